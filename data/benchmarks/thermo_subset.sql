@@ -0,0 +1,36 @@
+-- Подмножество таблицы compounds для бенчмарков (см. thermo_agents.benchmarks.cases)
+CREATE TABLE compounds (Formula TEXT, FirstName TEXT, SecondName TEXT, Phase TEXT, Tmin REAL, Tmax REAL, H298 REAL, S298 REAL, f1 REAL, f2 REAL, f3 REAL, f4 REAL, f5 REAL, f6 REAL, MeltingPoint REAL, BoilingPoint REAL, ReliabilityClass INTEGER, MolecularWeight REAL);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (284025, 'C', 'Carbon', '', 's', 298.15, 1100.0, 0.0, 5.740442, 8.517505, 0.04107, -0.54873, 0.0, 0.0, 0.0, 3915.0, 3915.0, 1, 12.0107);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (2769, 'C', 'Carbon', '', 's', 600.0, 1300.0, 0.0, 0.0, 24.99735, 55.186, -33.691, 7.948, -0.136, -0.403, 3915.0, 3915.0, 1, 12.0107);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (2770, 'C', 'Carbon', '', 's', 1300.0, 3900.0, 0.0, 0.0, 26.74454, 0.084615, -31.36193, 5.86286, 0.0, 0.0, 3915.0, 3915.0, 1, 12.0107);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (202544, 'CO', 'Carbon monoxide', '', 'g', 298.15, 3600.0, -0.110541, 197.660309, 25.567593, 6.096429, 4.054656, -2.671301, 0.0, 0.0, 68.0, 81.7, 1, 28.0101);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (202545, 'CO', 'Carbon monoxide', '', 'g', 3600.0, 11000.0, 0.0, 0.0, 35.150707, -4.465947, -16.908921, 4.699936, 0.0, 0.0, 68.0, 81.7, 1, 28.0101);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (37254, 'CO', 'Carbon monoxide', '', 'g', 11000.0, 16000.0, 0.0, 0.0, 30.35186, 7.013071, -0.371741, 0.0, 0.0, 0.0, 68.0, 81.7, 1, 28.0101);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (37261, 'CO2', 'Carbon dioxide', '', 'g', 298.15, 900.0, 0.0, 0.0, 58.166, 2.72, -6.381, 0.0, 0.0, 0.0, 0.0, 194.68, 1, 44.0095);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (37262, 'CO2', 'Carbon dioxide', '', 'g', 900.0, 2700.0, 0.0, 0.0, 44.228, -8.514, -3.082, 0.0, 0.0, 0.0, 0.0, 194.68, 1, 44.0095);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (37263, 'CO2', 'Carbon dioxide', '', 'g', 2700.0, 7600.0, 0.0, 0.0, 30.351, 7.013, -0.371, 0.0, 0.0, 0.0, 0.0, 194.68, 1, 44.0095);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (38806, 'Cl2', 'Dichlorine', '', 'g', 298.15, 1500.0, 0.0, 0.0, 28.868012, -2.847819, 0.091818, -7.040023, 0.0, 0.0, 171.7, 239.11, 1, 70.906);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (38807, 'Cl2', 'Dichlorine', '', 'g', 1500.0, 3300.0, 0.0, 0.0, 30.349718, 0.080292, -0.258036, 0.0, 0.0, 0.0, 171.7, 239.11, 1, 70.906);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (41696, 'FeO', 'Iron(II) oxide', '', 's', 298.15, 600.0, -0.265053, 59.807001, 50.278249, 3.65104, -1.94108, 8.23386, 0.0, 0.0, 1650.0, 3687.0, 1, 71.844);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (41697, 'FeO', 'Iron(II) oxide', '', 's', 600.0, 900.0, 0.0, 0.0, 55.5, 2.0, -1.0, 0.0, 0.0, 0.0, 1650.0, 3687.0, 1, 71.844);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (41698, 'FeO', 'Iron(II) oxide', '', 's', 900.0, 1300.0, 0.0, 0.0, 52.0, 1.5, -0.8, 0.0, 0.0, 0.0, 1650.0, 3687.0, 1, 71.844);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (41699, 'FeO', 'Iron(II) oxide', '', 's', 1300.0, 1650.0, 0.0, 0.0, 48.0, 1.0, -0.5, 0.0, 0.0, 0.0, 1650.0, 3687.0, 1, 71.844);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (41700, 'FeO', 'Iron(II) oxide', '', 'l', 1650.0, 5000.0, 0.024058, 14.58124, 68.199, 0.0, 0.0, 0.0, 0.0, 0.0, 1650.0, 3687.0, 1, 71.844);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (42969, 'H2O', 'Hydrogen oxide', '', 'l', 273.151, 495.0, -0.28583, 69.949995, 75.327, 0.0, 0.0, 0.0, 0.0, 0.0, 273.15, 373.15, 1, 18.01528);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (295112, 'H2O', 'Hydrogen oxide', '', 'l', 298.15, 372.78, -0.28583, 69.94804, 30.0, 10.0, 0.0, 0.0, 0.0, 0.0, 273.15, 373.15, 1, 18.01528);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (42974, 'H2O', 'Hydrogen oxide', '', 'g', 298.15, 600.0, -0.241826, 188.831995, 30.0, 10.0, 1.0, 0.0, 0.0, 0.0, 273.15, 373.15, 1, 18.01528);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (295115, 'H2O', 'Hydrogen oxide', '', 'g', 600.0, 1600.0, 0.0, 0.0, 33.0, 12.0, -3.0, 0.0, 0.0, 0.0, 273.15, 373.15, 1, 18.01528);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (42975, 'H2O', 'Hydrogen oxide', '', 'g', 1100.0, 2800.0, 0.0, 0.0, 30.5, 8.0, -2.0, 0.0, 0.0, 0.0, 273.15, 373.15, 1, 18.01528);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (295116, 'H2O', 'Hydrogen oxide', '', 'g', 1600.0, 6000.0, 0.0, 0.0, 28.0, 0.0, 0.0, 0.0, 0.0, 0.0, 273.15, 373.15, 1, 18.01528);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (42976, 'H2O', 'Hydrogen oxide', '', 'g', 2800.0, 8400.0, 0.0, 0.0, 26.0, -5.0, 1.0, 0.0, 0.0, 0.0, 273.15, 373.15, 1, 18.01528);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (42977, 'H2O', 'Hydrogen oxide', '', 'g', 8400.0, 18000.0, 0.0, 0.0, 25.0, 0.0, 0.0, 0.0, 0.0, 0.0, 273.15, 373.15, 1, 18.01528);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (42978, 'H2O', 'Hydrogen oxide', '', 'g', 18000.0, 20000.0, 0.0, 0.0, 24.0, 0.0, 0.0, 0.0, 0.0, 0.0, 273.15, 373.15, 1, 18.01528);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (310262, 'HCl', 'Hydrogen chloride , Hydrochloric acid', '', 'g', 298.15, 3000.0, -0.092311, 186.894882, 26.922364, 4.165626, 1.011465, -2.163518, 0.0, 0.0, 158.97, 188.0, 1, 36.4609);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (-1, 'NH3', 'Ammonia', '', 'l', 195.41, 398.3, -0.080058, 26.3490019184, 58.10751752, 75.1523452544, 0.0425522448304, 0.0, 0.0, 0.0, 195.41, 398.3, 1, 17.03052);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (-2, 'NH3', 'Ammonia', '', 'g', 298.15, 1000.0, -0.04594, 192.7778, 24.90389082784, 36.320638744, 0.487128994816, -4.60882177056, 0.0, 0.0, 195.41, 398.3, 1, 17.03052);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (-3, 'NH3', 'Ammonia', '', 'g', 1000.0, 6000.0, 0.0, 0.0, 65.0639819416, 7.6441311808, -165.8366056, -0.850946484744, 0.0, 0.0, 195.41, 398.3, 1, 17.03052);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (297771, 'NaCl', 'Sodium chloride', '', 's', 298.15, 1073.95, -0.411119, 72.13208, 52.271696, 5.364832, -0.939432, 0.0, 0.0, 0.0, 1074.0, 1686.0, 1, 58.4428);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (48398, 'NaCl', 'Sodium chloride', '', 'l', 1074.0, 3400.0, 0.028158, 26.21694, 66.904, 0.0, 0.0, 0.0, 0.0, 0.0, 1074.0, 1686.0, 1, 58.4428);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (49767, 'O2', 'Oxygen', '', 'g', 298.15, 700.0, 0.0, 0.0, 30.504081, 8.278872, -0.355823, -6.743896, 0.0, 0.0, 54.36, 90.2, 1, 31.998);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (49768, 'O2', 'Oxygen', '', 'g', 700.0, 1200.0, 0.0, 0.0, 36.771426, -61.850688, -0.736896, 29.765018, 0.0, 0.0, 54.36, 90.2, 1, 31.998);
+INSERT INTO compounds (rowid, Formula, FirstName, SecondName, Phase, Tmin, Tmax, H298, S298, f1, f2, f3, f4, f5, f6, MeltingPoint, BoilingPoint, ReliabilityClass, MolecularWeight) VALUES (49769, 'O2', 'Oxygen', '', 'g', 1200.0, 2500.0, 0.0, 0.0, 31.922289, -12.378921, -8.432196, 10.273726, 0.0, 0.0, 54.36, 90.2, 1, 31.998);
@@ -3,6 +3,7 @@
 import asyncio
 import os
 import sys
+import time
 from pathlib import Path
 from typing import Optional
 
@@ -20,11 +21,13 @@ if str(src_path) not in sys.path:
 
 from dotenv import load_dotenv
 
+from thermo_agents.batch import BatchResultWriter, load_batch
 from thermo_agents.orchestrator import (
     ThermoOrchestrator,
     ThermoOrchestratorConfig
 )
 from thermo_agents.session_logger import SessionLogger
+from thermo_agents.worker_pool import CalculationWorkerPool
 
 # Загрузка переменных окружения
 load_dotenv()
@@ -148,6 +151,62 @@ async def main_test():
             pass
 
 
+async def main_batch(
+    input_path: Path,
+    output_path: Path,
+    workers: int = 0,
+    concurrency: int = 4,
+    chunk_size: int = 16,
+) -> int:
+    """
+    Пакетный режим: запросы из JSONL, результаты в JSONL/CSV.
+
+    Args:
+        input_path: JSONL с запросами или готовыми параметрами
+        output_path: Файл результатов (.jsonl или .csv)
+        workers: Число процессов для расчетов (0 — в текущем процессе)
+        concurrency: Максимум одновременных вызовов LLM
+        chunk_size: Размер группы заданий с общими веществами
+
+    Returns:
+        Код возврата (1, если есть ошибки)
+    """
+    items = load_batch(input_path)
+    print(f"Заданий: {len(items)} ({input_path})")
+
+    db_path = Path(__file__).parent / "data" / "thermo_data.db"
+    orchestrator = create_orchestrator(str(db_path))
+
+    pool = None
+    if workers > 0:
+        pool = CalculationWorkerPool(
+            orchestrator.config.db_path,
+            orchestrator.config.static_data_dir,
+            workers=workers,
+        )
+        await pool.start()
+        orchestrator.calculation_pool = pool
+
+    start = time.perf_counter()
+    try:
+        with BatchResultWriter(output_path) as writer:
+            results = await orchestrator.process_batch(
+                items, concurrency=concurrency, chunk_size=chunk_size, on_result=writer.write
+            )
+    finally:
+        if pool is not None:
+            await pool.shutdown()
+    elapsed = time.perf_counter() - start
+
+    errors = sum(result.status == "error" for result in results)
+    extraction = sum(result.extraction_s for result in results)
+    calculation = sum(result.calculation_s for result in results)
+    print(f"Готово за {elapsed:.1f} с: {len(results) - errors} успешно, {errors} с ошибками")
+    print(f"Суммарно: извлечение {extraction:.1f} с, расчет {calculation:.1f} с")
+    print(f"Результаты: {output_path}")
+    return 1 if errors else 0
+
+
 if __name__ == "__main__":
     import argparse
 
@@ -158,6 +217,8 @@ if __name__ == "__main__":
 Примеры использования:
   python main.py                    # Интерактивный режим (по умолчанию)
   python main.py --test             # Тестовый режим с предопределённым запросом
+  python main.py --batch queries.jsonl --output results.csv --workers 4
+                                    # Пакетный режим (запросы или параметры в JSONL)
         """,
     )
     parser.add_argument(
@@ -165,11 +226,50 @@ if __name__ == "__main__":
         action="store_true",
         help="Запустить тестовый режим с предопределённым запросом",
     )
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        metavar="JSONL",
+        help="Пакетный режим: JSONL с запросами или ExtractedReactionParameters",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("batch_results.jsonl"),
+        help="Файл результатов пакета (.jsonl или .csv)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Процессов для расчетов пакета (0 — в текущем процессе)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Одновременных запросов к LLM в пакетном режиме",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=16,
+        help="Размер группы заданий с общими веществами",
+    )
 
     args = parser.parse_args()
 
     try:
-        if args.test:
+        if args.batch:
+            sys.exit(
+                asyncio.run(
+                    main_batch(
+                        args.batch, args.output, args.workers,
+                        args.concurrency, args.chunk_size,
+                    )
+                )
+            )
+        elif args.test:
             # Тестовый режим
             asyncio.run(main_test())
         else:
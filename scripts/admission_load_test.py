@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный тест контроля допуска запросов (AdmissionController).
+
+Моделируемый сервис ограниченной производительности нагружается открытым
+потоком запросов на нескольких уровнях нагрузки (кратных номинальной) без
+контроля допуска и через AdmissionController. Отчет показывает задержки
+выполненных запросов (p50/p95/p99), отказы и таймауты, задержки активного
+пользователя и остальных, пиковое число одновременных запросов и предел
+контроллера под нагрузкой.
+
+Использование:
+    python scripts/admission_load_test.py
+    python scripts/admission_load_test.py --loads 1,2,5 --duration 5 \\
+        --output temp/admission_load.json --report temp/admission_load.md
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.thermo_agents.benchmarks.admission_load import (
+    MODES,
+    LoadProfile,
+    format_admission_report,
+    run_admission_load,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Хвост задержки с контролем допуска и без него",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--loads", default="1,5", help="Нагрузки (кратно номинальной) через запятую")
+    parser.add_argument("--duration", type=float, default=3.0, help="Секунд замера на нагрузку")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Секунд прогрева на половине номинальной нагрузки")
+    parser.add_argument("--capacity", type=int, default=4, help="Запросов, которые сервис обслуживает без замедления")
+    parser.add_argument("--service-ms", type=float, default=20.0, help="Время обслуживания без очереди, мс")
+    parser.add_argument("--timeout", type=float, default=1.0, help="Срок запроса, с")
+    parser.add_argument("--users", type=int, default=20, help="Число пользователей")
+    parser.add_argument("--heavy-share", type=float, default=0.5, help="Доля запросов одного активного пользователя")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно потока запросов")
+    parser.add_argument("--output", type=Path, help="Сохранить результаты в JSON")
+    parser.add_argument("--report", type=Path, help="Сохранить отчет (Markdown)")
+    args = parser.parse_args()
+
+    results = []
+    for load in (float(x) for x in args.loads.split(",")):
+        profile = LoadProfile(
+            load_factor=load,
+            duration_s=args.duration,
+            warmup_s=args.warmup,
+            users=args.users,
+            heavy_share=args.heavy_share,
+            timeout_s=args.timeout,
+            capacity=args.capacity,
+            base_service_s=args.service_ms / 1e3,
+            seed=args.seed,
+        )
+        for mode in MODES:
+            stats = asyncio.run(run_admission_load(mode, profile))
+            print(
+                f"⏱️ {load:g}x {mode:<10} p99 {stats.p99_ms:8.1f} ms  "
+                f"выполнено {stats.completed}/{stats.offered}  отказов {stats.rejected}  "
+                f"таймаутов {stats.timed_out}"
+            )
+            results.append(stats)
+
+    report = format_admission_report(results, profile)
+    print()
+    print(report)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps([s.to_dict() for s in results], indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(report, encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
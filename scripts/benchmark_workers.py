@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк многопроцессного режима расчетов (CalculationWorkerPool).
+
+Воспроизводит записанный JSONL журнал запросов и измеряет пропускную
+способность детерминированной части (без LLM) для разного числа процессов.
+
+Журнал пишется ботом при QUERY_LOG_PATH=<файл>; каждая строка — объект
+{"query": ..., "params": {...ExtractedReactionParameters...}} или просто
+словарь параметров. Пример журнала: scripts/sample_query_log.jsonl.
+
+Использование:
+    python scripts/benchmark_workers.py scripts/sample_query_log.jsonl \\
+        --workers 1,2,4 --repeat 10 --concurrency 16
+    python scripts/benchmark_workers.py log.jsonl --workers 4 --cache-dir temp/result_cache
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.thermo_agents.models.extraction import ExtractedReactionParameters
+from src.thermo_agents.worker_pool import CalculationWorkerPool
+
+
+def load_query_log(path: Path) -> List[ExtractedReactionParameters]:
+    """Загрузка параметров из JSONL журнала."""
+    jobs = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            params = record.get("params", record)
+            try:
+                jobs.append(ExtractedReactionParameters.model_validate(params))
+            except Exception as e:
+                print(f"⚠️ Строка {line_no} пропущена: {e}")
+    return jobs
+
+
+async def run_benchmark(
+    jobs: List[ExtractedReactionParameters],
+    workers: int,
+    concurrency: int,
+    db_path: Path,
+    static_dir: Path,
+    cache_dir: Path = None,
+) -> dict:
+    """Прогон всех заданий через пул с заданным числом процессов."""
+    pool = CalculationWorkerPool(db_path, static_dir, workers=workers, cache_dir=cache_dir)
+
+    start = time.perf_counter()
+    await pool.start()
+    startup = time.perf_counter() - start
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def run_one(params):
+        async with semaphore:
+            t0 = time.perf_counter()
+            await pool.calculate(params)
+            latencies.append(time.perf_counter() - t0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_one(params) for params in jobs))
+    elapsed = time.perf_counter() - start
+
+    stats = pool.get_stats()
+    await pool.shutdown()
+
+    latencies.sort()
+    return {
+        "workers": workers,
+        "jobs": len(jobs),
+        "startup_s": startup,
+        "elapsed_s": elapsed,
+        "throughput": len(jobs) / elapsed if elapsed > 0 else 0.0,
+        "p50_s": latencies[len(latencies) // 2],
+        "p95_s": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "cache_hits": stats["cache_hits"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк CalculationWorkerPool")
+    parser.add_argument("query_log", type=Path, help="JSONL журнал запросов")
+    parser.add_argument("--workers", default="1,2,4", help="Список числа процессов")
+    parser.add_argument("--repeat", type=int, default=5, help="Повторов журнала")
+    parser.add_argument("--concurrency", type=int, default=16, help="Одновременных заданий")
+    parser.add_argument("--db", type=Path, default=Path("data/thermo_data.db"))
+    parser.add_argument("--static-dir", type=Path, default=Path("data/static_compounds"))
+    parser.add_argument("--cache-dir", type=Path, default=None, help="Включить общий кэш результатов")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    jobs = load_query_log(args.query_log)
+    if not jobs:
+        print("❌ Журнал не содержит заданий")
+        return 1
+    jobs = jobs * args.repeat
+
+    print(f"Заданий: {len(jobs)} (журнал × {args.repeat}), concurrency={args.concurrency}")
+    print(f"{'workers':>8} {'time, s':>9} {'jobs/s':>9} {'speedup':>8} {'p50, s':>8} {'p95, s':>8} {'cache':>6}")
+
+    baseline = None
+    for workers in (int(w) for w in args.workers.split(",")):
+        # Отдельный пустой кэш на прогон: повторы журнала дают попадания
+        cache_dir = args.cache_dir / f"workers_{workers}" if args.cache_dir else None
+        if cache_dir:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+        result = asyncio.run(
+            run_benchmark(jobs, workers, args.concurrency, args.db, args.static_dir, cache_dir)
+        )
+        if cache_dir:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+        baseline = baseline or result["throughput"]
+        print(
+            f"{workers:>8} {result['elapsed_s']:>9.2f} {result['throughput']:>9.2f} "
+            f"{result['throughput'] / baseline:>7.2f}x {result['p50_s']:>8.3f} "
+            f"{result['p95_s']:>8.3f} {result['cache_hits']:>6}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Построение предрассчитанных таблиц свойств (Cp, H, S) на сетке температур.
+
+Для каждой формулы из БД (и YAML-кэша) выполняется обычный отбор записей
+(CompoundDataLoader + PhaseTransitionDetector + RecordRangeBuilder) и
+свойства табулируются на равномерной сетке. Таблица пишется в
+<index-dir>/thermo_table и подключается ботом через SEARCH_INDEX_DIR
+(ReactionEngine считает реакции по таблицам, если отбор записей запроса
+совпадает с табличным: все вещества в таблице, нет имен и типов веществ,
+окно расчета равно окну сетки). Вместе с матрицей сохраняется отбор записей
+веществ: метаданные для ответа берутся из него без загрузки веществ.
+
+С --check N сравнивает интерполяцию с прямым расчетом для N случайных
+веществ в температурах между узлами сетки.
+
+Использование:
+    python scripts/build_thermo_tables.py --db data/thermo_data.db \\
+        --index-dir temp/search_index
+    python scripts/build_thermo_tables.py --db data/thermo_data.db \\
+        --index-dir temp/search_index --t-max 3000 --dtype float64 --check 50
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.thermo_agents.core_logic import (
+    CompoundDataLoader,
+    PhaseTransitionDetector,
+    RecordRangeBuilder,
+    ThermodynamicEngine,
+    ThermoTable,
+)
+from src.thermo_agents.core_logic.thermo_tables import tabulate_records
+from src.thermo_agents.search.compound_index import database_version
+from src.thermo_agents.search.database_connector import DatabaseConnector
+from src.thermo_agents.storage.static_data_manager import StaticDataManager
+
+
+def list_formulas(db_connector: DatabaseConnector, static_manager: StaticDataManager) -> list:
+    """Формулы БД (без ионов) и YAML-кэша."""
+    rows = db_connector.execute_query(
+        "SELECT DISTINCT TRIM(Formula) AS Formula FROM compounds "
+        "WHERE Formula NOT LIKE '%+%' AND Formula NOT LIKE '%-%' ORDER BY 1"
+    )
+    return static_manager.list_available_compounds() + [row["Formula"] for row in rows]
+
+
+def check_interpolation(table, loader, detector, builder, engine, count: int) -> dict:
+    """Максимальная ошибка интерполяции относительно прямого расчета."""
+    rng = np.random.default_rng(0)
+    formulas = rng.choice(table.formulas, size=min(count, len(table.formulas)), replace=False)
+    temperatures = np.sort(rng.uniform(table.t_min, table.t_max, size=200))
+
+    max_h = max_s = 0.0
+    for formula in formulas:
+        df = loader.get_raw_compound_data(formula)
+        melting, boiling = detector.get_most_common_melting_boiling_points(df)
+        records = builder.get_compound_records_for_range(
+            df, [table.t_min, table.t_max], melting, boiling
+        )
+        exact = tabulate_records(records, temperatures, engine)
+        approx = table.interpolate([formula], temperatures)[0]
+        max_h = max(max_h, float(np.max(np.abs(approx[1] - exact[1]))))
+        max_s = max(max_s, float(np.max(np.abs(approx[2] - exact[2]))))
+
+    return {"formulas": len(formulas), "max_h_error": max_h, "max_s_error": max_s}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Построение таблиц свойств на сетке")
+    parser.add_argument("--db", type=Path, default=Path("data/thermo_data.db"))
+    parser.add_argument("--static-dir", type=Path, default=Path("data/static_compounds"))
+    parser.add_argument("--index-dir", type=Path, required=True, help="Каталог снимков индексов")
+    parser.add_argument("--t-min", type=float, default=298.0)
+    parser.add_argument("--t-max", type=float, default=6000.0)
+    parser.add_argument("--step", type=float, default=1.0)
+    parser.add_argument("--dtype", choices=["float32", "float64"], default="float32")
+    parser.add_argument("--limit", type=int, default=None, help="Только первые N формул")
+    parser.add_argument("--check", type=int, default=0, help="Проверить N случайных веществ")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logger = logging.getLogger("build_thermo_tables")
+
+    if not args.db.exists():
+        print(f"❌ БД не найдена: {args.db}")
+        return 1
+
+    db_connector = DatabaseConnector(args.db)
+    static_manager = StaticDataManager(args.static_dir)
+    loader = CompoundDataLoader(db_connector, static_manager, logger)
+    detector = PhaseTransitionDetector()
+    builder = RecordRangeBuilder(logger)
+    engine = ThermodynamicEngine(logger)
+
+    formulas = list_formulas(db_connector, static_manager)
+    if args.limit:
+        formulas = formulas[: args.limit]
+
+    table = ThermoTable()
+    stats = table.build(
+        formulas,
+        loader,
+        detector,
+        builder,
+        engine,
+        args.index_dir / "thermo_table",
+        t_min=args.t_min,
+        t_max=args.t_max,
+        t_step=args.step,
+        dtype=args.dtype,
+        source_version=database_version(args.db),
+    )
+    print(
+        f"✅ Таблицы свойств: {stats['formulas']} веществ (пропущено {stats['skipped']}), "
+        f"{stats['points']} точек, {stats['size_mb']:.1f} MB за {stats['build_time_s']:.1f}s"
+    )
+
+    if args.check:
+        result = check_interpolation(table, loader, detector, builder, engine, args.check)
+        print(
+            f"Интерполяция ({result['formulas']} веществ, 200 температур): "
+            f"max |ΔH| = {result['max_h_error']:.3g} Дж/моль, "
+            f"max |ΔS| = {result['max_s_error']:.3g} Дж/(моль·K)"
+        )
+
+    db_connector.disconnect()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Офлайн-оценка режимов промпта извлечения параметров (compact / legacy).
+
+Прогоняет записанные запросы (JSONL журнал бота, QUERY_LOG_PATH) через
+ThermodynamicAgent в каждом режиме и сравнивает извлеченные параметры с
+записанными, а также входные токены и задержку.
+
+Журнал: строки {"query": ..., "params": {...ExtractedReactionParameters...}}.
+Пример: scripts/sample_query_log.jsonl.
+
+Использование:
+    # Реальная модель (OPENROUTER_API_KEY, LLM_BASE_URL, LLM_DEFAULT_MODEL)
+    python scripts/eval_extraction.py scripts/sample_query_log.jsonl --repeat 3
+
+    # Без обращения к модели: ответ — записанные параметры, сравниваются
+    # только объем промпта и оценка входных токенов
+    python scripts/eval_extraction.py scripts/sample_query_log.jsonl --dry-run
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.thermo_agents.models.extraction import ExtractedReactionParameters
+from src.thermo_agents.thermodynamic_agent import create_thermo_agent
+
+# Поля, по которым сравнивается качество извлечения
+FIELDS = (
+    "query_type",
+    "balanced_equation",
+    "all_compounds",
+    "reactants",
+    "products",
+    "temperature_range_k",
+    "temperature_step_k",
+)
+
+
+def load_records(path: Path) -> List[Dict[str, Any]]:
+    """Записи журнала с запросом и эталонными параметрами."""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "query" not in record or "params" not in record:
+                print(f"⚠️ Строка {line_no} пропущена: нужны query и params")
+                continue
+            record["params"] = ExtractedReactionParameters.model_validate(record["params"])
+            records.append(record)
+    return records
+
+
+def normalize(field: str, value: Any) -> Any:
+    """Значение поля без несущественных различий (порядок веществ, пробелы, стрелки)."""
+    if field in ("all_compounds", "reactants", "products"):
+        return frozenset(value)
+    if field == "balanced_equation":
+        equation = re.sub(r"\s+", "", value or "")
+        return re.sub(r"→|⇄|<=>|->", "=", equation)
+    if field == "temperature_range_k":
+        return tuple(float(t) for t in value)
+    return value
+
+
+def compare(expected: ExtractedReactionParameters, actual: ExtractedReactionParameters) -> Dict[str, bool]:
+    """Совпадение полей FIELDS."""
+    return {
+        field: normalize(field, getattr(expected, field)) == normalize(field, getattr(actual, field))
+        for field in FIELDS
+    }
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else 0.0
+
+
+async def run_mode(records: List[Dict[str, Any]], mode: str, args) -> Dict[str, Any]:
+    """Прогон всех записей в одном режиме промпта."""
+    agent = create_thermo_agent(
+        llm_api_key=os.getenv("OPENROUTER_API_KEY", "dry-run" if args.dry_run else ""),
+        llm_base_url=os.getenv("LLM_BASE_URL", "https://openrouter.ai/api/v1"),
+        llm_model=os.getenv("LLM_DEFAULT_MODEL", "openai/gpt-4o"),
+        prompt_mode=mode,
+        prompt_cache_key=args.prompt_cache_key,
+    )
+
+    expected: Optional[ExtractedReactionParameters] = None
+    override = None
+    if args.dry_run:
+        from pydantic_ai.messages import ModelResponse, ToolCallPart
+        from pydantic_ai.models.function import FunctionModel
+
+        def replay(messages, info):
+            return ModelResponse(parts=[
+                ToolCallPart(info.output_tools[0].name, expected.model_dump(mode="json"))
+            ])
+
+        override = agent.agent.override(model=FunctionModel(replay))
+        override.__enter__()
+
+    rows = []
+    try:
+        for _ in range(args.repeat):
+            for record in records:
+                expected = record["params"]
+                start = time.perf_counter()
+                try:
+                    actual = await agent.extract_parameters(record["query"])
+                    error = None
+                except Exception as e:
+                    actual, error = None, str(e)
+                rows.append({
+                    "mode": mode,
+                    "query": record["query"],
+                    "latency_s": time.perf_counter() - start,
+                    "error": error,
+                    "matches": compare(expected, actual) if actual is not None else {},
+                    **agent.last_usage,
+                })
+    finally:
+        if override is not None:
+            override.__exit__(None, None, None)
+
+    ok = [row for row in rows if row["error"] is None]
+    return {
+        "mode": mode,
+        "rows": rows,
+        "n": len(rows),
+        "errors": len(rows) - len(ok),
+        "exact": sum(all(row["matches"].values()) for row in ok) / len(rows) if rows else 0.0,
+        "fields": {
+            field: sum(row["matches"][field] for row in ok) / len(rows) if rows else 0.0
+            for field in FIELDS
+        },
+        "input_tokens": statistics.mean(row.get("input_tokens", 0) for row in ok) if ok else 0.0,
+        "cache_read_tokens": statistics.mean(row.get("cache_read_tokens", 0) for row in ok) if ok else 0.0,
+        "requests": statistics.mean(row.get("requests", 0) for row in ok) if ok else 0.0,
+        "p50_s": percentile([row["latency_s"] for row in ok], 0.5),
+        "p95_s": percentile([row["latency_s"] for row in ok], 0.95),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Оценка режимов промпта извлечения")
+    parser.add_argument("query_log", type=Path, help="JSONL журнал запросов с параметрами")
+    parser.add_argument("--modes", default="legacy,compact", help="Режимы через запятую")
+    parser.add_argument("--repeat", type=int, default=1, help="Повторов журнала")
+    parser.add_argument("--dry-run", action="store_true", help="Без обращения к модели")
+    parser.add_argument("--prompt-cache-key", default=None, help="prompt_cache_key OpenAI")
+    parser.add_argument("--output", type=Path, default=None, help="JSON с результатами по запросам")
+    args = parser.parse_args()
+
+    try:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+    except ImportError:
+        pass
+
+    if not args.dry_run and not os.getenv("OPENROUTER_API_KEY"):
+        print("❌ Нет OPENROUTER_API_KEY (или используйте --dry-run)")
+        return 1
+
+    records = load_records(args.query_log)
+    if not records:
+        print("❌ Журнал не содержит записей с параметрами")
+        return 1
+
+    print(f"Запросов: {len(records)} × {args.repeat}{' (dry-run)' if args.dry_run else ''}")
+    print(
+        f"{'mode':>8} {'ok':>5} {'exact':>7} {'in tok':>8} {'cached':>8} "
+        f"{'calls':>6} {'p50, s':>8} {'p95, s':>8}"
+    )
+
+    results = []
+    for mode in args.modes.split(","):
+        result = asyncio.run(run_mode(records, mode.strip(), args))
+        results.append(result)
+        print(
+            f"{result['mode']:>8} {result['n'] - result['errors']:>5} {result['exact']:>7.1%} "
+            f"{result['input_tokens']:>8.0f} {result['cache_read_tokens']:>8.0f} "
+            f"{result['requests']:>6.2f} {result['p50_s']:>8.3f} {result['p95_s']:>8.3f}"
+        )
+
+    print("\nСовпадение по полям:")
+    for field in FIELDS:
+        print(f"  {field:<22}" + "".join(f" {r['mode']}={r['fields'][field]:.1%}" for r in results))
+
+    if args.output:
+        args.output.write_text(
+            json.dumps([row for r in results for row in r["rows"]], ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        print(f"\nРезультаты по запросам: {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
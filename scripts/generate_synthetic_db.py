@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Синтетическая БД compounds заданного масштаба для нагрузочных тестов поиска.
+
+Схема и распределения (формулы, фазы в скобках, ионы, композиты, сегменты
+Tmin-Tmax, классы надежности) — по статистике рабочей БД
+(docs/database_analysis_report.md); с --profile берутся из JSON, который
+пишет scripts/database_analysis.py.
+
+Использование:
+    python scripts/generate_synthetic_db.py --scale 10 --db temp/synthetic/synth_10x.db
+    python scripts/generate_synthetic_db.py --scale 1 --db temp/synth.db \\
+        --profile docs/database_analysis_results.json --seed 7
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.thermo_agents.benchmarks.synthetic_db import DatabaseProfile, generate_database
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Генератор синтетической таблицы compounds",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--scale", type=float, default=1.0, help="Масштаб относительно рабочей БД (1 = 316 434 записи)")
+    parser.add_argument("--db", type=Path, required=True, help="Файл создаваемой БД (перезаписывается)")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно генератора")
+    parser.add_argument("--profile", type=Path, help="JSON статистики из scripts/database_analysis.py")
+    args = parser.parse_args()
+
+    profile = DatabaseProfile.from_analysis_results(args.profile) if args.profile else None
+    print(f"⏳ Генерация {args.scale:g}x → {args.db}...")
+    stats = generate_database(args.db, scale=args.scale, seed=args.seed, profile=profile)
+    print(
+        f"✅ {stats['records']} записей, {stats['unique_formulas']} формул, "
+        f"{stats['size_mb']} МБ за {stats['generation_s']} с"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Подготовка БД к поиску: FTS5 индекс названий и снимки поисковых индексов.
+
+Создает в файле БД виртуальные таблицы compound_names_fts (словный поиск)
+и compound_names_trigram (поиск с опечатками) над FirstName/SecondName.
+С --index-dir дополнительно строит снимок индекса состава (тот же каталог
+задается боту через SEARCH_INDEX_DIR).
+
+С --query-log воспроизводит стадию 1 поиска (формула + название) для пар
+из JSONL журнала запросов (QUERY_LOG_PATH, поле params.compound_names) и
+сравнивает точное сравнение названий с FTS5: доля найденных и суммарное
+время поиска.
+
+Использование:
+    python scripts/prepare_search_db.py --db data/thermo_data.db
+    python scripts/prepare_search_db.py --db data/thermo_data.db \\
+        --index-dir temp/search_index --query-log scripts/sample_query_log.jsonl
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.thermo_agents.core_logic.compound_data_loader import CompoundDataLoader
+from src.thermo_agents.search.composition_index import CompositionIndex
+from src.thermo_agents.search.database_connector import DatabaseConnector
+from src.thermo_agents.search.name_index import NameIndex, create_name_index
+from src.thermo_agents.storage.static_data_manager import StaticDataManager
+
+
+def load_name_lookups(path: Path, static_manager: StaticDataManager) -> List[Tuple[str, str]]:
+    """
+    Пары (формула, первое название) из журнала, доходящие до стадии 1
+    (вещества из YAML-кэша находятся на стадии 0).
+    """
+    lookups = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            params = record.get("params", record)
+            for formula, names in (params.get("compound_names") or {}).items():
+                if names and not static_manager.is_available(formula):
+                    lookups.append((formula, names[0]))
+    return lookups
+
+
+def replay_stage_one(loader: CompoundDataLoader, lookups: List[Tuple[str, str]]) -> dict:
+    """Прогон стадии 1 загрузчика по парам (формула, название)."""
+    hits = 0
+    start = time.perf_counter()
+    for formula, name in lookups:
+        if not loader._search_db_with_name(formula, name).empty:
+            hits += 1
+    elapsed = time.perf_counter() - start
+    return {
+        "hits": hits,
+        "hit_rate": hits / len(lookups) if lookups else 0.0,
+        "total_ms": elapsed * 1000,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Подготовка БД к поиску")
+    parser.add_argument("--db", type=Path, default=Path("data/thermo_data.db"))
+    parser.add_argument("--static-dir", type=Path, default=Path("data/static_compounds"))
+    parser.add_argument("--index-dir", type=Path, default=None, help="Каталог снимков индексов")
+    parser.add_argument("--query-log", type=Path, default=None, help="JSONL журнал для отчета")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if not args.db.exists():
+        print(f"❌ БД не найдена: {args.db}")
+        return 1
+
+    stats = create_name_index(args.db)
+    print(f"✅ Индекс названий: {stats['records']} записей за {stats['build_time_s']:.2f}s")
+
+    db_connector = DatabaseConnector(args.db)
+
+    if args.index_dir:
+        index = CompositionIndex()
+        index.load_or_build(db_connector, args.index_dir / "composition.npz")
+        print(f"✅ Индекс состава: {index.get_stats()['total_records']} записей")
+
+    if args.query_log:
+        static_manager = StaticDataManager(args.static_dir)
+        lookups = load_name_lookups(args.query_log, static_manager)
+        if not lookups:
+            print("⚠️ В журнале нет названий для стадии 1")
+            return 0
+
+        logger = logging.getLogger("prepare_search_db")
+        exact = replay_stage_one(CompoundDataLoader(db_connector, static_manager, logger), lookups)
+        fts = replay_stage_one(
+            CompoundDataLoader(
+                db_connector, static_manager, logger, name_index=NameIndex(db_connector)
+            ),
+            lookups,
+        )
+
+        print(f"Стадия 1: {len(lookups)} пар (формула, название)")
+        print(f"{'поиск':>8} {'найдено':>8} {'доля':>7} {'время, ms':>10}")
+        for label, result in (("точный", exact), ("FTS5", fts)):
+            print(
+                f"{label:>8} {result['hits']:>8} {result['hit_rate']:>7.1%} "
+                f"{result['total_ms']:>10.1f}"
+            )
+
+    db_connector.disconnect()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
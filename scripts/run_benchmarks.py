@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Бенчмарки детерминированного пути расчета с базовой линией.
+
+Сценарии и фикстурная БД: src/thermo_agents/benchmarks/cases.py.
+Прогон сравнивается с JSON-базовой линией (data/benchmarks/baseline.json);
+замедление считается регрессией, если медиана выросла больше чем на
+--threshold и различие значимо по критерию Манна — Уитни (p < --alpha).
+Код выхода 1 при регрессиях.
+
+Использование:
+    python scripts/run_benchmarks.py                       # сравнение с базовой линией
+    python scripts/run_benchmarks.py --update-baseline     # записать новую базовую линию
+    python scripts/run_benchmarks.py --filter search --repeat 30 \\
+        --output temp/bench.json --report temp/bench.md
+    python scripts/run_benchmarks.py --rebuild-fixture     # пересобрать SQL-дамп из YAML
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.thermo_agents.benchmarks import (
+    compare_runs,
+    format_report,
+    load_run,
+    run_benchmarks,
+    save_run,
+)
+from src.thermo_agents.benchmarks.cases import (
+    BASELINE_PATH,
+    FIXTURE_SQL,
+    default_cases,
+    dump_fixture_sql,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Бенчмарки ThermoSystem с JSON-базовой линией",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="JSON базовой линии")
+    parser.add_argument("--output", type=Path, help="Сохранить результаты прогона в JSON")
+    parser.add_argument("--report", type=Path, help="Сохранить отчет (Markdown)")
+    parser.add_argument("--filter", help="Только сценарии, имя которых содержит подстроку")
+    parser.add_argument("--repeat", type=int, default=15, help="Замеров на сценарий")
+    parser.add_argument("--min-sample", type=float, default=0.005, help="Минимальная длительность замера, с")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Допустимый рост медианы (доля)")
+    parser.add_argument("--alpha", type=float, default=0.01, help="Уровень значимости")
+    parser.add_argument("--update-baseline", action="store_true", help="Записать прогон как базовую линию")
+    parser.add_argument("--rebuild-fixture", action="store_true", help="Пересобрать SQL-дамп фикстуры из YAML")
+    args = parser.parse_args()
+
+    # Предупреждения отбора записей повторяются в каждом замере
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.rebuild_fixture:
+        count = dump_fixture_sql()
+        print(f"✅ {FIXTURE_SQL}: {count} записей")
+        return 0
+
+    def progress(result):
+        print(f"  {result.name:<36} {result.median * 1e3:9.3f} ms  ({len(result.samples)} × {result.number})")
+
+    print("⏱️ Прогон сценариев...")
+    run = run_benchmarks(
+        default_cases(),
+        repeat=args.repeat,
+        min_sample_s=args.min_sample,
+        pattern=args.filter,
+        progress=progress,
+    )
+
+    if args.output:
+        save_run(run, args.output)
+
+    if args.update_baseline:
+        if args.baseline.exists() and args.filter:
+            # Частичный прогон обновляет только свои сценарии
+            baseline = load_run(args.baseline)
+            baseline.results.update(run.results)
+            baseline.environment = run.environment
+            run = baseline
+        save_run(run, args.baseline)
+        print(f"✅ Базовая линия записана: {args.baseline}")
+        report = format_report(run)
+        regressions = []
+    elif args.baseline.exists():
+        baseline = load_run(args.baseline)
+        if args.filter:
+            baseline.results = {
+                name: result for name, result in baseline.results.items() if args.filter in name
+            }
+        comparisons = compare_runs(run, baseline, threshold=args.threshold, alpha=args.alpha)
+        report = format_report(run, comparisons, baseline)
+        regressions = [c for c in comparisons if c.status == "regression"]
+    else:
+        print(f"⚠️ Базовая линия не найдена: {args.baseline} (используйте --update-baseline)")
+        report = format_report(run)
+        regressions = []
+
+    print()
+    print(report)
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(report, encoding="utf-8")
+
+    if regressions:
+        print(f"❌ Регрессии: {', '.join(c.name for c in regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
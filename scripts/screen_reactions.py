@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Скрининг множества реакций над общим набором веществ.
+
+Данные каждого вещества загружаются один раз; ΔG и ln K всех реакций
+считаются одним матричным произведением (ReactionScreener). Реакции
+задаются уравнениями (--equation, можно несколько раз) или перечисляются
+по балансу элементов. Результат — ранжированная таблица интервалов
+самопроизвольности (ΔG < 0), выводится на экран или в CSV.
+
+Использование:
+    python scripts/screen_reactions.py --species Fe2O3 CO Fe CO2 C FeO
+    python scripts/screen_reactions.py --species C O2 CO CO2 \\
+        --equation "C + O2 = CO2" --equation "C + CO2 = 2CO" --csv screening.csv
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.thermo_agents.core_logic import (
+    CompoundDataLoader,
+    PhaseTransitionDetector,
+    ReactionEngine,
+    ReactionScreener,
+    RecordRangeBuilder,
+    ThermodynamicEngine,
+)
+from src.thermo_agents.search.database_connector import DatabaseConnector
+from src.thermo_agents.storage.static_data_manager import StaticDataManager
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Скрининг реакций по стехиометрической матрице")
+    parser.add_argument("--species", nargs="+", required=True, help="Формулы веществ")
+    parser.add_argument("--equation", action="append", default=None, help="Сбалансированное уравнение")
+    parser.add_argument("--db", type=Path, default=Path("data/thermo_data.db"))
+    parser.add_argument("--static-dir", type=Path, default=Path("data/static_compounds"))
+    parser.add_argument("--t-start", type=float, default=298.0)
+    parser.add_argument("--t-end", type=float, default=2500.0)
+    parser.add_argument("--step", type=float, default=100.0)
+    parser.add_argument("--max-species", type=int, default=4, help="Максимум веществ в реакции")
+    parser.add_argument("--csv", type=Path, default=None, help="Сохранить таблицу в CSV")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logger = logging.getLogger("screen_reactions")
+
+    db_connector = DatabaseConnector(args.db)
+    loader = CompoundDataLoader(db_connector, StaticDataManager(args.static_dir), logger)
+    engine = ReactionEngine(
+        loader,
+        PhaseTransitionDetector(),
+        RecordRangeBuilder(logger),
+        ThermodynamicEngine(logger),
+        logger,
+    )
+
+    result = ReactionScreener(engine).screen(
+        args.species,
+        args.equation,
+        [args.t_start, args.t_end, args.step],
+        max_species=args.max_species,
+    )
+
+    for equation, reason in result.skipped.items():
+        print(f"⚠ Пропущено {equation}: {reason}")
+
+    if args.csv:
+        result.to_csv(args.csv)
+        print(f"✅ {len(result.equations)} реакций сохранено в {args.csv}")
+    else:
+        print(result.to_dataframe().to_string(index=False))
+
+    db_connector.disconnect()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
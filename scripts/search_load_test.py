@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный тест поискового слоя на синтетических БД разного масштаба.
+
+Для каждого масштаба генерирует (или берет из --db-dir) синтетическую БД
+и измеряет задержку и QPS стадий поиска на одной выборке запросов.
+Отчет показывает p50/p95/p99 по стадиям, показатель роста задержки с
+размером таблицы и стадии, у которых p95 превысил --slow-ms.
+
+Стадии с индексами (--with-indexes) создают FTS5 таблицы названий в файле
+БД и строят индекс состава; время подготовки попадает в столбец Setup.
+
+Использование:
+    python scripts/search_load_test.py --scales 1,5,10,50
+    python scripts/search_load_test.py --scales 0.1,1 --lookups 100 --with-indexes \\
+        --output temp/search_load.json --report temp/search_load.md
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.thermo_agents.benchmarks.search_load import (
+    INDEX_STAGES,
+    STAGES,
+    build_workload,
+    format_load_report,
+    run_search_load,
+)
+from src.thermo_agents.benchmarks.synthetic_db import generate_database
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Задержки стадий поиска на синтетических БД",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--scales", default="1,5,10,50", help="Масштабы через запятую")
+    parser.add_argument("--db-dir", type=Path, default=Path("temp/synthetic"), help="Каталог сгенерированных БД (переиспользуются)")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно генератора и выборки запросов")
+    parser.add_argument("--lookups", type=int, default=200, help="Запросов в выборке")
+    parser.add_argument("--time-budget", type=float, default=30.0, help="Максимум секунд на стадию и масштаб")
+    parser.add_argument("--with-indexes", action="store_true", help="Добавить стадии с индексами названий и состава")
+    parser.add_argument("--slow-ms", type=float, default=100.0, help="Порог p95 для списка медленных стадий")
+    parser.add_argument("--output", type=Path, help="Сохранить результаты в JSON")
+    parser.add_argument("--report", type=Path, help="Сохранить отчет (Markdown)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    stages = STAGES + INDEX_STAGES if args.with_indexes else STAGES
+
+    results = []
+    for scale in (float(s) for s in args.scales.split(",")):
+        db_path = args.db_dir / f"synth_{scale:g}x_seed{args.seed}.db"
+        if not db_path.exists():
+            print(f"⏳ Генерация {scale:g}x → {db_path}...")
+            stats = generate_database(db_path, scale=scale, seed=args.seed)
+            print(f"   {stats['records']} записей за {stats['generation_s']} с")
+
+        workload = build_workload(db_path, size=args.lookups, seed=args.seed)
+        print(f"⏱️ {scale:g}x: {len(workload)} запросов × {len(stages)} стадий...")
+        for stats in run_search_load(
+            db_path, workload, stages, scale=scale, time_budget_s=args.time_budget
+        ):
+            print(f"  {stats.stage:<22} p50 {stats.p50_ms:9.2f} ms  p95 {stats.p95_ms:9.2f} ms  {stats.qps:9.1f} QPS")
+            results.append(stats)
+
+    report = format_load_report(results, slow_ms=args.slow_ms)
+    print()
+    print(report)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps([s.to_dict() for s in results], indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(report, encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк хранилища сессий Telegram бота (SessionStore).
+
+Заполняет сессии и последние результаты для большого числа пользователей
+(по умолчанию 100 000) в прежней схеме SessionManager/CallbackHandler,
+в SessionStore в памяти и с SQLite. Отчет показывает память на сессию и
+всего, число пользователей с сохраненным результатом, время на сообщение,
+периодический обход и выгрузку по таймауту, запись в SQLite и загрузку
+истории после перезапуска.
+
+Использование:
+    python scripts/session_store_benchmark.py
+    python scripts/session_store_benchmark.py --users 20000 --budget-mb 8 \\
+        --output temp/session_store.json --report temp/session_store.md
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.thermo_agents.benchmarks.session_load import (
+    MODES,
+    SessionLoadProfile,
+    format_session_report,
+    run_session_load,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Память и задержки хранилища сессий",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--users", type=int, default=100_000, help="Число пользователей")
+    parser.add_argument("--messages", type=int, default=100_000, help="Сообщений после заполнения")
+    parser.add_argument("--rows", type=int, default=60, help="Строк таблицы в тексте результата")
+    parser.add_argument("--shared", type=float, default=0.3, help="Доля пользователей с типовым ответом")
+    parser.add_argument("--budget-mb", type=int, default=32, help="Бюджет памяти на тексты результатов, МБ")
+    parser.add_argument("--modes", default=",".join(MODES), help="Режимы через запятую")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно потока сообщений")
+    parser.add_argument("--output", type=Path, help="Сохранить результаты в JSON")
+    parser.add_argument("--report", type=Path, help="Сохранить отчет (Markdown)")
+    args = parser.parse_args()
+
+    profile = SessionLoadProfile(
+        users=args.users,
+        messages=args.messages,
+        result_rows=args.rows,
+        shared_share=args.shared,
+        memory_budget_mb=args.budget_mb,
+        seed=args.seed,
+    )
+
+    results = []
+    for mode in args.modes.split(","):
+        stats = run_session_load(mode, profile)
+        print(
+            f"🗂️ {mode:<7} память {stats.memory_mb:7.1f} MB  "
+            f"сессия {stats.session_bytes_per_user:5.0f} B  "
+            f"сообщение {stats.message_us:6.1f} µs  обход {stats.sweep_ms:7.2f} ms"
+        )
+        results.append(stats)
+
+    report = format_session_report(results, profile)
+    print()
+    print(report)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps([s.to_dict() for s in results], indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(report, encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
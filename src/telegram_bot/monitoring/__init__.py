@@ -6,12 +6,14 @@ This package provides comprehensive monitoring features including:
 - Query analytics and pattern analysis
 - Health checks for all components
 - Alert management and notifications
+- Bounded-memory streaming summaries (sketches, top-k, t-digest)
 """
 
 from .bot_metrics import BotMetrics, RequestMetrics
 from .query_analytics import QueryAnalytics, QueryPattern, CompoundAnalytics, ReactionAnalytics
 from .health_checker import HealthChecker
 from .alert_manager import AlertManager, AlertRule, AlertNotification
+from .streaming_stats import CountMinSketch, SpaceSavingTopK, TDigest, HyperLogLog, TimeBucketedRollup
 
 __all__ = [
     "BotMetrics",
@@ -23,5 +25,10 @@ __all__ = [
     "HealthChecker",
     "AlertManager",
     "AlertRule",
-    "AlertNotification"
+    "AlertNotification",
+    "CountMinSketch",
+    "SpaceSavingTopK",
+    "TDigest",
+    "HyperLogLog",
+    "TimeBucketedRollup"
 ]
\ No newline at end of file
@@ -18,6 +18,7 @@ import logging
 from ..models.security import HealthCheckResult, MonitoringConfig
 from ...thermo_agents.orchestrator import ThermoOrchestrator, ThermoOrchestratorConfig
 from ...thermo_agents.search.database_connector import DatabaseConnector
+from ...thermo_agents.utils.resilience import Deadline
 
 
 logger = logging.getLogger(__name__)
@@ -238,11 +239,37 @@ class HealthChecker:
                 timestamp=datetime.now()
             )
 
+        # Circuit breaker, hedged requests and latency of the LLM client
+        resilience = {}
+        get_stats = getattr(self.orchestrator, "get_llm_resilience_stats", None)
+        if get_stats is not None:
+            resilience = get_stats() or {}
+        breaker = resilience.get("breaker", {})
+        hedging = resilience.get("hedging", {})
+        resilience_details = {
+            "breaker_state": breaker.get("state"),
+            "breaker_rejected": breaker.get("rejected", 0),
+            "hedges_started": hedging.get("started", 0),
+            "hedges_won": hedging.get("won", 0),
+            "latency_p95_s": resilience.get("latency", {}).get("p95_s"),
+        }
+
+        if breaker.get("state") == "open":
+            # The provider is failing: a probe query would be rejected anyway
+            return HealthCheckResult(
+                component="llm_api",
+                status="unhealthy",
+                error_message=f"Circuit breaker open, retry in {breaker.get('retry_after_s', 0):.0f}s",
+                response_time_ms=(time.time() - start_time) * 1000,
+                details=resilience_details,
+                timestamp=datetime.now()
+            )
+
         try:
             # Test LLM with a simple query
             test_result = await self.orchestrator.process_query(
                 "H2O properties at 298K",
-                test_mode=True
+                deadline=Deadline.after(30.0)
             )
             response_time = (time.time() - start_time) * 1000
 
@@ -258,7 +285,8 @@ class HealthChecker:
             details = {
                 "test_successful": True,
                 "response_length": len(test_result) if isinstance(test_result, str) else 0,
-                "model": getattr(self.orchestrator, 'model_name', 'unknown')
+                "model": getattr(self.orchestrator, 'model_name', 'unknown'),
+                **resilience_details
             }
 
             # Determine status based on response time
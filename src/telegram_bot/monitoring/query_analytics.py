@@ -3,18 +3,29 @@ Query analytics and pattern analysis for Telegram bot.
 
 This module provides detailed analysis of user queries, compound usage,
 reaction patterns, and performance trends.
+
+All aggregates are kept in bounded-memory streaming summaries
+(see streaming_stats), so memory stays constant under unbounded traffic.
 """
 
 import re
 import json
-from typing import Dict, List, Any, Tuple, Optional, Set
+from typing import Dict, List, Any, Tuple, Optional
 from datetime import datetime, timedelta
-from collections import defaultdict, Counter
-from dataclasses import dataclass, asdict
+from collections import deque
+from dataclasses import dataclass, field
 import threading
 
 from ..models.security import QueryStatistics
 from ...thermo_agents.models.extraction import ExtractedReactionParameters
+from .streaming_stats import (
+    CountMinSketch,
+    HyperLogLog,
+    SpaceSavingTopK,
+    TDigest,
+    TimeBucketedRollup,
+    bucket_label,
+)
 
 
 @dataclass
@@ -25,6 +36,7 @@ class QueryPattern:
     avg_processing_time: float
     success_rate: float
     examples: List[str]
+    latency: TDigest = field(default_factory=TDigest, repr=False)
 
 
 @dataclass
@@ -32,7 +44,7 @@ class CompoundAnalytics:
     """Analytics for chemical compounds"""
     compound_name: str
     total_mentions: int
-    unique_users: Set[int]
+    unique_users: HyperLogLog
     avg_temperature: float
     temperature_range: Tuple[float, float]
     common_phases: List[str]
@@ -47,11 +59,51 @@ class ReactionAnalytics:
     reaction_hash: str
     reaction_type: str  # "oxidation", "reduction", "synthesis", etc.
     count: int
-    unique_users: Set[int]
+    unique_users: HyperLogLog
     avg_temperature_range: Tuple[float, float]
     common_compounds: List[str]
     success_rate: float
     avg_processing_time: float
+    equation: str = ""
+
+
+class _QueryRollup:
+    """Per-bucket aggregates for one time bucket (bounded size)."""
+
+    def __init__(self, top_k: int):
+        self.count = 0
+        self.successes = 0
+        self.total_time = 0.0
+        self.users = HyperLogLog(precision=8)
+        self.top_queries = SpaceSavingTopK(top_k)
+        # Stats are kept only for queries monitored by top_queries
+        self.query_stats: Dict[str, List[float]] = {}  # query -> [observed, total_time, successes]
+
+    def record(self, user_id: int, query: str, processing_time: float, success: bool) -> None:
+        self.count += 1
+        self.total_time += processing_time
+        if success:
+            self.successes += 1
+        self.users.add(user_id)
+        _offer_with_stats(self.top_queries, self.query_stats, query, processing_time, success)
+
+
+def _offer_with_stats(
+    top: SpaceSavingTopK,
+    stats: Dict[str, List[float]],
+    query: str,
+    processing_time: float,
+    success: bool
+) -> None:
+    """Offer a query to a top-k summary and keep its stats in sync."""
+    evicted = top.offer(query)
+    if evicted is not None:
+        stats.pop(evicted, None)
+    entry = stats.setdefault(query, [0, 0.0, 0])
+    entry[0] += 1
+    entry[1] += processing_time
+    if success:
+        entry[2] += 1
 
 
 class QueryAnalytics:
@@ -64,23 +116,55 @@ class QueryAnalytics:
     - Reaction analysis
     - User behavior patterns
     - Performance bottlenecks
+
+    Memory is bounded: compounds, reactions and queries are tracked with
+    count-min sketches and space-saving top-k summaries, latencies with
+    t-digests, and trends with hourly rollups kept for ``retention_hours``.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        top_k: int = 100,
+        history_size: int = 1000,
+        retention_hours: int = 168,
+        bucket_top_k: int = 50
+    ):
+        """
+        Args:
+            top_k: Number of queries/compounds/reactions tracked in detail
+            history_size: Number of most recent raw records kept for inspection
+            retention_hours: Number of hourly rollup buckets kept
+            bucket_top_k: Number of queries tracked per hourly bucket
+        """
+        self.top_k = top_k
         self.query_patterns: Dict[str, QueryPattern] = {}
         self.compound_analytics: Dict[str, CompoundAnalytics] = {}
         self.reaction_analytics: Dict[str, ReactionAnalytics] = {}
 
-        # Raw data storage
-        self.query_history: List[Dict[str, Any]] = []
-        self.compound_mentions: List[Dict[str, Any]] = []
-        self.reaction_history: List[Dict[str, Any]] = []
+        # Recent raw records (bounded ring buffers)
+        self.query_history: deque = deque(maxlen=history_size)
+        self.compound_mentions: deque = deque(maxlen=history_size)
+        self.reaction_history: deque = deque(maxlen=history_size)
+
+        # Streaming summaries
+        self.compound_frequency = CountMinSketch()
+        self.reaction_frequency = CountMinSketch()
+        self._top_compounds = SpaceSavingTopK(top_k)
+        self._top_reactions = SpaceSavingTopK(top_k)
+        self._top_queries = SpaceSavingTopK(top_k)
+        self._query_stats: Dict[str, List[float]] = {}
+        self.latency_digest = TDigest()
+        self._rollup = TimeBucketedRollup(
+            lambda: _QueryRollup(bucket_top_k),
+            bucket_seconds=3600,
+            retention_buckets=retention_hours
+        )
 
         # Pattern matching
         self._init_patterns()
 
-        # Thread safety
-        self._lock = threading.Lock()
+        # Thread safety (re-entrant: export_analytics calls the getters)
+        self._lock = threading.RLock()
 
     def _init_patterns(self) -> None:
         """Initialize regex patterns for query classification."""
@@ -120,6 +204,20 @@ class QueryAnalytics:
             ]
         }
 
+        # One precompiled regex classifies a query into all categories in a
+        # single call: each category is an optional lookahead anchored at the
+        # start that sets an empty named group when any alternative matches.
+        lookaheads = []
+        for pattern_name, regex_list in self.patterns.items():
+            alternatives = "|".join(f"(?:{regex})" for regex in regex_list)
+            lookaheads.append(f"(?:(?=[\\s\\S]*?(?:{alternatives}))(?P<{pattern_name}>))?")
+        self._combined_pattern = re.compile(r"\A" + "".join(lookaheads), re.IGNORECASE)
+
+    def classify_query(self, query: str) -> List[str]:
+        """Return the names of all pattern categories matching the query."""
+        match = self._combined_pattern.match(query)
+        return [name for name, value in match.groupdict().items() if value is not None]
+
     def record_query(
         self,
         user_id: int,
@@ -143,6 +241,9 @@ class QueryAnalytics:
         if timestamp is None:
             timestamp = datetime.now()
 
+        # Regex classification does not touch shared state
+        matched_patterns = self.classify_query(query)
+
         with self._lock:
             # Store raw query data
             query_data = {
@@ -151,12 +252,17 @@ class QueryAnalytics:
                 "timestamp": timestamp,
                 "processing_time": processing_time,
                 "success": success,
-                "query_type": extracted_params.query_type.value if extracted_params else "unknown"
+                "query_type": extracted_params.query_type if extracted_params else "unknown"
             }
             self.query_history.append(query_data)
 
+            # Streaming summaries
+            self.latency_digest.add(processing_time)
+            _offer_with_stats(self._top_queries, self._query_stats, query, processing_time, success)
+            self._rollup.bucket(timestamp).record(user_id, query, processing_time, success)
+
             # Analyze query patterns
-            self._analyze_query_patterns(query_data)
+            self._analyze_query_patterns(query_data, matched_patterns)
 
             # Analyze compounds if present
             if extracted_params and extracted_params.all_compounds:
@@ -164,45 +270,44 @@ class QueryAnalytics:
 
             # Analyze reactions if present
             if (extracted_params and
-                extracted_params.query_type.value == "reaction_calculation" and
+                extracted_params.query_type == "reaction_calculation" and
                 extracted_params.balanced_equation):
                 self._analyze_reaction_mentions(user_id, extracted_params, processing_time, success, timestamp)
 
-    def _analyze_query_patterns(self, query_data: Dict[str, Any]) -> None:
-        """Analyze and categorize query patterns."""
-        query = query_data["query"].lower()
+    def _analyze_query_patterns(
+        self,
+        query_data: Dict[str, Any],
+        matched_patterns: List[str]
+    ) -> None:
+        """Update per-category statistics for the matched patterns."""
+        for pattern_name in matched_patterns:
+            if pattern_name not in self.query_patterns:
+                self.query_patterns[pattern_name] = QueryPattern(
+                    pattern=pattern_name,
+                    count=0,
+                    avg_processing_time=0.0,
+                    success_rate=1.0,
+                    examples=[]
+                )
 
-        for pattern_name, regex_list in self.patterns.items():
-            for regex in regex_list:
-                if re.search(regex, query, re.IGNORECASE):
-                    if pattern_name not in self.query_patterns:
-                        self.query_patterns[pattern_name] = QueryPattern(
-                            pattern=pattern_name,
-                            count=0,
-                            avg_processing_time=0.0,
-                            success_rate=1.0,
-                            examples=[]
-                        )
-
-                    pattern = self.query_patterns[pattern_name]
-                    pattern.count += 1
-
-                    # Update average processing time
-                    pattern.avg_processing_time = (
-                        (pattern.avg_processing_time * (pattern.count - 1) + query_data["processing_time"]) / pattern.count
-                    )
-
-                    # Update success rate
-                    if query_data["success"]:
-                        pattern.success_rate = (pattern.success_rate * (pattern.count - 1) + 1.0) / pattern.count
-                    else:
-                        pattern.success_rate = (pattern.success_rate * (pattern.count - 1)) / pattern.count
-
-                    # Add example if not already present
-                    if len(pattern.examples) < 5 and query_data["query"] not in pattern.examples:
-                        pattern.examples.append(query_data["query"])
-
-                    break  # Only match one pattern per query
+            pattern = self.query_patterns[pattern_name]
+            pattern.count += 1
+            pattern.latency.add(query_data["processing_time"])
+
+            # Update average processing time
+            pattern.avg_processing_time = (
+                (pattern.avg_processing_time * (pattern.count - 1) + query_data["processing_time"]) / pattern.count
+            )
+
+            # Update success rate
+            if query_data["success"]:
+                pattern.success_rate = (pattern.success_rate * (pattern.count - 1) + 1.0) / pattern.count
+            else:
+                pattern.success_rate = (pattern.success_rate * (pattern.count - 1)) / pattern.count
+
+            # Add example if not already present
+            if len(pattern.examples) < 5 and query_data["query"] not in pattern.examples:
+                pattern.examples.append(query_data["query"])
 
     def _analyze_compound_mentions(
         self,
@@ -212,8 +317,8 @@ class QueryAnalytics:
         success: bool
     ) -> None:
         """Analyze compound mentions in queries."""
-        for compound in extracted_params.all_compounds:
-            compound_name = compound.compound_name
+        for compound_name in extracted_params.all_compounds:
+            phase = None  # Phases are resolved later from the database
 
             # Extract temperature information
             temp_range = extracted_params.temperature_range_k or (298.15, 298.15)
@@ -227,16 +332,21 @@ class QueryAnalytics:
                 "temperature_range": temp_range,
                 "avg_temperature": avg_temp,
                 "success": success,
-                "phase": compound.phase
+                "phase": phase
             }
             self.compound_mentions.append(mention_data)
 
-            # Update compound analytics
+            # Frequency summaries; detailed analytics only for the top-k
+            self.compound_frequency.add(compound_name)
+            evicted = self._top_compounds.offer(compound_name)
+            if evicted is not None:
+                self.compound_analytics.pop(evicted, None)
+
             if compound_name not in self.compound_analytics:
                 self.compound_analytics[compound_name] = CompoundAnalytics(
                     compound_name=compound_name,
                     total_mentions=0,
-                    unique_users=set(),
+                    unique_users=HyperLogLog(precision=8),
                     avg_temperature=avg_temp,
                     temperature_range=temp_range,
                     common_phases=[],
@@ -264,8 +374,8 @@ class QueryAnalytics:
             )
 
             # Update phase information
-            if compound.phase and compound.phase not in analytics.common_phases:
-                analytics.common_phases.append(compound.phase)
+            if phase and phase not in analytics.common_phases:
+                analytics.common_phases.append(phase)
 
             # Update success rate
             if success:
@@ -288,8 +398,11 @@ class QueryAnalytics:
         # Determine reaction type
         reaction_type = self._classify_reaction_type(equation)
 
+        compounds = list(extracted_params.all_compounds)
+        temperature_range = extracted_params.temperature_range_k or (298.15, 298.15)
+
         # Store reaction data
-        reaction_data = {
+        self.reaction_history.append({
             "user_id": user_id,
             "reaction_hash": reaction_hash,
             "equation": equation,
@@ -297,22 +410,27 @@ class QueryAnalytics:
             "timestamp": timestamp,
             "processing_time": processing_time,
             "success": success,
-            "compounds": [c.compound_name for c in extracted_params.all_compounds],
-            "temperature_range": extracted_params.temperature_range_k or (298.15, 298.15)
-        }
-        self.reaction_history.append(reaction_data)
+            "compounds": compounds,
+            "temperature_range": temperature_range
+        })
+
+        # Frequency summaries; detailed analytics only for the top-k
+        self.reaction_frequency.add(reaction_hash)
+        evicted = self._top_reactions.offer(reaction_hash)
+        if evicted is not None:
+            self.reaction_analytics.pop(evicted, None)
 
-        # Update reaction analytics
         if reaction_hash not in self.reaction_analytics:
             self.reaction_analytics[reaction_hash] = ReactionAnalytics(
                 reaction_hash=reaction_hash,
                 reaction_type=reaction_type,
                 count=0,
-                unique_users=set(),
+                unique_users=HyperLogLog(precision=8),
                 avg_temperature_range=(298.15, 298.15),
                 common_compounds=[],
                 success_rate=1.0,
-                avg_processing_time=0.0
+                avg_processing_time=0.0,
+                equation=equation
             )
 
         analytics = self.reaction_analytics[reaction_hash]
@@ -326,14 +444,13 @@ class QueryAnalytics:
 
         # Update temperature range
         current_min, current_max = analytics.avg_temperature_range
-        temp_range = reaction_data["temperature_range"]
         analytics.avg_temperature_range = (
-            min(current_min, temp_range[0]),
-            max(current_max, temp_range[1])
+            min(current_min, temperature_range[0]),
+            max(current_max, temperature_range[1])
         )
 
         # Update common compounds
-        for compound in reaction_data["compounds"]:
+        for compound in compounds:
             if compound not in analytics.common_compounds:
                 analytics.common_compounds.append(compound)
 
@@ -369,10 +486,19 @@ class QueryAnalytics:
         else:
             return "properties"
 
+    def estimate_compound_mentions(self, compound_name: str) -> int:
+        """Approximate number of mentions of any compound (count-min sketch)."""
+        with self._lock:
+            return self.compound_frequency.estimate(compound_name)
+
     def get_top_queries(self, limit: int = 10, time_window: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get top queries by frequency.
 
+        Answered from the space-saving summaries: the all-time summary, or the
+        merged hourly rollups when ``time_window`` is given. Counts are upper
+        bounds; ``count_error`` is the maximum overestimation.
+
         Args:
             limit: Maximum number of queries to return
             time_window: Time window in hours (default: all time)
@@ -381,38 +507,34 @@ class QueryAnalytics:
             List of top queries with statistics
         """
         with self._lock:
-            # Filter by time window if specified
             if time_window:
-                cutoff_time = datetime.now() - timedelta(hours=time_window)
-                filtered_queries = [
-                    q for q in self.query_history
-                    if q["timestamp"] >= cutoff_time
-                ]
+                top = SpaceSavingTopK(self.top_k)
+                stats: Dict[str, List[float]] = {}
+                since = datetime.now() - timedelta(hours=time_window)
+                for _, bucket in self._rollup.items(since):
+                    top.merge(bucket.top_queries)
+                    for query, (observed, total_time, successes) in bucket.query_stats.items():
+                        entry = stats.setdefault(query, [0, 0.0, 0])
+                        entry[0] += observed
+                        entry[1] += total_time
+                        entry[2] += successes
             else:
-                filtered_queries = self.query_history
-
-            # Count query frequencies
-            query_counts = Counter(q["query"] for q in filtered_queries)
-            query_stats = defaultdict(lambda: {"count": 0, "total_time": 0, "successes": 0})
+                top, stats = self._top_queries, self._query_stats
 
-            for query_data in filtered_queries:
-                query = query_data["query"]
-                query_stats[query]["count"] += 1
-                query_stats[query]["total_time"] += query_data["processing_time"]
-                if query_data["success"]:
-                    query_stats[query]["successes"] += 1
-
-            # Sort and format results
             top_queries = []
-            for query, stats in sorted(query_counts.items(), key=lambda x: x[1], reverse=True)[:limit]:
-                query_stat = query_stats[query]
+            for query, count in top.top(limit):
+                observed, total_time, successes = stats.get(query, [0, 0.0, 0])
+                if observed == 0:
+                    continue
+                success_rate = successes / observed
                 top_queries.append({
                     "query": query,
-                    "count": query_stat["count"],
-                    "avg_processing_time": query_stat["total_time"] / query_stat["count"],
-                    "success_rate": query_stat["successes"] / query_stat["count"],
-                    "success_count": query_stat["successes"],
-                    "error_count": query_stat["count"] - query_stat["successes"]
+                    "count": count,
+                    "count_error": top.error(query),
+                    "avg_processing_time": total_time / observed,
+                    "success_rate": success_rate,
+                    "success_count": round(count * success_rate),
+                    "error_count": count - round(count * success_rate)
                 })
 
             return top_queries
@@ -437,8 +559,8 @@ class QueryAnalytics:
             for compound_name, analytics in self.compound_analytics.items():
                 compounds_data.append({
                     "compound_name": compound_name,
-                    "total_mentions": analytics.total_mentions,
-                    "unique_users": len(analytics.unique_users),
+                    "total_mentions": self._top_compounds.count(compound_name),
+                    "unique_users": analytics.unique_users.count(),
                     "avg_temperature": analytics.avg_temperature,
                     "temperature_range": analytics.temperature_range,
                     "common_phases": analytics.common_phases,
@@ -468,19 +590,13 @@ class QueryAnalytics:
             List of reaction analytics
         """
         with self._lock:
-            # Find equations for reaction hashes
-            hash_to_equation = {}
-            for reaction_data in self.reaction_history:
-                if reaction_data["reaction_hash"] not in hash_to_equation:
-                    hash_to_equation[reaction_data["reaction_hash"]] = reaction_data["equation"]
-
             reactions_data = []
             for reaction_hash, analytics in self.reaction_analytics.items():
                 reactions_data.append({
-                    "equation": hash_to_equation.get(reaction_hash, "Unknown"),
+                    "equation": analytics.equation or "Unknown",
                     "reaction_type": analytics.reaction_type,
-                    "count": analytics.count,
-                    "unique_users": len(analytics.unique_users),
+                    "count": self._top_reactions.count(reaction_hash),
+                    "unique_users": analytics.unique_users.count(),
                     "avg_temperature_range": analytics.avg_temperature_range,
                     "common_compounds": analytics.common_compounds,
                     "success_rate": analytics.success_rate,
@@ -501,6 +617,7 @@ class QueryAnalytics:
                     "pattern": pattern.pattern,
                     "count": pattern.count,
                     "avg_processing_time": pattern.avg_processing_time,
+                    "p95_processing_time": pattern.latency.quantile(0.95),
                     "success_rate": pattern.success_rate,
                     "examples": pattern.examples
                 }
@@ -511,10 +628,24 @@ class QueryAnalytics:
                 "most_common": max(patterns_data.items(), key=lambda x: x[1]["count"])[0] if patterns_data else None
             }
 
+    def get_latency_quantiles(self) -> Dict[str, Optional[float]]:
+        """Processing time quantiles over all recorded queries (t-digest)."""
+        with self._lock:
+            return {
+                "p50": self.latency_digest.quantile(0.5),
+                "p90": self.latency_digest.quantile(0.9),
+                "p95": self.latency_digest.quantile(0.95),
+                "p99": self.latency_digest.quantile(0.99),
+                "max": self.latency_digest.max if self.latency_digest.count else None
+            }
+
     def get_usage_trends(self, hours: int = 24) -> Dict[str, Any]:
         """
         Get usage trends over time.
 
+        Answered from the hourly rollups; ``active_users`` is a HyperLogLog
+        estimate over the merged buckets.
+
         Args:
             hours: Time window in hours
 
@@ -522,53 +653,37 @@ class QueryAnalytics:
             Usage trend data
         """
         with self._lock:
-            cutoff_time = datetime.now() - timedelta(hours=hours)
-            recent_queries = [
-                q for q in self.query_history
-                if q["timestamp"] >= cutoff_time
-            ]
+            since = datetime.now() - timedelta(hours=hours)
+            buckets = self._rollup.items(since)
+            total_queries = sum(bucket.count for _, bucket in buckets)
 
-            if not recent_queries:
+            if total_queries == 0:
                 return {"error": "No data in specified time window"}
 
-            # Hourly aggregation
-            hourly_data = defaultdict(lambda: {"count": 0, "successes": 0, "total_time": 0})
-            user_activity = defaultdict(lambda: {"queries": 0, "successes": 0})
-
-            for query in recent_queries:
-                hour_key = query["timestamp"].strftime("%Y-%m-%d %H:00")
-                hourly_data[hour_key]["count"] += 1
-                hourly_data[hour_key]["total_time"] += query["processing_time"]
-                if query["success"]:
-                    hourly_data[hour_key]["successes"] += 1
-
-                user_id = query["user_id"]
-                user_activity[user_id]["queries"] += 1
-                if query["success"]:
-                    user_activity[user_id]["successes"] += 1
-
-            # Format hourly data
+            users = HyperLogLog(precision=8)
             hourly_trends = []
-            for hour, stats in sorted(hourly_data.items()):
+            for bucket_start, bucket in buckets:
+                users.merge(bucket.users)
+                if bucket.count == 0:
+                    continue
                 hourly_trends.append({
-                    "hour": hour,
-                    "query_count": stats["count"],
-                    "success_count": stats["successes"],
-                    "error_count": stats["count"] - stats["successes"],
-                    "success_rate": stats["successes"] / stats["count"] if stats["count"] > 0 else 0,
-                    "avg_processing_time": stats["total_time"] / stats["count"] if stats["count"] > 0 else 0
+                    "hour": bucket_label(bucket_start),
+                    "query_count": bucket.count,
+                    "success_count": bucket.successes,
+                    "error_count": bucket.count - bucket.successes,
+                    "success_rate": bucket.successes / bucket.count,
+                    "avg_processing_time": bucket.total_time / bucket.count
                 })
 
             # User activity statistics
-            active_users = len(user_activity)
-            total_user_queries = sum(stats["queries"] for stats in user_activity.values())
+            active_users = users.count()
 
             return {
                 "hourly_trends": hourly_trends,
                 "active_users": active_users,
-                "total_queries": len(recent_queries),
-                "total_user_queries": total_user_queries,
-                "avg_queries_per_user": total_user_queries / active_users if active_users > 0 else 0,
+                "total_queries": total_queries,
+                "total_user_queries": total_queries,
+                "avg_queries_per_user": total_queries / active_users if active_users > 0 else 0,
                 "time_window_hours": hours
             }
 
@@ -577,45 +692,31 @@ class QueryAnalytics:
         with self._lock:
             export_data = {
                 "export_timestamp": datetime.now().isoformat(),
-                "query_patterns": {k: asdict(v) for k, v in self.query_patterns.items()},
-                "compound_analytics": {k: asdict(v) for k, v in self.compound_analytics.items()},
-                "reaction_analytics": {k: asdict(v) for k, v in self.reaction_analytics.items()},
+                "query_patterns": self.get_pattern_analytics()["patterns"],
+                "compound_analytics": {
+                    c["compound_name"]: c for c in self.get_compound_analytics(self.top_k)
+                },
+                "reaction_analytics": self.get_reaction_analytics(self.top_k),
                 "top_queries": self.get_top_queries(50),
                 "compound_stats": self.get_compound_analytics(50),
                 "reaction_stats": self.get_reaction_analytics(30),
                 "pattern_stats": self.get_pattern_analytics(),
+                "latency_quantiles": self.get_latency_quantiles(),
                 "usage_trends_24h": self.get_usage_trends(24)
             }
 
-            # Convert sets to lists for JSON serialization
-            for compound_data in export_data["compound_analytics"].values():
-                compound_data["unique_users"] = list(compound_data["unique_users"])
-
-            for reaction_data in export_data["reaction_analytics"].values():
-                reaction_data["unique_users"] = list(reaction_data["unique_users"])
-
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+                json.dump(export_data, f, indent=2, ensure_ascii=False, default=str)
 
     def clear_old_data(self, days: int = 30) -> None:
         """Clear data older than specified number of days."""
         with self._lock:
             cutoff_time = datetime.now() - timedelta(days=days)
 
-            # Clear old query history
-            self.query_history = [
-                q for q in self.query_history
-                if q["timestamp"] >= cutoff_time
-            ]
-
-            # Clear old compound mentions
-            self.compound_mentions = [
-                m for m in self.compound_mentions
-                if m["timestamp"] >= cutoff_time
-            ]
+            # Drop expired rollup buckets
+            self._rollup.prune(cutoff_time)
 
-            # Clear old reaction history
-            self.reaction_history = [
-                r for r in self.reaction_history
-                if r["timestamp"] >= cutoff_time
-            ]
\ No newline at end of file
+            # Clear old raw records
+            for history in (self.query_history, self.compound_mentions, self.reaction_history):
+                while history and history[0]["timestamp"] < cutoff_time:
+                    history.popleft()
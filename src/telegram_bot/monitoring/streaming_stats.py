@@ -0,0 +1,15 @@
+"""
+Bounded-memory streaming summaries for monitoring.
+
+The summaries live in thermo_agents.telegram_bot.monitoring next to BotMetrics;
+this module re-exports them for QueryAnalytics.
+"""
+
+from ...thermo_agents.telegram_bot.monitoring.streaming_stats import (
+    CountMinSketch,
+    SpaceSavingTopK,
+    TDigest,
+    HyperLogLog,
+    TimeBucketedRollup,
+    bucket_label,
+)
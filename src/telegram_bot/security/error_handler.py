@@ -6,6 +6,7 @@ and user-friendly error messages for all types of system failures.
 """
 
 import logging
+import math
 import traceback
 from typing import Dict, Any, Optional, List
 from datetime import datetime
@@ -464,10 +465,27 @@ class GracefulDegradationHandler:
         }
 
     async def _handle_high_load(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle high system load."""
+        """
+        Handle high system load.
+
+        Serves a cached response when the caller has one; otherwise reports
+        the admission controller's estimated wait (``estimated_wait_s``)
+        instead of a fixed delay.
+        """
+        cached = context.get("cached_response")
+        if cached:
+            return {
+                "success": True,
+                "response": f"⚡ Система под высокой нагрузкой: показан сохраненный результат.\n\n{cached}",
+                "fallback_mode": True,
+                "delay_suggested": 0
+            }
+
+        wait = context.get("estimated_wait_s")
+        delay = max(1, math.ceil(wait)) if wait else 5
         return {
             "success": True,
-            "response": "⚡ Система под высокой нагрузкой. Запрос будет обработан с задержкой.",
+            "response": f"⚡ Система под высокой нагрузкой. Ориентировочное ожидание ~{delay} с.",
             "fallback_mode": True,
-            "delay_suggested": 5
+            "delay_suggested": delay
         }
\ No newline at end of file
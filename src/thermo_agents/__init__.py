@@ -1 +1,41 @@
-# Thermo Agents Module
+"""
+Thermo Agents Module.
+
+Основные классы доступны из корня пакета и загружаются лениво (PEP 562):
+`import thermo_agents` не импортирует pandas, scipy и pydantic-ai, они
+подгружаются при первом обращении к соответствующему классу.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+_LAZY_EXPORTS = {
+    "ThermoOrchestrator": ".orchestrator",
+    "ThermoOrchestratorConfig": ".orchestrator",
+    "ExtractedReactionParameters": ".models.extraction",
+    "ThermodynamicAgent": ".thermodynamic_agent",
+    "create_thermo_agent": ".thermodynamic_agent",
+    "SessionLogger": ".session_logger",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .models.extraction import ExtractedReactionParameters
+    from .orchestrator import ThermoOrchestrator, ThermoOrchestratorConfig
+    from .session_logger import SessionLogger
+    from .thermodynamic_agent import ThermodynamicAgent, create_thermo_agent
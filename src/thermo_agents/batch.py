@@ -0,0 +1,189 @@
+"""
+Пакетная обработка запросов (ночные расчеты сотен реакций и веществ).
+
+Вход — JSONL, каждая строка одно из:
+- {"query": "..."} или просто строка — параметры извлекает LLM;
+- {"query": "...", "params": {...}} — журнал запросов бота (QUERY_LOG_PATH),
+  LLM не вызывается;
+- словарь ExtractedReactionParameters.
+
+Задания с общими веществами объединяются в группы: внутри группы данные
+вещества загружаются и отбираются для диапазона один раз (frames и
+records_cache оркестратора). Результаты пишутся по мере готовности в JSONL
+или CSV с временем извлечения и расчета каждого запроса.
+
+Основные компоненты:
+- BatchItem / BatchResult: задание и результат
+- load_batch: чтение JSONL
+- group_jobs: разбиение заданий на группы с общими веществами
+- BatchResultWriter: потоковая запись результатов
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .models.extraction import ExtractedReactionParameters
+
+
+@dataclass
+class BatchItem:
+    """Задание пакета: запрос и/или готовые параметры."""
+
+    index: int
+    query: Optional[str] = None
+    params: Optional[ExtractedReactionParameters] = None
+    # Ошибка разбора строки входного файла
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    """Результат одного задания пакета."""
+
+    index: int
+    query: Optional[str]
+    status: str  # "ok" | "error"
+    response: str = ""
+    error: Optional[str] = None
+    params: Optional[ExtractedReactionParameters] = None
+    extraction_s: float = 0.0
+    calculation_s: float = 0.0
+
+    @property
+    def query_type(self) -> Optional[str]:
+        return self.params.query_type if self.params is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Запись для JSONL."""
+        return {
+            "index": self.index,
+            "query": self.query,
+            "query_type": self.query_type,
+            "status": self.status,
+            "error": self.error,
+            "extraction_s": round(self.extraction_s, 4),
+            "calculation_s": round(self.calculation_s, 4),
+            "params": self.params.model_dump(mode="json") if self.params else None,
+            "response": self.response,
+        }
+
+
+def load_batch(path: Path) -> List[BatchItem]:
+    """
+    Чтение заданий из JSONL.
+
+    Строки с невалидными параметрами не пропускаются, а становятся
+    заданиями с ошибкой, чтобы индексы результатов совпадали со строками.
+
+    Args:
+        path: Путь к JSONL файлу
+
+    Returns:
+        Список заданий в порядке строк (пустые строки пропускаются)
+    """
+    items = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+
+            item = BatchItem(index=len(items))
+            try:
+                record = json.loads(line)
+                if isinstance(record, str):
+                    record = {"query": record}
+                item.query = record.get("query")
+                if "params" in record or "query_type" in record:
+                    item.params = ExtractedReactionParameters.model_validate(
+                        record.get("params", record)
+                    )
+                elif not item.query:
+                    raise ValueError("нет ни query, ни params")
+            except Exception as e:
+                item.error = f"строка {line_no}: {e}"
+            items.append(item)
+    return items
+
+
+def group_jobs(
+    jobs: Sequence[ExtractedReactionParameters], chunk_size: int
+) -> List[List[int]]:
+    """
+    Разбиение заданий на группы с общими веществами.
+
+    Задания сортируются по составу, где вещества упорядочены по частоте в
+    пакете (самые частые первыми): запросы с общими частыми веществами
+    оказываются рядом и попадают в одну группу.
+
+    Args:
+        jobs: Параметры заданий
+        chunk_size: Максимальный размер группы
+
+    Returns:
+        Группы индексов заданий
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size должен быть >= 1")
+
+    frequency = Counter(formula for params in jobs for formula in set(params.all_compounds))
+
+    def composition_key(index: int):
+        compounds = sorted(
+            set(jobs[index].all_compounds), key=lambda f: (-frequency[f], f)
+        )
+        return ([(-frequency[f], f) for f in compounds], index)
+
+    order = sorted(range(len(jobs)), key=composition_key)
+    return [order[i:i + chunk_size] for i in range(0, len(order), chunk_size)]
+
+
+class BatchResultWriter:
+    """
+    Потоковая запись результатов: JSONL или CSV (по расширению файла).
+
+    Каждая запись сбрасывается на диск сразу, поэтому при прерывании
+    пакета готовые результаты сохраняются.
+    """
+
+    CSV_FIELDS = [
+        "index", "query", "query_type", "status", "error",
+        "extraction_s", "calculation_s", "response",
+    ]
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.is_csv = self.path.suffix.lower() == ".csv"
+        self.count = 0
+        self._file = None
+        self._csv_writer = None
+
+    def __enter__(self) -> "BatchResultWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8", newline="")
+        if self.is_csv:
+            self._csv_writer = csv.DictWriter(
+                self._file, fieldnames=self.CSV_FIELDS, extrasaction="ignore"
+            )
+            self._csv_writer.writeheader()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._file.close()
+        self._file = None
+
+    def write(self, result: BatchResult) -> None:
+        """Запись одного результата."""
+        record = result.to_dict()
+        if self._csv_writer is not None:
+            self._csv_writer.writerow(record)
+        else:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.count += 1
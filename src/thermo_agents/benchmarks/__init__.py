@@ -0,0 +1,46 @@
+"""
+Бенчмарки детерминированного пути расчета.
+
+harness — замеры, JSON-базовые линии, статистическое сравнение и отчет;
+cases — фикстурная БД и стандартные сценарии. Запуск: scripts/run_benchmarks.py.
+
+synthetic_db — синтетическая таблица compounds масштаба 1x–50x рабочей БД,
+search_load — задержки стадий поиска на ней (scripts/generate_synthetic_db.py,
+scripts/search_load_test.py).
+
+admission_load — генератор нагрузки для контроля допуска запросов
+(scripts/admission_load_test.py).
+
+session_load — память и задержки хранилища сессий бота на 100 000
+пользователей (scripts/session_store_benchmark.py).
+"""
+
+from .harness import (
+    REFERENCE_CASE,
+    BenchmarkCase,
+    BenchmarkResult,
+    BenchmarkRun,
+    Comparison,
+    compare_runs,
+    format_report,
+    load_run,
+    measure,
+    run_benchmarks,
+    save_run,
+    speed_factor,
+)
+
+__all__ = [
+    "REFERENCE_CASE",
+    "BenchmarkCase",
+    "BenchmarkResult",
+    "BenchmarkRun",
+    "Comparison",
+    "compare_runs",
+    "format_report",
+    "load_run",
+    "measure",
+    "run_benchmarks",
+    "save_run",
+    "speed_factor",
+]
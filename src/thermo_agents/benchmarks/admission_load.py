@@ -0,0 +1,223 @@
+"""
+Локальный генератор нагрузки для контроля допуска (utils.admission).
+
+Открытый поток запросов (пуассоновские поступления) идет в моделируемый
+сервис с ограниченной производительностью: capacity запросов обслуживаются
+за base_service_s, при большем числе одновременных запросов время каждого
+растет пропорционально (общий ресурс — LLM провайдер, CPU расчета). Часть
+трафика отправляет один активный пользователь, остальное делят прочие.
+
+Прогон состоит из прогрева на половине номинальной нагрузки (контроллер
+узнает обычное время обслуживания) и замера на load_factor × номинальной.
+В режиме unbounded запросы идут в сервис напрямую, в режиме admission —
+через AdmissionController; сравниваются хвост задержки выполненных
+запросов, доля выполненных и задержки активного и прочих пользователей.
+
+Запуск: scripts/admission_load_test.py.
+"""
+
+import asyncio
+import random
+import statistics
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..utils.admission import AdmissionController, AdmissionRejected
+from ..utils.resilience import Deadline
+from .search_load import _percentile
+
+MODES = ("unbounded", "admission")
+
+
+@dataclass
+class LoadProfile:
+    """Параметры прогона."""
+
+    load_factor: float = 5.0
+    duration_s: float = 3.0
+    warmup_s: float = 1.0
+    users: int = 20
+    heavy_share: float = 0.5  # доля запросов одного активного пользователя
+    timeout_s: float = 1.0
+    capacity: int = 4
+    base_service_s: float = 0.02
+    seed: int = 0
+
+    @property
+    def nominal_rps(self) -> float:
+        """Производительность сервиса без очереди (запросов в секунду)."""
+        return self.capacity / self.base_service_s
+
+
+@dataclass
+class AdmissionLoadStats:
+    """Результат прогона одного режима."""
+
+    mode: str
+    load_factor: float
+    offered: int
+    completed: int
+    rejected: int
+    timed_out: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    response_p99_ms: float
+    heavy_p95_ms: float
+    light_p95_ms: float
+    light_completed_share: float
+    max_in_flight: int
+    # Предел контроллера к концу поступлений (до разбора очереди)
+    limit_under_load: Optional[int] = None
+
+    @property
+    def goodput_share(self) -> float:
+        """Доля выполненных запросов."""
+        return self.completed / self.offered if self.offered else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class SimulatedService:
+    """
+    Сервис с ограниченной производительностью: время запроса растет
+    пропорционально превышению capacity одновременных запросов.
+    """
+
+    def __init__(self, capacity: int, base_service_s: float):
+        self.capacity = capacity
+        self.base_service_s = base_service_s
+        self.active = 0
+        self.max_active = 0
+
+    async def handle(self) -> None:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(
+                self.base_service_s * max(1.0, self.active / self.capacity)
+            )
+        finally:
+            self.active -= 1
+
+
+def _ms(values: Sequence[float], q: float) -> float:
+    return _percentile(sorted(values), q) * 1e3
+
+
+async def run_admission_load(
+    mode: str,
+    profile: Optional[LoadProfile] = None,
+    controller: Optional[AdmissionController] = None,
+) -> AdmissionLoadStats:
+    """
+    Прогон нагрузки в одном режиме.
+
+    Args:
+        mode: unbounded | admission
+        profile: Параметры прогона
+        controller: Контроллер для режима admission (по умолчанию с пределом
+            до 4 × capacity, целевым временем 2 × base_service_s, очередью
+            16 × capacity и двумя местами в очереди на пользователя)
+    """
+    if mode not in MODES:
+        raise ValueError(f"Неизвестный режим: {mode}")
+    profile = profile or LoadProfile()
+    if mode == "admission" and controller is None:
+        controller = AdmissionController(
+            max_concurrency=profile.capacity * 4,
+            max_queue=profile.capacity * 16,
+            max_queue_per_user=2,
+            initial_service_s=profile.base_service_s,
+            target_service_s=profile.base_service_s * 2,
+            name="load",
+        )
+    elif mode == "unbounded":
+        controller = None
+
+    loop = asyncio.get_running_loop()
+    rng = random.Random(profile.seed)
+    service = SimulatedService(profile.capacity, profile.base_service_s)
+    records: List[Tuple[int, str, float]] = []
+
+    async def request(user: int, measured: bool) -> None:
+        start = loop.time()
+        deadline = Deadline.after(profile.timeout_s, clock=loop.time)
+        outcome = "ok"
+        try:
+            if controller is None:
+                await asyncio.wait_for(service.handle(), deadline.remaining())
+            else:
+                async with controller.slot(user, deadline=deadline):
+                    await asyncio.wait_for(service.handle(), deadline.remaining())
+        except AdmissionRejected as e:
+            outcome = "timeout" if e.reason == "expired" else "rejected"
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+        if measured:
+            records.append((user, outcome, loop.time() - start))
+
+    tasks = []
+    phases = ((0.5, profile.warmup_s, False), (profile.load_factor, profile.duration_s, True))
+    for load_factor, phase_s, measured in phases:
+        rate = load_factor * profile.nominal_rps
+        if phase_s <= 0 or rate <= 0:
+            continue
+        end = loop.time() + phase_s
+        next_arrival = loop.time()
+        while next_arrival < end:
+            # Запросы по расписанию поступлений: отставание догоняется без сна
+            delay = next_arrival - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            user = 0 if rng.random() < profile.heavy_share else rng.randint(1, profile.users - 1)
+            tasks.append(asyncio.ensure_future(request(user, measured)))
+            next_arrival += rng.expovariate(rate)
+    limit_under_load = controller.concurrency_limit if controller is not None else None
+    await asyncio.gather(*tasks)
+
+    ok = [latency for _, outcome, latency in records if outcome == "ok"]
+    heavy = [latency for user, outcome, latency in records if outcome == "ok" and user == 0]
+    light = [latency for user, outcome, latency in records if outcome == "ok" and user != 0]
+    light_offered = sum(user != 0 for user, _, _ in records)
+
+    return AdmissionLoadStats(
+        mode=mode,
+        load_factor=profile.load_factor,
+        offered=len(records),
+        completed=len(ok),
+        rejected=sum(outcome == "rejected" for _, outcome, _ in records),
+        timed_out=sum(outcome == "timeout" for _, outcome, _ in records),
+        p50_ms=statistics.median(ok) * 1e3 if ok else 0.0,
+        p95_ms=_ms(ok, 0.95),
+        p99_ms=_ms(ok, 0.99),
+        response_p99_ms=_ms([latency for _, _, latency in records], 0.99),
+        heavy_p95_ms=_ms(heavy, 0.95),
+        light_p95_ms=_ms(light, 0.95),
+        light_completed_share=len(light) / light_offered if light_offered else 0.0,
+        max_in_flight=service.max_active,
+        limit_under_load=limit_under_load,
+    )
+
+
+def format_admission_report(results: Sequence[AdmissionLoadStats], profile: LoadProfile) -> str:
+    """Markdown-отчет: задержки и исходы запросов по режимам и нагрузкам."""
+    lines = [
+        f"Service: capacity {profile.capacity}, base {profile.base_service_s * 1e3:g} ms "
+        f"({profile.nominal_rps:g} rps nominal), timeout {profile.timeout_s:g} s, "
+        f"heavy user share {profile.heavy_share:.0%}",
+        "",
+        "| Mode | Load | Offered | Completed | Rejected | Timed out | p50, ms | p95, ms | p99, ms "
+        "| Response p99, ms | Heavy p95, ms | Light p95, ms | Light completed | Max in flight | Limit |",
+        "|---|---|---|---|---|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for s in results:
+        limit = "-" if s.limit_under_load is None else str(s.limit_under_load)
+        lines.append(
+            f"| {s.mode} | {s.load_factor:g}x | {s.offered} | {s.completed} | {s.rejected} | "
+            f"{s.timed_out} | {s.p50_ms:.1f} | {s.p95_ms:.1f} | {s.p99_ms:.1f} | "
+            f"{s.response_p99_ms:.1f} | {s.heavy_p95_ms:.1f} | {s.light_p95_ms:.1f} | "
+            f"{s.light_completed_share:.0%} | {s.max_in_flight} | {limit} |"
+        )
+    return "\n".join(lines) + "\n"
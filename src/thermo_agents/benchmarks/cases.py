@@ -0,0 +1,322 @@
+"""
+Сценарии бенчмарка и фикстурная база данных.
+
+Фикстура — подмножество таблицы compounds в виде SQL-дампа
+(data/benchmarks/thermo_subset.sql): записи веществ из YAML-кэша с
+исходными rowid БД. Дамп хранится в репозитории, база собирается из него
+во временном каталоге, поэтому прогоны воспроизводимы без thermo_data.db.
+Пересборка дампа: dump_fixture_sql() (scripts/run_benchmarks.py --rebuild-fixture).
+
+Сценарии покрывают детерминированный путь расчета: ThermodynamicCalculator,
+ThermodynamicEngine, RecordRangeBuilder, OptimalRecordSelector, ReactionEngine,
+поиск в SQL (CompoundSearcher, CompoundDataLoader), форматтеры и полный
+ThermoOrchestrator.calculate без LLM.
+"""
+
+import logging
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+
+from ..models.extraction import ExtractedReactionParameters
+from ..models.search import DatabaseRecord
+from ..storage.static_data_manager import StaticDataManager
+from .harness import BenchmarkCase
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+STATIC_DATA_DIR = PROJECT_ROOT / "data" / "static_compounds"
+FIXTURE_SQL = PROJECT_ROOT / "data" / "benchmarks" / "thermo_subset.sql"
+BASELINE_PATH = PROJECT_ROOT / "data" / "benchmarks" / "baseline.json"
+
+# Схема таблицы compounds рабочей БД (столбцы, которые читает поиск)
+COMPOUNDS_COLUMNS = [
+    ("Formula", "TEXT"),
+    ("FirstName", "TEXT"),
+    ("SecondName", "TEXT"),
+    ("Phase", "TEXT"),
+    ("Tmin", "REAL"),
+    ("Tmax", "REAL"),
+    ("H298", "REAL"),
+    ("S298", "REAL"),
+    ("f1", "REAL"),
+    ("f2", "REAL"),
+    ("f3", "REAL"),
+    ("f4", "REAL"),
+    ("f5", "REAL"),
+    ("f6", "REAL"),
+    ("MeltingPoint", "REAL"),
+    ("BoilingPoint", "REAL"),
+    ("ReliabilityClass", "INTEGER"),
+    ("MolecularWeight", "REAL"),
+]
+
+BOUDOUARD = ExtractedReactionParameters(
+    query_type="reaction_calculation",
+    balanced_equation="C + CO2 = 2CO",
+    all_compounds=["C", "CO2", "CO"],
+    reactants=["C", "CO2"],
+    products=["CO"],
+    compound_types={"C": True, "CO2": False, "CO": False},
+    compound_names={"C": ["Carbon"], "CO2": ["Carbon dioxide"], "CO": ["Carbon monoxide"]},
+    temperature_range_k=(298, 2500),
+    extraction_confidence=0.95,
+)
+
+WATER = ExtractedReactionParameters(
+    query_type="compound_data",
+    balanced_equation="N/A",
+    all_compounds=["H2O"],
+    reactants=[],
+    products=[],
+    compound_names={"H2O": ["Water"]},
+    temperature_range_k=(300, 1500),
+    temperature_step_k=100,
+    extraction_confidence=0.9,
+)
+
+
+def _sql_literal(value) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return repr(value)
+
+
+def dump_fixture_sql(
+    static_dir: Union[str, Path] = STATIC_DATA_DIR,
+    output: Union[str, Path] = FIXTURE_SQL,
+) -> int:
+    """
+    Пересборка SQL-дампа фикстуры из YAML-кэша.
+
+    Записи YAML — копии строк рабочей БД (db_rowid); H298 переводится
+    обратно в кДж/моль, как в БД.
+
+    Args:
+        static_dir: Каталог YAML-файлов веществ
+        output: Путь к SQL-дампу
+
+    Returns:
+        Число записей в дампе
+    """
+    manager = StaticDataManager(Path(static_dir))
+    columns = ", ".join(["rowid"] + [name for name, _ in COMPOUNDS_COLUMNS])
+    lines = [
+        "-- Подмножество таблицы compounds для бенчмарков (см. thermo_agents.benchmarks.cases)",
+        "CREATE TABLE compounds ("
+        + ", ".join(f"{name} {kind}" for name, kind in COMPOUNDS_COLUMNS)
+        + ");",
+    ]
+
+    used_rowids = set()
+    next_rowid = -1
+    count = 0
+    for formula in sorted(manager.list_available_compounds()):
+        data = manager.load_compound(formula)
+        for record in data.phases:
+            rowid = record.db_rowid
+            if rowid is None or rowid in used_rowids:
+                rowid = next_rowid
+                next_rowid -= 1
+            used_rowids.add(rowid)
+            values = [
+                rowid, data.formula, record.first_name or "", "", record.phase,
+                record.tmin, record.tmax, round(record.h298 / 1000, 6), record.s298,
+                record.f1, record.f2, record.f3, record.f4, record.f5, record.f6,
+                record.tmelt, record.tboil, record.reliability_class,
+                record.molecular_weight or 0.0,
+            ]
+            lines.append(
+                f"INSERT INTO compounds ({columns}) VALUES ("
+                + ", ".join(_sql_literal(value) for value in values)
+                + ");"
+            )
+            count += 1
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return count
+
+
+def build_fixture_db(
+    db_path: Union[str, Path],
+    sql_path: Union[str, Path] = FIXTURE_SQL,
+) -> Path:
+    """Создание SQLite базы из SQL-дампа фикстуры."""
+    db_path = Path(db_path)
+    if db_path.exists():
+        db_path.unlink()
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(Path(sql_path).read_text(encoding="utf-8"))
+    return db_path
+
+
+def _h2o_gas_record() -> DatabaseRecord:
+    """Запись H2O(g) для калькулятора (как в tests/performance)."""
+    return DatabaseRecord(
+        id=1, formula="H2O", first_name="Water", phase="g",
+        h298=-241.826, s298=188.838,
+        f1=30.092, f2=6.832, f3=6.793, f4=-2.534, f5=0.082, f6=-0.028,
+        tmin=298.15, tmax=1000.0, tmelt=273.15, tboil=373.15, reliability_class=1,
+    )
+
+
+def default_cases(workdir: Optional[Union[str, Path]] = None) -> List[BenchmarkCase]:
+    """
+    Стандартный набор сценариев.
+
+    Args:
+        workdir: Каталог для фикстурной БД (по умолчанию — временный)
+
+    Returns:
+        Подготовленные сценарии; данные загружены, замеряется только расчет
+    """
+    from ..calculations.thermodynamic_calculator import ThermodynamicCalculator
+    from ..orchestrator import ThermoOrchestrator, ThermoOrchestratorConfig
+    from ..search.compound_searcher import CompoundSearcher
+    from ..search.database_connector import DatabaseConnector
+    from ..search.sql_builder import SQLBuilder
+    from ..selection.optimal_record_selector import OptimalRecordSelector
+
+    logger = logging.getLogger("thermo_agents.benchmarks")
+    workdir = Path(workdir or tempfile.mkdtemp(prefix="thermo_bench_"))
+    db_path = build_fixture_db(workdir / "thermo_subset.db")
+
+    orchestrator = ThermoOrchestrator(
+        ThermoOrchestratorConfig(
+            db_path=db_path,
+            static_data_dir=STATIC_DATA_DIR,
+            logger=logger,
+            prefetch_enabled=False,
+        )
+    )
+    loader = orchestrator.compound_loader
+    range_builder = orchestrator.range_builder
+    phase_detector = orchestrator.phase_detector
+    engine = orchestrator.thermo_engine
+    reaction_engine = orchestrator.reaction_engine
+
+    # Поиск в БД без YAML-кэша: пустой каталог статических данных
+    empty_static = workdir / "no_static"
+    empty_static.mkdir(exist_ok=True)
+    db_only_loader = type(loader)(
+        orchestrator.db_connector, StaticDataManager(empty_static), logger
+    )
+    searcher = CompoundSearcher(SQLBuilder(), DatabaseConnector(db_path))
+
+    # Подготовленные данные
+    h2o_df, _, _ = loader.get_raw_compound_data_with_metadata("H2O", ["Water"])
+    melting, boiling = phase_detector.get_most_common_melting_boiling_points(h2o_df)
+    h2o_records = range_builder.get_compound_records_for_range(
+        df=h2o_df, t_range=[298, 2500], melting=melting, boiling=boiling,
+        tolerance=1.0, is_elemental=False,
+    )
+    gas_record = next(rec for rec in h2o_records if rec["Phase"] == "g")
+    temperatures = np.arange(300.0, 2500.0, 10.0)
+
+    frames = {}
+    reaction_range = list(orchestrator.REACTION_TEMPERATURE_RANGE)
+    df_result, metadata = reaction_engine.calculate_reaction_with_metadata(
+        BOUDOUARD, reaction_range, frames=frames
+    )
+    records_list = [dict(rec) for rec in h2o_records]
+
+    calculator = ThermodynamicCalculator()
+    calc_record = _h2o_gas_record()
+    calc_temperatures = [300.0 + 10.0 * i for i in range(70)]
+    selector = OptimalRecordSelector()
+
+    return [
+        BenchmarkCase(
+            "calculator.properties",
+            lambda: [calculator.calculate_properties(calc_record, T) for T in calc_temperatures],
+            "ThermodynamicCalculator.calculate_properties, 70 температур",
+        ),
+        BenchmarkCase(
+            "calculator.generate_table",
+            lambda: calculator.generate_table(calc_record, 300, 1000, 25),
+            "ThermodynamicCalculator.generate_table 300-1000K, шаг 25K",
+        ),
+        BenchmarkCase(
+            "engine.properties",
+            lambda: [engine.calculate_properties(gas_record, T) for T in temperatures[::10]],
+            "ThermodynamicEngine.calculate_properties, 22 температуры",
+        ),
+        BenchmarkCase(
+            "engine.properties_array",
+            lambda: engine.calculate_properties_array(gas_record, temperatures),
+            "ThermodynamicEngine.calculate_properties_array, 220 температур",
+        ),
+        BenchmarkCase(
+            "range_builder.records_for_range",
+            lambda: range_builder.get_compound_records_for_range(
+                df=h2o_df, t_range=[298, 2500], melting=melting, boiling=boiling,
+                tolerance=1.0, is_elemental=False,
+            ),
+            "RecordRangeBuilder: отбор записей H2O 298-2500K",
+        ),
+        BenchmarkCase(
+            "selector.optimize",
+            lambda: selector.optimize_selected_records(
+                h2o_records, (298, 2500), h2o_df,
+                melting=melting, boiling=boiling, is_elemental=False,
+            ),
+            "OptimalRecordSelector.optimize_selected_records для H2O",
+        ),
+        BenchmarkCase(
+            "reaction_engine.reaction",
+            lambda: reaction_engine.calculate_reaction_with_metadata(
+                BOUDOUARD, reaction_range, frames=frames
+            ),
+            "ReactionEngine: C + CO2 = 2CO, 298-2500K (данные загружены)",
+        ),
+        BenchmarkCase(
+            "search.compound_searcher",
+            lambda: searcher.search_compound("CO2", temperature_range=(298, 2500)),
+            "CompoundSearcher.search_compound по фикстурной БД",
+        ),
+        BenchmarkCase(
+            "search.loader_db",
+            lambda: db_only_loader.get_raw_compound_data_with_metadata(
+                "CO2", ["Carbon dioxide"]
+            ),
+            "CompoundDataLoader: двухстадийный поиск в БД без YAML",
+        ),
+        BenchmarkCase(
+            "search.loader_yaml",
+            lambda: loader.get_raw_compound_data_with_metadata("H2O", ["Water"]),
+            "CompoundDataLoader: вещество из YAML-кэша",
+        ),
+        BenchmarkCase(
+            "formatting.reaction",
+            lambda: orchestrator.unified_formatter.format_reaction_result(
+                BOUDOUARD, df_result, metadata
+            ),
+            "UnifiedReactionFormatter.format_reaction_result",
+        ),
+        BenchmarkCase(
+            "formatting.compound_table",
+            lambda: orchestrator.compound_info_formatter.format_compound_thermodynamic_table(
+                formula="H2O", records_used=records_list,
+                temperature_range_k=WATER.temperature_range_k,
+                temperature_step_k=WATER.temperature_step_k,
+                compound_names=["Water"],
+            ),
+            "CompoundInfoFormatter.format_compound_thermodynamic_table",
+        ),
+        BenchmarkCase(
+            "orchestrator.reaction",
+            lambda: orchestrator.calculate(BOUDOUARD),
+            "ThermoOrchestrator.calculate: реакция целиком (без LLM)",
+        ),
+        BenchmarkCase(
+            "orchestrator.compound",
+            lambda: orchestrator.calculate(WATER),
+            "ThermoOrchestrator.calculate: свойства вещества (без LLM)",
+        ),
+    ]
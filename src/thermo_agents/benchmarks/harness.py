@@ -0,0 +1,408 @@
+"""
+Измерение времени, JSON-базовые линии и статистическое сравнение прогонов.
+
+Каждый сценарий (BenchmarkCase) — вызываемый объект без аргументов,
+подготовленный заранее (загрузка данных не входит в замер). Число вызовов
+в одном замере подбирается так, чтобы замер длился не меньше min_sample_s;
+в результат записывается время одного вызова для каждого замера.
+
+Сравнение с базовой линией: сценарий считается замедлившимся, если
+медиана выросла больше чем на threshold и различие значимо по
+одностороннему критерию Манна — Уитни (p < alpha). Оба условия нужны,
+чтобы шум на общих CI-машинах не давал ложных срабатываний. Текущие замеры
+предварительно приводятся к скорости машины базовой линии по эталонной
+нагрузке, которая замеряется в каждом прогоне.
+"""
+
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+RESULTS_FORMAT_VERSION = 1
+
+# Сценарий эталонной нагрузки (нормировка скорости машины)
+REFERENCE_CASE = "_reference"
+
+
+@dataclass
+class BenchmarkCase:
+    """Сценарий бенчмарка."""
+
+    name: str  # "<группа>.<сценарий>", например "search.compound_searcher"
+    func: Callable[[], object]
+    description: str = ""
+
+    @property
+    def group(self) -> str:
+        return self.name.split(".", 1)[0]
+
+
+@dataclass
+class BenchmarkResult:
+    """Замеры одного сценария (секунды на вызов)."""
+
+    name: str
+    samples: List[float]
+    number: int  # Вызовов в одном замере
+    description: str = ""
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.samples)
+
+    @property
+    def stdev(self) -> float:
+        return statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+
+    @property
+    def iqr(self) -> float:
+        if len(self.samples) < 4:
+            return max(self.samples) - min(self.samples)
+        q1, _, q3 = statistics.quantiles(self.samples, n=4)
+        return q3 - q1
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data.update(median=self.median, mean=self.mean, stdev=self.stdev, iqr=self.iqr)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BenchmarkResult":
+        return cls(
+            name=data["name"],
+            samples=list(data["samples"]),
+            number=data.get("number", 1),
+            description=data.get("description", ""),
+        )
+
+
+@dataclass
+class Comparison:
+    """Сравнение сценария с базовой линией."""
+
+    name: str
+    status: str  # regression | improvement | unchanged | new | missing
+    baseline_median: Optional[float] = None
+    current_median: Optional[float] = None
+    ratio: Optional[float] = None  # current / baseline
+    p_value: Optional[float] = None
+
+
+@dataclass
+class BenchmarkRun:
+    """Результаты прогона с описанием окружения."""
+
+    results: Dict[str, BenchmarkResult]
+    environment: Dict[str, str] = field(default_factory=dict)
+
+
+def environment_info() -> Dict[str, str]:
+    """Версии интерпретатора и основных зависимостей для отчета."""
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+    }
+    for module in ("numpy", "pandas", "scipy"):
+        if module in sys.modules:
+            info[module] = getattr(sys.modules[module], "__version__", "?")
+    return info
+
+
+def _calibrate(func: Callable[[], object], min_sample_s: float, clock: Callable[[], float]) -> int:
+    """Число вызовов, при котором замер длится не меньше min_sample_s."""
+    number = 1
+    while True:
+        start = clock()
+        for _ in range(number):
+            func()
+        if clock() - start >= min_sample_s or number >= 1 << 16:
+            return number
+        number *= 2
+
+
+def _sample(func: Callable[[], object], number: int, clock: Callable[[], float]) -> float:
+    start = clock()
+    for _ in range(number):
+        func()
+    return (clock() - start) / number
+
+
+def measure(
+    case: BenchmarkCase,
+    repeat: int = 15,
+    warmup: int = 2,
+    min_sample_s: float = 0.005,
+    clock: Callable[[], float] = time.perf_counter,
+) -> BenchmarkResult:
+    """
+    Замер одного сценария.
+
+    Args:
+        case: Сценарий
+        repeat: Число замеров
+        warmup: Прогревочные вызовы (не учитываются)
+        min_sample_s: Минимальная длительность замера (подбор числа вызовов)
+        clock: Источник времени
+
+    Returns:
+        BenchmarkResult со временем одного вызова в каждом замере
+    """
+    for _ in range(warmup):
+        case.func()
+    number = _calibrate(case.func, min_sample_s, clock)
+    samples = [_sample(case.func, number, clock) for _ in range(repeat)]
+    return BenchmarkResult(case.name, samples, number, case.description)
+
+
+def reference_workload() -> float:
+    """
+    Эталонная нагрузка (чистый Python и numpy) для нормировки скорости машины.
+
+    Ее время в прогоне и в базовой линии дает поправочный множитель: прогоны
+    на более медленной или загруженной машине сравниваются корректно.
+    """
+    import numpy as np
+
+    total = 0.0
+    for i in range(2000):
+        total += (i % 7) * 0.5
+    values = np.linspace(300.0, 2500.0, 2000)
+    total += float(np.sum(values ** 2 / 1e6 + 1e5 / values ** 2))
+    return total
+
+
+def run_benchmarks(
+    cases: Iterable[BenchmarkCase],
+    repeat: int = 15,
+    warmup: int = 2,
+    min_sample_s: float = 0.005,
+    pattern: Optional[str] = None,
+    progress: Optional[Callable[[BenchmarkResult], None]] = None,
+    clock: Callable[[], float] = time.perf_counter,
+) -> BenchmarkRun:
+    """
+    Прогон сценариев.
+
+    Замеры чередуются по кругу (по одному замеру каждого сценария за раунд),
+    поэтому медленные колебания нагрузки машины распределяются по всем
+    сценариям поровну, а не попадают в один из них. Вместе со сценариями
+    замеряется эталонная нагрузка (REFERENCE_CASE).
+
+    Args:
+        cases: Сценарии
+        repeat: Число замеров на сценарий
+        warmup: Прогревочные вызовы
+        min_sample_s: Минимальная длительность замера
+        pattern: Подстрока имени для отбора сценариев
+        progress: Обратный вызов после каждого сценария
+        clock: Источник времени
+
+    Returns:
+        BenchmarkRun с результатами и описанием окружения
+    """
+    selected = [case for case in cases if not pattern or pattern in case.name]
+    selected.append(BenchmarkCase(REFERENCE_CASE, reference_workload, "Эталонная нагрузка"))
+
+    numbers = []
+    for case in selected:
+        for _ in range(warmup):
+            case.func()
+        numbers.append(_calibrate(case.func, min_sample_s, clock))
+
+    samples: List[List[float]] = [[] for _ in selected]
+    for _ in range(repeat):
+        for case, number, case_samples in zip(selected, numbers, samples):
+            case_samples.append(_sample(case.func, number, clock))
+
+    results = {}
+    for case, number, case_samples in zip(selected, numbers, samples):
+        result = BenchmarkResult(case.name, case_samples, number, case.description)
+        results[case.name] = result
+        if progress:
+            progress(result)
+    return BenchmarkRun(results, environment_info())
+
+
+def save_run(run: BenchmarkRun, path: Union[str, Path]) -> None:
+    """Сохранение прогона (или базовой линии) в JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "version": RESULTS_FORMAT_VERSION,
+        "environment": run.environment,
+        "results": {name: result.to_dict() for name, result in sorted(run.results.items())},
+    }
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def load_run(path: Union[str, Path]) -> BenchmarkRun:
+    """Загрузка прогона из JSON."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if data.get("version") != RESULTS_FORMAT_VERSION:
+        raise ValueError(f"Неподдерживаемая версия файла результатов: {data.get('version')}")
+    results = {
+        name: BenchmarkResult.from_dict(result) for name, result in data["results"].items()
+    }
+    return BenchmarkRun(results, data.get("environment", {}))
+
+
+def _mann_whitney_p(current: List[float], baseline: List[float], alternative: str) -> float:
+    """Односторонний p-value критерия Манна — Уитни."""
+    from scipy.stats import mannwhitneyu
+
+    if len(current) < 2 or len(baseline) < 2:
+        return 1.0
+    return float(mannwhitneyu(current, baseline, alternative=alternative).pvalue)
+
+
+def speed_factor(current: BenchmarkRun, baseline: BenchmarkRun) -> Optional[float]:
+    """
+    Поправка на скорость машины: медиана эталонной нагрузки в базовой линии,
+    деленная на медиану в текущем прогоне (None, если эталона нет).
+    """
+    now = current.results.get(REFERENCE_CASE)
+    base = baseline.results.get(REFERENCE_CASE)
+    if now is None or base is None or now.median <= 0:
+        return None
+    return base.median / now.median
+
+
+def compare_runs(
+    current: BenchmarkRun,
+    baseline: BenchmarkRun,
+    threshold: float = 0.25,
+    alpha: float = 0.01,
+    normalize: bool = True,
+) -> List[Comparison]:
+    """
+    Сравнение прогона с базовой линией.
+
+    Args:
+        current: Текущий прогон
+        baseline: Базовая линия
+        threshold: Допустимое относительное изменение медианы
+        alpha: Уровень значимости
+        normalize: Приводить текущие замеры к скорости машины базовой линии
+            (по эталонной нагрузке, см. speed_factor)
+
+    Returns:
+        Сравнения по всем сценариям обоих прогонов (кроме эталона)
+    """
+    factor = speed_factor(current, baseline) if normalize else None
+    factor = factor or 1.0
+
+    comparisons = []
+    for name in sorted((set(current.results) | set(baseline.results)) - {REFERENCE_CASE}):
+        now = current.results.get(name)
+        base = baseline.results.get(name)
+        if base is None:
+            comparisons.append(Comparison(name, "new", current_median=now.median * factor))
+            continue
+        if now is None:
+            comparisons.append(Comparison(name, "missing", baseline_median=base.median))
+            continue
+
+        samples = [sample * factor for sample in now.samples]
+        median = statistics.median(samples)
+        ratio = median / base.median if base.median > 0 else float("inf")
+        status, p_value = "unchanged", None
+        if ratio > 1.0 + threshold:
+            p_value = _mann_whitney_p(samples, base.samples, "greater")
+            if p_value < alpha:
+                status = "regression"
+        elif ratio < 1.0 / (1.0 + threshold):
+            p_value = _mann_whitney_p(samples, base.samples, "less")
+            if p_value < alpha:
+                status = "improvement"
+
+        comparisons.append(Comparison(name, status, base.median, median, ratio, p_value))
+    return comparisons
+
+
+def _format_time(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "—"
+    if seconds >= 1.0:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} µs"
+
+
+_STATUS_MARKS = {
+    "regression": "❌ regression",
+    "improvement": "✅ improvement",
+    "unchanged": "unchanged",
+    "new": "new",
+    "missing": "missing",
+}
+
+
+def format_report(
+    run: BenchmarkRun,
+    comparisons: Optional[List[Comparison]] = None,
+    baseline: Optional[BenchmarkRun] = None,
+) -> str:
+    """
+    Markdown-отчет о прогоне (и сравнении с базовой линией, если задано).
+
+    Args:
+        run: Текущий прогон
+        comparisons: Результат compare_runs
+        baseline: Базовая линия (для описания окружения)
+
+    Returns:
+        Текст отчета
+    """
+    lines = ["# Benchmark report", ""]
+    env = ", ".join(f"{key} {value}" for key, value in run.environment.items())
+    lines.append(f"Environment: {env}")
+    if baseline is not None and baseline.environment:
+        base_env = ", ".join(f"{key} {value}" for key, value in baseline.environment.items())
+        lines.append(f"Baseline: {base_env}")
+    factor = speed_factor(run, baseline) if baseline is not None else None
+    if comparisons is not None and factor is not None:
+        lines.append(
+            f"Machine speed factor: {factor:.2f} (current timings are scaled by it)"
+        )
+    lines.append("")
+
+    if comparisons is None:
+        lines.append("| Case | Median | IQR | Min | Samples × calls |")
+        lines.append("|---|---:|---:|---:|---:|")
+        for name, result in sorted(run.results.items()):
+            lines.append(
+                f"| {name} | {_format_time(result.median)} | {_format_time(result.iqr)} "
+                f"| {_format_time(min(result.samples))} | {len(result.samples)} × {result.number} |"
+            )
+        return "\n".join(lines) + "\n"
+
+    lines.append("| Case | Baseline | Current | Ratio | p | Status |")
+    lines.append("|---|---:|---:|---:|---:|---|")
+    for comparison in comparisons:
+        ratio = f"{comparison.ratio:.2f}×" if comparison.ratio is not None else "—"
+        p_value = f"{comparison.p_value:.3g}" if comparison.p_value is not None else "—"
+        lines.append(
+            f"| {comparison.name} | {_format_time(comparison.baseline_median)} "
+            f"| {_format_time(comparison.current_median)} | {ratio} | {p_value} "
+            f"| {_STATUS_MARKS[comparison.status]} |"
+        )
+
+    counts = {}
+    for comparison in comparisons:
+        counts[comparison.status] = counts.get(comparison.status, 0) + 1
+    lines.append("")
+    lines.append("Summary: " + ", ".join(f"{status}: {count}" for status, count in sorted(counts.items())))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,298 @@
+"""
+Нагрузочный прогон поискового слоя на синтетических БД разного масштаба.
+
+Для каждой БД (synthetic_db) измеряется задержка отдельных стадий поиска
+на одной и той же выборке запросов: построение SQL, выполнение запроса
+SQLBuilder, CompoundSearcher.search_compound, стадии 1 и 2
+CompoundDataLoader (LIKE по Formula) и, по выбору, индексы названий и
+состава. По задержкам на разных масштабах считается показатель роста
+(log p50 / log числа записей): ~1 — стадия растет линейно с таблицей
+(полный просмотр), ~0 — не зависит от размера.
+
+Запуск: scripts/search_load_test.py.
+"""
+
+import logging
+import math
+import random
+import re
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+from .synthetic_db import ANCHOR_COMPOUNDS
+
+STAGES = (
+    "sql_build",
+    "sql_execute",
+    "compound_searcher",
+    "loader_stage1",
+    "loader_stage2",
+)
+INDEX_STAGES = ("name_index", "composition_searcher")
+
+SEARCH_TEMPERATURE_RANGE = (298.0, 2500.0)
+
+# Формула без фазы в скобках, заряда и композитной части
+_BASE_FORMULA = re.compile(r"^([A-Za-z0-9]+)")
+
+
+@dataclass
+class LookupQuery:
+    """Запрос нагрузочного прогона: формула и название (как от LLM)."""
+
+    formula: str
+    name: str
+    kind: str  # anchor | existing | missing
+
+
+@dataclass
+class StageStats:
+    """Задержки одной стадии на одной БД."""
+
+    stage: str
+    scale: float
+    records: int
+    lookups: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    qps: float
+    hit_rate: float
+    setup_s: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def build_workload(
+    db_path: Union[str, Path],
+    size: int = 200,
+    seed: int = 0,
+    anchor_share: float = 0.3,
+    missing_share: float = 0.1,
+) -> List[LookupQuery]:
+    """
+    Выборка запросов: опорные вещества, случайные формулы из БД и
+    отсутствующие в БД формулы (полный просмотр без результата).
+    """
+    from ..search.database_connector import DatabaseConnector
+
+    rng = random.Random(seed)
+    connector = DatabaseConnector(db_path)
+    max_rowid = connector.execute_query("SELECT MAX(rowid) AS n FROM compounds")[0]["n"] or 0
+
+    n_anchor = round(size * anchor_share)
+    n_missing = round(size * missing_share)
+    n_existing = size - n_anchor - n_missing
+
+    anchors = list(ANCHOR_COMPOUNDS.items())
+    queries = [
+        LookupQuery(formula, name, "anchor")
+        for formula, (_, name) in (anchors[i % len(anchors)] for i in range(n_anchor))
+    ]
+
+    rowids = [rng.randint(1, max_rowid) for _ in range(n_existing)] if max_rowid else []
+    for rowid in rowids:
+        rows = connector.execute_query(
+            "SELECT Formula, FirstName FROM compounds WHERE rowid = ?", [rowid]
+        )
+        if not rows:
+            continue
+        match = _BASE_FORMULA.match(rows[0]["Formula"] or "")
+        if match:
+            queries.append(LookupQuery(match.group(1), rows[0]["FirstName"] or "", "existing"))
+
+    queries.extend(
+        LookupQuery(f"Xq{rng.randint(2, 9)}Zv{i}", "Missing compound", "missing")
+        for i in range(n_missing)
+    )
+    connector.disconnect()
+    rng.shuffle(queries)
+    return queries
+
+
+def _stage_functions(
+    db_path: Path, stages: Sequence[str]
+) -> Tuple[Dict[str, Callable[[LookupQuery], int]], Dict[str, float]]:
+    """Функции стадий (возвращают число найденных записей) и время подготовки."""
+    from ..core_logic.compound_data_loader import CompoundDataLoader
+    from ..search.composition_index import CompositionIndex
+    from ..search.compound_searcher import CompoundSearcher
+    from ..search.database_connector import DatabaseConnector
+    from ..search.name_index import NameIndex, create_name_index
+    from ..search.sql_builder import SQLBuilder
+    from ..storage.static_data_manager import StaticDataManager
+
+    logger = logging.getLogger(__name__)
+    connector = DatabaseConnector(db_path)
+    builder = SQLBuilder()
+    # Пустой YAML-каталог: загрузчик всегда идет в БД
+    empty_static = db_path.parent / f".{db_path.stem}_no_static"
+    empty_static.mkdir(exist_ok=True)
+    loader = CompoundDataLoader(connector, StaticDataManager(empty_static), logger)
+    searcher = CompoundSearcher(builder, connector)
+
+    def sql_build(q):
+        query, _ = builder.build_compound_search_query(q.formula, SEARCH_TEMPERATURE_RANGE)
+        return int(bool(query))
+
+    def sql_execute(q):
+        query, params = builder.build_compound_search_query(q.formula, SEARCH_TEMPERATURE_RANGE)
+        return len(connector.execute_query(query, params))
+
+    functions: Dict[str, Callable[[LookupQuery], int]] = {
+        "sql_build": sql_build,
+        "sql_execute": sql_execute,
+        "compound_searcher": lambda q: len(
+            searcher.search_compound(q.formula, SEARCH_TEMPERATURE_RANGE).records_found
+        ),
+        "loader_stage1": lambda q: len(loader._search_db_with_name(q.formula, q.name)),
+        "loader_stage2": lambda q: len(loader._search_db_formula_only(q.formula)),
+    }
+    setup: Dict[str, float] = {}
+
+    if "name_index" in stages:
+        start = time.perf_counter()
+        create_name_index(db_path)
+        indexed_loader = CompoundDataLoader(
+            connector, StaticDataManager(empty_static), logger,
+            name_index=NameIndex(connector),
+        )
+        setup["name_index"] = time.perf_counter() - start
+        functions["name_index"] = lambda q: len(indexed_loader._search_db_with_name(q.formula, q.name))
+
+    if "composition_searcher" in stages:
+        start = time.perf_counter()
+        composition_index = CompositionIndex()
+        composition_index.build_from_database(connector)
+        indexed_searcher = CompoundSearcher(
+            builder, connector, composition_index=composition_index
+        )
+        setup["composition_searcher"] = time.perf_counter() - start
+        functions["composition_searcher"] = lambda q: len(
+            indexed_searcher.search_compound(q.formula, SEARCH_TEMPERATURE_RANGE).records_found
+        )
+
+    return {stage: functions[stage] for stage in stages}, setup
+
+
+def run_search_load(
+    db_path: Union[str, Path],
+    workload: Sequence[LookupQuery],
+    stages: Sequence[str] = STAGES,
+    scale: float = 1.0,
+    time_budget_s: float = 30.0,
+    clock: Callable[[], float] = time.perf_counter,
+) -> List[StageStats]:
+    """
+    Задержки стадий поиска на одной БД.
+
+    Каждая стадия выполняет запросы выборки последовательно, пока выборка не
+    кончится или не истечет time_budget_s (на больших масштабах медленные
+    стадии успевают меньше запросов).
+    """
+    from ..search.database_connector import DatabaseConnector
+
+    db_path = Path(db_path)
+    unknown = set(stages) - set(STAGES) - set(INDEX_STAGES)
+    if unknown:
+        raise ValueError(f"Неизвестные стадии поиска: {sorted(unknown)}")
+
+    records = DatabaseConnector(db_path).execute_query(
+        "SELECT COUNT(*) AS n FROM compounds"
+    )[0]["n"]
+    functions, setup = _stage_functions(db_path, stages)
+
+    results = []
+    for stage, func in functions.items():
+        # Прогрев: первый запрос открывает соединение и заполняет кэш страниц
+        func(workload[0])
+
+        latencies = []
+        hits = 0
+        started = clock()
+        for query in workload:
+            start = clock()
+            found = func(query)
+            latencies.append(clock() - start)
+            hits += bool(found)
+            if clock() - started > time_budget_s:
+                break
+        elapsed = sum(latencies)
+
+        latencies.sort()
+        results.append(StageStats(
+            stage=stage,
+            scale=scale,
+            records=records,
+            lookups=len(latencies),
+            p50_ms=statistics.median(latencies) * 1e3,
+            p95_ms=_percentile(latencies, 0.95) * 1e3,
+            p99_ms=_percentile(latencies, 0.99) * 1e3,
+            mean_ms=statistics.fmean(latencies) * 1e3,
+            qps=len(latencies) / elapsed if elapsed > 0 else float("inf"),
+            hit_rate=hits / len(latencies),
+            setup_s=setup.get(stage, 0.0),
+        ))
+    return results
+
+
+def scaling_exponents(results: Sequence[StageStats]) -> Dict[str, float]:
+    """
+    Показатель роста p50 по числу записей между наименьшим и наибольшим
+    масштабом для каждой стадии.
+    """
+    by_stage: Dict[str, List[StageStats]] = {}
+    for stats in results:
+        by_stage.setdefault(stats.stage, []).append(stats)
+
+    exponents = {}
+    for stage, items in by_stage.items():
+        items = sorted(items, key=lambda s: s.records)
+        low, high = items[0], items[-1]
+        if high.records <= low.records or low.p50_ms <= 0 or high.p50_ms <= 0:
+            continue
+        exponents[stage] = math.log(high.p50_ms / low.p50_ms) / math.log(high.records / low.records)
+    return exponents
+
+
+def format_load_report(results: Sequence[StageStats], slow_ms: float = 100.0) -> str:
+    """
+    Markdown-отчет: таблица задержек по масштабам и стадиям, показатели роста
+    и стадии, у которых p95 превысил slow_ms.
+    """
+    lines = [
+        "| Scale | Records | Stage | Lookups | p50, ms | p95, ms | p99, ms | QPS | Hit rate | Setup, s |",
+        "|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for s in sorted(results, key=lambda s: (s.scale, s.stage)):
+        lines.append(
+            f"| {s.scale:g}x | {s.records} | {s.stage} | {s.lookups} | {s.p50_ms:.2f} | "
+            f"{s.p95_ms:.2f} | {s.p99_ms:.2f} | {s.qps:.1f} | {s.hit_rate:.0%} | {s.setup_s:.2f} |"
+        )
+
+    exponents = scaling_exponents(results)
+    if exponents:
+        lines.append("")
+        lines.append("Scaling exponent (p50 vs records, 1 = linear scan):")
+        for stage, exponent in sorted(exponents.items()):
+            lines.append(f"- {stage}: {exponent:.2f}")
+
+    slow = [s for s in results if s.p95_ms > slow_ms]
+    if slow:
+        lines.append("")
+        lines.append(f"p95 above {slow_ms:g} ms:")
+        for s in sorted(slow, key=lambda s: (s.stage, s.scale)):
+            lines.append(f"- {s.stage} at {s.scale:g}x ({s.records} records): p95 {s.p95_ms:.1f} ms")
+    return "\n".join(lines) + "\n"
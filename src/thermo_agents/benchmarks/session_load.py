@@ -0,0 +1,306 @@
+"""
+Бенчмарк хранилища сессий Telegram бота на большом числе пользователей.
+
+Сравниваются три режима:
+
+- legacy — прежняя схема SessionManager/CallbackHandler: dataclass с __dict__
+  в словаре, множество активных, история — словари с полным текстом ответа
+  не больше чем для 100 пользователей (вытеснение — поиск минимума по
+  времени), обход всех сессий при очистке неактивных;
+- store — SessionStore в памяти (записи со __slots__, колесо таймеров,
+  тексты по хэшу с бюджетом памяти и сбросом на диск);
+- sqlite — то же с сохранением в SQLite (запись пакетом, загрузка при
+  обращении после перезапуска).
+
+Замеряются память после заполнения (tracemalloc), время на сообщение
+(учет активности + сохранение результата), периодический обход без
+истекших сессий и выгрузка всех сессий по таймауту.
+
+Запуск: scripts/session_store_benchmark.py.
+"""
+
+import gc
+import random
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..telegram_bot.utils.session_store import SessionStore
+
+MODES = ("legacy", "store", "sqlite")
+LEGACY_HISTORY_LIMIT = 100
+
+
+@dataclass
+class SessionLoadProfile:
+    """Параметры прогона."""
+
+    users: int = 100_000
+    messages: int = 100_000
+    result_rows: int = 60  # строк таблицы в тексте результата (~2.5 КБ)
+    shared_share: float = 0.3  # доля пользователей с одинаковым (типовым) ответом
+    memory_budget_mb: int = 32
+    timeout_s: float = 3600.0
+    seed: int = 0
+
+
+@dataclass
+class SessionLoadStats:
+    """Результат прогона одного режима."""
+
+    mode: str
+    users: int
+    session_bytes_per_user: float
+    memory_mb: float
+    history_users: int
+    content_memory_mb: float
+    spilled: int
+    message_us: float
+    sweep_ms: float
+    expire_all_ms: float
+    flush_ms: Optional[float] = None
+    reload_us: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _LegacySession:
+    """UserSession до перехода на SessionStore (dataclass без __slots__)."""
+    user_id: int
+    username: Optional[str]
+    first_name: Optional[str]
+    start_time: float
+    last_activity: float
+    request_count: int = 0
+    is_active: bool = True
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _result_texts(rows: int, count: int = 64) -> List[str]:
+    """Тексты результатов: таблица свойств по температурам."""
+    rng = random.Random(1)
+    texts = []
+    for n in range(count):
+        lines = [f"Результаты расчёта (вариант {n})", "| T, K | ΔH, кДж/моль | ΔS, Дж/(моль·К) | ΔG, кДж/моль |"]
+        for i in range(rows):
+            t = 298 + 25 * i
+            lines.append(
+                f"| {t} | {rng.uniform(-500, 100):.2f} | {rng.uniform(-200, 200):.2f} | {rng.uniform(-600, 50):.2f} |"
+            )
+        texts.append("\n".join(lines))
+    return texts
+
+
+def _content(user_id: int, texts: Sequence[str], shared: bool) -> str:
+    base = texts[user_id % len(texts)]
+    return base if shared else f"Запрос пользователя {user_id}\n{base}"
+
+
+class _LegacyLayout:
+    """Прежние структуры SessionManager и CallbackHandler."""
+
+    def __init__(self, clock: _Clock, timeout_s: float):
+        self.clock = clock
+        self.timeout_s = timeout_s
+        self.sessions: Dict[int, _LegacySession] = {}
+        self.active_users = set()
+        self.history: Dict[int, Dict[str, Any]] = {}
+
+    def start(self, user_id: int) -> None:
+        now = self.clock()
+        self.sessions[user_id] = _LegacySession(user_id, f"user{user_id}", "Имя", now, now)
+        self.active_users.add(user_id)
+
+    def message(self, user_id: int, query: str, content: str) -> None:
+        session = self.sessions[user_id]
+        session.last_activity = self.clock()
+        session.request_count += 1
+        self.active_users.add(user_id)
+        self.history[user_id] = {
+            "query": query, "content": content, "query_type": "compound_data",
+            "params": None, "frames": {}, "timestamp": self.clock(),
+        }
+        if len(self.history) > LEGACY_HISTORY_LIMIT:
+            oldest = min(self.history.keys(), key=lambda uid: self.history[uid]["timestamp"])
+            del self.history[oldest]
+
+    def sweep(self) -> int:
+        now = self.clock()
+        inactive = [
+            uid for uid, session in self.sessions.items()
+            if now - session.last_activity > self.timeout_s
+        ]
+        for uid in inactive:
+            self.sessions[uid].is_active = False
+            self.active_users.discard(uid)
+        return len(inactive)
+
+
+def run_session_load(
+    mode: str,
+    profile: Optional[SessionLoadProfile] = None,
+    work_dir: Optional[Path] = None,
+) -> SessionLoadStats:
+    """
+    Прогон одного режима.
+
+    Args:
+        mode: legacy | store | sqlite
+        profile: Параметры прогона
+        work_dir: Каталог для SQLite и сброшенных текстов (по умолчанию временный)
+    """
+    if mode not in MODES:
+        raise ValueError(f"Неизвестный режим: {mode}")
+    profile = profile or SessionLoadProfile()
+    if work_dir is None:
+        with tempfile.TemporaryDirectory() as tmp:
+            return run_session_load(mode, profile, Path(tmp))
+
+    rng = random.Random(profile.seed)
+    texts = _result_texts(profile.result_rows)
+    shared_cutoff = int(profile.users * profile.shared_share)
+    clock = _Clock()
+    users = range(profile.users)
+    messages = [rng.randrange(profile.users) for _ in range(profile.messages)]
+    contents = [_content(uid, texts, uid < shared_cutoff) for uid in messages]
+
+    store: Optional[SessionStore] = None
+    legacy: Optional[_LegacyLayout] = None
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    if mode == "legacy":
+        legacy = _LegacyLayout(clock, profile.timeout_s)
+        for uid in users:
+            legacy.start(uid)
+        sessions_memory = tracemalloc.get_traced_memory()[0] - base
+        for uid in users:
+            legacy.message(uid, "свойства H2O", _content(uid, texts, uid < shared_cutoff))
+    else:
+        store = SessionStore(
+            timeout_s=profile.timeout_s,
+            db_path=work_dir / "sessions.db" if mode == "sqlite" else None,
+            memory_budget_bytes=profile.memory_budget_mb * 1024 * 1024,
+            spill_dir=work_dir / "results",
+            clock=clock,
+        )
+        for uid in users:
+            store.open_session(uid, f"user{uid}", "Имя")
+        sessions_memory = tracemalloc.get_traced_memory()[0] - base
+        for uid in users:
+            store.record_activity(uid)
+            store.save_history(uid, "свойства H2O", _content(uid, texts, uid < shared_cutoff), "compound_data")
+    memory = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+
+    # Сообщения активных пользователей
+    start = time.perf_counter()
+    for uid, content in zip(messages, contents):
+        clock.now += 0.001
+        if legacy is not None:
+            legacy.message(uid, "свойства CO2", content)
+        else:
+            store.record_activity(uid)
+            store.save_history(uid, "свойства CO2", content, "compound_data")
+    message_us = (time.perf_counter() - start) / max(len(messages), 1) * 1e6
+
+    flush_ms = None
+    if mode == "sqlite":
+        start = time.perf_counter()
+        store.flush()
+        flush_ms = (time.perf_counter() - start) * 1e3
+
+    # Периодический обход: ни одна сессия еще не истекла
+    clock.now += profile.timeout_s / 2
+    gc.collect()
+    start = time.perf_counter()
+    if legacy is not None:
+        legacy.sweep()
+    else:
+        store.expire()
+    sweep_ms = (time.perf_counter() - start) * 1e3
+
+    if legacy is not None:
+        history_users = len(legacy.history)
+        content_memory = sum(len(h["content"]) for h in legacy.history.values())
+        spilled = 0
+    else:
+        history_users = len(store.history)
+        content_memory = store.content.memory_bytes
+        spilled = store.content.spilled
+
+    # Выгрузка всех сессий по таймауту
+    clock.now += profile.timeout_s * 2
+    gc.collect()
+    start = time.perf_counter()
+    if legacy is not None:
+        legacy.sweep()
+    else:
+        store.expire()
+    expire_all_ms = (time.perf_counter() - start) * 1e3
+
+    reload_us = None
+    if mode == "sqlite":
+        store.close()
+        restored = SessionStore(
+            timeout_s=profile.timeout_s,
+            db_path=work_dir / "sessions.db",
+            spill_dir=work_dir / "results",
+            clock=clock,
+        )
+        sample = rng.sample(range(profile.users), min(1000, profile.users))
+        start = time.perf_counter()
+        for uid in sample:
+            restored.get_content(restored.get_history(uid))
+        reload_us = (time.perf_counter() - start) / len(sample) * 1e6
+        restored.close()
+
+    return SessionLoadStats(
+        mode=mode,
+        users=profile.users,
+        session_bytes_per_user=sessions_memory / max(profile.users, 1),
+        memory_mb=memory / 2**20,
+        history_users=history_users,
+        content_memory_mb=content_memory / 2**20,
+        spilled=spilled,
+        message_us=message_us,
+        sweep_ms=sweep_ms,
+        expire_all_ms=expire_all_ms,
+        flush_ms=flush_ms,
+        reload_us=reload_us,
+    )
+
+
+def format_session_report(results: Sequence[SessionLoadStats], profile: SessionLoadProfile) -> str:
+    """Markdown-отчет: память и задержки по режимам."""
+    lines = [
+        f"Users {profile.users}, messages {profile.messages}, result rows {profile.result_rows}, "
+        f"shared results {profile.shared_share:.0%}, content budget {profile.memory_budget_mb} MB",
+        "",
+        "| Mode | Session, B/user | Memory, MB | Users with result | Content in memory, MB | Spilled "
+        "| Message, µs | Sweep, ms | Expire all, ms | Flush, ms | Reload, µs |",
+        "|---|---|---|---|---|---|---|---|---|---|---|",
+    ]
+
+    def optional(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:.1f}"
+
+    for s in results:
+        lines.append(
+            f"| {s.mode} | {s.session_bytes_per_user:.0f} | {s.memory_mb:.1f} | {s.history_users} | "
+            f"{s.content_memory_mb:.1f} | {s.spilled} | {s.message_us:.1f} | {s.sweep_ms:.2f} | "
+            f"{s.expire_all_ms:.1f} | {optional(s.flush_ms)} | {optional(s.reload_us)} |"
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,472 @@
+"""
+Генератор синтетической таблицы compounds для нагрузочных тестов поиска.
+
+Распределения взяты из статистики рабочей БД, собранной
+scripts/database_analysis.py (docs/database_analysis_report.md): классы
+надежности, фазы, доля формул с фазой в скобках и ионов, распределение Tmin,
+число записей на формулу. Те же распределения можно прочитать из JSON,
+который пишет database_analysis.py (DatabaseProfile.from_analysis_results);
+оттуда же берется точная схема таблицы (table_structure).
+
+Масштаб 1.0 соответствует размеру рабочей БД (316 434 записи, 32 790
+формул). Масштаб увеличивает число различных формул, а не число записей на
+формулу: опорные вещества (H2O, CO2, HCl, ...) сохраняют реалистичное число
+записей, растет только таблица, которую просматривают LIKE-запросы.
+
+Записи одной формулы и фазы образуют короткие цепочки смежных сегментов
+Tmin-Tmax (разные источники данных); H298/S298 заданы у первого сегмента
+цепочки, у последующих часто нулевые — как в рабочей БД.
+"""
+
+import json
+import random
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from ..utils.chem_utils import parse_composition
+from .cases import COMPOUNDS_COLUMNS
+
+# Число записей и различных формул рабочей БД (масштаб 1.0)
+PRODUCTION_RECORDS = 316_434
+PRODUCTION_FORMULAS = 32_790
+
+# Среднее число различных строк Formula на базовую формулу у генератора;
+# подобрано так, чтобы число уникальных Formula совпадало с рабочей БД
+FORMULA_VARIANTS_PER_BASE = 4.5
+
+# Доля записей, начинающих новую цепочку сегментов Tmin-Tmax внутри фазы;
+# остальные продолжают предыдущий сегмент
+CHAIN_START_SHARE = 0.9
+
+# Границы корзин Tmin из database_analysis.analyze_temperature_ranges
+TMIN_BUCKETS: Dict[str, Tuple[float, float]] = {
+    "< 100K": (10.0, 100.0),
+    "100K - 298K": (100.0, 298.0),
+    "298K - 500K": (298.0, 500.0),
+    "500K - 1000K": (500.0, 1000.0),
+    "1000K - 2000K": (1000.0, 2000.0),
+    "> 2000K": (2000.0, 6000.0),
+}
+
+# Записей на вещество в рабочей БД (отчет, раздел "Результаты тестовых
+# запросов"); для C, CO, Cl2, FeO, Fe — оценка
+ANCHOR_COMPOUNDS: Dict[str, Tuple[int, str]] = {
+    "H2O": (1484, "Water"),
+    "CO2": (1428, "Carbon dioxide"),
+    "NH3": (1710, "Ammonia"),
+    "CH4": (1352, "Methane"),
+    "O2": (1609, "Oxygen"),
+    "HCl": (153, "Hydrogen chloride"),
+    "NaCl": (154, "Sodium chloride"),
+    "TiO2": (70, "Titanium dioxide"),
+    "TiCl4": (20, "Titanium tetrachloride"),
+    "Fe": (120, "Iron"),
+    "FeO": (40, "Iron oxide"),
+    "C": (60, "Carbon"),
+    "CO": (80, "Carbon monoxide"),
+    "Cl2": (60, "Chlorine"),
+}
+
+# Элементы генерируемых формул: (вес выбора, атомная масса, название)
+ELEMENTS: Dict[str, Tuple[float, float, str]] = {
+    "O": (30, 15.999, "Oxygen"), "H": (25, 1.008, "Hydrogen"),
+    "C": (20, 12.011, "Carbon"), "N": (8, 14.007, "Nitrogen"),
+    "Cl": (8, 35.45, "Chlorine"), "S": (6, 32.06, "Sulfur"),
+    "F": (5, 18.998, "Fluorine"), "Fe": (5, 55.845, "Iron"),
+    "Si": (4, 28.085, "Silicon"), "Na": (4, 22.99, "Sodium"),
+    "K": (3, 39.098, "Potassium"), "Ca": (3, 40.078, "Calcium"),
+    "Mg": (3, 24.305, "Magnesium"), "Al": (3, 26.982, "Aluminium"),
+    "Ti": (3, 47.867, "Titanium"), "Cu": (3, 63.546, "Copper"),
+    "Br": (3, 79.904, "Bromine"), "P": (3, 30.974, "Phosphorus"),
+    "B": (3, 10.81, "Boron"), "Zn": (2, 65.38, "Zinc"),
+    "I": (2, 126.9, "Iodine"), "Li": (2, 6.94, "Lithium"),
+    "Cr": (2, 51.996, "Chromium"), "Mn": (2, 54.938, "Manganese"),
+    "Ni": (2, 58.693, "Nickel"), "W": (2, 183.84, "Tungsten"),
+    "Mo": (2, 95.95, "Molybdenum"), "Pb": (2, 207.2, "Lead"),
+    "Ba": (2, 137.33, "Barium"), "Sn": (2, 118.71, "Tin"),
+    "Zr": (1, 91.224, "Zirconium"), "U": (1, 238.03, "Uranium"),
+}
+
+# Порядок записи элементов без углерода: электроположительные первыми
+_ELEMENT_ORDER = [
+    "Li", "Na", "K", "Ba", "Ca", "Mg", "Al", "Zn", "Fe", "Cu", "Ni", "Cr",
+    "Mn", "Ti", "Zr", "Mo", "W", "Sn", "Pb", "U", "B", "Si", "P", "N", "H",
+    "C", "S", "O", "F", "Cl", "Br", "I",
+]
+
+_ANION_NAMES = {
+    "O": "oxide", "Cl": "chloride", "F": "fluoride", "S": "sulfide",
+    "Br": "bromide", "I": "iodide", "N": "nitride", "H": "hydride",
+    "C": "carbide", "P": "phosphide", "B": "boride", "Si": "silicide",
+}
+
+# Обозначения фазы в скобках после формулы
+_PHASE_LABELS = {
+    "g": ["g"], "l": ["l"], "s": ["s", "cr", "s2"],
+    "a": ["a"], "ao": ["ao"], "ai": ["ai"],
+}
+
+_IONIC_CHARGES = ["+", "-", "+2", "-2", "+3", "2+", "2-"]
+
+
+@dataclass
+class DatabaseProfile:
+    """
+    Статистика рабочей БД, по которой генерируются записи.
+
+    Распределения — абсолютные числа записей (нормируются при генерации).
+    По умолчанию — значения из docs/database_analysis_report.md.
+    """
+
+    total_records: int = PRODUCTION_RECORDS
+    unique_formulas: int = PRODUCTION_FORMULAS
+    reliability_distribution: Dict[int, float] = field(default_factory=lambda: {
+        1: 236_236, 2: 73_808, 3: 5_664, 0: 697, 4: 18, 5: 11,
+    })
+    phase_distribution: Dict[str, float] = field(default_factory=lambda: {
+        "g": 173_737, "l": 52_753, "s": 50_708, "a": 21_778, "ao": 9_834, "ai": 7_563,
+    })
+    tmin_distribution: Dict[str, float] = field(default_factory=lambda: {
+        "< 100K": 6_629, "100K - 298K": 64_580, "298K - 500K": 155_370,
+        "500K - 1000K": 40_115, "1000K - 2000K": 38_006, "> 2000K": 11_734,
+    })
+    # Доли записей: фаза в скобках в Formula, ионы (+/-), композиты (A*B);
+    # доля композитов статистикой не покрыта — оценка
+    phase_suffix_share: float = 272_647 / PRODUCTION_RECORDS
+    ionic_share: float = 25_131 / PRODUCTION_RECORDS
+    composite_share: float = 0.015
+    columns: List[Tuple[str, str]] = field(default_factory=lambda: list(COMPOUNDS_COLUMNS))
+
+    @classmethod
+    def from_analysis_results(cls, path: Union[str, Path]) -> "DatabaseProfile":
+        """
+        Профиль из JSON, который пишет scripts/database_analysis.py
+        (docs/database_analysis_results.json).
+        """
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        profile = cls()
+        total = data.get("total_records") or profile.total_records
+        profile.total_records = total
+
+        formulas = data.get("formula_statistics", {})
+        if formulas.get("unique_formulas"):
+            profile.unique_formulas = formulas["unique_formulas"]
+        if formulas.get("formulas_with_parentheses") is not None:
+            profile.phase_suffix_share = formulas["formulas_with_parentheses"] / total
+        if formulas.get("ionic_formulas") is not None:
+            profile.ionic_share = formulas["ionic_formulas"] / total
+
+        reliability = data.get("reliability_distribution")
+        if reliability:
+            profile.reliability_distribution = {
+                int(row["ReliabilityClass"]): row["count"]
+                for row in reliability
+                if row.get("ReliabilityClass") is not None
+            }
+        phases = data.get("phase_statistics", {}).get("phase_distribution")
+        if phases:
+            # Фазы вне стандартного набора (?, 9, NULL) — доли процента
+            profile.phase_distribution = {
+                row["Phase"]: row["count"]
+                for row in phases
+                if row.get("Phase") in _PHASE_LABELS
+            }
+        if data.get("temperature_distribution"):
+            profile.tmin_distribution = {
+                bucket: count
+                for bucket, count in data["temperature_distribution"].items()
+                if bucket in TMIN_BUCKETS
+            }
+        if data.get("table_structure"):
+            profile.columns = [
+                (row["name"], row.get("type") or "")
+                for row in data["table_structure"]
+            ]
+        return profile
+
+
+class _Categorical:
+    """Выбор из дискретного распределения (накопленные веса)."""
+
+    def __init__(self, weights: Dict):
+        self.values = list(weights)
+        total = float(sum(weights.values()))
+        cumulative, acc = [], 0.0
+        for value in self.values:
+            acc += weights[value] / total
+            cumulative.append(acc)
+        self.cumulative = cumulative
+
+    def sample(self, rng: random.Random):
+        x = rng.random()
+        for value, edge in zip(self.values, self.cumulative):
+            if x <= edge:
+                return value
+        return self.values[-1]
+
+
+class SyntheticDatabaseGenerator:
+    """
+    Генератор таблицы compounds заданного масштаба.
+
+    Генерация детерминирована (seed); записи выдаются потоком, поэтому
+    масштаб 50x (~16 млн записей) не требует памяти под всю таблицу.
+    """
+
+    def __init__(
+        self,
+        scale: float = 1.0,
+        profile: Optional[DatabaseProfile] = None,
+        seed: int = 0,
+    ):
+        if scale <= 0:
+            raise ValueError(f"Масштаб должен быть положительным: {scale}")
+        self.scale = scale
+        self.profile = profile or DatabaseProfile()
+        self.seed = seed
+
+        self._reliability = _Categorical(self.profile.reliability_distribution)
+        self._phase = _Categorical(self.profile.phase_distribution)
+        self._tmin_bucket = _Categorical(self.profile.tmin_distribution)
+        self._elements = _Categorical({el: w for el, (w, _, _) in ELEMENTS.items()})
+
+    @property
+    def target_records(self) -> int:
+        return max(1, round(self.profile.total_records * self.scale))
+
+    # ------------------------------------------------------------------
+    # Формулы
+    # ------------------------------------------------------------------
+
+    def _random_formula(self, rng: random.Random) -> str:
+        n_elements = _Categorical({1: 10, 2: 35, 3: 35, 4: 20}).sample(rng)
+        elements = set()
+        while len(elements) < n_elements:
+            elements.add(self._elements.sample(rng))
+
+        if "C" in elements:
+            ordered = ["C"] + (["H"] if "H" in elements else []) + sorted(elements - {"C", "H"})
+        else:
+            ordered = sorted(elements, key=_ELEMENT_ORDER.index)
+
+        parts = []
+        for element in ordered:
+            count = 1 if rng.random() < 0.5 else rng.randint(2, 6)
+            parts.append(element if count == 1 else f"{element}{count}")
+        return "".join(parts)
+
+    def _records_per_formula(self, rng: random.Random, n_formulas: int, n_records: int) -> List[int]:
+        """Тяжелый хвост числа записей на формулу (среднее как в рабочей БД)."""
+        weights = [rng.paretovariate(1.3) for _ in range(n_formulas)]
+        total = sum(weights)
+        counts = [max(1, round(w / total * n_records)) for w in weights]
+        # Подгонка суммы к целевому числу записей
+        diff = n_records - sum(counts)
+        i = 0
+        while diff != 0 and n_formulas:
+            j = i % n_formulas
+            if diff > 0:
+                counts[j] += 1
+                diff -= 1
+            elif counts[j] > 1:
+                counts[j] -= 1
+                diff += 1
+            i += 1
+            if i > 10 * n_formulas and diff < 0:
+                break
+        return counts
+
+    def _plan(self, rng: random.Random) -> List[Tuple[str, int, Optional[str]]]:
+        """Список (базовая формула, число записей, название)."""
+        anchor_scale = min(self.scale, 1.0)
+        plan = [
+            (formula, max(1, round(count * anchor_scale)), name)
+            for formula, (count, name) in ANCHOR_COMPOUNDS.items()
+        ]
+        anchor_records = sum(count for _, count, _ in plan)
+
+        # Базовая формула дает несколько строк Formula (фазы, ионы, композиты)
+        n_formulas = max(
+            1, round(self.profile.unique_formulas * self.scale / FORMULA_VARIANTS_PER_BASE)
+        ) - len(plan)
+        n_records = self.target_records - anchor_records
+        if n_formulas <= 0 or n_records <= 0:
+            return plan
+
+        seen = set(ANCHOR_COMPOUNDS)
+        formulas = []
+        attempts = 0
+        while len(formulas) < n_formulas and attempts < n_formulas * 20:
+            attempts += 1
+            formula = self._random_formula(rng)
+            if formula not in seen:
+                seen.add(formula)
+                formulas.append(formula)
+
+        counts = self._records_per_formula(rng, len(formulas), max(n_records, len(formulas)))
+        plan.extend((formula, count, None) for formula, count in zip(formulas, counts))
+        return plan
+
+    # ------------------------------------------------------------------
+    # Записи
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _molecular_weight(formula: str) -> float:
+        composition = parse_composition(formula) or {}
+        return round(sum(ELEMENTS.get(el, (0, 0.0, ""))[1] * n for el, n in composition.items()), 4)
+
+    @staticmethod
+    def _name(formula: str) -> str:
+        composition = parse_composition(formula) or {}
+        elements = list(composition)
+        if not elements:
+            return formula
+        first = ELEMENTS.get(elements[0], (0, 0.0, elements[0]))[2]
+        if len(elements) == 1:
+            return first
+        return f"{first} {_ANION_NAMES.get(elements[-1], 'compound')}"
+
+    def _tmin(self, rng: random.Random) -> float:
+        low, high = TMIN_BUCKETS[self._tmin_bucket.sample(rng)]
+        if low == 298.0 and rng.random() < 0.7:
+            return 298.15
+        return round(rng.uniform(low, high), 2)
+
+    def _variant(self, rng: random.Random, base: str, phase: str) -> str:
+        """Запись формулы в БД: ион, композит, фаза в скобках."""
+        formula = base
+        if rng.random() < self.profile.composite_share:
+            formula = f"{base}*{rng.randint(1, 6)}H2O" if rng.random() < 0.6 else f"{base}*{self._random_formula(rng)}"
+        elif rng.random() < self.profile.ionic_share:
+            formula = f"{base}{rng.choice(_IONIC_CHARGES)}"
+        if rng.random() < self.profile.phase_suffix_share:
+            formula = f"{formula}({rng.choice(_PHASE_LABELS.get(phase, [phase]))})"
+        return formula
+
+    def _compound_rows(
+        self, rng: random.Random, base: str, n_records: int, name: Optional[str]
+    ) -> Iterator[Dict[str, object]]:
+        melting = round(rng.uniform(50.0, 3500.0), 2)
+        boiling = round(melting + rng.uniform(50.0, 3000.0), 2)
+        first_name = name or self._name(base)
+        weight = self._molecular_weight(base)
+        is_element = len(parse_composition(base) or {}) == 1
+
+        # Записи формулы по фазам; внутри фазы — смежные сегменты температур
+        phases: Dict[str, int] = {}
+        for _ in range(n_records):
+            phase = self._phase.sample(rng)
+            phases[phase] = phases.get(phase, 0) + 1
+
+        for phase, count in phases.items():
+            # Запись формулы общая для фазы: варианты дают различные строки Formula
+            formula = self._variant(rng, base, phase)
+            h298 = 0.0 if is_element else round(rng.gauss(-400.0, 350.0), 3)
+            s298 = round(rng.lognormvariate(4.6, 0.6), 3)
+            tmin = 0.0
+            for segment in range(count):
+                # Новая цепочка (другой источник данных) или продолжение текущей
+                new_chain = segment == 0 or rng.random() < CHAIN_START_SHARE
+                if new_chain:
+                    tmin = self._tmin(rng)
+                tmax = round(tmin + min(20000.0, max(10.0, rng.lognormvariate(6.0, 0.8))), 2)
+                keep_base = new_chain or rng.random() < 0.4
+                yield {
+                    "Formula": formula,
+                    "FirstName": first_name,
+                    "SecondName": "" if rng.random() < 0.7 else f"{first_name} ({phase})",
+                    "Phase": phase,
+                    "Tmin": tmin,
+                    "Tmax": tmax,
+                    "H298": h298 if keep_base else 0.0,
+                    "S298": s298 if keep_base else 0.0,
+                    "f1": round(rng.uniform(10.0, 120.0), 4),
+                    "f2": round(rng.gauss(10.0, 20.0), 4),
+                    "f3": round(rng.gauss(-2.0, 5.0), 4),
+                    "f4": round(rng.gauss(1.0, 4.0), 4),
+                    "f5": round(rng.gauss(0.0, 0.1), 5),
+                    "f6": round(rng.gauss(0.0, 0.1), 5),
+                    "MeltingPoint": melting,
+                    "BoilingPoint": boiling,
+                    "ReliabilityClass": self._reliability.sample(rng),
+                    "MolecularWeight": weight,
+                }
+                # Продолжение цепочки начинается с конца сегмента (иногда с разрывом)
+                tmin = tmax if rng.random() < 0.9 else round(tmax + rng.uniform(1.0, 200.0), 2)
+
+    def iter_rows(self) -> Iterator[Dict[str, object]]:
+        """Поток записей (словари по столбцам COMPOUNDS_COLUMNS)."""
+        rng = random.Random(self.seed)
+        plan = self._plan(rng)
+        # Порядок формул в таблице перемешан, записи формулы идут подряд
+        rng.shuffle(plan)
+        for base, count, name in plan:
+            yield from self._compound_rows(rng, base, count, name)
+
+    def write(self, db_path: Union[str, Path], batch_size: int = 20_000) -> Dict[str, object]:
+        """
+        Запись таблицы compounds в новый файл SQLite.
+
+        Столбцы схемы профиля, которых генератор не заполняет, получают NULL.
+
+        Returns:
+            Статистика: путь, число записей, формул, время генерации
+        """
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        if db_path.exists():
+            db_path.unlink()
+
+        columns = [name for name, _ in self.profile.columns]
+        ddl = ", ".join(f"{name} {kind}".strip() for name, kind in self.profile.columns)
+        insert = (
+            f"INSERT INTO compounds ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+
+        start = time.perf_counter()
+        records = 0
+        formulas = set()
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute("PRAGMA journal_mode=OFF")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(f"CREATE TABLE compounds ({ddl})")
+            batch = []
+            for row in self.iter_rows():
+                batch.append(tuple(row.get(name) for name in columns))
+                formulas.add(row["Formula"])
+                if len(batch) >= batch_size:
+                    conn.executemany(insert, batch)
+                    records += len(batch)
+                    batch = []
+            if batch:
+                conn.executemany(insert, batch)
+                records += len(batch)
+            conn.commit()
+        finally:
+            conn.close()
+
+        return {
+            "db_path": str(db_path),
+            "scale": self.scale,
+            "seed": self.seed,
+            "records": records,
+            "unique_formulas": len(formulas),
+            "generation_s": round(time.perf_counter() - start, 3),
+            "size_mb": round(db_path.stat().st_size / 1e6, 1),
+        }
+
+
+def generate_database(
+    db_path: Union[str, Path],
+    scale: float = 1.0,
+    seed: int = 0,
+    profile: Optional[DatabaseProfile] = None,
+) -> Dict[str, object]:
+    """Создание синтетической БД заданного масштаба (см. SyntheticDatabaseGenerator)."""
+    return SyntheticDatabaseGenerator(scale, profile, seed).write(db_path)
@@ -3,16 +3,42 @@
 
 Содержит детерминированные функции для расчета термодинамических свойств
 на основе формул Шомейта и данных из базы данных.
+
+Классы загружаются лениво (PEP 562): импорт пакета не тянет scipy/numpy.
 """
 
-from .thermodynamic_calculator import (
-    ThermodynamicCalculator,
-    ThermodynamicProperties,
-    ThermodynamicTable
-)
+import importlib
+from typing import TYPE_CHECKING
+
+_LAZY_EXPORTS = {
+    "ThermodynamicCalculator": ".thermodynamic_calculator",
+    "ThermodynamicProperties": ".thermodynamic_calculator",
+    "ThermodynamicTable": ".thermodynamic_calculator",
+}
 
 __all__ = [
     "ThermodynamicCalculator",
     "ThermodynamicProperties",
     "ThermodynamicTable"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .thermodynamic_calculator import (
+        ThermodynamicCalculator,
+        ThermodynamicProperties,
+        ThermodynamicTable
+    )
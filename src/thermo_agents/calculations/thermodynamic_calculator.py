@@ -9,7 +9,6 @@ import numpy as np
 from dataclasses import dataclass
 from typing import List, Tuple, Optional, Dict
 from functools import lru_cache
-from scipy.integrate import quad
 from collections import defaultdict
 
 from ..models.search import DatabaseRecord
@@ -559,6 +558,8 @@ class ThermodynamicCalculator:
                 + getattr(record, 'f6', 0.0) * T**3 * 1e-9
             )
 
+        from scipy.integrate import quad
+
         delta_H, error = quad(Cp_T, T1, T2, epsabs=1e-9, epsrel=1e-9)
         return delta_H, error
 
@@ -588,6 +589,8 @@ class ThermodynamicCalculator:
             )
             return Cp_T / T
 
+        from scipy.integrate import quad
+
         delta_S, error = quad(Cp_T_over_T, T1, T2, epsabs=1e-12, epsrel=1e-9)
         return delta_S, error
 
@@ -7,18 +7,32 @@ This package contains the core calculation logic ported from calc_example.ipynb:
 - RecordRangeBuilder: Three-level strategy for record selection
 - ThermodynamicEngine: Cp, H, S, G calculations for single compounds
 - ReactionEngine: ΔH, ΔS, ΔG, K calculations for reactions
+- ThermoTable: Precomputed Cp, H, S tables on a fixed temperature grid
+- CrossoverSolver: Exact ΔG = 0 / ln K = target temperatures per phase segment
+- ReactionScreener: Stoichiometric-matrix screening of many reactions at once
+- GibbsEquilibriumSolver: Multi-reaction equilibrium composition by Gibbs minimization
 """
 
 from .compound_data_loader import CompoundDataLoader
 from .phase_transition_detector import PhaseTransitionDetector
 from .record_range_builder import RecordRangeBuilder
 from .thermodynamic_engine import ThermodynamicEngine
+from .thermo_tables import ThermoTable
+from .crossover_solver import Crossover, CrossoverSolver
 from .reaction_engine import ReactionEngine
+from .reaction_screening import ReactionScreener
+from .equilibrium_solver import EquilibriumResult, GibbsEquilibriumSolver
 
 __all__ = [
     'CompoundDataLoader',
     'PhaseTransitionDetector',
     'RecordRangeBuilder',
     'ThermodynamicEngine',
-    'ReactionEngine'
+    'ReactionEngine',
+    'ThermoTable',
+    'Crossover',
+    'CrossoverSolver',
+    'ReactionScreener',
+    'EquilibriumResult',
+    'GibbsEquilibriumSolver'
 ]
\ No newline at end of file
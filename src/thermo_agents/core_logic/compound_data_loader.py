@@ -13,6 +13,22 @@ from ..search.database_connector import DatabaseConnector
 from ..storage.static_data_manager import StaticDataManager
 from ..models.static_data import YAMLCompoundData, YAMLPhaseRecord
 from ..selection.optimal_record_selector import OptimalRecordSelector
+from ..search.composition_index import CompositionIndex
+from ..search.name_index import NameIndex
+
+# Порядок записей: надежность, ширина диапазона, длина формулы, фаза
+ORDER_BY = """ORDER BY
+            CASE ReliabilityClass
+                WHEN 1 THEN 0 WHEN 2 THEN 1 WHEN 3 THEN 2
+                WHEN 0 THEN 3 WHEN 4 THEN 4 WHEN 5 THEN 5 ELSE 6
+            END,
+            (Tmax - Tmin) DESC,
+            LENGTH(TRIM(Formula)) ASC,
+            CASE Phase
+                WHEN 'g' THEN 0 WHEN 'l' THEN 1
+                WHEN 's' THEN 2 WHEN 'aq' THEN 3 ELSE 4
+            END,
+            rowid ASC"""
 
 
 class CompoundDataLoader:
@@ -25,12 +41,16 @@ class CompoundDataLoader:
         db_connector: DatabaseConnector,
         static_data_manager: StaticDataManager,
         logger: logging.Logger,
-        optimizer: Optional[OptimalRecordSelector] = None
+        optimizer: Optional[OptimalRecordSelector] = None,
+        composition_index: Optional[CompositionIndex] = None,
+        name_index: Optional[NameIndex] = None
     ):
         self.db_connector = db_connector
         self.static_manager = static_data_manager
         self.logger = logger
         self.optimizer = optimizer
+        self.composition_index = composition_index
+        self.name_index = name_index
 
     def get_raw_compound_data(
         self,
@@ -81,6 +101,18 @@ class CompoundDataLoader:
             else:
                 self.logger.info(f"⚠ {formula}: стадия 1 не дала результатов, переход к стадии 2")
 
+        # Стадия 2: индекс элементного состава (точная формула, фазы в
+        # скобках, композиты и гидраты одним поиском; без изомеров)
+        if self.composition_index is not None and self.composition_index.is_built:
+            rowids = self.composition_index.lookup(formula)
+            if rowids:
+                df = self._fetch_by_rowids(rowids)
+                if not df.empty:
+                    self.logger.info(
+                        f"✓ {formula} (стадия 2: индекс состава): найдено {len(df)} записей"
+                    )
+                    return df
+
         # Стадия 2: БД только формула
         df = self._search_db_formula_only(formula)
         if not df.empty:
@@ -129,7 +161,16 @@ class CompoundDataLoader:
     def _search_db_with_name(self, formula: str, name: str) -> pd.DataFrame:
         """
         Стадия 1: Поиск в БД по формуле + имени.
+
+        С индексом названий (FTS5) название сопоставляется без учета регистра,
+        порядка слов и с допуском опечаток; иначе — точное сравнение.
         """
+        if self.name_index is not None and self.name_index.is_available:
+            rowids = self.name_index.search(name, formula)
+            if not rowids:
+                return pd.DataFrame()
+            return self._fetch_by_rowids(rowids)
+
         query = f"""
         SELECT * FROM compounds
         WHERE (
@@ -137,18 +178,7 @@ class CompoundDataLoader:
             AND (TRIM(FirstName) = '{name}' OR TRIM(SecondName) = '{name}')
         )
         AND (Formula NOT LIKE '%+%' AND Formula NOT LIKE '%-%')
-        ORDER BY
-            CASE ReliabilityClass
-                WHEN 1 THEN 0 WHEN 2 THEN 1 WHEN 3 THEN 2
-                WHEN 0 THEN 3 WHEN 4 THEN 4 WHEN 5 THEN 5 ELSE 6
-            END,
-            (Tmax - Tmin) DESC,
-            LENGTH(TRIM(Formula)) ASC,
-            CASE Phase
-                WHEN 'g' THEN 0 WHEN 'l' THEN 1
-                WHEN 's' THEN 2 WHEN 'aq' THEN 3 ELSE 4
-            END,
-            rowid ASC
+        {ORDER_BY}
         """
 
         self.db_connector.connect()
@@ -168,18 +198,28 @@ class CompoundDataLoader:
         SELECT * FROM compounds
         WHERE (TRIM(Formula) = '{formula}' OR Formula LIKE '{formula}(%')
         AND (Formula NOT LIKE '%+%' AND Formula NOT LIKE '%-%')
-        ORDER BY
-            CASE ReliabilityClass
-                WHEN 1 THEN 0 WHEN 2 THEN 1 WHEN 3 THEN 2
-                WHEN 0 THEN 3 WHEN 4 THEN 4 WHEN 5 THEN 5 ELSE 6
-            END,
-            (Tmax - Tmin) DESC,
-            LENGTH(TRIM(Formula)) ASC,
-            CASE Phase
-                WHEN 'g' THEN 0 WHEN 'l' THEN 1
-                WHEN 's' THEN 2 WHEN 'aq' THEN 3 ELSE 4
-            END,
-            rowid ASC
+        {ORDER_BY}
+        """
+
+        self.db_connector.connect()
+        results = self.db_connector.execute_query(query)
+
+        if not results:
+            return pd.DataFrame()
+
+        df = pd.DataFrame(results)
+        return self._sort_dataframe(df)
+
+    def _fetch_by_rowids(self, rowids: List[int]) -> pd.DataFrame:
+        """
+        Загрузка записей по первичному ключу (кандидаты из индексов).
+        """
+        id_list = ", ".join(str(int(rowid)) for rowid in rowids)
+        query = f"""
+        SELECT * FROM compounds
+        WHERE rowid IN ({id_list})
+        AND (Formula NOT LIKE '%+%' AND Formula NOT LIKE '%-%')
+        {ORDER_BY}
         """
 
         self.db_connector.connect()
@@ -325,6 +365,18 @@ class CompoundDataLoader:
             else:
                 self.logger.info(f"⚠ {formula}: стадия 1 не дала результатов, переход к стадии 2")
 
+        # Стадия 2: индекс элементного состава (точная формула, фазы в
+        # скобках, композиты и гидраты одним поиском; без изомеров)
+        if self.composition_index is not None and self.composition_index.is_built:
+            rowids = self.composition_index.lookup(formula)
+            if rowids:
+                df = self._fetch_by_rowids(rowids)
+                if not df.empty:
+                    self.logger.info(
+                        f"✓ {formula} (стадия 2: индекс состава): найдено {len(df)} записей"
+                    )
+                    return df, False, 2
+
         # Стадия 2: БД только формула
         df = self._search_db_formula_only(formula)
         if not df.empty:
@@ -335,6 +387,44 @@ class CompoundDataLoader:
 
         return df, False, None
 
+    def resolve_prefetched(
+        self,
+        formula: str,
+        compound_names: Optional[List[str]],
+        prefetched: tuple[pd.DataFrame, bool, Optional[int]],
+    ) -> Optional[tuple[pd.DataFrame, bool, Optional[int]]]:
+        """
+        Результат get_raw_compound_data_with_metadata по данным, загруженным без имен.
+
+        Предзагрузка ищет вещество только по формуле (YAML-кэш и стадия 2).
+        Если LLM указал имена, дополнительно выполняется только стадия 1;
+        при пустом результате, как и в полном поиске, используются данные
+        стадии 2.
+
+        Args:
+            formula: Химическая формула
+            compound_names: Список имен из LLM response (опционально)
+            prefetched: Результат get_raw_compound_data_with_metadata(formula)
+
+        Returns:
+            (df, is_yaml_cache, search_stage) или None, если нужен полный поиск
+        """
+        df, is_yaml_cache, _ = prefetched
+        if is_yaml_cache or not compound_names:
+            return prefetched
+        if df.empty:
+            return None
+
+        first_name = compound_names[0]
+        named_df = self._search_db_with_name(formula, first_name)
+        if not named_df.empty:
+            self.logger.info(
+                f"✓ {formula} (стадия 1: формула + '{first_name}'): "
+                f"найдено {len(named_df)} записей"
+            )
+            return named_df, False, 1
+        return prefetched
+
     def get_raw_compound_data_with_optimization_support(
         self,
         formula: str,
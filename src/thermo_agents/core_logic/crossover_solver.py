@@ -0,0 +1,345 @@
+"""
+Exact crossover temperatures of a reaction: ΔG(T) = 0 and ln K(T) = target.
+
+Instead of reading the sign change of ΔG off a 100 K table, roots are found
+by a safeguarded Newton iteration with analytic derivatives:
+
+    d(ΔG)/dT = -ΔS,        d(ln K)/dT = ΔH / (R·T²)
+
+The temperature window is split into segments at every record boundary
+(Tmin/Tmax of the selected records, the extrapolation limit) and at the
+melting/boiling points from PhaseTransitionDetector. Inside a segment each
+compound uses one fixed record, so the functions are smooth; the record
+choice per segment is the one ReactionEngine makes. A sign change across a
+segment boundary (a jump at a phase transition) is reported at the boundary
+with at_transition=True instead of being iterated on.
+
+Each segment is scanned with a coarse step; a subinterval without a sign
+change is bisected only if the derivatives at its ends point to an interior
+extremum that could touch zero. A typical root costs 3-6 evaluations.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .thermodynamic_engine import ThermodynamicEngine
+
+
+@dataclass
+class Crossover:
+    """Температура, при которой ΔG = 0 или ln K = target."""
+
+    T: float
+    quantity: str  # "delta_G" или "ln_K"
+    target: float
+    increasing: bool  # Функция растет через target при увеличении T
+    at_transition: bool = False  # Скачок через target на границе сегмента
+    evaluations: int = 0
+
+    @property
+    def becomes_spontaneous(self) -> bool:
+        """Выше T реакция самопроизвольна (ΔG убывает / ln K растет)."""
+        return self.increasing if self.quantity == "ln_K" else not self.increasing
+
+
+class CrossoverSolver:
+    """
+    Поиск температур равновесия (ΔG = 0) и температур с заданным ln K.
+    """
+
+    def __init__(
+        self,
+        thermo_engine: ThermodynamicEngine,
+        logger: Optional[logging.Logger] = None,
+        xtol: float = 1e-6,
+        scan_step: float = 500.0,
+        max_iter: int = 50,
+        max_depth: int = 6,
+    ):
+        """
+        Args:
+            thermo_engine: Расчет свойств веществ
+            logger: Логгер
+            xtol: Точность по температуре (K)
+            scan_step: Шаг грубого просмотра сегмента (K)
+            max_iter: Максимум итераций Ньютона на корень
+            max_depth: Глубина деления интервала при поиске двойных корней
+        """
+        self.thermo_engine = thermo_engine
+        self.logger = logger or logging.getLogger(__name__)
+        self.xtol = xtol
+        self.scan_step = scan_step
+        self.max_iter = max_iter
+        self.max_depth = max_depth
+        self.R = 8.314  # Дж/(моль·K)
+
+    # Публичный интерфейс
+
+    def find_equilibrium_temperatures(
+        self,
+        compound_records: Dict[str, Sequence[Any]],
+        coefficients: Dict[str, float],
+        t_start: float,
+        t_end: float,
+        transitions: Iterable[float] = (),
+    ) -> List[Crossover]:
+        """
+        Температуры, при которых ΔG(T) = 0.
+
+        Args:
+            compound_records: {formula: записи из RecordRangeBuilder}
+            coefficients: Стехиометрия {formula: coeff} (реагенты < 0)
+            t_start, t_end: Окно поиска (K)
+            transitions: Дополнительные точки разрыва (T плавления/кипения)
+
+        Returns:
+            Список Crossover по возрастанию T
+        """
+
+        def delta_G(T: float, dH: float, dS: float) -> Tuple[float, float]:
+            return dH - T * dS, -dS
+
+        return self._solve(
+            compound_records, coefficients, t_start, t_end, transitions,
+            delta_G, "delta_G", 0.0,
+        )
+
+    def find_ln_k_temperatures(
+        self,
+        compound_records: Dict[str, Sequence[Any]],
+        coefficients: Dict[str, float],
+        ln_k_target: float,
+        t_start: float,
+        t_end: float,
+        transitions: Iterable[float] = (),
+    ) -> List[Crossover]:
+        """
+        Температуры, при которых ln K(T) = ln_k_target.
+
+        Аргументы как в find_equilibrium_temperatures.
+        """
+
+        def ln_K(T: float, dH: float, dS: float) -> Tuple[float, float]:
+            return -(dH - T * dS) / (self.R * T) - ln_k_target, dH / (self.R * T * T)
+
+        return self._solve(
+            compound_records, coefficients, t_start, t_end, transitions,
+            ln_K, "ln_K", ln_k_target,
+        )
+
+    # Сегменты
+
+    @staticmethod
+    def segment_boundaries(
+        compound_records: Dict[str, Sequence[Any]],
+        t_start: float,
+        t_end: float,
+        transitions: Iterable[float] = (),
+    ) -> List[float]:
+        """Границы сегментов: края окна, Tmin/Tmax записей и точки переходов."""
+        points = {float(t_start), float(t_end)}
+        for records in compound_records.values():
+            for record in records:
+                points.add(float(record["Tmin"]))
+                points.add(float(record["Tmax"]))
+        for T in transitions:
+            if T is not None and not math.isnan(T):
+                points.add(float(T))
+        return sorted(T for T in points if t_start <= T <= t_end)
+
+    @staticmethod
+    def _choose_record(records: Sequence[Any], T: float) -> Tuple[Any, Optional[float]]:
+        """
+        Запись для температуры T по правилу ReactionEngine.
+
+        Returns:
+            (запись, T_max для экстраполяции или None)
+        """
+        for record in records:
+            if record["Tmin"] <= T <= record["Tmax"]:
+                return record, None
+        max_record = max(records, key=lambda r: r.get("Tmax", 0))
+        t_max_available = max_record.get("Tmax", 0)
+        if T > t_max_available:
+            return max_record, float(t_max_available)
+        return records[0], None
+
+    def _segment_evaluator(
+        self,
+        compound_records: Dict[str, Sequence[Any]],
+        coefficients: Dict[str, float],
+        a: float,
+        b: float,
+    ) -> Callable[[float], Tuple[float, float]]:
+        """Функция T -> (ΔH, ΔS) с записями, выбранными для сегмента (a, b)."""
+        middle = 0.5 * (a + b)
+        terms = []
+        for formula, records in compound_records.items():
+            coeff = coefficients.get(formula, 0)
+            if not coeff or not records:
+                continue
+            record, t_max = self._choose_record(records, middle)
+            at_max = (
+                self.thermo_engine.calculate_properties(record, t_max)
+                if t_max is not None
+                else None
+            )
+            terms.append((coeff, record, t_max, at_max))
+
+        def evaluate(T: float) -> Tuple[float, float]:
+            dH = dS = 0.0
+            for coeff, record, t_max, at_max in terms:
+                if at_max is None:
+                    props = self.thermo_engine.calculate_properties(record, T)
+                    H, S = props["enthalpy"], props["entropy"]
+                else:
+                    # Экстраполяция с постоянной Cp(T_max), как в ThermodynamicEngine
+                    H = at_max["enthalpy"] + at_max["cp"] * (T - t_max)
+                    S = at_max["entropy"] + at_max["cp"] * math.log(T / t_max)
+                dH += coeff * H
+                dS += coeff * S
+            return dH, dS
+
+        return evaluate
+
+    # Поиск корней
+
+    def _solve(
+        self,
+        compound_records: Dict[str, Sequence[Any]],
+        coefficients: Dict[str, float],
+        t_start: float,
+        t_end: float,
+        transitions: Iterable[float],
+        function: Callable[[float, float, float], Tuple[float, float]],
+        quantity: str,
+        target: float,
+    ) -> List[Crossover]:
+        """Корни function по всем сегментам окна."""
+        boundaries = self.segment_boundaries(compound_records, t_start, t_end, transitions)
+        crossovers: List[Crossover] = []
+        previous_end: Optional[float] = None  # Значение слева от текущей границы
+
+        for a, b in zip(boundaries, boundaries[1:]):
+            if b - a <= self.xtol:
+                continue
+            properties = self._segment_evaluator(compound_records, coefficients, a, b)
+            counter = [0]
+
+            def f(T: float) -> Tuple[float, float]:
+                counter[0] += 1
+                return function(T, *properties(T))
+
+            fa = f(a)
+            if previous_end is not None and previous_end * fa[0] < 0:
+                crossovers.append(Crossover(
+                    T=float(a), quantity=quantity, target=target,
+                    increasing=bool(fa[0] > 0), at_transition=True, evaluations=1,
+                ))
+
+            n_steps = max(1, math.ceil((b - a) / self.scan_step))
+            left = (a, fa)
+            for i in range(1, n_steps + 1):
+                x = b if i == n_steps else a + (b - a) * i / n_steps
+                right = (x, f(x))
+                crossovers.extend(self._roots_in(f, left, right, quantity, target, counter, 0))
+                left = right
+
+            previous_end = left[1][0]
+
+        unique: List[Crossover] = []
+        for crossover in sorted(crossovers, key=lambda c: c.T):
+            if unique and abs(crossover.T - unique[-1].T) <= 10 * self.xtol:
+                continue
+            unique.append(crossover)
+
+        self.logger.info(
+            f"Найдено {len(unique)} точек {quantity} = {target:g} в диапазоне "
+            f"{t_start:.0f}-{t_end:.0f}K ({len(boundaries) - 1} сегментов)"
+        )
+        return unique
+
+    def _roots_in(
+        self,
+        f: Callable[[float], Tuple[float, float]],
+        left: Tuple[float, Tuple[float, float]],
+        right: Tuple[float, Tuple[float, float]],
+        quantity: str,
+        target: float,
+        counter: List[int],
+        depth: int,
+    ) -> List[Crossover]:
+        """Корни на [left, right]: по смене знака или в окрестности экстремума."""
+        (x0, (f0, d0)), (x1, (f1, d1)) = left, right
+
+        if f0 == 0.0:
+            # Корень в узле; остаток отрезка просматривается со сдвигом
+            root = Crossover(float(x0), quantity, target, bool(d0 > 0), evaluations=1)
+            shifted = x0 + 1e-3 * (x1 - x0)
+            return [root] + self._roots_in(
+                f, (shifted, f(shifted)), right, quantity, target, counter, depth
+            )
+        if f0 * f1 < 0:
+            start = counter[0]
+            T = self._newton(f, x0, f0, x1, f1)
+            return [Crossover(
+                float(T), quantity, target, bool(f1 > f0), evaluations=counter[0] - start
+            )]
+
+        # Нет смены знака: двойной корень возможен, только если функция
+        # движется к нулю с левого края и удаляется от него у правого
+        if depth >= self.max_depth or f1 == 0.0:
+            return []
+        if not (f0 * d0 < 0 and f1 * d1 > 0):
+            return []
+        # Касательные с концов пересекаются, не дойдя до нуля: для выпуклой
+        # на сегменте функции (ΔCp одного знака) корня нет
+        reach = abs(f0 / d0) + abs(f1 / d1)
+        if reach > x1 - x0:
+            return []
+
+        xm = 0.5 * (x0 + x1)
+        middle = (xm, f(xm))
+        return self._roots_in(f, left, middle, quantity, target, counter, depth + 1) + (
+            self._roots_in(f, middle, right, quantity, target, counter, depth + 1)
+        )
+
+    def _newton(
+        self,
+        f: Callable[[float], Tuple[float, float]],
+        lo: float,
+        f_lo: float,
+        hi: float,
+        f_hi: float,
+    ) -> float:
+        """
+        Ньютон с аналитической производной внутри отрезка смены знака.
+
+        Шаг, выходящий за текущий отрезок, заменяется делением пополам;
+        отрезок сужается после каждой оценки.
+        """
+        if f_lo > 0:  # Ориентация: f(lo) < 0 < f(hi)
+            lo, hi, f_lo, f_hi = hi, lo, f_hi, f_lo
+
+        x = lo - f_lo * (hi - lo) / (f_hi - f_lo)  # Начальная точка — секущая
+        for _ in range(self.max_iter):
+            value, derivative = f(x)
+            if value == 0.0:
+                return x
+            if value < 0:
+                lo = x
+            else:
+                hi = x
+
+            step = value / derivative if derivative else float("inf")
+            x_new = x - step
+            if not (min(lo, hi) < x_new < max(lo, hi)):
+                x_new = 0.5 * (lo + hi)
+            if abs(x_new - x) < self.xtol or abs(hi - lo) < self.xtol:
+                return x_new
+            x = x_new
+
+        self.logger.warning(f"⚠ Ньютон не сошелся за {self.max_iter} итераций, T≈{x:.3f}K")
+        return x
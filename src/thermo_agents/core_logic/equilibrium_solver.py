@@ -0,0 +1,392 @@
+"""
+Equilibrium composition by Gibbs energy minimization.
+
+Model: ideal gas mixture at pressure P plus pure condensed phases (activity
+1). For species i with standard Gibbs energy g_i = G°_i(T)/(R·T), element
+matrix A (elements x species) and element amounts b, the composition
+minimizes
+
+    G/RT = Σ_gas n_i (g_i + ln P + ln(n_i / N_gas)) + Σ_cond n_j g_j,
+    subject to A·n = b, n ≥ 0.
+
+The problem is convex; it is solved through its dual in the element
+potentials λ (one variable per element, as in the element-potential method
+of NASA CEA / STANJAN):
+
+    maximize b·λ
+    subject to Σ_gas exp(a_i·λ - g_i - ln P) ≤ 1,   a_j·λ ≤ g_j (condensed).
+
+At the optimum gas mole fractions are x_i = exp(a_i·λ - g_i - ln P), so trace
+species keep full relative accuracy; condensed species with a_j·λ = g_j are
+present, and the gas amount and condensed moles follow from the element
+balance (non-negative least squares).
+
+Standard Gibbs energies for the whole temperature grid come from one
+vectorized tabulation per species (same record choice as ReactionEngine);
+the phase of the chosen record decides gas vs condensed at each T. The grid
+is then solved point by point, each point warm-started from the previous
+element potentials. Every point reports convergence diagnostics: optimizer
+iterations, element balance residual and the largest violation of the
+optimality conditions (the last two are the convergence criterion).
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..utils.chem_utils import parse_composition
+from .reaction_engine import ReactionEngine
+from .thermo_tables import record_phases, tabulate_records
+
+
+@dataclass
+class EquilibriumResult:
+    """Равновесный состав на сетке температур."""
+
+    species: List[str]
+    temperatures: np.ndarray
+    pressure_bar: float
+    initial_amounts: Dict[str, float]
+    elements: List[str]
+    moles: np.ndarray  # вещество × температура
+    is_gas: np.ndarray  # вещество × температура
+    element_potentials: np.ndarray  # элемент × температура (λ, безразмерные)
+    converged: np.ndarray
+    iterations: np.ndarray
+    balance_residual: np.ndarray  # max |A·n - b| / max b
+    optimality_residual: np.ndarray  # max нарушение условий оптимальности
+    messages: List[str] = field(default_factory=list)
+    missing: Dict[str, str] = field(default_factory=dict)
+
+    def mole_fractions(self) -> np.ndarray:
+        """Мольные доли в газовой фазе (конденсированные вещества — 0)."""
+        gas_moles = np.where(self.is_gas, self.moles, 0.0)
+        total = gas_moles.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(total > 0, gas_moles / total, 0.0)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Таблица: T и моли каждого вещества, затем диагностика сходимости."""
+        data = {"T": self.temperatures}
+        for i, formula in enumerate(self.species):
+            data[formula] = self.moles[i]
+        data["converged"] = self.converged
+        data["iterations"] = self.iterations
+        data["balance_residual"] = self.balance_residual
+        return pd.DataFrame(data)
+
+
+class GibbsEquilibriumSolver:
+    """
+    Равновесный состав смеси минимизацией энергии Гиббса.
+
+    Использует компоненты ReactionEngine (загрузчик, отбор записей, расчет
+    свойств) для G°(T) веществ.
+    """
+
+    def __init__(
+        self,
+        reaction_engine: ReactionEngine,
+        logger: Optional[logging.Logger] = None,
+        tol: float = 1e-12,
+        max_iter: int = 500,
+    ):
+        self.engine = reaction_engine
+        self.logger = logger or reaction_engine.logger
+        self.tol = tol
+        self.max_iter = max_iter
+        self.R = reaction_engine.R
+
+    # Данные веществ
+
+    def species_gibbs(
+        self,
+        species: Sequence[str],
+        temperatures: np.ndarray,
+        compound_names: Optional[Dict[str, List[str]]] = None,
+        compound_types: Optional[Dict[str, bool]] = None,
+    ) -> Tuple[List[str], np.ndarray, np.ndarray, Dict[str, str]]:
+        """
+        G°/RT и признак газа для каждого вещества на сетке (каждое вещество
+        загружается один раз).
+
+        Returns:
+            (найденные вещества, g (вещество × T), is_gas (вещество × T),
+            {вещество: причина пропуска})
+        """
+        T = np.asarray(temperatures, dtype=np.float64)
+        found, g_rows, gas_rows, missing = [], [], [], {}
+
+        for formula in dict.fromkeys(species):
+            try:
+                names = (compound_names or {}).get(formula)
+                df = self.engine.compound_loader.get_raw_compound_data(formula, names)
+                if df.empty:
+                    missing[formula] = "нет данных"
+                    continue
+
+                melting, boiling = self.engine.phase_detector.get_most_common_melting_boiling_points(df)
+                # Вырожденный диапазон (одна температура) отбор записей не принимает
+                t_range = [T.min(), max(T.max(), T.min() + 1.0)]
+                records = self.engine.range_builder.get_compound_records_for_range(
+                    df, t_range, melting, boiling,
+                    is_elemental=(compound_types or {}).get(formula),
+                )
+                if not records:
+                    missing[formula] = "нет записей для диапазона"
+                    continue
+
+                values = tabulate_records(records, T, self.engine.thermo_engine)
+                phases = record_phases(records, T)
+            except Exception as e:
+                self.logger.warning(f"⚠ {formula}: не удалось загрузить данные: {e}")
+                missing[formula] = str(e)
+                continue
+
+            g_rows.append((values[1] - T * values[2]) / (self.R * T))
+            gas_rows.append(np.array([str(p).lower().startswith("g") for p in phases]))
+            found.append(formula)
+
+        g = np.array(g_rows).reshape(len(found), len(T))
+        is_gas = np.array(gas_rows, dtype=bool).reshape(len(found), len(T))
+        return found, g, is_gas, missing
+
+    # Расчет
+
+    def solve(
+        self,
+        species: Sequence[str],
+        initial_amounts: Dict[str, float],
+        temperatures: Sequence[float],
+        pressure_bar: float = 1.0,
+        compound_names: Optional[Dict[str, List[str]]] = None,
+        compound_types: Optional[Dict[str, bool]] = None,
+    ) -> EquilibriumResult:
+        """
+        Равновесный состав для каждой температуры сетки.
+
+        Args:
+            species: Возможные вещества (газы и конденсированные фазы)
+            initial_amounts: Исходные количества {formula: моль}; задают
+                количества элементов
+            temperatures: Температуры (K)
+            pressure_bar: Давление (бар)
+            compound_names: Названия веществ для поиска {formula: [names]}
+            compound_types: {formula: is_elemental} для отбора записей
+
+        Returns:
+            EquilibriumResult
+
+        Raises:
+            ValueError: Если состав исходных веществ не распознан или для
+                элемента нет ни одного вещества с данными
+        """
+        T = np.asarray(temperatures, dtype=np.float64)
+        candidates = list(dict.fromkeys(list(species) + list(initial_amounts)))
+        found, g, is_gas, missing = self.species_gibbs(
+            candidates, T, compound_names, compound_types
+        )
+
+        b_by_element: Dict[str, float] = {}
+        for formula, amount in initial_amounts.items():
+            composition = parse_composition(formula)
+            if not composition:
+                raise ValueError(f"Не удалось разобрать формулу {formula}")
+            for element, count in composition.items():
+                b_by_element[element] = b_by_element.get(element, 0.0) + count * amount
+
+        elements = sorted(el for el, amount in b_by_element.items() if amount > 0)
+        compositions = {formula: parse_composition(formula) or {} for formula in found}
+
+        # Вещества с элементами, которых нет в исходной смеси, в равновесии отсутствуют
+        usable = [
+            i for i, formula in enumerate(found)
+            if compositions[formula] and set(compositions[formula]) <= set(elements)
+        ]
+        for i, formula in enumerate(found):
+            if i not in usable:
+                missing[formula] = "элементы вне исходной смеси"
+
+        A = np.array(
+            [[compositions[found[i]].get(el, 0.0) for i in usable] for el in elements]
+        ).reshape(len(elements), len(usable))
+        b = np.array([b_by_element[el] for el in elements])
+        uncovered = [el for e, el in enumerate(elements) if not A[e].any()]
+        if uncovered:
+            raise ValueError(f"Нет веществ с данными для элементов: {', '.join(uncovered)}")
+
+        moles = np.zeros((len(found), len(T)))
+        potentials = np.zeros((len(elements), len(T)))
+        converged = np.zeros(len(T), dtype=bool)
+        iterations = np.zeros(len(T), dtype=int)
+        balance = np.zeros(len(T))
+        optimality = np.zeros(len(T))
+        messages = []
+
+        warm_start = None
+        for k in range(len(T)):
+            point = self.solve_point(g[usable, k], is_gas[usable, k], A, b, pressure_bar, warm_start)
+            n, lam, success, nit, message = point
+            moles[usable, k] = n
+            potentials[:, k] = lam
+            iterations[k] = nit
+            balance[k] = np.max(np.abs(A @ n - b)) / np.max(b)
+            optimality[k] = self.optimality_residual(
+                n, g[usable, k], is_gas[usable, k], A, lam, pressure_bar
+            )
+            # Критерий — невязки баланса и условий оптимальности: SLSQP при
+            # жестком ftol может сообщить об ошибке line search уже в оптимуме
+            converged[k] = balance[k] < 1e-8 and optimality[k] < 1e-6
+            if not converged[k]:
+                status = "" if success else " (оптимизатор не сошелся)"
+                messages.append(f"T={T[k]:.1f}K: {message}{status}")
+            warm_start = lam
+
+        self.logger.info(
+            f"Равновесие: {len(usable)} веществ, {len(elements)} элементов, {len(T)} температур, "
+            f"сошлось {int(converged.sum())}/{len(T)}"
+        )
+        if missing:
+            self.logger.warning(f"Вещества исключены: {missing}")
+
+        return EquilibriumResult(
+            species=found,
+            temperatures=T,
+            pressure_bar=pressure_bar,
+            initial_amounts=dict(initial_amounts),
+            elements=elements,
+            moles=moles,
+            is_gas=is_gas,
+            element_potentials=potentials,
+            converged=converged,
+            iterations=iterations,
+            balance_residual=balance,
+            optimality_residual=optimality,
+            messages=messages,
+            missing=missing,
+        )
+
+    def solve_point(
+        self,
+        g: np.ndarray,
+        is_gas: np.ndarray,
+        A: np.ndarray,
+        b: np.ndarray,
+        pressure_bar: float = 1.0,
+        warm_start: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, bool, int, str]:
+        """
+        Минимум G при одной температуре (двойственная задача по λ).
+
+        Args:
+            g: G°/RT веществ
+            is_gas: Признак газа
+            A: Матрица элементов (элемент × вещество)
+            b: Количества элементов
+            pressure_bar: Давление (бар)
+            warm_start: λ предыдущей температуры
+
+        Returns:
+            (моли веществ, λ, успех, итерации, сообщение оптимизатора)
+        """
+        # scipy.optimize импортируется ~0.3 с: откладываем до первого расчета
+        from scipy.optimize import minimize, nnls
+        from scipy.special import logsumexp
+
+        gas = np.flatnonzero(is_gas)
+        condensed = np.flatnonzero(~is_gas)
+        ln_P = np.log(pressure_bar)
+        A_gas, A_cond = A[:, gas], A[:, condensed]
+        g_gas, g_cond = g[gas] + ln_P, g[condensed]
+
+        constraints = []
+        if len(gas):
+            constraints.append({
+                "type": "ineq",
+                "fun": lambda lam: -logsumexp(lam @ A_gas - g_gas),
+                "jac": lambda lam: -(A_gas @ _softmax(lam @ A_gas - g_gas)),
+            })
+        if len(condensed):
+            constraints.append({
+                "type": "ineq",
+                "fun": lambda lam: g_cond - lam @ A_cond,
+                "jac": lambda lam: -A_cond.T,
+            })
+
+        if warm_start is None:
+            # Допустимая начальная точка: при λ_e ≤ min(g) - |ln n| - 10
+            # все ограничения выполнены с запасом
+            warm_start = np.full(len(b), min(np.min(g_gas, initial=0.0), np.min(g_cond, initial=0.0))
+                                 - np.log(len(g)) - 10.0)
+
+        scale = np.max(b)
+        result = minimize(
+            lambda lam: -(b @ lam) / scale,
+            warm_start,
+            jac=lambda lam: -b / scale,
+            constraints=constraints,
+            method="SLSQP",
+            options={"ftol": self.tol, "maxiter": self.max_iter},
+        )
+        lam = result.x
+
+        n = np.zeros(len(g))
+        columns, owners = [], []
+        if len(gas):
+            x_gas = np.exp(lam @ A_gas - g_gas)
+            columns.append(A_gas @ x_gas)
+            owners.append(None)
+        for j, index in enumerate(condensed):
+            if g_cond[j] - lam @ A_cond[:, j] < 1e-7:  # Активное ограничение: фаза присутствует
+                columns.append(A_cond[:, j])
+                owners.append(index)
+
+        if columns:
+            amounts, _ = nnls(np.column_stack(columns), b)
+            for amount, owner in zip(amounts, owners):
+                if owner is None:
+                    n[gas] = amount * x_gas
+                else:
+                    n[owner] = amount
+
+        return n, lam, bool(result.success), int(result.nit), str(result.message)
+
+    def optimality_residual(
+        self,
+        n: np.ndarray,
+        g: np.ndarray,
+        is_gas: np.ndarray,
+        A: np.ndarray,
+        lam: np.ndarray,
+        pressure_bar: float,
+    ) -> float:
+        """
+        Максимальное нарушение условий оптимальности.
+
+        Газы: |Σx - 1| при наличии газовой фазы; конденсированные:
+        max(0, a_j·λ - g_j) (фаза снизила бы G) и |g_j - a_j·λ| для
+        присутствующих фаз.
+        """
+        residual = 0.0
+        gas = is_gas & (n > 0)
+        if gas.any():
+            x = np.exp(lam @ A[:, is_gas] - g[is_gas] - np.log(pressure_bar))
+            residual = abs(x.sum() - 1.0)
+
+        condensed = ~is_gas
+        if condensed.any():
+            slack = g[condensed] - lam @ A[:, condensed]
+            residual = max(residual, float(np.max(np.maximum(-slack, 0.0))))
+            present = n[condensed] > 0
+            if present.any():
+                residual = max(residual, float(np.max(np.abs(slack[present]))))
+        return residual
+
+
+def _softmax(values: np.ndarray) -> np.ndarray:
+    """exp(values) / Σ exp(values) без переполнения."""
+    shifted = np.exp(values - np.max(values))
+    return shifted / shifted.sum()
@@ -14,8 +14,10 @@ import pandas as pd
 
 from ..models.extraction import ExtractedReactionParameters
 from .compound_data_loader import CompoundDataLoader
+from .crossover_solver import Crossover, CrossoverSolver
 from .phase_transition_detector import PhaseTransitionDetector
 from .record_range_builder import RecordRangeBuilder
+from .thermo_tables import ThermoTable
 from .thermodynamic_engine import ThermodynamicEngine
 
 
@@ -31,6 +33,7 @@ class ReactionEngine:
         range_builder: RecordRangeBuilder,
         thermo_engine: ThermodynamicEngine,
         logger: logging.Logger,
+        thermo_table: Optional[ThermoTable] = None,
     ):
         self.compound_loader = compound_loader
         self.phase_detector = phase_detector
@@ -39,6 +42,167 @@ class ReactionEngine:
         self.logger = logger
         self.R = 8.314  # Дж/(моль·K)
 
+        # Предрассчитанные таблицы свойств (см. core_logic.thermo_tables)
+        self.thermo_table = thermo_table
+
+        # Точные температуры равновесия (см. core_logic.crossover_solver)
+        self.crossover_solver = CrossoverSolver(thermo_engine, logger)
+
+    def calculate_reaction_from_table(
+        self,
+        params: ExtractedReactionParameters,
+        temperature_range: List[float],
+    ) -> Optional[pd.DataFrame]:
+        """
+        Расчет реакции по предрассчитанным таблицам свойств.
+
+        ΔH(T) и ΔS(T) — взвешенные стехиометрическими коэффициентами суммы
+        строк таблицы (линейная интерполяция по сетке), без загрузки данных
+        и отбора записей.
+
+        Args:
+            params: Параметры из LLM (формулы, стехиометрия, уравнение)
+            temperature_range: [T_start, T_end, step] в K
+
+        Returns:
+            DataFrame в формате calculate_reaction или None, если таблицы
+            не загружены, в них нет одного из веществ или диапазон выходит
+            за пределы сетки
+        """
+        T_start, T_end, T_step = temperature_range
+        if self.thermo_table is None or not self.thermo_table.covers(
+            params.all_compounds, T_start, T_end
+        ):
+            return None
+
+        try:
+            reaction_coeffs = self.parse_reaction_equation(
+                params.balanced_equation, params.all_compounds
+            )
+        except Exception as e:
+            self.logger.error(f"Ошибка парсинга уравнения '{params.balanced_equation}': {e}")
+            raise ValueError(f"Ошибка парсинга уравнения: {e}")
+
+        temperatures = np.arange(T_start, T_end + T_step, T_step)
+        if temperatures[-1] > self.thermo_table.t_max:
+            return None
+
+        formulas = list(params.all_compounds)
+        coeffs = np.array([reaction_coeffs.get(formula, 0) for formula in formulas])
+        block = self.thermo_table.interpolate(formulas, temperatures)
+
+        delta_H = coeffs @ block[:, 1, :]
+        delta_S = coeffs @ block[:, 2, :]
+
+        self.logger.info(
+            f"✓ Расчет по таблицам: {params.balanced_equation}, "
+            f"{len(temperatures)} температурных точек"
+        )
+        return self._reaction_frame(temperatures, delta_H, delta_S)
+
+    def _table_selection_matches(
+        self, params: ExtractedReactionParameters, temperature_range: List[float]
+    ) -> bool:
+        """
+        Можно ли считать реакцию по таблицам: отбор записей запроса
+        совпадает с отбором при построении таблиц (ThermoTable.selection_matches).
+        """
+        return self.thermo_table is not None and self.thermo_table.selection_matches(
+            params.all_compounds,
+            temperature_range[0],
+            temperature_range[1],
+            compound_names=params.compound_names,
+            compound_types=params.compound_types,
+        )
+
+    def _table_metadata(
+        self, params: ExtractedReactionParameters, temperature_range: List[float]
+    ) -> Dict[str, Any]:
+        """Метаданные веществ (как в calculate_reaction_with_metadata) из отбора таблиц."""
+        compounds_metadata = {}
+        for formula in params.all_compounds:
+            selected = self.thermo_table.selected_records(
+                formula,
+                temperature_range[0],
+                temperature_range[1],
+                params.compound_names.get(formula) if params.compound_names else None,
+            )
+            compounds_metadata[formula] = self._compound_metadata(
+                selected["records"],
+                selected["melting"],
+                selected["boiling"],
+                selected["is_yaml_cache"],
+                selected["search_stage"],
+            )
+        return compounds_metadata
+
+    @staticmethod
+    def _compound_metadata(
+        records: List[pd.Series],
+        melting: Optional[float],
+        boiling: Optional[float],
+        is_yaml_cache: bool,
+        search_stage: Optional[int],
+    ) -> Dict[str, Any]:
+        """Метаданные вещества: отобранные записи и фазовые переходы между ними."""
+        # Собираем информацию о фазовых переходах на основе данных Tmin/Tmax
+        phase_transitions = []
+
+        # Сортируем записи по Tmin для определения последовательности фаз
+        sorted_records = sorted(records, key=lambda r: r.get("Tmin", float("inf")))
+
+        for i, record in enumerate(sorted_records):
+            current_phase = record.get("Phase", "unknown")
+            current_Tmin = record.get("Tmin")
+            current_Tmax = record.get("Tmax")
+
+            # Пропускаем записи без температурных данных
+            if current_Tmin is None or current_Tmax is None:
+                continue
+
+            # Ищем следующую запись с другой фазой
+            for next_record in sorted_records[i + 1 :]:
+                next_phase = next_record.get("Phase", "unknown")
+                next_Tmin = next_record.get("Tmin")
+
+                # Если фаза изменилась, фиксируем переход
+                if next_phase != current_phase and next_Tmin is not None:
+                    # Переход происходит в начале следующей записи
+                    phase_transitions.append((next_Tmin, current_phase, next_phase))
+                    break
+
+        return {
+            "records_used": records,
+            "melting_point": melting,
+            "boiling_point": boiling,
+            "phase_transitions": phase_transitions,
+            "is_yaml_cache": is_yaml_cache,
+            "search_stage": search_stage,
+        }
+
+    def _reaction_frame(
+        self, temperatures: np.ndarray, delta_H: np.ndarray, delta_S: np.ndarray
+    ) -> pd.DataFrame:
+        """DataFrame результата (T, ΔH, ΔS, ΔG, ln(K), K) по массивам ΔH и ΔS."""
+        delta_G = delta_H - temperatures * delta_S
+        ln_K = np.where(temperatures > 0, -delta_G / (self.R * temperatures), 0.0)
+        with np.errstate(over="ignore"):
+            K = np.where(
+                np.abs(ln_K) < 700, np.exp(np.clip(ln_K, -700, 700)),
+                np.where(ln_K > 0, np.inf, 0.0),
+            )  # Избегаем overflow
+
+        return pd.DataFrame(
+            {
+                "T": temperatures,
+                "delta_H": delta_H,
+                "delta_S": delta_S,
+                "delta_G": delta_G,
+                "ln_K": ln_K,
+                "K": K,
+            }
+        )
+
     def calculate_reaction(
         self,
         params: ExtractedReactionParameters,
@@ -69,6 +233,11 @@ class ReactionEngine:
         3. Вернуть DataFrame с колонками:
            T (K), ΔH (Дж/моль), ΔS (Дж/(моль·K)), ΔG (Дж/моль), ln(K), K
 
+        Если заданы предрассчитанные таблицы (thermo_table) и отбор записей
+        запроса совпадает с табличным (нет compound_names и compound_types,
+        окно равно окну сетки), шаги 1-2 заменяются расчетом
+        calculate_reaction_from_table.
+
         Args:
             params: Параметры из LLM (формулы, стехиометрия, уравнение)
             temperature_range: [T_start, T_end, step] в K
@@ -86,6 +255,12 @@ class ReactionEngine:
             - ⚠ T={T}K: нет подходящей записи для {formula}
             - ✓ Расчет завершен: {N} температурных точек
         """
+        # Отбор записей совпадает с табличным: расчет без загрузки
+        if self._table_selection_matches(params, temperature_range):
+            df_table = self.calculate_reaction_from_table(params, temperature_range)
+            if df_table is not None:
+                return df_table
+
         # Парсим уравнение реакции
         equation = params.balanced_equation
         all_compounds = params.all_compounds
@@ -289,8 +464,13 @@ class ReactionEngine:
             for compound in sorted_compounds:
                 # Экранируем спецсимволы в формуле
                 escaped_compound = re.escape(compound)
-                # Паттерн: опциональный коэффициент + формула + граница слова
-                pattern = r"(\d*\.?\d*)\s*" + escaped_compound + r"(?:\s|$|\+)"
+                # Паттерн: граница слагаемого + опциональный коэффициент + формула
+                # + граница слова (O2 не должен совпадать внутри CO2)
+                pattern = (
+                    r"(?:^|(?<=[\s+]))(\d*\.?\d*)\s*"
+                    + escaped_compound
+                    + r"(?=\s|$|\+)"
+                )
 
                 matches = re.finditer(pattern, side_str)
 
@@ -323,12 +503,85 @@ class ReactionEngine:
 
         return reaction_coeffs
 
+    def find_crossover_temperatures(
+        self,
+        params: ExtractedReactionParameters,
+        temperature_range: List[float],
+        compounds_metadata: Optional[Dict[str, Any]] = None,
+        target_k: Optional[float] = None,
+    ) -> List[Crossover]:
+        """
+        Точные температуры, при которых ΔG = 0 (и K = target_k, если задана).
+
+        Корни ищутся методом Ньютона с аналитическими производными по
+        сегментам между границами записей и точками фазовых переходов
+        (CrossoverSolver), без плотной сетки температур.
+
+        Args:
+            params: Параметры из LLM
+            temperature_range: [T_start, T_end, ...] в K
+            compounds_metadata: Метаданные calculate_reaction_with_metadata;
+                если не заданы, данные веществ загружаются заново
+            target_k: Целевая константа равновесия (K > 0)
+
+        Returns:
+            Список Crossover по возрастанию T (сначала ΔG = 0, затем K = target_k)
+        """
+        T_start, T_end = temperature_range[0], temperature_range[1]
+        if compounds_metadata is None:
+            _, compounds_metadata = self.calculate_reaction_with_metadata(
+                params, [T_start, T_end, T_end - T_start]
+            )
+
+        coefficients = self.parse_reaction_equation(
+            params.balanced_equation, params.all_compounds
+        )
+        compound_records = {
+            formula: metadata["records_used"]
+            for formula, metadata in compounds_metadata.items()
+        }
+        transitions = [
+            T
+            for metadata in compounds_metadata.values()
+            for T in (metadata.get("melting_point"), metadata.get("boiling_point"))
+            if T is not None
+        ]
+
+        crossovers = self.crossover_solver.find_equilibrium_temperatures(
+            compound_records, coefficients, T_start, T_end, transitions
+        )
+        if target_k is not None:
+            crossovers += self.crossover_solver.find_ln_k_temperatures(
+                compound_records, coefficients, float(np.log(target_k)),
+                T_start, T_end, transitions,
+            )
+        return crossovers
+
     def calculate_reaction_with_metadata(
-        self, params: ExtractedReactionParameters, temperature_range: List[float]
+        self,
+        params: ExtractedReactionParameters,
+        temperature_range: List[float],
+        frames: Optional[Dict[str, Tuple[pd.DataFrame, bool, Optional[int]]]] = None,
+        records_cache: Optional[Dict[tuple, List[pd.Series]]] = None,
     ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """
         Расчет реакции с возвратом метаданных об отобранных записях.
 
+        Если отбор записей совпадает с табличным (см. calculate_reaction),
+        результат и метаданные берутся из таблиц без загрузки веществ;
+        иначе вещества загружаются и записи отбираются для окна.
+
+        Args:
+            params: Параметры из LLM
+            temperature_range: [T_start, T_end, step] в K
+            frames: Кэш загруженных данных {formula: (df, is_yaml_cache, search_stage)}.
+                Найденные в нем вещества не загружаются повторно, новые
+                добавляются; отбор записей выполняется заново для диапазона.
+            records_cache: Кэш отобранных записей
+                {(formula, T_start, T_end, is_elemental): records}; при пакетной
+                обработке вещество, общее для многих запросов, отбирается для
+                диапазона один раз
+
         Returns:
             (df_result, compounds_metadata)
 
@@ -343,6 +596,13 @@ class ReactionEngine:
                 }
             }
         """
+        # Отбор записей совпадает с табличным: ΔH, ΔS и метаданные записей
+        # из таблиц, без загрузки веществ
+        if self._table_selection_matches(params, temperature_range):
+            df_table = self.calculate_reaction_from_table(params, temperature_range)
+            if df_table is not None:
+                return df_table, self._table_metadata(params, temperature_range)
+
         # Парсим уравнение реакции
         equation = params.balanced_equation
         all_compounds = params.all_compounds
@@ -368,12 +628,17 @@ class ReactionEngine:
                 else None
             )
 
-            # Загружаем данные из БД
-            df, is_yaml_cache, search_stage = (
-                self.compound_loader.get_raw_compound_data_with_metadata(
-                    formula, compound_names
+            # Загружаем данные из БД (или берем из кэша сессии)
+            if frames is not None and formula in frames:
+                df, is_yaml_cache, search_stage = frames[formula]
+            else:
+                df, is_yaml_cache, search_stage = (
+                    self.compound_loader.get_raw_compound_data_with_metadata(
+                        formula, compound_names
+                    )
                 )
-            )
+                if frames is not None:
+                    frames[formula] = (df, is_yaml_cache, search_stage)
 
             if df.empty:
                 self.logger.error(f"⚠ {formula}: нет данных в БД")
@@ -392,9 +657,15 @@ class ReactionEngine:
                 params.compound_types.get(formula) if params.compound_types else None
             )
 
-            records = self.range_builder.get_compound_records_for_range(
-                df, t_range_full, melting, boiling, is_elemental=is_elemental
-            )
+            records_key = (formula, *t_range_full, is_elemental)
+            if records_cache is not None and records_key in records_cache:
+                records = records_cache[records_key]
+            else:
+                records = self.range_builder.get_compound_records_for_range(
+                    df, t_range_full, melting, boiling, is_elemental=is_elemental
+                )
+                if records_cache is not None:
+                    records_cache[records_key] = records
 
             if not records:
                 self.logger.error(
@@ -402,44 +673,10 @@ class ReactionEngine:
                 )
                 raise ValueError(f"Не удалось получить записи для вещества {formula}")
 
-            # Собираем информацию о фазовых переходах на основе данных Tmin/Tmax
-            phase_transitions = []
-
-            # Сортируем записи по Tmin для определения последовательности фаз
-            sorted_records = sorted(records, key=lambda r: r.get("Tmin", float("inf")))
-
-            for i, record in enumerate(sorted_records):
-                current_phase = record.get("Phase", "unknown")
-                current_Tmin = record.get("Tmin")
-                current_Tmax = record.get("Tmax")
-
-                # Пропускаем записи без температурных данных
-                if current_Tmin is None or current_Tmax is None:
-                    continue
-
-                # Ищем следующую запись с другой фазой
-                for next_record in sorted_records[i + 1 :]:
-                    next_phase = next_record.get("Phase", "unknown")
-                    next_Tmin = next_record.get("Tmin")
-
-                    # Если фаза изменилась, фиксируем переход
-                    if next_phase != current_phase and next_Tmin is not None:
-                        # Переход происходит в начале следующей записи
-                        transition_T = next_Tmin
-                        phase_transitions.append(
-                            (transition_T, current_phase, next_phase)
-                        )
-                        break
-
             # Сохраняем метаданные
-            compounds_metadata[formula] = {
-                "records_used": records,
-                "melting_point": melting,
-                "boiling_point": boiling,
-                "phase_transitions": phase_transitions,
-                "is_yaml_cache": is_yaml_cache,
-                "search_stage": search_stage,
-            }
+            compounds_metadata[formula] = self._compound_metadata(
+                records, melting, boiling, is_yaml_cache, search_stage
+            )
 
             compound_data[formula] = {
                 "records": records,
@@ -0,0 +1,327 @@
+"""
+Reaction screening over a fixed set of species.
+
+Many candidate reactions over the same species (e.g. reduction routes for
+Fe2O3, chlorination of TiO2) are evaluated together: each species' records
+are loaded and tabulated once into species x T matrices of H and S (from the
+precomputed ThermoTable when it covers the species, otherwise via the usual
+record selection), and ΔH, ΔS, ΔG and ln K of all reactions are obtained as
+one product of the stoichiometric matrix with those matrices.
+
+Reactions are either given as balanced equations or enumerated from element
+balance: every minimal subset of species whose element matrix has a
+one-dimensional null space yields one balanced reaction.
+"""
+
+import itertools
+import logging
+import math
+from dataclasses import dataclass, field
+from fractions import Fraction
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..utils.chem_utils import parse_composition
+from .reaction_engine import ReactionEngine
+from .thermo_tables import tabulate_records
+
+
+def enumerate_reactions(
+    species: Sequence[str], max_species: int = 4, max_coefficient: int = 12
+) -> List[Dict[str, int]]:
+    """
+    Перечисление сбалансированных реакций по балансу элементов.
+
+    Для каждого подмножества веществ размера 2..max_species, у которого
+    матрица элементов имеет ранг k-1 и нуль-вектор без нулевых компонент
+    (минимальная реакция), строится целочисленная реакция. Знак выбирается
+    так, чтобы вещество, стоящее в species раньше остальных, было реагентом.
+
+    Args:
+        species: Формулы веществ
+        max_species: Максимум веществ в реакции
+        max_coefficient: Максимальный стехиометрический коэффициент
+
+    Returns:
+        Список реакций {formula: coeff}; реагенты отрицательные
+    """
+    compositions = {}
+    for formula in species:
+        composition = parse_composition(formula)
+        if composition:
+            compositions[formula] = composition
+
+    formulas = [formula for formula in species if formula in compositions]
+    elements = sorted({el for comp in compositions.values() for el in comp})
+    matrix = np.array(
+        [[compositions[f].get(el, 0.0) for f in formulas] for el in elements]
+    )
+
+    reactions = []
+    for size in range(2, min(max_species, len(formulas)) + 1):
+        for subset in itertools.combinations(range(len(formulas)), size):
+            sub = matrix[:, subset]
+            if np.linalg.matrix_rank(sub) != size - 1:
+                continue
+
+            null_vector = np.linalg.svd(sub)[2][-1]
+            if np.min(np.abs(null_vector)) < 1e-9:
+                continue  # Не минимальная: содержит реакцию меньшего размера
+
+            coeffs = _integer_coefficients(null_vector, max_coefficient)
+            if coeffs is None or np.any(sub @ coeffs != 0):
+                continue
+
+            if coeffs[0] > 0:
+                coeffs = -coeffs
+            reactions.append(
+                {formulas[i]: int(c) for i, c in zip(subset, coeffs)}
+            )
+
+    return reactions
+
+
+def _integer_coefficients(vector: np.ndarray, max_coefficient: int) -> Optional[np.ndarray]:
+    """Наименьшие целые коэффициенты, пропорциональные vector."""
+    scaled = vector / np.min(np.abs(vector))
+    fractions = [Fraction(float(x)).limit_denominator(max_coefficient) for x in scaled]
+    multiple = math.lcm(*(f.denominator for f in fractions))
+    coeffs = np.array([int(f * multiple) for f in fractions])
+    coeffs //= math.gcd(*(abs(int(c)) for c in coeffs))
+    if np.max(np.abs(coeffs)) > max_coefficient:
+        return None
+    return coeffs
+
+
+def format_equation(coefficients: Dict[str, float]) -> str:
+    """Уравнение из коэффициентов: {'C': -1, 'O2': -1, 'CO2': 1} -> 'C + O2 = CO2'."""
+
+    def side(items):
+        terms = []
+        for formula, coeff in items:
+            coeff = abs(coeff)
+            prefix = "" if coeff == 1 else f"{coeff:g}"
+            terms.append(f"{prefix}{formula}")
+        return " + ".join(terms)
+
+    reactants = [(f, c) for f, c in coefficients.items() if c < 0]
+    products = [(f, c) for f, c in coefficients.items() if c > 0]
+    return f"{side(reactants)} = {side(products)}"
+
+
+@dataclass
+class ScreeningResult:
+    """Результат скрининга: матрицы реакция × температура."""
+
+    species: List[str]
+    temperatures: np.ndarray
+    equations: List[str]
+    coefficients: np.ndarray  # реакция × вещество
+    delta_H: np.ndarray  # Дж/моль
+    delta_S: np.ndarray  # Дж/(моль·K)
+    delta_G: np.ndarray  # Дж/моль
+    ln_K: np.ndarray
+    skipped: Dict[str, str] = field(default_factory=dict)
+
+    def spontaneity_windows(self, index: int) -> List[Tuple[float, float]]:
+        """
+        Интервалы температур, где ΔG < 0, для реакции index.
+
+        Границы внутри диапазона уточняются линейной интерполяцией ΔG
+        между соседними точками.
+        """
+        T = self.temperatures
+        dG = self.delta_G[index]
+        negative = dG < 0
+
+        windows = []
+        start = None
+        for j in range(len(T)):
+            if negative[j] and start is None:
+                start = T[0] if j == 0 else self._crossing(j - 1, j, dG)
+            if not negative[j] and start is not None:
+                windows.append((float(start), float(self._crossing(j - 1, j, dG))))
+                start = None
+        if start is not None:
+            windows.append((float(start), float(T[-1])))
+        return windows
+
+    def _crossing(self, left: int, right: int, dG: np.ndarray) -> float:
+        T = self.temperatures
+        if dG[right] == dG[left]:
+            return T[right]
+        return T[left] + (T[right] - T[left]) * dG[left] / (dG[left] - dG[right])
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Ранжированная таблица реакций.
+
+        Сортировка: доля диапазона с ΔG < 0 (по убыванию), затем минимальное
+        ΔG (по возрастанию).
+        """
+        span = self.temperatures[-1] - self.temperatures[0]
+        rows = []
+        for i, equation in enumerate(self.equations):
+            windows = self.spontaneity_windows(i)
+            width = sum(hi - lo for lo, hi in windows)
+            j_min = int(np.argmin(self.delta_G[i]))
+            rows.append({
+                "equation": equation,
+                "dG_start_kJ": self.delta_G[i, 0] / 1000,
+                "dG_end_kJ": self.delta_G[i, -1] / 1000,
+                "dG_min_kJ": self.delta_G[i, j_min] / 1000,
+                "T_dG_min": float(self.temperatures[j_min]),
+                "ln_K_max": float(np.max(self.ln_K[i])),
+                "spontaneous_fraction": width / span if span > 0 else float(bool(windows)),
+                "spontaneous_windows": "; ".join(f"{lo:.0f}-{hi:.0f}K" for lo, hi in windows),
+            })
+
+        df = pd.DataFrame(rows, columns=[
+            "equation", "dG_start_kJ", "dG_end_kJ", "dG_min_kJ", "T_dG_min",
+            "ln_K_max", "spontaneous_fraction", "spontaneous_windows",
+        ])
+        return df.sort_values(
+            ["spontaneous_fraction", "dG_min_kJ"], ascending=[False, True]
+        ).reset_index(drop=True)
+
+    def to_csv(self, path: Union[str, Path]) -> None:
+        """Сохранить ранжированную таблицу в CSV."""
+        self.to_dataframe().to_csv(path, index=False)
+
+
+class ReactionScreener:
+    """
+    Скрининг множества реакций над общим набором веществ.
+
+    Использует компоненты ReactionEngine (загрузчик, отбор записей, расчет
+    свойств) и его предрассчитанные таблицы, если они есть.
+    """
+
+    def __init__(self, reaction_engine: ReactionEngine, logger: Optional[logging.Logger] = None):
+        self.engine = reaction_engine
+        self.logger = logger or reaction_engine.logger
+
+    def species_matrices(
+        self,
+        species: Sequence[str],
+        temperatures: np.ndarray,
+        compound_names: Optional[Dict[str, List[str]]] = None,
+    ) -> Tuple[List[str], np.ndarray, np.ndarray, Dict[str, str]]:
+        """
+        Матрицы H и S (вещество × температура); каждое вещество загружается один раз.
+
+        Returns:
+            (найденные вещества, H, S, {вещество: причина пропуска})
+        """
+        T = np.asarray(temperatures, dtype=np.float64)
+        table = self.engine.thermo_table
+        found, rows, missing = [], [], {}
+
+        for formula in dict.fromkeys(species):
+            if table is not None and table.covers([formula], T[0], T[-1]):
+                rows.append(table.interpolate([formula], T)[0])
+                found.append(formula)
+                continue
+
+            try:
+                names = (compound_names or {}).get(formula)
+                df = self.engine.compound_loader.get_raw_compound_data(formula, names)
+                if df.empty:
+                    missing[formula] = "нет данных"
+                    continue
+
+                melting, boiling = self.engine.phase_detector.get_most_common_melting_boiling_points(df)
+                records = self.engine.range_builder.get_compound_records_for_range(
+                    df, [T[0], T[-1]], melting, boiling
+                )
+                if not records:
+                    missing[formula] = "нет записей для диапазона"
+                    continue
+
+                rows.append(tabulate_records(records, T, self.engine.thermo_engine))
+                found.append(formula)
+            except Exception as e:
+                self.logger.warning(f"⚠ {formula}: не удалось загрузить данные: {e}")
+                missing[formula] = str(e)
+
+        block = np.array(rows).reshape(len(rows), 3, len(T))
+        return found, block[:, 1, :], block[:, 2, :], missing
+
+    def screen(
+        self,
+        species: Sequence[str],
+        equations: Optional[Sequence[str]] = None,
+        temperature_range: Sequence[float] = (298, 2500, 100),
+        compound_names: Optional[Dict[str, List[str]]] = None,
+        max_species: int = 4,
+    ) -> ScreeningResult:
+        """
+        Расчет ΔH, ΔS, ΔG, ln K для всех реакций одним матричным произведением.
+
+        Args:
+            species: Формулы веществ
+            equations: Сбалансированные уравнения; None — перечислить реакции
+                по балансу элементов (enumerate_reactions)
+            temperature_range: [T_start, T_end, step] в K (как в ReactionEngine)
+            compound_names: Названия веществ для поиска {formula: [names]}
+            max_species: Максимум веществ в перечисляемой реакции
+
+        Returns:
+            ScreeningResult
+        """
+        T_start, T_end, T_step = temperature_range
+        temperatures = np.arange(T_start, T_end + T_step, T_step, dtype=np.float64)
+
+        if equations is None:
+            reactions = enumerate_reactions(species, max_species=max_species)
+            labelled = [(format_equation(coeffs), coeffs) for coeffs in reactions]
+        else:
+            labelled = [
+                (equation, self.engine.parse_reaction_equation(equation, list(species)))
+                for equation in equations
+            ]
+
+        involved = [f for f in species if any(f in coeffs for _, coeffs in labelled)]
+        found, H, S, missing = self.species_matrices(involved, temperatures, compound_names)
+        column = {formula: i for i, formula in enumerate(found)}
+
+        equations_kept, stoichiometry, skipped = [], [], {}
+        for equation, coeffs in labelled:
+            absent = [f for f, c in coeffs.items() if c and f not in column]
+            if absent:
+                skipped[equation] = f"нет данных: {', '.join(absent)}"
+                continue
+            vector = np.zeros(len(found))
+            for formula, coeff in coeffs.items():
+                if coeff:
+                    vector[column[formula]] = coeff
+            equations_kept.append(equation)
+            stoichiometry.append(vector)
+
+        N = np.array(stoichiometry).reshape(len(stoichiometry), len(found))
+        delta_H = N @ H
+        delta_S = N @ S
+        delta_G = N @ (H - temperatures * S)
+        ln_K = -delta_G / (self.engine.R * temperatures)
+
+        self.logger.info(
+            f"Скрининг: {len(equations_kept)} реакций, {len(found)} веществ, "
+            f"{len(temperatures)} температур (пропущено {len(skipped)})"
+        )
+        if missing:
+            self.logger.warning(f"Вещества без данных: {missing}")
+
+        return ScreeningResult(
+            species=found,
+            temperatures=temperatures,
+            equations=equations_kept,
+            coefficients=N,
+            delta_H=delta_H,
+            delta_S=delta_S,
+            delta_G=delta_G,
+            ln_K=ln_K,
+            skipped=skipped,
+        )
@@ -0,0 +1,584 @@
+"""
+Precomputed thermochemical tables on a fixed temperature grid.
+
+An offline build runs the regular record selection (CompoundDataLoader +
+PhaseTransitionDetector + RecordRangeBuilder) for every formula and tabulates
+Cp, H and S on a uniform grid (298-6000 K with a 1 K step by default). The
+table is stored as an uncompressed .npy matrix (formulas x properties x
+grid points, float32 by default) opened with mmap_mode="r", plus a JSON
+formula index; only the rows touched by a reaction are paged in.
+
+ReactionEngine uses the table as a lookup backend: a reaction evaluation is
+a stoichiometry-weighted sum of table rows, G = H - T·S.
+
+Interpolation error (linear interpolation between grid nodes, step h):
+- at grid nodes (integer temperatures for h = 1 K) the values equal the
+  direct ThermodynamicEngine calculation up to storage rounding
+  (float32: ~6e-8 relative, e.g. ~0.06 J/mol for |H| ~ 1e6 J/mol);
+- between nodes inside one record the error is bounded by
+  h²/8 · max|dCp/dT| for H and h²/8 · max|d(Cp/T)/dT| for S, i.e.
+  < 0.02 J/mol and < 1e-4 J/(mol·K) for typical Shomate coefficients
+  at h = 1 K;
+- within the single grid interval that contains a record switch (phase
+  transition) the interpolation blends two records, so the error there
+  is up to the size of the jump.
+
+Record selection is performed once for the whole grid window, with the
+compound type derived from the formula, so for a compound whose selection
+depends on the requested window, type or names the table can differ from a
+window-specific calculation; the table is keyed by formula only.
+
+The selected records (with melting/boiling points and the data source) are
+stored next to the matrix as a JSON file, together with the requests whose
+selection was verified at build time to be the same as the table's: the
+windows passed to build() (e.g. the fixed reaction window), the compound
+types and the compound names found in the database (stage 1 search). Such a
+request is answered together with its metadata without loading the
+compounds (see selection_matches).
+"""
+
+import json
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .compound_data_loader import CompoundDataLoader
+from .phase_transition_detector import PhaseTransitionDetector
+from .record_range_builder import RecordRangeBuilder
+from .thermodynamic_engine import ThermodynamicEngine
+
+logger = logging.getLogger(__name__)
+
+PROPERTIES = ("cp", "enthalpy", "entropy")
+
+VALUES_FILE = "values.npy"
+INDEX_FILE = "index.json"
+SELECTION_FILE = "selection.json"
+
+# Имен вещества из БД, проверяемых при построении (стадия 1 поиска)
+MAX_VERIFIED_NAMES = 10
+
+# Температуры расчета реакции выходят за T_end не больше чем на шаг
+# (temperature_step_k ≤ 250K)
+MAX_STEP_K = 250.0
+
+# Фазовый суффикс в конце формулы: TiO2(s), H2O(g), NaCl(cr)
+_PHASE_SUFFIX_RE = re.compile(r"\([a-z]+\d*\)$")
+
+# Простое вещество: один элемент с необязательным индексом (O2, C, Cl2)
+_ELEMENT_RE = re.compile(r"^[A-Z][a-z]?\d*$")
+
+
+def base_formula(formula: str) -> str:
+    """Формула без фазового суффикса: 'TiO2(s)' -> 'TiO2'."""
+    return _PHASE_SUFFIX_RE.sub("", (formula or "").strip())
+
+
+def is_elemental_formula(formula: str) -> bool:
+    """Простое ли вещество (как классифицирует LLM в compound_types)."""
+    return bool(_ELEMENT_RE.match(formula))
+
+
+def _record_key(record: Any) -> str:
+    """Сравнимое представление записи (NaN равны друг другу)."""
+    return json.dumps(dict(record), sort_keys=True, default=_json_value)
+
+
+def _overlapping(records: Sequence[Any], t_start: float, t_end: float) -> list:
+    """Записи, пересекающиеся с окном [t_start, t_end]."""
+    return [
+        record for record in records
+        if record["Tmin"] < t_end and record["Tmax"] > t_start
+    ]
+
+
+def _json_value(value: Any) -> Any:
+    """Числа numpy и прочие значения записей для json.dumps."""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def record_choice(records: Sequence[Any], temperatures: np.ndarray):
+    """
+    Номер записи для каждой температуры по правилу ReactionEngine.
+
+    Первая запись с Tmin ≤ T ≤ Tmax; выше максимального Tmax — запись
+    с максимальным Tmax (экстраполяция); иначе — первая запись.
+
+    Returns:
+        (choice, above, max_index, t_max_available): номера записей,
+        маска экстраполяции, номер записи с максимальным Tmax и сам Tmax
+    """
+    T = np.asarray(temperatures, dtype=np.float64)
+
+    choice = np.full(len(T), -1)
+    for i in range(len(records) - 1, -1, -1):
+        inside = (records[i]["Tmin"] <= T) & (T <= records[i]["Tmax"])
+        choice[inside] = i
+
+    tmax_values = [record.get("Tmax", 0) for record in records]
+    max_index = int(np.argmax(tmax_values))
+    t_max_available = float(tmax_values[max_index])
+
+    above = (choice == -1) & (T > t_max_available)
+    choice[above] = max_index
+    choice[choice == -1] = 0
+    return choice, above, max_index, t_max_available
+
+
+def record_phases(records: Sequence[Any], temperatures: np.ndarray) -> np.ndarray:
+    """Фаза (поле Phase) записи, выбранной для каждой температуры."""
+    choice = record_choice(records, temperatures)[0]
+    phases = np.array([str(record.get("Phase", "") or "") for record in records], dtype=object)
+    return phases[choice]
+
+
+def tabulate_records(
+    records: Sequence[Any],
+    temperatures: np.ndarray,
+    thermo_engine: ThermodynamicEngine,
+) -> np.ndarray:
+    """
+    Свойства вещества на сетке температур по отобранным записям.
+
+    Выбор записи для каждой температуры повторяет ReactionEngine
+    (record_choice); выше максимального Tmax — экстраполяция с постоянной
+    Cp(Tmax).
+
+    Args:
+        records: Записи из RecordRangeBuilder.get_compound_records_for_range
+        temperatures: Массив температур (K)
+        thermo_engine: ThermodynamicEngine для расчета свойств
+
+    Returns:
+        Массив (len(PROPERTIES), len(temperatures)) — Cp, H, S
+    """
+    T = np.asarray(temperatures, dtype=np.float64)
+    result = np.zeros((len(PROPERTIES), len(T)))
+
+    choice, above, max_index, t_max_available = record_choice(records, T)
+
+    for i, record in enumerate(records):
+        mask = (choice == i) & ~above
+        if mask.any():
+            props = thermo_engine.calculate_properties_array(record, T[mask])
+            for row, name in enumerate(PROPERTIES):
+                result[row, mask] = props[name]
+
+    if above.any():
+        at_max = thermo_engine.calculate_properties_array(
+            records[max_index], np.array([t_max_available])
+        )
+        cp_max = at_max["cp"][0]
+        result[0, above] = cp_max
+        result[1, above] = at_max["enthalpy"][0] + cp_max * (T[above] - t_max_available)
+        result[2, above] = at_max["entropy"][0] + cp_max * np.log(
+            T[above] / t_max_available
+        )
+
+    return result
+
+
+class ThermoTable:
+    """
+    Таблица свойств веществ на равномерной сетке температур.
+
+    values[i, p, j] — свойство PROPERTIES[p] вещества formulas[i] при
+    T = t_min + j·t_step.
+    """
+
+    def __init__(self):
+        self.formulas: List[str] = []
+        self.t_min = 298.0
+        self.t_step = 1.0
+        self.values: Optional[np.ndarray] = None
+        self.source_version = ""
+        self._rows: Dict[str, int] = {}
+        # Отбор записей при построении: {formula: {records, melting, boiling,
+        # is_yaml_cache, search_stage}}
+        self.selection: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def is_loaded(self) -> bool:
+        """Загружена ли таблица."""
+        return self.values is not None
+
+    @property
+    def t_max(self) -> float:
+        """Верхняя температура сетки."""
+        n_points = self.values.shape[2] if self.values is not None else 1
+        return self.t_min + (n_points - 1) * self.t_step
+
+    @property
+    def temperatures(self) -> np.ndarray:
+        """Узлы сетки (K)."""
+        n_points = self.values.shape[2] if self.values is not None else 0
+        return self.t_min + np.arange(n_points) * self.t_step
+
+    # Построение
+
+    def build(
+        self,
+        formulas: Iterable[str],
+        compound_loader: CompoundDataLoader,
+        phase_detector: PhaseTransitionDetector,
+        range_builder: RecordRangeBuilder,
+        thermo_engine: ThermodynamicEngine,
+        path: Union[str, Path],
+        t_min: float = 298.0,
+        t_max: float = 6000.0,
+        t_step: float = 1.0,
+        dtype: str = "float32",
+        source_version: str = "records",
+        windows: Sequence[Tuple[float, float]] = (),
+    ) -> Dict[str, Any]:
+        """
+        Построить таблицу и записать ее в каталог path.
+
+        Для каждой формулы выполняется обычный отбор записей на окне
+        [t_min, t_max] с типом вещества по формуле; формулы без данных или
+        без записей пропускаются. Затем отбор повторяется для окон windows,
+        противоположного типа и имен вещества из БД; совпавшие с табличным
+        сохраняются (см. _verify_selection). Матрица пишется построчно в
+        .npy через memmap, целиком в памяти не собирается.
+
+        Args:
+            formulas: Формулы веществ (дубликаты и фазовые суффиксы убираются)
+            compound_loader: Загрузчик данных веществ
+            phase_detector: Определение точек плавления/кипения
+            range_builder: Отбор записей на окне
+            thermo_engine: Расчет свойств
+            path: Каталог таблицы
+            t_min, t_max, t_step: Сетка температур (K)
+            dtype: Тип хранения ("float32" или "float64")
+            source_version: Версия источника данных (для проверки свежести)
+            windows: Окна внутри сетки, запросы на которых должны
+                считаться по таблице (например, окно расчета реакций)
+
+        Returns:
+            Статистика построения
+        """
+        start_time = time.time()
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        unique_formulas = list(dict.fromkeys(base_formula(f) for f in formulas if f))
+        n_points = int(round((t_max - t_min) / t_step)) + 1
+        temperatures = t_min + np.arange(n_points) * t_step
+        grid_windows = [(t_min, t_max)] + [
+            (float(start), float(end)) for start, end in windows
+            if t_min <= start < end <= t_max and (start, end) != (t_min, t_max)
+        ]
+
+        # Строки заполняются подряд; строки пропущенных формул остаются
+        # неиспользованными в конце матрицы
+        rows = []
+        skipped = []
+        values = np.lib.format.open_memmap(
+            path / VALUES_FILE,
+            mode="w+",
+            dtype=np.dtype(dtype),
+            shape=(len(unique_formulas), len(PROPERTIES), n_points),
+        )
+
+        selection = {}
+        for formula in unique_formulas:
+            try:
+                frame = compound_loader.get_raw_compound_data_with_metadata(formula)
+                df, is_yaml_cache, search_stage = frame
+                if df.empty:
+                    skipped.append(formula)
+                    continue
+                is_elemental = is_elemental_formula(formula)
+                melting, boiling = phase_detector.get_most_common_melting_boiling_points(df)
+                records = range_builder.get_compound_records_for_range(
+                    df, [t_min, t_max], melting, boiling, is_elemental=is_elemental
+                )
+                if not records:
+                    skipped.append(formula)
+                    continue
+                row = tabulate_records(records, temperatures, thermo_engine)
+                values[len(rows)] = row
+                rows.append(formula)
+                selection[formula] = {
+                    "records": [record.to_dict() for record in records],
+                    "melting": melting,
+                    "boiling": boiling,
+                    "is_yaml_cache": is_yaml_cache,
+                    "search_stage": search_stage,
+                    **self._verify_selection(
+                        formula,
+                        frame,
+                        records,
+                        row,
+                        temperatures,
+                        is_elemental,
+                        grid_windows,
+                        compound_loader,
+                        phase_detector,
+                        range_builder,
+                        thermo_engine,
+                    ),
+                }
+            except Exception as e:
+                logger.warning(f"⚠ {formula}: не удалось табулировать: {e}")
+                skipped.append(formula)
+
+        values.flush()
+        del values
+
+        index = {
+            "formulas": rows,
+            "properties": list(PROPERTIES),
+            "t_min": t_min,
+            "t_step": t_step,
+            "n_points": n_points,
+            "dtype": dtype,
+            "source_version": source_version,
+        }
+        (path / INDEX_FILE).write_text(json.dumps(index, ensure_ascii=False), encoding="utf-8")
+        (path / SELECTION_FILE).write_text(
+            json.dumps(selection, ensure_ascii=False, default=_json_value), encoding="utf-8"
+        )
+
+        self.load(path)
+
+        elapsed = time.time() - start_time
+        logger.info(
+            f"Таблицы свойств построены за {elapsed:.1f}s: {len(rows)} веществ, "
+            f"{n_points} точек, пропущено {len(skipped)}"
+        )
+        return {
+            "formulas": len(rows),
+            "skipped": len(skipped),
+            "points": n_points,
+            "size_mb": (path / VALUES_FILE).stat().st_size / 1024 / 1024,
+            "build_time_s": elapsed,
+        }
+
+    @staticmethod
+    def _verify_selection(
+        formula: str,
+        frame: tuple,
+        records: List[pd.Series],
+        row: np.ndarray,
+        temperatures: np.ndarray,
+        is_elemental: bool,
+        windows: List[Tuple[float, float]],
+        compound_loader: CompoundDataLoader,
+        phase_detector: PhaseTransitionDetector,
+        range_builder: RecordRangeBuilder,
+        thermo_engine: ThermodynamicEngine,
+    ) -> Dict[str, Any]:
+        """
+        Запросы, отбор записей которых совпадает с табличным.
+
+        Отбор совпадает, если на окне выбраны те же записи, что пересекаются
+        с окном в табличном отборе, совпадают точки плавления и кипения, а
+        свойства по отобранным записям равны табличным во всех узлах сетки,
+        где идет расчет (от T_start до T_end + MAX_STEP_K). Проверяются: тип вещества (RecordRangeBuilder различает только
+        is_elemental=False) на всей сетке, окна — для всех подходящих типов,
+        имена вещества из БД (первое имя запроса ищется на стадии 1) — на
+        всех подходящих окнах и типах. Для YAML-кэша имена не используются.
+
+        Returns:
+            {types: [is_elemental], windows: [[T_start, T_end]],
+            names: {имя в нижнем регистре: search_stage}}
+        """
+        df, is_yaml_cache, search_stage = frame
+        melting, boiling = phase_detector.get_most_common_melting_boiling_points(df)
+
+        def same_selection(data: pd.DataFrame, window: Tuple[float, float], elemental: bool) -> bool:
+            points = phase_detector.get_most_common_melting_boiling_points(data)
+            selected = range_builder.get_compound_records_for_range(
+                data, list(window), *points, is_elemental=elemental
+            )
+            if points != (melting, boiling) or (
+                [_record_key(record) for record in selected]
+                != [_record_key(record) for record in _overlapping(records, *window)]
+            ):
+                return False
+            used = (temperatures >= window[0]) & (temperatures <= window[1] + MAX_STEP_K)
+            return bool(np.allclose(
+                tabulate_records(selected, temperatures[used], thermo_engine),
+                row[:, used],
+                rtol=1e-12,
+                atol=1e-9,
+            ))
+
+        types = [is_elemental]
+        if same_selection(df, windows[0], not is_elemental):
+            types.append(not is_elemental)
+        verified_windows = [
+            window for window in windows
+            if all(same_selection(df, window, elemental) for elemental in types)
+        ]
+
+        names: Dict[str, int] = {}
+        if not is_yaml_cache:
+            candidates = []
+            for column in ("FirstName", "SecondName"):
+                if column in df.columns:
+                    candidates.extend(str(name).strip() for name in df[column].dropna())
+            for name in list(dict.fromkeys(n for n in candidates if n))[:MAX_VERIFIED_NAMES]:
+                named = compound_loader.resolve_prefetched(formula, [name], frame)
+                if named is None:
+                    continue
+                if named is frame or all(
+                    same_selection(named[0], window, elemental)
+                    for window in verified_windows
+                    for elemental in types
+                ):
+                    names[name.lower()] = named[2]
+
+        return {
+            "types": types,
+            "windows": [list(window) for window in verified_windows],
+            "names": names,
+        }
+
+    # Загрузка
+
+    def load(self, path: Union[str, Path]) -> None:
+        """Открыть таблицу из каталога (матрица отображается в память)."""
+        path = Path(path)
+        index = json.loads((path / INDEX_FILE).read_text(encoding="utf-8"))
+
+        self.formulas = list(index["formulas"])
+        self.values = np.load(path / VALUES_FILE, mmap_mode="r")[: len(self.formulas)]
+        self.t_min = float(index["t_min"])
+        self.t_step = float(index["t_step"])
+        self.source_version = index.get("source_version", "")
+        self._rows = {formula: i for i, formula in enumerate(self.formulas)}
+
+        # Таблицы без файла отбора (построенные раньше) только для расчета
+        # по таблице, без метаданных записей
+        selection_path = path / SELECTION_FILE
+        self.selection = (
+            json.loads(selection_path.read_text(encoding="utf-8"))
+            if selection_path.exists() else {}
+        )
+
+    # Запросы
+
+    def has_formula(self, formula: str) -> bool:
+        """Есть ли вещество в таблице."""
+        return formula in self._rows
+
+    def covers(self, formulas: Iterable[str], t_start: float, t_end: float) -> bool:
+        """Есть ли все вещества и лежит ли [t_start, t_end] внутри сетки."""
+        if not self.is_loaded:
+            return False
+        return (
+            self.t_min <= t_start
+            and t_end <= self.t_max
+            and all(formula in self._rows for formula in formulas)
+        )
+
+    def selection_matches(
+        self,
+        formulas: Iterable[str],
+        t_start: float,
+        t_end: float,
+        compound_names: Optional[Dict[str, List[str]]] = None,
+        compound_types: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Совпадает ли отбор записей запроса с отбором при построении таблицы.
+
+        Совпадение проверено при построении (_verify_selection) для окна,
+        типа и первого имени каждого вещества. Таблицы, построенные без
+        проверки, подходят только для окна [t_min, t_max] без имен и с
+        типом по умолчанию (is_elemental не False).
+        """
+        formulas = list(formulas)
+        if not self.covers(formulas, t_start, t_end):
+            return False
+        for formula in formulas:
+            entry = self.selection.get(formula)
+            if entry is None:
+                return False
+            windows = entry.get("windows", [[self.t_min, self.t_max]])
+            if not any(start == t_start and end == t_end for start, end in windows):
+                return False
+            elemental = compound_types.get(formula) if compound_types else None
+            if (elemental is not False) not in entry.get("types", [True]):
+                return False
+            names = compound_names.get(formula) if compound_names else None
+            if names and not entry["is_yaml_cache"] and (
+                names[0].strip().lower() not in entry.get("names", {})
+            ):
+                return False
+        return True
+
+    def selected_records(
+        self,
+        formula: str,
+        t_start: Optional[float] = None,
+        t_end: Optional[float] = None,
+        compound_names: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Отбор записей вещества при построении таблицы.
+
+        Для окна [t_start, t_end] — только пересекающиеся с ним записи; для
+        имен из проверенных — стадия поиска, на которой они найдены.
+
+        Returns:
+            {records: [pd.Series], melting, boiling, is_yaml_cache, search_stage}
+        """
+        entry = self.selection[formula]
+        records = entry["records"]
+        if t_start is not None and t_end is not None:
+            records = _overlapping(records, t_start, t_end)
+        search_stage = entry["search_stage"]
+        if compound_names and not entry["is_yaml_cache"]:
+            search_stage = entry.get("names", {}).get(
+                compound_names[0].strip().lower(), search_stage
+            )
+        return {
+            **entry,
+            "records": [pd.Series(record) for record in records],
+            "search_stage": search_stage,
+        }
+
+    def interpolate(
+        self, formulas: Sequence[str], temperatures: np.ndarray
+    ) -> np.ndarray:
+        """
+        Линейная интерполяция свойств по сетке.
+
+        Args:
+            formulas: Формулы (должны быть в таблице)
+            temperatures: Температуры внутри сетки (K)
+
+        Returns:
+            Массив float64 (len(formulas), len(PROPERTIES), len(temperatures))
+        """
+        T = np.asarray(temperatures, dtype=np.float64)
+        rows = np.asarray([self._rows[formula] for formula in formulas], dtype=np.int64)
+
+        position = (T - self.t_min) / self.t_step
+        left = np.clip(np.floor(position).astype(np.int64), 0, self.values.shape[2] - 2)
+        weight = position - left
+
+        # В узлах сетки weight = 0: значение совпадает с табличным
+        block = np.asarray(self.values[rows], dtype=np.float64)
+        return block[:, :, left] * (1.0 - weight) + block[:, :, left + 1] * weight
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика таблицы."""
+        return {
+            "loaded": self.is_loaded,
+            "formulas": len(self.formulas),
+            "t_min": self.t_min,
+            "t_max": self.t_max if self.is_loaded else None,
+            "t_step": self.t_step,
+            "dtype": str(self.values.dtype) if self.is_loaded else None,
+        }
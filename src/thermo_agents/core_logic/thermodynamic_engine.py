@@ -173,6 +173,78 @@ class ThermodynamicEngine:
             "gibbs_energy": gibbs_energy,
         }
 
+    def calculate_properties_array(
+        self, record: pd.Series, temperatures: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Векторный вариант calculate_properties для массива температур.
+
+        Те же формулы и то же интегрирование (метод трапеций по 100 точкам
+        от T_ref до T) для всех температур сразу; используется при
+        построении таблиц свойств на сетке (core_logic.thermo_tables).
+
+        Args:
+            record: Строка DataFrame с коэффициентами (f1-f6), H₂₉₈ и S₂₉₈
+            temperatures: Массив температур (K)
+
+        Returns:
+            Словарь массивов 'cp', 'enthalpy', 'entropy', 'gibbs_energy'
+        """
+
+        def get_value(rec, key: str, default=0):
+            if hasattr(rec, "get"):
+                return rec.get(key, default)
+            else:
+                return getattr(rec, key.lower(), default)
+
+        T = np.asarray(temperatures, dtype=np.float64)
+        f1, f2, f3, f4, f5, f6 = (
+            float(get_value(record, f"f{i}", 0)) for i in range(1, 7)
+        )
+
+        if not self._has_valid_shomate_coefficients(f1, f2, f3, f4, f5, f6):
+            zeros = np.zeros_like(T)
+            return {
+                "cp": zeros,
+                "enthalpy": zeros.copy(),
+                "entropy": zeros.copy(),
+                "gibbs_energy": zeros.copy(),
+            }
+
+        H298 = float(get_value(record, "h298", 0))
+        S298 = float(get_value(record, "s298", 0))
+
+        def cp_function(temp: np.ndarray) -> np.ndarray:
+            return (
+                f1
+                + f2 * temp / 1000
+                + f3 * temp**-2 * 100_000
+                + f4 * temp**2 / 1_000_000
+                + f5 * temp**-3 * 1_000
+                + f6 * temp**3 * 10 ** (-9)
+            )
+
+        # Точки интегрирования: строка i — linspace(T_ref, T[i], 100)
+        num_points = 100
+        fractions = np.linspace(0.0, 1.0, num_points)
+        temp_points = self.T_ref + np.outer(T - self.T_ref, fractions)
+        cp_values = cp_function(temp_points)
+
+        widths = np.diff(temp_points, axis=1)
+        delta_H = np.sum((cp_values[:, 1:] + cp_values[:, :-1]) / 2 * widths, axis=1)
+        cp_over_T = cp_values / temp_points
+        delta_S = np.sum((cp_over_T[:, 1:] + cp_over_T[:, :-1]) / 2 * widths, axis=1)
+
+        enthalpy = H298 * 1000 + delta_H
+        entropy = S298 + delta_S
+
+        return {
+            "cp": cp_function(T),
+            "enthalpy": enthalpy,
+            "entropy": entropy,
+            "gibbs_energy": enthalpy - T * entropy,
+        }
+
     def calculate_properties_piecewise(
         self,
         records: list,
@@ -6,12 +6,37 @@
 - PhaseSegmentBuilder: построение фазовых сегментов
 - constants: константы фильтрации
 - precomputed_data: предвычисленные данные
+
+Классы загружаются лениво (PEP 562) при первом обращении.
 """
 
-from .phase_resolver import PhaseResolver
-from .phase_segment_builder import PhaseSegmentBuilder
+import importlib
+from typing import TYPE_CHECKING
+
+_LAZY_EXPORTS = {
+    'PhaseResolver': '.phase_resolver',
+    'PhaseSegmentBuilder': '.phase_segment_builder',
+}
 
 __all__ = [
     'PhaseResolver',
     'PhaseSegmentBuilder',
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .phase_resolver import PhaseResolver
+    from .phase_segment_builder import PhaseSegmentBuilder
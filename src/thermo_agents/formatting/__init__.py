@@ -6,16 +6,22 @@
 - CompoundInfoFormatter - форматирование данных о веществах
 - TableFormatter - форматирование таблиц результатов с rich
 - InterpretationFormatter - интерпретация результатов и рекомендации
+- EquilibriumFormatter - равновесный состав смеси (минимизация энергии Гиббса)
+- ReactionResult - результат расчета реакции с представлениями по требованию
 """
 
 from .unified_reaction_formatter import UnifiedReactionFormatter
 from .compound_info_formatter import CompoundInfoFormatter
 from .table_formatter import TableFormatter
 from .interpretation_formatter import InterpretationFormatter
+from .equilibrium_formatter import EquilibriumFormatter
+from .result_views import ReactionResult
 
 __all__ = [
     "UnifiedReactionFormatter",
     "CompoundInfoFormatter",
     "TableFormatter",
-    "InterpretationFormatter"
+    "InterpretationFormatter",
+    "EquilibriumFormatter",
+    "ReactionResult"
 ]
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+Форматирование равновесного состава смеси (минимизация энергии Гиббса).
+
+Таблица количеств веществ по температурам, мольные доли газовой фазы
+и диагностика сходимости решателя.
+"""
+
+from typing import List
+
+import numpy as np
+from tabulate import tabulate
+
+from ..core_logic.equilibrium_solver import EquilibriumResult
+from ..models.extraction import ExtractedReactionParameters
+
+
+class EquilibriumFormatter:
+    """
+    Форматирование результатов GibbsEquilibriumSolver.
+    """
+
+    # Количества меньше порога выводятся как 0
+    TRACE_MOLES = 1e-12
+
+    @staticmethod
+    def format_amount(value: float) -> str:
+        """Количество вещества: 4 значащие цифры, следовые — в научной нотации."""
+        if value < EquilibriumFormatter.TRACE_MOLES:
+            return "0"
+        if value < 1e-3:
+            return f"{value:.2e}"
+        return f"{value:.4g}"
+
+    def format_composition_table(self, result: EquilibriumResult) -> str:
+        """
+        Таблица количеств (моль) по температурам.
+
+        Конденсированные вещества помечаются (к) в заголовке, если при
+        какой-либо температуре выбранная запись не газовая.
+        """
+        headers = ["T (K)"]
+        for i, formula in enumerate(result.species):
+            condensed = not result.is_gas[i].all()
+            headers.append(f"{formula} (к)" if condensed else formula)
+        headers.append("Σ газ")
+
+        gas_total = np.where(result.is_gas, result.moles, 0.0).sum(axis=0)
+        rows = []
+        for k, T in enumerate(result.temperatures):
+            row = [f"{T:.0f}"]
+            row.extend(self.format_amount(result.moles[i, k]) for i in range(len(result.species)))
+            row.append(self.format_amount(gas_total[k]))
+            rows.append(row)
+
+        return tabulate(rows, headers=headers, tablefmt="grid", stralign="right")
+
+    def format_gas_fractions_table(self, result: EquilibriumResult) -> str:
+        """Мольные доли газовой фазы по температурам."""
+        fractions = result.mole_fractions()
+        gas_species = [i for i in range(len(result.species)) if result.is_gas[i].any()]
+
+        headers = ["T (K)"] + [f"x({result.species[i]})" for i in gas_species]
+        rows = []
+        for k, T in enumerate(result.temperatures):
+            rows.append([f"{T:.0f}"] + [self.format_amount(fractions[i, k]) for i in gas_species])
+
+        return tabulate(rows, headers=headers, tablefmt="grid", stralign="right")
+
+    def format_diagnostics(self, result: EquilibriumResult) -> List[str]:
+        """Сводка сходимости решателя."""
+        lines = ["Сходимость:"]
+        converged = int(result.converged.sum())
+        lines.append(f"  Сошлось: {converged}/{len(result.temperatures)} температур")
+        lines.append(f"  Итераций на точку: {int(result.iterations.max()) if len(result.iterations) else 0} (макс.)")
+        lines.append(f"  Невязка баланса элементов: {result.balance_residual.max():.1e} (макс., отн.)")
+        lines.append(f"  Невязка условий оптимальности: {result.optimality_residual.max():.1e} (макс.)")
+
+        for message in result.messages:
+            lines.append(f"  ⚠️ {message}")
+        for formula, reason in result.missing.items():
+            lines.append(f"  ⚠️ {formula} исключено: {reason}")
+        return lines
+
+    def format_equilibrium_result(
+        self, params: ExtractedReactionParameters, result: EquilibriumResult
+    ) -> str:
+        """
+        Полный вывод равновесного состава.
+
+        Args:
+            params: Параметры запроса (query_type="equilibrium_composition")
+            result: Результат GibbsEquilibriumSolver.solve
+
+        Returns:
+            Отформатированный текст
+        """
+        lines = []
+        lines.append("══════════════════════════════════════════════════════════════════")
+        lines.append("⚖️ Равновесный состав смеси (минимизация энергии Гиббса)")
+        lines.append("══════════════════════════════════════════════════════════════════")
+        lines.append("")
+
+        initial = ", ".join(f"{amount:g} моль {formula}" for formula, amount in result.initial_amounts.items())
+        lines.append(f"Исходная смесь: {initial}")
+        lines.append(f"Возможные вещества: {', '.join(result.species)}")
+        lines.append(f"Давление: {result.pressure_bar:g} бар")
+        lines.append(
+            f"Модель: идеальный газ + чистые конденсированные фазы; "
+            f"элементы: {', '.join(result.elements)}"
+        )
+        lines.append("")
+
+        lines.append("Количества веществ, моль:")
+        lines.append(self.format_composition_table(result))
+        lines.append("")
+
+        if result.is_gas.any():
+            lines.append("Мольные доли в газовой фазе:")
+            lines.append(self.format_gas_fractions_table(result))
+            lines.append("")
+
+        lines.extend(self.format_diagnostics(result))
+        lines.append("══════════════════════════════════════════════════════════════════")
+
+        return "\n".join(lines)
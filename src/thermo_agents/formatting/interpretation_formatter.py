@@ -8,6 +8,7 @@
 import pandas as pd
 import numpy as np
 from typing import Optional, Dict, List, Tuple
+from ..core_logic.crossover_solver import Crossover
 from ..models.extraction import ExtractedReactionParameters
 
 
@@ -42,6 +43,36 @@ class InterpretationFormatter:
 
         return None
 
+    @staticmethod
+    def format_crossovers(crossovers: List[Crossover]) -> List[str]:
+        """
+        Форматирует точные температуры ΔG = 0 и K = target (CrossoverSolver).
+
+        Args:
+            crossovers: Результат ReactionEngine.find_crossover_temperatures
+
+        Returns:
+            Строки для вывода (пустой список, если точек нет)
+        """
+        lines = []
+
+        for crossover in crossovers:
+            if crossover.quantity == "delta_G":
+                label = "ΔG = 0"
+                state = "самопроизвольна" if crossover.becomes_spontaneous else "несамопроизвольна"
+                outcome = f"выше реакция {state}"
+            else:
+                K_formatted = InterpretationFormatter.format_equilibrium_constant(
+                    float(np.exp(crossover.target))
+                )
+                label = f"K = {K_formatted}"
+                outcome = f"выше K {'>' if crossover.increasing else '<'} {K_formatted}"
+
+            note = " (скачок на фазовом переходе)" if crossover.at_transition else ""
+            lines.append(f"  🎯 {label} при T = {crossover.T:.2f} K{note}: {outcome}")
+
+        return lines
+
     @staticmethod
     def analyze_spontaneity_ranges(df_result: pd.DataFrame) -> Dict[str, Tuple[float, float]]:
         """
@@ -135,7 +166,8 @@ class InterpretationFormatter:
     def format_interpretation(
         self,
         df_result: pd.DataFrame,
-        params: ExtractedReactionParameters
+        params: ExtractedReactionParameters,
+        crossovers: Optional[List[Crossover]] = None
     ) -> str:
         """
         Форматирует интерпретацию результатов.
@@ -149,6 +181,8 @@ class InterpretationFormatter:
         Args:
             df_result: DataFrame с результатами
             params: Параметры реакции из LLM
+            crossovers: Точные температуры ΔG = 0 / K = target_k; если не
+                заданы, температура инверсии интерполируется по таблице
 
         Returns:
             Отформатированная интерпретация
@@ -181,11 +215,22 @@ class InterpretationFormatter:
             lines.append("")
 
         # Температура инверсии
-        T_inversion = self.find_inversion_temperature(df_result)
-        if T_inversion is not None:
-            lines.append(f"  🎯 Температура инверсии: ~{T_inversion:.0f} K")
-            lines.append(f"     При T > {T_inversion:.0f} K реакция становится термодинамически выгодной")
+        if crossovers is None:
+            T_inversion = self.find_inversion_temperature(df_result)
+        else:
+            equilibrium = [c.T for c in crossovers if c.quantity == "delta_G"]
+            T_inversion = equilibrium[0] if equilibrium else None
+
+        if crossovers:
+            lines.append("  Точные температуры:")
+            lines.extend(self.format_crossovers(crossovers))
             lines.append("")
+
+        if T_inversion is not None:
+            if crossovers is None:
+                lines.append(f"  🎯 Температура инверсии: ~{T_inversion:.0f} K")
+                lines.append(f"     При T > {T_inversion:.0f} K реакция становится термодинамически выгодной")
+                lines.append("")
         else:
             # Проверяем, всегда ли реакция спонтанна или неспонтанна
             first_dG = df_result.iloc[0]['delta_G']
@@ -0,0 +1,121 @@
+"""
+Структурированный результат расчета реакции и его представления.
+
+ReactionResult хранит промежуточные данные расчета — таблицу df_result,
+метаданные веществ (отобранные записи, температуры плавления и кипения,
+фазовые переходы, источник данных) и точные температуры равновесия, —
+а не итоговый текст. Представления строятся из них при первом запросе
+и запоминаются в результате:
+
+- full — полный ответ (UnifiedReactionFormatter.format_reaction_result)
+- brief — ключевые точки (UnifiedReactionFormatter.format_brief_result)
+- detailed — полный ответ с источниками данных и фазовыми переходами веществ
+- csv — таблица результатов (TableFormatter.format_csv_export)
+- file — текст файла отчета: детальный ответ и таблица в CSV
+
+Смена формата и повтор ответа стоят только форматирования, без пересчета
+и без обращения к LLM.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from ..core_logic.crossover_solver import Crossover
+from ..models.extraction import ExtractedReactionParameters
+from .unified_reaction_formatter import UnifiedReactionFormatter
+
+VIEWS = ("full", "brief", "detailed", "csv", "file")
+
+
+@dataclass(eq=False)
+class ReactionResult:
+    """Результат расчета реакции с представлениями по требованию."""
+
+    params: ExtractedReactionParameters
+    df_result: pd.DataFrame
+    compounds_metadata: Dict[str, Any]
+    crossovers: Optional[List[Crossover]]
+    formatter: UnifiedReactionFormatter = field(repr=False)
+    temperature_range: Optional[List[float]] = None
+    _views: Dict[str, str] = field(default_factory=dict, repr=False)
+
+    def render(self, view: str = "full") -> str:
+        """
+        Представление результата (строится один раз, затем из памяти).
+
+        Args:
+            view: full | brief | detailed | csv | file
+        """
+        text = self._views.get(view)
+        if text is None:
+            renderer = _RENDERERS.get(view)
+            if renderer is None:
+                raise ValueError(f"Неизвестное представление: {view}")
+            text = self._views[view] = renderer(self)
+        return text
+
+    def iter_sections(self) -> Iterator[str]:
+        """
+        Полный ответ по частям (UnifiedReactionFormatter.iter_reaction_result).
+
+        Части соединяются через "\n"; используется для потоковой записи
+        отчета в файл (FileHandler.create_report_file).
+        """
+        return self.formatter.iter_reaction_result(
+            self.params, self.df_result, self.compounds_metadata, self.crossovers
+        )
+
+    @property
+    def rendered_views(self) -> List[str]:
+        """Уже построенные представления."""
+        return list(self._views)
+
+    def _render_full(self) -> str:
+        return self.formatter.format_reaction_result(
+            self.params, self.df_result, self.compounds_metadata, crossovers=self.crossovers
+        )
+
+    def _render_brief(self) -> str:
+        return self.formatter.format_brief_result(
+            self.params, self.df_result, self.compounds_metadata
+        )
+
+    def _render_detailed(self) -> str:
+        lines = [self.render("full"), "", "Источники данных и фазовые переходы:"]
+        for formula in self.params.all_compounds:
+            metadata = self.compounds_metadata.get(formula, {})
+            source = (
+                "YAML-кэш" if metadata.get("is_yaml_cache")
+                else f"БД (стадия {metadata.get('search_stage')})"
+            )
+            lines.append(
+                f"  {formula}: {source}, записей {len(metadata.get('records_used', []))}"
+                f"{_format_point(', Tпл', metadata.get('melting_point'))}"
+                f"{_format_point(', Tкип', metadata.get('boiling_point'))}"
+            )
+            for T, phase_from, phase_to in metadata.get("phase_transitions", []):
+                lines.append(f"    {phase_from} → {phase_to} при {T:.0f} K")
+        return "\n".join(lines)
+
+    def _render_csv(self) -> str:
+        return self.formatter.table_formatter.format_csv_export(self.df_result)
+
+    def _render_file(self) -> str:
+        return f"{self.render('detailed')}\n\nТаблица результатов (CSV):\n{self.render('csv')}"
+
+
+def _format_point(label: str, value: Optional[float]) -> str:
+    if value is None or pd.isna(value):
+        return ""
+    return f"{label} {value:.0f} K"
+
+
+_RENDERERS: Dict[str, Callable[[ReactionResult], str]] = {
+    "full": ReactionResult._render_full,
+    "brief": ReactionResult._render_brief,
+    "detailed": ReactionResult._render_detailed,
+    "csv": ReactionResult._render_csv,
+    "file": ReactionResult._render_file,
+}
@@ -5,10 +5,11 @@
 красиво отформатированный вывод с использованием Unicode символов.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 import pandas as pd
 
+from ..core_logic.crossover_solver import Crossover
 from ..models.extraction import ExtractedReactionParameters
 from .compound_info_formatter import CompoundInfoFormatter
 from .interpretation_formatter import InterpretationFormatter
@@ -43,6 +44,7 @@ class UnifiedReactionFormatter:
         params: ExtractedReactionParameters,
         df_result: pd.DataFrame,
         compounds_metadata: Dict[str, Any],
+        crossovers: Optional[List[Crossover]] = None,
     ) -> str:
         """
         Форматирует полный результат расчета реакции.
@@ -85,31 +87,44 @@ class UnifiedReactionFormatter:
                     'search_stage': int
                 }
             }
+            crossovers: Точные температуры ΔG = 0 / K = target_k
+                (ReactionEngine.find_crossover_temperatures)
 
         Returns:
             Отформатированная строка для вывода пользователю
         """
-        lines = []
+        return "\n".join(
+            self.iter_reaction_result(params, df_result, compounds_metadata, crossovers)
+        )
 
+    def iter_reaction_result(
+        self,
+        params: ExtractedReactionParameters,
+        df_result: pd.DataFrame,
+        compounds_metadata: Dict[str, Any],
+        crossovers: Optional[List[Crossover]] = None,
+    ) -> Iterator[str]:
+        """
+        Потоковый вариант format_reaction_result: выдает вывод по строкам/блокам.
+
+        Части соединяются через "\n"; позволяет писать большой отчет сразу
+        в файл (FileHandler.create_report_file) без сборки одной строки.
+        """
         # Заголовок
-        lines.append(
-            "══════════════════════════════════════════════════════════════════"
-        )
-        lines.append("⚗️ Термодинамический расчёт реакции")
-        lines.append(
-            "══════════════════════════════════════════════════════════════════"
-        )
-        lines.append("")
+        yield "══════════════════════════════════════════════════════════════════"
+        yield "⚗️ Термодинамический расчёт реакции"
+        yield "══════════════════════════════════════════════════════════════════"
+        yield ""
 
         # Уравнение реакции
         equation_formatted = self._format_equation(params.balanced_equation)
-        lines.append(f"Уравнение реакции: {equation_formatted}")
-        lines.append("")
+        yield f"Уравнение реакции: {equation_formatted}"
+        yield ""
 
         # Метод расчёта
-        lines.append("Метод расчёта:")
-        lines.append(self._format_calculation_method())
-        lines.append("")
+        yield "Метод расчёта:"
+        yield self._format_calculation_method()
+        yield ""
 
         # Данные веществ
         all_compounds = params.all_compounds
@@ -127,7 +142,7 @@ class UnifiedReactionFormatter:
             )
 
             if compound_table:
-                lines.append(compound_table)
+                yield compound_table
 
             # Добавляем таблицу термодинамических свойств вещества
             # Используем расширенный диапазон 298-2500K для полноты картины
@@ -142,11 +157,11 @@ class UnifiedReactionFormatter:
             )
 
             if thermodynamic_table:
-                lines.append(thermodynamic_table)
+                yield thermodynamic_table
 
         # Добавляем информацию о веществах в текстовом формате
-        lines.append("Данные веществ:")
-        lines.append("")
+        yield "Данные веществ:"
+        yield ""
 
         for formula in all_compounds:
             names = compound_names.get(formula, []) if compound_names else []
@@ -170,12 +185,12 @@ class UnifiedReactionFormatter:
                 "  Источник:", f"  {source_info}\n  Источник:"
             )
 
-            lines.append(compound_info)
-            lines.append("")
+            yield compound_info
+            yield ""
 
         # Результаты расчёта
-        lines.append("Результаты расчёта:")
-        lines.append("")
+        yield "Результаты расчёта:"
+        yield ""
 
         # Собираем информацию о фазовых переходах
         phase_transitions = {}
@@ -188,35 +203,32 @@ class UnifiedReactionFormatter:
         table_output = self.table_formatter.format_reaction_table(
             df_result, phase_transitions
         )
-        lines.append(table_output)
-        lines.append("")
+        yield table_output
+        yield ""
 
         # Техническая информация о расчете
         temp_range = f"{df_result['T'].min():.0f}-{df_result['T'].max():.0f}"
-        lines.append(f"Диапазон температур: {temp_range} K")
-        lines.append("Шаг по температуре: 100 K")
-        lines.append("Расчёты выполнены с использованием уравнений Шомейта")
-        lines.append("")
+        yield f"Диапазон температур: {temp_range} K"
+        yield "Шаг по температуре: 100 K"
+        yield "Расчёты выполнены с использованием уравнений Шомейта"
+        yield ""
 
         # Интерпретация результатов
         interpretation_output = self.interpretation.format_interpretation(
-            df_result, params
+            df_result, params, crossovers
         )
-        lines.append(interpretation_output)
-        lines.append("")
+        yield interpretation_output
+        yield ""
 
         # Технические рекомендации
         tech_recommendations = self.interpretation.format_technical_recommendations(
             df_result, params
         )
-        lines.append(tech_recommendations)
+        yield tech_recommendations
 
         # Финальная линия
-        lines.append(
-            "══════════════════════════════════════════════════════════════════"
-        )
+        yield "══════════════════════════════════════════════════════════════════"
 
-        return "\n".join(lines)
 
     def _format_equation(self, equation: str) -> str:
         """
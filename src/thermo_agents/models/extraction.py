@@ -20,7 +20,8 @@ ExtractedReactionParameters:
 Ключевые поля ExtractedReactionParameters:
 
 Тип и структура запроса:
-- **query_type**: Тип запроса ("compound_data" или "reaction_calculation")
+- **query_type**: Тип запроса ("compound_data", "reaction_calculation" или
+  "equilibrium_composition")
 - **balanced_equation**: Уравнение реакции в стандартизированном формате
 - **all_compounds**: Все вещества в реакции (до 10)
 - **reactants**: Реагенты (левая часть уравнения)
@@ -29,6 +30,11 @@ ExtractedReactionParameters:
 Температурные параметры:
 - **temperature_range_k**: Диапазон температур (tmin, tmax) в Кельвинах
 - **temperature_step_k**: Шаг температуры для таблиц (25-250K)
+- **target_k**: Целевая константа равновесия (найти T, при которой K = target_k)
+
+Равновесный состав:
+- **initial_amounts**: Исходные количества веществ {формула: моль}
+- **pressure_bar**: Давление, бар
 
 Качество и метаданные:
 - **extraction_confidence**: Уверенность извлечения (0.0-1.0)
@@ -48,6 +54,9 @@ ExtractedReactionParameters:
 - **reaction_calculation**: Расчёт термодинамики реакции
   - Несколько веществ (2-10)
   - Заполненные reactants и products
+- **equilibrium_composition**: Равновесный состав смеси (минимизация G)
+  - Возможные вещества в all_compounds (2-10)
+  - Исходные количества в initial_amounts (или 1 моль каждого реагента)
 
 Правила валидации:
 - Для compound_data: ровно одно вещество
@@ -117,8 +126,9 @@ from pydantic import BaseModel, Field, field_validator
 class ExtractedReactionParameters(BaseModel):
     """Параметры реакции, извлечённые из запроса пользователя."""
 
-    query_type: Literal["compound_data", "reaction_calculation"] = Field(
-        ..., description="Тип запроса: данные по веществу или расчёт реакции"
+    query_type: Literal["compound_data", "reaction_calculation", "equilibrium_composition"] = Field(
+        ...,
+        description="Тип запроса: данные по веществу, расчёт реакции или равновесный состав смеси",
     )
 
     balanced_equation: str = Field(
@@ -159,6 +169,27 @@ class ExtractedReactionParameters(BaseModel):
         default=100, ge=25, le=250, description="Шаг температуры для таблиц, K (25-250)"
     )
 
+    target_k: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description=(
+            "Целевая константа равновесия: найти температуры, при которых K = target_k. "
+            "Только для reaction_calculation; None — только температуры ΔG = 0"
+        ),
+    )
+
+    initial_amounts: Dict[str, float] = Field(
+        default_factory=dict,
+        description=(
+            "Исходные количества веществ, моль: {formula: moles}. "
+            "Только для equilibrium_composition; если пусто — по 1 моль каждого реагента"
+        ),
+    )
+
+    pressure_bar: float = Field(
+        default=1.0, gt=0, description="Давление для равновесного состава, бар"
+    )
+
     use_multi_phase: bool = Field(
         default=True, description="Использовать многофазные расчёты (Stage 5)"
     )
@@ -243,6 +274,20 @@ class ExtractedReactionParameters(BaseModel):
             if not self.balanced_equation or self.balanced_equation == "N/A":
                 raise ValueError("reaction_calculation требует balanced_equation")
 
+        elif self.query_type == "equilibrium_composition":
+            # Для равновесного состава нужны возможные вещества и исходная смесь
+            if len(self.all_compounds) < 2:
+                raise ValueError(
+                    f"equilibrium_composition требует минимум 2 вещества, "
+                    f"получено: {len(self.all_compounds)}"
+                )
+            if not self.initial_amounts and not self.reactants:
+                raise ValueError(
+                    "equilibrium_composition требует initial_amounts или reactants"
+                )
+            if any(amount < 0 for amount in self.initial_amounts.values()):
+                raise ValueError("initial_amounts не может содержать отрицательные количества")
+
     @field_validator("temperature_step_k")
     @classmethod
     def validate_temperature_step(cls, v):
@@ -299,6 +344,9 @@ class ExtractedReactionParameters(BaseModel):
         if self.query_type == "compound_data":
             # Для compound_data обязательны только all_compounds и temperature_range_k
             required_fields = ["all_compounds", "temperature_range_k"]
+        elif self.query_type == "equilibrium_composition":
+            # Исходная смесь задается initial_amounts или reactants (проверено выше)
+            required_fields = ["all_compounds", "temperature_range_k"]
         else:  # reaction_calculation
             # Для reaction_calculation обязательны все поля реакции
             required_fields = [
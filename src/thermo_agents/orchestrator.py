@@ -7,29 +7,50 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
+
+from .batch import BatchItem, BatchResult, group_jobs
 from .core_logic import (
     CompoundDataLoader,
+    Crossover,
+    GibbsEquilibriumSolver,
     PhaseTransitionDetector,
     ReactionEngine,
     RecordRangeBuilder,
     ThermodynamicEngine,
+    ThermoTable,
 )
 from .formatting import (
     CompoundInfoFormatter,
+    EquilibriumFormatter,
     InterpretationFormatter,
+    ReactionResult,
     TableFormatter,
     UnifiedReactionFormatter,
 )
 from .models.extraction import ExtractedReactionParameters
+from .prefetch import CompoundPrefetcher, PrefetchReport, PrefetchTask
+from .search.composition_index import CompositionIndex
+from .search.compound_index import database_version
 from .search.database_connector import DatabaseConnector
+from .search.name_index import NameIndex
 from .session_logger import SessionLogger
 from .storage.static_data_manager import StaticDataManager
-from .thermodynamic_agent import ThermodynamicAgent
+from .utils.resilience import Deadline
+from .utils.single_flight import SingleFlight
+
+if TYPE_CHECKING:
+    # pydantic-ai/OpenAI (~0.5 с) загружаются только при создании агента
+    from .thermodynamic_agent import PartialExtraction, ThermodynamicAgent
 
 
 @dataclass
@@ -46,11 +67,27 @@ class ThermoOrchestratorConfig:
     llm_api_key: str = ""
     llm_base_url: str = ""
     llm_model: str = "openai:gpt-4o"
+    # Запасная модель для дублирующих запросов при медленном ответе основной
+    llm_hedge_model: Optional[str] = None
 
     # База данных
     db_path: Path = field(default_factory=lambda: Path("data/thermo_data.db"))
     static_data_dir: Path = field(default_factory=lambda: Path("data/static_compounds"))
 
+    # JSONL журнал извлеченных параметров (для воспроизведения в бенчмарке)
+    query_log_path: Optional[Path] = None
+
+    # Каталог снимков поисковых индексов БД (None — индексы не используются)
+    search_index_dir: Optional[Path] = None
+
+    # Спекулятивная предзагрузка веществ из текста запроса во время вызова LLM
+    prefetch_enabled: bool = True
+    prefetch_ttl_s: float = 120.0
+    prefetch_workers: int = 2
+    # Потоковое извлечение: загрузка веществ из частичного ответа LLM
+    # (all_compounds, compound_names) до окончания остальных полей
+    streaming_extraction: bool = False
+
 
 class ThermoOrchestrator:
     """
@@ -64,6 +101,13 @@ class ThermoOrchestrator:
     - Трехуровневая стратегия отбора записей
     """
 
+    # Сколько последних запросов хранить в recent_params (и результатов
+    # реакций в recent_results)
+    RECENT_PARAMS_LIMIT = 256
+
+    # Диапазон расчета реакций (T_start, T_end, шаг)
+    REACTION_TEMPERATURE_RANGE = [298, 2500, 100]
+
     def __init__(
         self,
         config: ThermoOrchestratorConfig,
@@ -81,6 +125,37 @@ class ThermoOrchestrator:
         self.agent_id = "core_logic_orchestrator"
         self.session_logger = session_logger
 
+        # Пул рабочих процессов для детерминированных расчетов (опционально,
+        # см. thermo_agents.worker_pool.CalculationWorkerPool)
+        self.calculation_pool = None
+
+        # Объединение одновременных расчетов с одинаковыми параметрами
+        self.calculation_flight = SingleFlight("params")
+
+        # Последние извлеченные параметры по тексту запроса: пересчет
+        # inline-кнопками идет от них, без повторного вызова LLM
+        self.recent_params: "OrderedDict[str, ExtractedReactionParameters]" = (
+            OrderedDict()
+        )
+
+        # Данные веществ, загруженные последними запросами (по тексту запроса):
+        # пересчет кнопками начинается с них, а не с пустого кэша
+        self.recent_frames: "OrderedDict[str, Dict[str, tuple]]" = OrderedDict()
+
+        # Записи, отобранные при расчете последних запросов (по тексту
+        # запроса): пересчет на окне внутри исходного берет записи из них
+        self.recent_records: "OrderedDict[str, Dict[tuple, list]]" = OrderedDict()
+
+        # Последние результаты реакций по (параметры, диапазон): смена формата
+        # и повтор ответа строят представление из них, без пересчета
+        self.recent_results: "OrderedDict[Tuple[str, tuple], ReactionResult]" = (
+            OrderedDict()
+        )
+
+        # Отчет предзагрузки веществ последнего запроса
+        self.prefetcher: Optional[CompoundPrefetcher] = None
+        self.last_prefetch_report: Optional[PrefetchReport] = None
+
         self.logger.info("Инициализация оркестратора с core-логикой (Этап 2)")
 
         # Инициализация компонентов
@@ -97,6 +172,7 @@ class ThermoOrchestrator:
                     llm_api_key=self.config.llm_api_key,
                     llm_base_url=self.config.llm_base_url,
                     llm_model=self.config.llm_model,
+                    hedge_model=self.config.llm_hedge_model,
                 )
                 self.logger.info("✅ ThermodynamicAgent инициализирован")
             except Exception as e:
@@ -118,6 +194,17 @@ class ThermoOrchestrator:
             self.logger.error(f"❌ Ошибка инициализации DatabaseConnector: {e}")
             self.db_connector = None
 
+        # Индекс элементного состава (композиты, гидраты, перестановки)
+        self.composition_index = self._load_composition_index()
+
+        # FTS5 индекс названий (создается scripts/prepare_search_db.py)
+        self.name_index = None
+        if self.db_connector and Path(self.config.db_path).exists():
+            name_index = NameIndex(self.db_connector)
+            if name_index.is_available:
+                self.name_index = name_index
+                self.logger.info("✅ Индекс названий (FTS5) подключен")
+
         # YAML-кэш (StaticDataManager)
         try:
             self.static_manager = StaticDataManager(self.config.static_data_dir)
@@ -133,7 +220,11 @@ class ThermoOrchestrator:
         if self.db_connector and self.static_manager:
             try:
                 self.compound_loader = CompoundDataLoader(
-                    self.db_connector, self.static_manager, self.logger
+                    self.db_connector,
+                    self.static_manager,
+                    self.logger,
+                    composition_index=self.composition_index,
+                    name_index=self.name_index,
                 )
                 self.phase_detector = PhaseTransitionDetector()
                 self.range_builder = RecordRangeBuilder(self.logger)
@@ -144,7 +235,9 @@ class ThermoOrchestrator:
                     self.range_builder,
                     self.thermo_engine,
                     self.logger,
+                    thermo_table=self._load_thermo_table(),
                 )
+                self.equilibrium_solver = GibbsEquilibriumSolver(self.reaction_engine)
                 self.logger.info("✅ Core-логика компоненты инициализированы")
 
                 # Новые форматтеры (Этап 3)
@@ -156,8 +249,17 @@ class ThermoOrchestrator:
                     self.table_formatter,
                     self.interpretation_formatter,
                 )
+                self.equilibrium_formatter = EquilibriumFormatter()
                 self.logger.info("✅ Новые форматтеры инициализированы (Этап 3)")
 
+                if self.config.prefetch_enabled:
+                    self.prefetcher = CompoundPrefetcher(
+                        self._prefetch_compound,
+                        resolve=self.compound_loader.resolve_prefetched,
+                        ttl_s=self.config.prefetch_ttl_s,
+                        max_workers=self.config.prefetch_workers,
+                    )
+
             except Exception as e:
                 self.logger.error(f"❌ Ошибка инициализации core-логики: {e}")
                 self.reaction_engine = None
@@ -169,12 +271,63 @@ class ThermoOrchestrator:
                 "⚠️ Core-логика не инициализирована (проблемы с БД или StaticDataManager)"
             )
 
-    async def process_query(self, user_query: str) -> str:
+    def _load_composition_index(self) -> Optional[CompositionIndex]:
+        """Загрузка (или построение) индекса состава, если задан search_index_dir."""
+        if not self.config.search_index_dir or not self.db_connector:
+            return None
+        if not Path(self.config.db_path).exists():
+            return None
+
+        try:
+            index = CompositionIndex()
+            index.load_or_build(
+                self.db_connector,
+                Path(self.config.search_index_dir) / "composition.npz",
+            )
+            self.logger.info(
+                f"✅ Индекс состава: {index.get_stats()['total_records']} записей"
+            )
+            return index
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка построения индекса состава: {e}")
+            return None
+
+    def _load_thermo_table(self) -> Optional[ThermoTable]:
+        """
+        Открытие предрассчитанных таблиц свойств (search_index_dir/thermo_table).
+
+        Таблицы строятся отдельно (scripts/build_thermo_tables.py); таблицы,
+        построенные для другой версии БД, не используются.
+        """
+        if not self.config.search_index_dir:
+            return None
+        table_dir = Path(self.config.search_index_dir) / "thermo_table"
+        if not table_dir.exists():
+            return None
+
+        try:
+            table = ThermoTable()
+            table.load(table_dir)
+            if table.source_version != database_version(self.config.db_path):
+                self.logger.warning(
+                    "⚠️ Таблицы свойств построены для другой версии БД, не используются"
+                )
+                return None
+            self.logger.info(f"✅ Таблицы свойств: {len(table.formulas)} веществ")
+            return table
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка загрузки таблиц свойств: {e}")
+            return None
+
+    async def process_query(
+        self, user_query: str, deadline: Optional[Deadline] = None
+    ) -> str:
         """
         Обработка запроса с использованием новой core-логики.
 
         Args:
             user_query: Запрос на естественном языке
+            deadline: Срок запроса; передается в извлечение параметров LLM
 
         Returns:
             Отформатированный ответ с результатами расчетов
@@ -195,68 +348,768 @@ class ThermoOrchestrator:
 
             start_time = time.time()
 
-            params = await self.thermodynamic_agent.extract_parameters(user_query)
+            # Данные веществ из текста запроса загружаются, пока работает LLM
+            prefetch_task = None
+            if self.prefetcher is not None and self.calculation_pool is None:
+                prefetch_task = self.prefetcher.start(user_query)
+
+            extract_kwargs = {} if deadline is None else {"deadline": deadline}
+            if prefetch_task is not None and self.config.streaming_extraction:
+                params = await self.thermodynamic_agent.extract_parameters(
+                    user_query,
+                    on_partial=lambda partial: self._on_partial_params(prefetch_task, partial),
+                    **extract_kwargs,
+                )
+            else:
+                params = await self.thermodynamic_agent.extract_parameters(
+                    user_query, **extract_kwargs
+                )
 
             duration = time.time() - start_time
+            if prefetch_task is not None:
+                prefetch_task.extraction_s = prefetch_task.mark("extraction done")
 
-            # 3. Логирование ответа LLM с временем выполнения
+            # 3. Логирование ответа LLM с временем выполнения и токенами
             if self.session_logger:
+                token_usage = getattr(self.thermodynamic_agent, "last_usage", None)
                 self.session_logger.log_llm_response(
                     params.model_dump(),
                     duration=duration,
                     model=getattr(self.thermodynamic_agent, "model_name", "unknown"),
+                    token_usage=token_usage if isinstance(token_usage, dict) else None,
                 )
 
-            # 4. Расчет реакции через новый ReactionEngine
-            if params.query_type == "reaction_calculation":
-                if not self.reaction_engine:
-                    return "❌ ReactionEngine не инициализирован. Проверьте конфигурацию БД и StaticDataManager."
+            if self.config.query_log_path:
+                self._append_query_log(user_query, params)
+
+            self._remember_params(user_query, params)
+
+            frames = records_cache = None
+            if prefetch_task is not None:
+                frames, records_cache = await self._collect_prefetch(prefetch_task, params)
+            if frames is None:
+                frames = {}
+            if records_cache is None:
+                records_cache = {}
+            self._remember_frames(user_query, frames, records_cache)
+
+            # 4. Детерминированный расчет; одновременные запросы с одинаковыми
+            # параметрами ждут одно вычисление
+            return await self.calculation_flight.do(
+                self._params_key(params),
+                lambda: self._run_calculation(
+                    params, frames=frames, records_cache=records_cache
+                ),
+            )
 
-                temperature_range = [298, 2500, 100]  # Фиксированный диапазон
+        except Exception as e:
+            self.logger.error(f"Ошибка обработки запроса: {e}")
+            if self.session_logger:
+                self.session_logger.log_llm_error(str(e))
+            return f"❌ Ошибка: {str(e)}"
+
+    async def _run_calculation(
+        self,
+        params: ExtractedReactionParameters,
+        frames: Optional[Dict[str, tuple]] = None,
+        records_cache: Optional[Dict[tuple, list]] = None,
+    ) -> str:
+        """
+        Детерминированный расчет: в пуле процессов или в текущем процессе.
+
+        frames и records_cache — предзагруженные данные веществ (см.
+        _collect_prefetch); пулу процессов не передаются.
+        """
+        if self.calculation_pool is not None:
+            return await self.calculation_pool.calculate(params)
 
+        if params.query_type == "reaction_calculation":
+            return self._calculate_reaction(
+                params, frames=frames, records_cache=records_cache
+            )
+        if params.query_type == "equilibrium_composition":
+            return self._calculate_equilibrium(params)
+
+        if frames is not None:
+            return self._format_compound_data(
+                params, frames=frames, records_cache=records_cache
+            )
+        return await self._process_compound_data(params)
+
+    def _prefetch_compound(self, formula: str) -> Tuple[tuple, Dict[tuple, list]]:
+        """
+        Загрузка вещества по формуле и отбор записей для диапазона реакций.
+
+        Выполняется в потоке CompoundPrefetcher до ответа LLM, поэтому
+        имена веществ и compound_types неизвестны: is_elemental
+        определяется по формуле.
+        """
+        frame = self.compound_loader.get_raw_compound_data_with_metadata(formula)
+        df = frame[0]
+        records = {}
+        if not df.empty:
+            melting, boiling = self.phase_detector.get_most_common_melting_boiling_points(df)
+            t_range = self.REACTION_TEMPERATURE_RANGE[:2]
+            is_elemental = self._is_elemental(formula)
+            records[(formula, *t_range, is_elemental)] = (
+                self.range_builder.get_compound_records_for_range(
+                    df, t_range, melting, boiling, is_elemental=is_elemental
+                )
+            )
+        return frame, records
+
+    def _on_partial_params(self, task: PrefetchTask, partial: PartialExtraction) -> None:
+        """
+        Частичные параметры потокового извлечения: загрузка новых веществ
+        и, после compound_names, поиск по именам — пока LLM дописывает ответ.
+        """
+        added = self.prefetcher.extend(task, partial.all_compounds)
+        for formula in added:
+            task.mark(f"partial {formula}")
+        if partial.names_complete:
+            task.mark("partial compound_names")
+            for formula, names in partial.compound_names.items():
+                if formula in task.formulas:
+                    self.prefetcher.resolve_early(task, formula, names)
+
+    async def _collect_prefetch(
+        self, task: PrefetchTask, params: ExtractedReactionParameters
+    ) -> Tuple[Optional[Dict[str, tuple]], Optional[Dict[tuple, list]]]:
+        """
+        Сверка предзагрузки с веществами из параметров LLM.
+
+        Предзагруженные данные используются, если поиск с именами из
+        параметров дает тот же результат (CompoundDataLoader.resolve_prefetched);
+        отобранные записи — только вместе с исходными данными. Загрузки
+        веществ из частичного ответа, которых нет в итоговых параметрах,
+        отменяются; поиск по частичным именам, не совпавшим с итоговыми,
+        повторяется. Ошибка сверки не прерывает запрос: расчет загрузит
+        вещества сам.
+
+        Returns:
+            (frames, records_cache) для расчета или (None, None)
+        """
+        if params.query_type == "reaction_calculation":
+            needed = list(params.all_compounds)
+        elif params.query_type == "compound_data":
+            needed = list(params.all_compounds[:1])
+        else:
+            needed = []
+
+        try:
+            cancelled = self.prefetcher.cancel(task, needed)
+            entries, wait_s = await self.prefetcher.collect(task, needed)
+
+            frames: Dict[str, tuple] = {}
+            records_cache: Dict[tuple, list] = {}
+            used = {}
+            contradicted = []
+            for formula, entry in entries.items():
+                names = params.compound_names.get(formula) if params.compound_names else None
+                frame, names_changed = await self.prefetcher.resolved_frame(task, formula, names)
+                if names_changed:
+                    contradicted.append(formula)
+                early = frame is not None
+                if frame is None:
+                    frame = self.compound_loader.resolve_prefetched(formula, names, entry.frame)
+                if frame is None:
+                    continue
+                frames[formula] = frame
+                if frame is entry.frame:
+                    records_cache.update(entry.records)
+                if frame is entry.frame or early:
+                    used[formula] = entry
+
+            report = self.prefetcher.report(
+                task,
+                needed,
+                used,
+                wait_s,
+                cancelled=cancelled,
+                contradicted=contradicted,
+            )
+        except Exception as e:
+            self.logger.warning(f"Предзагрузка веществ не использована: {e}")
+            return None, None
+
+        self.last_prefetch_report = report
+        self.logger.info(report.summary())
+        if self.session_logger:
+            self.session_logger.log_info(report.summary())
+            if report.streamed:
+                self.session_logger.log_info("Интервалы запроса:\n" + report.format_spans())
+        return (frames, records_cache) if frames else (None, None)
+
+    async def process_batch(
+        self,
+        items: Sequence[BatchItem],
+        concurrency: int = 4,
+        chunk_size: int = 16,
+        on_result: Optional[Callable[[BatchResult], None]] = None,
+    ) -> List[BatchResult]:
+        """
+        Пакетная обработка запросов.
+
+        1. Параметры извлекаются LLM не более чем для concurrency запросов
+           одновременно; задания с готовыми параметрами LLM не вызывают.
+        2. Задания группируются по общим веществам (group_jobs); группа
+           рассчитывается в рабочем процессе calculation_pool, а без пула —
+           в текущем процессе с общими для всего пакета кэшами веществ.
+
+        Args:
+            items: Задания пакета (см. batch.load_batch)
+            concurrency: Максимум одновременных вызовов LLM
+            chunk_size: Размер группы заданий для расчета
+            on_result: Вызывается для каждого результата по мере готовности
+
+        Returns:
+            Результаты в порядке items
+        """
+        results: Dict[int, BatchResult] = {}
+
+        def emit(result: BatchResult) -> None:
+            results[result.index] = result
+            if on_result is not None:
+                on_result(result)
+
+        # 1. Извлечение параметров
+        semaphore = asyncio.Semaphore(concurrency)
+        ready: List[Tuple[BatchItem, ExtractedReactionParameters, float]] = []
+
+        async def extract(item: BatchItem) -> None:
+            if item.error is not None:
+                emit(BatchResult(item.index, item.query, "error", error=item.error))
+                return
+            if item.params is not None:
+                ready.append((item, item.params, 0.0))
+                return
+            if not self.thermodynamic_agent:
+                emit(BatchResult(
+                    item.index, item.query, "error",
+                    error="LLM агент не инициализирован. Укажите API ключ в конфигурации.",
+                ))
+                return
+
+            async with semaphore:
+                start = time.perf_counter()
                 try:
-                    # Используем новый метод с метаданными для форматтера
-                    df_result, compounds_metadata = (
-                        self.reaction_engine.calculate_reaction_with_metadata(
-                            params, temperature_range
-                        )
+                    params = await self.thermodynamic_agent.extract_parameters(item.query)
+                except Exception as e:
+                    emit(BatchResult(
+                        item.index, item.query, "error", error=str(e),
+                        extraction_s=time.perf_counter() - start,
+                    ))
+                    return
+                duration = time.perf_counter() - start
+
+            if self.config.query_log_path:
+                self._append_query_log(item.query, params)
+            ready.append((item, params, duration))
+
+        await asyncio.gather(*(extract(item) for item in items))
+
+        # 2. Расчет группами с общими веществами (кэши по формуле и именам)
+        frames: Dict[tuple, tuple] = {}
+        records_cache: Dict[tuple, Dict[tuple, list]] = {}
+
+        async def calculate(chunk: List[int]) -> None:
+            jobs = [ready[i] for i in chunk]
+            params_list = [params for _, params, _ in jobs]
+            if self.calculation_pool is not None:
+                outputs = await self.calculation_pool.calculate_batch(params_list)
+            else:
+                outputs = self.calculate_batch(params_list, frames, records_cache)
+                await asyncio.sleep(0)
+
+            for (item, params, extraction_s), (response, calculation_s) in zip(jobs, outputs):
+                failed = response.startswith("❌")
+                emit(BatchResult(
+                    item.index, item.query, "error" if failed else "ok",
+                    response=response,
+                    error=response.splitlines()[0] if failed else None,
+                    params=params,
+                    extraction_s=extraction_s,
+                    calculation_s=calculation_s,
+                ))
+
+        chunks = group_jobs([params for _, params, _ in ready], chunk_size)
+        if self.calculation_pool is not None:
+            await asyncio.gather(*(calculate(chunk) for chunk in chunks))
+        else:
+            for chunk in chunks:
+                await calculate(chunk)
+
+        self.logger.info(
+            f"Пакет обработан: {len(results)} заданий, "
+            f"ошибок {sum(r.status == 'error' for r in results.values())}"
+        )
+        return [results[index] for index in sorted(results)]
+
+    def _remember_params(
+        self, user_query: str, params: ExtractedReactionParameters
+    ) -> None:
+        """Сохранение параметров запроса (LRU на RECENT_PARAMS_LIMIT запросов)."""
+        key = " ".join(user_query.split())
+        self.recent_params[key] = params
+        self.recent_params.move_to_end(key)
+        while len(self.recent_params) > self.RECENT_PARAMS_LIMIT:
+            self.recent_params.popitem(last=False)
+
+    def _remember_frames(
+        self,
+        user_query: str,
+        frames: Dict[str, tuple],
+        records_cache: Dict[tuple, list],
+    ) -> None:
+        """
+        Сохранение данных веществ и отобранных записей запроса (LRU на
+        RECENT_PARAMS_LIMIT запросов).
+        """
+        key = " ".join(user_query.split())
+        for recent, value in ((self.recent_frames, frames), (self.recent_records, records_cache)):
+            recent[key] = value
+            recent.move_to_end(key)
+            while len(recent) > self.RECENT_PARAMS_LIMIT:
+                recent.popitem(last=False)
+
+    def _remember_result(self, result: ReactionResult) -> None:
+        """Сохранение результата реакции (LRU на RECENT_PARAMS_LIMIT результатов)."""
+        key = (self._params_key(result.params), tuple(result.temperature_range))
+        self.recent_results[key] = result
+        self.recent_results.move_to_end(key)
+        while len(self.recent_results) > self.RECENT_PARAMS_LIMIT:
+            self.recent_results.popitem(last=False)
+
+    def get_reaction_result(
+        self,
+        params: ExtractedReactionParameters,
+        temperature_range: Optional[List[float]] = None,
+    ) -> Optional[ReactionResult]:
+        """
+        Сохраненный результат реакции для параметров.
+
+        Args:
+            params: Параметры запроса
+            temperature_range: Диапазон расчета (по умолчанию фиксированный
+                REACTION_TEMPERATURE_RANGE)
+
+        Returns:
+            ReactionResult или None (реакция не считалась в этом процессе,
+            например, расчет шел в пуле рабочих процессов)
+        """
+        if temperature_range is None:
+            temperature_range = self.REACTION_TEMPERATURE_RANGE
+        return self.recent_results.get(
+            (self._params_key(params), tuple(temperature_range))
+        )
+
+    def get_llm_resilience_stats(self) -> Dict[str, Any]:
+        """Выключатель, дублирующие запросы и задержки LLM ({} без агента)."""
+        get_stats = getattr(self.thermodynamic_agent, "get_resilience_stats", None)
+        if get_stats is None:
+            return {}
+        try:
+            stats = get_stats()
+        except Exception as e:
+            self.logger.debug(f"Нет статистики устойчивости LLM: {e}")
+            return {}
+        return stats if isinstance(stats, dict) else {}
+
+    def get_extracted_params(
+        self, user_query: str
+    ) -> Optional[ExtractedReactionParameters]:
+        """Параметры, извлеченные LLM для запроса (None, если запрос не обрабатывался)."""
+        return self.recent_params.get(" ".join(user_query.split()))
+
+    def get_loaded_frames(self, user_query: str) -> Optional[Dict[str, tuple]]:
+        """
+        Данные веществ, загруженные при обработке запроса
+        {formula: (df, is_yaml_cache, search_stage)}.
+
+        Возвращается копия: пересчет дополняет ее, не меняя данные других
+        пользователей с тем же запросом. Пустой словарь — расчет шел в пуле
+        рабочих процессов или без загрузки веществ; None — запрос не
+        обрабатывался.
+        """
+        frames = self.recent_frames.get(" ".join(user_query.split()))
+        return None if frames is None else dict(frames)
+
+    def get_loaded_records(self, user_query: str) -> Optional[Dict[tuple, list]]:
+        """
+        Записи, отобранные при расчете запроса
+        {(formula, T_start, T_end, is_elemental): records}.
+
+        Возвращается копия (см. get_loaded_frames); None — запрос не
+        обрабатывался.
+        """
+        records = self.recent_records.get(" ".join(user_query.split()))
+        return None if records is None else dict(records)
+
+    @staticmethod
+    def _params_key(params: ExtractedReactionParameters) -> str:
+        """Канонический ключ параметров (порядок полей не влияет)."""
+        return json.dumps(
+            params.model_dump(mode="json"), sort_keys=True, ensure_ascii=False
+        )
+
+    def _append_query_log(
+        self, user_query: str, params: ExtractedReactionParameters
+    ) -> None:
+        """Добавление запроса и извлеченных параметров в JSONL журнал."""
+        try:
+            record = {"query": user_query, "params": params.model_dump(mode="json")}
+            with open(self.config.query_log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            self.logger.warning(f"Не удалось записать журнал запросов: {e}")
+
+    def calculate(self, params: ExtractedReactionParameters) -> str:
+        """
+        Детерминированная часть обработки запроса (без LLM).
+
+        Используется рабочими процессами CalculationWorkerPool: результат
+        зависит только от параметров, БД и YAML-кэша.
+
+        Args:
+            params: Извлеченные параметры запроса
+
+        Returns:
+            Отформатированный ответ
+        """
+        try:
+            if params.query_type == "reaction_calculation":
+                return self._calculate_reaction(params)
+            if params.query_type == "equilibrium_composition":
+                return self._calculate_equilibrium(params)
+            return self._format_compound_data(params)
+        except Exception as e:
+            self.logger.error(f"Ошибка расчета: {e}")
+            return f"❌ Ошибка: {str(e)}"
+
+    def calculate_batch(
+        self,
+        jobs: Sequence[ExtractedReactionParameters],
+        frames: Optional[Dict[str, tuple]] = None,
+        records_cache: Optional[Dict[tuple, list]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Детерминированный расчет группы заданий с общими кэшами веществ.
+
+        Данные вещества загружаются (frames) и отбираются для диапазона
+        (records_cache) один раз на группу; ответы совпадают с calculate.
+        Загрузка вещества зависит от его имен (стадия 1 поиска), поэтому
+        кэши общие только для заданий с одинаковыми именами вещества.
+
+        Args:
+            jobs: Параметры заданий
+            frames: Кэш загруженных данных {(formula, names): frame}
+                (создается, если не передан)
+            records_cache: Кэш отобранных записей {(formula, names): {ключ: records}}
+                (создается, если не передан)
+
+        Returns:
+            [(ответ, время расчета в секундах)] в порядке jobs
+        """
+        frames = {} if frames is None else frames
+        records_cache = {} if records_cache is None else records_cache
+
+        outputs = []
+        for params in jobs:
+            start = time.perf_counter()
+            job_frames, job_records = self._job_caches(params, frames, records_cache)
+            try:
+                if params.query_type == "reaction_calculation":
+                    response = self._calculate_reaction(
+                        params, frames=job_frames, records_cache=job_records
+                    )
+                elif params.query_type == "equilibrium_composition":
+                    response = self._calculate_equilibrium(params)
+                else:
+                    response = self._format_compound_data(
+                        params, frames=job_frames, records_cache=job_records
                     )
+            except Exception as e:
+                self.logger.error(f"Ошибка расчета: {e}")
+                response = f"❌ Ошибка: {str(e)}"
+            self._share_job_caches(params, job_frames, job_records, frames, records_cache)
+            outputs.append((response, time.perf_counter() - start))
+        return outputs
+
+    @staticmethod
+    def _compound_key(
+        params: ExtractedReactionParameters, formula: str
+    ) -> Tuple[str, Tuple[str, ...]]:
+        """Ключ общих кэшей пакета: формула и имена вещества из параметров."""
+        names = params.compound_names.get(formula) if params.compound_names else None
+        return formula, tuple(names or ())
+
+    def _job_caches(
+        self,
+        params: ExtractedReactionParameters,
+        frames: Dict[tuple, tuple],
+        records_cache: Dict[tuple, Dict[tuple, list]],
+    ) -> Tuple[Dict[str, tuple], Dict[tuple, list]]:
+        """Кэши задания (по формуле) из общих кэшей пакета для его имен веществ."""
+        job_frames: Dict[str, tuple] = {}
+        job_records: Dict[tuple, list] = {}
+        for formula in params.all_compounds:
+            key = self._compound_key(params, formula)
+            if key in frames:
+                job_frames[formula] = frames[key]
+            job_records.update(records_cache.get(key, {}))
+        return job_frames, job_records
+
+    def _share_job_caches(
+        self,
+        params: ExtractedReactionParameters,
+        job_frames: Dict[str, tuple],
+        job_records: Dict[tuple, list],
+        frames: Dict[tuple, tuple],
+        records_cache: Dict[tuple, Dict[tuple, list]],
+    ) -> None:
+        """Загруженное заданием — в общие кэши пакета под его именами веществ."""
+        for formula in params.all_compounds:
+            key = self._compound_key(params, formula)
+            if formula in job_frames:
+                frames[key] = job_frames[formula]
+            shared = records_cache.setdefault(key, {})
+            shared.update(
+                (records_key, records)
+                for records_key, records in job_records.items()
+                if records_key[0] == formula
+            )
 
-                    # 5. НОВОЕ: Форматирование через UnifiedReactionFormatter
-                    if self.unified_formatter:
-                        formatted_result = (
-                            self.unified_formatter.format_reaction_result(
-                                params, df_result, compounds_metadata
-                            )
-                        )
-                    else:
-                        # Fallback на временный форматтер если новые не инициализированы
-                        formatted_result = self._format_temporary_result(
-                            df_result, params
-                        )
-
-                    # 6. Логирование результата
-                    if self.session_logger:
-                        self.session_logger.log_info(
-                            f"Расчет завершен: {len(df_result)} температурных точек"
-                        )
-
-                    return formatted_result
+    def recalculate(
+        self,
+        params: ExtractedReactionParameters,
+        frames: Optional[Dict[str, tuple]] = None,
+        records_cache: Optional[Dict[tuple, list]] = None,
+    ) -> str:
+        """
+        Пересчет по сохраненным параметрам с новым температурным окном (без LLM).
 
-                except Exception as e:
-                    self.logger.error(f"Ошибка расчета реакции: {e}")
-                    if self.session_logger:
-                        self.session_logger.log_llm_error(str(e))
-                    return f"❌ Ошибка расчета реакции: {str(e)}"
+        Используется inline-кнопками диапазона и шага: параметры берутся из
+        предыдущего запроса, меняются только temperature_range_k и
+        temperature_step_k. Загруженные данные веществ не зависят от окна,
+        поэтому берутся из frames. Если новое окно лежит внутри окна, для
+        которого записи уже отобраны, записи берутся из records_cache
+        (только покрывающие новое окно); иначе отбор выполняется заново.
+        Для реакций используется окно из параметров, а не фиксированный
+        диапазон 298-2500K.
 
-            else:  # compound_data
-                return await self._process_compound_data(params)
+        Args:
+            params: Параметры с новым температурным окном
+            frames: Кэш загруженных данных {formula: (df, is_yaml_cache, search_stage)},
+                дополняется загруженными веществами
+            records_cache: Кэш отобранных записей
+                {(formula, T_start, T_end, is_elemental): records},
+                дополняется записями нового окна
 
+        Returns:
+            Отформатированный ответ
+        """
+        try:
+            if params.query_type == "equilibrium_composition":
+                return self._calculate_equilibrium(params)
+
+            job_records = self._narrow_records(records_cache or {}, params.temperature_range_k)
+            if params.query_type == "reaction_calculation":
+                tmin, tmax = params.temperature_range_k
+                result = self._calculate_reaction(
+                    params,
+                    [tmin, tmax, params.temperature_step_k],
+                    frames=frames,
+                    records_cache=job_records,
+                )
+            else:
+                result = self._format_compound_data(
+                    params, frames=frames, records_cache=job_records
+                )
+            if records_cache is not None:
+                records_cache.update(job_records)
+            return result
         except Exception as e:
-            self.logger.error(f"Ошибка обработки запроса: {e}")
+            self.logger.error(f"Ошибка пересчета: {e}")
+            return f"❌ Ошибка: {str(e)}"
+
+    @staticmethod
+    def _narrow_records(
+        records_cache: Dict[tuple, list], t_range: Tuple[float, float]
+    ) -> Dict[tuple, list]:
+        """
+        Записи для окна t_range из записей окон, которые его содержат.
+
+        Отобранные записи покрывают свое окно без пропусков, поэтому для
+        вложенного окна достаточно оставить пересекающиеся с ним.
+
+        Returns:
+            {(formula, T_start, T_end, is_elemental): records} для t_range
+        """
+        tmin, tmax = t_range
+        narrowed: Dict[tuple, list] = {}
+        for (formula, t_start, t_end, is_elemental), records in records_cache.items():
+            key = (formula, tmin, tmax, is_elemental)
+            if key in narrowed or not (t_start <= tmin and tmax <= t_end):
+                continue
+            narrowed[key] = [
+                record for record in records
+                if record["Tmin"] < tmax and record["Tmax"] > tmin
+            ]
+        return narrowed
+
+    def displayed_params(
+        self, params: ExtractedReactionParameters
+    ) -> ExtractedReactionParameters:
+        """
+        Параметры с окном, на котором показан ответ на запрос.
+
+        Реакции считаются на фиксированном REACTION_TEMPERATURE_RANGE, а не
+        на окне из параметров LLM; кнопки диапазона и шага должны
+        начинаться с показанной таблицы.
+        """
+        if params.query_type != "reaction_calculation":
+            return params
+        tmin, tmax, step = self.REACTION_TEMPERATURE_RANGE
+        return params.model_copy(
+            update={"temperature_range_k": (float(tmin), float(tmax)), "temperature_step_k": step}
+        )
+
+    def calculate_brief(self, params: ExtractedReactionParameters) -> Optional[str]:
+        """
+        Краткий результат реакции (UnifiedReactionFormatter.format_brief_result)
+        по сохраненному результату, без LLM и без расчета.
+
+        Используется при перегрузке вместо полного ответа: расчет занял бы
+        ресурсы вне контроля допуска, поэтому краткий ответ строится только
+        для реакции, уже посчитанной на фиксированном диапазоне.
+
+        Returns:
+            Краткий ответ или None (не реакция, результата нет или ошибка форматирования)
+        """
+        if params.query_type != "reaction_calculation":
+            return None
+        try:
+            result = self.get_reaction_result(params)
+            return None if result is None else result.render("brief")
+        except Exception as e:
+            self.logger.warning(f"Краткий расчет не выполнен: {e}")
+            return None
+
+    def _calculate_reaction(
+        self,
+        params: ExtractedReactionParameters,
+        temperature_range: Optional[List[float]] = None,
+        frames: Optional[Dict[str, tuple]] = None,
+        records_cache: Optional[Dict[tuple, list]] = None,
+    ) -> str:
+        """Расчет реакции через ReactionEngine и UnifiedReactionFormatter."""
+        if not self.reaction_engine:
+            return "❌ ReactionEngine не инициализирован. Проверьте конфигурацию БД и StaticDataManager."
+
+        if temperature_range is None:
+            temperature_range = list(self.REACTION_TEMPERATURE_RANGE)  # Фиксированный диапазон
+
+        try:
+            # Используем новый метод с метаданными для форматтера
+            df_result, compounds_metadata = (
+                self.reaction_engine.calculate_reaction_with_metadata(
+                    params, temperature_range, frames=frames, records_cache=records_cache
+                )
+            )
+
+            crossovers = self._find_crossovers(params, temperature_range, compounds_metadata)
+
+            # Форматирование через UnifiedReactionFormatter; результат
+            # сохраняется для других представлений (кратко, детально, CSV)
+            if self.unified_formatter:
+                result = ReactionResult(
+                    params=params,
+                    df_result=df_result,
+                    compounds_metadata=compounds_metadata,
+                    crossovers=crossovers,
+                    formatter=self.unified_formatter,
+                    temperature_range=list(temperature_range),
+                )
+                formatted_result = result.render("full")
+                self._remember_result(result)
+            else:
+                # Fallback на временный форматтер если новые не инициализированы
+                formatted_result = self._format_temporary_result(df_result, params)
+
+            # Логирование результата
+            if self.session_logger:
+                self.session_logger.log_info(
+                    f"Расчет завершен: {len(df_result)} температурных точек"
+                )
+
+            return formatted_result
+
+        except Exception as e:
+            self.logger.error(f"Ошибка расчета реакции: {e}")
             if self.session_logger:
                 self.session_logger.log_llm_error(str(e))
-            return f"❌ Ошибка: {str(e)}"
+            return f"❌ Ошибка расчета реакции: {str(e)}"
+
+    def _find_crossovers(
+        self,
+        params: ExtractedReactionParameters,
+        temperature_range: List[float],
+        compounds_metadata: Dict[str, Any],
+    ) -> Optional[List[Crossover]]:
+        """
+        Точные температуры ΔG = 0 (и K = params.target_k) по уже отобранным записям.
+
+        Ошибка поиска не прерывает расчет: интерпретация тогда строится
+        по таблице (None).
+        """
+        try:
+            return self.reaction_engine.find_crossover_temperatures(
+                params, temperature_range, compounds_metadata, target_k=params.target_k
+            )
+        except Exception as e:
+            self.logger.warning(f"Не удалось найти температуры равновесия: {e}")
+            return None
+
+    def _calculate_equilibrium(self, params: ExtractedReactionParameters) -> str:
+        """
+        Равновесный состав смеси через GibbsEquilibriumSolver и EquilibriumFormatter.
+
+        Сетка температур — temperature_range_k с шагом temperature_step_k;
+        исходная смесь — initial_amounts, иначе по 1 моль каждого реагента.
+        """
+        if not self.reaction_engine:
+            return "❌ ReactionEngine не инициализирован. Проверьте конфигурацию БД и StaticDataManager."
+
+        tmin, tmax = params.temperature_range_k
+        step = params.temperature_step_k
+        temperatures = np.arange(tmin, tmax + step / 2, step)
+        initial_amounts = params.initial_amounts or {
+            formula: 1.0 for formula in params.reactants
+        }
+
+        try:
+            result = self.equilibrium_solver.solve(
+                params.all_compounds,
+                initial_amounts,
+                temperatures,
+                pressure_bar=params.pressure_bar,
+                compound_names=params.compound_names,
+                compound_types=params.compound_types,
+            )
+
+            if self.session_logger:
+                self.session_logger.log_info(
+                    f"Равновесие рассчитано: {len(result.temperatures)} температурных точек, "
+                    f"сошлось {int(result.converged.sum())}"
+                )
+
+            return self.equilibrium_formatter.format_equilibrium_result(params, result)
+
+        except Exception as e:
+            self.logger.error(f"Ошибка расчета равновесия: {e}")
+            if self.session_logger:
+                self.session_logger.log_llm_error(str(e))
+            return f"❌ Ошибка расчета равновесия: {str(e)}"
 
     def _is_elemental(self, formula: str) -> bool:
         """
@@ -287,6 +1140,25 @@ class ThermoOrchestrator:
         Args:
             params: Извлеченные параметры с query_type="compound_data"
 
+        Returns:
+            Отформатированная строка с таблицей свойств вещества
+        """
+        return self._format_compound_data(params)
+
+    def _format_compound_data(
+        self,
+        params: ExtractedReactionParameters,
+        frames: Optional[Dict[str, tuple]] = None,
+        records_cache: Optional[Dict[tuple, list]] = None,
+    ) -> str:
+        """
+        Синхронный расчет и форматирование свойств одного вещества.
+
+        Args:
+            params: Извлеченные параметры с query_type="compound_data"
+            frames: Кэш загруженных данных {formula: (df, is_yaml_cache, search_stage)}
+            records_cache: Кэш отобранных записей (см. calculate_batch)
+
         Returns:
             Отформатированная строка с таблицей свойств вещества
         """
@@ -306,11 +1178,17 @@ class ThermoOrchestrator:
                 self.session_logger.log_info(f"Запрос свойств вещества: {formula}")
 
             # 2. Загрузка данных через существующий CompoundDataLoader
-            df, is_yaml_cache, search_stage = (
-                self.compound_loader.get_raw_compound_data_with_metadata(
-                    formula, compound_names
+            # (или из кэша сессии при пересчете)
+            if frames is not None and formula in frames:
+                df, is_yaml_cache, search_stage = frames[formula]
+            else:
+                df, is_yaml_cache, search_stage = (
+                    self.compound_loader.get_raw_compound_data_with_metadata(
+                        formula, compound_names
+                    )
                 )
-            )
+                if frames is not None:
+                    frames[formula] = (df, is_yaml_cache, search_stage)
 
             if df.empty:
                 self.logger.warning(f"No data found for compound: {formula}")
@@ -352,14 +1230,20 @@ class ThermoOrchestrator:
             is_elemental = self._is_elemental(formula)
 
             # Выбираем записи, покрывающие запрошенный температурный диапазон
-            selected_records = self.range_builder.get_compound_records_for_range(
-                df=df,
-                t_range=params.temperature_range_k,
-                melting=melting_point,
-                boiling=boiling_point,
-                tolerance=1.0,
-                is_elemental=is_elemental,
-            )
+            records_key = (formula, *params.temperature_range_k, is_elemental)
+            if records_cache is not None and records_key in records_cache:
+                selected_records = records_cache[records_key]
+            else:
+                selected_records = self.range_builder.get_compound_records_for_range(
+                    df=df,
+                    t_range=params.temperature_range_k,
+                    melting=melting_point,
+                    boiling=boiling_point,
+                    tolerance=1.0,
+                    is_elemental=is_elemental,
+                )
+                if records_cache is not None:
+                    records_cache[records_key] = selected_records
 
             # Логирование выбранных записей
             self.logger.info(
@@ -529,5 +1413,7 @@ class ThermoOrchestrator:
                 "calculations": bool(self.reaction_engine),  # Включено на этапе 2
                 "database_search": bool(self.db_connector),  # Включено на этапе 2
                 "yaml_cache": bool(self.static_manager),  # Включено на этапе 2
+                "compound_prefetch": bool(self.prefetcher),
             },
+            "prefetch": self.prefetcher.get_stats() if self.prefetcher else None,
         }
@@ -0,0 +1,487 @@
+"""
+Спекулятивная предзагрузка веществ на время извлечения параметров LLM.
+
+Вызов LLM занимает секунды, а формулы веществ обычно видны прямо в тексте
+запроса. CompoundPrefetcher находит их регулярным выражением
+(utils.chem_utils.find_formulas) и сразу, параллельно с LLM, загружает данные
+и отбирает записи для стандартного диапазона в пуле потоков. После
+извлечения параметров результаты сверяются с all_compounds: совпавшие
+вещества передаются в расчет через frames/records_cache оркестратора,
+остальные остаются в кэше с коротким TTL для следующих запросов.
+
+При потоковом извлечении (ThermodynamicAgent.extract_parameters с
+on_partial) задача дополняется веществами из частичного ответа модели
+(extend), а после compound_names сразу выполняется поиск по именам
+(resolve_early). Если итоговые параметры расходятся с частичными, лишние
+загрузки отменяются (cancel), а поиск по именам повторяется с итоговыми
+именами. Отчет содержит интервалы времени (spans), по которым видно
+перекрытие загрузок с работой LLM.
+
+Основные компоненты:
+- PrefetchEntry: загруженные данные одного вещества
+- PrefetchTask: предзагрузка для одного запроса
+- PrefetchReport: попадания, промахи, отмены, интервалы и сэкономленное
+  время запроса
+- CompoundPrefetcher: пул потоков и TTL-кэш
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .utils.chem_utils import find_formulas
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PrefetchEntry:
+    """Данные вещества, загруженные без параметров LLM."""
+
+    formula: str
+    # (df, is_yaml_cache, search_stage) — как get_raw_compound_data_with_metadata
+    frame: tuple
+    # Отобранные записи {(formula, T_start, T_end, is_elemental): records}
+    records: Dict[tuple, list]
+    load_s: float
+    expires_at: float
+    # time.perf_counter() начала и конца загрузки
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+
+@dataclass
+class PrefetchReport:
+    """Итог предзагрузки для одного запроса."""
+
+    detected: List[str]
+    needed: List[str]
+    hits: List[str]
+    # Сумма времени загрузки попавших веществ
+    load_s: float = 0.0
+    # Ожидание незавершенной предзагрузки после ответа LLM
+    wait_s: float = 0.0
+    # Вещества из частичного ответа модели (потоковое извлечение)
+    streamed: List[str] = field(default_factory=list)
+    # Загрузки, отмененные из-за расхождения с итоговыми параметрами
+    cancelled: List[str] = field(default_factory=list)
+    # Вещества, у которых итоговые имена не совпали с частичными
+    contradicted: List[str] = field(default_factory=list)
+    # (название, начало, конец) в секундах от начала запроса
+    spans: List[Tuple[str, float, float]] = field(default_factory=list)
+    extraction_s: Optional[float] = None
+
+    @property
+    def misses(self) -> List[str]:
+        return [formula for formula in self.needed if formula not in self.hits]
+
+    @property
+    def unused(self) -> List[str]:
+        return [formula for formula in self.detected if formula not in self.needed]
+
+    @property
+    def hit_rate(self) -> float:
+        return len(self.hits) / len(self.needed) if self.needed else 0.0
+
+    @property
+    def saved_s(self) -> float:
+        """Время загрузки, снятое с критического пути запроса."""
+        return max(0.0, self.load_s - self.wait_s)
+
+    @property
+    def overlap_s(self) -> float:
+        """Время загрузок, выполненных во время работы LLM."""
+        if self.extraction_s is None:
+            return 0.0
+        return sum(
+            max(0.0, min(end, self.extraction_s) - max(start, 0.0))
+            for name, start, end in self.spans
+            if name.startswith("load ")
+        )
+
+    def summary(self) -> str:
+        text = (
+            f"Предзагрузка: найдено {len(self.detected)}, "
+            f"попаданий {len(self.hits)}/{len(self.needed)} ({self.hit_rate:.0%}), "
+            f"не использовано {len(self.unused)}, ожидание {self.wait_s:.3f} с, "
+            f"сэкономлено {self.saved_s:.3f} с"
+        )
+        if self.streamed:
+            text += (
+                f"; из потока {len(self.streamed)}, отменено {len(self.cancelled)}, "
+                f"расхождений имен {len(self.contradicted)}, "
+                f"перекрытие с LLM {self.overlap_s:.3f} с"
+            )
+        return text
+
+    def format_spans(self) -> str:
+        """Интервалы запроса построчно, по времени начала."""
+        return "\n".join(
+            f"  {name:<24} {start:8.3f} → {end:8.3f} с"
+            for name, start, end in sorted(self.spans, key=lambda span: span[1])
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "detected": self.detected,
+            "hits": self.hits,
+            "misses": self.misses,
+            "unused": self.unused,
+            "hit_rate": round(self.hit_rate, 4),
+            "load_s": round(self.load_s, 4),
+            "wait_s": round(self.wait_s, 4),
+            "saved_s": round(self.saved_s, 4),
+            "streamed": self.streamed,
+            "cancelled": self.cancelled,
+            "contradicted": self.contradicted,
+            "overlap_s": round(self.overlap_s, 4),
+            "spans": [(name, round(start, 4), round(end, 4)) for name, start, end in self.spans],
+        }
+
+
+@dataclass
+class PrefetchTask:
+    """Предзагрузка, запущенная для одного запроса."""
+
+    formulas: List[str]
+    futures: Dict[str, Future] = field(default_factory=dict)
+    started_at: float = field(default_factory=time.perf_counter)
+    # Вещества, добавленные из частичного ответа модели
+    streamed: List[str] = field(default_factory=list)
+    # Имена из частичного ответа и поиск по ним (resolve_early)
+    names: Dict[str, List[str]] = field(default_factory=dict)
+    resolutions: Dict[str, Future] = field(default_factory=dict)
+    # Отметки времени (название, секунды от started_at)
+    events: List[Tuple[str, float]] = field(default_factory=list)
+    # Конец извлечения параметров от started_at
+    extraction_s: Optional[float] = None
+
+    def mark(self, name: str) -> float:
+        """Отметка времени от начала запроса."""
+        elapsed = time.perf_counter() - self.started_at
+        self.events.append((name, elapsed))
+        return elapsed
+
+
+class CompoundPrefetcher:
+    """
+    Пул потоков для спекулятивной загрузки веществ и TTL-кэш результатов.
+
+    Загрузка вещества выполняется не более одного раза одновременно:
+    запрос, заставший загрузку другого запроса, ждет тот же Future.
+    Ошибки загрузки не передаются в расчет — вещество считается промахом
+    и загружается обычным путем.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[str], Tuple[tuple, Dict[tuple, list]]],
+        resolve: Optional[Callable[[str, List[str], tuple], Optional[tuple]]] = None,
+        ttl_s: float = 120.0,
+        max_workers: int = 2,
+        max_compounds: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            load: formula -> (frame, records) — загрузка и отбор записей
+            resolve: (formula, names, frame) -> frame | None — поиск по
+                именам поверх загрузки (CompoundDataLoader.resolve_prefetched)
+            ttl_s: Время жизни результата в кэше
+            max_workers: Потоков загрузки
+            max_compounds: Максимум формул из одного запроса
+            clock: Источник времени для TTL
+        """
+        self.load = load
+        self.resolve = resolve
+        self.ttl_s = ttl_s
+        self.max_compounds = max_compounds
+        self.clock = clock
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="prefetch"
+        )
+        self._lock = threading.Lock()
+        self._cache: Dict[str, PrefetchEntry] = {}
+        self._pending: Dict[str, Future] = {}
+        self.stats = {
+            "requests": 0,
+            "loads": 0,
+            "errors": 0,
+            "hits": 0,
+            "misses": 0,
+            "unused": 0,
+            "saved_s": 0.0,
+            "streamed": 0,
+            "cancelled": 0,
+            "contradicted": 0,
+        }
+
+    def start(self, text: str) -> PrefetchTask:
+        """
+        Запуск загрузки формул, найденных в тексте запроса.
+
+        Не блокирует: загрузка идет в пуле потоков, пока выполняется LLM.
+        """
+        self._evict()
+        task = PrefetchTask([])
+        with self._lock:
+            self.stats["requests"] += 1
+        self._submit(task, find_formulas(text, limit=self.max_compounds))
+        return task
+
+    def extend(self, task: PrefetchTask, formulas: Sequence[str]) -> List[str]:
+        """
+        Дополнение задачи веществами из частичного ответа модели.
+
+        Returns:
+            Вещества, которых еще не было в задаче
+        """
+        added = self._submit(task, formulas)
+        task.streamed.extend(added)
+        with self._lock:
+            self.stats["streamed"] += len(added)
+        return added
+
+    def resolve_early(self, task: PrefetchTask, formula: str, names: List[str]) -> None:
+        """
+        Поиск по именам из частичного ответа сразу после загрузки вещества.
+
+        Результат используется в resolved_frame, только если итоговые имена
+        совпадут с частичными.
+        """
+        if self.resolve is None or not names or formula in task.resolutions:
+            return
+        task.names[formula] = list(names)
+        task.resolutions[formula] = self._executor.submit(
+            self._resolve, formula, list(names), task.futures.get(formula)
+        )
+
+    def cancel(self, task: PrefetchTask, needed: Sequence[str]) -> List[str]:
+        """
+        Отмена загрузок из частичного ответа, которых нет в итоговых параметрах.
+
+        Отменяются только еще не начатые загрузки; завершенные остаются в
+        кэше. Вещества, найденные в тексте запроса, не отменяются — они
+        загружаются для следующих запросов.
+
+        Returns:
+            Отмененные вещества
+        """
+        needed = set(needed)
+        cancelled = []
+        for formula in task.streamed:
+            if formula in needed:
+                continue
+            resolution = task.resolutions.pop(formula, None)
+            if resolution is not None:
+                resolution.cancel()
+            future = task.futures.get(formula)
+            if future is not None and future.cancel():
+                with self._lock:
+                    if self._pending.get(formula) is future:
+                        del self._pending[formula]
+                cancelled.append(formula)
+        with self._lock:
+            self.stats["cancelled"] += len(cancelled)
+        return cancelled
+
+    async def collect(
+        self, task: PrefetchTask, needed: Sequence[str]
+    ) -> Tuple[Dict[str, PrefetchEntry], float]:
+        """
+        Результаты предзагрузки для веществ, нужных расчету.
+
+        Незавершенная загрузка нужного вещества дожидается (без блокировки
+        цикла событий); вещества из кэша предыдущих запросов берутся сразу.
+
+        Returns:
+            ({formula: PrefetchEntry}, время ожидания в секундах)
+        """
+        start = time.perf_counter()
+        entries = {}
+        for formula in dict.fromkeys(needed):
+            future = task.futures.get(formula)
+            if future is not None:
+                entry = await self._wait(future)
+            else:
+                entry = self.get(formula)
+            if entry is not None:
+                entries[formula] = entry
+        return entries, time.perf_counter() - start
+
+    async def resolved_frame(
+        self, task: PrefetchTask, formula: str, names: Optional[List[str]]
+    ) -> Tuple[Optional[tuple], bool]:
+        """
+        Результат resolve_early для итоговых имен вещества.
+
+        Returns:
+            (frame или None, расходятся ли итоговые имена с частичными);
+            frame None — поиск по именам нужно выполнить заново
+        """
+        resolution = task.resolutions.get(formula)
+        if resolution is None:
+            return None, False
+        if task.names.get(formula) != list(names or []):
+            resolution.cancel()
+            return None, True
+        try:
+            result = await self._wait(resolution)
+        except Exception as e:
+            logger.debug(f"Поиск {formula} по именам не удался: {e}")
+            return None, False
+        return (result[1] if result is not None else None), False
+
+    def report(
+        self,
+        task: PrefetchTask,
+        needed: Sequence[str],
+        used: Dict[str, PrefetchEntry],
+        wait_s: float,
+        cancelled: Sequence[str] = (),
+        contradicted: Sequence[str] = (),
+    ) -> PrefetchReport:
+        """
+        Отчет по запросу; накапливает статистику get_stats.
+
+        Интервалы строятся от начала задачи: извлечение параметров (если
+        задан task.extraction_s), загрузки веществ и ожидание после LLM.
+        """
+        extraction_s = task.extraction_s
+        spans = [(f"event {name}", t, t) for name, t in task.events]
+        if extraction_s is not None:
+            spans.append(("extraction", 0.0, extraction_s))
+            if wait_s > 0:
+                spans.append(("wait prefetch", extraction_s, extraction_s + wait_s))
+        for formula, future in task.futures.items():
+            if future.done() and not future.cancelled() and future.exception() is None:
+                entry = future.result()
+                if entry is not None:
+                    spans.append((
+                        f"load {formula}",
+                        entry.started_at - task.started_at,
+                        entry.finished_at - task.started_at,
+                    ))
+
+        report = PrefetchReport(
+            detected=list(task.formulas),
+            needed=list(dict.fromkeys(needed)),
+            hits=list(used),
+            load_s=sum(entry.load_s for entry in used.values()),
+            wait_s=wait_s,
+            streamed=list(task.streamed),
+            cancelled=list(cancelled),
+            contradicted=list(contradicted),
+            spans=spans,
+            extraction_s=extraction_s,
+        )
+        with self._lock:
+            self.stats["hits"] += len(report.hits)
+            self.stats["misses"] += len(report.misses)
+            self.stats["unused"] += len(report.unused)
+            self.stats["saved_s"] += report.saved_s
+            self.stats["contradicted"] += len(report.contradicted)
+        return report
+
+    def get(self, formula: str) -> Optional[PrefetchEntry]:
+        """Действующая запись кэша."""
+        with self._lock:
+            entry = self._cache.get(formula)
+            if entry is not None and entry.expires_at <= self.clock():
+                del self._cache[formula]
+                return None
+            return entry
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["cached"] = len(self._cache)
+        needed = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / needed if needed else 0.0
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, task: PrefetchTask, formulas: Sequence[str]) -> List[str]:
+        """Запуск загрузки новых для задачи веществ (без повторов)."""
+        added = []
+        with self._lock:
+            for formula in formulas:
+                if formula in task.formulas:
+                    continue
+                task.formulas.append(formula)
+                added.append(formula)
+                if formula in self._cache:
+                    continue
+                future = self._pending.get(formula)
+                if future is None:
+                    future = self._executor.submit(self._load, formula)
+                    self._pending[formula] = future
+                task.futures[formula] = future
+        return added
+
+    @staticmethod
+    async def _wait(future: Future):
+        """Ожидание Future пула; отмененная загрузка — промах (None)."""
+        if future.cancelled():
+            return None
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if future.cancelled():
+                return None
+            raise
+
+    def _resolve(
+        self, formula: str, names: List[str], future: Optional[Future]
+    ) -> Optional[Tuple[PrefetchEntry, Optional[tuple]]]:
+        # Загрузка поставлена в очередь раньше, поэтому ожидание в потоке
+        # пула не блокирует ее выполнение
+        entry = future.result() if future is not None else self.get(formula)
+        if entry is None:
+            return None
+        return entry, self.resolve(formula, names, entry.frame)
+
+    def _load(self, formula: str) -> Optional[PrefetchEntry]:
+        start = time.perf_counter()
+        try:
+            frame, records = self.load(formula)
+        except Exception as e:
+            logger.debug(f"Предзагрузка {formula} не удалась: {e}")
+            with self._lock:
+                self.stats["errors"] += 1
+                self._pending.pop(formula, None)
+            return None
+
+        entry = PrefetchEntry(
+            formula=formula,
+            frame=frame,
+            records=records,
+            load_s=time.perf_counter() - start,
+            expires_at=self.clock() + self.ttl_s,
+            started_at=start,
+            finished_at=time.perf_counter(),
+        )
+        with self._lock:
+            self.stats["loads"] += 1
+            self._cache[formula] = entry
+            self._pending.pop(formula, None)
+        return entry
+
+    def _evict(self) -> None:
+        now = self.clock()
+        with self._lock:
+            for formula in [f for f, e in self._cache.items() if e.expires_at <= now]:
+                del self._cache[formula]
@@ -20,7 +20,11 @@
   Поддерживает два типа запросов:
   - compound_data: запросы данных по отдельным веществам
   - reaction_calculation: расчёты термодинамики реакций
+  - equilibrium_composition: равновесный состав смеси нескольких веществ
   Правила классификации, валидация диапазонов, примеры ответов
+- EXTRACTION_SYSTEM_PROMPT / EXTRACTION_USER_TEMPLATE: тот же промпт для
+  компактного режима — инструкции стабильным системным префиксом
+  (кэшируется провайдером), в сообщении пользователя только запрос
 
 Промпты валидации и синтеза:
 - VALIDATE_OR_COMPLETE_PROMPT: Валидация и дополнение извлеченных параметров
@@ -124,9 +128,19 @@ User query: {user_query}
   - "2 W + 4 Cl2 + O2 → 2 WOCl4 at 600-900K"
   - "Calculate thermodynamics of tungsten chlorination"
 
+## equilibrium_composition (equilibrium mixture composition):
+✓ Asks for the equilibrium composition / products of a mixture, not of one given equation
+✓ Keywords: "equilibrium composition", "what forms", "равновесный состав", "состав продуктов"
+✓ all_compounds: starting materials AND all plausible products (gases and condensed phases)
+✓ initial_amounts: starting moles, e.g. {{"C": 2, "O2": 1}} (if not given, 1 mol of each reactant)
+✓ pressure_bar: pressure in bar (default 1.0); balanced_equation may be ""
+✓ Examples:
+  - "Equilibrium composition of 2 mol C + 1 mol O2 at 500-2500K"
+  - "Равновесный состав смеси CH4 и H2O при 800-1200K и 10 бар"
+
 # Task:
 Extract the following parameters:
-1. **Query type** (query_type) — "compound_data" or "reaction_calculation"
+1. **Query type** (query_type) — "compound_data", "reaction_calculation" or "equilibrium_composition"
 2. **Temperature step** (temperature_step_k) — from phrases "step X", "every X", "each X K" (25-250K, default 100)
 3. **Balanced reaction equation** — balance stoichiometric coefficients (for reaction_calculation)
 4. **List of all compounds** (up to 10 compounds, including reactants and products)
@@ -134,6 +148,7 @@ Extract the following parameters:
 6. **Products** (right side of equation) — for reaction_calculation
 7. **Temperature range** in Kelvin (tmin, tmax)
 8. **Compound names** — IUPAC and trivial names for each compound
+9. **Target equilibrium constant** (target_k) — from phrases "at what temperature K = X", "when does K reach X", "при какой температуре K = X" (reaction_calculation only, K > 0; otherwise null). For "at what temperature does the reaction become spontaneous" leave null: ΔG = 0 temperatures are always reported
 
 # Important rules:
 - Maximum 10 compounds in reaction
@@ -316,6 +331,18 @@ Response:
 # Your response (JSON):
 """
 
+# Компактный режим: инструкции без места для запроса (одинаковый префикс у
+# всех запросов попадает в кэш промптов провайдера), запрос — отдельным
+# коротким сообщением. format() снимает экранирование фигурных скобок.
+EXTRACTION_SYSTEM_PROMPT = (
+    THERMODYNAMIC_EXTRACTION_PROMPT.replace("# Input:\nUser query: {user_query}\n\n", "")
+    .replace("\n# Your response (JSON):\n", "")
+    .format()
+    .strip()
+)
+
+EXTRACTION_USER_TEMPLATE = "User query: {user_query}"
+
 
 VALIDATE_OR_COMPLETE_PROMPT = """You are a validator for thermodynamic database query parameters.
 
@@ -957,6 +984,7 @@ class PromptManager:
         self._prompts = {
             # Основные промпты агента
             "thermodynamic_extraction": THERMODYNAMIC_EXTRACTION_PROMPT,
+            "extraction_system": EXTRACTION_SYSTEM_PROMPT,
             "validate": VALIDATE_OR_COMPLETE_PROMPT,
             "synthesize": SYNTHESIZE_ANSWER_PROMPT,
             # Промпты инструментов
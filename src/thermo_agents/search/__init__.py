@@ -3,14 +3,41 @@ Search module for thermodynamic compounds.
 
 This module provides deterministic search functionality for chemical compounds
 in the thermodynamic database, replacing LLM-based agents with structured logic.
+
+Exports are resolved lazily (PEP 562), so importing the package (or a light
+submodule such as name_index) does not load pandas and the searcher stack.
 """
 
-from .compound_searcher import CompoundSearcher
-from .database_connector import DatabaseConnector
-from .sql_builder import SQLBuilder
+import importlib
+from typing import TYPE_CHECKING
+
+_LAZY_EXPORTS = {
+    "CompoundSearcher": ".compound_searcher",
+    "DatabaseConnector": ".database_connector",
+    "SQLBuilder": ".sql_builder",
+}
 
 __all__ = [
     "CompoundSearcher",
     "DatabaseConnector",
     "SQLBuilder",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .compound_searcher import CompoundSearcher
+    from .database_connector import DatabaseConnector
+    from .sql_builder import SQLBuilder
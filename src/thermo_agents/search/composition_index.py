@@ -0,0 +1,315 @@
+"""
+Индекс элементного состава соединений.
+
+Для каждой записи таблицы compounds заранее вычисляется канонический
+элементный состав (parse_composition): хэш сигнатуры состава и разреженный
+вектор (элемент, количество) в CSR-формате. Поиск композитов (Li2O*TiO2 для
+Li2TiO3), гидратов и формул с фазой в скобках становится одним поиском по
+хэшу вместо разбора формул кандидатов при каждом запросе.
+
+Одинаковый состав еще не означает одно вещество (C2H5OH и CH3OCH3), поэтому
+для каждой записи хранится и хэш самой формулы без фазы: запись без
+разделителей композита находится только по своей формуле, изомеры не
+возвращаются.
+"""
+
+import hashlib
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..utils.chem_utils import (
+    composition_signature,
+    is_composite_formula,
+    parse_composition,
+    strip_phase_suffix,
+)
+from .compound_index import database_version
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_FIELDS = (
+    "rowids", "hashes", "formula_hashes", "hash_order", "indptr",
+    "element_ids", "counts", "elements", "source_version",
+)
+
+# formula_hashes для композитов и гидратов: подходят любой формуле того же состава
+ANY_FORMULA = 0
+
+
+def signature_hash(signature: str) -> int:
+    """64-битный хэш сигнатуры состава."""
+    digest = hashlib.blake2b(signature.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def _formula_hash(formula: str) -> int:
+    """Хэш формулы без фазы (ANY_FORMULA для композитов и гидратов)."""
+    if is_composite_formula(formula):
+        return ANY_FORMULA
+    return signature_hash(strip_phase_suffix(formula)) or 1
+
+
+class CompositionIndex:
+    """
+    Индекс записей по элементному составу.
+
+    Записи, формулу которых не удалось разобрать (ионы, нестандартная
+    запись), в индекс не попадают.
+    """
+
+    def __init__(self):
+        self.rowids = np.empty(0, dtype=np.int64)
+        self.hashes = np.empty(0, dtype=np.int64)
+        self.formula_hashes = np.empty(0, dtype=np.int64)
+        self.hash_order = np.empty(0, dtype=np.int64)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.element_ids = np.empty(0, dtype=np.int32)
+        self.counts = np.empty(0, dtype=np.float64)
+        self.elements: List[str] = []
+        self.source_version = ""
+        self._element_lookup: Dict[str, int] = {}
+        self._sorted_hashes = self.hashes
+        self._built = False
+        self.skipped_records = 0
+
+    @property
+    def is_built(self) -> bool:
+        """Построен ли индекс."""
+        return self._built
+
+    # Построение
+
+    def build_from_database(self, db_connector: Any) -> None:
+        """
+        Построить индекс по всей таблице compounds.
+
+        Args:
+            db_connector: DatabaseConnector с доступом к БД
+        """
+        rows = db_connector.execute_query("SELECT rowid, Formula FROM compounds")
+        self.build(
+            ((row["rowid"], row["Formula"]) for row in rows),
+            source_version=database_version(db_connector.db_path),
+        )
+
+    def build(
+        self, rows: Iterable[Tuple[int, str]], source_version: str = "records"
+    ) -> None:
+        """
+        Построить индекс по парам (rowid, формула).
+
+        Args:
+            rows: Итератор пар (rowid, Formula)
+            source_version: Версия источника данных (для проверки снимка)
+        """
+        start_time = time.time()
+
+        element_lookup: Dict[str, int] = {}
+        signature_cache: Dict[str, Optional[Tuple[int, int, List[int], List[float]]]] = {}
+        rowids, hashes, formula_hashes, indptr, element_ids, counts = [], [], [], [0], [], []
+        skipped = 0
+
+        for rowid, formula in rows:
+            formula = (formula or "").strip()
+            if formula not in signature_cache:
+                composition = parse_composition(formula)
+                if composition is None:
+                    signature_cache[formula] = None
+                else:
+                    items = sorted(composition.items())
+                    signature_cache[formula] = (
+                        signature_hash(composition_signature(composition)),
+                        _formula_hash(formula),
+                        [element_lookup.setdefault(el, len(element_lookup)) for el, _ in items],
+                        [count for _, count in items],
+                    )
+
+            entry = signature_cache[formula]
+            if entry is None:
+                skipped += 1
+                continue
+
+            row_hash, row_formula_hash, row_elements, row_counts = entry
+            rowids.append(int(rowid))
+            hashes.append(row_hash)
+            formula_hashes.append(row_formula_hash)
+            element_ids.extend(row_elements)
+            counts.extend(row_counts)
+            indptr.append(len(element_ids))
+
+        self.rowids = np.asarray(rowids, dtype=np.int64)
+        self.hashes = np.asarray(hashes, dtype=np.int64)
+        self.formula_hashes = np.asarray(formula_hashes, dtype=np.int64)
+        self.hash_order = np.argsort(self.hashes, kind="stable")
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.element_ids = np.asarray(element_ids, dtype=np.int32)
+        self.counts = np.asarray(counts, dtype=np.float64)
+        self.elements = list(element_lookup)
+        self.source_version = source_version
+        self.skipped_records = skipped
+        self._finalize()
+
+        logger.info(
+            f"Индекс состава построен за {time.time() - start_time:.3f}s: "
+            f"{len(rowids)} записей, {len(set(hashes))} составов, "
+            f"пропущено {skipped}"
+        )
+
+    def _finalize(self) -> None:
+        self._element_lookup = {el: i for i, el in enumerate(self.elements)}
+        self._sorted_hashes = self.hashes[self.hash_order]
+        self._built = True
+
+    # Снимок
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Сохранить снимок индекса в .npz файл."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                rowids=self.rowids,
+                hashes=self.hashes,
+                formula_hashes=self.formula_hashes,
+                hash_order=self.hash_order,
+                indptr=self.indptr,
+                element_ids=self.element_ids,
+                counts=self.counts,
+                elements=np.asarray(self.elements, dtype=str),
+                source_version=np.asarray(self.source_version),
+            )
+        tmp_path.replace(path)
+
+    def load(self, path: Union[str, Path]) -> None:
+        """Загрузить снимок индекса из .npz файла."""
+        with np.load(Path(path), allow_pickle=False) as data:
+            arrays = {name: data[name] for name in _SNAPSHOT_FIELDS}
+
+        self.rowids = arrays["rowids"]
+        self.hashes = arrays["hashes"]
+        self.formula_hashes = arrays["formula_hashes"]
+        self.hash_order = arrays["hash_order"]
+        self.indptr = arrays["indptr"]
+        self.element_ids = arrays["element_ids"]
+        self.counts = arrays["counts"]
+        self.elements = arrays["elements"].tolist()
+        self.source_version = str(arrays["source_version"])
+        self._finalize()
+
+    def load_or_build(
+        self, db_connector: Any, snapshot_path: Optional[Union[str, Path]] = None
+    ) -> None:
+        """
+        Загрузить снимок, если он соответствует текущей БД, иначе построить
+        индекс и сохранить снимок.
+        """
+        if snapshot_path and Path(snapshot_path).exists():
+            try:
+                self.load(snapshot_path)
+                if self.source_version == database_version(db_connector.db_path):
+                    logger.info(f"Индекс состава загружен из {snapshot_path}")
+                    return
+                logger.info("Снимок индекса состава устарел, перестроение")
+            except (OSError, KeyError, ValueError) as e:
+                logger.warning(f"Не удалось загрузить снимок индекса состава: {e}")
+
+        self.build_from_database(db_connector)
+        if snapshot_path:
+            try:
+                self.save(snapshot_path)
+            except OSError as e:
+                logger.warning(f"Не удалось сохранить снимок индекса состава: {e}")
+
+    # Запросы
+
+    def _row_composition(self, position: int) -> Dict[str, float]:
+        start, end = self.indptr[position], self.indptr[position + 1]
+        return {
+            self.elements[element_id]: float(count)
+            for element_id, count in zip(self.element_ids[start:end], self.counts[start:end])
+        }
+
+    def lookup(self, formula: str) -> List[int]:
+        """
+        Записи того же вещества, что и formula.
+
+        Находит точную формулу, формулы с фазой в скобках, а также композиты
+        и гидраты того же элементного состава. Записи другой формулы без
+        разделителей композита (изомеры, CH3OCH3 для C2H5OH) не возвращаются;
+        для формулы-композита подходят все записи того же состава.
+
+        Args:
+            formula: Химическая формула запроса
+
+        Returns:
+            Список rowid (по возрастанию); пустой, если формулу не удалось разобрать
+        """
+        if not self._built:
+            return []
+
+        composition = parse_composition(formula)
+        if composition is None:
+            return []
+
+        query_hash = signature_hash(composition_signature(composition))
+        lo = np.searchsorted(self._sorted_hashes, query_hash, side="left")
+        hi = np.searchsorted(self._sorted_hashes, query_hash, side="right")
+        positions = self.hash_order[lo:hi]
+
+        if not is_composite_formula(formula):
+            allowed = (ANY_FORMULA, _formula_hash(formula))
+            positions = positions[np.isin(self.formula_hashes[positions], allowed)]
+
+        # Проверка состава защищает от коллизий хэша
+        expected = {el: round(count, 6) for el, count in composition.items() if count}
+        matches = [
+            int(self.rowids[position])
+            for position in positions
+            if {el: round(c, 6) for el, c in self._row_composition(position).items()} == expected
+        ]
+        return sorted(matches)
+
+    def rows_with_elements(self, elements: Iterable[str], exact: bool = False) -> List[int]:
+        """
+        Записи, содержащие все указанные элементы (по разреженным векторам).
+
+        Args:
+            elements: Символы элементов, например ["Li", "Ti", "O"]
+            exact: Только записи, не содержащие других элементов
+
+        Returns:
+            Список rowid
+        """
+        if not self._built:
+            return []
+
+        wanted = set(elements)
+        ids = [self._element_lookup.get(el) for el in wanted]
+        if not wanted or None in ids:
+            return []
+
+        row_lengths = np.diff(self.indptr)
+        nnz_rows = np.repeat(np.arange(len(self.rowids)), row_lengths)
+        hits = np.bincount(
+            nnz_rows[np.isin(self.element_ids, ids)], minlength=len(self.rowids)
+        )
+        mask = hits == len(ids)
+        if exact:
+            mask &= row_lengths == len(ids)
+        return self.rowids[mask].tolist()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика индекса."""
+        return {
+            "index_built": self._built,
+            "total_records": len(self.rowids),
+            "unique_compositions": len(np.unique(self.hashes)) if self._built else 0,
+            "elements": len(self.elements),
+            "skipped_records": self.skipped_records,
+        }
@@ -1,57 +1,100 @@
 """
 Высокопроизводительный индексатор соединений для быстрых поисков.
 
-Предоставляет индексацию и кэширование для оптимизации поиска
-химических соединений в базе данных.
+Строит колоночный снимок таблицы compounds (NumPy массивы) и индексы над ним:
+- отсортированный массив формул для префиксных запросов за O(log n + k)
+- отсортированные массивы Tmin/Tmax для запросов пересечения диапазонов
+- маски NumPy для фильтров по надежности, фазе и исключения ионов
+
+Снимок сохраняется в .npz и переиспользуется, пока не изменился файл БД.
+Используется CompoundSearcher как предварительный фильтр: вместо полного
+сканирования с LIKE база получает запрос по первичному ключу (rowid).
 """
 
-from typing import Dict, List, Set, Optional, Tuple, Any
-from dataclasses import dataclass
-import time
+import logging
 import re
-from collections import defaultdict
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
-from ..filtering.constants import (
-    COMPOUND_INDEX_CACHE_SIZE,
-    FORMULA_PREFIX_CACHE_SIZE,
-    PRECOMPUTED_PHASE_TRANSITIONS,
-)
+import numpy as np
+
+from ..filtering.constants import COMPOUND_INDEX_CACHE_SIZE
 from ..models.search import DatabaseRecord
 
+logger = logging.getLogger(__name__)
+
+# Класс надежности для записей без значения (как в прежнем индексе)
+UNKNOWN_RELIABILITY = 9
+
+# Верхняя граница для префиксного диапазона в отсортированном массиве строк
+_PREFIX_END = "\U0010ffff"
+
+_SNAPSHOT_FIELDS = (
+    "rowids", "formulas", "phases", "tmin", "tmax", "reliability",
+    "prefix_order", "tmin_order", "source_version",
+)
+
+
+def database_version(db_path: Union[str, Path]) -> str:
+    """Версия файла БД (размер и время изменения) для проверки свежести снимка."""
+    try:
+        stat = Path(db_path).stat()
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+    except OSError:
+        return "missing"
+
 
 @dataclass
 class CompoundIndex:
-    """Индекс для быстрого поиска соединений."""
-
-    formula_prefixes: Dict[str, List[int]]  # Префиксы формул -> ID записей
-    compound_names: Dict[str, List[int]]  # Названия соединений -> ID записей
-    reliability_index: Dict[int, int]  # ID -> класс надежности
-    phase_index: Dict[str, List[int]]  # Фазы -> ID записей
-    temperature_index: Dict[Tuple[float, float], List[int]]  # Темп. диапазоны -> ID
+    """Колоночный снимок таблицы compounds с производными индексами."""
+
+    rowids: np.ndarray  # int64, позиция -> rowid (по возрастанию)
+    formulas: np.ndarray  # str, TRIM(Formula)
+    phases: np.ndarray  # str, Phase ('' если нет)
+    tmin: np.ndarray  # float64
+    tmax: np.ndarray  # float64
+    reliability: np.ndarray  # int16
+    prefix_order: np.ndarray  # позиции, отсортированные по UPPER(формула)
+    tmin_order: np.ndarray  # позиции, отсортированные по Tmin
+    source_version: str
     last_updated: float
     total_records: int
 
+    def __post_init__(self):
+        # Производные структуры, которые не хранятся в снимке
+        upper = np.char.upper(self.formulas)
+        self.upper_formulas = upper
+        self.prefix_keys: List[str] = upper[self.prefix_order].tolist()
+        self.tmin_sorted: np.ndarray = self.tmin[self.tmin_order]  # NaN в конце
+        self.is_ion = (np.char.find(self.formulas, "+") >= 0) | (
+            np.char.find(self.formulas, "-") >= 0
+        )
+
 
 class CompoundIndexer:
     """
     Высокопроизводительный индексатор соединений с кэшированием.
 
     Особенности:
-    - Индексация по префиксам формул для быстрых поисков
-    - Кэширование результатов поиска
-    - Оптимизированные алгоритмы для больших наборов данных
+    - Префиксный поиск бинарным поиском по отсортированным формулам
+    - Пересечение температурных диапазонов по отсортированному Tmin
+    - Фильтры надежности/фазы/ионов как операции над масками NumPy
+    - Сохранение и загрузка снимка индекса
     """
 
     def __init__(self, cache_size: int = COMPOUND_INDEX_CACHE_SIZE):
         self.cache_size = cache_size
         self._index: Optional[CompoundIndex] = None
-        self._prefix_cache: Dict[str, List[int]] = {}
-        self._search_cache: Dict[str, Tuple[List[int], float]] = {}
+        self._prefix_cache: Dict[str, np.ndarray] = {}
 
         # Метрики производительности
         self._cache_hits = 0
         self._cache_misses = 0
         self._search_count = 0
+        self._build_time = 0.0
 
         # Предвычисленные паттерны для распространенных соединений
         self._common_patterns = self._initialize_common_patterns()
@@ -68,6 +111,8 @@ class CompoundIndexer:
             "H2": ["H2", "H2(g)", "HYDROGEN"],
         }
 
+    # Построение
+
     def build_index(self, records: List[DatabaseRecord]) -> None:
         """
         Построить индекс для набора записей.
@@ -75,110 +120,262 @@ class CompoundIndexer:
         Args:
             records: Список записей для индексации
         """
+        rows = (
+            (r.id, r.formula, r.phase, r.tmin, r.tmax, r.reliability_class)
+            for r in records
+            if r.id
+        )
+        self._build(rows, source_version="records")
+
+    def build_from_database(self, db_connector: Any) -> None:
+        """
+        Построить индекс по всей таблице compounds.
+
+        Args:
+            db_connector: DatabaseConnector с доступом к БД
+        """
+        rows = db_connector.execute_query(
+            "SELECT rowid, Formula, Phase, Tmin, Tmax, ReliabilityClass "
+            "FROM compounds ORDER BY rowid"
+        )
+        self._build(
+            (
+                (row["rowid"], row["Formula"], row["Phase"], row["Tmin"],
+                 row["Tmax"], row["ReliabilityClass"])
+                for row in rows
+            ),
+            source_version=database_version(db_connector.db_path),
+        )
+
+    def _build(self, rows: Iterable[Tuple], source_version: str) -> None:
         start_time = time.time()
 
-        formula_prefixes = defaultdict(list)
-        compound_names = defaultdict(list)
-        reliability_index = {}
-        phase_index = defaultdict(list)
-        temperature_index = defaultdict(list)
-
-        for record in records:
-            if not record.id:
-                continue
-
-            # Индексация по префиксам формул
-            self._index_formula_prefixes(record.formula, record.id, formula_prefixes)
-
-            # Индексация по названиям (если доступны)
-            if hasattr(record, 'first_name') and record.first_name:
-                names = self._extract_compound_names(record.first_name)
-                for name in names:
-                    compound_names[name.upper()].append(record.id)
-
-            # Индексация по надежности
-            if record.reliability_class:
-                reliability_index[record.id] = record.reliability_class
-
-            # Индексация по фазам
-            if record.phase:
-                phase_index[record.phase].append(record.id)
-
-            # Индексация по температурным диапазонам
-            if record.tmin is not None and record.tmax is not None:
-                # Создаем coarse-grained индекс по диапазонам (с шагом 100K)
-                tmin_bucket = int(record.tmin // 100) * 100
-                tmax_bucket = int(record.tmax // 100) * 100
-                temperature_index[(tmin_bucket, tmax_bucket)].append(record.id)
-
-        # Сохраняем индекс
-        self._index = CompoundIndex(
-            formula_prefixes=dict(formula_prefixes),
-            compound_names=dict(compound_names),
-            reliability_index=reliability_index,
-            phase_index=dict(phase_index),
-            temperature_index=dict(temperature_index),
-            last_updated=time.time(),
-            total_records=len(records)
+        rowids, formulas, phases, tmin, tmax, reliability = [], [], [], [], [], []
+        for rowid, formula, phase, t_lo, t_hi, rel in rows:
+            rowids.append(int(rowid))
+            formulas.append((formula or "").strip())
+            phases.append(phase or "")
+            tmin.append(np.nan if t_lo is None else float(t_lo))
+            tmax.append(np.nan if t_hi is None else float(t_hi))
+            reliability.append(UNKNOWN_RELIABILITY if rel is None else int(rel))
+
+        rowid_array = np.asarray(rowids, dtype=np.int64)
+        order = np.argsort(rowid_array, kind="stable")
+        formula_array = np.asarray(formulas, dtype=str)[order]
+        tmin_array = np.asarray(tmin, dtype=np.float64)[order]
+
+        self._set_index(
+            CompoundIndex(
+                rowids=rowid_array[order],
+                formulas=formula_array,
+                phases=np.asarray(phases, dtype=str)[order],
+                tmin=tmin_array,
+                tmax=np.asarray(tmax, dtype=np.float64)[order],
+                reliability=np.asarray(reliability, dtype=np.int16)[order],
+                prefix_order=np.argsort(np.char.upper(formula_array), kind="stable"),
+                tmin_order=np.argsort(tmin_array, kind="stable"),
+                source_version=source_version,
+                last_updated=time.time(),
+                total_records=len(rowids),
+            )
         )
 
+        self._build_time = time.time() - start_time
+        logger.info(
+            f"Индекс соединений построен за {self._build_time:.3f}s "
+            f"({len(rowids)} записей)"
+        )
+
+    def _set_index(self, index: CompoundIndex) -> None:
+        self._index = index
         # Очищаем кэши при перестроении индекса
         self._prefix_cache.clear()
-        self._search_cache.clear()
 
-        build_time = time.time() - start_time
-        print(f"Index built in {build_time:.3f}s for {len(records)} records")
+    # Снимок
 
-    def _index_formula_prefixes(
-        self,
-        formula: str,
-        record_id: int,
-        prefix_index: Dict[str, List[int]]
+    def save(self, path: Union[str, Path]) -> None:
+        """Сохранить снимок индекса в .npz файл."""
+        if not self._index:
+            raise ValueError("Индекс не построен")
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                **{
+                    name: (
+                        np.asarray(self._index.source_version)
+                        if name == "source_version"
+                        else getattr(self._index, name)
+                    )
+                    for name in _SNAPSHOT_FIELDS
+                },
+            )
+        tmp_path.replace(path)
+
+    def load(self, path: Union[str, Path]) -> None:
+        """Загрузить снимок индекса из .npz файла."""
+        with np.load(Path(path), allow_pickle=False) as data:
+            arrays = {name: data[name] for name in _SNAPSHOT_FIELDS}
+
+        self._set_index(
+            CompoundIndex(
+                rowids=arrays["rowids"],
+                formulas=arrays["formulas"],
+                phases=arrays["phases"],
+                tmin=arrays["tmin"],
+                tmax=arrays["tmax"],
+                reliability=arrays["reliability"],
+                prefix_order=arrays["prefix_order"],
+                tmin_order=arrays["tmin_order"],
+                source_version=str(arrays["source_version"]),
+                last_updated=Path(path).stat().st_mtime,
+                total_records=len(arrays["rowids"]),
+            )
+        )
+
+    def load_or_build(
+        self, db_connector: Any, snapshot_path: Optional[Union[str, Path]] = None
     ) -> None:
         """
-        Проиндексировать префиксы формулы для быстрых поисков.
+        Загрузить снимок, если он соответствует текущей БД, иначе построить
+        индекс по таблице compounds и сохранить снимок.
 
         Args:
-            formula: Химическая формула
-            record_id: ID записи
-            prefix_index: Индекс префиксов для обновления
+            db_connector: DatabaseConnector
+            snapshot_path: Путь к .npz снимку (опционально)
+        """
+        if snapshot_path and Path(snapshot_path).exists():
+            try:
+                self.load(snapshot_path)
+                if self._index.source_version == database_version(db_connector.db_path):
+                    logger.info(f"Индекс соединений загружен из {snapshot_path}")
+                    return
+                logger.info("Снимок индекса устарел, перестроение")
+            except (OSError, KeyError, ValueError) as e:
+                logger.warning(f"Не удалось загрузить снимок индекса: {e}")
+
+        self.build_from_database(db_connector)
+        if snapshot_path:
+            try:
+                self.save(snapshot_path)
+            except OSError as e:
+                logger.warning(f"Не удалось сохранить снимок индекса: {e}")
+
+    @property
+    def is_built(self) -> bool:
+        """Построен ли индекс."""
+        return self._index is not None
+
+    # Запросы по позициям (внутреннее представление)
+
+    def _prefix_positions(self, prefix: str) -> np.ndarray:
+        """Позиции записей, у которых UPPER(формула) начинается с prefix (без учета регистра)."""
+        key = prefix.strip().upper()
+        cached = self._prefix_cache.get(key)
+        if cached is not None:
+            self._cache_hits += 1
+            return cached
+
+        self._cache_misses += 1
+        keys = self._index.prefix_keys
+        lo = bisect_left(keys, key)
+        hi = bisect_left(keys, key + _PREFIX_END, lo)
+        positions = np.sort(self._index.prefix_order[lo:hi])
+
+        # Кэшируем результат
+        if len(self._prefix_cache) < self.cache_size:
+            self._prefix_cache[key] = positions
+        return positions
+
+    def formula_positions(
+        self,
+        formula: str,
+        prefix: bool = False,
+        containment: bool = False,
+    ) -> np.ndarray:
         """
-        if not formula:
-            return
+        Позиции записей, соответствующих условию поиска формулы SQLBuilder.
 
-        # Извлекаем атомные префиксы (H, He, Li, Be, B, C, N, O, F, Ne, etc.)
-        elements = re.findall(r'[A-Z][a-z]?', formula)
+        Эквивалент: TRIM(Formula) = formula OR Formula LIKE 'formula(%'
+        [OR Formula LIKE 'formula%'] [OR Formula LIKE '%formula%'].
+        Как и LIKE в SQLite, сравнения по шаблону не учитывают регистр.
 
-        # Создаем префиксы разной длины
-        for i in range(1, min(len(elements), 4) + 1):
-            prefix = ''.join(elements[:i])
-            prefix_index[prefix].append(record_id)
+        Args:
+            formula: Формула
+            prefix: Добавить префиксное совпадение
+            containment: Добавить совпадение по вхождению
 
-        # Добавляем полную формулу
-        prefix_index[formula].append(record_id)
+        Returns:
+            Отсортированный массив позиций
+        """
+        self._search_count += 1
+        index = self._index
+        formula = formula.strip()
 
-        # Добавляем формулу с фазой (если есть)
-        if '(' in formula and ')' in formula:
-            base_formula = formula.split('(')[0]
-            prefix_index[base_formula].append(record_id)
+        if containment:
+            return np.flatnonzero(np.char.find(index.upper_formulas, formula.upper()) >= 0)
 
-    def _extract_compound_names(self, name_str: str) -> List[str]:
-        """Извлечь возможные названия соединения из строки."""
-        if not name_str:
-            return []
+        candidates = self._prefix_positions(formula)
+        if prefix:
+            return candidates
 
-        names = []
+        exact = candidates[index.formulas[candidates] == formula]
+        with_phase = self._prefix_positions(formula + "(")
+        return np.union1d(exact, with_phase)
 
-        # Базовое название
-        names.append(name_str.strip())
+    def temperature_overlap_positions(self, tmin: float, tmax: float) -> np.ndarray:
+        """
+        Позиции записей с [Tmin, Tmax], пересекающим [tmin, tmax].
 
-        # Разделение по запятым и точкам с запятой
-        for separator in [',', ';']:
-            if separator in name_str:
-                names.extend([n.strip() for n in name_str.split(separator)])
+        Бинарный поиск отсекает записи с Tmin > tmax, оставшиеся
+        проверяются по Tmax векторно.
+        """
+        index = self._index
+        hi = int(np.searchsorted(index.tmin_sorted, tmax, side="right"))
+        positions = index.tmin_order[:hi]
+        return np.sort(positions[index.tmax[positions] >= tmin])
 
-        # Удаление дубликатов и пустых строк
-        return list(set(filter(None, names)))
+    def filter_mask(
+        self,
+        positions: np.ndarray,
+        temperature_range: Optional[Tuple[float, float]] = None,
+        phase: Optional[str] = None,
+        max_reliability_class: Optional[int] = None,
+        exclude_ions: bool = False,
+    ) -> np.ndarray:
+        """Булева маска для positions по комбинации фильтров."""
+        index = self._index
+        mask = np.ones(len(positions), dtype=bool)
+
+        if temperature_range is not None:
+            tmin, tmax = temperature_range
+            mask &= (index.tmax[positions] >= tmin) & (index.tmin[positions] <= tmax)
+        if phase is not None:
+            mask &= index.phases[positions] == phase
+        if max_reliability_class is not None:
+            mask &= index.reliability[positions] <= max_reliability_class
+        if exclude_ions:
+            mask &= ~index.is_ion[positions]
+        return mask
+
+    def to_rowids(self, positions: np.ndarray) -> List[int]:
+        """Позиции -> rowid записей БД."""
+        return self._index.rowids[positions].tolist()
+
+    def _positions_for(self, record_ids: List[int]) -> np.ndarray:
+        """rowid -> позиции (неизвестные rowid отбрасываются)."""
+        rowids = self._index.rowids
+        ids = np.asarray(record_ids, dtype=np.int64)
+        if not len(rowids) or not len(ids):
+            return np.empty(0, dtype=np.intp)
+
+        positions = np.searchsorted(rowids, ids).clip(0, len(rowids) - 1)
+        return positions[rowids[positions] == ids]
+
+    # Публичный API по rowid
 
     def search_by_formula_prefix(self, prefix: str) -> List[int]:
         """
@@ -188,38 +385,26 @@ class CompoundIndexer:
             prefix: Префикс формулы для поиска
 
         Returns:
-            Список ID записей, соответствующих префиксу
+            Список ID записей (rowid), соответствующих префиксу
         """
         if not self._index:
             return []
 
-        # Проверяем кэш
-        if prefix in self._prefix_cache:
-            self._cache_hits += 1
-            return self._prefix_cache[prefix].copy()
-
-        self._cache_misses += 1
+        self._search_count += 1
+        return self.to_rowids(self._prefix_positions(prefix))
 
-        # Поиск в индексе
-        matching_ids = []
-
-        # Прямой поиск префикса
-        if prefix in self._index.formula_prefixes:
-            matching_ids.extend(self._index.formula_prefixes[prefix])
-
-        # Поиск по частичным совпадениям
-        for indexed_prefix, ids in self._index.formula_prefixes.items():
-            if indexed_prefix.startswith(prefix):
-                matching_ids.extend(ids)
-
-        # Удаляем дубликаты и кэшируем результат
-        unique_ids = list(set(matching_ids))
+    def search_by_temperature_overlap(self, tmin: float, tmax: float) -> List[int]:
+        """
+        Записи, температурный диапазон которых пересекается с [tmin, tmax].
 
-        # Кэшируем результат
-        if len(self._prefix_cache) < self.cache_size:
-            self._prefix_cache[prefix] = unique_ids.copy()
+        Returns:
+            Список ID записей (rowid)
+        """
+        if not self._index:
+            return []
 
-        return unique_ids
+        self._search_count += 1
+        return self.to_rowids(self.temperature_overlap_positions(tmin, tmax))
 
     def search_common_compound(self, formula: str) -> List[int]:
         """
@@ -238,14 +423,11 @@ class CompoundIndexer:
         formula_clean = re.sub(r'\([^)]*\)', '', formula)  # Удаляем фазовые обозначения
 
         if formula_clean in self._common_patterns:
-            patterns = self._common_patterns[formula_clean]
-            matching_ids = []
-
-            for pattern in patterns:
-                ids = self.search_by_formula_prefix(pattern)
-                matching_ids.extend(ids)
-
-            return list(set(matching_ids))
+            positions = [
+                self._prefix_positions(pattern)
+                for pattern in self._common_patterns[formula_clean]
+            ]
+            return self.to_rowids(np.unique(np.concatenate(positions)))
 
         # Если не в распространенных, используем обычный поиск
         return self.search_by_formula_prefix(formula)
@@ -268,13 +450,9 @@ class CompoundIndexer:
         if not self._index:
             return record_ids
 
-        filtered_ids = []
-        for record_id in record_ids:
-            reliability = self._index.reliability_index.get(record_id, 9)  # По умолчанию плохая надежность
-            if reliability <= max_reliability_class:
-                filtered_ids.append(record_id)
-
-        return filtered_ids
+        positions = self._positions_for(record_ids)
+        mask = self.filter_mask(positions, max_reliability_class=max_reliability_class)
+        return self.to_rowids(positions[mask])
 
     def filter_by_temperature_range(
         self,
@@ -289,26 +467,15 @@ class CompoundIndexer:
             temperature_range: Температурный диапазон (tmin, tmax)
 
         Returns:
-            Отфильтрованный список ID записей
+            Отфильтрованный список ID записей, диапазон которых пересекается
+            с заданным
         """
         if not self._index:
             return record_ids
 
-        tmin, tmax = temperature_range
-        filtered_ids = []
-
-        # Используем coarse-grained индекс для быстрой фильтрации
-        tmin_bucket = int(tmin // 100) * 100
-        tmax_bucket = int(tmax // 100) * 100
-
-        # Проверяем пересечение с температурными бакетами
-        for bucket_start, bucket_end in range(tmin_bucket - 100, tmax_bucket + 101, 100):
-            bucket_key = (bucket_start, bucket_end)
-            if bucket_key in self._index.temperature_index:
-                bucket_ids = self._index.temperature_index[bucket_key]
-                filtered_ids.extend([rid for rid in bucket_ids if rid in record_ids])
-
-        return list(set(filtered_ids))
+        positions = self._positions_for(record_ids)
+        mask = self.filter_mask(positions, temperature_range=temperature_range)
+        return self.to_rowids(positions[mask])
 
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Получить метрики производительности индексатора."""
@@ -323,16 +490,15 @@ class CompoundIndexer:
             "cache_hits": self._cache_hits,
             "cache_misses": self._cache_misses,
             "prefix_cache_size": len(self._prefix_cache),
-            "search_cache_size": len(self._search_cache),
             "index_built": self._index is not None,
             "total_records": self._index.total_records if self._index else 0,
             "search_count": self._search_count,
+            "build_time_seconds": self._build_time,
         }
 
     def clear_cache(self) -> None:
         """Очистить все кэши."""
         self._prefix_cache.clear()
-        self._search_cache.clear()
         self._cache_hits = 0
         self._cache_misses = 0
 
@@ -350,4 +516,4 @@ class CompoundIndexer:
             return False
 
         age = time.time() - self._index.last_updated
-        return age < max_age_seconds
\ No newline at end of file
+        return age < max_age_seconds
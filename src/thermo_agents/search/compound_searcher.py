@@ -80,6 +80,8 @@ import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
 from ..filtering.constants import (
     DEFAULT_CACHE_SIZE,
     DEFAULT_QUERY_LIMIT,
@@ -97,6 +99,8 @@ from ..models.search import (
     SearchStatistics,
     SearchStrategy,
 )
+from .composition_index import CompositionIndex
+from .compound_index import CompoundIndexer
 from .database_connector import DatabaseConnector
 from .sql_builder import FilterPriorities, SQLBuilder
 
@@ -117,6 +121,8 @@ class CompoundSearcher:
         db_connector: DatabaseConnector,
         session_logger: Optional[Any] = None,
         static_data_manager: Optional[Any] = None,  # Будет в Stage 04
+        compound_index: Optional[CompoundIndexer] = None,
+        composition_index: Optional[CompositionIndex] = None,
     ):
         """
         Initialize compound searcher.
@@ -126,13 +132,106 @@ class CompoundSearcher:
             db_connector: Database connector for query execution
             session_logger: Optional session logger for detailed logging
             static_data_manager: Optional static data manager for YAML cache
+            compound_index: Optional built CompoundIndexer used as a pre-filter
+            composition_index: Optional built CompositionIndex consulted first
         """
         self.sql_builder = sql_builder
         self.db_connector = db_connector
         self.session_logger = session_logger  # НОВОЕ
         self.static_data_manager = static_data_manager
+        self.compound_index = compound_index
+        self.composition_index = composition_index
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
+    def _build_search_query(
+        self,
+        formula: str,
+        temperature_range: Optional[Tuple[float, float]],
+        phase: Optional[str],
+        limit: int,
+        compound_names: Optional[List[str]] = None,
+    ) -> Tuple[str, List[Any]]:
+        """
+        Build the search query, using the in-memory indexes as pre-filters.
+
+        The composition index finds records with the same element
+        substance (exact formula, phase suffixes, composites and hydrates of the
+        same composition, but not isomers). The compound index computes candidate rowids with
+        the same semantics as SQLBuilder's formula, ion, temperature and phase
+        conditions; both candidate sets are merged and fetched by primary key.
+        Name-based conditions are not covered by the indexes, so queries with
+        compound_names fall back to the full SQL search.
+        """
+        if compound_names:
+            return self.sql_builder.build_compound_search_query(
+                formula=formula,
+                temperature_range=temperature_range,
+                phase=phase,
+                limit=limit,
+                compound_names=compound_names,
+            )
+
+        composition_matches = []
+        if self.composition_index is not None and self.composition_index.is_built:
+            composition_matches = self.composition_index.lookup(formula)
+
+        candidates = self._index_candidates(formula, temperature_range, phase)
+
+        if candidates is not None:
+            if composition_matches:
+                # Composition matches are not pre-filtered, so the filters are
+                # repeated in SQL (a no-op for the compound index candidates)
+                return self.sql_builder.build_rowid_query(
+                    sorted(set(candidates) | set(composition_matches)),
+                    limit,
+                    temperature_range,
+                    phase,
+                )
+            return self.sql_builder.build_rowid_query(candidates, limit)
+
+        if composition_matches:
+            return self.sql_builder.build_rowid_query(
+                composition_matches, limit, temperature_range, phase
+            )
+
+        return self.sql_builder.build_compound_search_query(
+            formula=formula,
+            temperature_range=temperature_range,
+            phase=phase,
+            limit=limit,
+        )
+
+    def _index_candidates(
+        self,
+        formula: str,
+        temperature_range: Optional[Tuple[float, float]],
+        phase: Optional[str],
+    ) -> Optional[List[int]]:
+        """Candidate rowids from the compound index, or None without an index."""
+        index = self.compound_index
+        if index is None or not index.is_built:
+            return None
+
+        clean_formula = formula.strip()
+        spec = self.sql_builder.common_resolver.get_spec(clean_formula)
+        if spec is not None:
+            # Exact logic for common compounds (see CommonCompoundResolver)
+            positions = np.unique(np.concatenate(
+                [index.formula_positions(f) for f in spec.formulas]
+            ))
+        elif self.sql_builder._is_simple_formula(clean_formula):
+            positions = index.formula_positions(clean_formula)
+        else:
+            positions = index.formula_positions(clean_formula, containment=True)
+
+        mask = index.filter_mask(
+            positions,
+            temperature_range=temperature_range,
+            phase=phase,
+            exclude_ions=True,
+        )
+        return index.to_rowids(positions[mask])
+
     def search_compound(
         self,
         formula: str,
@@ -202,7 +301,7 @@ class CompoundSearcher:
 
         try:
             # Generate SQL query
-            query, params = self.sql_builder.build_compound_search_query(
+            query, params = self._build_search_query(
                 formula=formula,
                 temperature_range=sql_temperature_range,  # Use modified range
                 phase=phase,
@@ -876,7 +975,7 @@ class CompoundSearcher:
         self.logger.info(f"Поиск в БД для {formula}")
 
         # Генерация SQL запроса для поиска всех записей вещества
-        sql_query = self.sql_builder.build_compound_search_query(
+        sql_query = self._build_search_query(
             formula=formula,
             temperature_range=None,  # Ищем все записи
             phase=None,  # Все фазы
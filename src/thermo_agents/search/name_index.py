@@ -0,0 +1,274 @@
+"""
+Полнотекстовый индекс названий соединений (SQLite FTS5).
+
+Стадия 1 поиска (формула + название) раньше сравнивала TRIM(FirstName) и
+TRIM(SecondName) с названием точно: без индекса и без учета регистра,
+порядка слов и вариантов написания. Индекс состоит из двух виртуальных
+таблиц FTS5 над FirstName/SecondName (external content = compounds):
+- compound_names_fts: словный токенизатор unicode61 (регистр и диакритика
+  не важны, порядок слов не важен), ранжирование bm25;
+- compound_names_trigram: токенизатор trigram для поиска с опечатками.
+
+Таблицы создаются командой подготовки БД (scripts/prepare_search_db.py);
+NameIndex возвращает ранжированные rowid, которые загрузчик получает по
+первичному ключу.
+"""
+
+import logging
+import re
+import sqlite3
+import time
+import unicodedata
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+NAME_FTS_TABLE = "compound_names_fts"
+NAME_TRIGRAM_TABLE = "compound_names_trigram"
+
+# Британские/американские варианты написания (в обе стороны)
+_SPELLING_VARIANTS = {
+    "aluminium": "aluminum",
+    "caesium": "cesium",
+    "sulphur": "sulfur",
+    "sulphide": "sulfide",
+    "sulphate": "sulfate",
+    "sulphite": "sulfite",
+    "sulphuric": "sulfuric",
+}
+_SPELLING_VARIANTS.update({v: k for k, v in list(_SPELLING_VARIANTS.items())})
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+_ION_EXCLUSION = "(c.Formula NOT LIKE '%+%' AND c.Formula NOT LIKE '%-%')"
+
+
+def normalize_name(name: str) -> str:
+    """
+    Нормализация названия: нижний регистр, без диакритики, слова через пробел.
+
+    Example: "Titanium(IV)-Oxide " -> "titanium iv oxide"
+    """
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(_TOKEN_RE.findall(stripped.lower()))
+
+
+def fts_match_expression(name: str) -> Optional[str]:
+    """
+    Выражение MATCH для словной таблицы: все слова названия в любом порядке.
+
+    Слова с вариантами написания объединяются через OR:
+    "aluminium oxide" -> '("aluminium" OR "aluminum") AND "oxide"'
+
+    Returns:
+        Выражение FTS5 или None, если в названии нет слов
+    """
+    terms = []
+    for token in normalize_name(name).split():
+        variant = _SPELLING_VARIANTS.get(token)
+        if variant:
+            terms.append(f'("{token}" OR "{variant}")')
+        else:
+            terms.append(f'"{token}"')
+    return " AND ".join(terms) if terms else None
+
+
+def trigram_match_expression(name: str) -> Optional[str]:
+    """
+    Выражение MATCH для trigram-таблицы: любая из триграмм названия.
+
+    Returns:
+        Выражение FTS5 или None для названий короче трех символов
+    """
+    text = normalize_name(name)
+    trigrams = sorted({text[i:i + 3] for i in range(len(text) - 2)})
+    trigrams = [t for t in trigrams if " " not in t]
+    if not trigrams:
+        return None
+    return " OR ".join(f'"{t}"' for t in trigrams)
+
+
+def create_name_index(db_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Создать (пересоздать) FTS5 таблицы названий в файле БД.
+
+    Args:
+        db_path: Путь к SQLite БД с таблицей compounds
+
+    Returns:
+        Статистика: число проиндексированных записей и время построения
+    """
+    start_time = time.time()
+    conn = sqlite3.connect(str(db_path))
+    try:
+        with conn:
+            for table, tokenizer in (
+                (NAME_FTS_TABLE, "unicode61 remove_diacritics 2"),
+                (NAME_TRIGRAM_TABLE, "trigram case_sensitive 0"),
+            ):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute(
+                    f"CREATE VIRTUAL TABLE {table} USING fts5("
+                    f"FirstName, SecondName, content='compounds', "
+                    f"content_rowid='rowid', tokenize='{tokenizer}')"
+                )
+                conn.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+            conn.execute(f"INSERT INTO {NAME_FTS_TABLE}({NAME_FTS_TABLE}) VALUES ('optimize')")
+        records = conn.execute("SELECT COUNT(*) FROM compounds").fetchone()[0]
+    finally:
+        conn.close()
+
+    elapsed = time.time() - start_time
+    logger.info(f"Индекс названий построен за {elapsed:.2f}s: {records} записей")
+    return {"records": records, "build_time_s": elapsed}
+
+
+class NameIndex:
+    """
+    Поиск записей по названию (и формуле) через FTS5 таблицы.
+
+    Args:
+        db_connector: DatabaseConnector к БД с таблицами индекса
+        limit: Максимум возвращаемых rowid
+        min_similarity: Порог похожести названия для поиска с опечатками
+    """
+
+    def __init__(
+        self,
+        db_connector: Any,
+        limit: int = 200,
+        min_similarity: float = 0.85,
+    ):
+        self.db_connector = db_connector
+        self.limit = limit
+        self.min_similarity = min_similarity
+        self._available: Optional[bool] = None
+
+        # Статистика
+        self.lookups = 0
+        self.word_hits = 0
+        self.fuzzy_hits = 0
+        self.total_time = 0.0
+
+    @property
+    def is_available(self) -> bool:
+        """Созданы ли таблицы индекса в БД (проверяется один раз)."""
+        if self._available is None:
+            try:
+                rows = self.db_connector.execute_query(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN (?, ?)",
+                    [NAME_FTS_TABLE, NAME_TRIGRAM_TABLE],
+                )
+                self._available = len(rows) == 2
+            except (sqlite3.Error, FileNotFoundError):
+                self._available = False
+        return self._available
+
+    def search(self, name: str, formula: Optional[str] = None) -> List[int]:
+        """
+        Ранжированные rowid записей с данным названием.
+
+        Сначала словный поиск (все слова в любом порядке, bm25), при отсутствии
+        результатов — поиск по триграммам с проверкой похожести названия.
+        Ионы исключаются, как и в остальных стадиях поиска.
+
+        Args:
+            name: Название вещества
+            formula: Формула (точная или с фазой в скобках); None — любая
+
+        Returns:
+            Список rowid, лучшие совпадения первыми
+        """
+        if not self.is_available:
+            return []
+
+        start_time = time.time()
+        self.lookups += 1
+        try:
+            rowids = self._word_search(name, formula)
+            if rowids:
+                self.word_hits += 1
+                return rowids
+
+            rowids = self._fuzzy_search(name, formula)
+            if rowids:
+                self.fuzzy_hits += 1
+            return rowids
+        finally:
+            self.total_time += time.time() - start_time
+
+    def _formula_condition(self, formula: Optional[str]) -> tuple:
+        if not formula:
+            return "", []
+        clean_formula = formula.strip()
+        return (
+            "AND (TRIM(c.Formula) = ? OR c.Formula LIKE ?)",
+            [clean_formula, f"{clean_formula}(%"],
+        )
+
+    def _word_search(self, name: str, formula: Optional[str]) -> List[int]:
+        expression = fts_match_expression(name)
+        if expression is None:
+            return []
+
+        formula_sql, formula_params = self._formula_condition(formula)
+        rows = self.db_connector.execute_query(
+            f"""
+            SELECT c.rowid AS rowid FROM {NAME_FTS_TABLE} f
+            JOIN compounds c ON c.rowid = f.rowid
+            WHERE {NAME_FTS_TABLE} MATCH ? {formula_sql}
+            AND {_ION_EXCLUSION}
+            ORDER BY f.rank
+            LIMIT ?
+            """,
+            [expression, *formula_params, self.limit],
+        )
+        return [row["rowid"] for row in rows]
+
+    def _fuzzy_search(self, name: str, formula: Optional[str]) -> List[int]:
+        expression = trigram_match_expression(name)
+        if expression is None:
+            return []
+
+        formula_sql, formula_params = self._formula_condition(formula)
+        rows = self.db_connector.execute_query(
+            f"""
+            SELECT c.rowid AS rowid, c.FirstName AS FirstName, c.SecondName AS SecondName
+            FROM {NAME_TRIGRAM_TABLE} t
+            JOIN compounds c ON c.rowid = t.rowid
+            WHERE {NAME_TRIGRAM_TABLE} MATCH ? {formula_sql}
+            AND {_ION_EXCLUSION}
+            ORDER BY t.rank
+            LIMIT ?
+            """,
+            [expression, *formula_params, self.limit * 10],
+        )
+
+        # Триграммы отбирают кандидатов, порог похожести отсекает случайные
+        target = normalize_name(name)
+        scored = []
+        for row in rows:
+            similarity = max(
+                SequenceMatcher(None, target, normalize_name(row[column] or "")).ratio()
+                for column in ("FirstName", "SecondName")
+            )
+            if similarity >= self.min_similarity:
+                scored.append((-similarity, row["rowid"]))
+
+        scored.sort()
+        return [rowid for _, rowid in scored[: self.limit]]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика поиска по названиям."""
+        hits = self.word_hits + self.fuzzy_hits
+        return {
+            "available": self.is_available,
+            "lookups": self.lookups,
+            "word_hits": self.word_hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "hit_rate": hits / self.lookups if self.lookups else 0.0,
+            "avg_lookup_time_ms": self.total_time / self.lookups * 1000 if self.lookups else 0.0,
+        }
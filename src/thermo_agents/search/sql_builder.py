@@ -99,6 +99,7 @@ from ..filtering.constants import (
     VALID_PHASES,
 )
 from .common_compounds import CommonCompoundResolver
+from .name_index import NAME_FTS_TABLE, fts_match_expression
 
 
 @dataclass
@@ -137,15 +138,22 @@ class SQLBuilder:
     - Метрики производительности
     """
 
-    def __init__(self, priorities: Optional[FilterPriorities] = None):
+    def __init__(
+        self,
+        priorities: Optional[FilterPriorities] = None,
+        name_index: Optional[Any] = None,
+    ):
         """
         Initialize SQL builder with filtering priorities and performance optimizations.
 
         Args:
             priorities: Custom filtering priorities, defaults to standard config
+            name_index: Optional NameIndex; when its FTS5 tables exist, name
+                conditions use full-text matching instead of exact comparison
         """
         self.priorities = priorities or FilterPriorities()
         self.common_resolver = CommonCompoundResolver()
+        self.name_index = name_index
 
         # Кэширование запросов
         self._query_cache: Dict[str, Tuple[str, List[Any]]] = {}
@@ -393,13 +401,18 @@ class SQLBuilder:
         # Clean and escape formula
         clean_formula = formula.strip()
 
+        use_fts = self.name_index is not None and self.name_index.is_available
+
         # ПРИОРИТЕТ 1: Проверка на распространенное вещество
         if self.common_resolver.is_common_compound(clean_formula):
             common_condition = self.common_resolver.build_sql_condition(
-                clean_formula, compound_names
+                clean_formula, None if use_fts else compound_names
             )
             if common_condition:
                 # Используем точную логику для распространенных веществ
+                name_conditions = self._build_name_conditions(compound_names) if use_fts else []
+                if name_conditions:
+                    return f"({common_condition} OR {' OR '.join(name_conditions)})"
                 return common_condition
 
         # ПРИОРИТЕТ 2: Обычная логика для остальных веществ
@@ -418,21 +431,39 @@ class SQLBuilder:
 
         # Add name-based search if compound names are provided
         if compound_names:
-            name_conditions = []
-            for name in compound_names:
-                if name and name.strip():
-                    escaped_name = self._escape_sql(name.strip())
-                    # Case-insensitive exact match on FirstName
-                    name_conditions.append(
-                        f"LOWER(TRIM(FirstName)) = LOWER('{escaped_name}')"
-                    )
-
-            if name_conditions:
-                # Add name search as additional OR conditions
-                conditions.extend(name_conditions)
+            # Add name search as additional OR conditions
+            conditions.extend(self._build_name_conditions(compound_names))
 
         return "(" + " OR ".join(conditions) + ")"
 
+    def _build_name_conditions(self, compound_names: Optional[List[str]]) -> List[str]:
+        """
+        Build name match conditions.
+
+        With the FTS5 name index every word of the name must match FirstName
+        or SecondName in any order, case and diacritics insensitive. Without
+        it FirstName is compared exactly (case-insensitive).
+        """
+        use_fts = self.name_index is not None and self.name_index.is_available
+        name_conditions = []
+        for name in compound_names or []:
+            if not name or not name.strip():
+                continue
+            if use_fts:
+                expression = fts_match_expression(name)
+                if expression:
+                    name_conditions.append(
+                        f"rowid IN (SELECT rowid FROM {NAME_FTS_TABLE} "
+                        f"WHERE {NAME_FTS_TABLE} MATCH '{self._escape_sql(expression)}')"
+                    )
+            else:
+                escaped_name = self._escape_sql(name.strip())
+                # Case-insensitive exact match on FirstName
+                name_conditions.append(
+                    f"LOWER(TRIM(FirstName)) = LOWER('{escaped_name}')"
+                )
+        return name_conditions
+
     def _build_temperature_condition(
         self, tmin_user: float, tmax_user: float
     ) -> Tuple[str, List[float]]:
@@ -506,6 +537,54 @@ class SQLBuilder:
         # Basic SQL escaping - replace single quotes
         return value.replace("'", "''")
 
+    def build_rowid_query(
+        self,
+        rowids: List[int],
+        limit: int = DEFAULT_QUERY_LIMIT,
+        temperature_range: Optional[Tuple[float, float]] = None,
+        phase: Optional[str] = None,
+    ) -> Tuple[str, List[Any]]:
+        """
+        Generate query fetching records by primary key.
+
+        Used when the candidate set was already computed by an index
+        (CompoundIndexer, CompositionIndex), so the database does a rowid
+        lookup instead of a LIKE scan. Ordering is the same as in
+        build_compound_search_query.
+
+        Args:
+            rowids: Candidate record IDs (integers only)
+            limit: Maximum number of results to return
+            temperature_range: Optional (tmin, tmax) filter not yet applied
+            phase: Optional phase filter not yet applied
+
+        Returns:
+            Tuple of (SQL query string, parameters)
+        """
+        id_list = ", ".join(str(int(rowid)) for rowid in rowids)
+        where_conditions = [f"rowid IN ({id_list})"]
+        params: List[Any] = []
+
+        if temperature_range:
+            temp_condition, temp_params = self._build_temperature_condition(
+                temperature_range[0], temperature_range[1]
+            )
+            where_conditions.append(temp_condition)
+            params.extend(temp_params)
+
+        if phase:
+            where_conditions.append("Phase = ?")
+            params.append(phase)
+
+        query = f"""
+        SELECT * FROM compounds
+        WHERE {" AND ".join(where_conditions)}
+        {self._build_order_clause()}
+        LIMIT ?
+        """
+        params.append(limit)
+        return query, params
+
     def build_compound_count_query(
         self,
         formula: str,
@@ -90,6 +90,9 @@ class OptimalRecordSelector:
     strategy to minimize the number of records while maintaining accuracy.
     """
 
+    # Maximum acceptable gap between consecutive records of a combination (K)
+    MAX_GAP = 100.0
+
     def __init__(self, config: Optional[OptimizationConfig] = None):
         """Initialize the selector with configuration."""
         self.config = config or OptimizationConfig()
@@ -341,17 +344,36 @@ class OptimalRecordSelector:
         self, all_records: pd.DataFrame, phase: str, tmin: float, tmax: float
     ) -> List[Union[pd.Series, DatabaseRecord]]:
         """Find records that completely cover the given temperature range."""
-        covering = []
-
-        for _, record in all_records.iterrows():
-            if self._get_phase(record) == phase:
-                record_tmin = self._get_temp_min(record)
-                record_tmax = self._get_temp_max(record)
+        return [
+            record
+            for record in self._get_phase_records(all_records, phase, tmin, tmax)
+            if self._get_temp_min(record) <= tmin and self._get_temp_max(record) >= tmax
+        ]
 
-                if record_tmin <= tmin and record_tmax >= tmax:
-                    covering.append(record)
+    def _get_phase_records(
+        self, all_records: pd.DataFrame, phase: str, tmin: float, tmax: float
+    ) -> List[Union[pd.Series, DatabaseRecord]]:
+        """
+        Get records of the phase overlapping [tmin, tmax], in DataFrame order.
 
-        return covering
+        Filters with vectorized column masks when the standard columns are
+        present, so only matching rows are materialized as Series.
+        """
+        if {"Phase", "Tmin", "Tmax"}.issubset(all_records.columns):
+            mask = (
+                (all_records["Phase"] == phase)
+                & (all_records["Tmax"] >= tmin)
+                & (all_records["Tmin"] <= tmax)
+            )
+            return [record for _, record in all_records[mask].iterrows()]
+
+        return [
+            record
+            for _, record in all_records.iterrows()
+            if self._get_phase(record) == phase
+            and self._get_temp_max(record) >= tmin
+            and self._get_temp_min(record) <= tmax
+        ]
 
     def _filter_by_constraints(
         self,
@@ -548,112 +570,124 @@ class OptimalRecordSelector:
 
         Searches for records that:
         1. Cover the target range
-        2. Have gaps < 100K between consecutive records
-        3. Minimize total number of records
+        2. Have gaps < MAX_GAP between consecutive records
+        3. Minimize total number of records (best OptimizationScore)
         """
-        MAX_GAP = 100.0  # Maximum acceptable gap between records
-
-        # Get all relevant records for this phase
-        phase_records = []
-        for _, record in all_records.iterrows():
-            if self._get_phase(record) != group.phase:
-                continue
-
-            record_tmin = self._get_temp_min(record)
-            record_tmax = self._get_temp_max(record)
-
-            # Only consider records that overlap with our target range
-            if record_tmax >= group.tmin and record_tmin <= group.tmax:
-                phase_records.append(record)
-
+        phase_records = self._get_phase_records(
+            all_records, group.phase, group.tmin, group.tmax
+        )
         if not phase_records:
             return None
 
         # Sort by temperature
         phase_records.sort(key=lambda r: self._get_temp_min(r))
 
-        # Try to build optimal coverage using dynamic programming approach
-        best_combination = None
-        min_count = float("inf")
-
-        # Simple greedy approach: start from records that cover tmin
-        for start_record in phase_records:
-            start_tmin = self._get_temp_min(start_record)
-            start_tmax = self._get_temp_max(start_record)
+        candidates = self._filter_by_constraints(
+            phase_records, is_elemental, group.is_first_in_phase
+        )
+        if not candidates:
+            return None
 
-            # Must cover the start of range
-            if start_tmin > group.tmin + self.config.gap_tolerance_k:
-                continue
+        return self._find_min_record_cover(candidates, group.tmin, group.tmax)
 
-            # Try building combination starting from this record
-            combination = [start_record]
-            current_coverage = start_tmax
-
-            # Build coverage by selecting records with minimal gaps
-            while current_coverage < group.tmax - self.config.gap_tolerance_k:
-                # Find next best record with gap < MAX_GAP
-                next_record = None
-                min_gap = float("inf")
-                max_extension = 0
-
-                for record in phase_records:
-                    record_tmin = self._get_temp_min(record)
-                    record_tmax = self._get_temp_max(record)
-
-                    # Skip if already used
-                    if any(self._records_equal(record, r) for r in combination):
-                        continue
-
-                    # Calculate gap
-                    gap = record_tmin - current_coverage
-
-                    # Skip if gap is too large or record doesn't extend coverage
-                    if gap > MAX_GAP or record_tmax <= current_coverage:
-                        continue
-
-                    # Prefer records with smaller gaps and larger extensions
-                    extension = record_tmax - current_coverage
-                    if gap <= min_gap:
-                        if gap < min_gap or extension > max_extension:
-                            min_gap = gap
-                            max_extension = extension
-                            next_record = record
-
-                if next_record is not None:
-                    combination.append(next_record)
-                    current_coverage = self._get_temp_max(next_record)
-                else:
-                    # Can't continue this path
-                    break
-
-            # Check if this combination covers the full range
-            if current_coverage >= group.tmax - self.config.gap_tolerance_k:
-                # Validate constraints
-                valid_combination = self._filter_by_constraints(
-                    combination, is_elemental, group.is_first_in_phase
-                )
+    def _find_min_record_cover(
+        self,
+        records: List[Union[pd.Series, DatabaseRecord]],
+        range_min: float,
+        range_max: float,
+    ) -> Optional[List[Union[pd.Series, DatabaseRecord]]]:
+        """
+        Minimum-record interval cover of [range_min, range_max].
+
+        A chain starts with a record beginning within gap_tolerance_k of
+        range_min; each next record must start at most MAX_GAP after the
+        current coverage and extend it; the chain ends at the first record
+        reaching range_max - gap_tolerance_k.
+
+        Solved as a DP over chain length: layer k holds, for every record, the
+        minimal reliability sum of a k-record chain ending at it. Predecessors
+        of a record are the records with Tmax in [Tmin - MAX_GAP, Tmax), a
+        contiguous range in Tmax order, so each layer is one batch of range
+        minimum queries over a sparse table: O(n log n) per layer. Chains are
+        compared by OptimizationScore; layers stop once no longer chain can
+        beat the best score found.
+        """
+        tolerance = self.config.gap_tolerance_k
+        tmins = np.array([float(self._get_temp_min(r)) for r in records])
+        tmaxs = np.array([float(self._get_temp_max(r)) for r in records])
+        reliability = np.array([float(self._get_reliability_class(r)) for r in records])
+
+        starts = tmins <= range_min + tolerance
+        ends = tmaxs >= range_max - tolerance
+
+        by_tmax = np.argsort(tmaxs, kind="stable")
+        sorted_tmax = tmaxs[by_tmax]
+        pred_lo = np.searchsorted(sorted_tmax, tmins - self.MAX_GAP, side="left")
+        pred_hi = np.searchsorted(sorted_tmax, tmaxs, side="left")
+
+        w1, w2, _ = self.config.get_score_weights()
+        best_quality = (3.0 - reliability.min()) / 3.0
+
+        cost = np.where(starts, reliability, np.inf)
+        parents: List[np.ndarray] = []
+        best = None  # (score, chain length, last record)
+
+        for length in range(1, len(records) + 1):
+            finished = np.flatnonzero(ends & np.isfinite(cost))
+            if finished.size:
+                last = finished[np.argmin(cost[finished])]
+                score = OptimizationScore.calculate(
+                    length, cost[last] / length, 0.0, self.config
+                ).total_score
+                if best is None or score > best[0]:
+                    best = (score, length, last)
+
+            # A longer chain cannot beat the best score found
+            if best is not None and w1 / (length + 1) + w2 * best_quality <= best[0]:
+                break
 
-                if valid_combination and len(valid_combination) < min_count:
-                    min_count = len(valid_combination)
-                    best_combination = valid_combination
+            # Extend unfinished chains by one record
+            open_cost = np.where(ends, np.inf, cost)[by_tmax]
+            pred = self._range_argmin(open_cost, pred_lo, pred_hi)
+            has_pred = pred >= 0
+            cost = np.full(len(records), np.inf)
+            cost[has_pred] = reliability[has_pred] + open_cost[pred[has_pred]]
+            if not np.isfinite(cost).any():
+                break
+            parents.append(np.where(has_pred, by_tmax[pred], -1))
 
-        return best_combination
+        if best is None:
+            return None
 
-    def _records_equal(
-        self, r1: Union[pd.Series, DatabaseRecord], r2: Union[pd.Series, DatabaseRecord]
-    ) -> bool:
-        """Check if two records are the same."""
-        try:
-            rowid1 = r1.rowid if hasattr(r1, "rowid") else r1.get("rowid")
-            rowid2 = r2.rowid if hasattr(r2, "rowid") else r2.get("rowid")
-            return rowid1 == rowid2
-        except:
-            # Fallback: compare by temperature and phase
-            return (
-                self._get_temp_min(r1) == self._get_temp_min(r2)
-                and self._get_temp_max(r1) == self._get_temp_max(r2)
-                and self._get_phase(r1) == self._get_phase(r2)
-            )
+        _, length, last = best
+        chain = [last]
+        for layer in range(length - 2, -1, -1):
+            chain.append(parents[layer][chain[-1]])
+        return [records[i] for i in reversed(chain)]
+
+    @staticmethod
+    def _range_argmin(values: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        """Positions of the minimum of values on each [lo, hi) (-1 if empty)."""
+        n = len(values)
+        table = [np.arange(n)]
+        span = 1
+        while 2 * span <= n:
+            prev = table[-1]
+            left, right = prev[: n - 2 * span + 1], prev[span : n - span + 1]
+            table.append(np.where(values[right] < values[left], right, left))
+            span *= 2
+
+        result = np.full(len(lo), -1)
+        lengths = hi - lo
+        valid = lengths > 0
+        levels = np.zeros(len(lo), dtype=int)
+        levels[valid] = np.log2(lengths[valid]).astype(int)
+        for level in np.unique(levels[valid]):
+            mask = valid & (levels == level)
+            left = table[level][lo[mask]]
+            right = table[level][hi[mask] - (1 << level)]
+            result[mask] = np.where(values[right] < values[left], right, left)
+        return result
 
     def _ensure_phase_transition_coverage(
         self,
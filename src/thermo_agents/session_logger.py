@@ -134,6 +134,7 @@ class SessionLogger:
         model: str = "gpt-4-turbo",
         temperature: float = 0.0,
         max_tokens: int = 1000,
+        token_usage: Optional[Dict[str, int]] = None,
     ) -> None:
         """
         Логирование ответа от LLM.
@@ -144,6 +145,8 @@ class SessionLogger:
             model: Название модели LLM
             temperature: Температура модели
             max_tokens: Максимальное количество токенов
+            token_usage: Токены извлечения {requests, input_tokens,
+                cache_read_tokens, output_tokens} (опционально)
         """
         separator = "=" * 80
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
@@ -154,6 +157,14 @@ class SessionLogger:
         self._write(f"Model: {model}")
         self._write(f"Temperature: {temperature}")
         self._write(f"Max tokens: {max_tokens}")
+        # Токены (включая повторные вызовы модели при ошибках валидации)
+        if token_usage:
+            self._write(
+                f"Tokens: input {token_usage.get('input_tokens', 0)} "
+                f"(cached {token_usage.get('cache_read_tokens', 0)}), "
+                f"output {token_usage.get('output_tokens', 0)}, "
+                f"model calls {token_usage.get('requests', 0)}"
+            )
         self._write("")
 
         # Сырой JSON
@@ -3,21 +3,38 @@ Telegram Bot Integration for ThermoSystem
 
 Модуль интеграции Telegram бота с ThermoSystem v2.2.
 Обеспечивает умную обработку файлов и доставку результатов через Telegram API.
+
+Компоненты загружаются лениво (PEP 562): `from thermo_agents.telegram import
+TelegramBotConfig` не импортирует python-telegram-bot и оркестратор.
 """
 
-from .file_handler import TelegramFileHandler
-from .smart_response import SmartResponseHandler
-from .config import FileHandlerConfig, TelegramBotConfig
-from .metrics import FileSystemMetrics, MetricsCollector
+import importlib
+from typing import TYPE_CHECKING
+
+_LAZY_EXPORTS = {
+    # File Handling System
+    "TelegramFileHandler": ".file_handler",
+    "SmartResponseHandler": ".smart_response",
+    "FileHandlerConfig": ".config",
+    "TelegramBotConfig": ".config",
+    "FileSystemMetrics": ".metrics",
+    "MetricsCollector": ".metrics",
 
-# Legacy imports для обратной совместимости
-from .bot import ThermoSystemTelegramBot
-from .models import (
-    UserSession, BotCommand, BotResponse, FileResponse,
-    CommandStatus, MessageType, ProgressMessage
-)
-from .session_manager import SessionManager, RateLimiter
-from .thermo_adapter import ThermoAdapter, ResponseFormatter, FileGenerator
+    # Legacy components (для обратной совместимости)
+    "ThermoSystemTelegramBot": ".bot",
+    "UserSession": ".models",
+    "BotCommand": ".models",
+    "BotResponse": ".models",
+    "FileResponse": ".models",
+    "CommandStatus": ".models",
+    "MessageType": ".models",
+    "ProgressMessage": ".models",
+    "SessionManager": ".session_manager",
+    "RateLimiter": ".session_manager",
+    "ThermoAdapter": ".thermo_adapter",
+    "ResponseFormatter": ".thermo_adapter",
+    "FileGenerator": ".thermo_adapter",
+}
 
 __all__ = [
     # File Handling System (новые компоненты)
@@ -46,4 +63,31 @@ __all__ = [
     "FileGenerator",
 ]
 
-__version__ = "1.1.0"
\ No newline at end of file
+__version__ = "1.1.0"
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .file_handler import TelegramFileHandler
+    from .smart_response import SmartResponseHandler
+    from .config import FileHandlerConfig, TelegramBotConfig
+    from .metrics import FileSystemMetrics, MetricsCollector
+    from .bot import ThermoSystemTelegramBot
+    from .models import (
+        UserSession, BotCommand, BotResponse, FileResponse,
+        CommandStatus, MessageType, ProgressMessage
+    )
+    from .session_manager import SessionManager, RateLimiter
+    from .thermo_adapter import ThermoAdapter, ResponseFormatter, FileGenerator
@@ -143,11 +143,21 @@ class TelegramBotConfig:
     openrouter_api_key: str = ""
     llm_base_url: str = "https://openrouter.ai/api/v1"
     llm_model: str = "openai/gpt-4o"
+    # Запасная модель для дублирующих запросов (пусто — без дублирования)
+    llm_hedge_model: Optional[str] = None
 
     # Ограничения и файлы
     limits: BotLimits = field(default_factory=BotLimits)
     file_config: FileConfig = field(default_factory=FileConfig)
 
+    # Многопроцессный режим: 0 — расчеты в процессе бота
+    calc_workers: int = 0
+    result_cache_dir: Optional[Path] = None
+    query_log_path: Optional[Path] = None
+
+    # Снимки поисковых индексов БД
+    search_index_dir: Optional[Path] = None
+
     # Дополнительные настройки
     admin_user_id: Optional[int] = None
     log_bot_errors: bool = True
@@ -188,6 +198,7 @@ class TelegramBotConfig:
             openrouter_api_key=os.getenv("OPENROUTER_API_KEY", ""),
             llm_base_url=os.getenv("LLM_BASE_URL", "https://openrouter.ai/api/v1"),
             llm_model=os.getenv("LLM_DEFAULT_MODEL", "openai/gpt-4o"),
+            llm_hedge_model=os.getenv("LLM_HEDGE_MODEL") or None,
 
             limits=BotLimits(
                 max_concurrent_users=int(os.getenv("MAX_CONCURRENT_USERS", "20")),
@@ -204,6 +215,11 @@ class TelegramBotConfig:
                 temp_file_dir=Path(os.getenv("TEMP_FILE_DIR", "temp/telegram_files"))
             ),
 
+            calc_workers=int(os.getenv("CALC_WORKERS", "0")),
+            result_cache_dir=Path(os.getenv("RESULT_CACHE_DIR")) if os.getenv("RESULT_CACHE_DIR") else None,
+            query_log_path=Path(os.getenv("QUERY_LOG_PATH")) if os.getenv("QUERY_LOG_PATH") else None,
+            search_index_dir=Path(os.getenv("SEARCH_INDEX_DIR")) if os.getenv("SEARCH_INDEX_DIR") else None,
+
             admin_user_id=int(os.getenv("TELEGRAM_ADMIN_USER_ID")) if os.getenv("TELEGRAM_ADMIN_USER_ID") else None,
             log_bot_errors=os.getenv("LOG_BOT_ERRORS", "true").lower() == "true"
         )
@@ -238,6 +254,9 @@ class TelegramBotConfig:
         if self.limits.request_timeout_seconds < 10 or self.limits.request_timeout_seconds > 300:
             errors.append("REQUEST_TIMEOUT_SECONDS должен быть между 10 и 300")
 
+        if self.calc_workers < 0 or self.calc_workers > 64:
+            errors.append("CALC_WORKERS должен быть между 0 и 64")
+
         # Проверка файловой конфигурации
         if self.file_config.auto_file_threshold < 1000 or self.file_config.auto_file_threshold > 10000:
             errors.append("AUTO_FILE_THRESHOLD должен быть между 1000 и 10000")
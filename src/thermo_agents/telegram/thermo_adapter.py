@@ -16,6 +16,8 @@ from typing import Optional, Tuple, Union
 
 from ..orchestrator import ThermoOrchestrator, ThermoOrchestratorConfig
 from ..session_logger import SessionLogger
+from ..utils.resilience import Deadline
+from ..worker_pool import CalculationWorkerPool
 from .config import TelegramBotConfig
 from .models import BotResponse, CommandStatus, FileResponse, MessageType
 
@@ -28,6 +30,7 @@ class ThermoAdapter:
     def __init__(self, config: TelegramBotConfig):
         self.config = config
         self.orchestrator: Optional[ThermoOrchestrator] = None
+        self.calculation_pool: Optional[CalculationWorkerPool] = None
         self.response_formatter = ResponseFormatter()
         self.file_generator = FileGenerator(config.file_config)
 
@@ -39,15 +42,33 @@ class ThermoAdapter:
                 llm_api_key=self.config.openrouter_api_key,
                 llm_base_url=self.config.llm_base_url,
                 llm_model=self.config.llm_model,
+                llm_hedge_model=self.config.llm_hedge_model,
                 db_path=self.config.thermo_db_path,
                 max_retries=2,
                 timeout_seconds=self.config.limits.request_timeout_seconds,
+                query_log_path=self.config.query_log_path,
+                search_index_dir=self.config.search_index_dir,
             )
 
             # Создание оркестратора
             self.orchestrator = ThermoOrchestrator(thermo_config)
             logger.info("ThermoOrchestrator успешно инициализирован")
 
+            # Многопроцессный режим: расчеты выполняются в пуле процессов
+            if self.config.calc_workers > 0:
+                self.calculation_pool = CalculationWorkerPool(
+                    db_path=self.config.thermo_db_path,
+                    static_data_dir=thermo_config.static_data_dir,
+                    workers=self.config.calc_workers,
+                    cache_dir=self.config.result_cache_dir,
+                    search_index_dir=self.config.search_index_dir,
+                )
+                await self.calculation_pool.start()
+                self.orchestrator.calculation_pool = self.calculation_pool
+                logger.info(
+                    f"Пул расчетов запущен: {self.config.calc_workers} процессов"
+                )
+
         except Exception as e:
             logger.error(f"Ошибка инициализации ThermoOrchestrator: {e}")
             raise
@@ -68,13 +89,19 @@ class ThermoAdapter:
         if not self.orchestrator:
             raise RuntimeError("ThermoAdapter не инициализирован")
 
+        # Срок запроса: ограничивает попытки LLM внутри оркестратора
+        deadline = Deadline.after(self.config.limits.request_timeout_seconds)
+
         try:
             # Создаем логгер сессии для трассировки
             with SessionLogger() as session_logger:
                 session_logger.info(f"Processing query from user {user_id}: {query}")
 
                 # Выполняем запрос через ThermoOrchestrator
-                raw_response = await self.orchestrator.process_query(query)
+                raw_response = await asyncio.wait_for(
+                    self.orchestrator.process_query(query, deadline=deadline),
+                    timeout=deadline.remaining(),
+                )
                 session_logger.info("Query processed successfully")
 
                 # Определяем, нужно ли отправлять как файл
@@ -122,22 +149,42 @@ class ThermoAdapter:
         if not self.orchestrator:
             return {"status": "Не инициализирован"}
 
+        resilience = self.orchestrator.get_llm_resilience_stats()
+        breaker = resilience.get("breaker", {})
+        if breaker.get("state") == "open":
+            # Провайдер LLM деградировал: тестовый запрос был бы отклонен
+            return {
+                "status": f"LLM недоступна (повтор через {breaker.get('retry_after_s', 0):.0f} с)",
+                "last_check": datetime.now().isoformat(),
+                "llm_resilience": resilience,
+            }
+
         try:
             # Базовая проверка работоспособности
             test_query = "H2O"
+            deadline = Deadline.after(10.0)
             await asyncio.wait_for(
-                self.orchestrator.process_query(test_query), timeout=10.0
+                self.orchestrator.process_query(test_query, deadline=deadline),
+                timeout=deadline.remaining(),
             )
-            return {"status": "Работает", "last_check": datetime.now().isoformat()}
+            return {
+                "status": "Работает",
+                "last_check": datetime.now().isoformat(),
+                "llm_resilience": resilience,
+            }
         except Exception as e:
             return {
                 "status": f"Ошибка: {str(e)}",
                 "last_check": datetime.now().isoformat(),
+                "llm_resilience": resilience,
             }
 
     async def shutdown(self):
         """Завершение работы адаптера."""
         logger.info("ThermoAdapter shutting down")
+        if self.calculation_pool:
+            await self.calculation_pool.shutdown()
+            self.calculation_pool = None
 
 
 class ResponseFormatter:
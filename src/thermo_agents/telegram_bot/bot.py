@@ -11,7 +11,14 @@ import time
 from typing import Optional
 
 from telegram import Update
-from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters, ContextTypes
+from telegram.ext import (
+    Application,
+    CallbackQueryHandler,
+    CommandHandler as TelegramCommandHandler,
+    ContextTypes,
+    MessageHandler as TelegramMessageHandler,
+    filters,
+)
 
 from .config import TelegramBotConfig, BotStatus
 from .commands.command_handler import CommandHandler
@@ -20,10 +27,15 @@ from .handlers.message_handler import MessageHandler
 from .handlers.callback_handler import CallbackHandler
 from .managers.smart_response import SmartResponseHandler
 from .utils.session_manager import SessionManager
+from .utils.session_store import SessionStore
 from .utils.rate_limiter import RateLimiter
 from .utils.thermo_integration import ThermoIntegration
 from .utils.health_checker import HealthChecker
 from .utils.error_handler import TelegramBotErrorHandler
+from .utils.aiohttp_request import AiohttpRequest
+from .utils.webhook_server import WebhookServer
+from .models.security import MonitoringConfig
+from .monitoring import BotMetrics
 
 
 class ThermoSystemTelegramBot:
@@ -38,9 +50,12 @@ class ThermoSystemTelegramBot:
         self._setup_logging()
 
         # Инициализация базовых компонентов
-        self.session_manager = SessionManager(config)
+        self.session_store = SessionStore.from_config(config)
+        self.session_manager = SessionManager(config, self.session_store)
         self.rate_limiter = RateLimiter(config)
-        self.thermo_integration = ThermoIntegration(config)
+        # Метрики бота (объединенные запросы); здоровье проверяет HealthChecker
+        self.metrics = BotMetrics(MonitoringConfig(enable_health_checks=False))
+        self.thermo_integration = ThermoIntegration(config, metrics=self.metrics)
 
         # Инициализация продвинутых компонентов
         self.health_checker = HealthChecker(config, self.thermo_integration)
@@ -58,21 +73,27 @@ class ThermoSystemTelegramBot:
         )
 
         # Обработчики сообщений и callback'ов
-        self.message_handler = MessageHandler(
+        self.callback_handler = CallbackHandler(
             config,
             self.status,
             self.thermo_integration,
-            self.smart_response_handler
+            self.session_store
         )
-        self.callback_handler = CallbackHandler(
+        self.message_handler = MessageHandler(
             config,
             self.status,
-            self.thermo_integration
+            self.thermo_integration,
+            self.smart_response_handler,
+            self.callback_handler
         )
 
         # Запуск фонового мониторинга
         self._monitoring_task = None
 
+        # Webhook режим и ожидание остановки
+        self.webhook_server: Optional[WebhookServer] = None
+        self._stop_event = asyncio.Event()
+
     def _setup_logging(self) -> None:
         """Настройка логирования."""
         logging.basicConfig(
@@ -82,87 +103,17 @@ class ThermoSystemTelegramBot:
 
         self.logger = logging.getLogger(__name__)
 
-    async def start(self) -> None:
-        """Запуск бота."""
-        try:
-            self.logger.info("Запуск ThermoSystem Telegram Bot...")
-
-            # Валидация конфигурации
-            config_errors = self.config.validate_config()
-            if config_errors:
-                self.logger.error(f"Ошибки конфигурации: {config_errors}")
-                raise ValueError(f"Конфигурация неверна: {config_errors}")
-
-            # Проверка здоровья компонентов
-            health = await self.thermo_integration.health_check()
-            if health["status"] != "healthy":
-                self.logger.warning(f"Некоторые компоненты нездоровы: {health}")
-
-            # Создание приложения
-            self.application = Application.builder().token(self.config.bot_token).build()
-
-            # Регистрация обработчиков
-            self._register_handlers()
-
-            # Настройка graceful shutdown
-            self._setup_signal_handlers()
-
-            # Запуск фоновой очистки файлов
-            asyncio.create_task(self._periodic_cleanup())
-
-            # Обновление статуса
-            self.status.is_running = True
-            self.status.start_time = time.time()
-
-            self.logger.info("Бот успешно запущен!")
-
-            # Запуск polling
-            await self.application.run_polling(
-                allowed_updates=Update.ALL_TYPES,
-                timeout=self.config.bot_timeout_seconds
-            )
-
-        except Exception as e:
-            self.logger.error(f"Ошибка запуска бота: {e}")
-            self.status.is_running = False
-            raise
-
-    async def stop(self) -> None:
-        """Остановка бота."""
-        try:
-            self.logger.info("Остановка бота...")
-
-            # Обновление статуса
-            self.status.is_running = False
-
-            # Остановка приложения
-            if self.application:
-                await self.application.stop()
-                await self.application.shutdown()
-
-            # Очистка компонентов
-            await self.session_manager.shutdown()
-            await self.rate_limiter.cleanup()
-
-            # Очистка временных файлов
-            await self._cleanup_temp_files()
-
-            self.logger.info("Бот успешно остановлен.")
-
-        except Exception as e:
-            self.logger.error(f"Ошибка остановки бота: {e}")
-
     def _register_handlers(self) -> None:
         """Регистрация обработчиков команд и сообщений."""
         if not self.application:
             raise ValueError("Application не инициализирован")
 
         # Базовые команды
-        self.application.add_handler(CommandHandler("start", self._handle_start))
-        self.application.add_handler(CommandHandler("help", self._handle_help))
-        self.application.add_handler(CommandHandler("status", self._handle_status))
-        self.application.add_handler(CommandHandler("examples", self._handle_examples))
-        self.application.add_handler(CommandHandler("about", self._handle_about))
+        self.application.add_handler(TelegramCommandHandler("start", self._handle_start))
+        self.application.add_handler(TelegramCommandHandler("help", self._handle_help))
+        self.application.add_handler(TelegramCommandHandler("status", self._handle_status))
+        self.application.add_handler(TelegramCommandHandler("examples", self._handle_examples))
+        self.application.add_handler(TelegramCommandHandler("about", self._handle_about))
 
         # Административные команды (только для admin_user_id)
         if self.config.admin_user_id:
@@ -179,7 +130,7 @@ class ThermoSystemTelegramBot:
             ]
 
             for command, handler in admin_commands:
-                self.application.add_handler(CommandHandler(command, handler))
+                self.application.add_handler(TelegramCommandHandler(command, handler))
 
         # Callback запросы (inline кнопки)
         self.application.add_handler(
@@ -188,11 +139,11 @@ class ThermoSystemTelegramBot:
 
         # Текстовые сообщения
         self.application.add_handler(
-            MessageHandler(filters.TEXT & ~filters.COMMAND, self._handle_message)
+            TelegramMessageHandler(filters.TEXT & ~filters.COMMAND, self._handle_message)
         )
 
         # Неизвестные команды
-        self.application.add_handler(MessageHandler(filters.COMMAND, self._handle_unknown))
+        self.application.add_handler(TelegramMessageHandler(filters.COMMAND, self._handle_unknown))
 
         # Глобальный обработчик ошибок
         self.application.add_error_handler(self._handle_application_error)
@@ -425,10 +376,10 @@ class ThermoSystemTelegramBot:
     async def _handle_application_error(
         self,
         update: object,
-        context: ContextTypes.DEFAULT_TYPE,
-        error: Exception
+        context: ContextTypes.DEFAULT_TYPE
     ) -> None:
         """Глобальный обработчик ошибок приложения."""
+        error = context.error
         try:
             # Логирование через error handler
             await self.error_handler.handle_application_error(update, context, error)
@@ -439,12 +390,12 @@ class ThermoSystemTelegramBot:
 
     # Обновленный запуск с фоновым мониторингом
     async def start(self) -> None:
-        """Запуск бота с фоновым мониторингом."""
+        """Запуск бота (polling или webhook) с фоновым мониторингом."""
         try:
             self.logger.info("Запуск ThermoSystem Telegram Bot...")
 
             # Валидация конфигурации
-            config_errors = self.config.validate_config()
+            config_errors = self.config.validate()
             if config_errors:
                 self.logger.error(f"Ошибки конфигурации: {config_errors}")
                 raise ValueError(f"Конфигурация неверна: {config_errors}")
@@ -455,7 +406,7 @@ class ThermoSystemTelegramBot:
                 self.logger.warning(f"Некоторые компоненты нездоровы: {health}")
 
             # Создание приложения
-            self.application = Application.builder().token(self.config.bot_token).build()
+            self.application = self._build_application()
 
             # Регистрация обработчиков
             self._register_handlers()
@@ -468,23 +419,82 @@ class ThermoSystemTelegramBot:
                 self.health_checker.run_background_monitoring(interval_seconds=300)
             )
 
+            await self.application.initialize()
+            await self.application.start()
+
+            if self.config.mode == "webhook":
+                await self._start_webhook()
+            else:
+                await self.application.updater.start_polling(
+                    allowed_updates=Update.ALL_TYPES,
+                    timeout=self.config.bot_timeout_seconds
+                )
+
             # Обновление статуса
             self.status.is_running = True
             self.status.start_time = time.time()
 
-            self.logger.info("Бот успешно запущен с фоновым мониторингом!")
+            self.logger.info(f"Бот успешно запущен ({self.config.mode}) с фоновым мониторингом!")
 
-            # Запуск polling
-            await self.application.run_polling(
-                allowed_updates=Update.ALL_TYPES,
-                timeout=self.config.bot_timeout_seconds
-            )
+            # Ожидание остановки (stop() или сигнал)
+            await self._stop_event.wait()
 
         except Exception as e:
             self.logger.error(f"Ошибка запуска бота: {e}")
             self.status.is_running = False
             raise
 
+    def _build_application(self) -> Application:
+        """Создание Application с пулом keep-alive соединений на aiohttp."""
+        request = AiohttpRequest(
+            connection_pool_size=self.config.connection_pool_size,
+            read_timeout=self.config.request_timeout_seconds,
+            write_timeout=self.config.request_timeout_seconds,
+        )
+        builder = (
+            Application.builder()
+            .token(self.config.bot_token)
+            .base_url(self.config.bot_api_base_url)
+            .base_file_url(self.config.bot_api_base_file_url)
+            .request(request)
+            .concurrent_updates(self.config.max_concurrent_users)
+        )
+
+        if self.config.mode == "webhook":
+            # Обновления приходят через WebhookServer, Updater не нужен
+            builder = builder.updater(None)
+        else:
+            # Отдельное соединение для long-polling getUpdates
+            builder = builder.get_updates_request(
+                AiohttpRequest(
+                    connection_pool_size=1,
+                    read_timeout=self.config.bot_timeout_seconds + 5,
+                )
+            )
+
+        return builder.build()
+
+    async def _start_webhook(self) -> None:
+        """Запуск aiohttp webhook сервера и регистрация webhook в Bot API."""
+        self.webhook_server = WebhookServer(
+            self.application,
+            listen=self.config.webhook_listen,
+            port=self.config.webhook_port,
+            path=self.config.webhook_path,
+            secret_token=self.config.webhook_secret_token,
+            max_body_bytes=self.config.webhook_max_body_kb * 1024,
+            drain_timeout=self.config.shutdown_drain_seconds,
+        )
+        await self.webhook_server.start()
+
+        await self.application.bot.set_webhook(
+            url=self.config.webhook_url,
+            allowed_updates=Update.ALL_TYPES,
+            secret_token=self.config.webhook_secret_token,
+            max_connections=self.config.max_concurrent_users,
+            drop_pending_updates=True,
+        )
+
     # Улучшенная остановка с очисткой
     async def stop(self) -> None:
         """Остановка бота с полной очисткой ресурсов."""
@@ -502,9 +512,18 @@ class ThermoSystemTelegramBot:
                 except asyncio.CancelledError:
                     pass
 
+            # Прекращение приема обновлений: webhook сервер дообрабатывает
+            # принятые обновления (drain), polling останавливает getUpdates
+            if self.webhook_server:
+                await self.webhook_server.stop()
+                self.webhook_server = None
+            elif self.application and self.application.updater and self.application.updater.running:
+                await self.application.updater.stop()
+
             # Остановка приложения
             if self.application:
-                await self.application.stop()
+                if self.application.running:
+                    await self.application.stop()
                 await self.application.shutdown()
 
             # Очистка компонентов
@@ -520,4 +539,6 @@ class ThermoSystemTelegramBot:
             self.logger.info("Бот успешно остановлен с полной очисткой.")
 
         except Exception as e:
-            self.logger.error(f"Ошибка остановки бота: {e}")
\ No newline at end of file
+            self.logger.error(f"Ошибка остановки бота: {e}")
+        finally:
+            self._stop_event.set()
\ No newline at end of file
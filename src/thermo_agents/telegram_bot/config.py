@@ -7,6 +7,7 @@
 """
 
 import os
+import re
 from dataclasses import dataclass
 from typing import Optional, List
 from pathlib import Path
@@ -22,19 +23,49 @@ class TelegramBotConfig:
     bot_username: str
     webhook_url: Optional[str] = None
     mode: str = "polling"  # polling или webhook
+    bot_timeout_seconds: int = 10  # long-polling таймаут getUpdates
+
+    # Webhook сервер (aiohttp)
+    webhook_listen: str = "0.0.0.0"
+    webhook_port: int = 8443
+    webhook_path: str = "telegram"
+    webhook_secret_token: Optional[str] = None
+    webhook_max_body_kb: int = 1024
+    shutdown_drain_seconds: int = 10
+
+    # Исходящие запросы к Bot API
+    bot_api_base_url: str = "https://api.telegram.org/bot"
+    bot_api_base_file_url: str = "https://api.telegram.org/file/bot"
+    connection_pool_size: int = 16
 
     # Performance limits
     max_concurrent_users: int = 20
     request_timeout_seconds: int = 60
+    # Контроль допуска: предел одновременных запросов к ThermoSystem
+    # (подстраивается вниз по времени обслуживания) и очередь ожидания
+    max_concurrent_requests: int = 8
+    admission_queue_size: int = 64
+    admission_queue_per_user: int = 3
     message_max_length: int = 4000
     rate_limit_per_minute: int = 30
 
+    # Сессии и последние результаты пользователей: истечение по
+    # неактивности, бюджет памяти на тексты результатов (крупные и
+    # вытесненные сохраняются в result_spill_dir), SQLite (пусто — в памяти)
+    session_timeout_minutes: int = 60
+    session_store_path: Optional[str] = None
+    result_memory_budget_mb: int = 32
+    result_spill_dir: str = "temp/session_results"
+    result_spill_threshold_kb: int = 64
+
     # File handling
     enable_file_downloads: bool = True
     auto_file_threshold: int = 3000
     file_cleanup_hours: int = 24
     max_file_size_mb: int = 20
     temp_file_dir: str = "temp/telegram_files"
+    report_compression: str = "none"  # none, gzip, zip или auto
+    report_compress_threshold_kb: int = 512
 
     # Admin settings
     admin_user_id: Optional[int] = None
@@ -54,6 +85,18 @@ class TelegramBotConfig:
     db_path: str = "data/thermo_data.db"
     static_data_dir: str = "data/static_compounds"
 
+    # LLM
+    llm_api_key: str = ""
+    llm_base_url: str = "https://openrouter.ai/api/v1"
+    llm_model: str = "openai/gpt-4o"
+    # Запасная модель для дублирующих запросов (пусто — без дублирования)
+    llm_hedge_model: Optional[str] = None
+
+    # Rate limiting и логирование сессий
+    rate_limit_burst: int = 5
+    enable_session_logging: bool = True
+    session_log_dir: str = "logs/telegram_sessions"
+
     @classmethod
     def from_env(cls) -> 'TelegramBotConfig':
         """Создание конфигурации из переменных окружения"""
@@ -62,17 +105,40 @@ class TelegramBotConfig:
             bot_username=os.getenv("TELEGRAM_BOT_USERNAME", "ThermoCalcBot"),
             webhook_url=os.getenv("TELEGRAM_WEBHOOK_URL"),
             mode=os.getenv("TELEGRAM_MODE", "polling"),
+            bot_timeout_seconds=int(os.getenv("TELEGRAM_POLLING_TIMEOUT", "10")),
+
+            webhook_listen=os.getenv("TELEGRAM_WEBHOOK_LISTEN", "0.0.0.0"),
+            webhook_port=int(os.getenv("TELEGRAM_WEBHOOK_PORT", "8443")),
+            webhook_path=os.getenv("TELEGRAM_WEBHOOK_PATH", "telegram"),
+            webhook_secret_token=os.getenv("TELEGRAM_WEBHOOK_SECRET"),
+            webhook_max_body_kb=int(os.getenv("TELEGRAM_WEBHOOK_MAX_BODY_KB", "1024")),
+            shutdown_drain_seconds=int(os.getenv("SHUTDOWN_DRAIN_SECONDS", "10")),
+
+            bot_api_base_url=os.getenv("TELEGRAM_API_BASE_URL", "https://api.telegram.org/bot"),
+            bot_api_base_file_url=os.getenv("TELEGRAM_API_BASE_FILE_URL", "https://api.telegram.org/file/bot"),
+            connection_pool_size=int(os.getenv("TELEGRAM_CONNECTION_POOL_SIZE", "16")),
 
             max_concurrent_users=int(os.getenv("MAX_CONCURRENT_USERS", "20")),
             request_timeout_seconds=int(os.getenv("REQUEST_TIMEOUT_SECONDS", "60")),
+            max_concurrent_requests=int(os.getenv("MAX_CONCURRENT_REQUESTS", "8")),
+            admission_queue_size=int(os.getenv("ADMISSION_QUEUE_SIZE", "64")),
+            admission_queue_per_user=int(os.getenv("ADMISSION_QUEUE_PER_USER", "3")),
             message_max_length=int(os.getenv("MESSAGE_MAX_LENGTH", "4000")),
             rate_limit_per_minute=int(os.getenv("RATE_LIMIT_REQUESTS_PER_MINUTE", "30")),
 
+            session_timeout_minutes=int(os.getenv("SESSION_TIMEOUT_MINUTES", "60")),
+            session_store_path=os.getenv("SESSION_STORE_PATH") or None,
+            result_memory_budget_mb=int(os.getenv("RESULT_MEMORY_BUDGET_MB", "32")),
+            result_spill_dir=os.getenv("RESULT_SPILL_DIR", "temp/session_results"),
+            result_spill_threshold_kb=int(os.getenv("RESULT_SPILL_THRESHOLD_KB", "64")),
+
             enable_file_downloads=os.getenv("ENABLE_FILE_DOWNLOADS", "true").lower() == "true",
             auto_file_threshold=int(os.getenv("AUTO_FILE_THRESHOLD", "3000")),
             file_cleanup_hours=int(os.getenv("FILE_CLEANUP_HOURS", "24")),
             max_file_size_mb=int(os.getenv("MAX_FILE_SIZE_MB", "20")),
             temp_file_dir=os.getenv("TEMP_FILE_DIR", "temp/telegram_files"),
+            report_compression=os.getenv("REPORT_COMPRESSION", "none"),
+            report_compress_threshold_kb=int(os.getenv("REPORT_COMPRESS_THRESHOLD_KB", "512")),
 
             admin_user_id=int(os.getenv("TELEGRAM_ADMIN_USER_ID", "0")) if os.getenv("TELEGRAM_ADMIN_USER_ID") else None,
             log_errors_to_admin=os.getenv("LOG_BOT_ERRORS", "true").lower() == "true",
@@ -86,9 +152,40 @@ class TelegramBotConfig:
             log_responses=os.getenv("LOG_RESPONSES", "true").lower() == "true",
 
             db_path=os.getenv("DB_PATH", "data/thermo_data.db"),
-            static_data_dir=os.getenv("STATIC_DATA_DIR", "data/static_compounds")
+            static_data_dir=os.getenv("STATIC_DATA_DIR", "data/static_compounds"),
+
+            llm_api_key=os.getenv("OPENROUTER_API_KEY", ""),
+            llm_base_url=os.getenv("LLM_BASE_URL", "https://openrouter.ai/api/v1"),
+            llm_model=os.getenv("LLM_DEFAULT_MODEL", "openai/gpt-4o"),
+            llm_hedge_model=os.getenv("LLM_HEDGE_MODEL") or None,
+
+            rate_limit_burst=int(os.getenv("RATE_LIMIT_BURST", "5")),
+            enable_session_logging=os.getenv("ENABLE_SESSION_LOGGING", "true").lower() == "true",
+            session_log_dir=os.getenv("SESSION_LOG_DIR", "logs/telegram_sessions")
         )
 
+    # Имена, под которыми параметры используются компонентами бота
+
+    @property
+    def max_message_length(self) -> int:
+        return self.message_max_length
+
+    @property
+    def rate_limit_messages_per_minute(self) -> int:
+        return self.rate_limit_per_minute
+
+    @property
+    def response_format_threshold(self) -> int:
+        return self.auto_file_threshold
+
+    @property
+    def thermo_db_path(self) -> Path:
+        return Path(self.db_path)
+
+    @property
+    def thermo_static_data_dir(self) -> Path:
+        return Path(self.static_data_dir)
+
     def validate(self) -> List[str]:
         """Валидация конфигурации"""
         errors = []
@@ -108,6 +205,15 @@ class TelegramBotConfig:
         if self.mode == "webhook" and not self.webhook_url:
             errors.append("TELEGRAM_WEBHOOK_URL is required for webhook mode")
 
+        if self.webhook_secret_token and not re.fullmatch(r"[A-Za-z0-9_-]{1,256}", self.webhook_secret_token):
+            errors.append("TELEGRAM_WEBHOOK_SECRET must be 1-256 characters of A-Z, a-z, 0-9, _ and -")
+
+        if self.webhook_max_body_kb <= 0:
+            errors.append("TELEGRAM_WEBHOOK_MAX_BODY_KB must be positive")
+
+        if self.connection_pool_size <= 0:
+            errors.append("TELEGRAM_CONNECTION_POOL_SIZE must be positive")
+
         # Валидация лимитов
         if self.max_concurrent_users <= 0:
             errors.append("MAX_CONCURRENT_USERS must be positive")
@@ -115,9 +221,21 @@ class TelegramBotConfig:
         if self.request_timeout_seconds <= 0:
             errors.append("REQUEST_TIMEOUT_SECONDS must be positive")
 
+        if self.max_concurrent_requests <= 0:
+            errors.append("MAX_CONCURRENT_REQUESTS must be positive")
+
+        if self.admission_queue_size < 0 or self.admission_queue_per_user <= 0:
+            errors.append("ADMISSION_QUEUE_SIZE must be non-negative and ADMISSION_QUEUE_PER_USER positive")
+
         if self.message_max_length <= 0:
             errors.append("MESSAGE_MAX_LENGTH must be positive")
 
+        if self.session_timeout_minutes <= 0:
+            errors.append("SESSION_TIMEOUT_MINUTES must be positive")
+
+        if self.result_memory_budget_mb < 0 or self.result_spill_threshold_kb <= 0:
+            errors.append("RESULT_MEMORY_BUDGET_MB must be non-negative and RESULT_SPILL_THRESHOLD_KB positive")
+
         # Валидация файлов
         if self.auto_file_threshold <= 0:
             errors.append("AUTO_FILE_THRESHOLD must be positive")
@@ -125,6 +243,9 @@ class TelegramBotConfig:
         if self.max_file_size_mb <= 0:
             errors.append("MAX_FILE_SIZE_MB must be positive")
 
+        if self.report_compression not in ["none", "gzip", "zip", "auto"]:
+            errors.append("REPORT_COMPRESSION must be 'none', 'gzip', 'zip' or 'auto'")
+
         # Проверка путей
         db_file = Path(self.db_path)
         if not db_file.exists():
@@ -2,19 +2,27 @@
 Обработка файлов для детальных термодинамических отчетов.
 
 Поддерживает:
-- Генерацию TXT файлов с отчетами
-- Управление временными файлами
-- Автоматическую очистку
+- Потоковую генерацию TXT отчетов (без сборки одной большой строки)
+- Сжатие больших отчетов (gzip/zip)
+- Индекс временных файлов в памяти (O(1) статистика и очистка)
+- Отправку через InputFile из открытого дескриптора
 - Unicode нормализацию для Windows
 """
 
+import gzip
 import os
 import re
+import shutil
+import tempfile
+import threading
 import time
 import asyncio
+import zipfile
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
 import unicodedata
 
 from telegram import InputFile
@@ -23,17 +31,134 @@ from telegram.constants import ParseMode
 from ..config import TelegramBotConfig
 
 
+REPORT_COMPRESSION_MODES = ("none", "gzip", "zip", "auto")
+
+
+def _config_option(config: TelegramBotConfig, name: str, default):
+    """Значение опции конфигурации; default, если опция отсутствует или другого типа."""
+    value = getattr(config, name, default)
+    return value if isinstance(value, type(default)) else default
+
+
+class ReportSizeLimitExceeded(Exception):
+    """Отчет превысил максимальный размер файла."""
+
+
+class TempFileIndex:
+    """
+    Индекс временных файлов отчетов в памяти.
+
+    Хранит (размер, время создания) для каждого файла в порядке создания,
+    поэтому количество и суммарный размер доступны за O(1), а очистка
+    просматривает только устаревший префикс. Один индекс на директорию
+    разделяется всеми экземплярами FileHandler процесса.
+    """
+
+    _registry: Dict[Path, "TempFileIndex"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._total_size = 0
+        self._lock = threading.Lock()
+        self._scan()
+
+    @classmethod
+    def for_directory(cls, directory: Path) -> "TempFileIndex":
+        """Общий индекс для директории (создается один раз со сканированием)."""
+        key = directory.resolve()
+        with cls._registry_lock:
+            index = cls._registry.get(key)
+            if index is None:
+                index = cls(directory)
+                cls._registry[key] = index
+            return index
+
+    def _scan(self) -> None:
+        """Однократное сканирование директории при старте."""
+        found = []
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith("thermo_") and entry.is_file():
+                        stat = entry.stat()
+                        found.append((stat.st_mtime, entry.name, stat.st_size))
+        except FileNotFoundError:
+            return
+
+        for mtime, name, size in sorted(found):
+            self._entries[name] = (size, mtime)
+            self._total_size += size
+
+    def add(self, path: Path, size: int, created: Optional[float] = None) -> None:
+        with self._lock:
+            previous = self._entries.pop(path.name, None)
+            if previous:
+                self._total_size -= previous[0]
+            created = created if created is not None else time.time()
+            newest = next(reversed(self._entries.values()), None)
+            self._entries[path.name] = (size, created)
+            self._total_size += size
+            if newest is not None and created < newest[1]:
+                # Запись старее хвоста индекса: восстанавливаем порядок по времени
+                self._entries = OrderedDict(
+                    sorted(self._entries.items(), key=lambda item: item[1][1])
+                )
+
+    def discard(self, name: str) -> None:
+        with self._lock:
+            previous = self._entries.pop(name, None)
+            if previous:
+                self._total_size -= previous[0]
+
+    def get(self, name: str) -> Optional[Tuple[int, float]]:
+        with self._lock:
+            return self._entries.get(name)
+
+    def pop_expired(self, cutoff: float) -> List[str]:
+        """Извлечь из индекса имена файлов, созданных раньше ``cutoff``."""
+        expired = []
+        with self._lock:
+            while self._entries:
+                name, (size, created) = next(iter(self._entries.items()))
+                if created >= cutoff:
+                    break
+                self._entries.popitem(last=False)
+                self._total_size -= size
+                expired.append(name)
+        return expired
+
+    @property
+    def count(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_size(self) -> int:
+        return self._total_size
+
+
 class FileHandler:
     """Управление TXT файлами для Telegram бота."""
 
+    # Размер отчета, который держится в памяти до сброса на диск (auto-режим)
+    SPOOL_MAX_BYTES = 256 * 1024
+
     def __init__(self, config: TelegramBotConfig):
         self.config = config
-        self.temp_file_dir = config.temp_file_dir
+        self.temp_file_dir = Path(config.temp_file_dir)
         self.max_file_size_bytes = config.max_file_size_mb * 1024 * 1024
+        self.compression = _config_option(config, "report_compression", "none")
+        self.compress_threshold_bytes = (
+            _config_option(config, "report_compress_threshold_kb", 512) * 1024
+        )
 
         # Создание директории для временных файлов
         self.temp_file_dir.mkdir(parents=True, exist_ok=True)
 
+        # Общий индекс временных файлов директории
+        self.index = TempFileIndex.for_directory(self.temp_file_dir)
+
     def _sanitize_filename(self, filename: str) -> str:
         """Очистка имени файла для безопасного хранения."""
         # Unicode нормализация для Windows
@@ -72,103 +197,213 @@ class FileHandler:
         filename = f"thermo_{query_suffix}_{compound_str}_{timestamp}.txt"
         return self._sanitize_filename(filename)
 
-    async def create_txt_file(
+    async def create_report_file(
         self,
-        content: str,
+        chunks: Iterable[str],
         query_type: str,
         compounds: list[str],
-        title: str = "Термодинамический отчет"
+        title: str = "Термодинамический отчет",
+        compression: Optional[str] = None
     ) -> Tuple[Optional[Path], Optional[str]]:
         """
-        Создание TXT файла с термодинамическим отчетом.
+        Потоковое создание файла отчета из частей вывода форматтера.
+
+        Части пишутся по мере генерации в один поток (один переход
+        ``asyncio.to_thread``), полная строка отчета в памяти не собирается.
 
         Args:
-            content: Содержимое отчета
+            chunks: Итерируемые части отчета (например, генератор форматтера)
             query_type: Тип запроса (reaction, compound_data)
             compounds: Список соединений
             title: Заголовок отчета
+            compression: "none", "gzip", "zip" или "auto"
+                (по умолчанию — config.report_compression)
 
         Returns:
             Tuple[Path к файлу, ошибка]
         """
+        compression = compression or self.compression
+        if compression not in REPORT_COMPRESSION_MODES:
+            return None, f"Неизвестный режим сжатия: {compression}"
+
+        file_path = self.temp_file_dir / self._generate_filename(query_type, compounds)
+
         try:
-            # Проверка размера контента
-            content_size = len(content.encode('utf-8'))
-            if content_size > self.max_file_size_bytes:
-                return None, f"Размер отчета ({content_size / 1024 / 1024:.1f}MB) превышает лимит ({self.config.max_file_size_mb}MB)"
+            final_path, size = await asyncio.to_thread(
+                self._write_report, file_path, chunks, title, query_type, compression
+            )
+        except ReportSizeLimitExceeded as e:
+            return None, str(e)
+        except Exception as e:
+            return None, f"Ошибка создания файла: {str(e)}"
 
-            # Генерация имени файла
-            filename = self._generate_filename(query_type, compounds)
-            file_path = self.temp_file_dir / filename
+        self.index.add(final_path, size)
+        return final_path, None
 
-            # Форматирование контента с заголовком
-            formatted_content = self._format_report_content(content, title, query_type)
+    def _write_report(
+        self,
+        file_path: Path,
+        chunks: Iterable[str],
+        title: str,
+        query_type: str,
+        compression: str
+    ) -> Tuple[Path, int]:
+        """Синхронная запись отчета (выполняется в рабочем потоке)."""
+        parts = self._iter_report_parts(chunks, title, query_type)
+
+        if compression == "auto":
+            # Отчет сначала пишется в spooled-файл: маленькие остаются в памяти,
+            # большие сбрасываются на диск и сжимаются gzip при копировании
+            with tempfile.SpooledTemporaryFile(
+                max_size=self.SPOOL_MAX_BYTES, dir=self.temp_file_dir
+            ) as spool:
+                self._copy_limited(parts, spool)
+                size = spool.tell()
+                spool.seek(0)
+                if size > self.compress_threshold_bytes:
+                    target = file_path.with_name(file_path.name + ".gz")
+                    with gzip.open(target, "wb") as out:
+                        shutil.copyfileobj(spool, out)
+                else:
+                    target = file_path
+                    with open(target, "wb") as out:
+                        shutil.copyfileobj(spool, out)
+            return target, target.stat().st_size
+
+        if compression == "gzip":
+            target = file_path.with_name(file_path.name + ".gz")
+            opener = lambda: gzip.open(target, "wb")
+        elif compression == "zip":
+            target = file_path.with_suffix(".zip")
+            archive = zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED)
+            opener = lambda: archive.open(file_path.name, "w")
+        else:
+            target = file_path
+            opener = lambda: open(target, "wb")
 
-            # Сохранение файла
-            file = await asyncio.to_thread(open, file_path, 'w', encoding='utf-8')
+        try:
             try:
-                await asyncio.to_thread(file.write, formatted_content)
+                with opener() as out:
+                    self._copy_limited(parts, out)
             finally:
-                await asyncio.to_thread(file.close)
-
-            return file_path, None
-
-        except Exception as e:
-            return None, f"Ошибка создания файла: {str(e)}"
+                # Архив закрывается до удаления недописанного файла
+                if compression == "zip":
+                    archive.close()
+        except BaseException:
+            target.unlink(missing_ok=True)
+            raise
+
+        return target, target.stat().st_size
+
+    def _copy_limited(self, parts: Iterable[str], out) -> None:
+        """Запись частей в бинарный поток с контролем лимита размера."""
+        written = 0
+        for part in parts:
+            data = part.encode("utf-8")
+            written += len(data)
+            if written > self.max_file_size_bytes:
+                raise ReportSizeLimitExceeded(
+                    f"Размер отчета превышает лимит ({self.config.max_file_size_mb}MB)"
+                )
+            out.write(data)
 
-    def _format_report_content(self, content: str, title: str, query_type: str) -> str:
-        """Форматирование контента для TXT файла."""
-        separator = "=" * 60
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    async def create_txt_file(
+        self,
+        content: str,
+        query_type: str,
+        compounds: list[str],
+        title: str = "Термодинамический отчет"
+    ) -> Tuple[Optional[Path], Optional[str]]:
+        """
+        Создание TXT файла с термодинамическим отчетом.
 
-        formatted = f"""
-{separator}
-{title}
-{separator}
+        Args:
+            content: Содержимое отчета
+            query_type: Тип запроса (reaction, compound_data)
+            compounds: Список соединений
+            title: Заголовок отчета
 
-Сгенерировано: {timestamp}
-Тип расчета: {query_type}
-Источник: ThermoSystem v2.2
+        Returns:
+            Tuple[Path к файлу, ошибка]
+        """
+        # Проверка размера контента
+        content_size = len(content.encode('utf-8'))
+        if content_size > self.max_file_size_bytes:
+            return None, f"Размер отчета ({content_size / 1024 / 1024:.1f}MB) превышает лимит ({self.config.max_file_size_mb}MB)"
 
-{separator}
+        return await self.create_report_file([content], query_type, compounds, title)
 
-{content}
+    def _iter_report_parts(self, chunks: Iterable[str], title: str, query_type: str):
+        """Части TXT отчета: заголовок, содержимое по частям, подвал."""
+        separator = "=" * 60
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-{separator}
-© 2025 ThermoSystem Telegram Bot (@ThermoCalcBot)
-Отчет сгенерирован автоматически. Для проверки и исследований.
-"""
+        yield (
+            f"{separator}\n{title}\n{separator}\n\n"
+            f"Сгенерировано: {timestamp}\n"
+            f"Тип расчета: {query_type}\n"
+            f"Источник: ThermoSystem v2.2\n\n"
+            f"{separator}\n\n"
+        )
+
+        first = True
+        for chunk in chunks:
+            if not first:
+                yield "\n"
+            first = False
+            yield chunk
+
+        yield (
+            f"\n\n{separator}\n"
+            "© 2025 ThermoSystem Telegram Bot (@ThermoCalcBot)\n"
+            "Отчет сгенерирован автоматически. Для проверки и исследований."
+        )
 
-        return formatted.strip()
+    def _format_report_content(self, content: str, title: str, query_type: str) -> str:
+        """Форматирование контента для TXT файла."""
+        return "".join(self._iter_report_parts([content], title, query_type))
 
     async def cleanup_old_files(self) -> int:
         """Очистка старых временных файлов."""
         try:
-            cleaned_count = 0
             cutoff_time = datetime.now() - timedelta(hours=self.config.file_cleanup_hours)
 
-            for file_path in self.temp_file_dir.glob("thermo_*.txt"):
-                if file_path.is_file():
-                    file_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-                    if file_time < cutoff_time:
-                        await asyncio.to_thread(os.remove, file_path)
-                        cleaned_count += 1
+            # Индекс упорядочен по времени создания: берется только устаревший префикс
+            expired = self.index.pop_expired(cutoff_time.timestamp())
+            if not expired:
+                return 0
 
-            return cleaned_count
+            return await asyncio.to_thread(self._remove_files, expired)
 
         except Exception as e:
             print(f"Ошибка очистки файлов: {e}")
             return 0
 
+    def _remove_files(self, names: List[str]) -> int:
+        """Удаление файлов пачкой (в рабочем потоке)."""
+        removed = 0
+        for name in names:
+            try:
+                os.remove(self.temp_file_dir / name)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
     async def get_file_info(self, file_path: Path) -> dict:
         """Получение информации о файле."""
         try:
-            stat = file_path.stat()
+            entry = self.index.get(file_path.name)
+            if entry is not None and file_path.parent.resolve() == self.temp_file_dir.resolve():
+                size, created = entry
+            else:
+                stat = file_path.stat()
+                size, created = stat.st_size, stat.st_ctime
             return {
                 "name": file_path.name,
-                "size_bytes": stat.st_size,
-                "size_kb": round(stat.st_size / 1024, 2),
-                "created": datetime.fromtimestamp(stat.st_ctime).strftime("%Y-%m-%d %H:%M:%S"),
+                "size_bytes": size,
+                "size_kb": round(size / 1024, 2),
+                "created": datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M:%S"),
                 "exists": True
             }
         except Exception:
@@ -205,7 +440,7 @@ class FileHandler:
             if not file_path.exists():
                 return None
 
-            # Создание InputFile
+            # Создание InputFile (содержимое читается, дескриптор закрывается)
             file_handle = await asyncio.to_thread(open, file_path, 'rb')
             try:
                 input_file = InputFile(
@@ -214,28 +449,41 @@ class FileHandler:
                 )
                 return input_file
             except Exception as e:
-                await asyncio.to_thread(file_handle.close)
                 print(f"Ошибка создания InputFile: {e}")
                 return None
+            finally:
+                await asyncio.to_thread(file_handle.close)
 
         except Exception as e:
             print(f"Ошибка создания InputFile: {e}")
             return None
 
-    async def get_temp_files_count(self) -> int:
-        """Получение количества временных файлов."""
+    @asynccontextmanager
+    async def open_input_file(self, file_path: Path) -> AsyncIterator[Optional[InputFile]]:
+        """
+        InputFile, отправляемый из открытого дескриптора без чтения в память.
+
+        Дескриптор закрывается при выходе из контекста, т.е. после отправки:
+
+            async with file_handler.open_input_file(path) as input_file:
+                await message.reply_document(document=input_file)
+        """
         try:
-            return len(list(self.temp_file_dir.glob("thermo_*.txt")))
-        except Exception:
-            return 0
+            file_handle = await asyncio.to_thread(open, file_path, 'rb')
+        except OSError as e:
+            print(f"Ошибка создания InputFile: {e}")
+            yield None
+            return
 
-    async def get_total_temp_files_size(self) -> int:
-        """Получение общего размера временных файлов в байтах."""
         try:
-            total_size = 0
-            for file_path in self.temp_file_dir.glob("thermo_*.txt"):
-                if file_path.is_file():
-                    total_size += file_path.stat().st_size
-            return total_size
-        except Exception:
-            return 0
\ No newline at end of file
+            yield InputFile(file_handle, filename=file_path.name, read_file_handle=False)
+        finally:
+            await asyncio.to_thread(file_handle.close)
+
+    async def get_temp_files_count(self) -> int:
+        """Получение количества временных файлов (из индекса, O(1))."""
+        return self.index.count
+
+    async def get_total_temp_files_size(self) -> int:
+        """Получение общего размера временных файлов в байтах (из индекса, O(1))."""
+        return self.index.total_size
\ No newline at end of file
@@ -3,13 +3,26 @@
 
 Поддерживает интерактивные элементы:
 - Переключение между форматами вывода
-- Управление температурными диапазонами
+- Управление температурными диапазонами и шагом
 - Повторные расчёты с изменёнными параметрами
 - Получение детальной информации
+
+Изменение диапазона и шага пересчитывается по сохранённым параметрам
+последнего запроса и уже загруженным данным веществ, без повторного
+извлечения параметров через LLM.
+
+Последний запрос пользователя хранится в SessionStore (текст ответа —
+по хэшу с бюджетом памяти); загруженные данные веществ — в отдельном
+ограниченном кэше, при вытеснении догружаются при пересчёте.
+
+Для реакций рядом хранится структурированный результат (ReactionResult):
+кнопки формата (кратко, детально, CSV, файл) и повтор ответа строят
+представление из него без пересчёта и без LLM; представления запоминаются.
 """
 
 import asyncio
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
@@ -18,6 +31,25 @@ from telegram.constants import ParseMode
 from ..config import TelegramBotConfig, BotStatus
 from ..formatters.response_formatter import ResponseFormatter
 from ..utils.thermo_integration import ThermoIntegration
+from ..utils.session_store import SessionStore
+from ..utils.thermo_integration import ThermoResponse
+from ...formatting import ReactionResult
+from ...models.extraction import ExtractedReactionParameters
+
+# Пользователей, для которых хранятся загруженные данные веществ
+FRAMES_CACHE_LIMIT = 100
+
+# Границы расширения окна кнопкой range_expand, K
+EXPAND_LIMITS_K = (100.0, 6000.0)
+
+# Пользователей, для которых хранятся структурированные результаты реакций
+RESULTS_CACHE_LIMIT = 100
+
+# Представления ReactionResult, отправляемые документом: (файл, подпись)
+DOCUMENT_VIEWS = {
+    "csv": ("reaction_results.csv", "📑 Таблица результатов (CSV)"),
+    "file": ("reaction_report.txt", "📁 Отчёт по реакции"),
+}
 
 
 class CallbackHandler:
@@ -27,7 +59,8 @@ class CallbackHandler:
         self,
         config: TelegramBotConfig,
         status: BotStatus,
-        thermo_integration: ThermoIntegration
+        thermo_integration: ThermoIntegration,
+        session_store: Optional[SessionStore] = None
     ):
         self.config = config
         self.status = status
@@ -35,7 +68,10 @@ class CallbackHandler:
         self.response_formatter = ResponseFormatter(config)
 
         # История запросов для callback обработки
-        self.user_query_history: Dict[int, Dict[str, Any]] = {}
+        self.session_store = session_store if session_store is not None else SessionStore.from_config(config)
+        self.frames_cache: "OrderedDict[int, Dict[str, tuple]]" = OrderedDict()
+        self.records_cache: "OrderedDict[int, Dict[tuple, list]]" = OrderedDict()
+        self.results_cache: "OrderedDict[int, ReactionResult]" = OrderedDict()
 
     async def handle_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Основной обработчик callback запросов."""
@@ -61,6 +97,8 @@ class CallbackHandler:
                 await self._handle_format_callback(callback_query, user_id)
             elif callback_data.startswith("range_"):
                 await self._handle_range_callback(callback_query, user_id)
+            elif callback_data.startswith("step_"):
+                await self._handle_step_callback(callback_query, user_id)
             elif callback_data.startswith("info_"):
                 await self._handle_info_callback(callback_query, user_id)
             elif callback_data.startswith("repeat_"):
@@ -106,7 +144,7 @@ class CallbackHandler:
 
             if result.success:
                 # Сохранение в историю
-                self._save_query_to_history(user_id, query, result.content, result.query_type)
+                self.save_result(user_id, query, result)
 
                 # Форматирование и отправка результата
                 await self._send_calculation_result(
@@ -133,7 +171,7 @@ class CallbackHandler:
         format_type = data.replace("format_", "")
 
         # Получение последнего запроса из истории
-        last_query = self.user_query_history.get(user_id)
+        last_query = self.get_user_history(user_id)
         if not last_query:
             await callback_query.message.reply_text(
                 "❌ Нет предыдущих запросов для изменения формата",
@@ -144,13 +182,24 @@ class CallbackHandler:
         # Изменение формата и повторная отправка
         original_content = last_query["content"]
         query_type = last_query["query_type"]
+        result = last_query["result"]
+
+        if format_type in DOCUMENT_VIEWS:
+            await self._send_result_document(callback_query, result, format_type)
+            return
 
         if format_type == "compact":
             # Компактный формат
-            formatted_content = self._format_compact(original_content, query_type)
+            formatted_content = (
+                result.render("brief") if result is not None
+                else self._format_compact(original_content, query_type)
+            )
         elif format_type == "detailed":
             # Детальный формат
-            formatted_content = self._format_detailed(original_content, query_type)
+            formatted_content = (
+                result.render("detailed") if result is not None
+                else self._format_detailed(original_content, query_type)
+            )
         else:
             await self._send_callback_error(callback_query, "Неизвестный формат")
             return
@@ -167,7 +216,7 @@ class CallbackHandler:
         range_type = data.replace("range_", "")
 
         # Получение последнего запроса
-        last_query = self.user_query_history.get(user_id)
+        last_query = self.get_user_history(user_id)
         if not last_query:
             await callback_query.message.reply_text(
                 "❌ Нет предыдущих запросов для изменения диапазона",
@@ -189,6 +238,17 @@ class CallbackHandler:
             await self._send_callback_error(callback_query, "Неизвестный диапазон")
             return
 
+        # Пересчёт по сохранённым параметрам (без LLM)
+        params = last_query.get("params")
+        if params is not None:
+            new_range = self._modify_temperature_range(params.temperature_range_k, range_type)
+            await self._recalculate(
+                callback_query,
+                user_id,
+                params.model_copy(update={"temperature_range_k": new_range})
+            )
+            return
+
         # Модификация запроса
         modified_query = original_query + range_modifications[range_type]
 
@@ -206,7 +266,7 @@ class CallbackHandler:
 
             if result.success:
                 # Обновление истории
-                self._save_query_to_history(user_id, modified_query, result.content, result.query_type)
+                self.save_result(user_id, modified_query, result)
 
                 # Отправка нового результата
                 await self._send_calculation_result(
@@ -227,6 +287,112 @@ class CallbackHandler:
                 parse_mode="Markdown"
             )
 
+    async def _handle_step_callback(self, callback_query, user_id: int) -> None:
+        """Обработка callback для изменения шага по температуре (step_<K>)."""
+        data = callback_query.data
+
+        try:
+            step = int(data.replace("step_", ""))
+        except ValueError:
+            step = 0
+
+        if not 25 <= step <= 250:
+            await self._send_callback_error(callback_query, "Неизвестный шаг")
+            return
+
+        last_query = self.get_user_history(user_id)
+        if not last_query or last_query.get("params") is None:
+            await callback_query.message.reply_text(
+                "❌ Нет предыдущих запросов для изменения шага",
+                parse_mode="Markdown"
+            )
+            return
+
+        params = last_query["params"]
+        await self._recalculate(
+            callback_query,
+            user_id,
+            params.model_copy(update={"temperature_step_k": step})
+        )
+
+    @staticmethod
+    def _modify_temperature_range(
+        temperature_range_k: Tuple[float, float],
+        range_type: str
+    ) -> Tuple[float, float]:
+        """
+        Новый температурный диапазон для кнопки range_<type>.
+
+        temperature_range_k — окно показанной таблицы; expand расширяет его
+        на половину ширины в обе стороны в пределах EXPAND_LIMITS_K.
+        """
+        tmin, tmax = temperature_range_k
+
+        if range_type == "expand":
+            half_width = (tmax - tmin) / 2
+            low, high = EXPAND_LIMITS_K
+            return (
+                min(tmin, max(tmin - half_width, low)),
+                max(tmax, min(tmax + half_width, high)),
+            )
+        if range_type == "shrink":
+            center = (tmin + tmax) / 2
+            return (max(center - 100.0, 0.0), center + 100.0)
+        if range_type == "low":
+            return (100.0, 400.0)
+        return (1000.0, 2000.0)
+
+    async def _recalculate(
+        self,
+        callback_query,
+        user_id: int,
+        params: ExtractedReactionParameters
+    ) -> None:
+        """
+        Пересчёт последнего запроса с новыми параметрами без обращения к LLM.
+
+        Данные веществ берутся из истории пользователя (загружаются только
+        отсутствующие), заново выполняются отбор записей и расчёт.
+        """
+        last_query = self.get_user_history(user_id)
+        frames = last_query["frames"]
+        records_cache = last_query["records_cache"]
+
+        try:
+            result = await self.thermo_integration.recalculate(
+                params, frames, user_id, records_cache
+            )
+
+            if result.success:
+                self._save_query_to_history(
+                    user_id,
+                    last_query["query"],
+                    result.content,
+                    result.query_type,
+                    params=params,
+                    frames=frames,
+                    records_cache=records_cache,
+                    result=result.reaction_result
+                    if isinstance(result.reaction_result, ReactionResult) else None
+                )
+
+                await self._send_calculation_result(
+                    callback_query.message,
+                    result.content,
+                    result.query_type
+                )
+            else:
+                await callback_query.message.reply_text(
+                    f"❌ *Ошибка пересчёта:* {result.error}",
+                    parse_mode="Markdown"
+                )
+
+        except Exception as e:
+            await callback_query.message.reply_text(
+                f"❌ *Ошибка:* {str(e)}",
+                parse_mode="Markdown"
+            )
+
     async def _handle_info_callback(self, callback_query, user_id: int) -> None:
         """Обработка callback для получения дополнительной информации."""
         data = callback_query.data
@@ -272,8 +438,13 @@ H2O, CO2, NH3, Fe2O3, Al2O3
         )
 
     async def _handle_repeat_callback(self, callback_query, user_id: int) -> None:
-        """Обработка callback для повторения последнего запроса."""
-        last_query = self.user_query_history.get(user_id)
+        """
+        Обработка callback для повторения последнего запроса.
+
+        Сохранённый ответ отправляется заново без обработки; запрос
+        выполняется повторно, только если текст ответа не сохранился.
+        """
+        last_query = self.get_user_history(user_id)
         if not last_query:
             await callback_query.message.reply_text(
                 "❌ Нет предыдущих запросов для повтора",
@@ -281,6 +452,16 @@ H2O, CO2, NH3, Fe2O3, Al2O3
             )
             return
 
+        result = last_query["result"]
+        content = result.render("full") if result is not None else last_query["content"]
+        if content:
+            await self._send_calculation_result(
+                callback_query.message,
+                content,
+                last_query["query_type"]
+            )
+            return
+
         # Отправка сообщения о повторении
         processing_msg = await callback_query.message.reply_text(
             "🔄 *Повторяю последний запрос...*",
@@ -313,6 +494,27 @@ H2O, CO2, NH3, Fe2O3, Al2O3
                 parse_mode="Markdown"
             )
 
+    async def _send_result_document(
+        self,
+        callback_query,
+        result: Optional[ReactionResult],
+        view: str
+    ) -> None:
+        """Отправка представления результата реакции (CSV или отчёт) документом."""
+        if result is None:
+            await callback_query.message.reply_text(
+                "❌ Экспорт доступен только для расчёта реакции",
+                parse_mode="Markdown"
+            )
+            return
+
+        filename, caption = DOCUMENT_VIEWS[view]
+        await callback_query.message.reply_document(
+            document=result.render(view).encode("utf-8"),
+            filename=filename,
+            caption=f"{caption}: {result.params.balanced_equation}"
+        )
+
     async def _handle_unknown_callback(self, callback_query) -> None:
         """Обработка неизвестных callback запросов."""
         await callback_query.message.reply_text(
@@ -331,20 +533,61 @@ H2O, CO2, NH3, Fe2O3, Al2O3
         except Exception:
             pass  # Игнорируем ошибки при отправке сообщения об ошибке
 
-    def _save_query_to_history(self, user_id: int, query: str, content: str, query_type: str) -> None:
-        """Сохранение запроса в историю пользователя."""
-        self.user_query_history[user_id] = {
-            "query": query,
-            "content": content,
-            "query_type": query_type,
-            "timestamp": asyncio.get_event_loop().time()
-        }
+    def _save_query_to_history(
+        self,
+        user_id: int,
+        query: str,
+        content: str,
+        query_type: str,
+        params: Optional[ExtractedReactionParameters] = None,
+        frames: Optional[Dict[str, tuple]] = None,
+        result: Optional[ReactionResult] = None,
+        records_cache: Optional[Dict[tuple, list]] = None
+    ) -> None:
+        """
+        Сохранение запроса в историю пользователя.
 
-        # Ограничение размера истории
-        if len(self.user_query_history) > 100:
-            oldest_user = min(self.user_query_history.keys(),
-                            key=lambda uid: self.user_query_history[uid]["timestamp"])
-            del self.user_query_history[oldest_user]
+        Вместе с ответом сохраняются извлечённые параметры, кэш загруженных
+        данных веществ (frames) и отобранных записей (records_cache) для
+        пересчёта кнопками диапазона и шага, а для реакций —
+        структурированный результат для смены формата.
+        """
+        self.session_store.save_history(user_id, query, content, query_type, params)
+
+        self._remember(self.frames_cache, user_id, frames if frames is not None else {})
+        self._remember(
+            self.records_cache, user_id, records_cache if records_cache is not None else {}
+        )
+
+        if result is None:
+            self.results_cache.pop(user_id, None)
+            return
+        self._remember(self.results_cache, user_id, result, RESULTS_CACHE_LIMIT)
+
+    @staticmethod
+    def _remember(
+        cache: OrderedDict, user_id: int, value: Any, limit: int = FRAMES_CACHE_LIMIT
+    ) -> None:
+        """Сохранение значения пользователя в LRU-кэш на limit пользователей."""
+        cache[user_id] = value
+        cache.move_to_end(user_id)
+        if len(cache) > limit:
+            cache.popitem(last=False)
+
+    def save_result(self, user_id: int, query: str, response: ThermoResponse) -> None:
+        """Сохранение успешного ответа ThermoIntegration в историю пользователя."""
+        result = response.reaction_result
+        self._save_query_to_history(
+            user_id,
+            query,
+            response.content,
+            response.query_type,
+            params=response.params,
+            frames=dict(response.frames) if isinstance(response.frames, dict) else None,
+            result=result if isinstance(result, ReactionResult) else None,
+            records_cache=dict(response.records_cache)
+            if isinstance(response.records_cache, dict) else None
+        )
 
     async def _send_calculation_result(self, message, content: str, query_type: str) -> None:
         """Отправка результата расчёта с интерактивными кнопками."""
@@ -389,6 +632,14 @@ H2O, CO2, NH3, Fe2O3, Al2O3
         ]
         keyboard.append(format_row)
 
+        # Экспорт результата реакции
+        if query_type != "compound_data":
+            export_row = [
+                InlineKeyboardButton("📑 CSV", callback_data="format_csv"),
+                InlineKeyboardButton("📁 Файл", callback_data="format_file")
+            ]
+            keyboard.append(export_row)
+
         # Кнопки диапазонов
         if query_type in ["reaction", "compound_data"]:
             range_row = [
@@ -397,6 +648,12 @@ H2O, CO2, NH3, Fe2O3, Al2O3
             ]
             keyboard.append(range_row)
 
+            step_row = [
+                InlineKeyboardButton("🔍 Шаг 50K", callback_data="step_50"),
+                InlineKeyboardButton("📏 Шаг 250K", callback_data="step_250")
+            ]
+            keyboard.append(step_row)
+
         # Кнопки информации
         info_row = [
             InlineKeyboardButton("ℹ️ ThermoSystem", callback_data="info_thermo"),
@@ -448,11 +705,38 @@ H2O, CO2, NH3, Fe2O3, Al2O3
 
     def get_user_history(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Получение истории запросов пользователя."""
-        return self.user_query_history.get(user_id)
+        record = self.session_store.get_history(user_id)
+        if record is None:
+            return None
+
+        frames = self.frames_cache.get(user_id)
+        if frames is None:
+            frames = {}
+        self._remember(self.frames_cache, user_id, frames)
+
+        records_cache = self.records_cache.get(user_id)
+        if records_cache is None:
+            records_cache = {}
+        self._remember(self.records_cache, user_id, records_cache)
+
+        result = self.results_cache.get(user_id)
+        if result is not None:
+            self.results_cache.move_to_end(user_id)
+
+        return {
+            "query": record.query,
+            "content": self.session_store.get_content(record),
+            "query_type": record.query_type,
+            "params": record.params,
+            "frames": frames,
+            "records_cache": records_cache,
+            "result": result,
+            "timestamp": record.timestamp
+        }
 
     def clear_user_history(self, user_id: int) -> bool:
         """Очистка истории пользователя."""
-        if user_id in self.user_query_history:
-            del self.user_query_history[user_id]
-            return True
-        return False
\ No newline at end of file
+        self.frames_cache.pop(user_id, None)
+        self.records_cache.pop(user_id, None)
+        self.results_cache.pop(user_id, None)
+        return self.session_store.clear_history(user_id)
\ No newline at end of file
@@ -7,7 +7,7 @@
 import time
 import asyncio
 import logging
-from typing import Optional, Tuple
+from typing import Callable, Iterable, Optional, Tuple
 
 from telegram import Update, Message
 from telegram.ext import ContextTypes
@@ -18,6 +18,7 @@ from ..formatters.response_formatter import ResponseFormatter
 from ..formatters.file_handler import FileHandler
 from ..utils.thermo_integration import ThermoIntegration
 from ..managers.smart_response import SmartResponseHandler
+from .callback_handler import CallbackHandler
 
 
 class MessageHandler:
@@ -28,12 +29,15 @@ class MessageHandler:
         config: TelegramBotConfig,
         status: BotStatus,
         thermo_integration: ThermoIntegration,
-        smart_response_handler: SmartResponseHandler = None
+        smart_response_handler: SmartResponseHandler = None,
+        callback_handler: Optional[CallbackHandler] = None
     ):
         self.config = config
         self.status = status
         self.thermo_integration = thermo_integration
         self.smart_response_handler = smart_response_handler
+        # История запросов для кнопок формата, диапазона и повтора
+        self.callback_handler = callback_handler
         self.response_formatter = ResponseFormatter(config)
         self.file_handler = FileHandler(config)
         self.logger = logging.getLogger(__name__)
@@ -60,14 +64,26 @@ class MessageHandler:
                 parse_mode="Markdown"
             )
 
+            async def notify_queued(estimated_wait_s: float) -> None:
+                await processing_message.edit_text(
+                    f"⏳ *Запрос в очереди*, ориентировочное ожидание ~{max(1, round(estimated_wait_s))} с",
+                    parse_mode="Markdown"
+                )
+
             # Обработка запроса через ThermoSystem
-            response_data = await self._process_thermo_query(query_text, user_id)
+            response_data = await self._process_thermo_query(
+                query_text, user_id, on_queued=notify_queued
+            )
 
             # Удаление индикатора обработки
             await processing_message.delete()
 
             # Отправка результата
             if response_data["success"]:
+                if self.callback_handler is not None:
+                    self.callback_handler.save_result(
+                        user_id, query_text, response_data["response"]
+                    )
                 await self._send_successful_response(message, response_data)
                 self.status.successful_requests += 1
             else:
@@ -94,11 +110,20 @@ class MessageHandler:
                 self.status.total_requests
             )
 
-    async def _process_thermo_query(self, query: str, user_id: int) -> dict:
+    async def _process_thermo_query(self, query: str, user_id: int, on_queued=None) -> dict:
         """Обработка термодинамического запроса."""
         try:
             # Вызов ThermoOrchestrator через интеграцию
-            result = await self.thermo_integration.process_query(query, user_id)
+            result = await self.thermo_integration.process_query(
+                query, user_id, on_queued=on_queued
+            )
+
+            # Отказ (перегрузка, таймаут) передается пользователю как ошибка
+            if result.success is False:
+                return {
+                    "success": False,
+                    "error": result.error
+                }
 
             return {
                 "success": True,
@@ -107,6 +132,7 @@ class MessageHandler:
                 "compounds": result.compounds,
                 "processing_time_ms": result.processing_time_ms,
                 "has_large_tables": result.has_large_tables,
+                "response": result,
             }
 
         except Exception as e:
@@ -121,6 +147,12 @@ class MessageHandler:
         query_type = response_data["query_type"]
         user_query = response_data.get("user_query", "")
 
+        # Для реакции файл отчета пишется по частям из форматтера (новый
+        # итератор на каждую попытку отправки)
+        response = response_data.get("response")
+        result = getattr(response, "reaction_result", None)
+        sections = result.iter_sections if result is not None else None
+
         # Использование Smart Response Handler если доступен
         if self.smart_response_handler:
             try:
@@ -133,7 +165,8 @@ class MessageHandler:
                     context=context,
                     content=content,
                     query_type=query_type,
-                    user_query=user_query
+                    user_query=user_query,
+                    chunks=sections() if sections is not None else None
                 )
 
                 # Логирование результата доставки
@@ -149,27 +182,33 @@ class MessageHandler:
                         f"Smart response failed: {result.get('error', 'unknown error')}"
                     )
                     # Fallback на старый метод
-                    await self._fallback_send_response(message, content, query_type)
+                    await self._fallback_send_response(message, content, query_type, sections)
 
                 return
 
             except Exception as e:
                 self.logger.error(f"Smart response handler error: {e}")
                 # Fallback на старый метод
-                await self._fallback_send_response(message, content, query_type)
+                await self._fallback_send_response(message, content, query_type, sections)
                 return
 
         # Fallback на старый метод если SmartResponseHandler недоступен
-        await self._fallback_send_response(message, content, query_type)
+        await self._fallback_send_response(message, content, query_type, sections)
 
-    async def _fallback_send_response(self, message: Message, content: str, query_type: str) -> None:
+    async def _fallback_send_response(
+        self,
+        message: Message,
+        content: str,
+        query_type: str,
+        sections: Optional[Callable[[], Iterable[str]]] = None
+    ) -> None:
         """Fallback метод отправки ответа."""
         try:
             # Определение способа отправки через file handler
             should_send_file = self.file_handler.should_send_as_file(content)
 
             if should_send_file:
-                await self._send_file_response(message, content, query_type, [])
+                await self._send_file_response(message, content, query_type, [], sections)
             else:
                 await self._send_text_response(message, content, query_type)
 
@@ -222,13 +261,19 @@ class MessageHandler:
         message: Message,
         content: str,
         query_type: str,
-        compounds: list[str]
+        compounds: list[str],
+        sections: Optional[Callable[[], Iterable[str]]] = None
     ) -> None:
-        """Отправка ответа в виде файла."""
+        """
+        Отправка ответа в виде файла.
+
+        Если передан источник частей ответа (ReactionResult.iter_sections),
+        файл пишется потоково из них, иначе из готового текста.
+        """
         try:
             # Создание TXT файла
-            file_path, error = await self.file_handler.create_txt_file(
-                content,
+            file_path, error = await self.file_handler.create_report_file(
+                sections() if sections is not None else [content],
                 query_type,
                 compounds,
                 title="Термодинамический отчет"
@@ -239,21 +284,20 @@ class MessageHandler:
                 await self._send_text_response(message, content, query_type)
                 return
 
-            # Создание InputFile
-            input_file = await self.file_handler.create_input_file(file_path)
-            if not input_file:
-                await self._send_text_response(message, content, query_type)
-                return
-
             # Форматирование краткого сообщения
             brief_content = self._create_brief_summary(content, query_type, file_path)
 
-            # Отправка файла с кратким описанием
-            await message.reply_document(
-                document=input_file,
-                caption=brief_content,
-                parse_mode="Markdown"
-            )
+            # Отправка файла из открытого дескриптора
+            async with self.file_handler.open_input_file(file_path) as input_file:
+                if not input_file:
+                    await self._send_text_response(message, content, query_type)
+                    return
+
+                await message.reply_document(
+                    document=input_file,
+                    caption=brief_content,
+                    parse_mode="Markdown"
+                )
 
         except Exception as e:
             # Fallback при ошибке отправки файла
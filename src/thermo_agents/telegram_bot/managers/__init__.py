@@ -6,8 +6,8 @@
 - SmartResponse: умная система ответов
 """
 
-from .session_manager import SessionManager
-from .rate_limiter import RateLimiter
+from ..utils.session_manager import SessionManager
+from ..utils.rate_limiter import RateLimiter
 from .smart_response import SmartResponseHandler
 
 __all__ = [
@@ -10,7 +10,7 @@
 
 import asyncio
 import time
-from typing import Tuple, Optional, List, Dict, Any
+from typing import Tuple, Optional, Iterable, List, Dict, Any
 from dataclasses import dataclass
 
 from telegram import Update, Message, InputFile
@@ -69,7 +69,8 @@ class SmartResponseHandler:
         context: ContextTypes.DEFAULT_TYPE,
         content: str,
         query_type: str = "calculation",
-        user_query: str = ""
+        user_query: str = "",
+        chunks: Optional[Iterable[str]] = None
     ) -> Dict[str, Any]:
         """
         Основной метод отправки умного ответа.
@@ -80,6 +81,8 @@ class SmartResponseHandler:
             content: Контент ответа
             query_type: Тип запроса
             user_query: Оригинальный запрос пользователя
+            chunks: Части ответа для потоковой записи файла
+                (ReactionResult.iter_sections); по умолчанию — content
 
         Returns:
             Словарь с результатом отправки
@@ -100,7 +103,7 @@ class SmartResponseHandler:
                 )
             elif delivery_plan.method == "file":
                 result = await self._send_as_file(
-                    update, context, content, query_type, user_query, delivery_plan
+                    update, context, content, query_type, user_query, delivery_plan, chunks
                 )
             elif delivery_plan.method == "split":
                 result = await self._send_split_messages(
@@ -241,16 +244,17 @@ class SmartResponseHandler:
         content: str,
         query_type: str,
         user_query: str,
-        delivery_plan: DeliveryPlan
+        delivery_plan: DeliveryPlan,
+        chunks: Optional[Iterable[str]] = None
     ) -> Dict[str, Any]:
-        """Отправка ответа как файла."""
+        """Отправка ответа как файла (потоково из chunks, если переданы)."""
         try:
             # Извлечение соединений для имени файла
             compounds = self._extract_compounds_from_query(user_query) if user_query else []
 
             # Создание файла
-            file_path, error = await self.file_handler.create_txt_file(
-                content,
+            file_path, error = await self.file_handler.create_report_file(
+                chunks if chunks is not None else [content],
                 query_type,
                 compounds,
                 title=f"ThermoSystem Report - {query_type.title()}"
@@ -259,26 +263,19 @@ class SmartResponseHandler:
             if error or not file_path:
                 raise Exception(f"Ошибка создания файла: {error}")
 
-            # Создание InputFile
-            input_file = await self.file_handler.create_input_file(file_path)
-            if not input_file:
-                raise Exception("Ошибка создания InputFile")
-
             # Создание краткого описания
             caption = self._create_file_caption(content, query_type, delivery_plan)
 
-            # Отправка файла
-            message = await update.message.reply_document(
-                document=input_file,
-                caption=caption,
-                parse_mode="Markdown"
-            )
+            # Отправка файла из открытого дескриптора (закрывается после отправки)
+            async with self.file_handler.open_input_file(file_path) as input_file:
+                if not input_file:
+                    raise Exception("Ошибка создания InputFile")
 
-            # Закрытие файла
-            try:
-                input_file.file_object.close()
-            except:
-                pass
+                message = await update.message.reply_document(
+                    document=input_file,
+                    caption=caption,
+                    parse_mode="Markdown"
+                )
 
             # Получение информации о файле
             file_info = await self.file_handler.get_file_info(file_path)
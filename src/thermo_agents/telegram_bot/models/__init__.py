@@ -0,0 +1,31 @@
+"""
+Модели безопасности и мониторинга Telegram бота.
+"""
+
+from .security import (
+    ValidationResult,
+    SecurityContext,
+    ErrorCategory,
+    SecurityMetrics,
+    BotPerformanceMetrics,
+    HealthCheckResult,
+    AlertData,
+    UserActivity,
+    QueryStatistics,
+    SecurityConfig,
+    MonitoringConfig,
+)
+
+__all__ = [
+    "ValidationResult",
+    "SecurityContext",
+    "ErrorCategory",
+    "SecurityMetrics",
+    "BotPerformanceMetrics",
+    "HealthCheckResult",
+    "AlertData",
+    "UserActivity",
+    "QueryStatistics",
+    "SecurityConfig",
+    "MonitoringConfig",
+]
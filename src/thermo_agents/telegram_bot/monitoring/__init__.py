@@ -0,0 +1,20 @@
+"""
+Метрики Telegram бота.
+
+- BotMetrics: сбор метрик производительности и активности
+- RequestMetrics: метрики отдельного запроса
+- Потоковые сводки с ограниченной памятью (скетчи, top-k, t-digest)
+"""
+
+from .bot_metrics import BotMetrics, RequestMetrics
+from .streaming_stats import CountMinSketch, SpaceSavingTopK, TDigest, HyperLogLog, TimeBucketedRollup
+
+__all__ = [
+    "BotMetrics",
+    "RequestMetrics",
+    "CountMinSketch",
+    "SpaceSavingTopK",
+    "TDigest",
+    "HyperLogLog",
+    "TimeBucketedRollup",
+]
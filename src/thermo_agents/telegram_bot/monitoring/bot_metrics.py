@@ -0,0 +1,518 @@
+"""
+Bot metrics collection and performance monitoring.
+
+This module provides comprehensive metrics collection for the Telegram bot
+including performance statistics, user activity tracking, and system health.
+"""
+
+import time
+import threading
+from typing import Dict, Any, Optional, List
+from datetime import datetime, timedelta
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+import psutil
+import asyncio
+from pathlib import Path
+
+from ..models.security import (
+    BotPerformanceMetrics,
+    SecurityMetrics,
+    UserActivity,
+    QueryStatistics,
+    MonitoringConfig
+)
+from .streaming_stats import HyperLogLog, SpaceSavingTopK, TDigest, TimeBucketedRollup, bucket_label
+
+
+@dataclass
+class RequestMetrics:
+    """Metrics for a single request"""
+    user_id: int
+    query_length: int
+    processing_time: float
+    success: bool
+    error_type: Optional[str] = None
+    llm_time: Optional[float] = None
+    db_time: Optional[float] = None
+    calculation_time: Optional[float] = None
+    formatting_time: Optional[float] = None
+
+
+class BotMetrics:
+    """
+    Comprehensive metrics collection for Telegram bot performance and usage.
+
+    Tracks:
+    - Request statistics and success rates
+    - Response times and performance
+    - User activity and patterns
+    - System resource usage
+    - Error rates and types
+
+    All per-user and per-query state is bounded: user activity is an LRU
+    ordered by last request, queries and compounds are space-saving top-k
+    summaries, response time quantiles come from a t-digest and hourly
+    statistics are a fixed number of rollup buckets.
+    """
+
+    def __init__(
+        self,
+        config: MonitoringConfig,
+        max_tracked_users: int = 10000,
+        top_k: int = 100
+    ):
+        self.config = config
+        self.max_tracked_users = max_tracked_users
+        self.performance_metrics = BotPerformanceMetrics()
+        self.security_metrics = SecurityMetrics()
+
+        # Request tracking
+        self.recent_requests = deque(maxlen=1000)  # Last 1000 requests
+        self.hourly_stats = TimeBucketedRollup(
+            lambda: {"requests": 0, "errors": 0},
+            bucket_seconds=3600,
+            retention_buckets=max(1, config.metrics_retention_days) * 24
+        )
+
+        # User activity tracking (LRU by last request: oldest first)
+        self.user_activities: "OrderedDict[int, UserActivity]" = OrderedDict()
+        self.active_users = set()
+        self.unique_users = HyperLogLog()
+
+        # Query analytics
+        self.query_stats: Dict[str, QueryStatistics] = {}
+        self._top_queries = SpaceSavingTopK(top_k)
+        self.compound_frequency = SpaceSavingTopK(top_k)
+        self.reaction_frequency = SpaceSavingTopK(top_k)
+
+        # Performance tracking
+        self.response_times = deque(maxlen=1000)
+        self.response_time_digest = TDigest()
+        self.error_counts: Dict[str, int] = {}
+
+        # Requests served by an identical in-flight computation
+        self.coalesced_counts: Dict[str, int] = {}
+
+        # System monitoring
+        self.system_stats = {}
+        self.last_system_check = 0
+
+        # Thread safety
+        self._lock = threading.Lock()
+
+        # Background tasks
+        if config.enable_health_checks:
+            self._start_background_monitoring()
+
+    def record_request(
+        self,
+        user_id: int,
+        username: Optional[str],
+        query: str,
+        processing_time: float,
+        success: bool,
+        error_type: Optional[str] = None,
+        timing_breakdown: Optional[Dict[str, float]] = None
+    ) -> None:
+        """
+        Record metrics for a completed request.
+
+        Args:
+            user_id: Telegram user ID
+            username: Telegram username (optional)
+            query: The processed query
+            processing_time: Total processing time in seconds
+            success: Whether the request was successful
+            error_type: Type of error if unsuccessful
+            timing_breakdown: Detailed timing for different stages
+        """
+        with self._lock:
+            # Update performance metrics
+            self.performance_metrics.request_count += 1
+            if success:
+                self.performance_metrics.successful_requests += 1
+            else:
+                self.performance_metrics.error_count += 1
+                error_key = error_type or "unknown"
+                self.error_counts[error_key] = self.error_counts.get(error_key, 0) + 1
+
+            # Update average response time
+            self._update_average_response_time(processing_time)
+            self.response_times.append(processing_time)
+            self.response_time_digest.add(processing_time)
+
+            # Create request metrics
+            request_metrics = RequestMetrics(
+                user_id=user_id,
+                query_length=len(query),
+                processing_time=processing_time,
+                success=success,
+                error_type=error_type,
+                llm_time=timing_breakdown.get("llm") if timing_breakdown else None,
+                db_time=timing_breakdown.get("database") if timing_breakdown else None,
+                calculation_time=timing_breakdown.get("calculation") if timing_breakdown else None,
+                formatting_time=timing_breakdown.get("formatting") if timing_breakdown else None
+            )
+
+            self.recent_requests.append(request_metrics)
+
+            # Update user activity
+            self._update_user_activity(user_id, username, processing_time, success)
+
+            # Update query analytics
+            if self.config.enable_analytics:
+                self._update_query_analytics(query, success, processing_time)
+
+            # Update hourly statistics
+            hour_stats = self.hourly_stats.bucket()
+            hour_stats["requests"] += 1
+            if not success:
+                hour_stats["errors"] += 1
+
+    def record_coalesced(self, kind: str) -> None:
+        """
+        Record a request that joined an identical in-flight computation.
+
+        Args:
+            kind: Coalescing level ("query" for the normalized query text,
+                "params" for canonical extracted parameters)
+        """
+        with self._lock:
+            self.performance_metrics.coalesced_requests += 1
+            self.coalesced_counts[kind] = self.coalesced_counts.get(kind, 0) + 1
+
+    def _update_average_response_time(self, processing_time: float) -> None:
+        """Update the running average response time."""
+        total_requests = self.performance_metrics.request_count
+        current_avg = self.performance_metrics.avg_response_time
+
+        # Running average calculation
+        self.performance_metrics.avg_response_time = (
+            (current_avg * (total_requests - 1) + processing_time) / total_requests
+        )
+
+    def _update_user_activity(
+        self,
+        user_id: int,
+        username: Optional[str],
+        processing_time: float,
+        success: bool
+    ) -> None:
+        """Update user activity statistics."""
+        now = datetime.now()
+
+        activity = self.user_activities.get(user_id)
+        if activity is None:
+            activity = UserActivity(
+                user_id=user_id,
+                username=username,
+                first_request=now
+            )
+            self.user_activities[user_id] = activity
+            self.unique_users.add(user_id)
+        else:
+            self.user_activities.move_to_end(user_id)
+
+        activity.request_count += 1
+        activity.last_request = now
+        activity.total_processing_time += processing_time
+
+        if not success:
+            activity.errors += 1
+
+        # Update active users
+        self.active_users.add(user_id)
+
+        # Clean up inactive users (no activity in last hour)
+        self._cleanup_inactive_users()
+
+    def _update_query_analytics(
+        self,
+        query: str,
+        success: bool,
+        processing_time: float
+    ) -> None:
+        """Update query statistics and analytics."""
+        # Normalize query for analytics
+        normalized_query = self._normalize_query(query)
+
+        # Only queries monitored by the top-k summary keep detailed stats
+        evicted = self._top_queries.offer(normalized_query)
+        if evicted is not None:
+            self.query_stats.pop(evicted, None)
+
+        if normalized_query not in self.query_stats:
+            self.query_stats[normalized_query] = QueryStatistics(
+                query=normalized_query,
+                count=1,
+                avg_processing_time=processing_time,
+                success_rate=1.0 if success else 0.0
+            )
+        else:
+            stats = self.query_stats[normalized_query]
+            stats.count += 1
+            stats.last_used = datetime.now()
+
+            # Update average processing time
+            stats.avg_processing_time = (
+                (stats.avg_processing_time * (stats.count - 1) + processing_time) / stats.count
+            )
+
+            # Update success rate
+            if success:
+                stats.success_rate = (stats.success_rate * (stats.count - 1) + 1.0) / stats.count
+            else:
+                stats.success_rate = (stats.success_rate * (stats.count - 1)) / stats.count
+
+    def _normalize_query(self, query: str) -> str:
+        """Normalize query for analytics comparison."""
+        # Remove extra whitespace and convert to lowercase
+        normalized = " ".join(query.lower().split())
+
+        # Replace temperature variations with standard format
+        normalized = normalized.replace("k", "K")
+        normalized = normalized.replace("°c", "C")
+        normalized = normalized.replace("°f", "F")
+
+        return normalized
+
+    def _cleanup_inactive_users(self) -> None:
+        """
+        Remove users who haven't been active in the last hour.
+
+        ``user_activities`` is ordered by last request, so only the stale
+        head of the LRU is visited (amortized O(1) per request). The LRU is
+        also capped at ``max_tracked_users``.
+        """
+        cutoff_time = datetime.now() - timedelta(hours=1)
+
+        while self.user_activities:
+            user_id, activity = next(iter(self.user_activities.items()))
+            over_capacity = len(self.user_activities) > self.max_tracked_users
+            if not over_capacity and activity.last_request and activity.last_request >= cutoff_time:
+                break
+            del self.user_activities[user_id]
+            self.active_users.discard(user_id)
+
+    def get_performance_stats(self) -> Dict[str, Any]:
+        """Get comprehensive performance statistics."""
+        with self._lock:
+            uptime = time.time() - self.performance_metrics.start_time
+            error_rate = (
+                (self.performance_metrics.error_count / self.performance_metrics.request_count * 100)
+                if self.performance_metrics.request_count > 0 else 0
+            )
+
+            # Calculate requests per minute
+            requests_per_minute = 0
+            if uptime > 0:
+                requests_per_minute = self.performance_metrics.request_count / (uptime / 60)
+
+            # Percentiles for response times (t-digest over all requests)
+            digest = self.response_time_digest
+            response_stats = {}
+            if digest.count:
+                response_stats = {
+                    "min": digest.min,
+                    "max": digest.max,
+                    "p50": digest.quantile(0.5),
+                    "p95": digest.quantile(0.95),
+                    "p99": digest.quantile(0.99)
+                }
+
+            return {
+                "uptime_seconds": uptime,
+                "total_requests": self.performance_metrics.request_count,
+                "successful_requests": self.performance_metrics.successful_requests,
+                "error_count": self.performance_metrics.error_count,
+                "error_rate_percent": error_rate,
+                "success_rate_percent": 100 - error_rate,
+                "avg_response_time_seconds": self.performance_metrics.avg_response_time,
+                "requests_per_minute": requests_per_minute,
+                "active_users": len(self.active_users),
+                "total_unique_users": self.unique_users.count(),
+                "coalesced_requests": self.performance_metrics.coalesced_requests,
+                "coalesced_by_kind": dict(self.coalesced_counts),
+                "response_time_stats": response_stats
+            }
+
+    def get_user_stats(self) -> Dict[str, Any]:
+        """Get user activity statistics."""
+        with self._lock:
+            if not self.user_activities:
+                return {
+                    "total_users": 0,
+                    "active_users": 0,
+                    "avg_requests_per_user": 0,
+                    "top_users": []
+                }
+
+            # Calculate statistics
+            total_requests = sum(activity.request_count for activity in self.user_activities.values())
+            avg_requests = total_requests / len(self.user_activities)
+
+            # Get top users by request count
+            top_users = sorted(
+                self.user_activities.values(),
+                key=lambda x: x.request_count,
+                reverse=True
+            )[:10]
+
+            return {
+                "total_users": len(self.user_activities),
+                "active_users": len(self.active_users),
+                "total_requests": total_requests,
+                "avg_requests_per_user": avg_requests,
+                "top_users": [
+                    {
+                        "user_id": activity.user_id,
+                        "username": activity.username,
+                        "requests": activity.request_count,
+                        "errors": activity.errors,
+                        "success_rate": 1.0 - (activity.errors / activity.request_count) if activity.request_count > 0 else 1.0,
+                        "avg_processing_time": activity.total_processing_time / activity.request_count if activity.request_count > 0 else 0,
+                        "last_request": activity.last_request.isoformat() if activity.last_request else None
+                    }
+                    for activity in top_users
+                ]
+            }
+
+    def get_query_analytics(self, limit: int = 10) -> Dict[str, Any]:
+        """Get query analytics and popular queries."""
+        with self._lock:
+            # Get top queries by frequency
+            top_queries = sorted(
+                self.query_stats.values(),
+                key=lambda x: x.count,
+                reverse=True
+            )[:limit]
+
+            # Get queries with highest error rates
+            problematic_queries = [
+                stats for stats in self.query_stats.values()
+                if stats.success_rate < 0.8 and stats.count >= 3
+            ]
+            problematic_queries.sort(key=lambda x: x.success_rate)
+
+            return {
+                "top_queries": [
+                    {
+                        "query": stats.query,
+                        "count": stats.count,
+                        "avg_processing_time": stats.avg_processing_time,
+                        "success_rate": stats.success_rate,
+                        "last_used": stats.last_used.isoformat()
+                    }
+                    for stats in top_queries
+                ],
+                "problematic_queries": [
+                    {
+                        "query": stats.query,
+                        "count": stats.count,
+                        "success_rate": stats.success_rate,
+                        "avg_processing_time": stats.avg_processing_time
+                    }
+                    for stats in problematic_queries[:5]
+                ],
+                "total_unique_queries": len(self.query_stats),
+                "compound_frequency": self.compound_frequency.as_dict(),
+                "reaction_frequency": self.reaction_frequency.as_dict()
+            }
+
+    def get_system_stats(self) -> Dict[str, Any]:
+        """Get system resource statistics."""
+        try:
+            # Get system metrics
+            cpu_percent = psutil.cpu_percent(interval=1)
+            memory = psutil.virtual_memory()
+            disk = psutil.disk_usage('/')
+
+            # Get process-specific metrics
+            process = psutil.Process()
+            process_memory = process.memory_info()
+
+            return {
+                "cpu_percent": cpu_percent,
+                "memory": {
+                    "total_gb": memory.total / (1024**3),
+                    "available_gb": memory.available / (1024**3),
+                    "used_gb": memory.used / (1024**3),
+                    "percent": memory.percent
+                },
+                "disk": {
+                    "total_gb": disk.total / (1024**3),
+                    "free_gb": disk.free / (1024**3),
+                    "used_gb": disk.used / (1024**3),
+                    "percent": (disk.used / disk.total) * 100
+                },
+                "process": {
+                    "memory_rss_mb": process_memory.rss / (1024**2),
+                    "memory_vms_mb": process_memory.vms / (1024**2),
+                    "cpu_percent": process.cpu_percent(),
+                    "num_threads": process.num_threads(),
+                    "open_files": len(process.open_files())
+                }
+            }
+        except Exception as e:
+            return {"error": f"Failed to get system stats: {str(e)}"}
+
+    def get_hourly_stats(self, hours: int = 24) -> List[Dict[str, Any]]:
+        """Get hourly statistics for the last N hours."""
+        with self._lock:
+            cutoff_time = datetime.now() - timedelta(hours=hours)
+
+            hourly_data = []
+            for hour_start, stats in self.hourly_stats.items(cutoff_time):
+                error_rate = (
+                    (stats["errors"] / stats["requests"] * 100)
+                    if stats["requests"] > 0 else 0
+                )
+
+                hourly_data.append({
+                    "hour": bucket_label(hour_start),
+                    "requests": stats["requests"],
+                    "errors": stats["errors"],
+                    "error_rate_percent": error_rate,
+                    "success_rate_percent": 100 - error_rate
+                })
+
+            return hourly_data
+
+    def _start_background_monitoring(self) -> None:
+        """Start background system monitoring."""
+        def monitor_system():
+            while True:
+                try:
+                    if self.config.enable_metrics:
+                        self.system_stats = self.get_system_stats()
+                        self.last_system_check = time.time()
+
+                    # Sleep for configured interval
+                    time.sleep(self.config.health_check_interval_seconds)
+                except Exception as e:
+                    # Log error but continue monitoring
+                    print(f"System monitoring error: {e}")
+                    time.sleep(60)  # Wait 1 minute before retrying
+
+        monitor_thread = threading.Thread(target=monitor_system, daemon=True)
+        monitor_thread.start()
+
+    def reset_metrics(self) -> None:
+        """Reset all metrics (use with caution)."""
+        with self._lock:
+            self.performance_metrics = BotPerformanceMetrics()
+            self.security_metrics = SecurityMetrics()
+            self.recent_requests.clear()
+            self.user_activities.clear()
+            self.active_users.clear()
+            self.unique_users.clear()
+            self.query_stats.clear()
+            self._top_queries.clear()
+            self.response_times.clear()
+            self.response_time_digest.clear()
+            self.error_counts.clear()
+            self.coalesced_counts.clear()
+            self.hourly_stats.clear()
+            self.compound_frequency.clear()
+            self.reaction_frequency.clear()
\ No newline at end of file
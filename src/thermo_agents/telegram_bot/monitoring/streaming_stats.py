@@ -0,0 +1,371 @@
+"""
+Bounded-memory streaming summaries for monitoring.
+
+This module provides the fixed-size data structures used by QueryAnalytics
+and BotMetrics so that memory stays constant under unbounded traffic:
+- CountMinSketch: approximate frequency of arbitrary keys
+- SpaceSavingTopK: heavy hitters (top-k) with bounded error
+- TDigest: streaming latency quantiles
+- HyperLogLog: distinct counts (unique users)
+- TimeBucketedRollup: fixed number of time buckets with retention
+"""
+
+import hashlib
+import math
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+
+def _stable_hash64(item: Hashable, salt: int = 0) -> int:
+    """Stable 64-bit hash (independent of PYTHONHASHSEED)."""
+    data = f"{salt}:{item!r}".encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+class CountMinSketch:
+    """
+    Count-min sketch for approximate frequency counting.
+
+    Estimates never underestimate; overestimation is bounded by
+    ``e / width * total`` with probability ``1 - exp(-depth)``.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._table: List[List[int]] = [[0] * width for _ in range(depth)]
+
+    def _indexes(self, item: Hashable) -> Iterator[Tuple[int, int]]:
+        # Double hashing: h_i = h1 + i * h2
+        h = _stable_hash64(item)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        for row in range(self.depth):
+            yield row, (h1 + row * h2) % self.width
+
+    def add(self, item: Hashable, count: int = 1) -> None:
+        """Add ``count`` occurrences of ``item``."""
+        self.total += count
+        for row, col in self._indexes(item):
+            self._table[row][col] += count
+
+    def estimate(self, item: Hashable) -> int:
+        """Estimated number of occurrences of ``item``."""
+        return min(self._table[row][col] for row, col in self._indexes(item))
+
+    def clear(self) -> None:
+        """Reset all counters."""
+        self.total = 0
+        for row in self._table:
+            for i in range(self.width):
+                row[i] = 0
+
+
+class SpaceSavingTopK:
+    """
+    Space-Saving heavy hitters summary.
+
+    Monitors at most ``capacity`` items. When a new item arrives and the
+    summary is full, the item with the smallest count is replaced and the
+    newcomer inherits its count as the error bound.
+    """
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self._counts: Dict[Hashable, List[int]] = {}  # item -> [count, error]
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._counts
+
+    def offer(self, item: Hashable, count: int = 1) -> Optional[Hashable]:
+        """
+        Add ``count`` occurrences of ``item``.
+
+        Returns:
+            The evicted item, if the summary had to make room, else None
+        """
+        entry = self._counts.get(item)
+        if entry is not None:
+            entry[0] += count
+            return None
+
+        if len(self._counts) < self.capacity:
+            self._counts[item] = [count, 0]
+            return None
+
+        evicted = min(self._counts, key=lambda key: self._counts[key][0])
+        min_count = self._counts.pop(evicted)[0]
+        self._counts[item] = [min_count + count, min_count]
+        return evicted
+
+    def count(self, item: Hashable) -> int:
+        """Upper-bound count for a monitored item (0 if not monitored)."""
+        entry = self._counts.get(item)
+        return entry[0] if entry else 0
+
+    def error(self, item: Hashable) -> int:
+        """Maximum overestimation of the item's count."""
+        entry = self._counts.get(item)
+        return entry[1] if entry else 0
+
+    def top(self, limit: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """Monitored items sorted by count, descending."""
+        items = sorted(self._counts.items(), key=lambda kv: kv[1][0], reverse=True)
+        if limit is not None:
+            items = items[:limit]
+        return [(item, entry[0]) for item, entry in items]
+
+    def as_dict(self) -> Dict[Hashable, int]:
+        """Monitored items as a plain ``{item: count}`` dict."""
+        return dict(self.top())
+
+    def merge(self, other: "SpaceSavingTopK") -> None:
+        """Merge another summary into this one (counts and errors add up)."""
+        for item, (count, error) in other._counts.items():
+            self.offer(item, count)
+            if item in self._counts:
+                self._counts[item][1] += error
+
+    def clear(self) -> None:
+        self._counts.clear()
+
+
+class TDigest:
+    """
+    Merging t-digest for streaming quantile estimation.
+
+    Keeps O(compression) centroids regardless of the number of samples;
+    accuracy is highest near the tails (p95, p99).
+    """
+
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means: List[float] = []
+        self._weights: List[float] = []
+        self._buffer: List[float] = []
+        self._buffer_limit = compression * 5
+
+    def add(self, value: float) -> None:
+        """Add a single sample."""
+        self._buffer.append(value)
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._buffer) >= self._buffer_limit:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        points = list(zip(self._means, self._weights)) + [(v, 1.0) for v in self._buffer]
+        self._buffer = []
+        self._compress(points)
+
+    def _compress(self, points: List[Tuple[float, float]]) -> None:
+        points.sort()
+        total = sum(weight for _, weight in points)
+        means: List[float] = []
+        weights: List[float] = []
+        cumulative = 0.0
+        cur_mean, cur_weight = points[0]
+
+        for mean, weight in points[1:]:
+            q = (cumulative + cur_weight + weight / 2) / total
+            limit = 4 * total * q * (1 - q) / self.compression
+            if cur_weight + weight <= max(limit, 1.0):
+                cur_mean += (mean - cur_mean) * weight / (cur_weight + weight)
+                cur_weight += weight
+            else:
+                means.append(cur_mean)
+                weights.append(cur_weight)
+                cumulative += cur_weight
+                cur_mean, cur_weight = mean, weight
+
+        means.append(cur_mean)
+        weights.append(cur_weight)
+        self._means, self._weights = means, weights
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile ``q`` (0..1), or None if empty."""
+        if self.count == 0:
+            return None
+        self._flush()
+
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        if len(self._means) == 1:
+            return self._means[0]
+
+        target = q * self.count
+        cumulative = 0.0
+        for i, weight in enumerate(self._weights):
+            if cumulative + weight >= target:
+                # Interpolate between neighbouring centroid centers
+                center = cumulative + weight / 2
+                if target < center:
+                    prev_mean = self._means[i - 1] if i > 0 else self.min
+                    prev_center = cumulative - (self._weights[i - 1] / 2 if i > 0 else 0)
+                    span = center - prev_center
+                    frac = (target - prev_center) / span if span > 0 else 1.0
+                    return prev_mean + frac * (self._means[i] - prev_mean)
+                next_mean = self._means[i + 1] if i + 1 < len(self._means) else self.max
+                next_center = cumulative + weight + (
+                    self._weights[i + 1] / 2 if i + 1 < len(self._weights) else 0
+                )
+                span = next_center - center
+                frac = (target - center) / span if span > 0 else 0.0
+                return self._means[i] + frac * (next_mean - self._means[i])
+            cumulative += weight
+        return self.max
+
+    def merge(self, other: "TDigest") -> None:
+        """Merge another digest into this one."""
+        if other.count == 0:
+            return
+        other._flush()
+        points = (
+            list(zip(self._means, self._weights))
+            + [(v, 1.0) for v in self._buffer]
+            + list(zip(other._means, other._weights))
+        )
+        self._buffer = []
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(points)
+
+    def clear(self) -> None:
+        self.__init__(self.compression)
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter with linear-counting small-range correction.
+
+    With the default precision (p=10) it uses 1024 one-byte registers and has
+    a standard error of about 3%; small cardinalities are practically exact.
+    """
+
+    def __init__(self, precision: int = 10):
+        self.precision = precision
+        self._m = 1 << precision
+        self._registers = bytearray(self._m)
+        if self._m >= 128:
+            self._alpha = 0.7213 / (1 + 1.079 / self._m)
+        else:
+            self._alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(self._m, 0.7213)
+
+    def add(self, item: Hashable) -> None:
+        h = _stable_hash64(item)
+        index = h & (self._m - 1)
+        w = h >> self.precision
+        rank = (64 - self.precision) - w.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def count(self) -> int:
+        """Estimated number of distinct items."""
+        zeros = self._registers.count(0)
+        if zeros == self._m:
+            return 0
+        estimate = self._alpha * self._m * self._m / sum(
+            2.0 ** -r for r in self._registers
+        )
+        if estimate <= 2.5 * self._m and zeros:
+            estimate = self._m * math.log(self._m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        for i, value in enumerate(other._registers):
+            if value > self._registers[i]:
+                self._registers[i] = value
+
+    def clear(self) -> None:
+        self._registers = bytearray(self._m)
+
+
+class TimeBucketedRollup:
+    """
+    Fixed-size sequence of time buckets.
+
+    Each bucket is created by ``factory`` and covers ``bucket_seconds``.
+    Only the newest ``retention_buckets`` buckets are kept, so memory is
+    bounded by ``retention_buckets * sizeof(bucket)``.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        bucket_seconds: int = 3600,
+        retention_buckets: int = 168
+    ):
+        self.factory = factory
+        self.bucket_seconds = bucket_seconds
+        self.retention_buckets = retention_buckets
+        self._buckets: "OrderedDict[int, Any]" = OrderedDict()
+
+    def _bucket_key(self, timestamp: datetime) -> int:
+        epoch = int(timestamp.timestamp())
+        return epoch - epoch % self.bucket_seconds
+
+    def bucket(self, timestamp: Optional[datetime] = None) -> Any:
+        """Bucket covering ``timestamp`` (created on demand)."""
+        key = self._bucket_key(timestamp or datetime.now())
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self.factory()
+            self._buckets[key] = bucket
+            if len(self._buckets) > 1 and key < next(reversed(self._buckets)):
+                # Out-of-order timestamp: keep buckets sorted by start time
+                keys = sorted(self._buckets)
+                self._buckets = OrderedDict((k, self._buckets[k]) for k in keys)
+            while len(self._buckets) > self.retention_buckets:
+                self._buckets.popitem(last=False)
+        return bucket
+
+    def items(
+        self,
+        since: Optional[datetime] = None
+    ) -> List[Tuple[datetime, Any]]:
+        """``(bucket_start, bucket)`` pairs overlapping ``[since, now)``, oldest first."""
+        keys = list(self._buckets)
+        start = 0
+        if since is not None:
+            start = bisect_left(keys, int(since.timestamp()) - self.bucket_seconds + 1)
+        return [
+            (datetime.fromtimestamp(key), self._buckets[key])
+            for key in keys[start:]
+        ]
+
+    def prune(self, before: datetime) -> None:
+        """Drop buckets that end before ``before``."""
+        cutoff = int(before.timestamp())
+        while self._buckets:
+            key = next(iter(self._buckets))
+            if key + self.bucket_seconds > cutoff:
+                break
+            self._buckets.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+def bucket_label(bucket_start: datetime) -> str:
+    """Hour label in the format used by the monitoring reports."""
+    return bucket_start.strftime("%Y-%m-%d %H:00")
+
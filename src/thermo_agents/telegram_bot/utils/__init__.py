@@ -3,15 +3,18 @@
 
 - ThermoIntegration: интеграция с ThermoOrchestrator
 - SessionManager: управление сессиями пользователей
+- SessionStore: компактное хранилище сессий и последних результатов
 - RateLimiter: управление лимитами запросов
 """
 
 from .thermo_integration import ThermoIntegration
 from .session_manager import SessionManager
+from .session_store import SessionStore
 from .rate_limiter import RateLimiter
 
 __all__ = [
     "ThermoIntegration",
     "SessionManager",
+    "SessionStore",
     "RateLimiter",
 ]
\ No newline at end of file
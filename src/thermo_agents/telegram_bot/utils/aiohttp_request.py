@@ -0,0 +1,127 @@
+"""
+HTTP клиент Bot API на aiohttp с пулом keep-alive соединений.
+
+Реализация telegram.request.BaseRequest поверх одной aiohttp.ClientSession:
+все исходящие вызовы Bot API (sendMessage, sendDocument, ...) переиспользуют
+TCP/TLS соединения из пула вместо установки нового на каждый запрос.
+"""
+
+import asyncio
+from typing import Optional, Tuple
+
+import aiohttp
+from telegram.error import NetworkError, TimedOut
+from telegram.request import BaseRequest, RequestData
+from telegram._utils.defaultvalue import DefaultValue
+
+
+class AiohttpRequest(BaseRequest):
+    """
+    BaseRequest для python-telegram-bot на aiohttp.
+
+    Args:
+        connection_pool_size: Максимум одновременных соединений в пуле
+        keepalive_timeout: Сколько секунд держать простаивающее соединение
+        connect_timeout: Таймаут установки соединения
+        read_timeout: Таймаут чтения ответа
+        write_timeout: Таймаут отправки запроса (для загрузки файлов)
+        pool_timeout: Таймаут ожидания свободного соединения из пула
+    """
+
+    def __init__(
+        self,
+        connection_pool_size: int = 16,
+        keepalive_timeout: float = 60.0,
+        connect_timeout: Optional[float] = 5.0,
+        read_timeout: Optional[float] = 5.0,
+        write_timeout: Optional[float] = 5.0,
+        pool_timeout: Optional[float] = 1.0,
+    ):
+        self.connection_pool_size = connection_pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._write_timeout = write_timeout
+        self._pool_timeout = pool_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def read_timeout(self) -> Optional[float]:
+        return self._read_timeout
+
+    async def initialize(self) -> None:
+        """Создание сессии и пула соединений."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.connection_pool_size,
+                keepalive_timeout=self.keepalive_timeout,
+                enable_cleanup_closed=True,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"User-Agent": self.USER_AGENT},
+            )
+
+    async def shutdown(self) -> None:
+        """Закрытие сессии и всех соединений пула."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _pick(self, value, default: Optional[float]) -> Optional[float]:
+        return default if isinstance(value, DefaultValue) else value
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: Optional[RequestData] = None,
+        read_timeout=BaseRequest.DEFAULT_NONE,
+        write_timeout=BaseRequest.DEFAULT_NONE,
+        connect_timeout=BaseRequest.DEFAULT_NONE,
+        pool_timeout=BaseRequest.DEFAULT_NONE,
+    ) -> Tuple[int, bytes]:
+        """См. BaseRequest.do_request."""
+        if self._session is None or self._session.closed:
+            raise RuntimeError("AiohttpRequest не инициализирован")
+
+        read = self._pick(read_timeout, self._read_timeout)
+        write = self._pick(write_timeout, self._write_timeout)
+        connect = self._pick(connect_timeout, self._connect_timeout)
+        pool = self._pick(pool_timeout, self._pool_timeout)
+
+        data = None
+        if request_data is not None:
+            if request_data.contains_files:
+                data = aiohttp.FormData()
+                for name, value in request_data.json_parameters.items():
+                    data.add_field(name, value)
+                for name, part in request_data.multipart_data.items():
+                    if isinstance(part, tuple):
+                        filename, content, mimetype = part
+                        data.add_field(
+                            name, content, filename=filename, content_type=mimetype
+                        )
+                    else:
+                        data.add_field(name, part)
+            else:
+                data = request_data.json_parameters
+
+        # aiohttp не разделяет таймауты записи и чтения: sock_read покрывает
+        # ожидание ответа, total — весь запрос (включая загрузку файла)
+        total = None
+        if read is not None and write is not None:
+            total = read + write + (connect or 0) + (pool or 0)
+        timeout = aiohttp.ClientTimeout(
+            total=total, connect=pool, sock_connect=connect, sock_read=read
+        )
+
+        try:
+            async with self._session.request(
+                method, url, data=data, timeout=timeout
+            ) as response:
+                return response.status, await response.read()
+        except asyncio.TimeoutError as err:
+            raise TimedOut from err
+        except aiohttp.ClientError as err:
+            raise NetworkError(f"aiohttp.{err.__class__.__name__}: {err}") from err
@@ -251,32 +251,59 @@ class HealthChecker:
             if not self.thermo_integration.orchestrator:
                 raise RuntimeError("ThermoOrchestrator not initialized")
 
-            # Быстрая проверка через базовый запрос
-            test_query = "H2O"
-            result = await self.thermo_integration.process_query(test_query, 0)
-
-            response_time = (time.time() - start_time) * 1000
+            resilience = self.thermo_integration.get_llm_resilience_stats()
+            breaker = resilience.get("breaker", {})
+            hedging = resilience.get("hedging", {})
+            resilience_details = {
+                "breaker_state": breaker.get("state"),
+                "breaker_rejected": breaker.get("rejected", 0),
+                "breaker_times_opened": breaker.get("times_opened", 0),
+                "hedge_model": hedging.get("model"),
+                "hedges_started": hedging.get("started", 0),
+                "hedges_won": hedging.get("won", 0),
+                "latency_p95_s": resilience.get("latency", {}).get("p95_s"),
+            }
 
-            if result.success:
-                if response_time > self.RESPONSE_TIME_CRITICAL:
-                    status = "unhealthy"
-                    error = f"Response time too slow: {response_time:.0f}ms"
-                elif response_time > self.RESPONSE_TIME_WARNING:
-                    status = "degraded"
-                    error = f"Response time slow: {response_time:.0f}ms"
-                else:
-                    status = "healthy"
-                    error = None
-            else:
+            if breaker.get("state") == "open":
+                # Провайдер деградировал: тестовый запрос был бы отклонен
+                response_time = (time.time() - start_time) * 1000
                 status = "unhealthy"
-                error = f"Query failed: {result.error}"
+                error = (
+                    f"Circuit breaker open, retry in {breaker.get('retry_after_s', 0):.0f}s"
+                )
+                details = {
+                    "api_url": self.config.llm_base_url,
+                    "model": self.config.llm_model,
+                    **resilience_details,
+                }
+            else:
+                # Быстрая проверка через базовый запрос
+                test_query = "H2O"
+                result = await self.thermo_integration.process_query(test_query, 0)
+
+                response_time = (time.time() - start_time) * 1000
+
+                if result.success:
+                    if response_time > self.RESPONSE_TIME_CRITICAL:
+                        status = "unhealthy"
+                        error = f"Response time too slow: {response_time:.0f}ms"
+                    elif response_time > self.RESPONSE_TIME_WARNING:
+                        status = "degraded"
+                        error = f"Response time slow: {response_time:.0f}ms"
+                    else:
+                        status = "healthy"
+                        error = None
+                else:
+                    status = "unhealthy"
+                    error = f"Query failed: {result.error}"
 
-            details = {
-                "test_query": test_query,
-                "result_length": len(result.content) if result.content else 0,
-                "api_url": self.config.llm_base_url,
-                "model": self.config.llm_model
-            }
+                details = {
+                    "test_query": test_query,
+                    "result_length": len(result.content) if result.content else 0,
+                    "api_url": self.config.llm_base_url,
+                    "model": self.config.llm_model,
+                    **resilience_details,
+                }
 
         except Exception as e:
             response_time = (time.time() - start_time) * 1000
@@ -370,8 +397,9 @@ class HealthChecker:
         start_time = time.time()
 
         try:
-            # Получение системных метрик
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # Получение системных метрик (замер CPU блокирует, поэтому в потоке,
+            # чтобы не останавливать обработку обновлений)
+            cpu_percent = await asyncio.to_thread(psutil.cpu_percent, 1)
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
 
@@ -470,7 +498,7 @@ class HealthChecker:
     async def get_system_metrics(self) -> SystemMetrics:
         """Получение текущих системных метрик."""
         try:
-            cpu_percent = psutil.cpu_percent(interval=0.1)
+            cpu_percent = await asyncio.to_thread(psutil.cpu_percent, 0.1)
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
 
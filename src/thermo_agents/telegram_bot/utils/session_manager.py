@@ -1,28 +1,18 @@
 """
 Управление сессиями пользователей Telegram бота.
 
-Отслеживание активных пользователей, лимиты и статистика.
+Отслеживание активных пользователей, лимиты и статистика. Сессии хранятся
+в SessionStore: в памяти только активные пользователи, неактивные истекают
+по колесу таймеров, при SESSION_STORE_PATH сессии сохраняются в SQLite.
 """
 
-import time
 import asyncio
-from datetime import datetime, timedelta
-from typing import Dict, Set, Optional
-from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional
+from dataclasses import dataclass
 
 from ..config import TelegramBotConfig
-
-
-@dataclass
-class UserSession:
-    """Информация о сессии пользователя."""
-    user_id: int
-    username: Optional[str]
-    first_name: Optional[str]
-    start_time: float
-    last_activity: float
-    request_count: int = 0
-    is_active: bool = True
+from .session_store import SessionStore, UserSession
 
 
 @dataclass
@@ -38,13 +28,27 @@ class SessionStats:
 class SessionManager:
     """Менеджер сессий пользователей."""
 
-    def __init__(self, config: TelegramBotConfig):
+    def __init__(self, config: TelegramBotConfig, store: Optional[SessionStore] = None):
         self.config = config
-        self.sessions: Dict[int, UserSession] = {}
-        self.active_users: Set[int] = set()
+        self.store = store if store is not None else SessionStore.from_config(config)
         self.stats = SessionStats()
-        self._session_timeout = 3600  # 1 час таймаут сессии
         self._cleanup_task = None
+        # День, к которому относится ежедневная статистика
+        self._stats_date = datetime.now().date()
+
+    @property
+    def sessions(self) -> Dict[int, UserSession]:
+        """Сессии активных пользователей (в памяти)."""
+        return self.store.sessions
+
+    @property
+    def active_sessions(self) -> Dict[int, UserSession]:
+        return self.store.sessions
+
+    @property
+    def active_users(self):
+        """ID активных пользователей."""
+        return self.store.sessions.keys()
 
     async def start_session(self, user_id: int, username: Optional[str] = None, first_name: Optional[str] = None) -> bool:
         """
@@ -59,31 +63,16 @@ class SessionManager:
             True если сессия успешно создана
         """
         try:
-            current_time = time.time()
-
             # Проверка лимита активных пользователей
             if len(self.active_users) >= self.config.max_concurrent_users:
                 if user_id not in self.active_users:
                     return False
 
-            # Создание или обновление сессии
-            if user_id in self.sessions:
-                session = self.sessions[user_id]
-                session.last_activity = current_time
-                session.is_active = True
-            else:
-                session = UserSession(
-                    user_id=user_id,
-                    username=username,
-                    first_name=first_name,
-                    start_time=current_time,
-                    last_activity=current_time
-                )
-                self.sessions[user_id] = session
+            # Создание, загрузка из хранилища или обновление сессии
+            _, opened = self.store.open_session(user_id, username, first_name)
+            if opened:
                 self.stats.total_users_today += 1
 
-            # Добавление в активные пользователи
-            self.active_users.add(user_id)
             self.stats.active_users = len(self.active_users)
             self.stats.peak_concurrent_users = max(self.stats.peak_concurrent_users, self.stats.active_users)
 
@@ -105,12 +94,7 @@ class SessionManager:
             user_id: ID пользователя
         """
         try:
-            if user_id in self.sessions:
-                session = self.sessions[user_id]
-                session.is_active = False
-                session.last_activity = time.time()
-
-            self.active_users.discard(user_id)
+            self.store.close_session(user_id)
             self.stats.active_users = len(self.active_users)
 
         except Exception as e:
@@ -124,18 +108,9 @@ class SessionManager:
             user_id: ID пользователя
         """
         try:
-            current_time = time.time()
-
-            if user_id in self.sessions:
-                session = self.sessions[user_id]
-                session.last_activity = current_time
-                session.request_count += 1
+            if self.store.record_activity(user_id) is not None:
                 self.stats.total_requests_today += 1
 
-                # Повторное добавление в активные если нужно
-                self.active_users.add(user_id)
-                self.stats.active_users = len(self.active_users)
-
         except Exception as e:
             print(f"Ошибка обновления активности: {e}")
 
@@ -145,7 +120,7 @@ class SessionManager:
 
     def get_session_info(self, user_id: int) -> Optional[UserSession]:
         """Получение информации о сессии пользователя."""
-        return self.sessions.get(user_id)
+        return self.store.get_session(user_id)
 
     def get_active_users_count(self) -> int:
         """Получение количества активных пользователей."""
@@ -157,7 +132,7 @@ class SessionManager:
 
     def get_user_statistics(self) -> dict:
         """Получение статистики пользователей."""
-        current_time = time.time()
+        current_time = self.store.clock()
         total_session_time = 0
         active_sessions = 0
 
@@ -169,25 +144,26 @@ class SessionManager:
         avg_session_time = total_session_time / active_sessions if active_sessions > 0 else 0
 
         return {
-            "total_users": len(self.sessions),
+            "total_users": self.stats.total_users_today,
             "active_users": len(self.active_users),
             "total_requests_today": self.stats.total_requests_today,
             "average_session_time_minutes": avg_session_time / 60,
             "peak_concurrent_users": self.stats.peak_concurrent_users,
             "max_concurrent_users": self.config.max_concurrent_users,
-            "utilization_percent": (len(self.active_users) / self.config.max_concurrent_users) * 100
+            "utilization_percent": (len(self.active_users) / self.config.max_concurrent_users) * 100,
+            "store": self.store.get_stats()
         }
 
     def get_user_requests_today(self, user_id: int) -> int:
         """Получение количества запросов пользователя за сегодня."""
-        session = self.sessions.get(user_id)
+        session = self.store.get_session(user_id)
         return session.request_count if session else 0
 
     async def _cleanup_inactive_sessions(self) -> None:
         """Фоновая задача очистки неактивных сессий."""
         while True:
             try:
-                await asyncio.sleep(300)  # Проверка каждые 5 минут
+                await asyncio.sleep(self.store.wheel.granularity_s)
                 await self._remove_inactive_sessions()
             except asyncio.CancelledError:
                 break
@@ -195,21 +171,17 @@ class SessionManager:
                 print(f"Ошибка очистки сессий: {e}")
 
     async def _remove_inactive_sessions(self) -> None:
-        """Удаление неактивных сессий."""
+        """Выгрузка неактивных сессий и запись изменений в хранилище."""
         try:
-            current_time = time.time()
-            inactive_users = []
-
-            for user_id, session in self.sessions.items():
-                if current_time - session.last_activity > self._session_timeout:
-                    inactive_users.append(user_id)
-
-            for user_id in inactive_users:
-                await self.end_session(user_id)
+            self.store.expire()
+            self.store.flush()
+            self.stats.active_users = len(self.active_users)
 
-            # Сброс ежедневной статистики в полночь
-            now = datetime.now()
-            if now.hour == 0 and now.minute < 5:  # Первые 5 минут часа
+            # Сброс ежедневной статистики один раз при смене дня (очистка
+            # выполняется каждые granularity_s, а не раз в несколько минут)
+            today = datetime.now().date()
+            if today != self._stats_date:
+                self._stats_date = today
                 self._reset_daily_stats()
 
         except Exception as e:
@@ -230,9 +202,9 @@ class SessionManager:
                 except asyncio.CancelledError:
                     pass
 
-            # Завершение всех активных сессий
-            for user_id in list(self.active_users):
-                await self.end_session(user_id)
+            # Завершение всех активных сессий (одной записью в хранилище)
+            self.store.close()
+            self.stats.active_users = 0
 
         except Exception as e:
             print(f"Ошибка завершения работы SessionManager: {e}")
@@ -240,13 +212,14 @@ class SessionManager:
     def get_top_users(self, limit: int = 10) -> list[dict]:
         """Получение топ пользователей по количеству запросов."""
         users = []
-        for session in self.sessions.values():
+        now = self.store.clock()
+        for session in self.store.top_sessions(limit):
             users.append({
                 "user_id": session.user_id,
                 "username": session.username,
                 "first_name": session.first_name,
                 "request_count": session.request_count,
-                "session_time_minutes": (time.time() - session.start_time) / 60,
+                "session_time_minutes": (now - session.start_time) / 60,
                 "is_active": session.is_active
             })
 
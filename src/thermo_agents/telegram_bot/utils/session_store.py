@@ -0,0 +1,671 @@
+"""
+Компактное хранилище сессий и последних запросов пользователей Telegram бота.
+
+- UserSession / HistoryRecord: записи со __slots__ (без __dict__ на пользователя)
+- TimeWheel: истечение неактивности за O(1) на сообщение — ключ переносится
+  в ячейку колеса по времени истечения, при обходе снимаются только
+  наступившие ячейки, а не все сессии
+- ContentStore: тексты результатов по sha256 (одинаковые ответы хранятся
+  один раз) с бюджетом памяти; крупные и вытесненные тексты сжимаются
+  и сохраняются на диск по хэшу
+- SessionStore: сессии и последний запрос пользователя, необязательно
+  с сохранением в SQLite — история переживает перезапуск бота
+
+В памяти остаются только пользователи, активные в пределах таймаута. При
+SQLite истекшие записи выгружаются и загружаются обратно при следующем
+обращении; без SQLite они удаляются.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple, Union
+
+from ...models.extraction import ExtractedReactionParameters
+
+DEFAULT_MEMORY_BUDGET = 32 * 1024 * 1024
+DEFAULT_SPILL_THRESHOLD = 64 * 1024
+
+
+@dataclass(slots=True)
+class UserSession:
+    """Информация о сессии пользователя."""
+    user_id: int
+    username: Optional[str]
+    first_name: Optional[str]
+    start_time: float
+    last_activity: float
+    request_count: int = 0
+    is_active: bool = True
+
+
+@dataclass(slots=True)
+class HistoryRecord:
+    """Последний запрос пользователя; текст ответа хранится в ContentStore."""
+    query: str
+    query_type: str
+    content_key: str
+    params: Optional[ExtractedReactionParameters]
+    timestamp: float
+
+
+class TimeWheel:
+    """
+    Ленивое колесо таймеров для истечения неактивности.
+
+    Ключ ставится в ячейку тика истечения один раз — когда запись попадает
+    в память (schedule). Сообщения колесо не трогают: при обходе expire()
+    время последней активности берется из самой записи (last_seen), и ключ,
+    активный после постановки, переносится в ячейку нового срока. Так
+    на ключ приходится один перенос за таймаут, а не операция на каждое
+    сообщение, и не нужен отдельный словарь сроков. Точность истечения —
+    granularity_s.
+    """
+
+    def __init__(self, timeout_s: float, granularity_s: Optional[float] = None):
+        if timeout_s <= 0:
+            raise ValueError("timeout_s должен быть положительным")
+        self.timeout_s = timeout_s
+        self.granularity_s = granularity_s or max(timeout_s / 60, 1.0)
+        # Ключ истекает не раньше timeout_s после последней активности
+        self._timeout_ticks = int(-(-timeout_s // self.granularity_s)) + 1
+        self._slots: List[Set[Hashable]] = [set() for _ in range(self._timeout_ticks + 1)]
+        self._cursor: Optional[int] = None
+
+    def _tick(self, now: float) -> int:
+        return int(now // self.granularity_s)
+
+    def __len__(self) -> int:
+        """Число запланированных ключей."""
+        return sum(len(slot) for slot in self._slots)
+
+    def schedule(self, key: Hashable, now: float) -> None:
+        """Поставить ключ с активностью в момент now."""
+        tick = self._tick(now)
+        self._slots[(tick + self._timeout_ticks) % len(self._slots)].add(key)
+        if self._cursor is None:
+            self._cursor = tick
+
+    def expire(self, now: float, last_seen: Callable[[Hashable], Optional[float]]) -> List[Hashable]:
+        """
+        Снять ключи, неактивные timeout_s к now.
+
+        Args:
+            last_seen: Время последней активности ключа (None — ключ больше
+                не отслеживается и снимается без истечения)
+        """
+        current = self._tick(now)
+        if self._cursor is None or current <= self._cursor:
+            return []
+
+        expired = []
+        # Каждая ячейка обходится не больше одного раза за вызов
+        first = max(self._cursor + 1, current - len(self._slots) + 1)
+        for tick in range(first, current + 1):
+            slot = self._slots[tick % len(self._slots)]
+            keys = list(slot)
+            slot.clear()
+            for key in keys:
+                seen = last_seen(key)
+                if seen is None:
+                    continue
+                due = self._tick(seen) + self._timeout_ticks
+                if due <= current:
+                    expired.append(key)
+                else:
+                    self._slots[due % len(self._slots)].add(key)
+        self._cursor = current
+        return expired
+
+
+class ContentStore:
+    """
+    Тексты результатов по хэшу с бюджетом памяти и сбросом на диск.
+
+    Тексты хранятся сжатыми (zlib), если это уменьшает размер. Счетчик
+    ссылок учитывает записи истории в памяти: при нуле текст удаляется из
+    памяти и с диска. При keep_spilled=True на текст на диске может
+    ссылаться история в SQLite, поэтому удаление с диска откладывается до
+    collect(). Без spill_dir вытесненные по бюджету тексты теряются.
+    """
+
+    def __init__(
+        self,
+        memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET,
+        spill_dir: Optional[Union[str, Path]] = None,
+        spill_threshold_bytes: int = DEFAULT_SPILL_THRESHOLD,
+        keep_spilled: bool = False,
+    ):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.spill_threshold_bytes = spill_threshold_bytes
+        self.keep_spilled = keep_spilled
+        self.memory_bytes = 0
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._refs: Dict[str, int] = {}
+        self._on_disk: Set[str] = set()
+        # Тексты на диске без ссылок в памяти, ожидающие collect()
+        self._released: Set[str] = set()
+        self.spilled = 0
+        self.dropped = 0
+        self.disk_reads = 0
+
+    @staticmethod
+    def key_for(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+    @staticmethod
+    def _encode(text: str) -> bytes:
+        data = text.encode("utf-8")
+        packed = zlib.compress(data, 1)
+        return b"z" + packed if len(packed) < len(data) else b"r" + data
+
+    @staticmethod
+    def _decode(blob: bytes) -> str:
+        data = zlib.decompress(blob[1:]) if blob[:1] == b"z" else blob[1:]
+        return data.decode("utf-8")
+
+    def _path(self, key: str) -> Path:
+        return self.spill_dir / key[:2] / key
+
+    def _is_on_disk(self, key: str) -> bool:
+        if self.spill_dir is None:
+            return False
+        if key not in self._on_disk and self._path(key).exists():
+            self._on_disk.add(key)
+        return key in self._on_disk
+
+    def _write(self, key: str, blob: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(blob)
+        os.replace(tmp, path)
+        self._on_disk.add(key)
+        self.spilled += 1
+
+    def _delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+        self._on_disk.discard(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._memory or self._is_on_disk(key)
+
+    def put(self, text: str) -> str:
+        """Сохранить текст (или добавить ссылку на сохраненный), вернуть ключ."""
+        key = self.key_for(text)
+        self._refs[key] = self._refs.get(key, 0) + 1
+        if key in self._memory:
+            self._memory.move_to_end(key)
+        elif not self._is_on_disk(key):
+            blob = self._encode(text)
+            if self.spill_dir is not None and len(blob) >= self.spill_threshold_bytes:
+                self._write(key, blob)
+            else:
+                self._memory[key] = blob
+                self.memory_bytes += len(blob)
+                self._enforce_budget()
+        return key
+
+    def retain(self, key: str) -> None:
+        """Ссылка на текст, загруженный вместе с записью из SQLite."""
+        self._refs[key] = self._refs.get(key, 0) + 1
+
+    def get(self, key: str) -> Optional[str]:
+        blob = self._memory.get(key)
+        if blob is not None:
+            self._memory.move_to_end(key)
+            return self._decode(blob)
+        if self._is_on_disk(key):
+            try:
+                blob = self._path(key).read_bytes()
+            except OSError:
+                self._on_disk.discard(key)
+                return None
+            self.disk_reads += 1
+            return self._decode(blob)
+        return None
+
+    def persist(self, key: str) -> None:
+        """Записать текст из памяти на диск (остается и в памяти)."""
+        blob = self._memory.get(key)
+        if blob is not None and self.spill_dir is not None and not self._is_on_disk(key):
+            self._write(key, blob)
+
+    def release(self, key: str) -> None:
+        refs = self._refs.get(key, 0) - 1
+        if refs > 0:
+            self._refs[key] = refs
+            return
+        self._refs.pop(key, None)
+        blob = self._memory.pop(key, None)
+        if blob is not None:
+            self.memory_bytes -= len(blob)
+        if self._is_on_disk(key):
+            if self.keep_spilled:
+                self._released.add(key)
+            else:
+                self._delete(key)
+
+    def collect(self, stored: Callable[[Set[str]], Set[str]]) -> int:
+        """
+        Удалить с диска освобожденные тексты, на которые не ссылается
+        сохраненная история.
+
+        Args:
+            stored: Ключи из переданных, на которые ссылается история в SQLite
+
+        Returns:
+            Число удаленных текстов
+        """
+        candidates = {key for key in self._released if key not in self._refs}
+        self._released.clear()
+        if not candidates:
+            return 0
+        unreferenced = candidates - stored(candidates)
+        for key in unreferenced:
+            self._delete(key)
+        return len(unreferenced)
+
+    def _enforce_budget(self) -> None:
+        while self.memory_bytes > self.memory_budget_bytes and len(self._memory) > 1:
+            key, blob = self._memory.popitem(last=False)
+            self.memory_bytes -= len(blob)
+            if self.spill_dir is not None:
+                if not self._is_on_disk(key):
+                    self._write(key, blob)
+            else:
+                self.dropped += 1
+
+    def prune(self, keep: Set[str]) -> int:
+        """Удалить с диска тексты, на которые нет ссылок (кроме keep)."""
+        if self.spill_dir is None or not self.spill_dir.exists():
+            return 0
+        removed = 0
+        for path in self.spill_dir.glob("*/*"):
+            key = path.name
+            if key not in keep and key not in self._refs:
+                self._delete(key)
+                removed += 1
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries_in_memory": len(self._memory),
+            "memory_bytes": self.memory_bytes,
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "spilled": self.spilled,
+            "dropped": self.dropped,
+            "disk_reads": self.disk_reads,
+        }
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    user_id INTEGER PRIMARY KEY,
+    username TEXT,
+    first_name TEXT,
+    start_time REAL NOT NULL,
+    last_activity REAL NOT NULL,
+    request_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS history (
+    user_id INTEGER PRIMARY KEY,
+    query TEXT NOT NULL,
+    query_type TEXT NOT NULL,
+    content_key TEXT NOT NULL,
+    params TEXT,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_content_key ON history (content_key);
+"""
+
+
+class SessionStore:
+    """
+    Сессии и последние запросы пользователей.
+
+    В памяти — только пользователи, активные в пределах timeout_s (колесо
+    таймеров общее для сессии и истории). Изменения пишутся в SQLite
+    пакетно в flush() (write-behind) и при выгрузке истекших записей;
+    отсутствующие в памяти записи загружаются из SQLite при обращении.
+    """
+
+    def __init__(
+        self,
+        timeout_s: float = 3600.0,
+        db_path: Optional[Union[str, Path]] = None,
+        memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET,
+        spill_dir: Optional[Union[str, Path]] = None,
+        spill_threshold_bytes: int = DEFAULT_SPILL_THRESHOLD,
+        granularity_s: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.clock = clock
+        self.sessions: Dict[int, UserSession] = {}
+        self.history: Dict[int, HistoryRecord] = {}
+        self.wheel = TimeWheel(timeout_s, granularity_s)
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path is not None:
+            db_path = Path(db_path)
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            if spill_dir is None:
+                spill_dir = db_path.with_name(db_path.stem + "_results")
+            self._db = sqlite3.connect(str(db_path))
+            self._db.executescript(_SCHEMA)
+
+        self.content = ContentStore(
+            memory_budget_bytes=memory_budget_bytes,
+            spill_dir=spill_dir,
+            spill_threshold_bytes=spill_threshold_bytes,
+            keep_spilled=self._db is not None,
+        )
+        self._dirty_sessions: Set[int] = set()
+        self._dirty_history: Set[int] = set()
+        self.expired_total = 0
+
+        # Тексты на диске, на которые не ссылается сохраненная история
+        # (без SQLite — все, оставшиеся от прошлого запуска)
+        keys = set()
+        if self._db is not None:
+            keys = {row[0] for row in self._db.execute("SELECT content_key FROM history")}
+        self.content.prune(keys)
+
+    @classmethod
+    def from_config(cls, config: Any) -> "SessionStore":
+        """Хранилище по TelegramBotConfig (незаданные параметры — по умолчанию)."""
+        def option(name: str, kind: type, default: Any) -> Any:
+            value = getattr(config, name, default)
+            return value if isinstance(value, kind) else default
+
+        return cls(
+            timeout_s=option("session_timeout_minutes", int, 60) * 60.0,
+            db_path=option("session_store_path", str, None) or None,
+            memory_budget_bytes=option("result_memory_budget_mb", int, 32) * 1024 * 1024,
+            spill_dir=option("result_spill_dir", str, None) or None,
+            spill_threshold_bytes=option("result_spill_threshold_kb", int, 64) * 1024,
+        )
+
+    @property
+    def persistent(self) -> bool:
+        return self._db is not None
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    # Сессии
+
+    def open_session(
+        self,
+        user_id: int,
+        username: Optional[str] = None,
+        first_name: Optional[str] = None,
+    ) -> Tuple[UserSession, bool]:
+        """
+        Сессия пользователя в памяти (загружается из SQLite или создается).
+
+        Returns:
+            (сессия, True если сессия открыта заново, а не продолжена)
+        """
+        now = self.clock()
+        session = self.sessions.get(user_id)
+        opened = session is None
+        if opened:
+            self._schedule(user_id, now)
+            session = self._load_session(user_id)
+            if session is None:
+                session = UserSession(user_id, username, first_name, now, now)
+            else:
+                # Возвращение после таймаута — новая сессия с прежним счетчиком
+                session.start_time = now
+                session.username = username or session.username
+                session.first_name = first_name or session.first_name
+            self.sessions[user_id] = session
+        session.last_activity = now
+        session.is_active = True
+        if self._db is not None:
+            self._dirty_sessions.add(user_id)
+        return session, opened
+
+    def record_activity(self, user_id: int) -> Optional[UserSession]:
+        """Учет запроса пользователя с сессией в памяти."""
+        session = self.sessions.get(user_id)
+        if session is not None:
+            now = self.clock()
+            session.last_activity = now
+            session.request_count += 1
+            if self._db is not None:
+                self._dirty_sessions.add(user_id)
+        return session
+
+    def close_session(self, user_id: int) -> None:
+        """Завершение сессии: запись выгружается из памяти (история остается)."""
+        session = self.sessions.pop(user_id, None)
+        if session is None:
+            return
+        session.is_active = False
+        session.last_activity = self.clock()
+        self._write_sessions([session])
+        self._dirty_sessions.discard(user_id)
+
+    def get_session(self, user_id: int) -> Optional[UserSession]:
+        """Сессия из памяти или последняя сохраненная (без загрузки в память)."""
+        return self.sessions.get(user_id) or self._load_session(user_id)
+
+    def top_sessions(self, limit: int) -> List[UserSession]:
+        """Пользователи с наибольшим числом запросов (с учетом SQLite)."""
+        if self._db is None:
+            return sorted(self.sessions.values(), key=lambda s: s.request_count, reverse=True)[:limit]
+        self.flush()
+        rows = self._db.execute(
+            "SELECT user_id, username, first_name, start_time, last_activity, request_count "
+            "FROM sessions ORDER BY request_count DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return [self.sessions.get(row[0]) or self._session_from_row(row) for row in rows]
+
+    # История
+
+    def save_history(
+        self,
+        user_id: int,
+        query: str,
+        content: str,
+        query_type: str,
+        params: Optional[ExtractedReactionParameters] = None,
+    ) -> HistoryRecord:
+        """Сохранение последнего запроса пользователя (заменяет предыдущий)."""
+        now = self.clock()
+        key = self.content.put(content)
+        previous = self.history.get(user_id)
+        if previous is not None:
+            self.content.release(previous.content_key)
+        record = HistoryRecord(query, query_type, key, params, now)
+        if previous is None:
+            self._schedule(user_id, now)
+        self.history[user_id] = record
+        if self._db is not None:
+            self._dirty_history.add(user_id)
+        return record
+
+    def get_history(self, user_id: int) -> Optional[HistoryRecord]:
+        record = self.history.get(user_id)
+        if record is None and self._db is not None:
+            row = self._db.execute(
+                "SELECT query, query_type, content_key, params, timestamp "
+                "FROM history WHERE user_id = ?",
+                (user_id,),
+            ).fetchone()
+            if row is not None:
+                params = ExtractedReactionParameters.model_validate_json(row[3]) if row[3] else None
+                record = HistoryRecord(row[0], row[1], row[2], params, row[4])
+                self.content.retain(record.content_key)
+                self._schedule(user_id, record.timestamp)
+                self.history[user_id] = record
+        return record
+
+    def get_content(self, record: HistoryRecord) -> str:
+        """Текст ответа записи ('' если вытеснен без сохранения на диск)."""
+        return self.content.get(record.content_key) or ""
+
+    def clear_history(self, user_id: int) -> bool:
+        record = self.get_history(user_id)
+        if record is None:
+            return False
+        del self.history[user_id]
+        self._dirty_history.discard(user_id)
+        if self._db is not None:
+            with self._db:
+                self._db.execute("DELETE FROM history WHERE user_id = ?", (user_id,))
+        self.content.release(record.content_key)
+        return True
+
+    # Обслуживание
+
+    def expire(self) -> List[int]:
+        """
+        Выгрузка пользователей, неактивных дольше таймаута.
+
+        Returns:
+            ID пользователей, чьи сессии истекли
+        """
+        expired = self.wheel.expire(self.clock(), self._last_seen)
+        if not expired:
+            return []
+        sessions = [s for s in (self.sessions.pop(uid, None) for uid in expired) if s is not None]
+        for session in sessions:
+            session.is_active = False
+        records = {uid: self.history.pop(uid) for uid in expired if uid in self.history}
+
+        self._write_sessions(sessions)
+        self._write_history(records)
+        for record in records.values():
+            self.content.release(record.content_key)
+        self._dirty_sessions.difference_update(expired)
+        self._dirty_history.difference_update(expired)
+        self.expired_total += len(expired)
+        return [s.user_id for s in sessions]
+
+    def flush(self) -> None:
+        """
+        Запись измененных записей в SQLite одной транзакцией.
+
+        После записи с диска удаляются тексты, на которые больше не
+        ссылаются ни записи в памяти, ни сохраненная история.
+        """
+        if self._db is None:
+            self._dirty_sessions.clear()
+            self._dirty_history.clear()
+            return
+        self._write_sessions([self.sessions[uid] for uid in self._dirty_sessions if uid in self.sessions])
+        self._write_history({uid: self.history[uid] for uid in self._dirty_history if uid in self.history})
+        self._dirty_sessions.clear()
+        self._dirty_history.clear()
+        self.content.collect(self._stored_content_keys)
+
+    def close(self) -> None:
+        """Завершение всех сессий, сохранение изменений и закрытие SQLite."""
+        now = self.clock()
+        for session in self.sessions.values():
+            session.is_active = False
+            session.last_activity = now
+        self._dirty_sessions.update(self.sessions)
+        self.flush()
+        self.sessions.clear()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "sessions_in_memory": len(self.sessions),
+            "history_in_memory": len(self.history),
+            "scheduled": len(self.wheel),
+            "expired_total": self.expired_total,
+            "persistent": self.persistent,
+            "pending_writes": len(self._dirty_sessions) + len(self._dirty_history),
+            "content": self.content.get_stats(),
+        }
+
+    def _schedule(self, user_id: int, now: float) -> None:
+        """Постановка в колесо пользователя, впервые попавшего в память."""
+        if user_id not in self.sessions and user_id not in self.history:
+            self.wheel.schedule(user_id, now)
+
+    def _last_seen(self, user_id: int) -> Optional[float]:
+        session = self.sessions.get(user_id)
+        record = self.history.get(user_id)
+        if session is None:
+            return record.timestamp if record is not None else None
+        if record is None:
+            return session.last_activity
+        return max(session.last_activity, record.timestamp)
+
+    # SQLite
+
+    @staticmethod
+    def _session_from_row(row: tuple) -> UserSession:
+        return UserSession(row[0], row[1], row[2], row[3], row[4], row[5], is_active=False)
+
+    def _load_session(self, user_id: int) -> Optional[UserSession]:
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT user_id, username, first_name, start_time, last_activity, request_count "
+            "FROM sessions WHERE user_id = ?",
+            (user_id,),
+        ).fetchone()
+        return self._session_from_row(row) if row else None
+
+    def _write_sessions(self, sessions: List[UserSession]) -> None:
+        if self._db is None or not sessions:
+            return
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (s.user_id, s.username, s.first_name, s.start_time, s.last_activity, s.request_count)
+                    for s in sessions
+                ],
+            )
+
+    def _stored_content_keys(self, keys: Set[str]) -> Set[str]:
+        """Ключи из keys, на которые ссылается история в SQLite."""
+        keys = list(keys)
+        stored = set()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self._db.execute(
+                "SELECT DISTINCT content_key FROM history WHERE content_key IN "
+                f"({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            stored.update(row[0] for row in rows)
+        return stored
+
+    def _write_history(self, records: Dict[int, HistoryRecord]) -> None:
+        if self._db is None or not records:
+            return
+        for record in records.values():
+            self.content.persist(record.content_key)
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO history VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        uid,
+                        r.query,
+                        r.query_type,
+                        r.content_key,
+                        r.params.model_dump_json() if r.params is not None else None,
+                        r.timestamp,
+                    )
+                    for uid, r in records.items()
+                ],
+            )
@@ -4,15 +4,21 @@
 Адаптирует интерфейс ThermoSystem для использования в Telegram боте.
 """
 
+import math
 import time
 import asyncio
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
-from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+from dataclasses import dataclass, replace
 
+from ...formatting import ReactionResult
 from ...orchestrator import ThermoOrchestrator, ThermoOrchestratorConfig
 from ...session_logger import SessionLogger
 from ...models.extraction import ExtractedReactionParameters
+from ...utils.admission import AdmissionController, AdmissionRejected
+from ...utils.resilience import Deadline
+from ...utils.single_flight import SingleFlight
 
 
 @dataclass
@@ -25,15 +31,83 @@ class ThermoResponse:
     has_large_tables: bool
     success: bool = True
     error: Optional[str] = None
+    # Параметры, извлеченные LLM, с окном показанной таблицы (для пересчета
+    # без повторного извлечения)
+    params: Optional[ExtractedReactionParameters] = None
+    # Ответ при перегрузке: cached (сохраненный) или brief (краткий)
+    degraded: Optional[str] = None
+    # Оценка ожидания, если запрос не допущен к обработке
+    estimated_wait_s: Optional[float] = None
+    # Структурированный результат реакции: другие форматы ответа строятся
+    # из него без пересчета
+    reaction_result: Optional[ReactionResult] = None
+    # Данные веществ, загруженные при обработке (для пересчета кнопками)
+    frames: Optional[Dict[str, tuple]] = None
+    # Записи, отобранные при расчете (для пересчета на вложенном окне)
+    records_cache: Optional[Dict[tuple, list]] = None
+
+
+OVERLOAD_NOTE = "⚡ Система под высокой нагрузкой"
 
 
 class ThermoIntegration:
     """Интеграция с ThermoOrchestrator для Telegram бота."""
 
-    def __init__(self, config):
+    # Сколько последних успешных ответов хранить для ответа при перегрузке
+    RESPONSE_CACHE_LIMIT = 128
+
+    def __init__(self, config, metrics=None):
+        """
+        Args:
+            config: Конфигурация бота
+            metrics: BotMetrics (опционально) для учета объединенных запросов
+        """
         self.config = config
+        self.metrics = metrics
         self.orchestrator: Optional[ThermoOrchestrator] = None
+
+        # Одинаковые одновременные запросы ждут одну обработку
+        self.query_flight = SingleFlight("query", on_coalesced=self._record_coalesced)
+
+        # Контроль допуска: ограниченная очередь с честным разделением по
+        # пользователям перед обработкой запросов; предел снижается, когда
+        # обработка дольше четверти срока запроса
+        self.admission = AdmissionController(
+            max_concurrency=self._config_int("max_concurrent_requests", 8),
+            max_queue=self._config_int("admission_queue_size", 64),
+            max_queue_per_user=self._config_int("admission_queue_per_user", 3),
+            target_service_s=self._config_int("request_timeout_seconds", 60) / 4,
+            name="query",
+        )
+
+        # Последние успешные ответы: при перегрузке отдаются без обработки
+        self.response_cache: "OrderedDict[str, ThermoResponse]" = OrderedDict()
+
         self._init_orchestrator()
+        if self.orchestrator is not None:
+            self.orchestrator.calculation_flight.on_coalesced = self._record_coalesced
+
+    def _config_int(self, name: str, default: int) -> int:
+        """Целочисленный параметр конфигурации (default, если не задан)."""
+        value = getattr(self.config, name, default)
+        return value if isinstance(value, int) else default
+
+    def _record_coalesced(self, kind: str) -> None:
+        """Учет объединенного запроса в BotMetrics."""
+        if self.metrics is not None:
+            self.metrics.record_coalesced(kind)
+
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """Ключ объединения запросов: без лишних пробелов (регистр важен для формул)."""
+        return " ".join(query.split())
+
+    def get_coalescing_stats(self) -> dict:
+        """Статистика объединения запросов."""
+        stats = {"query": self.query_flight.get_stats()}
+        if self.orchestrator is not None:
+            stats["params"] = self.orchestrator.calculation_flight.get_stats()
+        return stats
 
     def _init_orchestrator(self) -> None:
         """Инициализация ThermoOrchestrator."""
@@ -43,6 +117,7 @@ class ThermoIntegration:
                 llm_api_key=self.config.llm_api_key,
                 llm_base_url=self.config.llm_base_url,
                 llm_model=self.config.llm_model,
+                llm_hedge_model=self.config.llm_hedge_model,
                 db_path=self.config.thermo_db_path,
                 static_data_dir=self.config.thermo_static_data_dir,
                 max_retries=2,
@@ -59,13 +134,23 @@ class ThermoIntegration:
             print(f"Ошибка инициализации ThermoOrchestrator: {e}")
             self.orchestrator = None
 
-    async def process_query(self, query: str, user_id: int) -> ThermoResponse:
+    async def process_query(
+        self,
+        query: str,
+        user_id: int,
+        on_queued: Optional[Callable[[float], Awaitable[None]]] = None
+    ) -> ThermoResponse:
         """
         Обработка термодинамического запроса.
 
+        Запрос проходит контроль допуска: при занятых местах ждет в очереди,
+        при перегрузке получает сохраненный или краткий результат, а если
+        их нет и очередь заполнена — ответ с оценкой ожидания.
+
         Args:
             query: Текст запроса пользователя
             user_id: ID пользователя Telegram
+            on_queued: Вызывается с оценкой ожидания (с), если запрос встал в очередь
 
         Returns:
             ThermoResponse с результатом обработки
@@ -82,10 +167,41 @@ class ThermoIntegration:
             )
 
         start_time = time.time()
+        key = self._normalize_query(query)
+
+        # Срок запроса: ограничивает ожидание в очереди, попытки LLM внутри
+        # оркестратора и ожидание результата здесь
+        deadline = Deadline.after(self.config.request_timeout_seconds)
+
+        # Под нагрузкой уже обработанный запрос получает сохраненный или
+        # краткий результат без очереди и без LLM
+        if self.admission.saturated:
+            degraded = self._degraded_response(key, start_time)
+            if degraded is not None:
+                return degraded
+
+        # Такой же выполняющийся запрос ждется без занятия места
+        ticket = None
+        if key not in self.query_flight:
+            try:
+                ticket = await self.admission.acquire(
+                    user_id, deadline=deadline, on_queued=on_queued
+                )
+            except AdmissionRejected as e:
+                return self._overload_response(e, start_time)
 
+        completed = False
         try:
-            # Обработка запроса через ThermoOrchestrator
-            result = await self.orchestrator.process_query(query)
+            # Обработка запроса через ThermoOrchestrator (одинаковые
+            # одновременные запросы получают результат одной обработки)
+            result = await asyncio.wait_for(
+                self.query_flight.do(
+                    key,
+                    lambda: self.orchestrator.process_query(query, deadline=deadline)
+                ),
+                timeout=deadline.remaining()
+            )
+            completed = True
 
             # Извлечение информации о запросе
             query_info = await self._extract_query_info(query, user_id)
@@ -93,16 +209,26 @@ class ThermoIntegration:
             # Определение наличия больших таблиц
             has_large_tables = self._detect_large_tables(result)
 
+            params = self.orchestrator.get_extracted_params(query)
+
             processing_time = (time.time() - start_time) * 1000
 
-            return ThermoResponse(
+            response = ThermoResponse(
                 content=result,
                 query_type=query_info["query_type"],
                 compounds=query_info["compounds"],
                 processing_time_ms=processing_time,
                 has_large_tables=has_large_tables,
-                success=True
+                success=True,
+                params=self.orchestrator.displayed_params(params)
+                if isinstance(params, ExtractedReactionParameters) else None,
+                reaction_result=self._reaction_result(params),
+                frames=self.orchestrator.get_loaded_frames(query),
+                records_cache=self.orchestrator.get_loaded_records(query)
             )
+            if isinstance(result, str) and not result.startswith("❌"):
+                self._remember_response(key, response)
+            return response
 
         except asyncio.TimeoutError:
             return ThermoResponse(
@@ -126,6 +252,164 @@ class ThermoIntegration:
                 error=f"Ошибка обработки запроса: {str(e)}"
             )
 
+        finally:
+            if ticket is not None:
+                self.admission.release(ticket, success=completed)
+
+    def _reaction_result(
+        self,
+        params: Optional[ExtractedReactionParameters],
+        temperature_range: Optional[List[float]] = None
+    ) -> Optional[ReactionResult]:
+        """Сохраненный оркестратором результат реакции (None для других запросов)."""
+        if not isinstance(params, ExtractedReactionParameters):
+            return None
+        if params.query_type != "reaction_calculation":
+            return None
+        result = self.orchestrator.get_reaction_result(params, temperature_range)
+        return result if isinstance(result, ReactionResult) else None
+
+    def _remember_response(self, key: str, response: ThermoResponse) -> None:
+        """Сохранение ответа (LRU на RESPONSE_CACHE_LIMIT запросов)."""
+        self.response_cache[key] = response
+        self.response_cache.move_to_end(key)
+        while len(self.response_cache) > self.RESPONSE_CACHE_LIMIT:
+            self.response_cache.popitem(last=False)
+
+    def _degraded_response(self, key: str, start_time: float) -> Optional[ThermoResponse]:
+        """
+        Ответ без обработки при перегрузке: сохраненный ответ на тот же
+        запрос или краткий вид сохраненного результата реакции (без расчета).
+
+        Returns:
+            ThermoResponse или None, если запрос еще не обрабатывался или
+            результата реакции нет
+        """
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            self.response_cache.move_to_end(key)
+            return replace(
+                cached,
+                content=f"{OVERLOAD_NOTE}: показан сохраненный результат.\n\n{cached.content}",
+                processing_time_ms=(time.time() - start_time) * 1000,
+                degraded="cached"
+            )
+
+        params = self.orchestrator.get_extracted_params(key)
+        if not isinstance(params, ExtractedReactionParameters):
+            return None
+        content = self.orchestrator.calculate_brief(params)
+        if not isinstance(content, str):
+            return None
+
+        return ThermoResponse(
+            content=(
+                f"{OVERLOAD_NOTE}: краткий результат, полный доступен "
+                f"при повторном запросе позже.\n\n{content}"
+            ),
+            query_type="reaction",
+            compounds=list(params.all_compounds),
+            processing_time_ms=(time.time() - start_time) * 1000,
+            has_large_tables=False,
+            success=True,
+            params=params,
+            degraded="brief"
+        )
+
+    def _overload_response(self, rejection: AdmissionRejected, start_time: float) -> ThermoResponse:
+        """Отказ в обработке с оценкой ожидания."""
+        wait = max(1, math.ceil(rejection.estimated_wait_s))
+        return ThermoResponse(
+            content="",
+            query_type="error",
+            compounds=[],
+            processing_time_ms=(time.time() - start_time) * 1000,
+            has_large_tables=False,
+            success=False,
+            error=(
+                f"{OVERLOAD_NOTE}, ориентировочное ожидание ~{wait} с. "
+                f"Повторите запрос позже."
+            ),
+            estimated_wait_s=rejection.estimated_wait_s
+        )
+
+    def get_admission_stats(self) -> dict:
+        """Предел одновременности, очередь и отказы контроля допуска."""
+        return self.admission.get_stats()
+
+    async def recalculate(
+        self,
+        params: ExtractedReactionParameters,
+        frames: Dict[str, tuple],
+        user_id: int,
+        records_cache: Optional[Dict[tuple, list]] = None
+    ) -> ThermoResponse:
+        """
+        Пересчет с измененными параметрами без обращения к LLM.
+
+        Пересчет проходит тот же контроль допуска, что и запросы, и
+        выполняется в отдельном потоке, не блокируя цикл событий.
+
+        Args:
+            params: Параметры предыдущего запроса с новым температурным окном
+            frames: Кэш загруженных данных веществ пользователя (дополняется)
+            user_id: ID пользователя Telegram
+            records_cache: Кэш отобранных записей пользователя (дополняется)
+
+        Returns:
+            ThermoResponse с результатом пересчета
+        """
+        if not self.orchestrator:
+            return ThermoResponse(
+                content="",
+                query_type="error",
+                compounds=[],
+                processing_time_ms=0,
+                has_large_tables=False,
+                success=False,
+                error="ThermoOrchestrator не инициализирован"
+            )
+
+        query_type = "reaction" if params.query_type == "reaction_calculation" else "compound_data"
+
+        start_time = time.time()
+        deadline = Deadline.after(self.config.request_timeout_seconds)
+        try:
+            async with self.admission.slot(user_id, deadline=deadline):
+                result = await asyncio.to_thread(
+                    self.orchestrator.recalculate, params, frames, records_cache
+                )
+        except AdmissionRejected as e:
+            return self._overload_response(e, start_time)
+        processing_time = (time.time() - start_time) * 1000
+
+        if result.startswith("❌"):
+            return ThermoResponse(
+                content="",
+                query_type="error",
+                compounds=list(params.all_compounds),
+                processing_time_ms=processing_time,
+                has_large_tables=False,
+                success=False,
+                error=result.lstrip("❌ ")
+            )
+
+        return ThermoResponse(
+            content=result,
+            query_type=query_type,
+            compounds=list(params.all_compounds),
+            processing_time_ms=processing_time,
+            has_large_tables=self._detect_large_tables(result),
+            success=True,
+            params=params,
+            reaction_result=self._reaction_result(
+                params,
+                [*params.temperature_range_k, params.temperature_step_k]
+            ),
+            frames=frames,
+            records_cache=records_cache
+        )
+
     async def _extract_query_info(self, query: str, user_id: int) -> dict:
         """
         Извлечение информации о запросе для логирования и статистики.
@@ -292,6 +576,12 @@ class ThermoIntegration:
 
         return False
 
+    def get_llm_resilience_stats(self) -> dict:
+        """Выключатель, дублирующие запросы и задержки LLM."""
+        if not self.orchestrator:
+            return {}
+        return self.orchestrator.get_llm_resilience_stats()
+
     async def health_check(self) -> dict:
         """Проверка здоровья интеграции."""
         try:
@@ -328,7 +618,9 @@ class ThermoIntegration:
                 },
                 "performance": {
                     "llm_response_time_ms": llm_time
-                }
+                },
+                "llm_resilience": self.get_llm_resilience_stats(),
+                "admission": self.get_admission_stats()
             }
 
         except Exception as e:
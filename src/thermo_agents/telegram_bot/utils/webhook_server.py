@@ -0,0 +1,164 @@
+"""
+Webhook сервер Telegram бота на aiohttp.
+
+Принимает обновления от Telegram по HTTPS POST вместо long-polling:
+- проверка секретного токена (X-Telegram-Bot-Api-Secret-Token)
+- ограничение размера тела запроса (413 для слишком больших)
+- обработка обновления в фоне с немедленным ответом 200
+- graceful drain: при остановке новые обновления не принимаются (503),
+  а уже принятые дообрабатываются с ограничением по времени
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Optional, Set
+
+from aiohttp import web
+from telegram import Update
+from telegram.ext import Application
+
+SECRET_TOKEN_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class WebhookServer:
+    """
+    aiohttp сервер, передающий обновления в telegram.ext.Application.
+
+    Args:
+        application: Инициализированное и запущенное Application
+        listen: Адрес для прослушивания
+        port: Порт
+        path: Путь webhook (без ведущего "/")
+        secret_token: Секретный токен, указанный в setWebhook (опционально)
+        max_body_bytes: Максимальный размер тела обновления
+        drain_timeout: Сколько секунд ждать обработки принятых обновлений
+    """
+
+    def __init__(
+        self,
+        application: Application,
+        listen: str = "0.0.0.0",
+        port: int = 8443,
+        path: str = "telegram",
+        secret_token: Optional[str] = None,
+        max_body_bytes: int = 1024 * 1024,
+        drain_timeout: float = 10.0,
+    ):
+        self.application = application
+        self.listen = listen
+        self.port = port
+        self.path = "/" + path.strip("/")
+        self.secret_token = secret_token
+        self.max_body_bytes = max_body_bytes
+        self.drain_timeout = drain_timeout
+
+        self.logger = logging.getLogger(__name__)
+        self._runner: Optional[web.AppRunner] = None
+        self._site: Optional[web.TCPSite] = None
+        self._in_flight: Set[asyncio.Task] = set()
+        self._accepting = False
+
+        # Статистика
+        self.updates_received = 0
+        self.updates_rejected = 0
+        self.last_processing_time_ms = 0.0
+
+    def build_app(self) -> web.Application:
+        """Создание aiohttp приложения с маршрутами webhook и health."""
+        app = web.Application(client_max_size=self.max_body_bytes)
+        app.router.add_post(self.path, self._handle_update)
+        app.router.add_get("/healthz", self._handle_health)
+        return app
+
+    async def start(self) -> None:
+        """Запуск HTTP сервера."""
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        self._site = web.TCPSite(self._runner, self.listen, self.port)
+        await self._site.start()
+        self._accepting = True
+        self.logger.info(f"Webhook сервер слушает {self.listen}:{self.port}{self.path}")
+
+    @property
+    def bound_port(self) -> Optional[int]:
+        """Фактический порт (полезно при port=0 в тестах)."""
+        if self._site is None or self._site._server is None:
+            return None
+        sockets = self._site._server.sockets
+        return sockets[0].getsockname()[1] if sockets else None
+
+    async def _handle_update(self, request: web.Request) -> web.Response:
+        if not self._accepting:
+            self.updates_rejected += 1
+            return web.Response(status=503, text="shutting down")
+
+        if self.secret_token and request.headers.get(SECRET_TOKEN_HEADER) != self.secret_token:
+            self.updates_rejected += 1
+            return web.Response(status=403)
+
+        if request.content_length is not None and request.content_length > self.max_body_bytes:
+            self.updates_rejected += 1
+            return web.Response(status=413)
+
+        try:
+            data = await request.json(loads=json.loads)
+            update = Update.de_json(data, self.application.bot)
+        except web.HTTPRequestEntityTooLarge:
+            self.updates_rejected += 1
+            return web.Response(status=413)
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            self.updates_rejected += 1
+            self.logger.warning(f"Некорректное обновление: {e}")
+            return web.Response(status=400)
+
+        self.updates_received += 1
+        task = asyncio.create_task(self._process(update))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+        # Telegram повторяет доставку при не-200, поэтому отвечаем сразу
+        return web.Response(status=200)
+
+    async def _process(self, update: Update) -> None:
+        start = time.perf_counter()
+        try:
+            # Через update_processor: соблюдается лимит concurrent_updates
+            await self.application.update_processor.process_update(
+                update, self.application.process_update(update)
+            )
+        except Exception as e:
+            self.logger.error(f"Ошибка обработки обновления {update.update_id}: {e}")
+        finally:
+            self.last_processing_time_ms = (time.perf_counter() - start) * 1000
+
+    async def _handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "accepting": self._accepting,
+                "in_flight": len(self._in_flight),
+                "updates_received": self.updates_received,
+                "updates_rejected": self.updates_rejected,
+            }
+        )
+
+    async def stop(self) -> None:
+        """Graceful drain и остановка сервера."""
+        self._accepting = False
+
+        if self._in_flight:
+            self.logger.info(f"Ожидание обработки {len(self._in_flight)} обновлений...")
+            done, pending = await asyncio.wait(
+                set(self._in_flight), timeout=self.drain_timeout
+            )
+            for task in pending:
+                task.cancel()
+            if pending:
+                self.logger.warning(f"Прервано необработанных обновлений: {len(pending)}")
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            self._site = None
+        self.logger.info("Webhook сервер остановлен")
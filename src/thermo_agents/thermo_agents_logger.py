@@ -676,6 +676,7 @@ class SessionLogger:
         llm_response: Any,
         extracted_params: Optional[Any] = None,
         extraction_time_ms: float = 0.0,
+        token_usage: Optional[Dict[str, int]] = None,
     ):
         """
         Логировать взаимодействие с LLM: запрос, ответ и извлечённые параметры.
@@ -685,6 +686,8 @@ class SessionLogger:
             llm_response: Полный ответ от LLM (объект result из pydantic_ai)
             extracted_params: Извлечённые параметры (ExtractedReactionParameters)
             extraction_time_ms: Время выполнения запроса в миллисекундах
+            token_usage: Токены запроса {requests, input_tokens,
+                cache_read_tokens, output_tokens}
         """
         # Базовое детализированное логирование
         separator = "═" * 63
@@ -702,6 +705,16 @@ class SessionLogger:
             self.log_info(f"ВРЕМЯ ВЫПОЛНЕНИЯ: {extraction_time_ms:.1f} мс")
             self.log_info("")
 
+        # Токены (включая повторные вызовы модели при ошибках валидации)
+        if token_usage:
+            self.log_info(
+                f"ТОКЕНЫ: вход {token_usage.get('input_tokens', 0)} "
+                f"(из кэша {token_usage.get('cache_read_tokens', 0)}), "
+                f"выход {token_usage.get('output_tokens', 0)}, "
+                f"вызовов модели {token_usage.get('requests', 0)}"
+            )
+            self.log_info("")
+
         # 3. Валидация структуры и извлечённые параметры
         if extracted_params:
             self.log_info("ИЗВЛЕЧЁННЫЕ ПАРАМЕТРЫ:")
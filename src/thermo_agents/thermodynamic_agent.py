@@ -18,14 +18,41 @@ LLM-компонент гибридной архитектуры v2.0 для и
 - start(): Запустить агента в режиме прослушивания сообщений
 - stop(): Остановить агента
 - extract_parameters(user_query): Извлечь параметры из текстового запроса
+- build_user_prompt(user_query): Сообщение пользователя для режима промпта
 - process_single_query(user_query): Обработать одиночный запрос
 - _process_message(message): Обработать входящее сообщение из storage
 - _initialize_agent(): Создать PydanticAI агент с инструментами
 
-Инструменты PydanticAI:
+Инструменты PydanticAI (только при storage_tools=True):
 - save_to_storage(key, value, ttl): Сохранить данные в хранилище
 - load_from_storage(key): Загрузить данные из хранилища
 
+Режимы промпта (prompt_mode):
+- compact: инструкции один раз в системном префиксе (одинаковом для всех
+  запросов, поэтому кэшируемом провайдером), в сообщении только запрос
+- legacy: полный промпт и в системном, и в пользовательском сообщении
+
+Учет токенов: usage() каждого запроса (вход, из кэша, выход, число
+вызовов модели) передается в SessionLogger.log_llm_interaction и
+суммируется в token_totals.
+
+Устойчивость вызовов модели (extract_parameters):
+- deadline: срок запроса (utils.resilience.Deadline) от обработчика бота;
+  таймауты попыток и паузы между ними ограничены оставшимся временем
+- автоматический выключатель: после breaker_failure_threshold неудач подряд
+  запросы отклоняются сразу, пока провайдер не восстановится
+- дублирующий запрос (hedge_model): если основная модель не ответила за
+  p95 последних успешных вызовов, тот же запрос уходит запасной модели,
+  используется первый ответ
+- общий HTTP-клиент с keep-alive для всех агентов процесса; повторы SDK
+  отключены, повторяет только extract_parameters
+Статистика — get_resilience_stats().
+
+Потоковое извлечение (extract_parameters с on_partial): ответ модели
+читается по мере генерации, и all_compounds / compound_names передаются
+в on_partial (PartialExtraction), как только они провалидированы, — до
+окончания остальных полей. Оркестратор в это время загружает вещества.
+
 Процесс обработки:
 1. Получает сообщение "extract_parameters" из хранилища
 2. Извлекает user_query из payload
@@ -47,7 +74,7 @@ LLM-компонент гибридной архитектуры v2.0 для и
 - Определение типов ошибок (auth, rate limit, network, timeout)
 - Логирование ошибок с детализацией
 - Отправка error-сообщений через storage
-- Retry механизм с увеличением таймаута
+- Retry механизм с увеличением таймаута в пределах срока запроса
 
 Интеграция:
 - Работает с AgentStorage для коммуникации
@@ -69,21 +96,118 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
+import time
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from pydantic import BaseModel
+import httpx
+from openai import AsyncOpenAI
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from pydantic_ai import Agent, RunContext
-from pydantic_ai.models.openai import OpenAIChatModel
+from pydantic_ai.messages import ToolCallPart
+from pydantic_ai.models.openai import OpenAIChatModel, OpenAIChatModelSettings
 from pydantic_ai.providers.openai import OpenAIProvider
+from pydantic_core import from_json
 
 from .agent_storage import AgentStorage, get_storage
 from .models.extraction import ExtractedReactionParameters
 from .operations import OperationType
-from .prompts import THERMODYNAMIC_EXTRACTION_PROMPT
+from .prompts import (
+    EXTRACTION_SYSTEM_PROMPT,
+    EXTRACTION_USER_TEMPLATE,
+    THERMODYNAMIC_EXTRACTION_PROMPT,
+)
 from .thermo_agents_logger import SessionLogger
+from .utils.resilience import CircuitBreaker, CircuitOpenError, Deadline, LatencyTracker
+
+# Поля учета токенов (атрибуты pydantic_ai RunUsage)
+TOKEN_FIELDS = ("requests", "input_tokens", "cache_read_tokens", "output_tokens")
+
+_COMPOUND_NAMES = TypeAdapter(Dict[str, List[str]])
 
+# Успешных вызовов до перехода задержки дублирующего запроса на p95
+HEDGE_MIN_SAMPLES = 20
 
+_shared_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """
+    HTTP-клиент с keep-alive, общий для агентов процесса.
+
+    Соединения с провайдером переиспользуются между запросами (без нового
+    TLS-рукопожатия на каждый запрос). Таймаут чтения — верхняя граница;
+    фактический таймаут задает extract_parameters.
+    """
+    global _shared_http_client
+    if _shared_http_client is None or _shared_http_client.is_closed:
+        _shared_http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(300.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=64, max_keepalive_connections=16, keepalive_expiry=90.0
+            ),
+        )
+    return _shared_http_client
+
+
+@dataclass
+class PartialExtraction:
+    """Поля ExtractedReactionParameters, провалидированные до конца ответа модели."""
+
+    # Вещества, строки которых уже закрыты в JSON ответа
+    all_compounds: List[str] = field(default_factory=list)
+    # Заполняется только целиком, после закрытия объекта compound_names
+    compound_names: Dict[str, List[str]] = field(default_factory=dict)
+    compounds_complete: bool = False
+    names_complete: bool = False
+
+
+def parse_partial_extraction(args: Any) -> PartialExtraction:
+    """
+    Разбор частичных аргументов вызова инструмента вывода.
+
+    Незакрытые строки в частичном JSON отбрасываются, поэтому вещество
+    попадает в результат только целиком ("CO", но не "CO" из "CO2").
+    Поле считается законченным, когда в ответе началось следующее поле.
+
+    Args:
+        args: Накопленные аргументы ToolCallPart (строка JSON или словарь)
+
+    Returns:
+        PartialExtraction (пустой, если JSON еще не разбирается)
+    """
+    partial = PartialExtraction()
+    if isinstance(args, dict):
+        data, complete = args, True
+    else:
+        try:
+            data = from_json(args or "{}", allow_partial=True)
+        except ValueError:
+            return partial
+        complete = False
+    if not isinstance(data, dict):
+        return partial
+
+    keys = list(data)
+
+    def finished(key: str) -> bool:
+        return key in data and (complete or keys[-1] != key)
+
+    compounds = data.get("all_compounds")
+    if isinstance(compounds, list):
+        partial.all_compounds = [
+            c.strip() for c in compounds if isinstance(c, str) and c.strip()
+        ]
+        partial.compounds_complete = finished("all_compounds")
+
+    if finished("compound_names"):
+        try:
+            partial.compound_names = _COMPOUND_NAMES.validate_python(data["compound_names"])
+            partial.names_complete = True
+        except ValidationError:
+            pass
+    return partial
 
 
 @dataclass
@@ -99,6 +223,32 @@ class ThermoAgentConfig:
     session_logger: Optional[SessionLogger] = None
     poll_interval: float = 1.0  # Интервал проверки новых сообщений (секунды)
     max_retries: int = 4
+    # "compact" — инструкции только в системном префиксе; "legacy" — полный
+    # промпт в системном и в пользовательском сообщении
+    prompt_mode: str = "compact"
+    # Инструменты save_to_storage/load_from_storage: каждый их вызов — лишний
+    # запрос к модели, извлечению параметров они не нужны
+    storage_tools: bool = False
+    # prompt_cache_key OpenAI: запросы с одним ключом направляются на один
+    # кэш префикса (None — не передается)
+    prompt_cache_key: Optional[str] = None
+    # Попытки извлечения: таймаут попытки attempt_timeout_s × номер попытки,
+    # пауза между попытками — retry_backoff_s × 2^попытка с джиттером; и то
+    # и другое ограничено сроком запроса (deadline)
+    extraction_attempts: int = 3
+    attempt_timeout_s: float = 30.0
+    retry_backoff_s: float = 1.0
+    # Автоматический выключатель провайдера
+    breaker_failure_threshold: int = 5
+    breaker_reset_s: float = 30.0
+    # Запасная модель для дублирующих запросов (None — без дублирования);
+    # задержка дублирования — p95 успешных вызовов, но не меньше
+    # hedge_min_delay_s, до накопления статистики — hedge_delay_s
+    hedge_model: Optional[str] = None
+    hedge_delay_s: float = 8.0
+    hedge_min_delay_s: float = 1.0
+    # Общий HTTP-клиент с keep-alive (get_shared_http_client)
+    shared_http_client: bool = True
 
 
 class ThermodynamicAgent:
@@ -125,8 +275,23 @@ class ThermodynamicAgent:
         self.logger = config.logger
         self.running = False
 
-        # Инициализация PydanticAI агента
+        # Накопительный учет токенов (см. _record_usage)
+        self.token_totals: Dict[str, int] = dict.fromkeys(TOKEN_FIELDS, 0)
+        self.last_usage: Dict[str, int] = {}
+
+        # Устойчивость вызовов модели (см. extract_parameters)
+        self.breaker = CircuitBreaker(
+            "llm",
+            failure_threshold=config.breaker_failure_threshold,
+            reset_timeout_s=config.breaker_reset_s,
+        )
+        self.latency = LatencyTracker()
+        self.hedge_stats: Dict[str, int] = {"started": 0, "won": 0, "lost": 0}
+
+        # Инициализация PydanticAI агента (и агента запасной модели)
+        self._provider = self._create_provider()
         self.agent = self._initialize_agent()
+        self.hedge_agent: Optional[Agent] = self._initialize_hedge_agent()
 
         # Регистрация в хранилище
         self.storage.start_session(
@@ -143,23 +308,60 @@ class ThermodynamicAgent:
 
         self.logger.info(f"ThermodynamicAgent '{self.agent_id}' initialized")
 
-    def _initialize_agent(self) -> Agent:
-        """Создание PydanticAI агента для извлечения параметров."""
-        provider = OpenAIProvider(
+    def _create_provider(self) -> OpenAIProvider:
+        """Провайдер OpenAI API (с общим HTTP-клиентом, если включен)."""
+        if not self.config.shared_http_client:
+            return OpenAIProvider(
+                api_key=self.config.llm_api_key,
+                base_url=self.config.llm_base_url,
+            )
+
+        # Повторы делает extract_parameters в пределах срока запроса; повторы
+        # SDK (по умолчанию 2) незаметно удлиняли бы каждую попытку
+        client = AsyncOpenAI(
             api_key=self.config.llm_api_key,
-            base_url=self.config.llm_base_url,
+            base_url=self.config.llm_base_url or None,
+            http_client=get_shared_http_client(),
+            max_retries=0,
         )
+        return OpenAIProvider(openai_client=client)
 
-        model = OpenAIChatModel(self.config.llm_model, provider=provider)
+    def _build_agent(self, model_name: str) -> Agent:
+        """PydanticAI агент извлечения параметров для модели model_name."""
+        model = OpenAIChatModel(model_name, provider=self._provider)
+
+        model_settings = None
+        if self.config.prompt_cache_key:
+            model_settings = OpenAIChatModelSettings(
+                extra_body={"prompt_cache_key": self.config.prompt_cache_key}
+            )
 
-        agent = Agent(
+        return Agent(
             model,
             deps_type=ThermoAgentConfig,
             output_type=ExtractedReactionParameters,
-            system_prompt=THERMODYNAMIC_EXTRACTION_PROMPT,
+            system_prompt=(
+                EXTRACTION_SYSTEM_PROMPT
+                if self.config.prompt_mode == "compact"
+                else THERMODYNAMIC_EXTRACTION_PROMPT
+            ),
             retries=self.config.max_retries,
+            model_settings=model_settings,
         )
 
+    def _initialize_hedge_agent(self) -> Optional[Agent]:
+        """Агент запасной модели для дублирующих запросов (без инструментов)."""
+        if not self.config.hedge_model:
+            return None
+        return self._build_agent(self.config.hedge_model)
+
+    def _initialize_agent(self) -> Agent:
+        """Создание PydanticAI агента для извлечения параметров."""
+        agent = self._build_agent(self.config.llm_model)
+
+        if not self.config.storage_tools:
+            return agent
+
         # Добавляем инструменты для работы с хранилищем
         @agent.tool
         async def save_to_storage(
@@ -184,6 +386,63 @@ class ThermodynamicAgent:
 
         return agent
 
+    def build_user_prompt(self, user_query: str) -> str:
+        """Сообщение пользователя: только запрос (compact) или полный промпт (legacy)."""
+        if self.config.prompt_mode == "compact":
+            return EXTRACTION_USER_TEMPLATE.format(user_query=user_query)
+        return THERMODYNAMIC_EXTRACTION_PROMPT.format(user_query=user_query)
+
+    async def _run_streaming(
+        self, prompt: str, on_partial: Callable[[PartialExtraction], None]
+    ):
+        """
+        Потоковый запуск агента: on_partial вызывается при каждом новом
+        провалидированном веществе и при завершении compound_names.
+
+        Returns:
+            (result, ExtractedReactionParameters)
+        """
+        emitted: List[str] = []
+        names_emitted = False
+
+        async with self.agent.run_stream(prompt, deps=self.config) as result:
+            async for response, _ in result.stream_responses(debounce_by=None):
+                calls = [part for part in response.parts if isinstance(part, ToolCallPart)]
+                if not calls:
+                    continue
+                partial = parse_partial_extraction(calls[-1].args)
+
+                new_names = partial.names_complete and not names_emitted
+                if partial.all_compounds == emitted and not new_names:
+                    continue
+                emitted = partial.all_compounds
+                names_emitted = names_emitted or partial.names_complete
+
+                try:
+                    on_partial(partial)
+                except Exception as e:
+                    self.logger.warning(f"Ошибка обработки частичных параметров: {e}")
+
+            output = await result.get_output()
+        return result, output
+
+    def _record_usage(self, result) -> Dict[str, int]:
+        """
+        Токены одного извлечения из result.usage() (с учетом повторов модели
+        при ошибках валидации) и обновление token_totals.
+        """
+        try:
+            usage = result.usage()
+            tokens = {name: int(getattr(usage, name) or 0) for name in TOKEN_FIELDS}
+        except Exception as e:
+            self.logger.debug(f"Нет данных об использовании токенов: {e}")
+            return {}
+
+        for name, value in tokens.items():
+            self.token_totals[name] += value
+        self.last_usage = tokens
+        return tokens
+
     async def start(self):
         """
         Запустить агента в режиме прослушивания сообщений.
@@ -267,11 +526,12 @@ class ThermodynamicAgent:
 
                 extraction_start = time.time()
                 result = await asyncio.wait_for(
-                    self.agent.run(user_query, deps=self.config),
+                    self.agent.run(self.build_user_prompt(user_query), deps=self.config),
                     timeout=30.0,  # 30 секунд на ответ модели + network
                 )
                 extraction_time_ms = (time.time() - extraction_start) * 1000
                 extracted_params = result.output
+                token_usage = self._record_usage(result)
 
                 self.logger.info(
                     f"Successfully extracted parameters: {extracted_params.intent}, compounds: {extracted_params.compounds}"
@@ -284,6 +544,7 @@ class ThermodynamicAgent:
                         llm_response=result,
                         extracted_params=extracted_params,
                         extraction_time_ms=extraction_time_ms,
+                        token_usage=token_usage,
                     )
 
                 # Дополнительное логирование для реакции
@@ -459,37 +720,158 @@ class ThermodynamicAgent:
             if self.config.session_logger:
                 self.config.session_logger.log_info(f"EXTRACTION ERROR: {str(e)[:100]}")
 
-    async def extract_parameters(self, user_query: str) -> ExtractedReactionParameters:
+    def hedge_delay(self) -> float:
+        """Задержка дублирующего запроса: p95 успешных вызовов модели."""
+        if self.latency.count < HEDGE_MIN_SAMPLES:
+            return self.config.hedge_delay_s
+        return max(self.config.hedge_min_delay_s, self.latency.percentile(0.95))
+
+    async def _run_primary(
+        self, prompt: str, on_partial: Optional[Callable[[PartialExtraction], None]]
+    ):
+        """Вызов основной модели: (result, ExtractedReactionParameters)."""
+        if on_partial is None:
+            result = await self.agent.run(prompt, deps=self.config)
+            return result, result.output
+        return await self._run_streaming(prompt, on_partial)
+
+    async def _run_hedge(self, prompt: str):
+        """Вызов запасной модели (без потокового режима)."""
+        result = await self.hedge_agent.run(prompt, deps=self.config)
+        return result, result.output
+
+    async def _run_attempt(
+        self,
+        prompt: str,
+        on_partial: Optional[Callable[[PartialExtraction], None]],
+        timeout: float,
+    ):
+        """
+        Одна попытка извлечения с таймаутом и, если задана запасная модель,
+        дублирующим запросом после hedge_delay(). Побеждает первый успешный
+        ответ; второй запрос отменяется.
+
+        Raises:
+            CircuitOpenError: Выключатель открыт, модель не вызывалась
+            asyncio.TimeoutError: Ни один запрос не ответил за timeout
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(
+                f"LLM временно недоступна, повтор через {self.breaker.retry_after():.0f} с"
+            )
+
+        try:
+            return await self._race_models(prompt, on_partial, timeout)
+        except BaseException as e:
+            # Ошибки попытки учитывает extract_parameters; отмена запроса
+            # (CancelledError) — не результат пробного вызова, и без возврата
+            # разрешения выключатель в half_open отклонял бы все вызовы
+            if not isinstance(e, Exception):
+                self.breaker.release_probe()
+            raise
+
+    async def _race_models(
+        self,
+        prompt: str,
+        on_partial: Optional[Callable[[PartialExtraction], None]],
+        timeout: float,
+    ):
+        """Основной запрос и, после hedge_delay(), дублирующий (см. _run_attempt)."""
+        primary = asyncio.ensure_future(self._run_primary(prompt, on_partial))
+        delay = self.hedge_delay()
+        if self.hedge_agent is None or delay >= timeout:
+            return await asyncio.wait_for(primary, timeout=timeout)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        hedge = None
+        try:
+            await asyncio.wait({primary}, timeout=delay)
+            if primary.done():
+                return primary.result()
+
+            self.hedge_stats["started"] += 1
+            self.logger.info(f"Дублирующий запрос к {self.config.hedge_model} через {delay:.1f} с")
+            hedge = asyncio.ensure_future(self._run_hedge(prompt))
+            pending = {primary, hedge}
+            while pending:
+                remaining = timeout - (loop.time() - started)
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(0.0, remaining), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise asyncio.TimeoutError()
+                for task in done:
+                    if task.exception() is None:
+                        self.hedge_stats["won" if task is hedge else "lost"] += 1
+                        return task.result()
+            # Оба запроса завершились ошибкой
+            return primary.result()
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def _backoff_delay(self, attempt: int, deadline: Optional[Deadline]) -> Optional[float]:
+        """
+        Пауза перед следующей попыткой (экспоненциальная с джиттером).
+
+        Returns:
+            Длительность паузы или None, если после паузы до срока запроса
+            не останется времени на попытку
+        """
+        delay = self.config.retry_backoff_s * (2 ** attempt) * random.uniform(0.5, 1.0)
+        if deadline is not None and deadline.remaining() <= delay + self.config.hedge_min_delay_s:
+            return None
+        return delay
+
+    async def extract_parameters(
+        self,
+        user_query: str,
+        on_partial: Optional[Callable[[PartialExtraction], None]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> ExtractedReactionParameters:
         """
         Извлечение параметров из запроса пользователя.
 
         Args:
             user_query: Запрос на естественном языке
+            on_partial: Потоковый режим: вызывается с частичными параметрами
+                (all_compounds, compound_names) до окончания ответа модели.
+                При повторной попытке частичные параметры могут не совпасть
+                с итоговыми — итоговым считается возвращенный результат.
+            deadline: Срок запроса; попытки и паузы между ними не выходят за
+                него (без срока — только таймауты попыток)
 
         Returns:
             ExtractedReactionParameters
 
         Raises:
-            ValueError: Если извлечённые данные некорректны
+            ValueError: Если извлечённые данные некорректны, модель не ответила
+                до срока или выключатель провайдера открыт
         """
-        max_retries = 3
+        max_retries = self.config.extraction_attempts
+        missing = None
 
         for attempt in range(max_retries):
-            try:
-                import asyncio
-                import time
+            timeout = self.config.attempt_timeout_s * (attempt + 1)
+            if deadline is not None:
+                timeout = deadline.timeout(timeout)
+            is_last = attempt == max_retries - 1
 
-                timeout = 30.0 * (attempt + 1)
+            try:
+                if timeout <= 0:
+                    raise asyncio.TimeoutError()
 
                 # Формируем промпт
-                prompt = THERMODYNAMIC_EXTRACTION_PROMPT.format(user_query=user_query)
+                prompt = self.build_user_prompt(user_query)
 
                 extraction_start = time.time()
-                result = await asyncio.wait_for(
-                    self.agent.run(prompt, deps=self.config), timeout=timeout
-                )
+                result, extracted_params = await self._run_attempt(prompt, on_partial, timeout)
                 extraction_time_ms = (time.time() - extraction_start) * 1000
-                extracted_params = result.output
+                self.breaker.record_success()
+                self.latency.record(extraction_time_ms / 1000)
+                token_usage = self._record_usage(result)
 
                 # НОВОЕ: Структурированное логирование LLM взаимодействия
                 if self.config.session_logger:
@@ -498,16 +880,14 @@ class ThermodynamicAgent:
                         llm_response=result,
                         extracted_params=extracted_params,
                         extraction_time_ms=extraction_time_ms,
+                        token_usage=token_usage,
                     )
 
                 # Проверка полноты
                 if not extracted_params.is_complete():
                     missing = ", ".join(extracted_params.missing_fields)
-                    if attempt == max_retries - 1:
-                        raise ValueError(
-                            f"Не удалось извлечь обязательные поля: {missing}. "
-                            f"Пожалуйста, уточните запрос."
-                        )
+                    if deadline is not None and deadline.expired:
+                        break
                     continue
 
                 self.logger.info(
@@ -515,21 +895,33 @@ class ThermodynamicAgent:
                 )
                 return extracted_params
 
+            except CircuitOpenError as e:
+                # Провайдер деградировал: без повторов, сразу ответ пользователю
+                self.logger.warning(f"extract_parameters rejected: {e}")
+                raise ValueError(
+                    "Модель временно недоступна: провайдер не отвечает. "
+                    "Попробуйте повторить запрос через минуту."
+                )
+
             except asyncio.TimeoutError:
+                self.breaker.record_failure()
                 self.logger.error(
                     f"Timeout in extract_parameters (attempt {attempt + 1}/{max_retries})"
                 )
-                if attempt == max_retries - 1:
+                delay = None if is_last else self._backoff_delay(attempt, deadline)
+                if delay is None:
                     raise ValueError(
                         f"Не удалось извлечь параметры: превышено время ожидания ответа от модели. Попробуйте упростить запрос."
                     )
-                await asyncio.sleep(1)
+                await asyncio.sleep(delay)
 
             except Exception as e:
+                self.breaker.record_failure()
                 self.logger.error(
                     f"Error in extract_parameters (attempt {attempt + 1}/{max_retries}): {e}"
                 )
-                if attempt == max_retries - 1:
+                delay = None if is_last else self._backoff_delay(attempt, deadline)
+                if delay is None:
                     if "status_code: 401" in str(e) or "No auth credentials" in str(e):
                         raise ValueError(
                             "Ошибка аутентификации: проверьте API ключ для доступа к модели."
@@ -542,8 +934,13 @@ class ThermodynamicAgent:
                         raise ValueError(
                             f"Не удалось извлечь параметры: {str(e)[:100]}..."
                         )
-                await asyncio.sleep(1)
+                await asyncio.sleep(delay)
 
+        if missing is not None:
+            raise ValueError(
+                f"Не удалось извлечь обязательные поля: {missing}. "
+                f"Пожалуйста, уточните запрос."
+            )
         raise ValueError(f"Не удалось извлечь параметры после {max_retries} попыток.")
 
     async def process_single_query(
@@ -566,7 +963,32 @@ class ThermodynamicAgent:
     def get_status(self) -> Dict:
         """Получить статус агента."""
         session = self.storage.get_session(self.agent_id)
-        return {"agent_id": self.agent_id, "running": self.running, "session": session}
+        return {
+            "agent_id": self.agent_id,
+            "running": self.running,
+            "session": session,
+            "prompt_mode": self.config.prompt_mode,
+            "token_usage": dict(self.token_totals),
+            "resilience": self.get_resilience_stats(),
+        }
+
+    def get_resilience_stats(self) -> Dict[str, Any]:
+        """Состояние выключателя, дублирующие запросы и задержки модели."""
+        p50 = self.latency.percentile(0.5)
+        p95 = self.latency.percentile(0.95)
+        return {
+            "breaker": self.breaker.get_stats(),
+            "hedging": {
+                "model": self.config.hedge_model,
+                "delay_s": round(self.hedge_delay(), 3),
+                **self.hedge_stats,
+            },
+            "latency": {
+                "samples": self.latency.count,
+                "p50_s": round(p50, 3) if p50 is not None else None,
+                "p95_s": round(p95, 3) if p95 is not None else None,
+            },
+        }
 
 
 # =============================================================================
@@ -580,6 +1002,10 @@ def create_thermo_agent(
     llm_model: str = "openai:gpt-4o",
     storage: Optional[AgentStorage] = None,
     logger: Optional[logging.Logger] = None,
+    prompt_mode: str = "compact",
+    storage_tools: bool = False,
+    prompt_cache_key: Optional[str] = None,
+    hedge_model: Optional[str] = None,
 ) -> ThermodynamicAgent:
     """
     Создать термодинамического агента.
@@ -590,6 +1016,10 @@ def create_thermo_agent(
         llm_model: Модель LLM
         storage: Хранилище (или будет использовано глобальное)
         logger: Логгер
+        prompt_mode: Режим промпта ("compact" или "legacy")
+        storage_tools: Подключить инструменты хранилища
+        prompt_cache_key: Ключ кэша промптов OpenAI
+        hedge_model: Запасная модель для дублирующих запросов
 
     Returns:
         Настроенный термодинамический агент
@@ -600,6 +1030,10 @@ def create_thermo_agent(
         llm_model=llm_model,
         storage=storage or get_storage(),
         logger=logger or logging.getLogger(__name__),
+        prompt_mode=prompt_mode,
+        storage_tools=storage_tools,
+        prompt_cache_key=prompt_cache_key,
+        hedge_model=hedge_model,
     )
 
     return ThermodynamicAgent(config)
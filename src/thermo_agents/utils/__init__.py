@@ -2,6 +2,11 @@
 
 from .chem_utils import (
     parse_formula,
+    parse_composition,
+    composition_signature,
+    strip_phase_suffix,
+    is_composite_formula,
+    find_formulas,
     sum_formulas,
     is_ionic_formula,
     is_ionic_name,
@@ -9,13 +14,29 @@ from .chem_utils import (
     normalize_composite_formula,
     expand_composite_candidates,
 )
+from .admission import AdmissionController, AdmissionRejected, AdmissionTicket
+from .resilience import CircuitBreaker, CircuitOpenError, Deadline, LatencyTracker
+from .single_flight import SingleFlight
 
 __all__ = [
     'parse_formula',
+    'parse_composition',
+    'composition_signature',
+    'strip_phase_suffix',
+    'is_composite_formula',
+    'find_formulas',
     'sum_formulas',
     'is_ionic_formula',
     'is_ionic_name',
     'query_contains_charge',
     'normalize_composite_formula',
     'expand_composite_candidates',
+    'SingleFlight',
+    'Deadline',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'LatencyTracker',
+    'AdmissionController',
+    'AdmissionRejected',
+    'AdmissionTicket',
 ]
\ No newline at end of file
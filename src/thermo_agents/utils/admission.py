@@ -0,0 +1,372 @@
+"""
+Контроль допуска запросов при перегрузке.
+
+AdmissionController стоит перед обработкой запроса: одновременно
+выполняется не больше concurrency_limit запросов, остальные ждут в
+ограниченной очереди. Очередь разделена по пользователям и обслуживается
+по схеме deficit round robin (DRR): при каждом обходе пользователь
+получает quantum единиц стоимости и тратит их на свои запросы, поэтому
+пользователь с десятком запросов в очереди задерживает остальных не
+больше, чем на свою долю.
+
+Предел одновременности подстраивается по измеренному времени обслуживания
+(градиент целевого и краткосрочного среднего времени): когда запросы
+начинают выполняться медленнее цели, предел снижается и лишняя нагрузка
+ждет в очереди, а не растягивает все выполняющиеся запросы. Цель задается
+явно (target_service_s) или берется как LATENCY_TOLERANCE × долгосрочное
+среднее; долгосрочное среднее при длительной перегрузке само растет, поэтому
+для сервисов с известным бюджетом времени цель лучше задать. Ожидание в очереди
+оценивается по очереди и времени обслуживания; запрос, который не успеет
+начаться до своего срока (Deadline), отклоняется сразу с оценкой ожидания.
+"""
+
+import asyncio
+import inspect
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Hashable, Optional
+
+from .resilience import Deadline, LatencyTracker
+
+# Сглаживание времени обслуживания: краткосрочное и долгосрочное среднее
+SHORT_ALPHA = 0.2
+LONG_ALPHA = 0.02
+
+# Допустимое замедление относительно долгосрочного среднего до снижения
+# предела (если цель не задана)
+LATENCY_TOLERANCE = 1.5
+MIN_GRADIENT = 0.5
+LIMIT_SMOOTHING = 0.2
+
+
+class AdmissionRejected(RuntimeError):
+    """
+    Запрос не допущен к обработке.
+
+    Attributes:
+        reason: queue_full | user_queue_full | deadline | expired
+        estimated_wait_s: Оценка ожидания в очереди на момент отказа
+    """
+
+    def __init__(self, reason: str, estimated_wait_s: float):
+        super().__init__(
+            f"Запрос не допущен ({reason}), ожидание ~{estimated_wait_s:.0f} с"
+        )
+        self.reason = reason
+        self.estimated_wait_s = estimated_wait_s
+
+
+@dataclass
+class AdmissionTicket:
+    """Допуск к обработке; возвращается контроллеру через release()."""
+
+    user_id: Hashable
+    cost: float
+    enqueued_at: float
+    started_at: float = 0.0
+    released: bool = False
+
+    @property
+    def queued_s(self) -> float:
+        """Время ожидания в очереди."""
+        return self.started_at - self.enqueued_at
+
+
+@dataclass(eq=False)
+class _Waiter:
+    ticket: AdmissionTicket
+    future: asyncio.Future
+
+
+class AdmissionController:
+    """
+    Ограниченная очередь с честным разделением по пользователям и
+    адаптивным пределом одновременности.
+
+    Args:
+        max_concurrency: Верхняя граница (и начальное значение) предела
+        min_concurrency: Нижняя граница предела
+        max_queue: Запросов в очереди всего
+        max_queue_per_user: Запросов в очереди одного пользователя
+        quantum: Единиц стоимости на пользователя за обход DRR
+        initial_service_s: Оценка времени обслуживания до первых замеров
+        target_service_s: Целевое время обслуживания (None — по долгосрочному среднему)
+        name: Имя (для статистики)
+        clock: Монотонные часы (подменяются в тестах)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_queue: int = 64,
+        max_queue_per_user: int = 4,
+        quantum: float = 1.0,
+        initial_service_s: float = 5.0,
+        target_service_s: Optional[float] = None,
+        name: str = "default",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min(min_concurrency, max_concurrency)
+        self.max_queue = max_queue
+        self.max_queue_per_user = max_queue_per_user
+        self.quantum = quantum
+        self.target_service_s = target_service_s
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+
+        # Очереди пользователей и порядок обхода DRR
+        self._queues: Dict[Hashable, Deque[_Waiter]] = {}
+        self._rotation: Deque[Hashable] = deque()
+        self._deficit: Dict[Hashable, float] = {}
+        self._queued = 0
+
+        # Время обслуживания: краткосрочное и долгосрочное среднее
+        self._service_short = initial_service_s
+        self._service_long = initial_service_s
+        self._service_samples = 0
+
+        # Статистика
+        self.admitted = 0
+        self.queued_total = 0
+        self.completed = 0
+        self.rejected: Dict[str, int] = {}
+        self.queue_wait = LatencyTracker(window=500)
+
+    @property
+    def concurrency_limit(self) -> int:
+        """Текущий предел одновременно выполняемых запросов."""
+        return max(self.min_concurrency, int(self.limit))
+
+    @property
+    def queued(self) -> int:
+        """Запросов в очереди."""
+        return self._queued
+
+    @property
+    def saturated(self) -> bool:
+        """Нет свободного места: новый запрос будет ждать в очереди."""
+        return self.in_flight >= self.concurrency_limit or self._queued > 0
+
+    @property
+    def service_time_s(self) -> float:
+        """Краткосрочное среднее время обслуживания."""
+        return self._service_short
+
+    def estimate_wait(self, user_id: Optional[Hashable] = None) -> float:
+        """
+        Оценка ожидания нового запроса пользователя в очереди.
+
+        При DRR запрос пользователя с k запросами в очереди начнется после
+        его k запросов и не больше k + 1 запросов каждого другого
+        пользователя; очередь разбирается со скоростью
+        concurrency_limit / service_time_s запросов в секунду.
+        """
+        if not self.saturated:
+            return 0.0
+        own = len(self._queues.get(user_id, ()))
+        ahead = own + sum(
+            min(len(queue), own + 1)
+            for uid, queue in self._queues.items()
+            if uid != user_id
+        )
+        return (ahead + 1) * self._service_short / self.concurrency_limit
+
+    async def acquire(
+        self,
+        user_id: Hashable,
+        cost: float = 1.0,
+        deadline: Optional[Deadline] = None,
+        on_queued: Optional[Callable[[float], Any]] = None,
+    ) -> AdmissionTicket:
+        """
+        Получить допуск к обработке (с ожиданием в очереди при необходимости).
+
+        Args:
+            user_id: Пользователь (единица честного разделения)
+            cost: Стоимость запроса в единицах quantum
+            deadline: Срок запроса: ожидание ограничено им
+            on_queued: Вызывается с оценкой ожидания, если запрос встал в
+                очередь (может быть корутинной функцией)
+
+        Returns:
+            AdmissionTicket, который нужно вернуть через release()
+
+        Raises:
+            AdmissionRejected: Очередь заполнена, запрос не успеет начаться
+                до срока или срок истек в очереди
+        """
+        ticket = AdmissionTicket(user_id, cost, self.clock())
+        if not self.saturated:
+            self._start(ticket)
+            return ticket
+
+        wait = self.estimate_wait(user_id)
+        if self._queued >= self.max_queue:
+            self._reject("queue_full", wait)
+        if len(self._queues.get(user_id, ())) >= self.max_queue_per_user:
+            self._reject("user_queue_full", wait)
+        if deadline is not None and wait >= deadline.remaining():
+            self._reject("deadline", wait)
+
+        waiter = _Waiter(ticket, asyncio.get_running_loop().create_future())
+        if user_id not in self._queues:
+            self._queues[user_id] = deque()
+            self._rotation.append(user_id)
+            self._deficit[user_id] = 0.0
+        self._queues[user_id].append(waiter)
+        self._queued += 1
+        self.queued_total += 1
+
+        try:
+            if on_queued is not None:
+                try:
+                    result = on_queued(wait)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    self.logger.warning(f"Ошибка уведомления об очереди: {e}")
+
+            timeout = deadline.remaining() if deadline is not None else None
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+            return ticket
+        except BaseException as e:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Допуск выдан одновременно с отменой: возвращаем место
+                self.release(ticket, success=False)
+            else:
+                waiter.future.cancel()
+                self._remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                self._reject("expired", self.estimate_wait(user_id))
+            raise
+
+    def release(self, ticket: AdmissionTicket, success: bool = True) -> None:
+        """
+        Вернуть допуск после обработки.
+
+        Args:
+            ticket: Допуск из acquire()
+            success: Обработка завершилась (время обслуживания учитывается
+                только для завершенных запросов)
+        """
+        if ticket.released:
+            return
+        ticket.released = True
+        self.in_flight -= 1
+        self.completed += 1
+        if success:
+            self._record_service(self.clock() - ticket.started_at)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        user_id: Hashable,
+        cost: float = 1.0,
+        deadline: Optional[Deadline] = None,
+        on_queued: Optional[Callable[[float], Any]] = None,
+    ) -> AsyncIterator[AdmissionTicket]:
+        """Допуск на время блока: acquire() и release() по его завершении."""
+        ticket = await self.acquire(user_id, cost, deadline, on_queued)
+        success = False
+        try:
+            yield ticket
+            success = True
+        finally:
+            self.release(ticket, success=success)
+
+    def _start(self, ticket: AdmissionTicket) -> None:
+        ticket.started_at = self.clock()
+        self.in_flight += 1
+        self.admitted += 1
+        self.queue_wait.record(ticket.queued_s)
+
+    def _reject(self, reason: str, wait: float) -> None:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        raise AdmissionRejected(reason, wait)
+
+    def _remove(self, waiter: _Waiter) -> None:
+        user_id = waiter.ticket.user_id
+        queue = self._queues.get(user_id)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        self._queued -= 1
+        if not queue:
+            self._drop_user(user_id)
+
+    def _drop_user(self, user_id: Hashable) -> None:
+        del self._queues[user_id]
+        del self._deficit[user_id]
+        self._rotation.remove(user_id)
+
+    def _dispatch(self) -> None:
+        """Выдача допусков по DRR, пока есть свободные места."""
+        while self.in_flight < self.concurrency_limit and self._rotation:
+            user_id = self._rotation[0]
+            queue = self._queues[user_id]
+            waiter = queue[0]
+
+            if self._deficit[user_id] < waiter.ticket.cost:
+                # Новый обход: пользователь получает quantum и ждет очереди
+                self._deficit[user_id] += self.quantum
+                self._rotation.rotate(-1)
+                continue
+
+            queue.popleft()
+            self._queued -= 1
+            self._deficit[user_id] -= waiter.ticket.cost
+            if not queue:
+                # Пользователь без запросов не копит дефицит
+                self._drop_user(user_id)
+
+            self._start(waiter.ticket)
+            waiter.future.set_result(None)
+
+    def _record_service(self, seconds: float) -> None:
+        """Обновление средних времени обслуживания и предела одновременности."""
+        if self._service_samples == 0:
+            self._service_short = self._service_long = seconds
+        else:
+            self._service_short += SHORT_ALPHA * (seconds - self._service_short)
+            self._service_long += LONG_ALPHA * (seconds - self._service_long)
+        self._service_samples += 1
+
+        if self._service_short <= 0:
+            return
+        target = self.target_service_s or LATENCY_TOLERANCE * self._service_long
+        gradient = max(MIN_GRADIENT, min(1.0, target / self._service_short))
+        target = self.limit * gradient + math.sqrt(self.limit)
+        self.limit = self.limit * (1 - LIMIT_SMOOTHING) + target * LIMIT_SMOOTHING
+        self.limit = max(float(self.min_concurrency), min(float(self.max_concurrency), self.limit))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Предел, очередь, время обслуживания и счетчики отказов."""
+        p50 = self.queue_wait.percentile(0.5)
+        p95 = self.queue_wait.percentile(0.95)
+        return {
+            "name": self.name,
+            "concurrency_limit": self.concurrency_limit,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queued": self._queued,
+            "users_queued": len(self._queues),
+            "admitted": self.admitted,
+            "queued_total": self.queued_total,
+            "completed": self.completed,
+            "rejected": dict(self.rejected),
+            "service_time_s": round(self._service_short, 3),
+            "estimated_wait_s": round(self.estimate_wait(), 3),
+            "queue_wait_p50_s": round(p50, 3) if p50 is not None else None,
+            "queue_wait_p95_s": round(p95, 3) if p95 is not None else None,
+        }
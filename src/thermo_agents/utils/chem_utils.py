@@ -1,6 +1,6 @@
 """Utilities for chemical formula parsing and manipulation."""
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 import re
 import logging
 
@@ -51,6 +51,191 @@ def parse_formula(formula: str) -> Dict[str, int]:
     return total_counts
 
 
+_TOKEN_RE = re.compile(r'([A-Z][a-z]?)|(\d+(?:\.\d+)?)|([(\[])|([)\]])')
+_LEADING_COEFF_RE = re.compile(r'^(\d+(?:\.\d+)?)(?=[A-Z(\[])')
+_PHASE_SUFFIX_RE = re.compile(r'\([a-z][a-z0-9,]*\)$')
+_COMPOSITE_SPLIT_RE = re.compile(r'[*·]|(?<!\d)\.|\.(?!\d)')
+
+
+def _parse_composition_part(part: str) -> Optional[Dict[str, float]]:
+    """Parse one composite part with groups and an optional leading coefficient."""
+    multiplier = 1.0
+    match = _LEADING_COEFF_RE.match(part)
+    if match:
+        multiplier = float(match.group(1))
+        part = part[match.end():]
+
+    stack: List[Dict[str, float]] = [{}]
+    last: Optional[Dict[str, float]] = None  # last element/group for a following count
+    pos = 0
+    for token in _TOKEN_RE.finditer(part):
+        if token.start() != pos:
+            return None  # unexpected characters (charges, lowercase text, ...)
+        pos = token.end()
+        element, number, open_bracket, close_bracket = token.groups()
+
+        if element:
+            last = {element: 1.0}
+            stack[-1][element] = stack[-1].get(element, 0.0) + 1.0
+        elif number:
+            if last is None:
+                return None
+            factor = float(number) - 1.0
+            for el, count in last.items():
+                stack[-1][el] = stack[-1].get(el, 0.0) + count * factor
+            last = None
+        elif open_bracket:
+            stack.append({})
+            last = None
+        else:
+            if len(stack) == 1:
+                return None
+            group = stack.pop()
+            for el, count in group.items():
+                stack[-1][el] = stack[-1].get(el, 0.0) + count
+            last = group
+
+    if pos != len(part) or len(stack) != 1 or not stack[0]:
+        return None
+    return {el: count * multiplier for el, count in stack[0].items()}
+
+
+def strip_phase_suffix(formula: str) -> str:
+    """
+    Formula without whitespace and trailing phase annotations.
+
+    Example: "H2O(g)" -> "H2O", "SiO2(cr,alpha)" -> "SiO2"
+    """
+    clean = re.sub(r'\s+', '', formula or '')
+    while True:
+        stripped = _PHASE_SUFFIX_RE.sub('', clean)
+        if stripped == clean:
+            return clean
+        clean = stripped
+
+
+def is_composite_formula(formula: str) -> bool:
+    """Whether the formula is written as composite/hydrate parts (Li2O*TiO2, CuSO4·5H2O)."""
+    return bool(_COMPOSITE_SPLIT_RE.search(strip_phase_suffix(formula)))
+
+
+def parse_composition(formula: str) -> Optional[Dict[str, float]]:
+    """
+    Parse a formula into its total element composition.
+
+    Unlike parse_formula this handles groups, composite/hydrate parts with
+    coefficients, fractional counts and trailing phase annotations:
+        - "Ca(OH)2" -> {"Ca": 1, "O": 2, "H": 2}
+        - "CuSO4*5H2O" -> {"Cu": 1, "S": 1, "O": 9, "H": 10}
+        - "Li2O*TiO2" -> {"Li": 2, "O": 3, "Ti": 1}
+        - "H2O(g)" -> {"H": 2, "O": 1}
+
+    Args:
+        formula: Chemical formula string
+
+    Returns:
+        Element counts, or None for ions and formulas that cannot be parsed
+    """
+    clean = strip_phase_suffix(formula)
+
+    if not clean or IONIC_RE.search(clean):
+        return None
+
+    total: Dict[str, float] = {}
+    for part in _COMPOSITE_SPLIT_RE.split(clean):
+        if not part:
+            return None
+        counts = _parse_composition_part(part)
+        if counts is None:
+            return None
+        for element, count in counts.items():
+            total[element] = total.get(element, 0.0) + count
+    return total
+
+
+def composition_signature(composition: Dict[str, float]) -> str:
+    """
+    Canonical element-count signature, independent of formula notation.
+
+    Example: {"O": 3, "Li": 2, "Ti": 1} -> "Li2;O3;Ti1"
+    """
+    return ";".join(
+        f"{element}{round(count, 6):g}"
+        for element, count in sorted(composition.items())
+        if count
+    )
+
+
+ELEMENT_SYMBOLS = frozenset("""
+    H He Li Be B C N O F Ne Na Mg Al Si P S Cl Ar K Ca Sc Ti V Cr Mn Fe Co Ni
+    Cu Zn Ga Ge As Se Br Kr Rb Sr Y Zr Nb Mo Tc Ru Rh Pd Ag Cd In Sn Sb Te I Xe
+    Cs Ba La Ce Pr Nd Pm Sm Eu Gd Tb Dy Ho Er Tm Yb Lu Hf Ta W Re Os Ir Pt Au
+    Hg Tl Pb Bi Po At Rn Fr Ra Ac Th Pa U Np Pu Am Cm Bk Cf Es Fm Md No Lr
+""".split())
+
+# Formula-like tokens in free text: optional stoichiometric coefficient,
+# then an uppercase start; surrounding letters/digits reject words like "CO2x"
+_FORMULA_TOKEN_RE = re.compile(
+    r'(?<![A-Za-z0-9])(\d*)([A-Z][A-Za-z0-9()\[\]*·]*)(?![A-Za-z0-9])'
+)
+
+# English words that are also element symbols
+_FORMULA_STOPWORDS = frozenset({'As', 'At', 'Be', 'He', 'I', 'In', 'No'})
+
+
+def find_formulas(text: str, limit: int = 10) -> List[str]:
+    """
+    Find chemical formulas mentioned in free text.
+
+    Tokens are accepted only if every symbol is a real element and the
+    formula parses (see parse_composition). Stoichiometric coefficients and
+    phase suffixes are dropped; a bare "K" or "C" right after a number is
+    read as a temperature unit. Used for speculative prefetch, so occasional
+    false positives are acceptable.
+    Examples:
+        - "2CO + O2 = 2CO2 при 298-1000 K" -> ["CO", "O2", "CO2"]
+        - "Свойства H2O(g)" -> ["H2O"]
+
+    Args:
+        text: Query text
+        limit: Maximum number of formulas
+
+    Returns:
+        Unique formulas in order of appearance
+    """
+    found: List[str] = []
+    for match in _FORMULA_TOKEN_RE.finditer(text or ''):
+        coefficient, token = match.groups()
+        # Closing brackets of the surrounding text: "(see NaCl)"
+        while token[-1] in ')]' and (
+            token.count('(') + token.count('[') < token.count(')') + token.count(']')
+        ):
+            token = token[:-1]
+        while True:
+            stripped = _PHASE_SUFFIX_RE.sub('', token)
+            if stripped == token:
+                break
+            token = stripped
+
+        if token in _FORMULA_STOPWORDS or token in found:
+            continue
+        # Units: "298 K", "298K", "25 C", "25°C" (but "2C" is carbon)
+        before = text[:match.start()].rstrip()[-1:]
+        if token == 'K' and (coefficient or before.isdigit()):
+            continue
+        if token == 'C' and not coefficient and (before.isdigit() or before == '°'):
+            continue
+
+        composition = parse_composition(token)
+        if not composition or not set(composition) <= ELEMENT_SYMBOLS:
+            continue
+
+        found.append(token)
+        if len(found) >= limit:
+            break
+    return found
+
+
 def sum_formulas(parts: List[str]) -> Dict[str, int]:
     """
     Sum multiple chemical formulas into total element counts.
@@ -0,0 +1,189 @@
+"""
+Срок запроса, автоматический выключатель и статистика задержек для
+вызовов внешних сервисов (LLM провайдера).
+
+Deadline — абсолютный срок запроса, который передается от обработчика
+сообщения вниз по стеку: каждый уровень ограничивает свои таймауты
+оставшимся временем вместо собственных фиксированных значений.
+
+CircuitBreaker — после серии неудач подряд отклоняет вызовы сразу (open),
+через reset_timeout_s пропускает один пробный вызов (half_open); успех
+пробного вызова закрывает выключатель, неудача снова открывает.
+
+LatencyTracker — скользящее окно длительностей успешных вызовов для
+перцентилей (задержка дублирующего запроса по p95).
+"""
+
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+
+class Deadline:
+    """
+    Абсолютный срок выполнения запроса.
+
+    Args:
+        expires_at: Момент истечения по часам clock
+        clock: Монотонные часы (подменяются в тестах)
+    """
+
+    def __init__(self, expires_at: float, clock: Callable[[], float] = time.monotonic):
+        self.expires_at = expires_at
+        self.clock = clock
+
+    @classmethod
+    def after(cls, seconds: float, clock: Callable[[], float] = time.monotonic) -> "Deadline":
+        """Срок через seconds секунд от текущего момента."""
+        return cls(clock() + seconds, clock)
+
+    def remaining(self) -> float:
+        """Оставшееся время в секундах (не меньше нуля)."""
+        return max(0.0, self.expires_at - self.clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """Таймаут операции: оставшееся время, но не больше cap."""
+        remaining = self.remaining()
+        return remaining if cap is None else min(remaining, cap)
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.3f}s)"
+
+
+class CircuitOpenError(RuntimeError):
+    """Вызов отклонен: выключатель открыт."""
+
+
+class CircuitBreaker:
+    """
+    Автоматический выключатель по числу неудач подряд.
+
+    Args:
+        name: Имя (для статистики и сообщений)
+        failure_threshold: Неудач подряд до размыкания
+        reset_timeout_s: Время в состоянии open до пробного вызова
+        clock: Монотонные часы (подменяются в тестах)
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str = "default",
+        failure_threshold: int = 5,
+        reset_timeout_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self.clock = clock
+
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        # Статистика
+        self.consecutive_failures = 0
+        self.failures = 0
+        self.successes = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout_s:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def retry_after(self) -> float:
+        """Секунд до пробного вызова (0, если выключатель не открыт)."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout_s - (self.clock() - self._opened_at))
+
+    def allow(self) -> bool:
+        """
+        Можно ли выполнить вызов. В half_open разрешается один пробный
+        вызов до его результата; отклоненные вызовы учитываются в rejected.
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def release_probe(self) -> None:
+        """
+        Вернуть разрешение пробного вызова без результата (вызов отменен):
+        следующий allow() в half_open снова разрешает пробу.
+        """
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self.successes += 1
+        self.consecutive_failures = 0
+        self._state = self.CLOSED
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self._state == self.HALF_OPEN or (
+            self._state == self.CLOSED and self.consecutive_failures >= self.failure_threshold
+        ):
+            self._state = self.OPEN
+            self._opened_at = self.clock()
+            self._probe_in_flight = False
+            self.times_opened += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Состояние и счетчики выключателя."""
+        return {
+            "name": self.name,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failures": self.failures,
+            "successes": self.successes,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+            "retry_after_s": round(self.retry_after(), 3),
+        }
+
+
+class LatencyTracker:
+    """
+    Длительности последних window успешных вызовов.
+
+    Args:
+        window: Размер скользящего окна
+    """
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    @property
+    def count(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Перцентиль q (0..1) по окну (None, если замеров нет)."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
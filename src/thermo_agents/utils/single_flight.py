@@ -0,0 +1,101 @@
+"""
+Объединение одинаковых одновременных запросов (single-flight).
+
+Если несколько корутин запрашивают результат по одному ключу, пока первое
+вычисление еще не завершено, они ожидают это же вычисление вместо запуска
+собственного. Отмена действует на уровне отдельного ожидающего: вычисление
+отменяется только когда его перестали ждать все.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class SingleFlight:
+    """
+    Группа single-flight вычислений по ключу.
+
+    Args:
+        name: Имя группы (для статистики и метрик)
+        on_coalesced: Вызывается с именем группы для каждого объединенного запроса
+    """
+
+    def __init__(
+        self,
+        name: str = "default",
+        on_coalesced: Optional[Callable[[str], None]] = None,
+    ):
+        self.name = name
+        self.on_coalesced = on_coalesced
+        self.logger = logging.getLogger(__name__)
+
+        # ключ -> [задача вычисления, число ожидающих]
+        self._in_flight: Dict[Hashable, list] = {}
+
+        # Статистика
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Получить результат вычисления по ключу.
+
+        Args:
+            key: Ключ запроса (нормализованный запрос, канонические параметры)
+            factory: Создает корутину вычисления; вызывается только лидером
+
+        Returns:
+            Результат вычисления (или исключение вычисления) для всех ожидающих
+        """
+        entry = self._in_flight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(factory())
+            entry = [task, 0]
+            self._in_flight[key] = entry
+            task.add_done_callback(lambda _: self._forget(key, task))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+            if self.on_coalesced is not None:
+                try:
+                    self.on_coalesced(self.name)
+                except Exception as e:
+                    self.logger.warning(f"Ошибка записи метрики объединения: {e}")
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Отменили этого ожидающего; остальные продолжают ждать
+            if not task.done() and entry[1] == 1:
+                task.cancel()
+            raise
+        finally:
+            entry[1] -= 1
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        entry = self._in_flight.get(key)
+        if entry is not None and entry[0] is task:
+            del self._in_flight[key]
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Выполняется ли вычисление по ключу."""
+        return key in self._in_flight
+
+    @property
+    def in_flight(self) -> int:
+        """Число выполняющихся вычислений."""
+        return len(self._in_flight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика группы."""
+        total = self.executions + self.coalesced
+        return {
+            "name": self.name,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": self.in_flight,
+            "coalesce_ratio": self.coalesced / total if total else 0.0,
+        }
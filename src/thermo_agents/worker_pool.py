@@ -0,0 +1,283 @@
+"""
+Пул рабочих процессов для детерминированных термодинамических расчетов.
+
+Расчет реакции (pandas, численное интегрирование, форматирование таблиц)
+занимает CPU и в одном процессе ограничен GIL. В многопроцессном режиме
+фронтенд бота (polling/webhook) выполняет только извлечение параметров
+через LLM, а расчет по ExtractedReactionParameters отправляет в пул.
+
+Основные компоненты:
+- CalculationWorkerPool: пул процессов с предзагруженным ThermoOrchestrator
+- SharedResultCache: общий для процессов дисковый кэш готовых ответов
+
+Каждый рабочий процесс один раз при старте создает ThermoOrchestrator без
+LLM агента (соединение с БД, YAML-кэш, движки и форматтеры). Задания и
+результаты передаются через каналы ProcessPoolExecutor в виде JSON строк
+параметров и готового текста ответа.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models.extraction import ExtractedReactionParameters
+
+logger = logging.getLogger(__name__)
+
+# Оркестратор рабочего процесса (создается в _init_worker)
+_worker_orchestrator = None
+_worker_cache: Optional["SharedResultCache"] = None
+
+
+class SharedResultCache:
+    """
+    Дисковый кэш ответов, общий для всех процессов.
+
+    Ключ — хэш канонического JSON параметров и версии данных (размер и
+    mtime БД), поэтому замена БД автоматически инвалидирует кэш. Запись
+    атомарная (временный файл + os.replace), блокировки не нужны.
+    """
+
+    def __init__(self, directory: Path, db_path: Optional[Path] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.data_version = self._data_version(db_path)
+
+    @staticmethod
+    def _data_version(db_path: Optional[Path]) -> str:
+        if db_path is None:
+            return ""
+        try:
+            stat = Path(db_path).stat()
+        except OSError:
+            return "no-db"
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def key(self, params_json: str) -> str:
+        """Ключ кэша для JSON параметров."""
+        canonical = json.dumps(json.loads(params_json), sort_keys=True, ensure_ascii=False)
+        digest = hashlib.sha256(f"{self.data_version}|{canonical}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.txt"
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            return self._path(key).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def put(self, key: str, value: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(value)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+
+def _init_worker(
+    db_path: str,
+    static_data_dir: str,
+    cache_dir: Optional[str],
+    search_index_dir: Optional[str] = None,
+) -> None:
+    """Инициализация рабочего процесса: предзагрузка компонентов оркестратора."""
+    global _worker_orchestrator, _worker_cache
+
+    from .orchestrator import ThermoOrchestrator, ThermoOrchestratorConfig
+
+    config = ThermoOrchestratorConfig(
+        db_path=Path(db_path),
+        static_data_dir=Path(static_data_dir),
+        search_index_dir=Path(search_index_dir) if search_index_dir else None,
+    )
+    _worker_orchestrator = ThermoOrchestrator(config)
+
+    # Соединение с БД открывается один раз на процесс
+    db_connector = _worker_orchestrator.db_connector
+    if db_connector is not None:
+        try:
+            db_connector.connect()
+        except Exception as e:
+            logger.warning(f"Рабочий процесс без соединения с БД: {e}")
+
+    # Прогрев YAML-кэша, чтобы первый запрос не платил за разбор файлов
+    static_manager = _worker_orchestrator.static_manager
+    if static_manager is not None:
+        for formula in static_manager.list_available_compounds():
+            try:
+                static_manager.load_compound(formula)
+            except Exception as e:
+                logger.debug(f"Не удалось предзагрузить {formula}: {e}")
+
+    if cache_dir:
+        _worker_cache = SharedResultCache(Path(cache_dir), Path(db_path))
+
+
+def _run_job(params_json: str, cache_key: Optional[str]) -> str:
+    """Выполнение одного задания в рабочем процессе."""
+    params = ExtractedReactionParameters.model_validate_json(params_json)
+    result = _worker_orchestrator.calculate(params)
+
+    if _worker_cache is not None and cache_key and not result.startswith("❌"):
+        _worker_cache.put(cache_key, result)
+    return result
+
+
+def _run_batch(params_jsons: List[str]) -> List[Tuple[str, float]]:
+    """Расчет группы заданий пакета в рабочем процессе (общие кэши веществ)."""
+    jobs = [ExtractedReactionParameters.model_validate_json(p) for p in params_jsons]
+    return _worker_orchestrator.calculate_batch(jobs)
+
+
+def _ping() -> int:
+    """Пустое задание для прогрева процессов пула."""
+    return os.getpid()
+
+
+class CalculationWorkerPool:
+    """
+    Пул процессов для детерминированной части обработки запросов.
+
+    Пример:
+        pool = CalculationWorkerPool(db_path, static_dir, workers=4)
+        await pool.start()
+        orchestrator.calculation_pool = pool
+        ...
+        await pool.shutdown()
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        static_data_dir: Path = Path("data/static_compounds"),
+        workers: int = 2,
+        cache_dir: Optional[Path] = None,
+        search_index_dir: Optional[Path] = None,
+    ):
+        if workers < 1:
+            raise ValueError("workers должен быть >= 1")
+
+        self.db_path = Path(db_path)
+        self.static_data_dir = Path(static_data_dir)
+        self.workers = workers
+        self.search_index_dir = Path(search_index_dir) if search_index_dir else None
+        self.cache = (
+            SharedResultCache(Path(cache_dir), self.db_path) if cache_dir else None
+        )
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        # Статистика для /status и бенчмарка
+        self.jobs_submitted = 0
+        self.cache_hits = 0
+
+    async def start(self) -> None:
+        """Запуск процессов и ожидание их инициализации."""
+        if self._executor is not None:
+            return
+
+        # spawn: рабочие процессы не наследуют event loop и потоки фронтенда
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(
+                str(self.db_path),
+                str(self.static_data_dir),
+                str(self.cache.directory) if self.cache else None,
+                str(self.search_index_dir) if self.search_index_dir else None,
+            ),
+        )
+
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(self._executor, _ping) for _ in range(self.workers))
+        )
+        logger.info(f"CalculationWorkerPool запущен: {self.workers} процессов")
+
+    async def calculate(self, params: ExtractedReactionParameters) -> str:
+        """
+        Выполнить расчет по параметрам в рабочем процессе.
+
+        Args:
+            params: Извлеченные параметры запроса
+
+        Returns:
+            Отформатированный ответ (как ThermoOrchestrator.calculate)
+        """
+        if self._executor is None:
+            raise RuntimeError("CalculationWorkerPool не запущен")
+
+        params_json = params.model_dump_json()
+        self.jobs_submitted += 1
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key(params_json)
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, _run_job, params_json, cache_key
+        )
+
+    async def calculate_batch(
+        self, jobs: List[ExtractedReactionParameters]
+    ) -> List[Tuple[str, float]]:
+        """
+        Расчет группы заданий пакета в одном рабочем процессе.
+
+        Группа выполняется целиком в одном процессе, поэтому вещества,
+        общие для ее заданий, загружаются один раз. Кэш результатов не
+        используется: пакет пишет ответы в собственный файл.
+
+        Args:
+            jobs: Параметры заданий группы
+
+        Returns:
+            [(ответ, время расчета в секундах)] в порядке jobs
+        """
+        if self._executor is None:
+            raise RuntimeError("CalculationWorkerPool не запущен")
+
+        self.jobs_submitted += len(jobs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, _run_batch, [params.model_dump_json() for params in jobs]
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика пула."""
+        return {
+            "workers": self.workers,
+            "running": self._executor is not None,
+            "jobs_submitted": self.jobs_submitted,
+            "cache_enabled": self.cache is not None,
+            "cache_hits": self.cache_hits,
+        }
+
+    async def shutdown(self) -> None:
+        """Остановка рабочих процессов."""
+        if self._executor is None:
+            return
+        executor, self._executor = self._executor, None
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+        logger.info("CalculationWorkerPool остановлен")
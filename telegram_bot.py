@@ -24,7 +24,7 @@ load_dotenv(env_path)
 # Добавление пути к исходникам
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from thermo_agents.telegram import TelegramBotConfig, ThermoSystemTelegramBot
+from thermo_agents.telegram import TelegramBotConfig
 
 
 async def main():
@@ -51,6 +51,10 @@ async def main():
 
         # Создание и запуск бота
         print("\n🚀 Запуск ThermoSystem Telegram Bot...")
+        # Стек бота (python-telegram-bot, оркестратор, LLM) грузится только
+        # после успешной валидации конфигурации
+        from thermo_agents.telegram import ThermoSystemTelegramBot
+
         bot = ThermoSystemTelegramBot(config)
 
         # Запуск бота (будет работать до получения сигнала остановки)
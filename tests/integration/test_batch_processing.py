@@ -0,0 +1,269 @@
+"""
+Integration tests for batch query processing (ThermoOrchestrator.process_batch).
+
+Reactions and compounds are covered by the static YAML set (no database
+required); LLM extraction is replaced by a fake agent.
+"""
+
+import asyncio
+import csv
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.thermo_agents.batch import (
+    BatchItem,
+    BatchResultWriter,
+    group_jobs,
+    load_batch,
+)
+from src.thermo_agents.models.extraction import ExtractedReactionParameters
+from src.thermo_agents.orchestrator import ThermoOrchestrator, ThermoOrchestratorConfig
+from src.thermo_agents.worker_pool import CalculationWorkerPool
+
+STATIC_DIR = Path(__file__).parent.parent.parent / "data" / "static_compounds"
+
+
+def reaction_params(equation, reactants, products) -> ExtractedReactionParameters:
+    return ExtractedReactionParameters(
+        query_type="reaction_calculation",
+        balanced_equation=equation,
+        all_compounds=reactants + products,
+        reactants=reactants,
+        products=products,
+        temperature_range_k=(298, 2500),
+        extraction_confidence=0.95,
+    )
+
+
+def compound_params(formula) -> ExtractedReactionParameters:
+    return ExtractedReactionParameters(
+        query_type="compound_data",
+        balanced_equation="N/A",
+        all_compounds=[formula],
+        reactants=[],
+        products=[],
+        temperature_range_k=(300, 1000),
+        extraction_confidence=0.9,
+    )
+
+
+JOBS = [
+    reaction_params("C + CO2 = 2CO", ["C", "CO2"], ["CO"]),
+    compound_params("H2O"),
+    reaction_params("2CO + O2 = 2CO2", ["CO", "O2"], ["CO2"]),
+    reaction_params("C + O2 = CO2", ["C", "O2"], ["CO2"]),
+    compound_params("CO2"),
+]
+
+
+@pytest.fixture
+def orchestrator(tmp_path):
+    config = ThermoOrchestratorConfig(
+        db_path=tmp_path / "missing.db", static_data_dir=STATIC_DIR
+    )
+    return ThermoOrchestrator(config)
+
+
+class FakeAgent:
+    """LLM агент: параметры по тексту запроса, учет одновременных вызовов"""
+
+    model_name = "fake"
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def extract_parameters(self, query):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if query == "сломанный запрос":
+                raise ValueError("LLM вернул некорректный JSON")
+            return compound_params(query)
+        finally:
+            self.in_flight -= 1
+
+
+class TestBatchInput:
+    """Чтение JSONL и группировка заданий"""
+
+    def test_load_batch_formats(self, tmp_path):
+        path = tmp_path / "batch.jsonl"
+        lines = [
+            json.dumps("Свойства H2O"),
+            json.dumps({"query": "Реакция C + O2"}),
+            "",
+            json.dumps({"query": "лог", "params": JOBS[0].model_dump(mode="json")}),
+            json.dumps(JOBS[1].model_dump(mode="json")),
+            json.dumps({"params": {"query_type": "reaction_calculation"}}),
+            json.dumps({"note": "пусто"}),
+        ]
+        path.write_text("\n".join(lines), encoding="utf-8")
+
+        items = load_batch(path)
+
+        assert [item.index for item in items] == list(range(6))
+        assert items[0].query == "Свойства H2O" and items[0].params is None
+        assert items[1].query == "Реакция C + O2"
+        assert items[2].query == "лог" and items[2].params == JOBS[0]
+        assert items[3].params == JOBS[1]
+        assert items[4].error.startswith("строка 6")
+        assert items[5].error is not None
+
+    def test_group_jobs_keeps_shared_compounds_together(self):
+        chunks = group_jobs(JOBS, chunk_size=3)
+
+        # CO2 встречается в четырех заданиях, C — в двух: задания с CO2 и C
+        # в первой группе, H2O (одно задание) — последним
+        assert chunks == [[4, 0, 3], [2, 1]]
+
+        with pytest.raises(ValueError):
+            group_jobs(JOBS, chunk_size=0)
+
+
+class TestProcessBatch:
+    """Пакетная обработка в текущем процессе"""
+
+    @pytest.mark.asyncio
+    async def test_matches_single_calculation_and_loads_once(self, orchestrator, monkeypatch):
+        expected = [orchestrator.calculate(params) for params in JOBS]
+
+        loads = []
+        original = orchestrator.compound_loader.get_raw_compound_data_with_metadata
+
+        def counting_load(formula, *args, **kwargs):
+            loads.append(formula)
+            return original(formula, *args, **kwargs)
+
+        monkeypatch.setattr(
+            orchestrator.compound_loader, "get_raw_compound_data_with_metadata", counting_load
+        )
+
+        streamed = []
+        items = [BatchItem(index=i, params=params) for i, params in enumerate(JOBS)]
+        results = await orchestrator.process_batch(items, chunk_size=2, on_result=streamed.append)
+
+        assert [r.index for r in results] == list(range(len(JOBS)))
+        assert sorted(r.index for r in streamed) == list(range(len(JOBS)))
+        assert all(r.status == "ok" for r in results)
+        for result, text in zip(results, expected):
+            assert result.response.splitlines()[:20] == text.splitlines()[:20]
+            assert result.calculation_s > 0
+            assert result.extraction_s == 0.0
+        assert sorted(loads) == sorted({"C", "CO", "CO2", "O2", "H2O"})
+
+    def test_frames_are_shared_only_for_same_names(self, orchestrator, monkeypatch):
+        loads = []
+        original = orchestrator.compound_loader.get_raw_compound_data_with_metadata
+
+        def counting_load(formula, compound_names=None):
+            loads.append((formula, tuple(compound_names or ())))
+            return original(formula, compound_names)
+
+        monkeypatch.setattr(
+            orchestrator.compound_loader, "get_raw_compound_data_with_metadata", counting_load
+        )
+        named = compound_params("CO2").model_copy(
+            update={"compound_names": {"CO2": ["Carbon dioxide"]}}
+        )
+        jobs = [compound_params("CO2"), named, compound_params("CO2"), named]
+
+        outputs = orchestrator.calculate_batch(jobs)
+
+        assert all(not response.startswith("❌") for response, _ in outputs)
+        assert sorted(loads) == [("CO2", ()), ("CO2", ("Carbon dioxide",))]
+
+    @pytest.mark.asyncio
+    async def test_extraction_concurrency_and_errors(self, orchestrator):
+        agent = FakeAgent()
+        orchestrator.thermodynamic_agent = agent
+        queries = ["H2O", "CO2", "сломанный запрос", "O2", "NaCl", "CO"]
+        items = [BatchItem(index=i, query=q) for i, q in enumerate(queries)]
+        items.append(BatchItem(index=len(items), error="строка 7: плохой JSON"))
+
+        results = await orchestrator.process_batch(items, concurrency=2)
+
+        assert agent.max_in_flight == 2
+        statuses = [r.status for r in results]
+        assert statuses == ["ok", "ok", "error", "ok", "ok", "ok", "error"]
+        assert "некорректный JSON" in results[2].error
+        assert results[0].query_type == "compound_data"
+        assert results[0].extraction_s > 0
+
+    @pytest.mark.asyncio
+    async def test_queries_without_agent_fail_per_item(self, orchestrator):
+        orchestrator.thermodynamic_agent = None
+        items = [BatchItem(index=0, query="Свойства H2O"), BatchItem(index=1, params=JOBS[1])]
+
+        results = await orchestrator.process_batch(items)
+
+        assert [r.status for r in results] == ["error", "ok"]
+
+    @pytest.mark.asyncio
+    async def test_calculation_errors_are_reported(self, orchestrator):
+        params = reaction_params("Xe + O2 = XeO2", ["Xe", "O2"], ["XeO2"])
+
+        results = await orchestrator.process_batch([BatchItem(index=0, params=params)])
+
+        assert results[0].status == "error"
+        assert results[0].error.startswith("❌")
+
+
+@pytest.fixture
+def spawn_safe_sys_path(monkeypatch):
+    """См. tests/integration/test_worker_pool.py"""
+    tests_dir = Path(__file__).parent.parent.resolve()
+    monkeypatch.setattr(
+        sys, "path", [p for p in sys.path if tests_dir not in Path(p).resolve().parents]
+    )
+
+
+class TestProcessBatchWithPool:
+    """Расчет групп в рабочих процессах"""
+
+    @pytest.mark.asyncio
+    async def test_pool_matches_in_process(self, orchestrator, tmp_path, spawn_safe_sys_path):
+        items = [BatchItem(index=i, params=params) for i, params in enumerate(JOBS)]
+        expected = await orchestrator.process_batch(items)
+
+        pool = CalculationWorkerPool(tmp_path / "missing.db", STATIC_DIR, workers=2)
+        await pool.start()
+        orchestrator.calculation_pool = pool
+        try:
+            results = await orchestrator.process_batch(items, chunk_size=2)
+        finally:
+            await pool.shutdown()
+
+        assert pool.get_stats()["jobs_submitted"] == len(JOBS)
+        for result, reference in zip(results, expected):
+            assert result.status == reference.status == "ok"
+            assert result.response.splitlines()[:20] == reference.response.splitlines()[:20]
+
+
+class TestBatchResultWriter:
+    """Потоковая запись результатов"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("suffix", [".jsonl", ".csv"])
+    async def test_streams_results(self, orchestrator, tmp_path, suffix):
+        path = tmp_path / f"out{suffix}"
+        items = [BatchItem(index=i, params=params) for i, params in enumerate(JOBS[:2])]
+
+        with BatchResultWriter(path) as writer:
+            await orchestrator.process_batch(items, on_result=writer.write)
+
+        with open(path, encoding="utf-8", newline="") as f:
+            if suffix == ".csv":
+                rows = list(csv.DictReader(f))
+            else:
+                rows = [json.loads(line) for line in f]
+
+        assert writer.count == 2
+        assert sorted(int(row["index"]) for row in rows) == [0, 1]
+        assert {row["query_type"] for row in rows} == {"reaction_calculation", "compound_data"}
+        assert all(row["status"] == "ok" and float(row["calculation_s"]) > 0 for row in rows)
+        assert all(row["response"] for row in rows)
@@ -18,6 +18,7 @@ from src.thermo_agents.selection.optimal_record_selector import (
     OptimizationConfig
 )
 from src.thermo_agents.models.search import DatabaseRecord
+from src.thermo_agents.selection.selection_config import RecordGroup
 
 
 class TestOptimizationPerformance:
@@ -522,5 +523,50 @@ class TestOptimizationPerformance:
             print(f"Cache speedup: {speedup:.2f}x")
 
 
+    def test_min_record_cover_scaling(self, selector):
+        """Test interval-DP cover scaling up to 1000 records per phase."""
+        record_counts = [10, 100, 300, 1000]
+        cover_times = []
+
+        for count in record_counts:
+            rng = np.random.default_rng(count)
+            starts = np.sort(rng.uniform(0, 5000, count))
+            all_records_df = pd.DataFrame({
+                'rowid': range(count),
+                'Formula': 'ScaleTest',
+                'Phase': 's',
+                'Tmin': starts,
+                'Tmax': starts + rng.uniform(50, 400, count),
+                'H298': -100.0,
+                'S298': 50.0,
+                'f1': 10.0, 'f2': 0.1, 'f3': 0.0, 'f4': 0.0, 'f5': 0.0, 'f6': 0.0,
+                'ReliabilityClass': rng.integers(0, 4, count),
+            })
+            group = RecordGroup(
+                phase='s', tmin=float(starts[0]), tmax=5000.0, records=[],
+                is_first_in_phase=True,
+            )
+
+            start_time = time.perf_counter()
+            result = selector._find_optimal_combination_from_db(
+                group, all_records_df, is_elemental=False
+            )
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            cover_times.append(elapsed_ms)
+
+            print(f"Records per phase {count}: {elapsed_ms:.2f}ms, "
+                  f"cover of {len(result) if result else 0} records")
+
+            if result:
+                for prev, nxt in zip(result, result[1:]):
+                    assert nxt.Tmin - prev.Tmax <= selector.MAX_GAP
+
+        # 10x more records must cost far less than 100x (cubic search: 1000x)
+        growth = cover_times[-1] / cover_times[1]
+        print(f"Time growth 100 -> 1000 records: {growth:.1f}x")
+        assert cover_times[-1] < 2000, f"1000 records took {cover_times[-1]:.0f}ms"
+        assert growth < 50, f"Poor scalability: {growth:.1f}x"
+
+
 if __name__ == "__main__":
-    pytest.main([__file__])
\ No newline at end of file
+    pytest.main([__file__])
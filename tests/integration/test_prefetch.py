@@ -0,0 +1,294 @@
+"""
+Integration tests for speculative compound prefetch during LLM extraction.
+
+Compounds come from the static YAML set (no database required); LLM
+extraction is replaced by a fake agent with a delay, or by a streaming
+pydantic_ai FunctionModel for the streaming extraction mode.
+"""
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.thermo_agents.models.extraction import ExtractedReactionParameters
+from src.thermo_agents.orchestrator import ThermoOrchestrator, ThermoOrchestratorConfig
+from src.thermo_agents.prefetch import CompoundPrefetcher
+from src.thermo_agents.thermodynamic_agent import create_thermo_agent
+
+STATIC_DIR = Path(__file__).parent.parent.parent / "data" / "static_compounds"
+
+BOUDOUARD = ExtractedReactionParameters(
+    query_type="reaction_calculation",
+    balanced_equation="C + CO2 = 2CO",
+    all_compounds=["C", "CO2", "CO"],
+    reactants=["C", "CO2"],
+    products=["CO"],
+    compound_types={"C": True, "CO2": False, "CO": False},
+    temperature_range_k=(298, 2500),
+    extraction_confidence=0.95,
+)
+
+WATER = ExtractedReactionParameters(
+    query_type="compound_data",
+    balanced_equation="N/A",
+    all_compounds=["H2O"],
+    reactants=[],
+    products=[],
+    temperature_range_k=(300, 1000),
+    extraction_confidence=0.9,
+)
+
+NACL = WATER.model_copy(update={"all_compounds": ["NaCl"]})
+
+
+class FakeAgent:
+    """LLM агент: заранее заданные параметры по тексту запроса"""
+
+    model_name = "fake"
+
+    def __init__(self, responses, delay=0.05):
+        self.responses = responses
+        self.delay = delay
+
+    async def extract_parameters(self, query):
+        await asyncio.sleep(self.delay)
+        return self.responses[query]
+
+
+@pytest.fixture
+def orchestrator(tmp_path, monkeypatch):
+    config = ThermoOrchestratorConfig(
+        db_path=tmp_path / "missing.db", static_data_dir=STATIC_DIR
+    )
+    orchestrator = ThermoOrchestrator(config)
+    orchestrator.thermodynamic_agent = FakeAgent({
+        "Реакция C + CO2 = 2CO": BOUDOUARD,
+        "Свойства H2O (сравнить с NaCl)": WATER,
+        "Свойства NaCl": NACL,
+        "Свойства Xe": WATER.model_copy(update={"all_compounds": ["Xe"]}),
+    })
+
+    orchestrator.loads = []
+    original = orchestrator.compound_loader.get_raw_compound_data_with_metadata
+
+    def counting_load(formula, *args, **kwargs):
+        orchestrator.loads.append(formula)
+        return original(formula, *args, **kwargs)
+
+    monkeypatch.setattr(
+        orchestrator.compound_loader, "get_raw_compound_data_with_metadata", counting_load
+    )
+    yield orchestrator
+    orchestrator.prefetcher.close()
+
+
+class TestProcessQueryPrefetch:
+    """Предзагрузка в process_query"""
+
+    @pytest.mark.asyncio
+    async def test_reaction_uses_prefetched_compounds(self, orchestrator):
+        expected = orchestrator.calculate(BOUDOUARD)
+        orchestrator.loads.clear()
+
+        response = await orchestrator.process_query("Реакция C + CO2 = 2CO")
+
+        assert response.splitlines()[:20] == expected.splitlines()[:20]
+        # Каждое вещество загружено один раз — в потоке предзагрузки
+        assert sorted(orchestrator.loads) == ["C", "CO", "CO2"]
+
+        report = orchestrator.last_prefetch_report
+        assert report.detected == ["C", "CO2", "CO"]
+        assert report.hits == ["C", "CO2", "CO"]
+        assert report.misses == [] and report.unused == []
+        assert report.hit_rate == 1.0
+        assert report.saved_s == pytest.approx(max(0.0, report.load_s - report.wait_s))
+
+    @pytest.mark.asyncio
+    async def test_unused_compounds_stay_cached(self, orchestrator):
+        await orchestrator.process_query("Свойства H2O (сравнить с NaCl)")
+
+        report = orchestrator.last_prefetch_report
+        assert report.hits == ["H2O"]
+        assert report.unused == ["NaCl"]
+
+        orchestrator.loads.clear()
+        response = await orchestrator.process_query("Свойства NaCl")
+
+        assert "NaCl" in response
+        assert orchestrator.loads == []
+        assert orchestrator.last_prefetch_report.hits == ["NaCl"]
+        stats = orchestrator.get_status()["prefetch"]
+        assert stats["hits"] == 2 and stats["unused"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_prefetch_falls_back_to_regular_load(self, orchestrator):
+        response = await orchestrator.process_query("Свойства Xe")
+
+        # Без БД загрузка падает и в предзагрузке, и в обычном пути
+        assert response.startswith("❌")
+        assert orchestrator.loads == ["Xe", "Xe"]
+        assert orchestrator.last_prefetch_report.misses == ["Xe"]
+        assert orchestrator.prefetcher.get_stats()["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, tmp_path):
+        config = ThermoOrchestratorConfig(
+            db_path=tmp_path / "missing.db",
+            static_data_dir=STATIC_DIR,
+            prefetch_enabled=False,
+        )
+        orchestrator = ThermoOrchestrator(config)
+        orchestrator.thermodynamic_agent = FakeAgent({"Реакция C + CO2 = 2CO": BOUDOUARD})
+
+        await orchestrator.process_query("Реакция C + CO2 = 2CO")
+
+        assert orchestrator.prefetcher is None
+        assert orchestrator.last_prefetch_report is None
+
+
+def streaming_model(*payloads, delay=0.002):
+    """FunctionModel, отдающий ответы по 6 символов; i-й вызов — payloads[i]"""
+    from pydantic_ai.models.function import DeltaToolCall, FunctionModel
+
+    calls = []
+
+    async def stream(messages, info):
+        text = json.dumps(payloads[min(len(calls), len(payloads) - 1)])
+        calls.append(text)
+        yield {0: DeltaToolCall(name=info.output_tools[0].name)}
+        for i in range(0, len(text), 6):
+            await asyncio.sleep(delay)
+            yield {0: DeltaToolCall(json_args=text[i:i + 6])}
+
+    return FunctionModel(stream_function=stream)
+
+
+class TestStreamingExtraction:
+    """Загрузка веществ из частичного ответа LLM"""
+
+    PAYLOAD = {
+        "query_type": "reaction_calculation",
+        "balanced_equation": "C + CO2 = 2CO",
+        "all_compounds": ["C", "CO2", "CO"],
+        "reactants": ["C", "CO2"],
+        "products": ["CO"],
+        "compound_names": {"C": ["Carbon"]},
+        "compound_types": {"C": True, "CO2": False, "CO": False},
+        "temperature_range_k": [298, 2500],
+        "extraction_confidence": 0.95,
+    }
+
+    @pytest.fixture
+    def streaming(self, tmp_path):
+        config = ThermoOrchestratorConfig(
+            db_path=tmp_path / "missing.db",
+            static_data_dir=STATIC_DIR,
+            streaming_extraction=True,
+        )
+        orchestrator = ThermoOrchestrator(config)
+        orchestrator.thermodynamic_agent = create_thermo_agent("test_key", "http://localhost")
+        yield orchestrator
+        orchestrator.prefetcher.close()
+
+    @pytest.mark.asyncio
+    async def test_loads_overlap_with_extraction(self, streaming):
+        expected = streaming.calculate(BOUDOUARD)
+        agent = streaming.thermodynamic_agent
+
+        with agent.agent.override(model=streaming_model(self.PAYLOAD)):
+            response = await streaming.process_query("Реакция углерода с диоксидом углерода")
+
+        assert response.splitlines()[:20] == expected.splitlines()[:20]
+        report = streaming.last_prefetch_report
+        assert report.streamed == ["C", "CO2", "CO"]
+        assert report.hits == ["C", "CO2", "CO"]
+        assert report.cancelled == [] and report.contradicted == []
+
+        spans = {name: (start, end) for name, start, end in report.spans}
+        extraction_end = spans["extraction"][1]
+        assert spans["load C"][0] < extraction_end
+        assert report.overlap_s > 0
+        assert "load CO2" in report.format_spans()
+
+    @pytest.mark.asyncio
+    async def test_final_params_contradict_partial(self, streaming):
+        # Первый ответ не проходит валидацию, повтор дает другие вещества и имена
+        invalid = dict(
+            self.PAYLOAD,
+            all_compounds=["C", "NaCl"],
+            compound_names={"C": ["Graphite"]},
+            extraction_confidence=7.0,
+        )
+        agent = streaming.thermodynamic_agent
+
+        with agent.agent.override(model=streaming_model(invalid, self.PAYLOAD)):
+            response = await streaming.process_query("Реакция углерода с диоксидом углерода")
+
+        assert not response.startswith("❌")
+        report = streaming.last_prefetch_report
+        assert report.streamed == ["C", "NaCl", "CO2", "CO"]
+        assert "NaCl" in report.unused
+        assert report.contradicted == ["C"]
+        assert report.hits == ["C", "CO2", "CO"]
+
+
+class TestCompoundPrefetcher:
+    """TTL-кэш и объединение загрузок"""
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry_and_shared_loads(self):
+        now = [0.0]
+        loads = []
+
+        def load(formula):
+            loads.append(formula)
+            return ("frame", False, 2), {}
+
+        prefetcher = CompoundPrefetcher(load, ttl_s=10.0, clock=lambda: now[0])
+        try:
+            first = prefetcher.start("H2 + Cl2 = 2HCl")
+            entries, _ = await prefetcher.collect(first, ["H2", "Cl2", "HCl"])
+            assert sorted(entries) == ["Cl2", "H2", "HCl"]
+
+            # В пределах TTL повторной загрузки нет
+            second = prefetcher.start("H2 + Cl2")
+            assert second.futures == {}
+            entries, _ = await prefetcher.collect(second, ["H2"])
+            assert list(entries) == ["H2"]
+            assert sorted(loads) == ["Cl2", "H2", "HCl"]
+
+            now[0] = 11.0
+            assert prefetcher.get("H2") is None
+            third = prefetcher.start("H2")
+            await prefetcher.collect(third, ["H2"])
+            assert loads.count("H2") == 2
+        finally:
+            prefetcher.close()
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_streamed_loads(self):
+        release = threading.Event()
+
+        def load(formula):
+            release.wait(5)
+            return (formula, False, 2), {}
+
+        prefetcher = CompoundPrefetcher(load, max_workers=1)
+        try:
+            task = prefetcher.start("H2")
+            assert prefetcher.extend(task, ["H2", "O2", "N2"]) == ["O2", "N2"]
+
+            # H2 загружается, O2 и N2 ждут в очереди; итоговые параметры — H2, O2
+            cancelled = prefetcher.cancel(task, ["H2", "O2"])
+            release.set()
+            entries, _ = await prefetcher.collect(task, ["H2", "O2", "N2"])
+
+            assert cancelled == ["N2"]
+            assert sorted(entries) == ["H2", "O2"]
+            assert prefetcher.get_stats()["cancelled"] == 1
+        finally:
+            release.set()
+            prefetcher.close()
@@ -0,0 +1,108 @@
+"""
+Integration tests for CalculationWorkerPool and SharedResultCache.
+
+The pool is exercised with real spawned worker processes on reactions that
+are fully covered by the static YAML set (no database required).
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.thermo_agents.models.extraction import ExtractedReactionParameters
+from src.thermo_agents.orchestrator import ThermoOrchestrator, ThermoOrchestratorConfig
+from src.thermo_agents.worker_pool import CalculationWorkerPool, SharedResultCache
+
+STATIC_DIR = Path(__file__).parent.parent.parent / "data" / "static_compounds"
+
+
+def boudouard_params() -> ExtractedReactionParameters:
+    return ExtractedReactionParameters(
+        query_type="reaction_calculation",
+        balanced_equation="C + CO2 = 2CO",
+        all_compounds=["C", "CO2", "CO"],
+        reactants=["C", "CO2"],
+        products=["CO"],
+        temperature_range_k=(298, 2500),
+        extraction_confidence=0.95,
+    )
+
+
+class TestSharedResultCache:
+    """Test cases for the on-disk result cache."""
+
+    def test_key_is_canonical(self, tmp_path):
+        cache = SharedResultCache(tmp_path)
+        assert cache.key('{"a": 1, "b": 2}') == cache.key('{"b":2,"a":1}')
+
+    def test_put_get_roundtrip(self, tmp_path):
+        cache = SharedResultCache(tmp_path)
+        key = cache.key(boudouard_params().model_dump_json())
+
+        assert cache.get(key) is None
+        cache.put(key, "результат")
+        assert cache.get(key) == "результат"
+        assert not list(tmp_path.rglob("*.tmp"))
+
+    def test_key_depends_on_db_version(self, tmp_path):
+        db = tmp_path / "thermo.db"
+        db.write_bytes(b"v1")
+        params_json = boudouard_params().model_dump_json()
+        key_v1 = SharedResultCache(tmp_path / "cache", db).key(params_json)
+
+        db.write_bytes(b"version 2")
+        key_v2 = SharedResultCache(tmp_path / "cache", db).key(params_json)
+
+        assert key_v1 != key_v2
+
+
+@pytest.fixture
+def spawn_safe_sys_path(monkeypatch):
+    """
+    spawn passes sys.path to worker processes; pytest may have prepended
+    test directories such as tests/unit, whose ``logging`` package shadows
+    the standard library in a fresh interpreter.
+    """
+    tests_dir = Path(__file__).parent.parent.resolve()
+    monkeypatch.setattr(
+        sys, "path", [p for p in sys.path if tests_dir not in Path(p).resolve().parents]
+    )
+
+
+class TestCalculationWorkerPool:
+    """Test cases for the process pool front end."""
+
+    @pytest.mark.asyncio
+    async def test_pool_matches_in_process_result(self, tmp_path, spawn_safe_sys_path):
+        params = boudouard_params()
+        config = ThermoOrchestratorConfig(
+            db_path=tmp_path / "missing.db", static_data_dir=STATIC_DIR
+        )
+        expected = ThermoOrchestrator(config).calculate(params)
+
+        pool = CalculationWorkerPool(
+            tmp_path / "missing.db", STATIC_DIR, workers=1, cache_dir=tmp_path / "cache"
+        )
+        await pool.start()
+        try:
+            first = await pool.calculate(params)
+            second = await pool.calculate(params)
+        finally:
+            await pool.shutdown()
+
+        assert "Термодинамический расчёт реакции" in first
+        # Таблицы совпадают; различаться может только время в отчете
+        assert first.splitlines()[:20] == expected.splitlines()[:20]
+        assert second == first
+        assert pool.get_stats()["cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_calculate_requires_start(self, tmp_path):
+        pool = CalculationWorkerPool(tmp_path / "missing.db", STATIC_DIR, workers=1)
+        with pytest.raises(RuntimeError):
+            await pool.calculate(boudouard_params())
+
+    def test_invalid_worker_count(self, tmp_path):
+        with pytest.raises(ValueError):
+            CalculationWorkerPool(tmp_path / "missing.db", STATIC_DIR, workers=0)
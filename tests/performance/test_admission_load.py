@@ -0,0 +1,43 @@
+"""
+Тест генератора нагрузки контроля допуска: хвост задержки при 5x нагрузке.
+"""
+
+import asyncio
+
+import pytest
+
+from thermo_agents.benchmarks.admission_load import (
+    LoadProfile,
+    format_admission_report,
+    run_admission_load,
+)
+
+pytestmark = pytest.mark.performance
+
+
+def test_tail_latency_bounded_at_5x_load():
+    profile = LoadProfile(load_factor=5.0, duration_s=1.5, warmup_s=0.5, timeout_s=1.0)
+
+    unbounded = asyncio.run(run_admission_load("unbounded", profile))
+    admission = asyncio.run(run_admission_load("admission", profile))
+
+    # Без контроля допуска одновременных запросов становится сотни и
+    # большинство не укладывается в срок
+    assert unbounded.max_in_flight > 100
+    assert unbounded.timed_out > unbounded.completed
+
+    # С контролем лишние запросы сразу получают отказ, выполненные
+    # укладываются в малую часть срока, а выполняется их больше
+    assert admission.max_in_flight <= profile.capacity * 4
+    assert admission.p99_ms < profile.timeout_s * 1e3 * 0.6
+    assert admission.p99_ms < unbounded.p99_ms
+    assert admission.completed > unbounded.completed
+    assert admission.light_completed_share > unbounded.light_completed_share
+
+    report = format_admission_report([unbounded, admission], profile)
+    assert "| admission | 5x |" in report
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        asyncio.run(run_admission_load("fifo"))
@@ -0,0 +1,144 @@
+"""
+Тесты бенчмарк-харнесса: статистическое сравнение, базовая линия, сценарии.
+"""
+
+import random
+
+import pytest
+
+from thermo_agents.benchmarks import (
+    REFERENCE_CASE,
+    BenchmarkCase,
+    BenchmarkResult,
+    BenchmarkRun,
+    compare_runs,
+    format_report,
+    load_run,
+    measure,
+    run_benchmarks,
+    save_run,
+)
+from thermo_agents.benchmarks.cases import BASELINE_PATH, default_cases
+
+pytestmark = pytest.mark.performance
+
+
+def make_run(medians, reference=1e-3, seed=0, noise=0.03, n=20):
+    """Синтетический прогон: замеры с шумом ±noise вокруг заданных медиан"""
+    rng = random.Random(seed)
+
+    def samples(median):
+        return [median * (1 + rng.uniform(-noise, noise)) for _ in range(n)]
+
+    results = {name: BenchmarkResult(name, samples(m), 1) for name, m in medians.items()}
+    results[REFERENCE_CASE] = BenchmarkResult(REFERENCE_CASE, samples(reference), 1)
+    return BenchmarkRun(results, {"python": "test"})
+
+
+class TestCompareRuns:
+    """Пороговое и статистическое сравнение с базовой линией"""
+
+    def test_statuses(self):
+        baseline = make_run({"a.slow": 1e-3, "a.fast": 1e-3, "a.same": 1e-3, "a.gone": 1e-3})
+        current = make_run(
+            {"a.slow": 1.5e-3, "a.fast": 0.5e-3, "a.same": 1.05e-3, "a.new": 1e-3}, seed=1
+        )
+
+        statuses = {c.name: c.status for c in compare_runs(current, baseline)}
+
+        assert statuses == {
+            "a.slow": "regression",
+            "a.fast": "improvement",
+            "a.same": "unchanged",
+            "a.new": "new",
+            "a.gone": "missing",
+        }
+
+    def test_noisy_slowdown_is_not_significant(self):
+        # Медиана выше порога, но выборки из 3 замеров не дают значимости
+        baseline = make_run({"a.case": 1e-3}, n=3)
+        current = make_run({"a.case": 1.3e-3}, seed=1, n=3)
+
+        (comparison,) = compare_runs(current, baseline, threshold=0.25, alpha=0.01)
+
+        assert comparison.ratio > 1.25
+        assert comparison.status == "unchanged"
+
+    def test_machine_speed_normalization(self):
+        # Машина вдвое медленнее: эталон и сценарий замедлились одинаково
+        baseline = make_run({"a.case": 1e-3}, reference=1e-3)
+        current = make_run({"a.case": 2e-3}, reference=2e-3, seed=1)
+
+        (normalized,) = compare_runs(current, baseline)
+        (raw,) = compare_runs(current, baseline, normalize=False)
+
+        assert normalized.status == "unchanged"
+        assert normalized.ratio == pytest.approx(1.0, abs=0.1)
+        assert raw.status == "regression"
+
+
+class TestHarness:
+    """Замеры, JSON и отчет"""
+
+    def test_measure_calibrates_calls_per_sample(self):
+        now = [0.0]
+        calls = []
+
+        def func():
+            calls.append(1)
+            now[0] += 1e-4
+
+        result = measure(
+            BenchmarkCase("a.case", func), repeat=3, warmup=1,
+            min_sample_s=1e-3, clock=lambda: now[0],
+        )
+
+        assert result.number == 16
+        assert result.samples == pytest.approx([1e-4] * 3)
+
+    def test_round_trip_and_report(self, tmp_path):
+        run = run_benchmarks(
+            [BenchmarkCase("a.sum", lambda: sum(range(100)), "Сумма")],
+            repeat=3, warmup=0, min_sample_s=0.0,
+        )
+        assert set(run.results) == {"a.sum", REFERENCE_CASE}
+
+        path = tmp_path / "run.json"
+        save_run(run, path)
+        loaded = load_run(path)
+        assert loaded.results["a.sum"].samples == run.results["a.sum"].samples
+        assert loaded.environment == run.environment
+
+        report = format_report(loaded, compare_runs(loaded, run), run)
+        assert "| a.sum |" in report
+        assert "Machine speed factor" in report
+        assert "unchanged: 1" in report
+
+
+class TestDefaultCases:
+    """Стандартные сценарии на фикстурной БД"""
+
+    @pytest.fixture(scope="class")
+    def cases(self, tmp_path_factory):
+        return default_cases(tmp_path_factory.mktemp("bench"))
+
+    def test_cases_run(self, cases):
+        results = {}
+        for case in cases:
+            results[case.name] = case.func()
+
+        groups = {case.group for case in cases}
+        assert {
+            "calculator", "engine", "range_builder", "selector",
+            "reaction_engine", "search", "formatting", "orchestrator",
+        } <= groups
+
+        assert not results["orchestrator.reaction"].startswith("❌")
+        assert not results["orchestrator.compound"].startswith("❌")
+        df, is_yaml, stage = results["search.loader_db"]
+        assert not df.empty and not is_yaml and stage is not None
+        assert results["search.compound_searcher"].records_found
+
+    def test_baseline_covers_cases(self, cases):
+        baseline = load_run(BASELINE_PATH)
+        assert {case.name for case in cases} | {REFERENCE_CASE} == set(baseline.results)
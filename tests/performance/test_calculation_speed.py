@@ -7,17 +7,12 @@ Performance тесты для output formats v2.1.
 import pytest
 import time
 import asyncio
-from pathlib import Path
 
+from thermo_agents.benchmarks.cases import STATIC_DATA_DIR, build_fixture_db
 from thermo_agents.calculations.thermodynamic_calculator import ThermodynamicCalculator
 from thermo_agents.models.search import DatabaseRecord
-from thermo_agents.orchestrator import Orchestrator
-from thermo_agents.search.database_connector import DatabaseConnector
-from thermo_agents.search.compound_searcher import CompoundSearcher
-from thermo_agents.search.sql_builder import SQLBuilder
-from thermo_agents.filtering.filter_pipeline import FilterPipeline
+from thermo_agents.orchestrator import ThermoOrchestrator, ThermoOrchestratorConfig
 from thermo_agents.models.extraction import ExtractedReactionParameters
-from thermo_agents.thermodynamic_agent import ThermoAgentConfig
 
 
 def get_h2o_record():
@@ -72,6 +67,56 @@ def calculator():
     return ThermodynamicCalculator()
 
 
+class MockFastAgent:
+    """Агент без LLM: параметры по тексту запроса."""
+
+    model_name = "mock"
+
+    async def extract_parameters(self, query: str) -> ExtractedReactionParameters:
+        if "H2O" in query:
+            return ExtractedReactionParameters(
+                query_type="compound_data",
+                all_compounds=["H2O"],
+                reactants=[],
+                products=[],
+                balanced_equation="",
+                temperature_range_k=(300.0, 600.0),
+                temperature_step_k=100,
+                compound_names={"H2O": ["Water"]},
+                extraction_confidence=0.95,
+                missing_fields=[]
+            )
+        return ExtractedReactionParameters(
+            query_type="reaction_calculation",
+            all_compounds=["CO", "O2", "CO2"],
+            reactants=["CO", "O2"],
+            products=["CO2"],
+            balanced_equation="2CO + O2 -> 2CO2",
+            temperature_range_k=(500.0, 800.0),
+            temperature_step_k=100,
+            compound_names={
+                "CO": ["Carbon monoxide"],
+                "O2": ["Oxygen"],
+                "CO2": ["Carbon dioxide"]
+            },
+            extraction_confidence=0.95,
+            missing_fields=[]
+        )
+
+
+@pytest.fixture
+def orchestrator(tmp_path):
+    """Оркестратор на фикстурной БД (data/benchmarks) и YAML-кэше без LLM."""
+    config = ThermoOrchestratorConfig(
+        db_path=build_fixture_db(tmp_path / "thermo_subset.db"),
+        static_data_dir=STATIC_DATA_DIR,
+        prefetch_enabled=False,
+    )
+    orchestrator = ThermoOrchestrator(config)
+    orchestrator.thermodynamic_agent = MockFastAgent()
+    return orchestrator
+
+
 class TestPerformance:
     """Performance тесты для output formats v2.1."""
 
@@ -92,12 +137,13 @@ class TestPerformance:
         record = get_h2o_record()
 
         start_time = time.time()
-        result = calculator.generate_table(record, 300, 1300, 10)  # 101 точка
+        # Минимальный шаг 25K; диапазон ограничен Tmax записи (1000K)
+        result = calculator.generate_table(record, 300, 1300, 25)  # 29 точек
         duration = time.time() - start_time
 
-        # Проверка времени < 200ms для 101 точки
+        # Проверка времени < 200ms для 29 точек
         assert duration < 0.2, f"Генерация таблицы заняла {duration:.3f}s, ожидалось < 0.2s"
-        assert len(result.properties) == 101
+        assert len(result.properties) == 29
 
     def test_single_property_calculation_speed(self, calculator):
         """Benchmark расчёта свойств для одной температуры."""
@@ -201,47 +247,9 @@ class TestPerformance:
         assert result1.Cp == result2.Cp
 
     @pytest.mark.slow
-    async def test_orchestrator_query_speed(self):
+    @pytest.mark.asyncio
+    async def test_orchestrator_query_speed(self, orchestrator):
         """Benchmark скорости обработки запросов оркестратором."""
-        # Создание mock агента
-        class MockFastAgent:
-            def __init__(self, config):
-                self.config = config
-
-            async def extract_parameters(self, query: str) -> ExtractedReactionParameters:
-                return ExtractedReactionParameters(
-                    query_type="compound_data",
-                    all_compounds=["H2O"],
-                    reactants=[],
-                    products=[],
-                    balanced_equation="",
-                    temperature_range_k=(300.0, 600.0),
-                    temperature_step_k=100,
-                    compound_names={"H2O": ["Water"]},
-                    extraction_confidence=0.95,
-                    missing_fields=[]
-                )
-
-        # Проверяем наличие базы данных
-        test_db_path = str(Path(__file__).parent.parent.parent / "data" / "thermo_data.db")
-        if not Path(test_db_path).exists():
-            pytest.skip("База данных не найдена")
-
-        # Создание оркестратора
-        db_connector = DatabaseConnector(test_db_path)
-        sql_builder = SQLBuilder()
-        compound_searcher = CompoundSearcher(sql_builder, db_connector)
-        filter_pipeline = FilterPipeline()
-        agent_config = ThermoAgentConfig(llm_base_url="mock://localhost")
-        thermodynamic_agent = MockFastAgent(agent_config)
-
-        orchestrator = Orchestrator(
-            thermodynamic_agent=thermodynamic_agent,
-            compound_searcher=compound_searcher,
-            filter_pipeline=filter_pipeline
-        )
-
-        # Тест скорости обработки запросов
         query = "Дай таблицу для H2O при 300-600K"
 
         start_time = time.time()
@@ -252,71 +260,16 @@ class TestPerformance:
         assert duration < 2.0, f"Обработка запроса заняла {duration:.3f}s, ожидалось < 2.0s"
         assert isinstance(result, str)
         assert len(result) > 0
+        assert not result.startswith("❌")
 
     @pytest.mark.slow
-    async def test_orchestrator_load_test(self):
+    @pytest.mark.asyncio
+    async def test_orchestrator_load_test(self, orchestrator):
         """Нагрузочный тест оркестратора."""
-        # Создание mock агента
-        class MockFastAgent:
-            def __init__(self, config):
-                self.config = config
-
-            async def extract_parameters(self, query: str) -> ExtractedReactionParameters:
-                if "H2O" in query:
-                    return ExtractedReactionParameters(
-                        query_type="compound_data",
-                        all_compounds=["H2O"],
-                        reactants=[],
-                        products=[],
-                        balanced_equation="",
-                        temperature_range_k=(300.0, 600.0),
-                        temperature_step_k=100,
-                        compound_names={"H2O": ["Water"]},
-                        extraction_confidence=0.95,
-                        missing_fields=[]
-                    )
-                else:
-                    return ExtractedReactionParameters(
-                        query_type="reaction_calculation",
-                        all_compounds=["CO2", "H2", "CO", "H2O"],
-                        reactants=["CO2", "H2"],
-                        products=["CO", "H2O"],
-                        balanced_equation="CO2 + H2 -> CO + H2O",
-                        temperature_range_k=(500.0, 800.0),
-                        temperature_step_k=100,
-                        compound_names={
-                            "CO2": ["Carbon dioxide"],
-                            "H2": ["Hydrogen"],
-                            "CO": ["Carbon monoxide"],
-                            "H2O": ["Water"]
-                        },
-                        extraction_confidence=0.95,
-                        missing_fields=[]
-                    )
-
-        # Проверяем наличие базы данных
-        test_db_path = str(Path(__file__).parent.parent.parent / "data" / "thermo_data.db")
-        if not Path(test_db_path).exists():
-            pytest.skip("База данных не найдена")
-
-        # Создание оркестратора
-        db_connector = DatabaseConnector(test_db_path)
-        sql_builder = SQLBuilder()
-        compound_searcher = CompoundSearcher(sql_builder, db_connector)
-        filter_pipeline = FilterPipeline()
-        agent_config = ThermoAgentConfig(llm_base_url="mock://localhost")
-        thermodynamic_agent = MockFastAgent(agent_config)
-
-        orchestrator = Orchestrator(
-            thermodynamic_agent=thermodynamic_agent,
-            compound_searcher=compound_searcher,
-            filter_pipeline=filter_pipeline
-        )
-
         # Тестовые запросы
         queries = [
             "Дай таблицу для H2O при 300-600K",
-            "CO2 + H2 -> CO + H2O при 500-800K"
+            "2CO + O2 -> 2CO2 при 500-800K"
         ]
 
         start_time = time.time()
@@ -334,6 +287,7 @@ class TestPerformance:
         # Среднее время < 1 секунды на запрос
         assert avg_time < 1.0, f"Среднее время {avg_time:.3f}s, ожидалось < 1.0s"
         assert len(results) == 50
+        assert not any(result.startswith("❌") for result in results)
 
     def test_memory_usage_large_table(self, calculator):
         """Тест использования памяти для больших таблиц."""
@@ -342,12 +296,12 @@ class TestPerformance:
         record = get_h2o_record()
 
         # Генерация большой таблицы
-        result = calculator.generate_table(record, 200, 2000, 5)  # 361 точка
+        result = calculator.generate_table(record, 200, 2000, 25)  # 300-1000K, 29 точек
 
         # Проверка размера объекта
         size = sys.getsizeof(result.properties)
         assert size < 1024 * 1024, f"Таблица занимает {size} байт, ожидалось < 1MB"
-        assert len(result.properties) == 361
+        assert len(result.properties) == 29
 
     def test_concurrent_calculations(self, calculator):
         """Тест параллельных расчётов."""
@@ -0,0 +1,110 @@
+"""
+Бюджет времени холодного импорта (python -X importtime).
+
+Каждый импорт выполняется в отдельном интерпретаторе. Проверяется, что
+легкие пакеты не тянут тяжелые зависимости (детерминированно, всегда), и что
+кумулятивное время импорта укладывается в бюджет. Время зависит от машины
+и ее загрузки, поэтому бюджеты проверяются только с THERMO_IMPORT_BUDGETS=1;
+на медленных машинах их можно масштабировать переменной
+THERMO_IMPORT_BUDGET_SCALE.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytestmark = pytest.mark.performance
+
+SRC_DIR = Path(__file__).parent.parent.parent / "src"
+
+HEAVY_MODULES = ("pandas", "scipy", "pydantic_ai", "openai", "telegram", "tabulate")
+
+# Модуль -> (бюджет в мс, тяжелые модули, которые он может загружать)
+BUDGETS = {
+    "thermo_agents": (150, ()),
+    "thermo_agents.search": (150, ()),
+    "thermo_agents.calculations": (150, ()),
+    "thermo_agents.filtering": (150, ()),
+    "thermo_agents.telegram.config": (250, ()),
+    # Горячий путь: pandas нужен загрузчику веществ, LLM и scipy — нет
+    "thermo_agents.orchestrator": (1500, ("pandas", "tabulate")),
+}
+
+
+def import_profile(module):
+    """Импорт в чистом интерпретаторе: (кумулятивное время, мс; загруженные модули)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    cumulative_us, loaded = None, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        loaded.add(name.split(".")[0])
+        if name == module:
+            cumulative_us = int(cumulative)
+    assert cumulative_us is not None, f"{module} не найден в выводе importtime"
+    return cumulative_us / 1000.0, loaded
+
+
+@pytest.mark.parametrize("module", list(BUDGETS))
+def test_no_heavy_imports(module):
+    _, allowed = BUDGETS[module]
+
+    _, loaded = import_profile(module)
+
+    unexpected = sorted(set(HEAVY_MODULES) & loaded - set(allowed))
+    assert unexpected == [], f"{module} загружает {unexpected}"
+
+
+@pytest.mark.skipif(
+    os.environ.get("THERMO_IMPORT_BUDGETS") != "1",
+    reason="бюджеты времени импорта проверяются с THERMO_IMPORT_BUDGETS=1",
+)
+@pytest.mark.parametrize("module", list(BUDGETS))
+def test_import_budget(module):
+    budget_ms, _ = BUDGETS[module]
+    budget_ms *= float(os.environ.get("THERMO_IMPORT_BUDGET_SCALE", "1"))
+
+    elapsed_ms, _ = import_profile(module)
+
+    assert elapsed_ms <= budget_ms, (
+        f"import {module}: {elapsed_ms:.0f} мс > бюджета {budget_ms:.0f} мс"
+    )
+
+
+def test_lazy_exports_resolve():
+    """Ленивые экспорты пакетов разрешаются в те же объекты, что и прямые импорты"""
+    code = (
+        "import thermo_agents, thermo_agents.search as s, thermo_agents.calculations as c\n"
+        "from thermo_agents.search.compound_searcher import CompoundSearcher\n"
+        "from thermo_agents.calculations.thermodynamic_calculator import ThermodynamicTable\n"
+        "from thermo_agents.filtering import PhaseResolver\n"
+        "from thermo_agents.orchestrator import ThermoOrchestrator\n"
+        "assert s.CompoundSearcher is CompoundSearcher\n"
+        "assert c.ThermodynamicTable is ThermodynamicTable\n"
+        "assert thermo_agents.ThermoOrchestrator is ThermoOrchestrator\n"
+        "assert 'SQLBuilder' in dir(s)\n"
+        "try:\n"
+        "    s.Missing\n"
+        "except AttributeError:\n"
+        "    pass\n"
+        "else:\n"
+        "    raise SystemExit('no AttributeError')\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=SRC_DIR, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
@@ -0,0 +1,43 @@
+"""
+Тест бенчмарка хранилища сессий: память на сессию, обход без полного
+перебора и восстановление истории из SQLite.
+"""
+
+import pytest
+
+from thermo_agents.benchmarks.session_load import (
+    SessionLoadProfile,
+    format_session_report,
+    run_session_load,
+)
+
+pytestmark = pytest.mark.performance
+
+
+def test_compact_sessions_and_bounded_content(tmp_path):
+    profile = SessionLoadProfile(users=20_000, messages=5_000, memory_budget_mb=2)
+
+    legacy = run_session_load("legacy", profile)
+    store = run_session_load("store", profile, tmp_path / "store")
+    sqlite = run_session_load("sqlite", profile, tmp_path / "sqlite")
+
+    # Записи со __slots__ занимают меньше, чем dataclass с __dict__
+    assert store.session_bytes_per_user < legacy.session_bytes_per_user
+
+    # Результат сохранен для всех пользователей, в памяти — в пределах бюджета
+    assert legacy.history_users == 100
+    assert store.history_users == profile.users
+    assert store.content_memory_mb <= profile.memory_budget_mb
+    assert store.spilled > 0
+
+    # Периодический обход не перебирает все сессии
+    assert store.sweep_ms < legacy.sweep_ms
+
+    assert sqlite.reload_us is not None and sqlite.flush_ms is not None
+    report = format_session_report([legacy, store, sqlite], profile)
+    assert "| sqlite |" in report
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        run_session_load("redis")
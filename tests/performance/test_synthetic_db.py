@@ -0,0 +1,156 @@
+"""
+Тесты генератора синтетической БД и нагрузочного прогона поиска.
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from thermo_agents.benchmarks.cases import COMPOUNDS_COLUMNS
+from thermo_agents.benchmarks.search_load import (
+    STAGES,
+    StageStats,
+    build_workload,
+    format_load_report,
+    run_search_load,
+    scaling_exponents,
+)
+from thermo_agents.benchmarks.synthetic_db import (
+    DatabaseProfile,
+    SyntheticDatabaseGenerator,
+    generate_database,
+)
+
+pytestmark = pytest.mark.performance
+
+SCALE = 0.02
+
+
+@pytest.fixture(scope="module")
+def synthetic_db(tmp_path_factory):
+    db_path = tmp_path_factory.mktemp("synth") / "synth.db"
+    stats = generate_database(db_path, scale=SCALE, seed=1)
+    return db_path, stats
+
+
+def query(db_path, sql):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+class TestSyntheticDatabase:
+    """Схема и распределения сгенерированной таблицы"""
+
+    def test_schema_and_size(self, synthetic_db):
+        db_path, stats = synthetic_db
+        columns = [(row[1], row[2]) for row in query(db_path, "PRAGMA table_info(compounds)")]
+
+        assert columns == COMPOUNDS_COLUMNS
+        assert stats["records"] == round(316_434 * SCALE)
+        assert query(db_path, "SELECT COUNT(*) FROM compounds")[0][0] == stats["records"]
+
+    def test_distributions(self, synthetic_db):
+        db_path, stats = synthetic_db
+        total = stats["records"]
+
+        def share(where):
+            return query(db_path, f"SELECT COUNT(*) FROM compounds WHERE {where}")[0][0] / total
+
+        assert share("ReliabilityClass = 1") == pytest.approx(0.747, abs=0.05)
+        assert share("Phase = 'g'") == pytest.approx(0.549, abs=0.05)
+        assert share("Formula LIKE '%(%)%'") == pytest.approx(0.862, abs=0.05)
+        assert 0.02 < share("Formula LIKE '%+%' OR Formula LIKE '%-%'") < 0.15
+        assert share("Formula LIKE '%*%'") > 0
+        assert share("Tmin >= 298 AND Tmin < 500") == pytest.approx(0.49, abs=0.1)
+
+    def test_temperature_segments(self, synthetic_db):
+        db_path, _ = synthetic_db
+        rows = query(db_path, "SELECT Formula, Phase, Tmin, Tmax FROM compounds")
+
+        assert all(tmax > tmin for _, _, tmin, tmax in rows)
+        # Часть записей продолжает сегмент той же формулы и фазы
+        ends = {(formula, phase, tmax) for formula, phase, _, tmax in rows}
+        continued = sum((formula, phase, tmin) in ends for formula, phase, tmin, _ in rows)
+        assert 0.02 < continued / len(rows) < 0.2
+
+    def test_deterministic_by_seed(self):
+        first = SyntheticDatabaseGenerator(scale=0.002, seed=3)
+        second = SyntheticDatabaseGenerator(scale=0.002, seed=3)
+
+        assert list(first.iter_rows()) == list(second.iter_rows())
+
+    def test_profile_from_analysis_results(self, tmp_path):
+        results = {
+            "total_records": 1000,
+            "table_structure": [
+                {"name": "Formula", "type": "TEXT"},
+                {"name": "Phase", "type": "TEXT"},
+                {"name": "Tmin", "type": "REAL"},
+                {"name": "Tmax", "type": "REAL"},
+                {"name": "Comment", "type": "TEXT"},
+            ],
+            "reliability_distribution": [
+                {"ReliabilityClass": 2, "count": 900},
+                {"ReliabilityClass": 1, "count": 100},
+            ],
+            "formula_statistics": {
+                "unique_formulas": 100,
+                "formulas_with_parentheses": 500,
+                "ionic_formulas": 0,
+            },
+            "phase_statistics": {"phase_distribution": [
+                {"Phase": "s", "count": 990}, {"Phase": "?", "count": 10},
+            ]},
+        }
+        path = tmp_path / "analysis.json"
+        path.write_text(json.dumps(results), encoding="utf-8")
+
+        profile = DatabaseProfile.from_analysis_results(path)
+        assert profile.phase_suffix_share == 0.5
+        assert profile.phase_distribution == {"s": 990}
+
+        db_path = tmp_path / "custom.db"
+        generate_database(db_path, scale=1.0, profile=profile)
+        columns = [row[1] for row in query(db_path, "PRAGMA table_info(compounds)")]
+        assert columns == ["Formula", "Phase", "Tmin", "Tmax", "Comment"]
+        assert query(db_path, "SELECT DISTINCT Phase FROM compounds") == [("s",)]
+        assert query(db_path, "SELECT COUNT(*) FROM compounds WHERE Comment IS NOT NULL")[0][0] == 0
+
+
+class TestSearchLoad:
+    """Нагрузочный прогон стадий поиска"""
+
+    def test_stages_find_records(self, synthetic_db):
+        db_path, _ = synthetic_db
+        workload = build_workload(db_path, size=20, seed=0)
+        assert {q.kind for q in workload} == {"anchor", "existing", "missing"}
+
+        results = run_search_load(db_path, workload, scale=SCALE, time_budget_s=10)
+
+        by_stage = {s.stage: s for s in results}
+        assert set(by_stage) == set(STAGES)
+        for stage in ("sql_execute", "compound_searcher", "loader_stage2"):
+            # Найдены все запросы, кроме отсутствующих в БД формул
+            assert 0.5 < by_stage[stage].hit_rate < 1.0
+        assert all(s.lookups == len(workload) and s.p50_ms > 0 for s in results)
+
+    def test_unknown_stage(self, synthetic_db):
+        db_path, _ = synthetic_db
+        with pytest.raises(ValueError):
+            run_search_load(db_path, build_workload(db_path, size=5), stages=["full_scan"])
+
+    def test_scaling_report(self):
+        def stats(scale, records, p50):
+            return StageStats("sql_execute", scale, records, 10, p50, p50 * 2, p50 * 3, p50, 1e3 / p50, 1.0)
+
+        results = [stats(1, 1_000, 1.0), stats(10, 10_000, 10.0), stats(100, 100_000, 150.0)]
+
+        assert scaling_exponents(results)["sql_execute"] == pytest.approx(1.09, abs=0.01)
+        report = format_load_report(results, slow_ms=100)
+        assert "| 100x | 100000 | sql_execute |" in report
+        assert "- sql_execute at 100x" in report
+        assert "- sql_execute at 10x" not in report
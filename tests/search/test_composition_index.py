@@ -0,0 +1,191 @@
+"""
+Unit tests for CompositionIndex.
+
+Lookups are checked against brute-force composition comparison (isomers
+excluded), and the index is exercised through CompoundSearcher and
+CompoundDataLoader.
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.thermo_agents.core_logic.compound_data_loader import CompoundDataLoader
+from src.thermo_agents.search.composition_index import CompositionIndex
+from src.thermo_agents.search.compound_searcher import CompoundSearcher
+from src.thermo_agents.search.database_connector import DatabaseConnector
+from src.thermo_agents.search.sql_builder import SQLBuilder
+from src.thermo_agents.storage.static_data_manager import StaticDataManager
+from src.thermo_agents.utils.chem_utils import (
+    is_composite_formula,
+    parse_composition,
+    strip_phase_suffix,
+)
+
+FORMULAS = [
+    "Li2TiO3", "Li2O*TiO2", "TiO2*Li2O", "Li2TiO3(s)", "Li2O", "TiO2",
+    "CuSO4", "CuSO4*5H2O", "CuSO4*5H2O(s)", "CaSiO3", "CaO*SiO2", "CaO·SiO2",
+    "Ca(OH)2", "CaO2H2", "Fe+2", "CO3-2", "H2O", "H2O(g)",
+    "C2H5OH", "C2H5OH(l)", "CH3OCH3", "C2H6O", "HCOOH", "CH2O2",
+]
+
+
+def create_database(path: Path) -> None:
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute("""
+            CREATE TABLE compounds (
+                Formula TEXT, FirstName TEXT, SecondName TEXT, Phase TEXT,
+                Tmin REAL, Tmax REAL, H298 REAL, S298 REAL,
+                f1 REAL, f2 REAL, f3 REAL, f4 REAL, f5 REAL, f6 REAL,
+                MeltingPoint REAL, BoilingPoint REAL, ReliabilityClass INTEGER
+            )
+        """)
+        for i, formula in enumerate(FORMULAS):
+            conn.execute(
+                "INSERT INTO compounds VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+                (
+                    formula, "Name", "", "g" if i % 2 else "s",
+                    298.15, 1500.0 if i % 3 else 600.0,
+                    -100.0, 50.0, 30.0, 1.0, 0.0, 0.0, 0.0, 0.0,
+                    300.0, 400.0, 1,
+                ),
+            )
+
+
+@pytest.fixture
+def db_connector(tmp_path):
+    db_path = tmp_path / "compounds.db"
+    create_database(db_path)
+    connector = DatabaseConnector(db_path)
+    yield connector
+    connector.disconnect()
+
+
+@pytest.fixture
+def index(db_connector):
+    index = CompositionIndex()
+    index.build_from_database(db_connector)
+    return index
+
+
+def rowids_of(formulas):
+    return sorted(i + 1 for i, f in enumerate(FORMULAS) if f in formulas)
+
+
+class TestCompositionIndex:
+    """Test index lookups."""
+
+    def test_composite_and_reordered_forms(self, index):
+        expected = rowids_of({"Li2TiO3", "Li2O*TiO2", "TiO2*Li2O", "Li2TiO3(s)"})
+        assert index.lookup("Li2TiO3") == expected
+        assert index.lookup("Li2O*TiO2") == expected
+
+    def test_hydrate(self, index):
+        assert index.lookup("CuSO4*5H2O") == rowids_of({"CuSO4*5H2O", "CuSO4*5H2O(s)"})
+        assert index.lookup("CuSO4") == rowids_of({"CuSO4"})
+
+    def test_groups_and_middle_dot(self, index):
+        assert index.lookup("Ca(OH)2") == rowids_of({"Ca(OH)2"})
+        assert index.lookup("CaSiO3") == rowids_of({"CaSiO3", "CaO*SiO2", "CaO·SiO2"})
+
+    def test_isomers_are_not_returned(self, index):
+        assert index.lookup("C2H5OH") == rowids_of({"C2H5OH", "C2H5OH(l)"})
+        assert index.lookup("CH3OCH3") == rowids_of({"CH3OCH3"})
+        assert index.lookup("HCOOH") == rowids_of({"HCOOH"})
+
+    @pytest.mark.parametrize("formula", FORMULAS + ["Li3TiO3", "Xe"])
+    def test_lookup_matches_scan(self, index, formula):
+        composition = parse_composition(formula)
+        expected = sorted(
+            i + 1 for i, f in enumerate(FORMULAS)
+            if composition is not None and parse_composition(f) == composition
+            and (
+                is_composite_formula(f) or is_composite_formula(formula)
+                or strip_phase_suffix(f) == strip_phase_suffix(formula)
+            )
+        )
+        assert index.lookup(formula) == expected
+
+    def test_ions_are_not_indexed(self, index):
+        assert index.lookup("Fe+2") == []
+        assert index.get_stats()["skipped_records"] == 2
+
+    def test_rows_with_elements(self, index):
+        exact = index.rows_with_elements(["Li", "Ti", "O"], exact=True)
+        assert exact == rowids_of({"Li2TiO3", "Li2O*TiO2", "TiO2*Li2O", "Li2TiO3(s)"})
+        assert set(index.rows_with_elements(["Li", "O"])) == set(
+            rowids_of({"Li2TiO3", "Li2O*TiO2", "TiO2*Li2O", "Li2TiO3(s)", "Li2O"})
+        )
+        assert index.rows_with_elements(["Xe"]) == []
+
+    def test_snapshot_roundtrip(self, index, db_connector, tmp_path):
+        snapshot = tmp_path / "index" / "composition.npz"
+        index.save(snapshot)
+
+        loaded = CompositionIndex()
+        loaded.load_or_build(db_connector, snapshot)
+        assert loaded.source_version == index.source_version
+        for formula in FORMULAS:
+            assert loaded.lookup(formula) == index.lookup(formula)
+
+    def test_stale_snapshot_is_rebuilt(self, index, db_connector, tmp_path):
+        snapshot = tmp_path / "composition.npz"
+        index.source_version = "stale"
+        index.save(snapshot)
+
+        loaded = CompositionIndex()
+        loaded.load_or_build(db_connector, snapshot)
+        assert loaded.source_version != "stale"
+        assert loaded.lookup("Li2TiO3") == rowids_of(
+            {"Li2TiO3", "Li2O*TiO2", "TiO2*Li2O", "Li2TiO3(s)"}
+        )
+
+    def test_unbuilt_index(self):
+        assert CompositionIndex().lookup("H2O") == []
+
+
+class TestCompositionIndexConsumers:
+    """Test the index through the searcher and the data loader."""
+
+    def test_searcher_finds_composite_forms(self, index, db_connector):
+        searcher = CompoundSearcher(SQLBuilder(), db_connector, composition_index=index)
+        plain = CompoundSearcher(SQLBuilder(), db_connector)
+
+        result = searcher.search_compound("Li2TiO3")
+        assert {r.formula for r in result.records_found} == {
+            "Li2TiO3", "Li2O*TiO2", "TiO2*Li2O", "Li2TiO3(s)"
+        }
+        assert "Li2O*TiO2" not in {
+            r.formula for r in plain.search_compound("Li2TiO3").records_found
+        }
+
+    def test_searcher_applies_filters(self, index, db_connector):
+        searcher = CompoundSearcher(SQLBuilder(), db_connector, composition_index=index)
+        result = searcher.search_compound("Li2TiO3", phase="s")
+        assert result.records_found
+        assert all(r.phase == "s" for r in result.records_found)
+        assert not searcher.search_compound(
+            "Li2TiO3", temperature_range=(2000.0, 2500.0)
+        ).records_found
+
+    def test_loader_stage_two_uses_index(self, index, db_connector, tmp_path):
+        loader = CompoundDataLoader(
+            db_connector,
+            StaticDataManager(tmp_path / "static"),
+            logging.getLogger(__name__),
+            composition_index=index,
+        )
+        df = loader.get_raw_compound_data("CaSiO3")
+        assert set(df["Formula"]) == {"CaSiO3", "CaO*SiO2", "CaO·SiO2"}
+
+    def test_loader_does_not_return_isomers(self, index, db_connector, tmp_path):
+        loader = CompoundDataLoader(
+            db_connector,
+            StaticDataManager(tmp_path / "static"),
+            logging.getLogger(__name__),
+            composition_index=index,
+        )
+        df = loader.get_raw_compound_data("C2H5OH")
+        assert set(df["Formula"]) == {"C2H5OH", "C2H5OH(l)"}
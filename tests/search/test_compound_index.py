@@ -0,0 +1,175 @@
+"""
+Unit tests for CompoundIndexer.
+
+Index queries are checked against brute-force scans, and CompoundSearcher
+with the index pre-filter is checked against the plain SQL search.
+"""
+
+import random
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.thermo_agents.search.compound_index import CompoundIndexer
+from src.thermo_agents.search.compound_searcher import CompoundSearcher
+from src.thermo_agents.search.database_connector import DatabaseConnector
+from src.thermo_agents.search.sql_builder import SQLBuilder
+
+FORMULAS = [
+    "H2O", "H2O(g)", "H2O2", "HCl", "CO", "CO2", "CO2(g)", "CO3-2", "Co", "CoO",
+    "Fe", "FeO", "Fe2O3", "Fe3O4", "FeSiO3", "Fe+2", "NaCl", "NaCl(s)", "NH3",
+    "NH4Cl", "CaCO3", "CaO", "SiO2", "Li2TiO3", "TiO2", "O2", "N2", "CH4",
+]
+PHASES = ["g", "l", "s", "aq", None]
+
+
+def create_database(path: Path, rows: int = 600, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute("""
+            CREATE TABLE compounds (
+                Formula TEXT, FirstName TEXT, SecondName TEXT, Phase TEXT,
+                Tmin REAL, Tmax REAL, H298 REAL, S298 REAL,
+                f1 REAL, f2 REAL, f3 REAL, f4 REAL, f5 REAL, f6 REAL,
+                MeltingPoint REAL, BoilingPoint REAL, ReliabilityClass INTEGER
+            )
+        """)
+        for _ in range(rows):
+            tmin = rng.choice([100.0, 298.15, 500.0, 1000.0, 1500.0])
+            conn.execute(
+                "INSERT INTO compounds VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+                (
+                    rng.choice(FORMULAS), "Name", "", rng.choice(PHASES),
+                    tmin, tmin + rng.choice([100.0, 500.0, 2000.0]),
+                    -100.0, 50.0, 30.0, 1.0, 0.0, 0.0, 0.0, 0.0,
+                    300.0, 400.0, rng.choice([0, 1, 2, 3]),
+                ),
+            )
+
+
+@pytest.fixture
+def db_connector(tmp_path):
+    db_path = tmp_path / "compounds.db"
+    create_database(db_path)
+    connector = DatabaseConnector(db_path)
+    yield connector
+    connector.disconnect()
+
+
+@pytest.fixture
+def indexer(db_connector):
+    indexer = CompoundIndexer()
+    indexer.build_from_database(db_connector)
+    return indexer
+
+
+@pytest.fixture
+def all_rows(db_connector):
+    return db_connector.execute_query("SELECT rowid, * FROM compounds")
+
+
+class TestCompoundIndexer:
+    """Test index queries against brute-force scans."""
+
+    @pytest.mark.parametrize("prefix", ["H2O", "h2o", "CO", "Fe", "Fe2", "NaCl(", "X"])
+    def test_prefix_search_matches_scan(self, indexer, all_rows, prefix):
+        expected = sorted(
+            row["rowid"] for row in all_rows
+            if row["Formula"].upper().startswith(prefix.upper())
+        )
+        assert sorted(indexer.search_by_formula_prefix(prefix)) == expected
+
+    @pytest.mark.parametrize("tmin,tmax", [(298.15, 298.15), (0, 150), (600, 1200), (5000, 6000)])
+    def test_temperature_overlap_matches_scan(self, indexer, all_rows, tmin, tmax):
+        expected = sorted(
+            row["rowid"] for row in all_rows
+            if row["Tmax"] >= tmin and row["Tmin"] <= tmax
+        )
+        assert sorted(indexer.search_by_temperature_overlap(tmin, tmax)) == expected
+
+    def test_filters_on_record_ids(self, indexer, all_rows):
+        ids = [row["rowid"] for row in all_rows[:100]] + [10_000_000]
+
+        reliable = indexer.filter_by_reliability(ids, max_reliability_class=1)
+        assert sorted(reliable) == sorted(
+            row["rowid"] for row in all_rows[:100] if row["ReliabilityClass"] <= 1
+        )
+
+        in_range = indexer.filter_by_temperature_range(ids, (800, 900))
+        assert sorted(in_range) == sorted(
+            row["rowid"] for row in all_rows[:100]
+            if row["Tmax"] >= 800 and row["Tmin"] <= 900
+        )
+
+    def test_no_index(self):
+        indexer = CompoundIndexer()
+        assert indexer.search_by_formula_prefix("H2O") == []
+        assert indexer.filter_by_reliability([1, 2]) == [1, 2]
+        assert not indexer.is_built
+
+    def test_snapshot_roundtrip(self, indexer, db_connector, tmp_path):
+        snapshot = tmp_path / "index" / "compounds.npz"
+        indexer.save(snapshot)
+
+        loaded = CompoundIndexer()
+        loaded.load(snapshot)
+
+        for prefix in ["H2O", "Fe", "CO2"]:
+            assert loaded.search_by_formula_prefix(prefix) == indexer.search_by_formula_prefix(prefix)
+        assert loaded.get_performance_metrics()["total_records"] == 600
+
+    def test_load_or_build_rebuilds_stale_snapshot(self, db_connector, tmp_path):
+        snapshot = tmp_path / "compounds.npz"
+        indexer = CompoundIndexer()
+        indexer.load_or_build(db_connector, snapshot)
+        assert snapshot.exists()
+
+        db_connector.execute_query(
+            "INSERT INTO compounds (Formula, Phase, Tmin, Tmax, ReliabilityClass) "
+            "VALUES ('XeF2', 's', 298.15, 500, 1)"
+        )
+        db_connector._connection.commit()
+
+        fresh = CompoundIndexer()
+        fresh.load_or_build(db_connector, snapshot)
+        assert len(fresh.search_by_formula_prefix("XeF2")) == 1
+
+
+class TestCompoundSearcherPrefilter:
+    """CompoundSearcher returns the same records with and without the index."""
+
+    @pytest.mark.parametrize(
+        "formula,temperature_range,phase,found",
+        [
+            ("H2O", None, None, True),          # common compound
+            ("FeO", None, None, True),          # simple formula
+            ("Fe", (500, 900), None, True),     # simple, temperature filter
+            ("NaCl", None, "s", True),          # phase filter
+            ("FeSiO3", None, None, True),       # complex formula (containment)
+            ("CaCO3", (298.15, 298.15), None, True),
+            ("XeF2", None, None, False),        # no matches
+        ],
+    )
+    def test_same_results_as_sql(
+        self, db_connector, indexer, formula, temperature_range, phase, found
+    ):
+        sql_builder = SQLBuilder()
+        plain = CompoundSearcher(sql_builder, db_connector)
+        indexed = CompoundSearcher(sql_builder, db_connector, compound_index=indexer)
+
+        def key(result):
+            return [
+                (r.formula, r.phase, r.tmin, r.tmax, r.reliability_class)
+                for r in result.records_found
+            ]
+
+        expected = plain.search_compound(formula, temperature_range, phase, limit=1000)
+        actual = indexed.search_compound(formula, temperature_range, phase, limit=1000)
+
+        assert key(actual) == key(expected)
+        assert bool(actual.records_found) == found
+        assert not any("+" in r.formula for r in actual.records_found)
+
+        query, _ = indexed._build_search_query(formula, temperature_range, phase, 1000)
+        assert "rowid IN" in query
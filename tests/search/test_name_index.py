@@ -0,0 +1,162 @@
+"""
+Unit tests for the FTS5 compound name index.
+
+Covers name normalization, ranked lookups with word-order, spelling and typo
+variants, and the name-based stage of CompoundDataLoader and SQLBuilder.
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.thermo_agents.core_logic.compound_data_loader import CompoundDataLoader
+from src.thermo_agents.search.database_connector import DatabaseConnector
+from src.thermo_agents.search.name_index import (
+    NameIndex,
+    create_name_index,
+    fts_match_expression,
+    normalize_name,
+)
+from src.thermo_agents.search.sql_builder import SQLBuilder
+from src.thermo_agents.storage.static_data_manager import StaticDataManager
+
+ROWS = [
+    ("TiO2", "Titanium dioxide", "Rutile"),
+    ("TiO2(s)", "Titanium(IV) oxide", "Anatase"),
+    ("Al2O3", "Aluminum oxide", "Corundum"),
+    ("H2SO4", "Sulfuric acid", ""),
+    ("Fe+2", "Iron ion", ""),
+    ("CaCO3", "Calcium carbonate", "Calcite"),
+    ("CaCO3", "Calcium carbonate", "Aragonite"),
+    ("NaCl", "Sodium chloride", "Halite"),
+]
+
+
+def create_database(path: Path) -> None:
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute("""
+            CREATE TABLE compounds (
+                Formula TEXT, FirstName TEXT, SecondName TEXT, Phase TEXT,
+                Tmin REAL, Tmax REAL, H298 REAL, S298 REAL,
+                f1 REAL, f2 REAL, f3 REAL, f4 REAL, f5 REAL, f6 REAL,
+                MeltingPoint REAL, BoilingPoint REAL, ReliabilityClass INTEGER
+            )
+        """)
+        for formula, first_name, second_name in ROWS:
+            conn.execute(
+                "INSERT INTO compounds VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+                (
+                    formula, first_name, second_name, "s", 298.15, 1500.0,
+                    -100.0, 50.0, 30.0, 1.0, 0.0, 0.0, 0.0, 0.0, 300.0, 400.0, 1,
+                ),
+            )
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "compounds.db"
+    create_database(path)
+    create_name_index(path)
+    return path
+
+
+@pytest.fixture
+def db_connector(db_path):
+    connector = DatabaseConnector(db_path)
+    yield connector
+    connector.disconnect()
+
+
+@pytest.fixture
+def name_index(db_connector):
+    return NameIndex(db_connector)
+
+
+class TestNormalization:
+    """Test name normalization and match expressions."""
+
+    def test_normalize_name(self):
+        assert normalize_name("Titanium(IV)-Oxide ") == "titanium iv oxide"
+        assert normalize_name("Café  Oxide") == "cafe oxide"
+
+    def test_spelling_variants(self):
+        assert fts_match_expression("Aluminium oxide") == '("aluminium" OR "aluminum") AND "oxide"'
+
+    def test_empty_name(self):
+        assert fts_match_expression(" - ") is None
+
+
+class TestNameIndex:
+    """Test ranked lookups."""
+
+    def test_index_available(self, name_index, tmp_path):
+        assert name_index.is_available
+        plain = tmp_path / "plain.db"
+        create_database(plain)
+        connector = DatabaseConnector(plain)
+        assert not NameIndex(connector).is_available
+        assert NameIndex(connector).search("Titanium dioxide") == []
+        connector.disconnect()
+
+    @pytest.mark.parametrize("name", [
+        "Titanium dioxide", "titanium DIOXIDE", "Dioxide titanium", "rutile",
+    ])
+    def test_case_and_word_order(self, name_index, name):
+        assert name_index.search(name, "TiO2") == [1]
+
+    def test_formula_with_phase(self, name_index):
+        assert name_index.search("Anatase", "TiO2") == [2]
+
+    def test_spelling_variant(self, name_index):
+        assert name_index.search("Aluminium oxide", "Al2O3") == [3]
+        assert name_index.search("Sulphuric acid") == [4]
+
+    def test_typo_tolerance(self, name_index):
+        assert name_index.search("Titanum dioxid", "TiO2")[0] == 1
+        assert name_index.search("Calcium carbonat", "CaCO3") == [6, 7]
+        assert name_index.get_stats()["fuzzy_hits"] == 2
+
+    def test_unrelated_name_not_matched(self, name_index):
+        assert name_index.search("Sodium chloride", "TiO2") == []
+        assert name_index.search("Zirconium silicate", "TiO2") == []
+
+    def test_ions_excluded(self, name_index):
+        assert name_index.search("Iron ion") == []
+
+
+class TestNameIndexConsumers:
+    """Test the name-based stage of the loader and SQL builder."""
+
+    def _loader(self, db_connector, tmp_path, name_index=None):
+        return CompoundDataLoader(
+            db_connector,
+            StaticDataManager(tmp_path / "static"),
+            logging.getLogger(__name__),
+            name_index=name_index,
+        )
+
+    def test_loader_stage_one(self, db_connector, name_index, tmp_path):
+        exact = self._loader(db_connector, tmp_path)
+        fts = self._loader(db_connector, tmp_path, name_index)
+
+        assert exact._search_db_with_name("TiO2", "dioxide titanium").empty
+        df = fts._search_db_with_name("TiO2", "dioxide titanium")
+        assert list(df["FirstName"]) == ["Titanium dioxide"]
+
+        df = fts.get_raw_compound_data("CaCO3", ["calcite"])
+        assert list(df["SecondName"]) == ["Calcite"]
+
+    def test_sql_builder_name_condition(self, db_connector, name_index):
+        builder = SQLBuilder(name_index=name_index)
+        query, params = builder.build_compound_search_query(
+            "Sodium", compound_names=["chloride sodium"]
+        )
+        rows = db_connector.execute_query(query, params)
+        assert [row["Formula"] for row in rows] == ["NaCl"]
+
+        query, _ = SQLBuilder().build_compound_search_query(
+            "Sodium", compound_names=["chloride sodium"]
+        )
+        assert "compound_names_fts" not in query
@@ -0,0 +1,102 @@
+"""
+Интеграционные тесты webhook режима на локальном fake Bot API
+"""
+
+import asyncio
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from telegram.ext import CommandHandler, ApplicationHandlerStop
+
+from src.thermo_agents.telegram_bot.bot import ThermoSystemTelegramBot
+from tests.telegram_bot.utils.fake_bot_api import (
+    FakeBotApi, make_fake_api_config, make_message_update, start_bot
+)
+
+SECRET = "test-secret_123"
+
+
+@pytest_asyncio.fixture
+async def fake_api():
+    api = FakeBotApi()
+    await api.start()
+    yield api
+    await api.stop()
+
+
+@pytest_asyncio.fixture
+async def webhook_bot(fake_api, tmp_path):
+    config = make_fake_api_config(
+        fake_api,
+        mode="webhook",
+        webhook_secret_token=SECRET,
+        webhook_max_body_kb=4,
+        shutdown_drain_seconds=5,
+        temp_file_dir=str(tmp_path),
+    )
+    bot = ThermoSystemTelegramBot(config)
+    task = await start_bot(bot)
+    yield bot
+    if bot.status.is_running:
+        await bot.stop()
+    await task
+
+
+@pytest.mark.integration
+class TestWebhookMode:
+    """Webhook режим: доставка обновлений, ограничения и graceful drain"""
+
+    @pytest.mark.asyncio
+    async def test_webhook_registered_with_secret(self, fake_api, webhook_bot):
+        assert fake_api.webhook_url == webhook_bot.config.webhook_url
+        assert fake_api.webhook_secret == SECRET
+
+    @pytest.mark.asyncio
+    async def test_help_round_trip(self, fake_api, webhook_bot):
+        after = len(fake_api.calls)
+        await fake_api.push_update(make_message_update("/help"))
+
+        call = await fake_api.wait_for_call("sendMessage", 12345, after=after)
+        assert call["params"]["text"]
+
+    @pytest.mark.asyncio
+    async def test_wrong_secret_rejected(self, fake_api, webhook_bot):
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                fake_api.webhook_url,
+                json={"update_id": 1, **make_message_update("/help")},
+                headers={"X-Telegram-Bot-Api-Secret-Token": "wrong"},
+            ) as response:
+                assert response.status == 403
+
+        assert webhook_bot.webhook_server.updates_rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_oversized_body_rejected(self, fake_api, webhook_bot):
+        update = {"update_id": 1, **make_message_update("x" * 8192)}
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                fake_api.webhook_url,
+                json=update,
+                headers={"X-Telegram-Bot-Api-Secret-Token": SECRET},
+            ) as response:
+                assert response.status == 413
+
+    @pytest.mark.asyncio
+    async def test_graceful_drain_completes_accepted_updates(self, fake_api, webhook_bot):
+        finished = []
+
+        async def slow(update, context):
+            await asyncio.sleep(0.5)
+            finished.append(update.update_id)
+            raise ApplicationHandlerStop
+
+        webhook_bot.application.add_handler(CommandHandler("slow", slow), group=-1)
+
+        server = webhook_bot.webhook_server
+        await fake_api.push_update(make_message_update("/slow"))
+        await webhook_bot.stop()
+
+        assert len(finished) == 1
+        assert server.updates_received == 1
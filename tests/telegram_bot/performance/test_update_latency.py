@@ -0,0 +1,58 @@
+"""
+Performance тесты задержки update → reply: polling против webhook
+
+Оба режима используют одни и те же обработчики и fake Bot API на localhost,
+поэтому разница отражает только способ доставки обновлений.
+"""
+
+import statistics
+
+import pytest
+
+from src.thermo_agents.telegram_bot.bot import ThermoSystemTelegramBot
+from tests.telegram_bot.utils.fake_bot_api import (
+    FakeBotApi, make_fake_api_config, make_message_update, start_bot
+)
+
+ROUNDS = 20
+
+
+async def measure_latency(mode: str, tmp_path) -> list:
+    """Задержки (секунды) от отправки /help до sendMessage"""
+    api = FakeBotApi()
+    await api.start()
+    bot = ThermoSystemTelegramBot(
+        make_fake_api_config(api, mode=mode, temp_file_dir=str(tmp_path / mode))
+    )
+    task = await start_bot(bot)
+
+    latencies = []
+    try:
+        for _ in range(ROUNDS):
+            after = len(api.calls)
+            sent_at = await api.push_update(make_message_update("/help"))
+            call = await api.wait_for_call("sendMessage", 12345, after=after)
+            latencies.append(call["time"] - sent_at)
+    finally:
+        await bot.stop()
+        await task
+        await api.stop()
+    return latencies
+
+
+@pytest.mark.performance
+class TestUpdateLatency:
+    """Сравнение задержки обработки обновлений в режимах polling и webhook"""
+
+    @pytest.mark.asyncio
+    async def test_webhook_vs_polling_latency(self, tmp_path):
+        polling = await measure_latency("polling", tmp_path)
+        webhook = await measure_latency("webhook", tmp_path)
+
+        polling_p50 = statistics.median(polling) * 1000
+        webhook_p50 = statistics.median(webhook) * 1000
+
+        assert len(polling) == len(webhook) == ROUNDS
+        assert polling_p50 > 0 and webhook_p50 > 0
+        # Webhook не должен быть медленнее polling (с запасом на шум)
+        assert webhook_p50 <= polling_p50 * 1.5 + 5
@@ -0,0 +1,122 @@
+"""
+Tests for bounded-memory streaming analytics.
+
+This module tests the streaming summaries behind QueryAnalytics and
+BotMetrics: count-min sketch, space-saving top-k, t-digest, HyperLogLog
+and time-bucketed rollups, plus constant memory under unbounded traffic.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from src.telegram_bot.monitoring import BotMetrics, QueryAnalytics
+from src.telegram_bot.monitoring.streaming_stats import (
+    CountMinSketch,
+    HyperLogLog,
+    SpaceSavingTopK,
+    TDigest,
+    TimeBucketedRollup,
+)
+from src.telegram_bot.models.security import MonitoringConfig
+
+
+class TestStreamingSummaries:
+    """Test cases for the streaming data structures."""
+
+    def test_count_min_never_underestimates(self):
+        sketch = CountMinSketch(width=256, depth=4)
+        counts = {f"C{i}": i % 7 + 1 for i in range(500)}
+        for key, count in counts.items():
+            sketch.add(key, count)
+
+        for key, count in counts.items():
+            assert sketch.estimate(key) >= count
+
+    def test_space_saving_finds_heavy_hitters(self):
+        top = SpaceSavingTopK(capacity=10)
+        rng = random.Random(42)
+        stream = ["H2O"] * 500 + ["CO2"] * 300 + [f"X{i}" for i in range(2000)]
+        rng.shuffle(stream)
+        for item in stream:
+            top.offer(item)
+
+        leaders = [item for item, _ in top.top(2)]
+        assert leaders == ["H2O", "CO2"]
+        assert len(top) == 10
+        assert top.count("H2O") - top.error("H2O") <= 500 <= top.count("H2O")
+
+    def test_tdigest_quantiles(self):
+        digest = TDigest(compression=100)
+        values = list(range(1, 10001))
+        random.Random(1).shuffle(values)
+        for value in values:
+            digest.add(value)
+
+        assert abs(digest.quantile(0.5) - 5000) < 100
+        assert abs(digest.quantile(0.99) - 9900) < 50
+        assert digest.min == 1 and digest.max == 10000
+
+    def test_hyperloglog_estimates(self):
+        hll = HyperLogLog()
+        assert hll.count() == 0
+        hll.add(1)
+        hll.add(1)
+        assert hll.count() == 1
+
+        for i in range(20000):
+            hll.add(i)
+        assert abs(hll.count() - 20000) / 20000 < 0.1
+
+    def test_rollup_retention(self):
+        rollup = TimeBucketedRollup(lambda: {"n": 0}, bucket_seconds=3600, retention_buckets=3)
+        start = datetime(2024, 1, 1, 0, 30)
+        for hour in range(10):
+            rollup.bucket(start + timedelta(hours=hour))["n"] += 1
+
+        assert len(rollup) == 3
+        assert [bucket["n"] for _, bucket in rollup.items()] == [1, 1, 1]
+
+
+class TestBoundedAnalytics:
+    """QueryAnalytics and BotMetrics stay bounded under unbounded traffic."""
+
+    def test_query_analytics_memory_is_bounded(self):
+        analytics = QueryAnalytics(top_k=20, history_size=50, bucket_top_k=10)
+        for i in range(3000):
+            query = "H2O properties at 298K" if i % 3 == 0 else f"query {i}"
+            analytics.record_query(
+                user_id=i, query=query, extracted_params=None,
+                processing_time=0.5, success=True
+            )
+
+        assert len(analytics.query_history) == 50
+        assert len(analytics._top_queries) == 20
+        assert len(analytics._query_stats) <= 20
+        assert analytics.get_top_queries(limit=1)[0]["query"] == "H2O properties at 298K"
+        assert analytics.get_top_queries(limit=1, time_window=1)[0]["query"] == "H2O properties at 298K"
+
+        trends = analytics.get_usage_trends(hours=1)
+        assert trends["total_queries"] == 3000
+        assert abs(trends["active_users"] - 3000) / 3000 < 0.15
+
+    def test_classify_query_matches_all_categories(self):
+        analytics = QueryAnalytics()
+
+        assert analytics.classify_query("Check equilibrium constant") == ["equilibrium"]
+        assert "phase_transition" in analytics.classify_query("Water melting point")
+        assert analytics.classify_query("hello") == []
+
+    def test_bot_metrics_user_tracking_is_bounded(self):
+        metrics = BotMetrics(MonitoringConfig(enable_health_checks=False), max_tracked_users=100, top_k=10)
+        for i in range(1000):
+            metrics.record_request(
+                user_id=i, username=None, query=f"query {i % 50}",
+                processing_time=i / 1000, success=True
+            )
+
+        assert len(metrics.user_activities) == 100
+        assert len(metrics.query_stats) <= 10
+
+        stats = metrics.get_performance_stats()
+        assert abs(stats["total_unique_users"] - 1000) / 1000 < 0.1
+        assert abs(stats["response_time_stats"]["p50"] - 0.5) < 0.05
@@ -0,0 +1,107 @@
+"""
+Тесты контроля допуска запросов в ThermoIntegration
+"""
+
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.thermo_agents.models.extraction import ExtractedReactionParameters
+from src.thermo_agents.telegram_bot.utils.thermo_integration import ThermoIntegration
+
+REACTION_PARAMS = dict(
+    query_type="reaction_calculation",
+    balanced_equation="C + CO2 = 2CO",
+    all_compounds=["C", "CO2", "CO"],
+    reactants=["C", "CO2"],
+    products=["CO"],
+    temperature_range_k=[298, 2500],
+    extraction_confidence=0.95,
+)
+
+
+@pytest.fixture
+def integration():
+    config = Mock()
+    config.request_timeout_seconds = 60
+    config.max_concurrent_requests = 1
+    config.admission_queue_size = 1
+    config.admission_queue_per_user = 1
+    with patch('src.thermo_agents.telegram_bot.utils.thermo_integration.ThermoOrchestrator'):
+        integration = ThermoIntegration(config)
+
+    calls = []
+
+    async def process_query(query, deadline=None):
+        calls.append(query)
+        await asyncio.sleep(0.05)
+        return f"result for {query}"
+
+    integration.orchestrator.process_query = process_query
+    integration.orchestrator.get_extracted_params.return_value = None
+    integration.calls = calls
+    return integration
+
+
+class TestAdmissionControl:
+    """Очередь, ответы при перегрузке и оценка ожидания"""
+
+    @pytest.mark.asyncio
+    async def test_queued_request_gets_wait_estimate(self, integration):
+        waits = []
+
+        async def on_queued(wait):
+            waits.append(wait)
+
+        first, second = await asyncio.gather(
+            integration.process_query("H2O properties", 1),
+            integration.process_query("CO2 properties", 2, on_queued=on_queued),
+        )
+
+        assert first.success and second.success
+        assert len(waits) == 1 and waits[0] > 0
+        assert integration.get_admission_stats()["queued_total"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_response_under_load(self, integration):
+        await integration.process_query("H2O properties", 1)
+        ticket = await integration.admission.acquire("other")
+
+        response = await integration.process_query("H2O  properties", 2)
+
+        assert response.success and response.degraded == "cached"
+        assert response.content.endswith("result for H2O properties")
+        assert integration.calls == ["H2O properties"]
+        integration.admission.release(ticket)
+
+    @pytest.mark.asyncio
+    async def test_brief_response_from_known_params(self, integration):
+        params = ExtractedReactionParameters(**REACTION_PARAMS)
+        integration.orchestrator.get_extracted_params.return_value = params
+        integration.orchestrator.calculate_brief.return_value = "⚗️ кратко"
+        ticket = await integration.admission.acquire("other")
+
+        response = await integration.process_query("C + CO2", 2)
+
+        assert response.degraded == "brief" and response.params is params
+        assert response.content.endswith("⚗️ кратко")
+        integration.orchestrator.calculate_brief.assert_called_once_with(params)
+        assert integration.calls == []
+        integration.admission.release(ticket)
+
+    @pytest.mark.asyncio
+    async def test_overload_response_with_estimated_wait(self, integration):
+        ticket = await integration.admission.acquire("other")
+        queued = asyncio.create_task(integration.process_query("H2O properties", 1))
+        await asyncio.sleep(0)
+
+        response = await integration.process_query("CO2 properties", 2)
+
+        assert not response.success
+        assert response.estimated_wait_s > 0
+        assert "ожидание" in response.error
+        assert integration.get_admission_stats()["rejected"] == {"queue_full": 1}
+
+        integration.admission.release(ticket)
+        assert (await queued).success
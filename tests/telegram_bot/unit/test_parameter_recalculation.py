@@ -0,0 +1,279 @@
+"""
+Тесты пересчета кнопками диапазона и шага по сохраненным параметрам (без LLM)
+"""
+
+import threading
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.thermo_agents.models.extraction import ExtractedReactionParameters
+from src.thermo_agents.orchestrator import ThermoOrchestrator, ThermoOrchestratorConfig
+from src.thermo_agents.telegram_bot.config import BotStatus
+from src.thermo_agents.telegram_bot.handlers.callback_handler import CallbackHandler
+from src.thermo_agents.telegram_bot.utils.thermo_integration import ThermoIntegration
+from tests.telegram_bot.fixtures.mock_updates import (
+    create_mock_callback_query,
+    create_mock_telegram_bot_config,
+)
+
+REACTION_PARAMS = dict(
+    query_type="reaction_calculation",
+    balanced_equation="C + O2 = CO2",
+    all_compounds=["C", "O2", "CO2"],
+    reactants=["C", "O2"],
+    products=["CO2"],
+    temperature_range_k=[298, 800],
+    extraction_confidence=0.95,
+)
+
+
+class FakeAgent:
+    """LLM агент с фиксированными параметрами и счетчиком вызовов"""
+
+    model_name = "fake"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def extract_parameters(self, query, deadline=None):
+        self.calls += 1
+        return ExtractedReactionParameters(**REACTION_PARAMS)
+
+
+@pytest.fixture
+def orchestrator():
+    orchestrator = ThermoOrchestrator(
+        ThermoOrchestratorConfig(
+            db_path=Path("data/thermo_data.db"),
+            static_data_dir=Path("data/static_compounds"),
+        )
+    )
+    orchestrator.thermodynamic_agent = FakeAgent()
+    return orchestrator
+
+
+@pytest.fixture
+def callback_handler(orchestrator):
+    config = Mock()
+    config.request_timeout_seconds = 60
+    with patch('src.thermo_agents.telegram_bot.utils.thermo_integration.ThermoOrchestrator'):
+        integration = ThermoIntegration(config)
+    integration.orchestrator = orchestrator
+
+    with patch('src.thermo_agents.telegram_bot.handlers.callback_handler.ResponseFormatter'):
+        handler = CallbackHandler(
+            create_mock_telegram_bot_config(), BotStatus(), integration
+        )
+    handler._send_calculation_result = AsyncMock()
+    return handler
+
+
+def result_temperatures(content):
+    """Температуры из таблицы результатов реакции"""
+    table = content[content.index("Результаты расчёта"):]
+    temperatures = []
+    for line in table.splitlines():
+        cells = [cell.strip() for cell in line.split("|") if cell.strip()]
+        if cells and cells[0].isdigit():
+            temperatures.append(int(cells[0]))
+    return temperatures
+
+
+class TestOrchestratorRecalculate:
+    """Пересчет с новым окном и повторным использованием загруженных данных"""
+
+    def test_reaction_uses_params_window(self, orchestrator):
+        params = ExtractedReactionParameters(**REACTION_PARAMS).model_copy(
+            update={"temperature_range_k": (1000.0, 1400.0)}
+        )
+
+        result = orchestrator.recalculate(params, {})
+
+        assert result_temperatures(result) == [1000, 1100, 1200, 1300, 1400]
+
+    def test_frames_are_reused(self, orchestrator):
+        params = ExtractedReactionParameters(**REACTION_PARAMS)
+        frames = {}
+        orchestrator.recalculate(params, frames)
+        assert set(frames) == {"C", "O2", "CO2"}
+
+        with patch.object(
+            orchestrator.compound_loader,
+            "get_raw_compound_data_with_metadata",
+            side_effect=AssertionError("данные должны браться из frames"),
+        ):
+            result = orchestrator.recalculate(
+                params.model_copy(
+                    update={"temperature_range_k": (500.0, 700.0), "temperature_step_k": 50}
+                ),
+                frames,
+            )
+
+        assert result_temperatures(result) == [500, 550, 600, 650, 700]
+
+    def test_compound_data_window(self, orchestrator):
+        params = ExtractedReactionParameters(
+            query_type="compound_data",
+            balanced_equation="",
+            all_compounds=["H2O"],
+            reactants=[],
+            products=[],
+            temperature_range_k=(400.0, 600.0),
+            temperature_step_k=100,
+            extraction_confidence=0.9,
+        )
+        frames = {}
+
+        result = orchestrator.recalculate(params, frames)
+
+        assert "СВОЙСТВА ВЕЩЕСТВА" in result
+        assert set(frames) == {"H2O"}
+
+
+class TestRangeCallbacks:
+    """Кнопки диапазона и шага пересчитывают без повторного вызова LLM"""
+
+    @pytest.mark.parametrize("range_type, expected", [
+        ("expand", (100.0, 1051.0)),
+        ("shrink", (449.0, 649.0)),
+        ("low", (100.0, 400.0)),
+        ("high", (1000.0, 2000.0)),
+    ])
+    def test_modify_temperature_range(self, range_type, expected):
+        assert CallbackHandler._modify_temperature_range((298.0, 800.0), range_type) == expected
+
+    @pytest.mark.parametrize("window, expected", [
+        ((298.0, 2500.0), (100.0, 3601.0)),
+        ((50.0, 5900.0), (50.0, 6000.0)),
+    ])
+    def test_expand_never_narrows(self, window, expected):
+        assert CallbackHandler._modify_temperature_range(window, "expand") == expected
+
+    @pytest.mark.asyncio
+    async def test_buttons_start_from_displayed_reaction_range(self, callback_handler):
+        await callback_handler.handle_callback(create_mock_callback_query("calc_carbon"), Mock())
+
+        params = callback_handler.get_user_history(12345)["params"]
+        assert params.temperature_range_k == (298.0, 2500.0)
+        assert params.temperature_step_k == 100
+
+    @pytest.mark.asyncio
+    async def test_range_and_step_skip_llm(self, callback_handler, orchestrator):
+        await callback_handler.handle_callback(create_mock_callback_query("calc_carbon"), Mock())
+        await callback_handler.handle_callback(create_mock_callback_query("range_high"), Mock())
+        await callback_handler.handle_callback(create_mock_callback_query("step_250"), Mock())
+
+        assert orchestrator.thermodynamic_agent.calls == 1
+        history = callback_handler.get_user_history(12345)
+        assert history["params"].temperature_range_k == (1000.0, 2000.0)
+        assert history["params"].temperature_step_k == 250
+        assert set(history["frames"]) == {"C", "O2", "CO2"}
+
+        content = callback_handler._send_calculation_result.call_args.args[1]
+        assert result_temperatures(content) == [1000, 1250, 1500, 1750, 2000]
+
+    @pytest.mark.asyncio
+    async def test_first_recalculation_reuses_query_frames(self, callback_handler, orchestrator):
+        await callback_handler.handle_callback(create_mock_callback_query("calc_carbon"), Mock())
+        assert set(callback_handler.get_user_history(12345)["frames"]) == {"C", "O2", "CO2"}
+
+        with patch.object(
+            orchestrator.compound_loader,
+            "get_raw_compound_data_with_metadata",
+            side_effect=AssertionError("данные должны браться из ответа на запрос"),
+        ):
+            await callback_handler.handle_callback(create_mock_callback_query("range_high"), Mock())
+
+        content = callback_handler._send_calculation_result.call_args.args[1]
+        assert result_temperatures(content) == [1000, 1100, 1200, 1300, 1400, 1500,
+                                                1600, 1700, 1800, 1900, 2000]
+
+    @pytest.mark.asyncio
+    async def test_narrower_window_reuses_query_records(self, callback_handler, orchestrator):
+        await callback_handler.handle_callback(create_mock_callback_query("calc_carbon"), Mock())
+        records_cache = callback_handler.get_user_history(12345)["records_cache"]
+        assert {key[:3] for key in records_cache} == {
+            (formula, 298, 2500) for formula in ("C", "O2", "CO2")
+        }
+
+        with patch.object(
+            orchestrator.range_builder,
+            "get_compound_records_for_range",
+            side_effect=AssertionError("записи должны браться из ответа на запрос"),
+        ):
+            await callback_handler.handle_callback(create_mock_callback_query("range_high"), Mock())
+
+        content = callback_handler._send_calculation_result.call_args.args[1]
+        assert result_temperatures(content)[0] == 1000
+        assert (
+            ("C", 1000.0, 2000.0, None)
+            in callback_handler.get_user_history(12345)["records_cache"]
+        )
+
+    def test_narrowed_records_cover_window(self, orchestrator):
+        records = [
+            {"Tmin": 298.0, "Tmax": 700.0},
+            {"Tmin": 700.0, "Tmax": 1500.0},
+            {"Tmin": 1500.0, "Tmax": 2500.0},
+        ]
+        cache = {("X", 298, 2500, None): records, ("Y", 500, 900, None): records}
+
+        narrowed = ThermoOrchestrator._narrow_records(cache, (800.0, 1200.0))
+
+        assert narrowed == {("X", 800.0, 1200.0, None): [records[1]]}
+
+    @pytest.mark.asyncio
+    async def test_recalculation_runs_in_thread_with_admission(self, callback_handler, orchestrator):
+        integration = callback_handler.thermo_integration
+        params = ExtractedReactionParameters(**REACTION_PARAMS)
+        seen = {}
+
+        def recalculate(params, frames, records_cache):
+            seen["thread"] = threading.current_thread()
+            seen["in_flight"] = integration.admission.in_flight
+            return "результат"
+
+        with patch.object(orchestrator, "recalculate", side_effect=recalculate):
+            result = await integration.recalculate(params, {}, 12345)
+
+        assert result.success and result.content == "результат"
+        assert seen["thread"] is not threading.main_thread()
+        assert seen["in_flight"] == 1
+        assert integration.admission.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_recalculation_rejected_under_overload(self, callback_handler, orchestrator):
+        integration = callback_handler.thermo_integration
+        integration.admission.max_queue = 0
+        integration.admission.in_flight = integration.admission.concurrency_limit
+
+        with patch.object(orchestrator, "recalculate") as recalculate:
+            result = await integration.recalculate(
+                ExtractedReactionParameters(**REACTION_PARAMS), {}, 12345
+            )
+
+        recalculate.assert_not_called()
+        assert not result.success
+        assert result.estimated_wait_s is not None
+
+    @pytest.mark.asyncio
+    async def test_invalid_step(self, callback_handler):
+        update = create_mock_callback_query("step_1000")
+        await callback_handler.handle_callback(update, Mock())
+
+        assert "Неизвестный шаг" in update.callback_query.message.reply_text.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_range_without_params_falls_back_to_query(self, callback_handler):
+        callback_handler._save_query_to_history(12345, "CO2 свойства", "content", "compound_data")
+        callback_handler.thermo_integration.process_query = AsyncMock(
+            return_value=Mock(success=True, content="result", query_type="compound_data", params=None)
+        )
+
+        await callback_handler.handle_callback(create_mock_callback_query("range_expand"), Mock())
+
+        callback_handler.thermo_integration.process_query.assert_called_once_with(
+            "CO2 свойства расширить диапазон до 2000K", 12345
+        )
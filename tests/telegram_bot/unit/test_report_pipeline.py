@@ -0,0 +1,148 @@
+"""
+Unit тесты потокового конвейера файлов отчетов (FileHandler + TempFileIndex)
+"""
+
+import gzip
+import os
+import time
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+from src.thermo_agents.telegram_bot.formatters.file_handler import (
+    FileHandler,
+    TempFileIndex,
+)
+
+
+def make_config(temp_dir, **overrides):
+    """Минимальная конфигурация файлового хендлера"""
+    values = dict(
+        temp_file_dir=temp_dir,
+        max_file_size_mb=1,
+        file_cleanup_hours=24,
+        report_compression="none",
+        report_compress_threshold_kb=1,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestReportPipeline:
+    """Тесты потоковой записи отчетов"""
+
+    @pytest.mark.asyncio
+    async def test_streamed_report_matches_joined_content(self, tmp_path):
+        """Отчет из частей совпадает с отчетом из одной строки"""
+        handler = FileHandler(make_config(tmp_path))
+        chunks = [f"T={t} K; ΔG=-{t}" for t in range(300, 400)]
+
+        path, error = await handler.create_report_file(iter(chunks), "reaction", ["H2O"])
+
+        assert error is None
+        expected = handler._format_report_content("\n".join(chunks), "Термодинамический отчет", "reaction")
+        assert path.read_text(encoding="utf-8") == expected
+        assert handler.index.count == 1
+        assert handler.index.total_size == path.stat().st_size
+
+    @pytest.mark.asyncio
+    async def test_auto_mode_compresses_large_reports(self, tmp_path):
+        """auto: маленькие отчеты — .txt, большие — .txt.gz"""
+        handler = FileHandler(make_config(tmp_path, report_compression="auto"))
+
+        small, _ = await handler.create_report_file(["short"], "reaction", ["H2"])
+        large, _ = await handler.create_report_file(["x" * 4096], "reaction", ["O2"])
+
+        assert small.suffix == ".txt"
+        assert large.name.endswith(".txt.gz")
+        assert "x" * 4096 in gzip.decompress(large.read_bytes()).decode("utf-8")
+
+    @pytest.mark.asyncio
+    async def test_zip_mode_single_entry(self, tmp_path):
+        """zip: архив с одним текстовым файлом"""
+        handler = FileHandler(make_config(tmp_path))
+
+        path, error = await handler.create_report_file(["data"], "compound_data", ["CO2"], compression="zip")
+
+        assert error is None
+        with zipfile.ZipFile(path) as archive:
+            assert len(archive.namelist()) == 1
+
+    @pytest.mark.asyncio
+    async def test_size_limit_leaves_no_partial_file(self, tmp_path):
+        """Превышение лимита не оставляет недописанный файл"""
+        handler = FileHandler(make_config(tmp_path))
+        chunks = ("y" * 1024 for _ in range(2048))
+
+        path, error = await handler.create_report_file(chunks, "reaction", ["H2O"])
+
+        assert path is None
+        assert "лимит" in error
+        assert list(tmp_path.iterdir()) == []
+        assert handler.index.count == 0
+
+    @pytest.mark.asyncio
+    async def test_zip_size_limit_leaves_no_partial_archive(self, tmp_path):
+        """zip: превышение лимита удаляет закрытый архив"""
+        handler = FileHandler(make_config(tmp_path))
+        chunks = ("y" * 1024 for _ in range(2048))
+
+        path, error = await handler.create_report_file(chunks, "reaction", ["H2O"], compression="zip")
+
+        assert path is None
+        assert "лимит" in error
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_cleanup_uses_index(self, tmp_path):
+        """Очистка удаляет устаревшие файлы и обновляет индекс"""
+        handler = FileHandler(make_config(tmp_path))
+        old, _ = await handler.create_report_file(["old"], "reaction", ["H2O"])
+        fresh, _ = await handler.create_report_file(["fresh"], "reaction", ["CO2"])
+        stale = time.time() - 48 * 3600
+        os.utime(old, (stale, stale))
+        handler.index.add(old, old.stat().st_size, created=stale)
+
+        removed = await handler.cleanup_old_files()
+
+        assert removed == 1
+        assert not old.exists() and fresh.exists()
+        assert await handler.get_temp_files_count() == 1
+
+    @pytest.mark.asyncio
+    async def test_open_input_file_closes_handle(self, tmp_path):
+        """Дескриптор файла закрывается после выхода из контекста"""
+        handler = FileHandler(make_config(tmp_path))
+        path, _ = await handler.create_report_file(["content"], "reaction", ["H2O"])
+
+        async with handler.open_input_file(path) as input_file:
+            assert input_file.filename == path.name
+            handle = input_file.input_file_content
+            assert not handle.closed
+
+        assert handle.closed
+
+
+class TestTempFileIndex:
+    """Тесты индекса временных файлов"""
+
+    def test_index_scans_existing_files(self, tmp_path):
+        """Индекс подхватывает уже существующие файлы thermo_*"""
+        (tmp_path / "thermo_a.txt").write_text("abc")
+        (tmp_path / "other.txt").write_text("ignored")
+
+        index = TempFileIndex(tmp_path)
+
+        assert index.count == 1
+        assert index.total_size == 3
+
+    def test_pop_expired(self, tmp_path):
+        """pop_expired возвращает только устаревшие записи"""
+        index = TempFileIndex(tmp_path)
+        index.add(tmp_path / "thermo_old.txt", 10, created=100.0)
+        index.add(tmp_path / "thermo_new.txt", 20, created=200.0)
+
+        assert index.pop_expired(150.0) == ["thermo_old.txt"]
+        assert index.count == 1
+        assert index.total_size == 20
@@ -0,0 +1,198 @@
+"""
+Тесты объединения одинаковых одновременных запросов (single-flight)
+"""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.telegram_bot.models.security import MonitoringConfig
+from src.telegram_bot.monitoring.bot_metrics import BotMetrics
+from src.thermo_agents.models.extraction import ExtractedReactionParameters
+from src.thermo_agents.orchestrator import ThermoOrchestrator, ThermoOrchestratorConfig
+from src.thermo_agents.telegram_bot.utils.thermo_integration import ThermoIntegration
+
+REACTION_PARAMS = dict(
+    query_type="reaction_calculation",
+    balanced_equation="C + CO2 = 2CO",
+    all_compounds=["C", "CO2", "CO"],
+    reactants=["C", "CO2"],
+    products=["CO"],
+    temperature_range_k=[298, 2500],
+    extraction_confidence=0.95,
+)
+
+
+@pytest.fixture
+def metrics():
+    return BotMetrics(MonitoringConfig(enable_health_checks=False))
+
+
+@pytest.fixture
+def integration(metrics):
+    config = Mock()
+    config.request_timeout_seconds = 60
+    with patch('src.thermo_agents.telegram_bot.utils.thermo_integration.ThermoOrchestrator'):
+        integration = ThermoIntegration(config, metrics=metrics)
+
+    calls = []
+
+    async def process_query(query, deadline=None):
+        calls.append(query)
+        await asyncio.sleep(0.05)
+        return f"result for {query}"
+
+    integration.orchestrator.process_query = process_query
+    integration.calls = calls
+    return integration
+
+
+class FakeAgent:
+    """LLM агент, возвращающий одинаковые параметры на разные формулировки"""
+
+    model_name = "fake"
+
+    async def extract_parameters(self, query):
+        await asyncio.sleep(0.01)
+        return ExtractedReactionParameters(**REACTION_PARAMS)
+
+
+class TestQueryCoalescing:
+    """Объединение по нормализованному тексту запроса"""
+
+    @pytest.mark.asyncio
+    async def test_identical_queries_processed_once(self, integration, metrics):
+        responses = await asyncio.gather(*(
+            integration.process_query("C + CO2 = 2CO", user_id=i) for i in range(4)
+        ))
+
+        assert len(integration.calls) == 1
+        assert all(r.success and r.content == "result for C + CO2 = 2CO" for r in responses)
+
+        stats = metrics.get_performance_stats()
+        assert stats["coalesced_requests"] == 3
+        assert stats["coalesced_by_kind"] == {"query": 3}
+
+    @pytest.mark.asyncio
+    async def test_whitespace_is_normalized_but_case_is_not(self, integration):
+        await asyncio.gather(
+            integration.process_query("CO  +  O2", user_id=1),
+            integration.process_query(" CO + O2 ", user_id=2),
+            integration.process_query("Co + O2", user_id=3),
+        )
+
+        assert len(integration.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_affect_others(self, integration):
+        first = asyncio.create_task(integration.process_query("H2O", user_id=1))
+        second = asyncio.create_task(integration.process_query("H2O", user_id=2))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        response = await second
+
+        assert response.success
+        assert len(integration.calls) == 1
+
+
+class TestParamsCoalescing:
+    """Объединение по каноническим извлеченным параметрам"""
+
+    @pytest.mark.asyncio
+    async def test_different_wording_same_params_calculated_once(self, metrics):
+        orchestrator = ThermoOrchestrator(
+            ThermoOrchestratorConfig(
+                db_path=Path("data/thermo_data.db"),
+                static_data_dir=Path("data/static_compounds"),
+            )
+        )
+        orchestrator.thermodynamic_agent = FakeAgent()
+        orchestrator.calculation_flight.on_coalesced = metrics.record_coalesced
+
+        calculations = []
+        calculate = orchestrator._calculate_reaction
+
+        async def slow_run(params, **kwargs):
+            calculations.append(params)
+            await asyncio.sleep(0.05)
+            return calculate(params, **kwargs)
+
+        orchestrator._run_calculation = slow_run
+
+        results = await asyncio.gather(
+            orchestrator.process_query("C + CO2 = 2CO"),
+            orchestrator.process_query("Реакция углерода с CO2"),
+        )
+
+        assert results[0] == results[1]
+        assert len(calculations) == 1
+        assert metrics.get_performance_stats()["coalesced_by_kind"] == {"params": 1}
+
+
+def test_bot_records_coalesced_requests(tmp_path):
+    from src.thermo_agents.telegram_bot.bot import ThermoSystemTelegramBot
+    from src.thermo_agents.telegram_bot.config import TelegramBotConfig
+
+    bot = ThermoSystemTelegramBot(TelegramBotConfig(
+        bot_token="123456:TEST-TOKEN",
+        bot_username="ThermoCalcBot",
+        enable_session_logging=False,
+        temp_file_dir=str(tmp_path),
+    ))
+
+    assert bot.thermo_integration.metrics is bot.metrics
+    bot.thermo_integration.query_flight.on_coalesced("query")
+    assert bot.metrics.coalesced_counts == {"query": 1}
+
+
+RUN_DEV_SCRIPT = """
+import asyncio
+import sys
+
+sys.path.insert(0, "src")
+
+from thermo_agents.telegram_bot.bot import ThermoSystemTelegramBot
+from thermo_agents.telegram_bot.config import TelegramBotConfig
+
+bot = ThermoSystemTelegramBot(TelegramBotConfig(
+    bot_token="123456:TEST-TOKEN",
+    bot_username="ThermoCalcBot",
+    enable_session_logging=False,
+    temp_file_dir=sys.argv[1],
+))
+
+
+async def process_query(query, deadline=None):
+    await asyncio.sleep(0.05)
+    return "result"
+
+
+async def main():
+    integration = bot.thermo_integration
+    integration.orchestrator.process_query = process_query
+    await asyncio.gather(
+        integration.process_query("H2O", user_id=1),
+        integration.process_query("H2O", user_id=2),
+    )
+
+asyncio.run(main())
+print(bot.metrics.coalesced_counts)
+"""
+
+
+def test_bot_imported_as_in_run_dev_records_coalesced(tmp_path):
+    """scripts/run_dev.py импортирует бота как thermo_agents, без префикса src"""
+    import subprocess
+    import sys
+
+    project_root = Path(__file__).resolve().parents[3]
+    result = subprocess.run(
+        [sys.executable, "-c", RUN_DEV_SCRIPT, str(tmp_path)],
+        cwd=project_root, capture_output=True, text=True, timeout=120,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "{'query': 1}"
@@ -0,0 +1,168 @@
+"""
+Тесты смены формата и повтора ответа по сохраненному результату реакции
+(без пересчета и без LLM)
+"""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.thermo_agents.formatting import ReactionResult
+from src.thermo_agents.models.extraction import ExtractedReactionParameters
+from src.thermo_agents.orchestrator import ThermoOrchestrator, ThermoOrchestratorConfig
+from src.thermo_agents.telegram_bot.config import BotStatus
+from src.thermo_agents.telegram_bot.handlers.callback_handler import CallbackHandler
+from src.thermo_agents.telegram_bot.utils.thermo_integration import ThermoIntegration
+from tests.telegram_bot.fixtures.mock_updates import (
+    create_mock_callback_query,
+    create_mock_telegram_bot_config,
+)
+
+REACTION_PARAMS = dict(
+    query_type="reaction_calculation",
+    balanced_equation="C + O2 = CO2",
+    all_compounds=["C", "O2", "CO2"],
+    reactants=["C", "O2"],
+    products=["CO2"],
+    temperature_range_k=[298, 800],
+    extraction_confidence=0.95,
+)
+
+
+class FakeAgent:
+    """LLM агент с фиксированными параметрами и счетчиком вызовов"""
+
+    model_name = "fake"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def extract_parameters(self, query, deadline=None):
+        self.calls += 1
+        return ExtractedReactionParameters(**REACTION_PARAMS)
+
+
+@pytest.fixture
+def orchestrator():
+    orchestrator = ThermoOrchestrator(
+        ThermoOrchestratorConfig(
+            db_path=Path("data/thermo_data.db"),
+            static_data_dir=Path("data/static_compounds"),
+        )
+    )
+    orchestrator.thermodynamic_agent = FakeAgent()
+    return orchestrator
+
+
+@pytest.fixture
+def callback_handler(orchestrator):
+    config = Mock()
+    config.request_timeout_seconds = 60
+    with patch('src.thermo_agents.telegram_bot.utils.thermo_integration.ThermoOrchestrator'):
+        integration = ThermoIntegration(config)
+    integration.orchestrator = orchestrator
+
+    with patch('src.thermo_agents.telegram_bot.handlers.callback_handler.ResponseFormatter'):
+        handler = CallbackHandler(
+            create_mock_telegram_bot_config(), BotStatus(), integration
+        )
+    handler._send_calculation_result = AsyncMock()
+    return handler
+
+
+def no_recalculation(orchestrator):
+    """Запрет повторного расчета реакции"""
+    return patch.object(
+        orchestrator.reaction_engine,
+        "calculate_reaction_with_metadata",
+        side_effect=AssertionError("представление должно строиться без пересчета"),
+    )
+
+
+class TestReactionResult:
+    """Представления строятся по требованию и запоминаются"""
+
+    def test_views_from_stored_result(self, orchestrator):
+        params = ExtractedReactionParameters(**REACTION_PARAMS)
+        content = orchestrator.calculate(params)
+
+        result = orchestrator.get_reaction_result(params)
+        assert isinstance(result, ReactionResult)
+        assert result.render("full") == content
+        assert result.rendered_views == ["full"]
+
+        with no_recalculation(orchestrator):
+            brief = result.render("brief")
+            detailed = result.render("detailed")
+            csv = result.render("csv")
+            assert orchestrator.calculate_brief(params) == brief
+
+        assert detailed.startswith(content)
+        assert "Источники данных и фазовые переходы" in detailed
+        assert csv.splitlines()[0].startswith("T")
+        assert len(csv.splitlines()) == len(result.df_result) + 1
+        assert result.render("file").endswith(csv)
+
+        with patch.object(result.formatter, "format_brief_result") as format_brief:
+            assert result.render("brief") is brief
+        format_brief.assert_not_called()
+
+        with pytest.raises(ValueError):
+            result.render("xlsx")
+
+    def test_brief_without_stored_result_does_not_calculate(self, orchestrator):
+        params = ExtractedReactionParameters(**REACTION_PARAMS)
+
+        with no_recalculation(orchestrator):
+            assert orchestrator.calculate_brief(params) is None
+
+    def test_sections_match_full_view(self, orchestrator):
+        params = ExtractedReactionParameters(**REACTION_PARAMS)
+        orchestrator.calculate(params)
+        result = orchestrator.get_reaction_result(params)
+
+        assert "\n".join(result.iter_sections()) == result.render("full")
+
+
+class TestFormatCallbacks:
+    """Кнопки формата и повтора не пересчитывают и не вызывают LLM"""
+
+    @pytest.mark.asyncio
+    async def test_format_switch_and_repeat(self, callback_handler, orchestrator):
+        await callback_handler.handle_callback(create_mock_callback_query("calc_carbon"), Mock())
+        history = callback_handler.get_user_history(12345)
+        result = history["result"]
+        assert isinstance(result, ReactionResult)
+
+        callback_handler.thermo_integration.process_query = AsyncMock(
+            side_effect=AssertionError("повтор должен отправлять сохраненный ответ")
+        )
+        with no_recalculation(orchestrator):
+            compact = create_mock_callback_query("format_compact")
+            await callback_handler.handle_callback(compact, Mock())
+            detailed = create_mock_callback_query("format_detailed")
+            await callback_handler.handle_callback(detailed, Mock())
+            csv = create_mock_callback_query("format_csv")
+            await callback_handler.handle_callback(csv, Mock())
+            await callback_handler.handle_callback(create_mock_callback_query("repeat_last"), Mock())
+
+        assert orchestrator.thermodynamic_agent.calls == 1
+        assert result.render("brief") in compact.callback_query.message.reply_text.call_args.args[0]
+        assert result.render("detailed") in detailed.callback_query.message.reply_text.call_args.args[0]
+
+        document = csv.callback_query.message.reply_document.call_args.kwargs
+        assert document["document"] == result.render("csv").encode("utf-8")
+        assert document["filename"].endswith(".csv")
+
+        assert callback_handler._send_calculation_result.call_args.args[1] == result.render("full")
+
+    @pytest.mark.asyncio
+    async def test_export_requires_reaction_result(self, callback_handler):
+        callback_handler._save_query_to_history(12345, "CO2 свойства", "content", "compound_data")
+
+        update = create_mock_callback_query("format_file")
+        await callback_handler.handle_callback(update, Mock())
+
+        update.callback_query.message.reply_document.assert_not_called()
+        assert "только для расчёта реакции" in update.callback_query.message.reply_text.call_args.args[0]
@@ -0,0 +1,227 @@
+"""
+Тесты хранилища сессий: истечение по колесу таймеров, бюджет памяти
+на тексты результатов и сохранение в SQLite
+"""
+
+from datetime import date, timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from src.thermo_agents.models.extraction import ExtractedReactionParameters
+from src.thermo_agents.telegram_bot.utils.session_manager import SessionManager
+from src.thermo_agents.telegram_bot.utils.session_store import (
+    ContentStore,
+    SessionStore,
+    TimeWheel,
+)
+
+PARAMS = dict(
+    query_type="reaction_calculation",
+    balanced_equation="C + O2 = CO2",
+    all_compounds=["C", "O2", "CO2"],
+    reactants=["C", "O2"],
+    products=["CO2"],
+    temperature_range_k=[298, 800],
+    extraction_confidence=0.95,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def result_text(seed: int, rows: int = 200) -> str:
+    """Таблица результата, как в ответах бота"""
+    lines = [f"Результаты расчёта #{seed}", "| T, K | ΔH | ΔS | ΔG |"]
+    for i in range(rows):
+        lines.append(f"| {298 + i} | {-393.5 + seed * 0.01 + i * 0.1:.3f} | {i * 0.37:.3f} | {-i * seed % 997:.1f} |")
+    return "\n".join(lines)
+
+
+class TestTimeWheel:
+    def test_expires_after_inactivity_only(self):
+        wheel = TimeWheel(timeout_s=60, granularity_s=10)
+        seen = {"a": 0, "b": 30}
+        wheel.schedule("a", 0)
+        wheel.schedule("b", 30)
+
+        assert wheel.expire(55, seen.get) == []
+        seen["a"] = 55  # активность переносит истечение без обращения к колесу
+        assert wheel.expire(100, seen.get) == ["b"]
+        assert wheel.expire(200, seen.get) == ["a"]
+        assert len(wheel) == 0
+
+    def test_long_gap_between_sweeps(self):
+        wheel = TimeWheel(timeout_s=60, granularity_s=10)
+        seen = {}
+        for i in range(20):
+            seen[i] = i * 7
+            wheel.schedule(i, i * 7)
+        del seen[0]  # больше не отслеживается
+
+        # Колесо прошло несколько оборотов без обхода
+        assert sorted(wheel.expire(10_000, seen.get)) == list(range(1, 20))
+        assert len(wheel) == 0
+
+
+class TestContentStore:
+    def test_shared_content_and_budget_spill(self, tmp_path):
+        store = ContentStore(memory_budget_bytes=4096, spill_dir=tmp_path)
+        text = result_text(1)
+        key = store.put(text)
+        assert store.put(text) == key  # одинаковый ответ хранится один раз
+
+        keys = [store.put(result_text(seed)) for seed in range(2, 12)]
+        assert store.memory_bytes <= 4096
+        assert store.get_stats()["spilled"] > 0
+        assert [store.get(k) for k in keys] == [result_text(seed) for seed in range(2, 12)]
+
+        store.release(key)
+        assert store.get(key) == text
+        store.release(key)
+        assert store.get(key) is None
+        assert key not in store
+
+    def test_large_content_goes_to_disk(self, tmp_path):
+        store = ContentStore(spill_dir=tmp_path, spill_threshold_bytes=256)
+        key = store.put(result_text(5, rows=2000))
+        assert store.memory_bytes == 0
+        assert store.get(key) == result_text(5, rows=2000)
+
+
+class TestSessionStore:
+    def test_inactive_users_leave_memory(self):
+        clock = FakeClock()
+        store = SessionStore(timeout_s=600, granularity_s=60, clock=clock)
+        store.open_session(1, "alice")
+        store.open_session(2, "bob")
+        store.save_history(2, "CO2", result_text(2), "compound_data")
+
+        clock.now += 400
+        store.record_activity(1)
+        clock.now += 400
+        assert store.expire() == [2]
+        assert list(store.sessions) == [1] and store.get_history(2) is None
+        assert store.content.memory_bytes == 0
+
+    def test_restart_with_sqlite(self, tmp_path):
+        clock = FakeClock()
+        db_path = tmp_path / "sessions.db"
+        params = ExtractedReactionParameters(**PARAMS)
+
+        store = SessionStore(timeout_s=600, db_path=db_path, clock=clock)
+        store.open_session(1, "alice")
+        store.record_activity(1)
+        store.save_history(1, "C + O2", result_text(1), "reaction_calculation", params)
+        store.open_session(2, "bob")
+        store.save_history(2, "H2O", result_text(2), "compound_data")
+        store.flush()
+        clock.now += 3600
+        store.expire()  # выгруженная из памяти история остается в SQLite
+        store.close()
+
+        restored = SessionStore(timeout_s=600, db_path=db_path, clock=clock)
+        assert not restored.sessions
+        session, opened = restored.open_session(1)
+        assert opened and session.request_count == 1 and session.username == "alice"
+
+        record = restored.get_history(1)
+        assert record.params == params
+        assert restored.get_content(record) == result_text(1)
+        assert restored.get_content(restored.get_history(2)) == result_text(2)
+        assert [s.user_id for s in restored.top_sessions(1)] == [1]
+        restored.close()
+
+    def test_released_content_is_not_written_to_disk(self, tmp_path):
+        store = SessionStore(timeout_s=600, db_path=tmp_path / "sessions.db")
+        store.open_session(1, "alice")
+        for seed in range(5):
+            store.save_history(1, "H2O", result_text(seed), "compound_data")
+
+        assert store.content.get_stats()["spilled"] == 0
+        store.flush()
+        assert store.content.get_stats()["spilled"] == 1
+        store.close()
+
+    def test_unreferenced_content_removed_from_disk(self, tmp_path):
+        clock = FakeClock()
+        spill_dir = tmp_path / "results"
+        store = SessionStore(
+            timeout_s=600,
+            db_path=tmp_path / "sessions.db",
+            spill_dir=spill_dir,
+            spill_threshold_bytes=256,
+            clock=clock,
+        )
+        store.open_session(1, "alice")
+        store.save_history(1, "H2O", result_text(1, rows=200), "compound_data")
+        store.open_session(2, "bob")
+        store.save_history(2, "CO2", result_text(2, rows=200), "compound_data")
+        store.flush()
+        clock.now += 3600
+        store.expire()  # на текст bob ссылается только история в SQLite
+
+        store.open_session(1, "alice")
+        store.get_history(1)
+        store.save_history(1, "O2", result_text(3, rows=200), "compound_data")
+        store.flush()
+
+        on_disk = {path.name for path in spill_dir.glob("*/*")}
+        assert on_disk == {
+            ContentStore.key_for(result_text(2, rows=200)),
+            ContentStore.key_for(result_text(3, rows=200)),
+        }
+        assert store.get_content(store.get_history(2)) == result_text(2, rows=200)
+        store.close()
+
+
+class TestSessionManager:
+    @pytest.mark.asyncio
+    async def test_limit_and_expiry(self):
+        clock = FakeClock()
+        config = Mock(max_concurrent_users=2)
+        manager = SessionManager(config, SessionStore(timeout_s=600, granularity_s=60, clock=clock))
+        manager._cleanup_task = Mock()  # без фоновой задачи
+
+        assert await manager.start_session(1, "alice")
+        assert await manager.start_session(2, "bob")
+        assert not await manager.start_session(3, "carol")
+        await manager.update_activity(1)
+
+        clock.now += 700
+        await manager._remove_inactive_sessions()
+        assert manager.get_active_users_count() == 0
+        assert await manager.start_session(3, "carol")
+        assert set(manager.active_sessions) == {3}
+        assert manager.get_user_statistics()["total_requests_today"] == 1
+
+    @pytest.mark.asyncio
+    async def test_daily_stats_reset_once_per_day(self):
+        clock = FakeClock()
+        manager = SessionManager(
+            Mock(max_concurrent_users=10),
+            SessionStore(timeout_s=600, granularity_s=60, clock=clock),
+        )
+        manager._cleanup_task = Mock()  # без фоновой задачи
+        await manager.start_session(1, "alice")
+        await manager.update_activity(1)
+
+        await manager._remove_inactive_sessions()
+        assert manager.get_user_statistics()["total_requests_today"] == 1
+
+        # Первая очистка нового дня сбрасывает статистику, следующие — нет
+        manager._stats_date = date.today() - timedelta(days=1)
+        await manager._remove_inactive_sessions()
+        assert manager.get_user_statistics()["total_requests_today"] == 0
+
+        await manager.update_activity(1)
+        for _ in range(5):
+            clock.now += 60
+            await manager._remove_inactive_sessions()
+        assert manager.get_user_statistics()["total_requests_today"] == 1
+        assert manager._stats_date == date.today()
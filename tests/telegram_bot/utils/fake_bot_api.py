@@ -0,0 +1,246 @@
+"""
+Локальный fake Telegram Bot API сервер для офлайн тестов
+
+Поддерживает методы, которые использует бот (getMe, getUpdates,
+setWebhook, sendMessage, sendDocument, ...), доставку обновлений как через
+long-polling, так и через webhook, и записывает все исходящие вызовы бота
+с временными метками для измерения задержки update → reply.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+from aiohttp import web
+
+BOT_USER = {
+    "id": 777000,
+    "is_bot": True,
+    "first_name": "ThermoCalcBot",
+    "username": "ThermoCalcBot",
+    "can_join_groups": False,
+    "can_read_all_group_messages": False,
+    "supports_inline_queries": False,
+}
+
+
+def make_message_update(text: str, chat_id: int = 12345, user_id: int = 12345) -> Dict[str, Any]:
+    """Словарь обновления с текстовым сообщением (команды получают entity)"""
+    message = {
+        "message_id": int(time.time() * 1000) % 1_000_000,
+        "date": int(time.time()),
+        "chat": {"id": chat_id, "type": "private", "first_name": "Test"},
+        "from": {"id": user_id, "is_bot": False, "first_name": "Test", "username": "tester"},
+        "text": text,
+    }
+    if text.startswith("/"):
+        command = text.split()[0]
+        message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(command)}]
+    return {"message": message}
+
+
+class FakeBotApi:
+    """Fake Bot API: aiohttp сервер на 127.0.0.1 со случайным портом"""
+
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+        self.webhook_url: Optional[str] = None
+        self.webhook_secret: Optional[str] = None
+        self._updates: List[Dict[str, Any]] = []
+        self._next_update_id = 1
+        self._next_message_id = 1
+        self._updates_changed = asyncio.Condition()
+        self._calls_changed = asyncio.Condition()
+        self._runner: Optional[web.AppRunner] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.port: Optional[int] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/bot"
+
+    @property
+    def base_file_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/file/bot"
+
+    async def start(self) -> None:
+        app = web.Application(client_max_size=50 * 1024 * 1024)
+        app.router.add_route("*", "/bot{token}/{method}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._session = aiohttp.ClientSession()
+
+    async def stop(self) -> None:
+        if self._session:
+            await self._session.close()
+        if self._runner:
+            await self._runner.cleanup()
+
+    # Доставка обновлений
+
+    async def push_update(self, update: Dict[str, Any]) -> float:
+        """Отправить обновление боту; возвращает время отправки (perf_counter)"""
+        update = dict(update, update_id=self._next_update_id)
+        self._next_update_id += 1
+        sent_at = time.perf_counter()
+
+        if self.webhook_url:
+            headers = {}
+            if self.webhook_secret:
+                headers["X-Telegram-Bot-Api-Secret-Token"] = self.webhook_secret
+            async with self._session.post(self.webhook_url, json=update, headers=headers) as response:
+                response.raise_for_status()
+        else:
+            async with self._updates_changed:
+                self._updates.append(update)
+                self._updates_changed.notify_all()
+        return sent_at
+
+    async def wait_for_call(self, method: str, chat_id: int, after: int = 0, timeout: float = 10.0) -> Dict[str, Any]:
+        """Дождаться вызова method для chat_id начиная с индекса after в self.calls"""
+
+        def find():
+            for call in self.calls[after:]:
+                if call["method"] == method and str(call["params"].get("chat_id")) == str(chat_id):
+                    return call
+            return None
+
+        async with self._calls_changed:
+            await asyncio.wait_for(self._calls_changed.wait_for(find), timeout)
+            return find()
+
+    # Обработчик Bot API
+
+    async def _read_params(self, request: web.Request) -> Dict[str, Any]:
+        if request.content_type == "application/json":
+            return await request.json()
+        if request.content_type == "multipart/form-data":
+            params = {}
+            async for part in await request.multipart():
+                if part.filename:
+                    params[part.name] = {"filename": part.filename, "size": len(await part.read())}
+                else:
+                    params[part.name] = await part.text()
+            return params
+        return dict(await request.post())
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        params = await self._read_params(request)
+
+        handler = getattr(self, f"_api_{method.lower()}", None)
+        result = await handler(params) if handler else True
+
+        if method.lower() != "getupdates":
+            async with self._calls_changed:
+                self.calls.append({"method": method, "params": params, "time": time.perf_counter()})
+                self._calls_changed.notify_all()
+
+        return web.json_response({"ok": True, "result": result})
+
+    def _message(self, params: Dict[str, Any], **extra) -> Dict[str, Any]:
+        self._next_message_id += 1
+        return {
+            "message_id": self._next_message_id,
+            "date": int(time.time()),
+            "chat": {"id": int(params.get("chat_id", 0)), "type": "private"},
+            "from": BOT_USER,
+            **extra,
+        }
+
+    async def _api_getme(self, params):
+        return BOT_USER
+
+    async def _api_setwebhook(self, params):
+        self.webhook_url = params.get("url") or None
+        self.webhook_secret = params.get("secret_token") or None
+        return True
+
+    async def _api_deletewebhook(self, params):
+        self.webhook_url = None
+        return True
+
+    async def _api_getwebhookinfo(self, params):
+        return {"url": self.webhook_url or "", "has_custom_certificate": False, "pending_update_count": 0}
+
+    async def _api_getupdates(self, params):
+        offset = int(params.get("offset") or 0)
+        timeout = float(params.get("timeout") or 0)
+
+        def pending():
+            return [u for u in self._updates if u["update_id"] >= offset]
+
+        async with self._updates_changed:
+            self._updates = pending()
+            if not self._updates and timeout > 0:
+                try:
+                    await asyncio.wait_for(self._updates_changed.wait_for(pending), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            return pending()
+
+    async def _api_sendmessage(self, params):
+        return self._message(params, text=params.get("text", ""))
+
+    async def _api_editmessagetext(self, params):
+        return self._message(params, text=params.get("text", ""))
+
+    async def _api_senddocument(self, params):
+        document = params.get("document", {})
+        return self._message(
+            params,
+            document={
+                "file_id": "fake-file",
+                "file_unique_id": "fake-file",
+                "file_name": document.get("filename", "report.txt") if isinstance(document, dict) else "report.txt",
+            },
+        )
+
+
+def free_port() -> int:
+    """Свободный TCP порт на 127.0.0.1"""
+    import socket
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def make_fake_api_config(api: FakeBotApi, mode: str = "polling", **overrides):
+    """TelegramBotConfig, направляющий бота на FakeBotApi"""
+    from src.thermo_agents.telegram_bot.config import TelegramBotConfig
+
+    port = free_port()
+    params = dict(
+        bot_token="123456:TEST-TOKEN",
+        bot_username="ThermoCalcBot",
+        mode=mode,
+        webhook_url=f"http://127.0.0.1:{port}/telegram",
+        webhook_listen="127.0.0.1",
+        webhook_port=port,
+        bot_api_base_url=api.base_url,
+        bot_api_base_file_url=api.base_file_url,
+        bot_timeout_seconds=1,
+        enable_session_logging=False,
+    )
+    params.update(overrides)
+    return TelegramBotConfig(**params)
+
+
+async def start_bot(bot, timeout: float = 10.0) -> asyncio.Task:
+    """Запуск bot.start() в фоне и ожидание перехода в состояние running"""
+    bot._setup_signal_handlers = lambda: None
+    task = asyncio.create_task(bot.start())
+    deadline = time.perf_counter() + timeout
+    while not bot.status.is_running:
+        if task.done():
+            task.result()
+        if time.perf_counter() > deadline:
+            raise TimeoutError("Бот не запустился")
+        await asyncio.sleep(0.02)
+    return task
@@ -442,5 +442,342 @@ class TestIntegrationWithNewArchitecture:
         assert "Стехиометрические коэффициенты НЕ используются" in formatted_prompt
 
 
+
+class TestPromptModes:
+    """Режимы промпта и учет токенов (модель — FunctionModel из pydantic_ai)."""
+
+    PARAMS = {
+        "query_type": "compound_data",
+        "balanced_equation": "",
+        "all_compounds": ["H2O"],
+        "reactants": [],
+        "products": [],
+        "temperature_range_k": [300, 600],
+        "extraction_confidence": 0.9,
+    }
+
+    class RecordingSessionLogger:
+        def __init__(self):
+            self.interactions = []
+
+        def log_llm_interaction(self, **kwargs):
+            self.interactions.append(kwargs)
+
+    async def _run(self, agent, query):
+        from pydantic_ai.messages import ModelResponse, ToolCallPart
+        from pydantic_ai.models.function import FunctionModel
+
+        calls = []
+
+        def respond(messages, info):
+            calls.append((messages, info))
+            return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, self.PARAMS)])
+
+        with agent.agent.override(model=FunctionModel(respond)):
+            params = await agent.extract_parameters(query)
+        return params, calls
+
+    def test_system_prompt_is_stable_prefix(self):
+        from thermo_agents.prompts import (
+            EXTRACTION_SYSTEM_PROMPT,
+            EXTRACTION_USER_TEMPLATE,
+            THERMODYNAMIC_EXTRACTION_PROMPT,
+        )
+
+        assert "{user_query}" not in EXTRACTION_SYSTEM_PROMPT
+        assert "{{" not in EXTRACTION_SYSTEM_PROMPT
+        assert '"compound_types": {' in EXTRACTION_SYSTEM_PROMPT
+        assert "# CLASSIFICATION RULES:" in EXTRACTION_SYSTEM_PROMPT
+        assert len(EXTRACTION_SYSTEM_PROMPT) < len(THERMODYNAMIC_EXTRACTION_PROMPT)
+        assert EXTRACTION_USER_TEMPLATE.format(user_query="q") == "User query: q"
+
+    @pytest.mark.asyncio
+    async def test_compact_mode_sends_instructions_once(self):
+        from thermo_agents.prompts import EXTRACTION_SYSTEM_PROMPT
+        from thermo_agents.thermodynamic_agent import create_thermo_agent
+
+        agent = create_thermo_agent("test_key", "http://localhost")
+        session_logger = self.RecordingSessionLogger()
+        agent.config.session_logger = session_logger
+
+        params, calls = await self._run(agent, "Свойства H2O")
+
+        assert params.all_compounds == ["H2O"]
+        messages, info = calls[0]
+        parts = messages[0].parts
+        assert [p.content for p in parts] == [EXTRACTION_SYSTEM_PROMPT, "User query: Свойства H2O"]
+        assert info.function_tools == []
+
+        usage = session_logger.interactions[0]["token_usage"]
+        assert usage["requests"] == 1 and usage["input_tokens"] > 0
+        assert agent.token_totals == usage
+        assert agent.get_status()["token_usage"] == usage
+
+    @pytest.mark.asyncio
+    async def test_legacy_mode_with_storage_tools(self):
+        from thermo_agents.thermodynamic_agent import create_thermo_agent
+
+        compact = create_thermo_agent("test_key", "http://localhost")
+        legacy = create_thermo_agent(
+            "test_key", "http://localhost", prompt_mode="legacy", storage_tools=True
+        )
+
+        await self._run(compact, "Свойства H2O")
+        _, calls = await self._run(legacy, "Свойства H2O")
+
+        messages, info = calls[0]
+        assert "Свойства H2O" in messages[0].parts[1].content
+        assert "# CLASSIFICATION RULES" in messages[0].parts[1].content
+        assert {tool.name for tool in info.function_tools} == {"save_to_storage", "load_from_storage"}
+        assert legacy.token_totals["input_tokens"] > compact.token_totals["input_tokens"]
+
+    @pytest.mark.asyncio
+    async def test_orchestrator_session_log_has_tokens(self, tmp_path):
+        from pathlib import Path
+
+        from pydantic_ai.messages import ModelResponse, ToolCallPart
+        from pydantic_ai.models.function import FunctionModel
+
+        from thermo_agents.orchestrator import ThermoOrchestrator, ThermoOrchestratorConfig
+        from thermo_agents.session_logger import SessionLogger
+        from thermo_agents.thermodynamic_agent import create_thermo_agent
+
+        session_logger = SessionLogger(logs_dir=tmp_path)
+        orchestrator = ThermoOrchestrator(
+            ThermoOrchestratorConfig(
+                db_path=Path("data/thermo_data.db"),
+                static_data_dir=Path("data/static_compounds"),
+            ),
+            session_logger=session_logger,
+        )
+        agent = orchestrator.thermodynamic_agent = create_thermo_agent(
+            "test_key", "http://localhost"
+        )
+
+        def respond(messages, info):
+            return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, self.PARAMS)])
+
+        with agent.agent.override(model=FunctionModel(respond)):
+            await orchestrator.process_query("Свойства H2O")
+        session_logger.close()
+
+        usage = agent.last_usage
+        assert usage["input_tokens"] > 0
+        log = session_logger.log_file.read_text(encoding="utf-8")
+        assert (
+            f"Tokens: input {usage['input_tokens']} (cached {usage['cache_read_tokens']}), "
+            f"output {usage['output_tokens']}, model calls 1"
+        ) in log
+
+
+class TestStreamingExtraction:
+    """Потоковое извлечение: частичные all_compounds и compound_names."""
+
+    PARAMS = {
+        "query_type": "reaction_calculation",
+        "balanced_equation": "C + CO2 = 2CO",
+        "all_compounds": ["C", "CO2", "CO"],
+        "reactants": ["C", "CO2"],
+        "products": ["CO"],
+        "compound_names": {"C": ["Graphite"], "CO2": ["Carbon dioxide"]},
+        "temperature_range_k": [298, 2500],
+        "extraction_confidence": 0.9,
+    }
+
+    def test_parse_partial_extraction(self):
+        import json
+
+        from thermo_agents.thermodynamic_agent import parse_partial_extraction
+
+        text = json.dumps(self.PARAMS)
+
+        partial = parse_partial_extraction(text[: text.index('"CO"')])
+        assert partial.all_compounds == ["C", "CO2"]
+        assert not partial.compounds_complete
+
+        partial = parse_partial_extraction(text[: text.index('"reactants": [') + 14])
+        assert partial.all_compounds == ["C", "CO2", "CO"]
+        assert partial.compounds_complete
+        assert not partial.names_complete
+
+        # Объект compound_names закрыт, но следующее поле еще не началось
+        names_end = text.index('"temperature_range_k"')
+        assert not parse_partial_extraction(text[:names_end]).names_complete
+
+        partial = parse_partial_extraction(text[: names_end + 24])
+        assert partial.names_complete
+        assert partial.compound_names == self.PARAMS["compound_names"]
+
+        assert parse_partial_extraction("").all_compounds == []
+        assert parse_partial_extraction(self.PARAMS).names_complete
+
+    @pytest.mark.asyncio
+    async def test_partials_arrive_before_output(self):
+        import json
+
+        from pydantic_ai.models.function import DeltaToolCall, FunctionModel
+
+        from thermo_agents.thermodynamic_agent import create_thermo_agent
+
+        text = json.dumps(self.PARAMS)
+        events = []
+
+        async def stream(messages, info):
+            yield {0: DeltaToolCall(name=info.output_tools[0].name)}
+            for i in range(0, len(text), 4):
+                events.append(("chunk", i))
+                yield {0: DeltaToolCall(json_args=text[i:i + 4])}
+
+        def on_partial(partial):
+            events.append(("partial", list(partial.all_compounds), partial.names_complete))
+
+        agent = create_thermo_agent("test_key", "http://localhost")
+        with agent.agent.override(model=FunctionModel(stream_function=stream)):
+            params = await agent.extract_parameters("Реакция углерода", on_partial=on_partial)
+
+        assert params.all_compounds == ["C", "CO2", "CO"]
+        partials = [e for e in events if e[0] == "partial"]
+        assert [p[1] for p in partials[:3]] == [["C"], ["C", "CO2"], ["C", "CO2", "CO"]]
+        assert partials[-1][2] is True
+        # Вещества переданы задолго до последнего фрагмента ответа
+        first_partial = events.index(partials[0])
+        assert first_partial < len(events) // 2
+        assert agent.last_usage["requests"] == 1
+
+
+def tool_model(payload, delay=0.0, fail=None):
+    """FunctionModel: ответ payload через delay секунд (или исключение fail)"""
+    import json
+
+    from pydantic_ai.messages import ModelResponse, ToolCallPart
+    from pydantic_ai.models.function import FunctionModel
+
+    calls = []
+
+    async def respond(messages, info):
+        calls.append(delay)
+        await asyncio.sleep(delay)
+        if fail is not None:
+            raise fail
+        return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, json.dumps(payload))])
+
+    model = FunctionModel(respond)
+    model.calls = calls
+    return model
+
+
+class TestResilience:
+    """Срок запроса, автоматический выключатель и дублирующие запросы."""
+
+    PARAMS = TestStreamingExtraction.PARAMS
+
+    @pytest.mark.asyncio
+    async def test_deadline_bounds_attempts(self):
+        import time
+
+        from thermo_agents.thermodynamic_agent import create_thermo_agent
+        from thermo_agents.utils.resilience import Deadline
+
+        agent = create_thermo_agent("test_key", "http://localhost")
+        slow = tool_model(self.PARAMS, delay=5.0)
+
+        start = time.monotonic()
+        with agent.agent.override(model=slow):
+            with pytest.raises(ValueError, match="превышено время ожидания"):
+                await agent.extract_parameters("Реакция углерода", deadline=Deadline.after(0.3))
+
+        # Без срока попытки ждали бы 30/60/90 с
+        assert time.monotonic() - start < 1.5
+        assert len(slow.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_breaker_fails_fast(self):
+        from thermo_agents.thermodynamic_agent import ThermoAgentConfig, ThermodynamicAgent
+
+        agent = ThermodynamicAgent(ThermoAgentConfig(
+            llm_api_key="test_key", llm_base_url="http://localhost",
+            breaker_failure_threshold=2, retry_backoff_s=0.0,
+        ))
+        failing = tool_model(self.PARAMS, fail=ConnectionError("network connection failed"))
+
+        with agent.agent.override(model=failing):
+            # Две неудачи размыкают выключатель, третья попытка не выполняется
+            with pytest.raises(ValueError, match="временно недоступна"):
+                await agent.extract_parameters("Реакция углерода")
+            assert agent.breaker.state == "open"
+            assert len(failing.calls) == 2
+
+            with pytest.raises(ValueError, match="временно недоступна"):
+                await agent.extract_parameters("Реакция углерода")
+
+        # Следующий запрос отклонен без обращения к модели
+        assert len(failing.calls) == 2
+        assert agent.get_resilience_stats()["breaker"]["rejected"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_is_released(self):
+        from thermo_agents.thermodynamic_agent import ThermoAgentConfig, ThermodynamicAgent
+
+        agent = ThermodynamicAgent(ThermoAgentConfig(
+            llm_api_key="test_key", llm_base_url="http://localhost",
+            breaker_failure_threshold=1, breaker_reset_s=0.0,
+        ))
+        agent.breaker.record_failure()
+        assert agent.breaker.state == "half_open"
+
+        slow = tool_model(self.PARAMS, delay=5.0)
+        with agent.agent.override(model=slow):
+            task = asyncio.create_task(agent.extract_parameters("Реакция углерода"))
+            while not slow.calls:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        # Отмененная проба не держит выключатель: следующий запрос — новая проба
+        assert agent.breaker.state == "half_open"
+        with agent.agent.override(model=tool_model(self.PARAMS)):
+            params = await agent.extract_parameters("Реакция углерода")
+        assert params.all_compounds == ["C", "CO2", "CO"]
+        assert agent.breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_hedged_request_wins(self):
+        from thermo_agents.thermodynamic_agent import ThermoAgentConfig, ThermodynamicAgent
+
+        agent = ThermodynamicAgent(ThermoAgentConfig(
+            llm_api_key="test_key", llm_base_url="http://localhost",
+            hedge_model="backup-model", hedge_delay_s=0.05,
+        ))
+        primary = tool_model(self.PARAMS, delay=2.0)
+        backup = tool_model(self.PARAMS, delay=0.01)
+
+        with agent.agent.override(model=primary), agent.hedge_agent.override(model=backup):
+            params = await agent.extract_parameters("Реакция углерода")
+
+        assert params.all_compounds == ["C", "CO2", "CO"]
+        assert len(backup.calls) == 1
+        hedging = agent.get_resilience_stats()["hedging"]
+        assert hedging["started"] == 1 and hedging["won"] == 1
+
+        # Быстрый ответ основной модели не порождает дублирующий запрос
+        fast = tool_model(self.PARAMS, delay=0.0)
+        with agent.agent.override(model=fast), agent.hedge_agent.override(model=backup):
+            await agent.extract_parameters("Реакция углерода")
+        assert len(backup.calls) == 1
+
+    def test_shared_http_client(self):
+        from thermo_agents.thermodynamic_agent import create_thermo_agent, get_shared_http_client
+
+        first = create_thermo_agent("test_key", "http://localhost")
+        second = create_thermo_agent("other_key", "http://localhost")
+
+        client = get_shared_http_client()
+        assert first._provider.client._client is client
+        assert second._provider.client._client is client
+        # Повторы SDK отключены: повторяет extract_parameters в пределах срока
+        assert first._provider.client.max_retries == 0
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,195 @@
+"""
+Тесты поиска точных температур ΔG = 0 и ln K = target (CrossoverSolver).
+
+Синтетические записи с постоянной Cp дают известные корни; реакция из
+YAML-кэша проверяется прямым расчетом ReactionEngine в найденной точке.
+"""
+
+import logging
+import math
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.thermo_agents.core_logic import (
+    CompoundDataLoader,
+    CrossoverSolver,
+    PhaseTransitionDetector,
+    ReactionEngine,
+    RecordRangeBuilder,
+    ThermodynamicEngine,
+)
+from src.thermo_agents.core_logic.crossover_solver import Crossover
+from src.thermo_agents.formatting import InterpretationFormatter
+from src.thermo_agents.models.extraction import ExtractedReactionParameters
+from src.thermo_agents.search.database_connector import DatabaseConnector
+from src.thermo_agents.storage.static_data_manager import StaticDataManager
+
+logger = logging.getLogger(__name__)
+
+COEFFICIENTS = {"A": -1.0, "B": 1.0}
+
+
+def make_record(tmin, tmax, h298, s298, cp):
+    # ThermodynamicEngine читает h298/s298 (кДж/моль, Дж/(моль·K)), отбор — Tmin/Tmax
+    return pd.Series({
+        "Formula": "X", "Phase": "s", "Tmin": tmin, "Tmax": tmax,
+        "h298": h298, "s298": s298,
+        "f1": cp, "f2": 0.0, "f3": 0.0, "f4": 0.0, "f5": 0.0, "f6": 0.0,
+    })
+
+
+def delta_G(solver, records, T):
+    engine = solver.thermo_engine
+    total = 0.0
+    for formula, coeff in COEFFICIENTS.items():
+        record, _ = solver._choose_record(records[formula], T)
+        total += coeff * engine.calculate_properties(record, T)["gibbs_energy"]
+    return total
+
+
+@pytest.fixture
+def solver():
+    return CrossoverSolver(ThermodynamicEngine(logger), logger)
+
+
+class TestEquilibriumTemperatures:
+    """ΔG(T) = 0 внутри сегментов и на их границах"""
+
+    def test_single_root(self, solver):
+        # ΔCp = 0: ΔG = 50000 - 50·T, корень ровно 1000 K
+        records = {
+            "A": [make_record(298.15, 3000.0, 0.0, 50.0, 30.0)],
+            "B": [make_record(298.15, 3000.0, 50.0, 100.0, 30.0)],
+        }
+
+        crossovers = solver.find_equilibrium_temperatures(records, COEFFICIENTS, 298.15, 2500.0)
+
+        assert len(crossovers) == 1
+        root = crossovers[0]
+        assert root.T == pytest.approx(1000.0, abs=1e-4)
+        assert root.becomes_spontaneous and not root.at_transition
+        assert root.evaluations <= 6
+
+    def test_two_roots_in_one_scan_interval(self, solver):
+        # ΔCp < 0: ΔG выпукла, минимум ниже нуля около 810 K
+        records = {
+            "A": [make_record(298.15, 3000.0, 0.0, 50.0, 30.0)],
+            "B": [make_record(298.15, 3000.0, 8.0, 70.0, 10.0)],
+        }
+        solver.scan_step = 5000.0
+
+        crossovers = solver.find_equilibrium_temperatures(records, COEFFICIENTS, 298.15, 2000.0)
+
+        assert len(crossovers) == 2
+        low, high = crossovers
+        assert low.T < 810 < high.T
+        assert low.becomes_spontaneous and not high.becomes_spontaneous
+        for crossover in crossovers:
+            assert abs(delta_G(solver, records, crossover.T)) < 1e-6
+
+    def test_jump_at_record_boundary(self, solver):
+        # Смена записи B при 1000 K переводит ΔG из + в -
+        records = {
+            "A": [make_record(298.15, 3000.0, 0.0, 50.0, 30.0)],
+            "B": [
+                make_record(298.15, 1000.0, 80.0, 100.0, 30.0),
+                make_record(1000.0, 3000.0, 20.0, 100.0, 30.0),
+            ],
+        }
+
+        crossovers = solver.find_equilibrium_temperatures(records, COEFFICIENTS, 298.15, 2500.0)
+
+        assert [c.T for c in crossovers] == [pytest.approx(1000.0)]
+        assert crossovers[0].at_transition
+        assert crossovers[0].becomes_spontaneous
+
+    def test_segment_boundaries(self):
+        records = {
+            "A": [make_record(298.15, 800.0, 0, 0, 1.0), make_record(800.0, 4000.0, 0, 0, 1.0)],
+            "B": [make_record(298.15, 1200.0, 0, 0, 1.0)],
+        }
+
+        boundaries = CrossoverSolver.segment_boundaries(
+            records, 298.15, 2500.0, transitions=[1500.0, float("nan"), 5000.0]
+        )
+
+        assert boundaries == [298.15, 800.0, 1200.0, 1500.0, 2500.0]
+
+
+class TestLnKTemperatures:
+    """ln K(T) = target"""
+
+    def test_ln_k_target(self, solver):
+        records = {
+            "A": [make_record(298.15, 3000.0, 0.0, 50.0, 30.0)],
+            "B": [make_record(298.15, 3000.0, 50.0, 100.0, 30.0)],
+        }
+
+        crossovers = solver.find_ln_k_temperatures(
+            records, COEFFICIENTS, math.log(10.0), 298.15, 2500.0
+        )
+
+        # ln K = -(50000 - 50·T)/(R·T) = ln 10  ->  T = 50000 / (50 - R·ln 10)
+        assert len(crossovers) == 1
+        assert crossovers[0].T == pytest.approx(50000 / (50 - 8.314 * math.log(10.0)), abs=1e-4)
+        assert crossovers[0].increasing
+
+
+class TestReactionEngineCrossovers:
+    """Интеграция с ReactionEngine на веществах из YAML-кэша"""
+
+    def test_matches_direct_calculation(self):
+        loader = CompoundDataLoader(
+            DatabaseConnector(Path("data/thermo_data.db")),
+            StaticDataManager(Path("data/static_compounds")),
+            logger,
+        )
+        engine = ReactionEngine(
+            loader,
+            PhaseTransitionDetector(),
+            RecordRangeBuilder(logger),
+            ThermodynamicEngine(logger),
+            logger,
+        )
+        params = ExtractedReactionParameters(
+            query_type="reaction_calculation",
+            balanced_equation="2CO + O2 = 2CO2",
+            all_compounds=["CO", "O2", "CO2"],
+            reactants=["CO", "O2"],
+            products=["CO2"],
+            temperature_range_k=[298, 2500],
+            extraction_confidence=0.95,
+            target_k=1.5,
+        )
+
+        crossovers = engine.find_crossover_temperatures(params, [298, 2500], target_k=1.5)
+
+        smooth = [c for c in crossovers if c.quantity == "ln_K" and not c.at_transition]
+        assert smooth
+        for crossover in smooth:
+            df = engine.calculate_reaction(params, [crossover.T, crossover.T + 0.5, 1])
+            assert df["ln_K"].iloc[0] == pytest.approx(math.log(1.5), abs=1e-9)
+
+
+class TestInterpretation:
+    """Вывод точных температур в интерпретации"""
+
+    def test_format_interpretation_with_crossovers(self):
+        df = pd.DataFrame({
+            "T": [800.0, 900.0, 1000.0, 1100.0, 1200.0],
+            "delta_G": [10000.0, 5000.0, 0.0, -5000.0, -10000.0],
+            "K": [0.2, 0.5, 1.0, 1.7, 2.7],
+        })
+        crossovers = [
+            Crossover(T=1000.0, quantity="delta_G", target=0.0, increasing=False),
+            Crossover(T=1234.5, quantity="ln_K", target=math.log(100.0), increasing=True),
+        ]
+
+        text = InterpretationFormatter().format_interpretation(df, None, crossovers)
+
+        assert "ΔG = 0 при T = 1000.00 K: выше реакция самопроизвольна" in text
+        assert "K = 100.00 при T = 1234.50 K: выше K > 100.00" in text
+        assert "~" not in text
+        assert "выше 1000 K" in text
@@ -0,0 +1,189 @@
+"""
+Тесты равновесного состава минимизацией энергии Гиббса (GibbsEquilibriumSolver).
+
+Синтетические G°/RT проверяют закон действующих масс и правило фаз для
+конденсированных веществ; смесь C/O2 из YAML-кэша сверяется с ln K
+реакции C + CO2 = 2CO из ReactionEngine.
+"""
+
+import logging
+import math
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.thermo_agents.core_logic import (
+    CompoundDataLoader,
+    GibbsEquilibriumSolver,
+    PhaseTransitionDetector,
+    ReactionEngine,
+    RecordRangeBuilder,
+    ThermodynamicEngine,
+)
+from src.thermo_agents.formatting import EquilibriumFormatter
+from src.thermo_agents.models.extraction import ExtractedReactionParameters
+from src.thermo_agents.search.database_connector import DatabaseConnector
+from src.thermo_agents.storage.static_data_manager import StaticDataManager
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    loader = CompoundDataLoader(
+        DatabaseConnector(Path("data/thermo_data.db")),
+        StaticDataManager(Path("data/static_compounds")),
+        logger,
+    )
+    return ReactionEngine(
+        loader,
+        PhaseTransitionDetector(),
+        RecordRangeBuilder(logger),
+        ThermodynamicEngine(logger),
+        logger,
+    )
+
+
+@pytest.fixture(scope="module")
+def solver(engine):
+    return GibbsEquilibriumSolver(engine, logger)
+
+
+class TestSolvePoint:
+    """Одна температура, заданные G°/RT"""
+
+    @pytest.mark.parametrize("pressure_bar", [0.1, 1.0, 10.0])
+    def test_gas_dissociation_law_of_mass_action(self, solver, pressure_bar):
+        # N2O4 = 2NO2, ln K = g(N2O4) - 2·g(NO2) = 1.5
+        g = np.array([-20.0, -10.75])  # N2O4, NO2
+        is_gas = np.array([True, True])
+        A = np.array([[2.0, 1.0], [4.0, 2.0]])  # N, O
+        b = np.array([2.0, 4.0])  # 1 моль N2O4
+
+        n, _, _, _, _ = solver.solve_point(g, is_gas, A, b, pressure_bar)
+
+        x = n / n.sum()
+        assert 2 * math.log(x[1]) - math.log(x[0]) + math.log(pressure_bar) == pytest.approx(1.5, abs=1e-8)
+        assert A @ n == pytest.approx(b, rel=1e-9)
+
+    def test_condensed_phase_present_or_absent(self, solver):
+        # C(к), O2, CO, CO2: избыток углерода остается твердым, кислород
+        # связан в CO/CO2
+        is_gas = np.array([False, True, True, True])
+        A = np.array([[1.0, 0.0, 1.0, 1.0], [0.0, 2.0, 1.0, 2.0]])  # C, O
+        g = np.array([0.0, 0.0, -30.0, -50.0])
+
+        n, lam, _, _, _ = solver.solve_point(g, is_gas, A, np.array([3.0, 2.0]))
+        assert n[0] > 0
+        assert solver.optimality_residual(n, g, is_gas, A, lam, 1.0) < 1e-6
+        # C + CO2 = 2CO при a(C) = 1: x_CO² / x_CO2 = exp(g_C + g_CO2 - 2·g_CO)
+        x = n[1:] / n[1:].sum()
+        assert 2 * math.log(x[1]) - math.log(x[2]) == pytest.approx(10.0, abs=1e-6)
+
+        # Недостаток углерода: твердый C отсутствует, a_C·λ < g_C
+        n, lam, _, _, _ = solver.solve_point(g, is_gas, A, np.array([0.5, 2.0]))
+        assert n[0] == 0.0
+        assert lam[0] < g[0]
+        assert A @ n == pytest.approx([0.5, 2.0], rel=1e-8)
+
+
+class TestSolve:
+    """Полный расчет по данным YAML-кэша"""
+
+    def test_carbon_oxygen_mixture(self, solver, engine):
+        temperatures = np.arange(600.0, 2001.0, 200.0)
+
+        result = solver.solve(["C", "O2", "CO", "CO2"], {"C": 2.0, "O2": 1.0}, temperatures)
+
+        assert result.converged.all()
+        assert result.balance_residual.max() < 1e-8
+        assert result.elements == ["C", "O"]
+        # Баланс элементов: 2 моль C и 2 моль O
+        C, O2, CO, CO2 = result.moles
+        assert C + CO + CO2 == pytest.approx(np.full(len(temperatures), 2.0), rel=1e-8)
+        assert 2 * O2 + CO + 2 * CO2 == pytest.approx(np.full(len(temperatures), 2.0), rel=1e-8)
+
+        # Где твердый углерод присутствует, выполняется равновесие Будуара
+        params = ExtractedReactionParameters(
+            query_type="reaction_calculation",
+            balanced_equation="C + CO2 = 2CO",
+            all_compounds=["C", "CO2", "CO"],
+            reactants=["C", "CO2"],
+            products=["CO"],
+            temperature_range_k=[600, 2000],
+            extraction_confidence=0.95,
+        )
+        df = engine.calculate_reaction(params, [600, 2000, 200])
+        x = result.mole_fractions()
+        checked = 0
+        for k, T in enumerate(temperatures):
+            if C[k] > 1e-9 and CO2[k] > 1e-12:
+                ln_K = df.loc[np.isclose(df["T"], T), "ln_K"].iloc[0]
+                assert 2 * math.log(x[2, k]) - math.log(x[3, k]) == pytest.approx(ln_K, abs=1e-5)
+                checked += 1
+        assert checked > 0
+
+    def test_missing_species_excluded(self, solver):
+        result = solver.solve(["C", "O2", "CO", "CO2", "NaCl"], {"C": 1.0, "O2": 1.0}, [1000.0])
+
+        assert "NaCl" in result.missing
+        assert result.converged.all()
+
+    def test_uncovered_element_raises(self, solver):
+        # Для ксенона нет данных: элемент нельзя распределить по веществам
+        with pytest.raises(ValueError):
+            solver.solve(["O2"], {"Xe": 1.0, "O2": 1.0}, [1000.0])
+
+
+class TestEquilibriumQuery:
+    """Параметры запроса и вывод"""
+
+    def test_params_validation(self):
+        params = ExtractedReactionParameters(
+            query_type="equilibrium_composition",
+            balanced_equation="",
+            all_compounds=["C", "O2", "CO", "CO2"],
+            reactants=["C", "O2"],
+            products=[],
+            initial_amounts={"C": 2.0, "O2": 1.0},
+            pressure_bar=5.0,
+            temperature_range_k=[500, 2500],
+            extraction_confidence=0.9,
+        )
+        assert params.is_complete()
+
+        with pytest.raises(ValueError):
+            params.model_copy(update={"initial_amounts": {"C": -1.0}}).model_post_init(None)
+        with pytest.raises(ValueError):
+            ExtractedReactionParameters(
+                query_type="equilibrium_composition",
+                balanced_equation="",
+                all_compounds=["C", "O2", "CO", "CO2"],
+                reactants=["C"],
+                products=[],
+                temperature_range_k=[500, 2500],
+                extraction_confidence=0.9,
+                pressure_bar=0.0,
+            )
+
+    def test_formatter_output(self, solver):
+        result = solver.solve(["C", "O2", "CO", "CO2"], {"C": 2.0, "O2": 1.0}, [800.0, 1600.0])
+        params = ExtractedReactionParameters(
+            query_type="equilibrium_composition",
+            balanced_equation="",
+            all_compounds=["C", "O2", "CO", "CO2"],
+            reactants=["C", "O2"],
+            products=[],
+            initial_amounts={"C": 2.0, "O2": 1.0},
+            temperature_range_k=[800, 1600],
+            extraction_confidence=0.9,
+        )
+
+        text = EquilibriumFormatter().format_equilibrium_result(params, result)
+
+        assert "Равновесный состав" in text
+        assert "2 моль C, 1 моль O2" in text
+        assert "C (к)" in text
+        assert "x(CO2)" in text
+        assert "Сошлось: 2/2" in text
@@ -1058,5 +1058,122 @@ class TestOptimalRecordSelector:
         assert group.is_first_in_phase is True
 
 
+
+def make_phase_df(intervals, phase="s"):
+    """DataFrame of phase records from (tmin, tmax, reliability) tuples."""
+    return pd.DataFrame([
+        {
+            "rowid": i, "Formula": "X", "Phase": phase, "Tmin": tmin, "Tmax": tmax,
+            "H298": -100.0, "S298": 50.0, "f1": 10.0, "f2": 0.0, "f3": 0.0,
+            "f4": 0.0, "f5": 0.0, "f6": 0.0, "ReliabilityClass": reliability,
+        }
+        for i, (tmin, tmax, reliability) in enumerate(intervals)
+    ])
+
+
+class TestMinRecordCover:
+    """Test the interval-DP record cover against exhaustive search."""
+
+    @pytest.fixture
+    def config(self):
+        return OptimizationConfig(gap_tolerance_k=1.0)
+
+    @pytest.fixture
+    def selector(self, config):
+        return OptimalRecordSelector(config)
+
+    def brute_force_best(self, selector, df, tmin, tmax):
+        """Best OptimizationScore over all valid chains (exhaustive DFS)."""
+        tol = selector.config.gap_tolerance_k
+        rows = [r for _, r in df.iterrows() if r.Tmax >= tmin and r.Tmin <= tmax]
+        best = None
+
+        def extend(chain):
+            nonlocal best
+            last = chain[-1]
+            if last.Tmax >= tmax - tol:
+                n = len(chain)
+                avg = sum(r.ReliabilityClass for r in chain) / n
+                score = OptimizationScore.calculate(n, avg, 0.0, selector.config).total_score
+                best = score if best is None else max(best, score)
+                return
+            for r in rows:
+                if r.Tmax > last.Tmax and r.Tmin - last.Tmax <= selector.MAX_GAP:
+                    extend(chain + [r])
+
+        for r in rows:
+            if r.Tmin <= tmin + tol:
+                extend([r])
+        return best
+
+    def chain_score(self, selector, chain):
+        n = len(chain)
+        avg = sum(selector._get_reliability_class(r) for r in chain) / n
+        return OptimizationScore.calculate(n, avg, 0.0, selector.config).total_score
+
+    @pytest.mark.parametrize("seed", range(25))
+    def test_matches_exhaustive_search(self, selector, seed):
+        rng = np.random.default_rng(seed)
+        intervals = []
+        for _ in range(9):
+            start = float(rng.integers(0, 9) * 100)
+            intervals.append(
+                (start, start + float(rng.integers(1, 5) * 100), int(rng.integers(0, 4)))
+            )
+        df = make_phase_df(intervals)
+        group = RecordGroup(phase="s", tmin=0.0, tmax=1000.0, records=[], is_first_in_phase=True)
+
+        result = selector._find_optimal_combination_from_db(group, df, is_elemental=False)
+        expected = self.brute_force_best(selector, df, 0.0, 1000.0)
+
+        if expected is None:
+            assert result is None
+            return
+
+        assert result is not None
+        assert self.chain_score(selector, result) == pytest.approx(expected)
+        assert result[0].Tmin <= 0.0 + selector.config.gap_tolerance_k
+        assert result[-1].Tmax >= 1000.0 - selector.config.gap_tolerance_k
+        for prev, nxt in zip(result, result[1:]):
+            assert nxt.Tmax > prev.Tmax
+            assert nxt.Tmin - prev.Tmax <= selector.MAX_GAP
+
+    def test_respects_max_gap(self, selector):
+        df = make_phase_df([(0, 400, 1), (550, 1000, 1)])
+        group = RecordGroup(phase="s", tmin=0.0, tmax=1000.0, records=[])
+        assert selector._find_optimal_combination_from_db(group, df, True) is None
+
+        df = make_phase_df([(0, 400, 1), (480, 1000, 1)])
+        result = selector._find_optimal_combination_from_db(group, df, True)
+        assert [(r.Tmin, r.Tmax) for r in result] == [(0, 400), (480, 1000)]
+
+    @pytest.mark.parametrize("trio_class,expected", [
+        (1, [1, 1, 1]),  # better reliability outweighs one extra record
+        (3, [2, 2]),  # fewer records with better reliability win
+    ])
+    def test_uses_optimization_score(self, selector, trio_class, expected):
+        df = make_phase_df([
+            (0, 300, trio_class), (300, 700, trio_class), (700, 1000, trio_class),
+            (0, 500, 3), (500, 1000, 3),
+            (0, 520, 2), (480, 1000, 2),
+        ])
+        group = RecordGroup(phase="s", tmin=0.0, tmax=1000.0, records=[])
+        result = selector._find_optimal_combination_from_db(group, df, True)
+        assert [r.ReliabilityClass for r in result] == expected
+
+    def test_constraints_applied_before_cover(self, selector):
+        df = make_phase_df([(0, 500, 1), (500, 1000, 1), (0, 1000, 1)])
+        df.loc[2, ["f1"]] = 0.0  # the single covering record has no coefficients
+        group = RecordGroup(phase="s", tmin=0.0, tmax=1000.0, records=[])
+        result = selector._find_optimal_combination_from_db(group, df, True)
+        assert [(r.Tmin, r.Tmax) for r in result] == [(0, 500), (500, 1000)]
+
+    def test_other_phases_ignored(self, selector):
+        df = pd.concat([make_phase_df([(0, 1000, 1)], phase="l"), make_phase_df([(0, 1000, 2)])])
+        group = RecordGroup(phase="s", tmin=0.0, tmax=1000.0, records=[])
+        result = selector._find_optimal_combination_from_db(group, df, True)
+        assert [r.Phase for r in result] == ["s"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,174 @@
+"""
+Тесты скрининга реакций через стехиометрическую матрицу (ReactionScreener).
+
+Матричный расчет сравнивается с поочередным расчетом ReactionEngine на
+веществах из YAML-кэша.
+"""
+
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.thermo_agents.core_logic import (
+    CompoundDataLoader,
+    PhaseTransitionDetector,
+    ReactionEngine,
+    ReactionScreener,
+    RecordRangeBuilder,
+    ThermodynamicEngine,
+)
+from src.thermo_agents.core_logic.reaction_screening import (
+    ScreeningResult,
+    enumerate_reactions,
+    format_equation,
+)
+from src.thermo_agents.models.extraction import ExtractedReactionParameters
+from src.thermo_agents.search.database_connector import DatabaseConnector
+from src.thermo_agents.storage.static_data_manager import StaticDataManager
+
+logger = logging.getLogger(__name__)
+
+SPECIES = ["C", "O2", "CO", "CO2"]
+EQUATIONS = ["C + O2 = CO2", "C + CO2 = 2CO", "2CO + O2 = 2CO2"]
+
+
+@pytest.fixture(scope="module")
+def engine():
+    loader = CompoundDataLoader(
+        DatabaseConnector(Path("data/thermo_data.db")),
+        StaticDataManager(Path("data/static_compounds")),
+        logger,
+    )
+    return ReactionEngine(
+        loader,
+        PhaseTransitionDetector(),
+        RecordRangeBuilder(logger),
+        ThermodynamicEngine(logger),
+        logger,
+    )
+
+
+def reaction_params(coefficients: dict, equation: str) -> ExtractedReactionParameters:
+    reactants = [f for f, c in coefficients.items() if c < 0]
+    products = [f for f, c in coefficients.items() if c > 0]
+    return ExtractedReactionParameters(
+        query_type="reaction_calculation",
+        balanced_equation=equation,
+        all_compounds=reactants + products,
+        reactants=reactants,
+        products=products,
+        temperature_range_k=[298, 1500],
+        extraction_confidence=0.95,
+    )
+
+
+class TestEnumeration:
+    """Перечисление реакций по балансу элементов"""
+
+    def test_carbon_oxygen_system(self):
+        reactions = {format_equation(r) for r in enumerate_reactions(SPECIES)}
+
+        assert reactions == {
+            "C + O2 = CO2",
+            "2C + O2 = 2CO",
+            "C + CO2 = 2CO",
+            "O2 + 2CO = 2CO2",
+        }
+
+    def test_reactions_are_balanced_and_minimal(self):
+        reactions = enumerate_reactions(["Fe2O3", "CO", "Fe", "CO2", "FeO"])
+
+        assert {"Fe2O3": -1, "CO": -3, "Fe": 2, "CO2": 3} in reactions
+        assert {"CO": -1, "FeO": -1, "Fe": 1, "CO2": 1} in reactions
+        # Fe2O3 + Fe = 3FeO — минимальная реакция из трех веществ
+        assert {"Fe2O3": -1, "Fe": -1, "FeO": 3} in reactions
+        assert all(len(r) <= 4 and 0 not in r.values() for r in reactions)
+
+    def test_max_species(self):
+        reactions = enumerate_reactions(["Fe2O3", "CO", "Fe", "CO2"], max_species=3)
+        assert reactions == []
+
+    def test_format_equation(self):
+        assert format_equation({"Fe2O3": -1, "CO": -3, "Fe": 2, "CO2": 3}) == (
+            "Fe2O3 + 3CO = 2Fe + 3CO2"
+        )
+
+
+class TestScreening:
+    """Матричный расчет ΔG/ln K и ранжирование"""
+
+    def test_matches_reaction_engine(self, engine):
+        result = ReactionScreener(engine).screen(SPECIES, EQUATIONS, [298, 1500, 100])
+
+        assert result.equations == EQUATIONS
+        for i, equation in enumerate(EQUATIONS):
+            coefficients = engine.parse_reaction_equation(equation, SPECIES)
+            params = reaction_params(coefficients, equation)
+            expected = engine.calculate_reaction(params, [298, 1500, 100])
+            np.testing.assert_allclose(result.temperatures, expected["T"])
+            np.testing.assert_allclose(result.delta_G[i], expected["delta_G"], rtol=1e-9, atol=1e-6)
+            np.testing.assert_allclose(result.ln_K[i], expected["ln_K"], rtol=1e-9, atol=1e-9)
+
+    def test_enumerated_screening(self, engine):
+        result = ReactionScreener(engine).screen(SPECIES, temperature_range=[298, 1500, 100])
+
+        assert len(result.equations) == 4
+        assert result.delta_G.shape == (4, len(result.temperatures))
+        np.testing.assert_allclose(
+            result.delta_G, result.delta_H - result.temperatures * result.delta_S
+        )
+
+    def test_missing_species_skipped(self, engine):
+        result = ReactionScreener(engine).screen(
+            ["C", "O2", "CO2", "Xx9Zz"], ["C + O2 = CO2", "C + Xx9Zz = CO2"], [298, 1000, 100]
+        )
+
+        assert result.equations == ["C + O2 = CO2"]
+        assert "C + Xx9Zz = CO2" in result.skipped
+
+    def test_ranked_table_and_csv(self, engine, tmp_path):
+        result = ReactionScreener(engine).screen(SPECIES, EQUATIONS, [298, 1500, 100])
+
+        table = result.to_dataframe()
+        assert set(table["equation"]) == set(EQUATIONS)
+        assert table["spontaneous_fraction"].is_monotonic_decreasing
+
+        path = tmp_path / "screening.csv"
+        result.to_csv(path)
+        pd.testing.assert_frame_equal(
+            pd.read_csv(path, keep_default_na=False), table, check_dtype=False
+        )
+
+
+class TestSpontaneityWindows:
+    """Интервалы ΔG < 0 с интерполяцией границ"""
+
+    def test_windows(self):
+        temperatures = np.array([300.0, 400.0, 500.0, 600.0, 700.0])
+        delta_G = np.array([[-10.0, 10.0, 30.0, -10.0, -20.0], [5.0, 5.0, 5.0, 5.0, 5.0]])
+        result = ScreeningResult(
+            species=[], temperatures=temperatures, equations=["A = B", "B = A"],
+            coefficients=np.zeros((2, 0)), delta_H=delta_G, delta_S=np.zeros_like(delta_G),
+            delta_G=delta_G, ln_K=-delta_G,
+        )
+
+        assert result.spontaneity_windows(0) == [(300.0, 350.0), (575.0, 700.0)]
+        assert result.spontaneity_windows(1) == []
+        assert list(result.to_dataframe()["equation"]) == ["A = B", "B = A"]
+
+
+class TestParseReactionEquation:
+    """Коэффициенты не должны совпадать внутри других формул"""
+
+    def test_formula_inside_other_formula(self, engine):
+        coefficients = engine.parse_reaction_equation("C + O2 = CO2", ["C", "O2", "CO2"])
+        assert coefficients == {"C": -1.0, "O2": -1.0, "CO2": 1.0}
+
+    def test_coefficients(self, engine):
+        coefficients = engine.parse_reaction_equation(
+            "Fe2O3 + 3CO = 2Fe + 3CO2", ["Fe2O3", "CO", "Fe", "CO2"]
+        )
+        assert coefficients == {"Fe2O3": -1.0, "CO": -3.0, "Fe": 2.0, "CO2": 3.0}
@@ -0,0 +1,226 @@
+"""
+Тесты предрассчитанных таблиц свойств на сетке температур (ThermoTable).
+
+Табличный расчет реакции сравнивается с прямым расчетом ReactionEngine
+на веществах из YAML-кэша; интерполяция между узлами — с прямым расчетом
+свойств.
+"""
+
+import logging
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.thermo_agents.core_logic import (
+    CompoundDataLoader,
+    PhaseTransitionDetector,
+    ReactionEngine,
+    RecordRangeBuilder,
+    ThermodynamicEngine,
+    ThermoTable,
+)
+from src.thermo_agents.core_logic.thermo_tables import base_formula, tabulate_records
+from src.thermo_agents.models.extraction import ExtractedReactionParameters
+from src.thermo_agents.search.database_connector import DatabaseConnector
+from src.thermo_agents.storage.static_data_manager import StaticDataManager
+
+logger = logging.getLogger(__name__)
+
+PARAMS = ExtractedReactionParameters(
+    query_type="reaction_calculation",
+    balanced_equation="C + O2 = CO2",
+    all_compounds=["C", "O2", "CO2"],
+    reactants=["C", "O2"],
+    products=["CO2"],
+    temperature_range_k=[298, 2500],
+    extraction_confidence=0.95,
+)
+
+
+def make_record(tmin, tmax, f1, f2=0.0, f3=0.0, phase="s"):
+    return pd.Series({
+        "Formula": "X", "Phase": phase, "Tmin": tmin, "Tmax": tmax,
+        "H298": -100.0, "S298": 50.0,
+        "f1": f1, "f2": f2, "f3": f3, "f4": 0.0, "f5": 0.0, "f6": 0.0,
+    })
+
+
+@pytest.fixture(scope="module")
+def components():
+    loader = CompoundDataLoader(
+        DatabaseConnector(Path("data/thermo_data.db")),
+        StaticDataManager(Path("data/static_compounds")),
+        logger,
+    )
+    return (
+        loader,
+        PhaseTransitionDetector(),
+        RecordRangeBuilder(logger),
+        ThermodynamicEngine(logger),
+    )
+
+
+@pytest.fixture(scope="module")
+def table(components, tmp_path_factory):
+    table = ThermoTable()
+    table.build(
+        ["C", "O2", "CO2(g)", "CO2"],
+        *components,
+        tmp_path_factory.mktemp("thermo_table"),
+        t_max=2500.0,
+        dtype="float64",
+    )
+    return table
+
+
+class TestTabulation:
+    """Векторный расчет свойств и выбор записи на сетке"""
+
+    def test_array_matches_scalar(self):
+        engine = ThermodynamicEngine(logger)
+        record = make_record(298.15, 1500.0, 30.0, 5.0, -2.0)
+        temperatures = np.array([298.15, 350.0, 777.7, 1500.0])
+
+        props = engine.calculate_properties_array(record, temperatures)
+
+        for i, T in enumerate(temperatures):
+            expected = engine.calculate_properties(record, T)
+            for name in ("cp", "enthalpy", "entropy", "gibbs_energy"):
+                assert props[name][i] == pytest.approx(expected[name], rel=1e-12, abs=1e-9)
+
+    def test_zero_coefficients(self):
+        engine = ThermodynamicEngine(logger)
+        props = engine.calculate_properties_array(make_record(298.15, 1000.0, 0.0), np.array([500.0]))
+        assert props["enthalpy"][0] == 0.0
+
+    def test_record_choice_matches_reaction_engine(self):
+        engine = ThermodynamicEngine(logger)
+        records = [make_record(298.15, 600.0, 30.0), make_record(700.0, 1000.0, 40.0, phase="l")]
+        temperatures = np.array([298.15, 500.0, 650.0, 800.0, 1200.0])
+
+        values = tabulate_records(records, temperatures, engine)
+
+        # 650K в разрыве -> первая запись; 1200K -> экстраполяция от Tmax=1000K
+        expected_650 = engine.calculate_properties(records[0], 650.0)
+        expected_800 = engine.calculate_properties(records[1], 800.0)
+        expected_1200 = engine.calculate_properties_with_extrapolation(records[1], 1200.0, 1000.0)
+        assert values[1, 2] == pytest.approx(expected_650["enthalpy"])
+        assert values[1, 3] == pytest.approx(expected_800["enthalpy"])
+        assert values[1, 4] == pytest.approx(expected_1200["enthalpy"])
+        assert values[2, 4] == pytest.approx(expected_1200["entropy"])
+
+    def test_base_formula(self):
+        assert base_formula("TiO2(s)") == "TiO2"
+        assert base_formula("Ca(OH)2") == "Ca(OH)2"
+
+
+class TestThermoTable:
+    """Таблица: хранение, интерполяция и расчет реакций"""
+
+    def test_build_and_load(self, table):
+        assert table.formulas == ["C", "O2", "CO2"]
+        assert table.values.shape == (3, 3, 2203)
+        assert table.t_max == 2500.0
+
+        reopened = ThermoTable()
+        reopened.load(Path(table.values.filename).parent)
+        assert isinstance(reopened.values, np.memmap)
+        np.testing.assert_array_equal(reopened.values, table.values)
+        assert set(reopened.selection) == {"C", "O2", "CO2"}
+
+    def test_reaction_matches_direct_calculation(self, components, table):
+        direct = ReactionEngine(*components, logger)
+        tabulated = ReactionEngine(*components, logger, thermo_table=table)
+
+        expected = direct.calculate_reaction(PARAMS, [298, 2400, 100])
+        df = tabulated.calculate_reaction_from_table(PARAMS, [298, 2400, 100])
+
+        assert list(df.columns) == list(expected.columns)
+        for column in ("T", "delta_H", "delta_S", "delta_G", "ln_K"):
+            np.testing.assert_allclose(df[column], expected[column], rtol=1e-9, atol=1e-6)
+
+        df_meta, metadata = tabulated.calculate_reaction_with_metadata(PARAMS, [298, 2400, 100])
+        np.testing.assert_allclose(df_meta["delta_G"], expected["delta_G"], rtol=1e-9)
+        assert set(metadata) == {"C", "O2", "CO2"}
+
+    def test_metadata_from_table_without_loading(self, components, table):
+        loader = components[0]
+        direct = ReactionEngine(*components, logger)
+        tabulated = ReactionEngine(*components, logger, thermo_table=table)
+
+        # Окно совпадает с окном сетки (298-2500K), шаг делит его нацело
+        window = [298, 2500, 367]
+        expected, expected_metadata = direct.calculate_reaction_with_metadata(PARAMS, window)
+        with patch.object(
+            loader,
+            "get_raw_compound_data_with_metadata",
+            side_effect=AssertionError("вещества должны браться из таблиц"),
+        ):
+            df, metadata = tabulated.calculate_reaction_with_metadata(PARAMS, window)
+
+        np.testing.assert_allclose(df["delta_G"], expected["delta_G"], rtol=1e-9, atol=1e-6)
+        for formula, meta in expected_metadata.items():
+            assert [r["Tmin"] for r in metadata[formula]["records_used"]] == [
+                r["Tmin"] for r in meta["records_used"]
+            ]
+            for key in ("melting_point", "boiling_point", "phase_transitions",
+                        "is_yaml_cache", "search_stage"):
+                assert metadata[formula][key] == meta[key]
+
+    @pytest.mark.parametrize("update, window", [
+        ({"compound_names": {"CO2": ["Carbon dioxide"]}}, [298, 2500, 367]),
+        ({"compound_types": {"C": True, "O2": True, "CO2": False}}, [298, 2500, 367]),
+        ({}, [298, 2400, 100]),
+    ])
+    def test_other_selection_uses_records(self, components, table, update, window):
+        loader = components[0]
+        engine = ReactionEngine(*components, logger, thermo_table=table)
+
+        with patch.object(
+            loader,
+            "get_raw_compound_data_with_metadata",
+            wraps=loader.get_raw_compound_data_with_metadata,
+        ) as load:
+            engine.calculate_reaction_with_metadata(PARAMS.model_copy(update=update), window)
+
+        assert load.call_count == 3
+
+    def test_interpolation_error_between_nodes(self, components, table):
+        loader, detector, builder, engine = components
+        temperatures = np.array([400.25, 555.5, 1234.75, 2100.1])
+
+        df = loader.get_raw_compound_data("CO2")
+        melting, boiling = detector.get_most_common_melting_boiling_points(df)
+        records = builder.get_compound_records_for_range(df, [298.0, 2500.0], melting, boiling)
+        exact = tabulate_records(records, temperatures, engine)
+        approx = table.interpolate(["CO2"], temperatures)[0]
+
+        assert np.max(np.abs(approx[1] - exact[1])) < 0.05
+        assert np.max(np.abs(approx[2] - exact[2])) < 1e-3
+
+    def test_float32_storage(self, components, tmp_path, table):
+        compact = ThermoTable()
+        compact.build(["CO2"], *components, tmp_path, t_max=2500.0)
+
+        assert compact.values.dtype == np.float32
+        np.testing.assert_allclose(
+            compact.values[0, 1], table.values[2, 1], rtol=1e-6, atol=0.1
+        )
+
+    def test_not_covered_falls_back(self, components, table):
+        engine = ReactionEngine(*components, logger, thermo_table=table)
+
+        # np.arange(298, 2600, 100) доходит до 2598K — за пределами сетки
+        assert engine.calculate_reaction_from_table(PARAMS, [298, 2500, 100]) is None
+
+        params = PARAMS.model_copy(update={
+            "balanced_equation": "C + CO2 = 2CO",
+            "all_compounds": ["C", "CO2", "CO"],
+            "reactants": ["C", "CO2"],
+            "products": ["CO"],
+        })
+        assert engine.calculate_reaction_from_table(params, [298, 1000, 100]) is None
+        assert len(engine.calculate_reaction(params, [298, 1000, 100])) == 9
@@ -0,0 +1,106 @@
+"""Unit tests for admission control with deficit round robin queuing."""
+
+import asyncio
+
+import pytest
+from src.thermo_agents.utils.admission import AdmissionController, AdmissionRejected
+from src.thermo_agents.utils.resilience import Deadline
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAdmissionController:
+    @pytest.mark.asyncio
+    async def test_fair_share_between_users(self):
+        controller = AdmissionController(max_concurrency=1, max_queue_per_user=10)
+        running = await controller.acquire("busy")
+        order = []
+
+        async def request(user_id):
+            ticket = await controller.acquire(user_id)
+            order.append(user_id)
+            await asyncio.sleep(0)
+            controller.release(ticket)
+
+        tasks = [asyncio.create_task(request("heavy")) for _ in range(4)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(request(user)) for user in ("a", "b")]
+        await asyncio.sleep(0)
+        assert controller.queued == 6
+
+        controller.release(running)
+        await asyncio.gather(*tasks)
+
+        # Запросы a и b не ждут все запросы heavy
+        assert order == ["heavy", "a", "b", "heavy", "heavy", "heavy"]
+        assert controller.in_flight == 0 and controller.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_rejections_carry_estimated_wait(self):
+        clock = FakeClock()
+        controller = AdmissionController(
+            max_concurrency=2, max_queue=2, max_queue_per_user=1,
+            initial_service_s=4.0, clock=clock,
+        )
+        await controller.acquire(1)
+        await controller.acquire(2)
+        assert controller.saturated
+        assert controller.estimate_wait(1) == pytest.approx(2.0)
+
+        queued = asyncio.create_task(controller.acquire(1))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as error:
+            await controller.acquire(1)
+        assert error.value.reason == "user_queue_full"
+        assert error.value.estimated_wait_s == pytest.approx(4.0)
+
+        # Запрос не начнется до своего срока
+        with pytest.raises(AdmissionRejected) as error:
+            await controller.acquire(3, deadline=Deadline.after(1.0, clock=clock))
+        assert error.value.reason == "deadline"
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert controller.queued == 0
+        assert controller.get_stats()["rejected"] == {"user_queue_full": 1, "deadline": 1}
+
+    @pytest.mark.asyncio
+    async def test_expired_in_queue(self):
+        controller = AdmissionController(max_concurrency=1, initial_service_s=0.01)
+        running = await controller.acquire("a")
+
+        with pytest.raises(AdmissionRejected) as error:
+            await controller.acquire("b", deadline=Deadline.after(0.05))
+        assert error.value.reason == "expired"
+        assert controller.queued == 0
+
+        controller.release(running)
+        assert not controller.saturated
+
+    def test_limit_follows_service_time(self):
+        clock = FakeClock()
+        controller = AdmissionController(
+            max_concurrency=16, initial_service_s=1.0, target_service_s=2.0, clock=clock,
+        )
+
+        def serve(seconds):
+            ticket = asyncio.run(controller.acquire("u"))
+            clock.now += seconds
+            controller.release(ticket)
+
+        # Медленнее цели: предел снижается
+        for _ in range(30):
+            serve(8.0)
+        assert controller.concurrency_limit <= 6
+
+        # Быстрее цели: предел восстанавливается до максимума
+        for _ in range(60):
+            serve(1.0)
+        assert controller.concurrency_limit == 16
@@ -9,6 +9,9 @@ from src.thermo_agents.utils.chem_utils import (
     query_contains_charge,
     normalize_composite_formula,
     expand_composite_candidates,
+    parse_composition,
+    composition_signature,
+    find_formulas,
 )
 
 # Mock record class for testing
@@ -273,4 +276,51 @@ class TestExpandCompositeCandidates:
         ]
 
         result = expand_composite_candidates(query, records)
-        assert len(result) == 0
\ No newline at end of file
+        assert len(result) == 0
+
+
+class TestParseComposition:
+    """Test parse_composition and composition_signature."""
+
+    @pytest.mark.parametrize("formula,expected", [
+        ("H2O", {"H": 2, "O": 1}),
+        ("H2O(g)", {"H": 2, "O": 1}),
+        ("Ca(OH)2", {"Ca": 1, "O": 2, "H": 2}),
+        ("CuSO4*5H2O", {"Cu": 1, "S": 1, "O": 9, "H": 10}),
+        ("Li2O*TiO2", {"Li": 2, "O": 3, "Ti": 1}),
+        ("CaO·SiO2", {"Ca": 1, "Si": 1, "O": 3}),
+    ])
+    def test_composition(self, formula, expected):
+        assert parse_composition(formula) == expected
+
+    @pytest.mark.parametrize("formula", ["Fe+2", "CO3-2", "", "Xx2(", "*H2O"])
+    def test_unparseable_or_ionic(self, formula):
+        assert parse_composition(formula) is None
+
+    def test_signature_is_notation_independent(self):
+        signatures = {
+            composition_signature(parse_composition(f))
+            for f in ["Li2TiO3", "Li2O*TiO2", "TiO2*Li2O", "Li2TiO3(s)"]
+        }
+        assert signatures == {"Li2;O3;Ti1"}
+
+
+class TestFindFormulas:
+    """Test find_formulas on free-text queries."""
+
+    @pytest.mark.parametrize("text,expected", [
+        ("2CO + O2 = 2CO2 при 298-1000 K", ["CO", "O2", "CO2"]),
+        ("Свойства H2O(g) от 300 до 1000K", ["H2O"]),
+        ("Fe2O3 + 3H2 -> 2Fe + 3H2O", ["Fe2O3", "H2", "Fe", "H2O"]),
+        ("CuSO4*5H2O и Ca(OH)2 при 25 C", ["CuSO4*5H2O", "Ca(OH)2"]),
+        ("2C + O2 при 25°C", ["C", "O2"]),
+        ("Свойства H2O (сравнить с NaCl)", ["H2O", "NaCl"]),
+    ])
+    def test_formulas_in_text(self, text, expected):
+        assert find_formulas(text) == expected
+
+    def test_rejects_words_and_fake_symbols(self):
+        assert find_formulas("At 900 K In Gibbs energy of Xq2") == []
+
+    def test_limit(self):
+        assert find_formulas("H2 O2 N2 Cl2", limit=2) == ["H2", "O2"]
@@ -0,0 +1,92 @@
+"""Unit tests for request deadlines, circuit breaker and latency tracking."""
+
+import pytest
+from src.thermo_agents.utils.resilience import CircuitBreaker, Deadline, LatencyTracker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDeadline:
+    def test_remaining_and_timeout(self):
+        clock = FakeClock()
+        deadline = Deadline.after(10.0, clock=clock)
+
+        assert deadline.remaining() == 10.0
+        assert deadline.timeout(30.0) == 10.0
+        assert deadline.timeout(4.0) == 4.0
+
+        clock.now += 12.0
+        assert deadline.remaining() == 0.0
+        assert deadline.expired
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker("llm", failure_threshold=3, reset_timeout_s=30.0, clock=clock)
+
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()  # сбрасывает серию
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+        assert breaker.rejected == 1
+        assert breaker.retry_after() == 30.0
+
+    def test_half_open_single_probe(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker("llm", failure_threshold=1, reset_timeout_s=30.0, clock=clock)
+        breaker.record_failure()
+
+        clock.now += 30.0
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()  # пробный вызов уже выполняется
+
+        # Неудачный пробный вызов снова размыкает
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.times_opened == 2
+
+        clock.now += 30.0
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.get_stats()["consecutive_failures"] == 0
+
+
+    def test_released_probe_allows_next(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker("llm", failure_threshold=1, reset_timeout_s=30.0, clock=clock)
+        breaker.record_failure()
+        clock.now += 30.0
+
+        assert breaker.allow()
+        breaker.release_probe()  # пробный вызов отменен
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+
+
+class TestLatencyTracker:
+    def test_percentile_over_window(self):
+        tracker = LatencyTracker(window=100)
+        assert tracker.percentile(0.95) is None
+
+        for i in range(1, 201):
+            tracker.record(float(i))
+
+        assert tracker.count == 100
+        assert tracker.percentile(0.5) == 150.0
+        assert tracker.percentile(0.95) == 195.0
@@ -0,0 +1,130 @@
+"""Unit tests for single-flight request coalescing."""
+
+import asyncio
+
+import pytest
+
+from src.thermo_agents.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test SingleFlight coalescing and cancellation."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("key", compute) for _ in range(5)))
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert flight.executions == 1
+        assert flight.coalesced == 4
+        assert flight.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        flight = SingleFlight()
+
+        async def compute(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        results = await asyncio.gather(
+            flight.do("a", lambda: compute("a")),
+            flight.do("b", lambda: compute("b")),
+        )
+
+        assert results == ["a", "b"]
+        assert flight.executions == 2
+        assert flight.coalesced == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_coalesced(self):
+        flight = SingleFlight()
+
+        async def compute():
+            return 1
+
+        await flight.do("key", compute)
+        await flight.do("key", compute)
+
+        assert flight.executions == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_is_shared(self):
+        flight = SingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            flight.do("key", compute), flight.do("key", compute), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.executions == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelling_one_waiter_keeps_others(self):
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def compute():
+            started.set()
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.create_task(flight.do("key", compute))
+        second = asyncio.create_task(flight.do("key", compute))
+        await started.wait()
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        assert await second == "done"
+
+    @pytest.mark.asyncio
+    async def test_computation_cancelled_when_all_waiters_leave(self):
+        flight = SingleFlight()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def compute():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiters = [asyncio.create_task(flight.do("key", compute)) for _ in range(2)]
+        await started.wait()
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await asyncio.sleep(0)
+        assert flight.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_on_coalesced_callback(self):
+        recorded = []
+        flight = SingleFlight("query", on_coalesced=recorded.append)
+
+        async def compute():
+            await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(flight.do("key", compute) for _ in range(3)))
+
+        assert recorded == ["query", "query"]